@@ -0,0 +1,3057 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Accès aux données SEAOP - modèles, schéma et fonctions de lecture/écriture
+
+Toute la couche sans interface de l'application : classes de données,
+migrations et initialisation de la base, appels d'offres, soumissions,
+messages, évaluations, notifications, statistiques, système d'urgence et
+demandes des services professionnels. Les pages l'importent, comme les
+tests, benchmarks et scripts, sans charger Streamlit, pandas ni PIL.
+"""
+
+import sqlite3
+import hashlib
+import datetime
+import uuid
+import re
+import base64
+import os
+from typing import Optional, List, Dict
+from dataclasses import dataclass
+from moteur_tarification import calculer_prix
+from demandes_services import (assurer_demandes_services, get_stats_services, lire_demandes_services,
+                                lire_stats_services, mettre_a_jour_statut_demande)
+from appariement_leads import assurer_index_appariement, notifier_entrepreneurs_admissibles
+from pertinence_projets import classer_projets, get_matrice_projets
+from proximite_projets import assurer_centroides_rta, rta_dans_rayon, normaliser_rta, EXPRESSION_RTA_LEAD
+from recherches_sauvegardees import assurer_recherches_sauvegardees, extraire_budget_minimum
+from projets_similaires import projets_similaires
+from doublons_leads import assurer_index_doublons, detecter_doublon
+from statistiques_prix import assurer_statistiques_prix
+from base_donnees import activer_wal, ecrire, executer_ecriture, executer_sql
+from chargement_parallele import charger_en_parallele
+from instrumentation import instrumenter_fonctions
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')  # Utilise le répertoire courant en développement
+if not os.path.exists(DATA_DIR):
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+_bases_pretes = set()
+
+# Classes de données
+@dataclass
+class Lead:
+    id: Optional[int] = None
+    nom: str = ""
+    email: str = ""
+    telephone: str = ""
+    code_postal: str = ""
+    type_projet: str = ""
+    description: str = ""
+    budget: str = ""
+    delai_realisation: str = ""
+    date_limite_soumissions: Optional[str] = None
+    date_debut_souhaite: Optional[str] = None
+    niveau_urgence: str = "normal"
+    photos: Optional[str] = None
+    plans: Optional[str] = None
+    documents: Optional[str] = None
+    date_creation: Optional[datetime.datetime] = None
+    statut: str = "nouveau"
+    numero_reference: Optional[str] = None
+    visible_entrepreneurs: bool = True
+    accepte_soumissions: bool = True
+    doublon_de: Optional[Dict] = None  # Projet original si republication (id, numero_reference, similarite)
+
+@dataclass
+class Entrepreneur:
+    id: Optional[int] = None
+    nom_entreprise: str = ""
+    nom_contact: str = ""
+    email: str = ""
+    telephone: str = ""
+    mot_de_passe_hash: str = ""
+    numero_rbq: str = ""
+    zones_desservies: str = ""
+    types_projets: str = ""
+    abonnement: str = "gratuit"
+    credits_restants: int = 5
+    date_inscription: Optional[datetime.datetime] = None
+    statut: str = "actif"
+    certifications: str = ""
+    evaluations_moyenne: float = 0.0
+    nombre_evaluations: int = 0
+
+@dataclass
+class Soumission:
+    id: Optional[int] = None
+    lead_id: int = 0
+    entrepreneur_id: int = 0
+    montant: float = 0.0
+    description_travaux: str = ""
+    delai_execution: str = ""
+    validite_offre: str = ""
+    inclusions: str = ""
+    exclusions: str = ""
+    conditions: str = ""
+    documents: Optional[str] = None
+    statut: str = "envoyee"
+    date_creation: Optional[datetime.datetime] = None
+    vue_par_client: bool = False
+    notes_client: str = ""
+    notes_entrepreneur: str = ""
+
+# Fonctions utilitaires
+def check_and_migrate_database():
+    """Vérifie et migre automatiquement la base de données si nécessaire"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Vérifier si les colonnes d'urgence existent
+        cursor.execute("PRAGMA table_info(leads)")
+        columns = [column[1] for column in cursor.fetchall()]
+        
+        # Colonnes requises pour le système d'urgence
+        required_columns = ['date_limite_soumissions', 'date_debut_souhaite', 'niveau_urgence']
+        missing_columns = [col for col in required_columns if col not in columns]
+        
+        if missing_columns:
+            print(f"Migration automatique : ajout des colonnes {missing_columns}")
+            
+            # Ajouter les colonnes manquantes
+            for column in missing_columns:
+                if column == 'date_limite_soumissions':
+                    cursor.execute('ALTER TABLE leads ADD COLUMN date_limite_soumissions DATE')
+                elif column == 'date_debut_souhaite':
+                    cursor.execute('ALTER TABLE leads ADD COLUMN date_debut_souhaite DATE')
+                elif column == 'niveau_urgence':
+                    cursor.execute('ALTER TABLE leads ADD COLUMN niveau_urgence TEXT DEFAULT "normal"')
+            
+            # Mettre à jour les projets existants avec des valeurs par défaut
+            cursor.execute('''
+                UPDATE leads 
+                SET 
+                    date_limite_soumissions = COALESCE(date_limite_soumissions, date(date_creation, '+14 days')),
+                    date_debut_souhaite = COALESCE(date_debut_souhaite, date(date_creation, '+30 days')),
+                    niveau_urgence = COALESCE(niveau_urgence, 'normal')
+                WHERE id > 0
+            ''')
+            
+            print(f"Migration automatique terminée : {cursor.rowcount} projets mis à jour")
+        
+        # Vérifier et créer la table notifications
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notifications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                utilisateur_type TEXT NOT NULL,
+                utilisateur_id INTEGER NOT NULL,
+                type_notification TEXT NOT NULL,
+                titre TEXT NOT NULL,
+                message TEXT NOT NULL,
+                lien_id INTEGER,
+                lu BOOLEAN DEFAULT 0,
+                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        conn.commit()
+        
+    except Exception as e:
+        print(f"Erreur lors de la migration automatique: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def init_database():
+    """Initialise la base de données SQLite avec toutes les tables"""
+    # Journal WAL : les lectures ne bloquent pas l'écrivain unique (base_donnees)
+    activer_wal(DATABASE_PATH)
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Table des leads (projets)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nom TEXT NOT NULL,
+            email TEXT NOT NULL,
+            telephone TEXT NOT NULL,
+            code_postal TEXT NOT NULL,
+            type_projet TEXT NOT NULL,
+            description TEXT NOT NULL,
+            budget TEXT NOT NULL,
+            delai_realisation TEXT NOT NULL,
+            date_limite_soumissions DATE,
+            date_debut_souhaite DATE,
+            niveau_urgence TEXT DEFAULT 'normal',
+            photos TEXT,
+            plans TEXT,
+            documents TEXT,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            statut TEXT DEFAULT 'nouveau',
+            numero_reference TEXT UNIQUE,
+            visible_entrepreneurs BOOLEAN DEFAULT 1,
+            accepte_soumissions BOOLEAN DEFAULT 1
+        )
+    ''')
+    
+    # Table des entrepreneurs
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS entrepreneurs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nom_entreprise TEXT NOT NULL,
+            nom_contact TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            telephone TEXT NOT NULL,
+            mot_de_passe_hash TEXT NOT NULL,
+            numero_rbq TEXT,
+            zones_desservies TEXT,
+            types_projets TEXT,
+            abonnement TEXT DEFAULT 'gratuit',
+            credits_restants INTEGER DEFAULT 5,
+            date_inscription TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            statut TEXT DEFAULT 'actif',
+            certifications TEXT,
+            evaluations_moyenne REAL DEFAULT 0.0,
+            nombre_evaluations INTEGER DEFAULT 0
+        )
+    ''')
+    
+    # Table des soumissions
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS soumissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lead_id INTEGER NOT NULL,
+            entrepreneur_id INTEGER NOT NULL,
+            montant REAL NOT NULL,
+            description_travaux TEXT NOT NULL,
+            delai_execution TEXT NOT NULL,
+            validite_offre TEXT NOT NULL,
+            inclusions TEXT,
+            exclusions TEXT,
+            conditions TEXT,
+            documents TEXT,
+            statut TEXT DEFAULT 'envoyee',
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            date_modification TIMESTAMP,
+            vue_par_client BOOLEAN DEFAULT 0,
+            notes_client TEXT,
+            notes_entrepreneur TEXT,
+            FOREIGN KEY (lead_id) REFERENCES leads (id),
+            FOREIGN KEY (entrepreneur_id) REFERENCES entrepreneurs (id),
+            UNIQUE(lead_id, entrepreneur_id)
+        )
+    ''')
+    
+    # Table des messages
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lead_id INTEGER NOT NULL,
+            entrepreneur_id INTEGER,
+            expediteur_type TEXT NOT NULL,
+            expediteur_id INTEGER NOT NULL,
+            destinataire_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            pieces_jointes TEXT,
+            date_envoi TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            lu BOOLEAN DEFAULT 0,
+            FOREIGN KEY (lead_id) REFERENCES leads (id),
+            FOREIGN KEY (entrepreneur_id) REFERENCES entrepreneurs (id)
+        )
+    ''')
+    
+    # Table des évaluations
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS evaluations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            soumission_id INTEGER NOT NULL,
+            evaluateur_type TEXT NOT NULL,
+            note INTEGER NOT NULL CHECK(note >= 1 AND note <= 5),
+            commentaire TEXT,
+            date_evaluation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (soumission_id) REFERENCES soumissions (id),
+            UNIQUE(soumission_id, evaluateur_type)
+        )
+    ''')
+    
+    # Table des attributions (pour compatibilité)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attributions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lead_id INTEGER,
+            entrepreneur_id INTEGER,
+            date_attribution TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            statut TEXT DEFAULT 'attribue',
+            notes TEXT,
+            prix_paye REAL DEFAULT 0.0,
+            soumission_id INTEGER,
+            FOREIGN KEY (lead_id) REFERENCES leads (id),
+            FOREIGN KEY (entrepreneur_id) REFERENCES entrepreneurs (id),
+            FOREIGN KEY (soumission_id) REFERENCES soumissions (id)
+        )
+    ''')
+    
+    # Table des notifications
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            utilisateur_type TEXT NOT NULL,
+            utilisateur_id INTEGER NOT NULL,
+            type_notification TEXT NOT NULL,
+            titre TEXT NOT NULL,
+            message TEXT NOT NULL,
+            lien_id INTEGER,
+            lu BOOLEAN DEFAULT 0,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Table des estimations (service d'estimation payant)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS estimations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            
+            -- Informations client
+            nom_client TEXT NOT NULL,
+            email_client TEXT NOT NULL,
+            telephone_client TEXT NOT NULL,
+            adresse_client TEXT,
+            
+            -- Détails de la demande
+            type_projet TEXT NOT NULL,
+            description_detaillee TEXT NOT NULL,
+            surface_approximative TEXT,
+            budget_approximatif TEXT,
+            delai_souhaite TEXT,
+            
+            -- Documents client (plans, croquis, photos)
+            plans_client TEXT,  -- Base64 des documents uploadés par le client
+            photos_client TEXT,  -- Photos de l'existant
+            documents_client TEXT,  -- Autres documents
+            
+            -- Informations estimation
+            prix_estimation REAL,  -- Prix du service d'estimation
+            statut TEXT DEFAULT 'recue',  -- 'recue', 'en_cours', 'terminee', 'envoyee', 'payee'
+            
+            -- Documents de réponse (estimation + facture)
+            estimation_document TEXT,  -- PDF/HTML de l'estimation fournie
+            facture_document TEXT,     -- Facture pour le service
+            documents_annexes TEXT,    -- Autres documents fournis
+            
+            -- Métadonnées
+            date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            date_debut_analyse TIMESTAMP,
+            date_estimation_terminee TIMESTAMP,
+            date_envoi_client TIMESTAMP,
+            date_paiement TIMESTAMP,
+            
+            -- Suivi
+            numero_reference TEXT UNIQUE,  -- Référence unique SEAOP-EST-XXXXX
+            notes_internes TEXT,  -- Notes pour l'estimateur
+            commentaires_client TEXT,  -- Retours du client
+            
+            -- Facturation
+            methode_paiement TEXT,  -- 'virement', 'cheque', 'carte', etc.
+            reference_paiement TEXT  -- Numéro de transaction
+        )
+    ''')
+    
+    # Index pour optimiser les performances des estimations
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_estimations_statut ON estimations(statut)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_estimations_client ON estimations(email_client)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_estimations_date ON estimations(date_demande)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_estimations_reference ON estimations(numero_reference)')
+    
+    # Comptes de soumissions par projet (fil des entrepreneurs, classement par pertinence)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_soumissions_lead ON soumissions(lead_id)')
+    
+    # Conversations d'un entrepreneur : messages lus par (entrepreneur, projet)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages(entrepreneur_id, lead_id)')
+    
+    conn.commit()
+    conn.close()
+    
+    # Registre unifié des demandes de services (triggers + reprise des demandes existantes)
+    assurer_demandes_services()
+    
+    # Index d'appariement projets / entrepreneurs (zones et types de projets)
+    assurer_index_appariement()
+    
+    # Centroïdes des RTA pour la recherche par rayon
+    assurer_centroides_rta()
+    
+    # Recherches sauvegardées des entrepreneurs (alertes)
+    assurer_recherches_sauvegardees()
+    
+    # Index MinHash des descriptions (détection des republications)
+    assurer_index_doublons()
+    
+    # Statistiques de prix des soumissions (contexte du formulaire de soumission)
+    assurer_statistiques_prix()
+
+def init_estimations_demo():
+    """Ajoute des données de démonstration pour les estimations si la table est vide"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Vérifier si la table estimations a des données
+        cursor.execute("SELECT COUNT(*) FROM estimations")
+        count = cursor.fetchone()[0]
+        
+        if count == 0:
+            # Ajouter des estimations de démonstration
+            estimations_demo = [
+                {
+                    'nom_client': 'Marie Dubois',
+                    'email_client': 'marie.dubois@exemple.com',
+                    'telephone_client': '514-555-1234',
+                    'adresse_client': '123 Rue Saint-Denis, Montréal, QC H2X 1K1',
+                    'type_projet': 'Rénovation cuisine',
+                    'description_detaillee': '''Estimation demandée pour rénovation complète de cuisine.
+                    
+Détails de la demande:
+- Cuisine actuelle: 12x10 pieds
+- Démolition partielle (garder la plomberie existante)
+- Nouvelles armoires en bois
+- Comptoir en granite ou quartz
+- Plancher en céramique
+- Électroménagers à remplacer (lave-vaisselle, cuisinière, réfrigérateur)
+- Peinture complète
+                    
+Contraintes:
+- Budget approximatif: 25 000$ - 35 000$
+- Délai souhaité: 2-3 mois
+- Disponibilité: weekends pour visites
+                    
+J'aimerais une estimation détaillée avec breakdown des coûts par poste.''',
+                    'surface_approximative': '120 pi²',
+                    'budget_approximatif': '25 000$ - 35 000$',
+                    'delai_souhaite': '2-3 mois',
+                    'prix_estimation': 150.00,
+                    'statut': 'recue',
+                    'numero_reference': 'SEAOP-EST-20240316-001'
+                },
+                {
+                    'nom_client': 'Pierre Gagnon',
+                    'email_client': 'p.gagnon@exemple.com',
+                    'telephone_client': '450-555-5678',
+                    'adresse_client': '456 Boulevard Taschereau, Longueuil, QC J4K 2V8',
+                    'type_projet': 'Agrandissement maison',
+                    'description_detaillee': '''Demande d'estimation pour agrandissement de maison unifamiliale.
+                    
+Projet envisagé:
+- Agrandissement arrière: 16x20 pieds
+- 2 étages (rez-de-chaussée + étage)
+- Rez-de-chaussée: salon familial + salle d'eau
+- Étage: 2 chambres + salle de bain complète
+- Raccordement au système existant (plomberie, électricité, chauffage)
+- Finition complète intérieure/extérieure
+                    
+Spécifications souhaitées:
+- Fondation en béton
+- Structure bois
+- Revêtement extérieur assorti à l'existant
+- Fenêtres double vitrage
+- Isolation haute performance
+                    
+Budget approximatif: 80 000$ - 120 000$
+Délai flexible: 4-6 mois''',
+                    'surface_approximative': '640 pi² (320 pi² x 2 étages)',
+                    'budget_approximatif': '80 000$ - 120 000$',
+                    'delai_souhaite': '4-6 mois',
+                    'prix_estimation': 300.00,
+                    'statut': 'en_cours',
+                    'numero_reference': 'SEAOP-EST-20240315-002',
+                    'notes_internes': 'Projet complexe - nécessite vérification zonage municipal'
+                }
+            ]
+            
+            # Insérer les données de démonstration
+            for estimation in estimations_demo:
+                cursor.execute('''
+                    INSERT INTO estimations (
+                        nom_client, email_client, telephone_client, adresse_client,
+                        type_projet, description_detaillee, surface_approximative,
+                        budget_approximatif, delai_souhaite, prix_estimation,
+                        statut, numero_reference, notes_internes
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    estimation['nom_client'], estimation['email_client'], 
+                    estimation['telephone_client'], estimation.get('adresse_client'),
+                    estimation['type_projet'], estimation['description_detaillee'],
+                    estimation['surface_approximative'], estimation['budget_approximatif'],
+                    estimation['delai_souhaite'], estimation['prix_estimation'],
+                    estimation['statut'], estimation['numero_reference'],
+                    estimation.get('notes_internes')
+                ))
+            
+            # Ajouter des notifications pour les nouvelles estimations
+            cursor.execute('''
+                INSERT INTO notifications (
+                    utilisateur_type, utilisateur_id, type_notification,
+                    titre, message, lien_id
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                'admin', 0, 'nouvelle_estimation',
+                'Nouvelle demande d\'estimation',
+                'Marie Dubois a demandé une estimation pour une rénovation de cuisine',
+                1
+            ))
+            
+            cursor.execute('''
+                INSERT INTO notifications (
+                    utilisateur_type, utilisateur_id, type_notification,
+                    titre, message, lien_id
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                'admin', 0, 'nouvelle_estimation',
+                'Nouvelle demande d\'estimation',
+                'Pierre Gagnon a demandé une estimation pour un agrandissement',
+                2
+            ))
+            
+            conn.commit()
+            
+    except Exception as e:
+        print(f"Erreur lors de l'initialisation des estimations de démonstration: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def assurer_base():
+    """Migration, tables et données de démonstration, une fois par processus pour la base"""
+    if DATABASE_PATH in _bases_pretes:
+        return
+    check_and_migrate_database()
+    init_database()
+    init_estimations_demo()
+    _bases_pretes.add(DATABASE_PATH)
+
+def hash_password(password: str) -> str:
+    """Hash un mot de passe avec SHA-256"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def valider_email(email: str) -> bool:
+    """Valide le format d'un email"""
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+def valider_telephone(telephone: str) -> bool:
+    """Valide le format d'un numéro de téléphone québécois"""
+    pattern = r'^(\+1[-.\s]?)?\(?([2-9][0-9]{2})\)?[-.\s]?([2-9][0-9]{2})[-.\s]?([0-9]{4})$'
+    return re.match(pattern, telephone.replace(" ", "")) is not None
+
+def valider_code_postal(code_postal: str) -> bool:
+    """Valide le format d'un code postal canadien"""
+    pattern = r'^[A-Za-z]\d[A-Za-z][ -]?\d[A-Za-z]\d$'
+    return re.match(pattern, code_postal) is not None
+
+def generer_numero_reference() -> str:
+    """Génère un numéro de référence unique"""
+    return f"SEAOP-{datetime.datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
+
+def sauvegarder_lead(lead: Lead) -> str:
+    """Sauvegarde un lead dans la base de données"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    numero_ref = generer_numero_reference()
+    lead.numero_reference = numero_ref
+    
+    cursor.execute('''
+        INSERT INTO leads (nom, email, telephone, code_postal, type_projet, 
+                          description, budget, delai_realisation, 
+                          date_limite_soumissions, date_debut_souhaite, niveau_urgence,
+                          photos, plans, documents, numero_reference)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (lead.nom, lead.email, lead.telephone, lead.code_postal, lead.type_projet,
+          lead.description, lead.budget, lead.delai_realisation,
+          lead.date_limite_soumissions, lead.date_debut_souhaite, lead.niveau_urgence,
+          lead.photos, lead.plans, lead.documents, numero_ref))
+    
+    lead_id = cursor.lastrowid
+    
+    # Republication d'un projet encore ouvert du même client : regroupée avec l'original, non diffusée
+    try:
+        lead.doublon_de = detecter_doublon(cursor, lead_id, lead.description, lead.email,
+                                           lead.telephone, lead.code_postal)
+    except Exception as e:
+        print(f"Erreur lors de la détection des doublons: {e}")
+    
+    # Notifier les entrepreneurs dont les zones et les types couvrent le projet
+    if lead.doublon_de is None:
+        try:
+            notifier_entrepreneurs_admissibles(cursor, lead_id, lead.code_postal, lead.type_projet)
+        except Exception as e:
+            print(f"Erreur lors de la notification des entrepreneurs: {e}")
+    
+    conn.commit()
+    conn.close()
+    
+    return numero_ref
+
+def authentifier_entrepreneur(email: str, mot_de_passe: str) -> Optional[Entrepreneur]:
+    """Authentifie un entrepreneur"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT * FROM entrepreneurs WHERE email = ? AND mot_de_passe_hash = ?
+    ''', (email, hash_password(mot_de_passe)))
+    
+    result = cursor.fetchone()
+    conn.close()
+    
+    if result:
+        return Entrepreneur(
+            id=result[0], nom_entreprise=result[1], nom_contact=result[2],
+            email=result[3], telephone=result[4], mot_de_passe_hash=result[5],
+            numero_rbq=result[6], zones_desservies=result[7], types_projets=result[8],
+            abonnement=result[9], credits_restants=result[10], 
+            date_inscription=result[11], statut=result[12], certifications=result[13],
+            evaluations_moyenne=result[14] if len(result) > 14 else 0.0,
+            nombre_evaluations=result[15] if len(result) > 15 else 0
+        )
+    return None
+
+def get_projets_disponibles() -> List[Dict]:
+    """Récupère tous les projets disponibles pour soumission avec informations d'urgence"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT l.*, 
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions
+        FROM leads l
+        WHERE l.visible_entrepreneurs = 1 AND l.accepte_soumissions = 1
+        ORDER BY 
+            CASE l.niveau_urgence 
+                WHEN 'critique' THEN 1 
+                WHEN 'eleve' THEN 2 
+                WHEN 'normal' THEN 3 
+                WHEN 'faible' THEN 4 
+            END,
+            l.date_limite_soumissions ASC,
+            l.date_creation DESC
+    ''')
+    
+    projets = []
+    for row in cursor.fetchall():
+        projet = {
+            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
+            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
+            'budget': row[7], 'delai_realisation': row[8], 
+            'date_limite_soumissions': row[9], 'date_debut_souhaite': row[10],
+            'niveau_urgence': row[11], 'photos': row[12], 'plans': row[13], 
+            'documents': row[14], 'date_creation': row[15], 'statut': row[16],
+            'numero_reference': row[17], 'visible_entrepreneurs': row[18], 
+            'accepte_soumissions': row[19], 'nb_soumissions': row[20]
+        }
+        
+        # Calculer les jours restants
+        projet['jours_restants_soumissions'] = calculer_jours_restants(projet['date_limite_soumissions'])
+        projet['jours_restants_debut'] = calculer_jours_restants(projet['date_debut_souhaite'])
+        
+        # Mettre à jour l'urgence automatiquement
+        mettre_a_jour_urgence_projet(projet['id'])
+        
+        projets.append(projet)
+    
+    conn.close()
+    return projets
+
+def sauvegarder_soumission(soumission: Soumission) -> bool:
+    """Sauvegarde une soumission d'entrepreneur (par l'écrivain unique)"""
+    try:
+        executer_sql('''
+            INSERT INTO soumissions (lead_id, entrepreneur_id, montant, description_travaux,
+                                   delai_execution, validite_offre, inclusions, exclusions,
+                                   conditions, documents, statut)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (soumission.lead_id, soumission.entrepreneur_id, soumission.montant,
+              soumission.description_travaux, soumission.delai_execution,
+              soumission.validite_offre, soumission.inclusions, soumission.exclusions,
+              soumission.conditions, soumission.documents, soumission.statut), chemin=DATABASE_PATH)
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+# Fonctions de gestion des messages
+def envoyer_message(lead_id: int, entrepreneur_id: int, expediteur_type: str, expediteur_id: int, destinataire_id: int, message: str, pieces_jointes: str = None) -> bool:
+    """Envoie un message entre client et entrepreneur"""
+    try:
+        executer_sql('''
+            INSERT INTO messages (lead_id, entrepreneur_id, expediteur_type, expediteur_id, destinataire_id, message, pieces_jointes)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (lead_id, entrepreneur_id, expediteur_type, expediteur_id, destinataire_id, message, pieces_jointes),
+            chemin=DATABASE_PATH)
+        return True
+    except Exception as e:
+        print(f"Erreur lors de l'envoi du message: {e}")
+        return False
+
+def get_messages_conversation(lead_id: int, entrepreneur_id: int) -> List[Dict]:
+    """Récupère tous les messages d'une conversation entre client et entrepreneur"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT m.*, 
+               CASE 
+                   WHEN m.expediteur_type = 'client' THEN l.nom
+                   ELSE e.nom_entreprise
+               END as nom_expediteur
+        FROM messages m
+        LEFT JOIN leads l ON m.lead_id = l.id
+        LEFT JOIN entrepreneurs e ON m.entrepreneur_id = e.id
+        WHERE m.lead_id = ? AND m.entrepreneur_id = ?
+        ORDER BY m.date_envoi ASC
+    ''', (lead_id, entrepreneur_id))
+    
+    messages = []
+    for row in cursor.fetchall():
+        messages.append({
+            'id': row[0],
+            'lead_id': row[1],
+            'entrepreneur_id': row[2],
+            'expediteur_type': row[3],
+            'expediteur_id': row[4],
+            'destinataire_id': row[5],
+            'message': row[6],
+            'pieces_jointes': row[7],
+            'date_envoi': row[8],
+            'lu': row[9],
+            'nom_expediteur': row[10]
+        })
+    
+    conn.close()
+    return messages
+
+def marquer_messages_lus(lead_id: int, entrepreneur_id: int, destinataire_id: int):
+    """Marque tous les messages comme lus pour un destinataire"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        UPDATE messages SET lu = 1 
+        WHERE lead_id = ? AND entrepreneur_id = ? AND destinataire_id = ? AND lu = 0
+    ''', (lead_id, entrepreneur_id, destinataire_id))
+    
+    conn.commit()
+    conn.close()
+
+def get_conversations_client(client_id: int) -> List[Dict]:
+    """Récupère toutes les conversations d'un client"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT DISTINCT m.lead_id, m.entrepreneur_id, e.nom_entreprise, l.type_projet,
+               (SELECT COUNT(*) FROM messages m2 WHERE m2.lead_id = m.lead_id AND m2.entrepreneur_id = m.entrepreneur_id AND m2.destinataire_id = ? AND m2.lu = 0) as non_lus,
+               (SELECT MAX(date_envoi) FROM messages m3 WHERE m3.lead_id = m.lead_id AND m3.entrepreneur_id = m.entrepreneur_id) as dernier_message
+        FROM messages m
+        JOIN entrepreneurs e ON m.entrepreneur_id = e.id
+        JOIN leads l ON m.lead_id = l.id
+        WHERE l.email = (SELECT email FROM leads WHERE id = ?)
+        ORDER BY dernier_message DESC
+    ''', (client_id, client_id))
+    
+    conversations = []
+    for row in cursor.fetchall():
+        conversations.append({
+            'lead_id': row[0],
+            'entrepreneur_id': row[1],
+            'nom_entreprise': row[2],
+            'type_projet': row[3],
+            'non_lus': row[4],
+            'dernier_message': row[5]
+        })
+    
+    conn.close()
+    return conversations
+
+def get_conversations_entrepreneur(entrepreneur_id: int) -> List[Dict]:
+    """Récupère toutes les conversations d'un entrepreneur"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT DISTINCT m.lead_id, m.entrepreneur_id, l.nom as nom_client, l.type_projet,
+               (SELECT COUNT(*) FROM messages m2 WHERE m2.lead_id = m.lead_id AND m2.entrepreneur_id = m.entrepreneur_id AND m2.destinataire_id = ? AND m2.lu = 0) as non_lus,
+               (SELECT MAX(date_envoi) FROM messages m3 WHERE m3.lead_id = m.lead_id AND m3.entrepreneur_id = m.entrepreneur_id) as dernier_message
+        FROM messages m
+        JOIN leads l ON m.lead_id = l.id
+        WHERE m.entrepreneur_id = ?
+        ORDER BY dernier_message DESC
+    ''', (entrepreneur_id, entrepreneur_id))
+    
+    conversations = []
+    for row in cursor.fetchall():
+        conversations.append({
+            'lead_id': row[0],
+            'entrepreneur_id': row[1],
+            'nom_client': row[2],
+            'type_projet': row[3],
+            'non_lus': row[4],
+            'dernier_message': row[5]
+        })
+    
+    conn.close()
+    return conversations
+
+# Fonctions de gestion des évaluations
+def ajouter_evaluation(soumission_id: int, evaluateur_type: str, note: int, commentaire: str = "") -> bool:
+    """Ajoute une évaluation pour une soumission"""
+    try:
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO evaluations (soumission_id, evaluateur_type, note, commentaire)
+            VALUES (?, ?, ?, ?)
+        ''', (soumission_id, evaluateur_type, note, commentaire))
+        
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Erreur lors de l'ajout de l'évaluation: {e}")
+        return False
+
+def get_evaluations_entrepreneur(entrepreneur_id: int) -> Dict:
+    """Récupère les statistiques d'évaluation d'un entrepreneur"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        return _lire_evaluations_entrepreneur(conn, entrepreneur_id)
+    finally:
+        conn.close()
+
+def _lire_evaluations_entrepreneur(conn: sqlite3.Connection, entrepreneur_id: int) -> Dict:
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT 
+            AVG(e.note) as note_moyenne,
+            COUNT(e.note) as nombre_evaluations,
+            COUNT(CASE WHEN e.note >= 4 THEN 1 END) as evaluations_positives
+        FROM evaluations e
+        JOIN soumissions s ON e.soumission_id = s.id
+        WHERE s.entrepreneur_id = ? AND e.evaluateur_type = 'client'
+    ''', (entrepreneur_id,))
+    
+    result = cursor.fetchone()
+    
+    if result and result[0]:
+        return {
+            'note_moyenne': round(result[0], 1),
+            'nombre_evaluations': result[1],
+            'evaluations_positives': result[2],
+            'pourcentage_positif': round((result[2] / result[1] * 100), 1) if result[1] > 0 else 0
+        }
+    else:
+        return {
+            'note_moyenne': 0,
+            'nombre_evaluations': 0,
+            'evaluations_positives': 0,
+            'pourcentage_positif': 0
+        }
+
+def get_evaluation_soumission(soumission_id: int, evaluateur_type: str) -> Optional[Dict]:
+    """Récupère l'évaluation d'une soumission"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT note, commentaire, date_evaluation
+        FROM evaluations
+        WHERE soumission_id = ? AND evaluateur_type = ?
+    ''', (soumission_id, evaluateur_type))
+    
+    result = cursor.fetchone()
+    conn.close()
+    
+    if result:
+        return {
+            'note': result[0],
+            'commentaire': result[1],
+            'date_evaluation': result[2]
+        }
+    return None
+
+def get_derniers_commentaires_entrepreneur(entrepreneur_id: int, limit: int = 5) -> List[Dict]:
+    """Récupère les derniers commentaires d'un entrepreneur"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        return _lire_derniers_commentaires_entrepreneur(conn, entrepreneur_id, limit)
+    finally:
+        conn.close()
+
+def _lire_derniers_commentaires_entrepreneur(conn: sqlite3.Connection, entrepreneur_id: int,
+                                            limit: int = 5) -> List[Dict]:
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT e.note, e.commentaire, e.date_evaluation, l.type_projet
+        FROM evaluations e
+        JOIN soumissions s ON e.soumission_id = s.id
+        JOIN leads l ON s.lead_id = l.id
+        WHERE s.entrepreneur_id = ? AND e.evaluateur_type = 'client' 
+        AND e.commentaire IS NOT NULL AND e.commentaire != ''
+        ORDER BY e.date_evaluation DESC
+        LIMIT ?
+    ''', (entrepreneur_id, limit))
+    
+    commentaires = []
+    for row in cursor.fetchall():
+        commentaires.append({
+            'note': row[0],
+            'commentaire': row[1],
+            'date_evaluation': row[2][:10] if row[2] else "",
+            'type_projet': row[3]
+        })
+    
+    return commentaires
+
+# Fonctions de gestion des notifications
+def creer_notification(utilisateur_type: str, utilisateur_id: int, type_notif: str, titre: str, message: str, lien_id: int = None) -> bool:
+    """Crée une nouvelle notification"""
+    try:
+        executer_sql('''
+            INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, titre, message, lien_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (utilisateur_type, utilisateur_id, type_notif, titre, message, lien_id), chemin=DATABASE_PATH)
+        return True
+    except Exception as e:
+        print(f"Erreur lors de la création de notification: {e}")
+        return False
+
+def get_notifications_utilisateur(utilisateur_type: str, utilisateur_id: int, limit: int = 10) -> List[Dict]:
+    """Récupère les notifications d'un utilisateur"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT id, type_notification, titre, message, lien_id, lu, date_creation
+        FROM notifications
+        WHERE utilisateur_type = ? AND utilisateur_id = ?
+        ORDER BY date_creation DESC
+        LIMIT ?
+    ''', (utilisateur_type, utilisateur_id, limit))
+    
+    notifications = []
+    for row in cursor.fetchall():
+        notifications.append({
+            'id': row[0],
+            'type_notification': row[1],
+            'titre': row[2],
+            'message': row[3],
+            'lien_id': row[4],
+            'lu': row[5],
+            'date_creation': row[6]
+        })
+    
+    conn.close()
+    return notifications
+
+def count_notifications_non_lues(utilisateur_type: str, utilisateur_id: int) -> int:
+    """Compte les notifications non lues d'un utilisateur"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT COUNT(*) FROM notifications
+        WHERE utilisateur_type = ? AND utilisateur_id = ? AND lu = 0
+    ''', (utilisateur_type, utilisateur_id))
+    
+    count = cursor.fetchone()[0]
+    conn.close()
+    return count
+
+def marquer_notification_lue(notification_id: int) -> bool:
+    """Marque une notification comme lue"""
+    try:
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE notifications SET lu = 1 WHERE id = ?
+        ''', (notification_id,))
+        
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Erreur lors du marquage de notification: {e}")
+        return False
+
+def marquer_toutes_notifications_lues(utilisateur_type: str, utilisateur_id: int) -> bool:
+    """Marque toutes les notifications d'un utilisateur comme lues"""
+    try:
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE notifications SET lu = 1 
+            WHERE utilisateur_type = ? AND utilisateur_id = ? AND lu = 0
+        ''', (utilisateur_type, utilisateur_id))
+        
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Erreur lors du marquage de toutes les notifications: {e}")
+        return False
+
+# Fonctions spécifiques de création de notifications
+def notifier_nouvelle_soumission(lead_id: int):
+    """Notifie le client qu'il a reçu une nouvelle soumission"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Récupérer les infos du projet
+    cursor.execute('SELECT nom, type_projet FROM leads WHERE id = ?', (lead_id,))
+    projet = cursor.fetchone()
+    
+    if projet:
+        titre = "📩 Nouvelle soumission reçue"
+        message = f"Vous avez reçu une nouvelle soumission pour votre projet : {projet[1]}"
+        creer_notification('client', lead_id, 'nouvelle_soumission', titre, message, lead_id)
+    
+    conn.close()
+
+def notifier_soumission_acceptee(soumission_id: int):
+    """Notifie l'entrepreneur que sa soumission a été acceptée"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Récupérer les infos de la soumission
+    cursor.execute('''
+        SELECT s.entrepreneur_id, l.type_projet, s.montant
+        FROM soumissions s
+        JOIN leads l ON s.lead_id = l.id
+        WHERE s.id = ?
+    ''', (soumission_id,))
+    
+    result = cursor.fetchone()
+    if result:
+        entrepreneur_id, type_projet, montant = result
+        titre = "🎉 Soumission acceptée !"
+        message = f"Félicitations ! Votre soumission de {montant:,.2f}$ pour le projet '{type_projet}' a été acceptée."
+        creer_notification('entrepreneur', entrepreneur_id, 'soumission_acceptee', titre, message, soumission_id)
+    
+    conn.close()
+
+def notifier_soumission_refusee(soumission_id: int):
+    """Notifie l'entrepreneur que sa soumission a été refusée"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Récupérer les infos de la soumission
+    cursor.execute('''
+        SELECT s.entrepreneur_id, l.type_projet
+        FROM soumissions s
+        JOIN leads l ON s.lead_id = l.id
+        WHERE s.id = ?
+    ''', (soumission_id,))
+    
+    result = cursor.fetchone()
+    if result:
+        entrepreneur_id, type_projet = result
+        titre = "❌ Soumission non retenue"
+        message = f"Votre soumission pour le projet '{type_projet}' n'a pas été retenue. Continuez à soumissionner !"
+        creer_notification('entrepreneur', entrepreneur_id, 'soumission_refusee', titre, message, soumission_id)
+    
+    conn.close()
+
+def notifier_nouveau_message(lead_id: int, entrepreneur_id: int, expediteur_type: str):
+    """Notifie qu'un nouveau message a été reçu"""
+    if expediteur_type == 'client':
+        # Notifier l'entrepreneur
+        titre = "💬 Nouveau message client"
+        message = "Vous avez reçu un nouveau message d'un client"
+        creer_notification('entrepreneur', entrepreneur_id, 'nouveau_message', titre, message, lead_id)
+    else:
+        # Notifier le client
+        titre = "💬 Nouveau message entrepreneur"
+        message = "Vous avez reçu un nouveau message d'un entrepreneur"
+        creer_notification('client', lead_id, 'nouveau_message', titre, message, lead_id)
+
+# Fonctions de statistiques et dashboard
+def get_stats_client(client_email: str) -> Dict:
+    """Récupère les statistiques d'un client"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Projets du client
+    cursor.execute('''
+        SELECT COUNT(*) as nb_projets,
+               AVG(nb_soumissions) as moy_soumissions_par_projet
+        FROM (
+            SELECT l.id, COUNT(s.id) as nb_soumissions
+            FROM leads l
+            LEFT JOIN soumissions s ON l.id = s.lead_id
+            WHERE l.email = ?
+            GROUP BY l.id
+        )
+    ''', (client_email,))
+    
+    projets_stats = cursor.fetchone()
+    
+    # Montant moyen des soumissions
+    cursor.execute('''
+        SELECT AVG(s.montant) as montant_moyen,
+               COUNT(s.id) as total_soumissions,
+               COUNT(CASE WHEN s.statut = 'acceptee' THEN 1 END) as soumissions_acceptees
+        FROM soumissions s
+        JOIN leads l ON s.lead_id = l.id
+        WHERE l.email = ?
+    ''', (client_email,))
+    
+    soumissions_stats = cursor.fetchone()
+    
+    # Évolution mensuelle
+    cursor.execute('''
+        SELECT strftime('%Y-%m', l.date_creation) as mois,
+               COUNT(l.id) as nb_projets,
+               COUNT(s.id) as nb_soumissions
+        FROM leads l
+        LEFT JOIN soumissions s ON l.id = s.lead_id
+        WHERE l.email = ?
+        GROUP BY strftime('%Y-%m', l.date_creation)
+        ORDER BY mois DESC
+        LIMIT 6
+    ''', (client_email,))
+    
+    evolution_mensuelle = cursor.fetchall()
+    
+    conn.close()
+    
+    return {
+        'nb_projets': projets_stats[0] if projets_stats else 0,
+        'moy_soumissions_par_projet': round(projets_stats[1], 1) if projets_stats[1] else 0,
+        'montant_moyen_soumissions': round(soumissions_stats[0], 2) if soumissions_stats[0] else 0,
+        'total_soumissions': soumissions_stats[1] if soumissions_stats else 0,
+        'soumissions_acceptees': soumissions_stats[2] if soumissions_stats else 0,
+        'taux_acceptation': round((soumissions_stats[2] / soumissions_stats[1] * 100), 1) if soumissions_stats[1] and soumissions_stats[1] > 0 else 0,
+        'evolution_mensuelle': evolution_mensuelle
+    }
+
+def _lire_soumissions_entrepreneur(conn: sqlite3.Connection, entrepreneur_id: int):
+    # Statistiques générales des soumissions
+    return conn.execute('''
+        SELECT COUNT(*) as total_soumissions,
+               COUNT(CASE WHEN statut = 'acceptee' THEN 1 END) as soumissions_acceptees,
+               COUNT(CASE WHEN statut = 'refusee' THEN 1 END) as soumissions_refusees,
+               AVG(montant) as montant_moyen,
+               SUM(CASE WHEN statut = 'acceptee' THEN montant ELSE 0 END) as ca_total
+        FROM soumissions
+        WHERE entrepreneur_id = ?
+    ''', (entrepreneur_id,)).fetchone()
+
+def _lire_evolution_entrepreneur(conn: sqlite3.Connection, entrepreneur_id: int) -> List:
+    # Évolution mensuelle
+    return conn.execute('''
+        SELECT strftime('%Y-%m', date_creation) as mois,
+               COUNT(*) as nb_soumissions,
+               COUNT(CASE WHEN statut = 'acceptee' THEN 1 END) as nb_acceptees,
+               SUM(CASE WHEN statut = 'acceptee' THEN montant ELSE 0 END) as ca_mois
+        FROM soumissions
+        WHERE entrepreneur_id = ?
+        GROUP BY strftime('%Y-%m', date_creation)
+        ORDER BY mois DESC
+        LIMIT 6
+    ''', (entrepreneur_id,)).fetchall()
+
+def _assembler_stats_entrepreneur(soumissions_stats, evolution_mensuelle: List, stats_eval: Dict) -> Dict:
+    total_soum = soumissions_stats[0] if soumissions_stats else 0
+    acceptees = soumissions_stats[1] if soumissions_stats else 0
+    
+    return {
+        'total_soumissions': total_soum,
+        'soumissions_acceptees': acceptees,
+        'soumissions_refusees': soumissions_stats[2] if soumissions_stats else 0,
+        'taux_succes': round((acceptees / total_soum * 100), 1) if total_soum > 0 else 0,
+        'montant_moyen': round(soumissions_stats[3], 2) if soumissions_stats[3] else 0,
+        'ca_total': round(soumissions_stats[4], 2) if soumissions_stats[4] else 0,
+        'note_moyenne': stats_eval['note_moyenne'],
+        'nb_evaluations': stats_eval['nombre_evaluations'],
+        'evolution_mensuelle': evolution_mensuelle
+    }
+
+def _lectures_entrepreneur(entrepreneur_id: int) -> Dict:
+    """Lectures indépendantes des statistiques d'un entrepreneur, pour charger_en_parallele"""
+    return {
+        'soumissions': lambda conn: _lire_soumissions_entrepreneur(conn, entrepreneur_id),
+        'evolution_mensuelle': lambda conn: _lire_evolution_entrepreneur(conn, entrepreneur_id),
+        'evaluations': lambda conn: _lire_evaluations_entrepreneur(conn, entrepreneur_id),
+    }
+
+def get_stats_entrepreneur(entrepreneur_id: int) -> Dict:
+    """Récupère les statistiques d'un entrepreneur"""
+    resultats = charger_en_parallele(_lectures_entrepreneur(entrepreneur_id), DATABASE_PATH)
+    return _assembler_stats_entrepreneur(resultats['soumissions'], resultats['evolution_mensuelle'],
+                                         resultats['evaluations'])
+
+def get_tableau_de_bord_entrepreneur(entrepreneur_id: int, limite_commentaires: int = 5) -> Dict:
+    """Évaluations, derniers commentaires et statistiques de l'espace entrepreneur, lus en parallèle"""
+    lectures = _lectures_entrepreneur(entrepreneur_id)
+    lectures['commentaires'] = lambda conn: _lire_derniers_commentaires_entrepreneur(
+        conn, entrepreneur_id, limite_commentaires)
+    resultats = charger_en_parallele(lectures, DATABASE_PATH)
+    return {
+        'evaluations': resultats['evaluations'],
+        'commentaires': resultats['commentaires'],
+        'stats': _assembler_stats_entrepreneur(resultats['soumissions'], resultats['evolution_mensuelle'],
+                                               resultats['evaluations'])
+    }
+
+def _lire_stats_generales(conn: sqlite3.Connection):
+    # Statistiques générales
+    return conn.execute('''
+        SELECT 
+            (SELECT COUNT(*) FROM leads) as total_projets,
+            (SELECT COUNT(*) FROM entrepreneurs) as total_entrepreneurs,
+            (SELECT COUNT(*) FROM soumissions) as total_soumissions,
+            (SELECT SUM(CASE WHEN statut = 'acceptee' THEN montant ELSE 0 END) FROM soumissions) as ca_total
+    ''').fetchone()
+
+def _lire_top_entrepreneurs_mois(conn: sqlite3.Connection) -> List:
+    # Top entrepreneurs du mois
+    return conn.execute('''
+        SELECT e.nom_entreprise,
+               COUNT(s.id) as nb_soumissions,
+               COUNT(CASE WHEN s.statut = 'acceptee' THEN 1 END) as nb_acceptees,
+               SUM(CASE WHEN s.statut = 'acceptee' THEN s.montant ELSE 0 END) as ca_mois,
+               AVG(ev.note) as note_moyenne
+        FROM entrepreneurs e
+        LEFT JOIN soumissions s ON e.id = s.entrepreneur_id 
+            AND strftime('%Y-%m', s.date_creation) = strftime('%Y-%m', 'now')
+        LEFT JOIN evaluations ev ON s.id = ev.soumission_id AND ev.evaluateur_type = 'client'
+        GROUP BY e.id, e.nom_entreprise
+        HAVING nb_soumissions > 0
+        ORDER BY nb_acceptees DESC, ca_mois DESC
+        LIMIT 5
+    ''').fetchall()
+
+def _lire_evolution_projets(conn: sqlite3.Connection) -> List:
+    # Évolution mensuelle globale
+    return conn.execute('''
+        SELECT strftime('%Y-%m', date_creation) as mois,
+               COUNT(*) as nb_projets
+        FROM leads
+        GROUP BY strftime('%Y-%m', date_creation)
+        ORDER BY mois DESC
+        LIMIT 6
+    ''').fetchall()
+
+def _lire_evolution_soumissions(conn: sqlite3.Connection) -> List:
+    return conn.execute('''
+        SELECT strftime('%Y-%m', date_creation) as mois,
+               COUNT(*) as nb_soumissions,
+               SUM(CASE WHEN statut = 'acceptee' THEN montant ELSE 0 END) as ca_mois
+        FROM soumissions
+        GROUP BY strftime('%Y-%m', date_creation)
+        ORDER BY mois DESC
+        LIMIT 6
+    ''').fetchall()
+
+# Lectures indépendantes des statistiques globales, pour charger_en_parallele
+LECTURES_STATS_ADMIN = {
+    'stats_generales': _lire_stats_generales,
+    'top_entrepreneurs': _lire_top_entrepreneurs_mois,
+    'evolution_projets': _lire_evolution_projets,
+    'evolution_soumissions': _lire_evolution_soumissions,
+}
+
+def _assembler_stats_admin(resultats: Dict) -> Dict:
+    stats_generales = resultats['stats_generales']
+    
+    return {
+        'total_projets': stats_generales[0] if stats_generales else 0,
+        'total_entrepreneurs': stats_generales[1] if stats_generales else 0,
+        'total_soumissions': stats_generales[2] if stats_generales else 0,
+        'ca_total': round(stats_generales[3], 2) if stats_generales[3] else 0,
+        'top_entrepreneurs': resultats['top_entrepreneurs'],
+        'evolution_projets': resultats['evolution_projets'],
+        'evolution_soumissions': resultats['evolution_soumissions']
+    }
+
+def get_stats_admin() -> Dict:
+    """Récupère les statistiques globales de la plateforme"""
+    return _assembler_stats_admin(charger_en_parallele(LECTURES_STATS_ADMIN, DATABASE_PATH))
+
+def get_tableau_de_bord_admin(limite_demandes: int = 10) -> Dict:
+    """Statistiques globales, statistiques des services et dernières demandes de la vue d'ensemble, lues en parallèle"""
+    assurer_demandes_services()
+    resultats = charger_en_parallele({
+        **LECTURES_STATS_ADMIN,
+        'stats_services': lire_stats_services,
+        'demandes_recentes': lambda conn: lire_demandes_services(conn, limite=limite_demandes),
+    }, DATABASE_PATH)
+    return {
+        'stats': _assembler_stats_admin(resultats),
+        'stats_services': resultats['stats_services'],
+        'demandes_recentes': resultats['demandes_recentes']
+    }
+
+# === FONCTIONS POUR SERVICE D'ESTIMATION ===
+
+def creer_demande_estimation(estimation_data: Dict) -> bool:
+    """Crée une nouvelle demande d'estimation"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Générer un numéro de référence unique
+        numero_reference = f"SEAOP-EST-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
+        
+        cursor.execute('''
+            INSERT INTO estimations (
+                nom_client, email_client, telephone_client, adresse_client,
+                type_projet, description_detaillee, surface_approximative,
+                budget_approximatif, delai_souhaite, plans_client, photos_client,
+                documents_client, prix_estimation, numero_reference
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            estimation_data['nom_client'],
+            estimation_data['email_client'],
+            estimation_data['telephone_client'],
+            estimation_data.get('adresse_client', ''),
+            estimation_data['type_projet'],
+            estimation_data['description_detaillee'],
+            estimation_data.get('surface_approximative', ''),
+            estimation_data.get('budget_approximatif', ''),
+            estimation_data.get('delai_souhaite', ''),
+            estimation_data.get('plans_client', ''),
+            estimation_data.get('photos_client', ''),
+            estimation_data.get('documents_client', ''),
+            estimation_data.get('prix_estimation', 0.0),
+            numero_reference
+        ))
+        
+        estimation_id = cursor.lastrowid
+        
+        # Créer une notification admin
+        cursor.execute('''
+            INSERT INTO notifications (
+                utilisateur_type, utilisateur_id, type_notification,
+                titre, message, lien_id
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            'admin', 0, 'nouvelle_estimation',
+            'Nouvelle demande d\'estimation',
+            f'{estimation_data["nom_client"]} a demandé une estimation pour {estimation_data["type_projet"]}',
+            estimation_id
+        ))
+        
+        conn.commit()
+        return True
+        
+    except Exception as e:
+        print(f"Erreur lors de la création de l'estimation: {e}")
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+def get_estimations_admin() -> List[Dict]:
+    """Récupère toutes les estimations pour l'admin"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT id, nom_client, email_client, telephone_client, type_projet,
+               description_detaillee, budget_approximatif, prix_estimation,
+               statut, date_demande, numero_reference, notes_internes,
+               plans_client, photos_client, documents_client
+        FROM estimations
+        ORDER BY date_demande DESC
+    ''')
+    
+    estimations = []
+    for row in cursor.fetchall():
+        estimations.append({
+            'id': row[0],
+            'nom_client': row[1],
+            'email_client': row[2],
+            'telephone_client': row[3],
+            'type_projet': row[4],
+            'description_detaillee': row[5],
+            'budget_approximatif': row[6],
+            'prix_estimation': row[7],
+            'statut': row[8],
+            'date_demande': row[9],
+            'numero_reference': row[10],
+            'notes_internes': row[11],
+            'plans_client': row[12],
+            'photos_client': row[13],
+            'documents_client': row[14]
+        })
+    
+    conn.close()
+    return estimations
+
+def get_stats_estimations() -> Dict:
+    """Récupère les statistiques des estimations depuis l'agrégat des services"""
+    stats = get_stats_services()['estimation']
+    par_statut = stats['par_statut']
+    return {
+        'total': stats['total'],
+        'recues': par_statut.get('recue', {}).get('nombre', 0),
+        'en_cours': par_statut.get('en_cours', {}).get('nombre', 0),
+        'envoyees': par_statut.get('envoyee', {}).get('nombre', 0),
+        'ca_estimations': stats['ca_total']
+    }
+
+def get_fichiers_client_estimation(estimation_id: int) -> Dict:
+    """Récupère les fichiers fournis par le client pour une estimation (chargés à la demande)"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT plans_client, photos_client, documents_client
+        FROM estimations WHERE id = ?
+    ''', (estimation_id,))
+    row = cursor.fetchone()
+    conn.close()
+
+    if not row:
+        return {'plans_client': '', 'photos_client': '', 'documents_client': ''}
+
+    return {
+        'plans_client': row[0],
+        'photos_client': row[1],
+        'documents_client': row[2]
+    }
+
+def get_estimation_by_id(estimation_id: int) -> Optional[Dict]:
+    """Récupère une estimation par son ID"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT * FROM estimations WHERE id = ?
+    ''', (estimation_id,))
+    
+    row = cursor.fetchone()
+    if not row:
+        conn.close()
+        return None
+    
+    # Mapper toutes les colonnes
+    columns = [description[0] for description in cursor.description]
+    estimation = dict(zip(columns, row))
+    
+    conn.close()
+    return estimation
+
+def get_estimations_client(email_client: str) -> List[Dict]:
+    """Récupère les estimations d'un client par email"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT id, type_projet, description_detaillee, prix_estimation,
+               statut, date_demande, numero_reference, 
+               date_estimation_terminee, date_envoi_client
+        FROM estimations
+        WHERE email_client = ?
+        ORDER BY date_demande DESC
+    ''', (email_client,))
+    
+    estimations = []
+    for row in cursor.fetchall():
+        estimations.append({
+            'id': row[0],
+            'type_projet': row[1],
+            'description_detaillee': row[2],
+            'prix_estimation': row[3],
+            'statut': row[4],
+            'date_demande': row[5],
+            'numero_reference': row[6],
+            'date_estimation_terminee': row[7],
+            'date_envoi_client': row[8]
+        })
+    
+    conn.close()
+    return estimations
+
+def mettre_a_jour_statut_estimation(estimation_id: int, nouveau_statut: str, notes_internes: str = None) -> bool:
+    """Met à jour le statut d'une estimation"""
+    return mettre_a_jour_statut_demande('estimation', estimation_id, nouveau_statut, notes_internes)
+
+def ajouter_documents_estimation(estimation_id: int, estimation_doc: str = None, facture_doc: str = None, annexes: str = None) -> bool:
+    """Ajoute les documents d'estimation et facture"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        updates = []
+        params = []
+        
+        if estimation_doc:
+            updates.append('estimation_document = ?')
+            params.append(estimation_doc)
+        
+        if facture_doc:
+            updates.append('facture_document = ?')
+            params.append(facture_doc)
+        
+        if annexes:
+            updates.append('documents_annexes = ?')
+            params.append(annexes)
+        
+        if updates:
+            updates.append('statut = ?')
+            params.append('envoyee')
+            updates.append('date_envoi_client = ?')
+            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            params.append(estimation_id)
+            
+            cursor.execute(f'''
+                UPDATE estimations 
+                SET {', '.join(updates)}
+                WHERE id = ?
+            ''', params)
+        
+        conn.commit()
+        return True
+        
+    except Exception as e:
+        print(f"Erreur lors de l'ajout des documents: {e}")
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+def formater_date_affichage(date_value) -> str:
+    """Formate une date pour l'affichage, gère différents types de données"""
+    if not date_value:
+        return "N/A"
+    
+    try:
+        if isinstance(date_value, str):
+            # Si c'est déjà une chaîne, vérifier si elle est valide
+            if len(date_value) >= 10 and date_value[:4].isdigit():
+                return date_value[:10]
+            else:
+                return "N/A"
+        elif isinstance(date_value, (int, float)):
+            # Si c'est un timestamp, le convertir
+            import datetime
+            
+            # Vérifier si le timestamp est raisonnable
+            if date_value <= 0:
+                return "N/A"
+            
+            # Si le timestamp semble être en millisecondes, le convertir
+            if date_value > 1e10:  # Plus grand que 1970 en secondes
+                date_value = date_value / 1000
+            
+            # Vérifier que le timestamp donne une date raisonnable (après 1990)
+            timestamp_1990 = datetime.datetime(1990, 1, 1).timestamp()
+            if date_value < timestamp_1990:
+                return "N/A"
+            
+            return datetime.datetime.fromtimestamp(date_value).strftime('%Y-%m-%d')
+        else:
+            # Autre type, convertir en string et prendre les 10 premiers caractères
+            str_value = str(date_value)[:10]
+            # Vérifier si ça ressemble à une date
+            if len(str_value) >= 4 and str_value[:4].isdigit():
+                return str_value
+            else:
+                return "N/A"
+    except:
+        return "N/A"
+
+# Fonctions de recherche et filtrage
+def filtrer_projets_pour_entrepreneurs(
+    type_projet: str = None,
+    budget_min: float = None,
+    budget_max: float = None,
+    code_postal: str = None,
+    delai_max: str = None,
+    recherche_texte: str = None,
+    rayon_km: float = None,
+    code_postal_origine: str = None
+) -> List[Dict]:
+    """Filtre les projets disponibles selon les critères"""
+    # Recherche par rayon : RTA retenues par la grille de centroïdes, avec leur distance
+    distances = None
+    if rayon_km and code_postal_origine:
+        distances = rta_dans_rayon(code_postal_origine, rayon_km) or {}
+        if not distances:
+            return []
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Construction de la requête dynamique (colonnes nommées : leur position dépend des migrations)
+    query = '''
+        SELECT l.id, l.nom, l.email, l.telephone, l.code_postal, l.type_projet, l.description,
+               l.budget, l.delai_realisation, l.photos, l.plans, l.documents, l.date_creation,
+               l.statut, l.numero_reference, l.visible_entrepreneurs, l.accepte_soumissions,
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions,
+               l.niveau_urgence
+        FROM leads l
+        WHERE l.visible_entrepreneurs = 1 AND l.accepte_soumissions = 1
+    '''
+    params = []
+    
+    if type_projet and type_projet != "Tous":
+        query += " AND l.type_projet = ?"
+        params.append(type_projet)
+    
+    if budget_min is not None:
+        # Extraire le montant numérique du budget (format: "10 000 - 25 000 $")
+        query += " AND CAST(REPLACE(REPLACE(SUBSTR(l.budget, 1, INSTR(l.budget, ' ') - 1), ' ', ''), '$', '') AS INTEGER) >= ?"
+        params.append(budget_min)
+    
+    if budget_max is not None:
+        query += " AND CAST(REPLACE(REPLACE(SUBSTR(l.budget, 1, INSTR(l.budget, ' ') - 1), ' ', ''), '$', '') AS INTEGER) <= ?"
+        params.append(budget_max)
+    
+    if code_postal:
+        query += " AND l.code_postal LIKE ?"
+        params.append(f"{code_postal}%")
+    
+    if distances is not None:
+        query += f" AND {EXPRESSION_RTA_LEAD} IN ({', '.join('?' * len(distances))})"
+        params.extend(distances)
+    
+    if recherche_texte:
+        query += " AND (l.description LIKE ? OR l.type_projet LIKE ? OR l.nom LIKE ?)"
+        params.extend([f"%{recherche_texte}%", f"%{recherche_texte}%", f"%{recherche_texte}%"])
+    
+    query += " ORDER BY l.date_creation DESC"
+    
+    cursor.execute(query, params)
+    
+    projets = []
+    for row in cursor.fetchall():
+        projets.append({
+            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
+            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
+            'budget': row[7], 'delai_realisation': row[8], 'photos': row[9],
+            'plans': row[10], 'documents': row[11], 'date_creation': row[12],
+            'statut': row[13], 'numero_reference': row[14],
+            'visible_entrepreneurs': row[15], 'accepte_soumissions': row[16],
+            'nb_soumissions': row[17], 'niveau_urgence': row[18]
+        })
+        if distances is not None:
+            projets[-1]['distance_km'] = distances.get(normaliser_rta(row[4]))
+    
+    conn.close()
+    return projets
+
+# Nombre de projets affichés lorsque le fil est trié par pertinence
+NOMBRE_PROJETS_PERTINENTS = 50
+
+# Projets similaires proposés par soumission
+NOMBRE_PROJETS_SIMILAIRES = 3
+
+def trier_projets_pour_entrepreneur(projets: List[Dict], tri: str, entrepreneur: Entrepreneur) -> List[Dict]:
+    """Trie le fil de projets ; « Pertinence » ne garde que les projets les mieux classés pour l'entrepreneur"""
+    if tri == "Pertinence":
+        par_id = {projet['id']: projet for projet in projets}
+        classement = classer_projets(
+            entrepreneur.zones_desservies, entrepreneur.types_projets,
+            ids_candidats=list(par_id), k=NOMBRE_PROJETS_PERTINENTS
+        )
+        resultat = []
+        for projet_id, score in classement:
+            projet = par_id[projet_id]
+            if score is not None:
+                projet['score_pertinence'] = score
+            resultat.append(projet)
+        return resultat
+    elif tri == "Date (plus ancien)":
+        return sorted(projets, key=lambda p: p['date_creation'] or '')
+    elif tri == "Budget (croissant)":
+        return sorted(projets, key=lambda p: extraire_budget_minimum(p['budget']))
+    elif tri == "Budget (décroissant)":
+        return sorted(projets, key=lambda p: extraire_budget_minimum(p['budget']), reverse=True)
+    elif tri == "Nb soumissions":
+        return sorted(projets, key=lambda p: p['nb_soumissions'], reverse=True)
+    elif tri == "Distance":
+        return sorted(projets, key=lambda p: p.get('distance_km', float('inf')))
+    return projets
+
+def get_projets_similaires_ouverts(lead_ids: List[int], exclure_ids: List[int] = (), k: int = NOMBRE_PROJETS_SIMILAIRES) -> List[Dict]:
+    """Projets ouverts les plus proches (TF-IDF) des projets donnés, avec leur similarité"""
+    similaires = projets_similaires(lead_ids, k=k, ids_candidats=get_matrice_projets().ids, exclure_ids=exclure_ids)
+    if not similaires:
+        return []
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT id, type_projet, code_postal, budget, numero_reference FROM leads
+        WHERE id IN ({', '.join('?' * len(similaires))})
+    ''', [projet_id for projet_id, _ in similaires])
+    par_id = {row['id']: dict(row) for row in cursor.fetchall()}
+    conn.close()
+    return [dict(par_id[projet_id], similarite=score) for projet_id, score in similaires if projet_id in par_id]
+
+def filtrer_mes_projets(
+    email: str,
+    statut: str = None,
+    periode: str = None,
+    type_projet: str = None,
+    recherche_texte: str = None
+) -> List[Dict]:
+    """Filtre les projets d'un client selon les critères"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    query = '''
+        SELECT l.*,
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions,
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id AND s.statut = 'acceptee') as nb_acceptees
+        FROM leads l
+        WHERE l.email = ?
+    '''
+    params = [email]
+    
+    if statut and statut != "Tous":
+        if statut == "Avec soumissions":
+            query += " AND (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) > 0"
+        elif statut == "Sans soumissions":
+            query += " AND (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) = 0"
+        elif statut == "Projet terminé":
+            query += " AND (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id AND s.statut = 'acceptee') > 0"
+    
+    if periode and periode != "Toutes":
+        if periode == "Cette semaine":
+            query += " AND l.date_creation >= date('now', '-7 days')"
+        elif periode == "Ce mois":
+            query += " AND l.date_creation >= date('now', 'start of month')"
+        elif periode == "Ce trimestre":
+            query += " AND l.date_creation >= date('now', '-3 months')"
+    
+    if type_projet and type_projet != "Tous":
+        query += " AND l.type_projet = ?"
+        params.append(type_projet)
+    
+    if recherche_texte:
+        query += " AND (l.description LIKE ? OR l.type_projet LIKE ? OR l.numero_reference LIKE ?)"
+        params.extend([f"%{recherche_texte}%", f"%{recherche_texte}%", f"%{recherche_texte}%"])
+    
+    query += " ORDER BY l.date_creation DESC"
+    
+    cursor.execute(query, params)
+    
+    projets = []
+    for row in cursor.fetchall():
+        projets.append({
+            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
+            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
+            'budget': row[7], 'delai_realisation': row[8], 
+            'date_limite_soumissions': row[9], 'date_debut_souhaite': row[10], 'niveau_urgence': row[11],
+            'photos': row[12], 'plans': row[13], 'documents': row[14], 
+            'date_creation': row[15], 'statut': row[16], 'numero_reference': row[17],
+            'visible_entrepreneurs': row[18], 'accepte_soumissions': row[19],
+            'nb_soumissions': int(row[20]) if row[20] is not None else 0, 
+            'nb_acceptees': int(row[21]) if row[21] is not None else 0
+        })
+    
+    conn.close()
+    return projets
+
+def filtrer_soumissions_entrepreneur(
+    entrepreneur_id: int,
+    statut: str = None,
+    periode: str = None,
+    montant_min: float = None,
+    montant_max: float = None
+) -> List[Dict]:
+    """Filtre les soumissions d'un entrepreneur"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    query = '''
+        SELECT s.*, l.type_projet, l.nom as nom_client, l.numero_reference
+        FROM soumissions s
+        JOIN leads l ON s.lead_id = l.id
+        WHERE s.entrepreneur_id = ?
+    '''
+    params = [entrepreneur_id]
+    
+    if statut and statut != "Tous":
+        query += " AND s.statut = ?"
+        params.append(statut)
+    
+    if periode and periode != "Toutes":
+        if periode == "Ce mois":
+            query += " AND s.date_creation >= date('now', 'start of month')"
+        elif periode == "Ce trimestre":
+            query += " AND s.date_creation >= date('now', '-3 months')"
+        elif periode == "Cette année":
+            query += " AND s.date_creation >= date('now', 'start of year')"
+    
+    if montant_min is not None:
+        query += " AND s.montant >= ?"
+        params.append(montant_min)
+    
+    if montant_max is not None:
+        query += " AND s.montant <= ?"
+        params.append(montant_max)
+    
+    query += " ORDER BY s.date_creation DESC"
+    
+    cursor.execute(query, params)
+    
+    soumissions = []
+    for row in cursor.fetchall():
+        soumissions.append({
+            'id': row[0], 'lead_id': row[1], 'entrepreneur_id': row[2],
+            'montant': row[3], 'description_travaux': row[4], 'delai_execution': row[5],
+            'validite_offre': row[6], 'inclusions': row[7], 'exclusions': row[8],
+            'conditions': row[9], 'documents': row[10], 'statut': row[11],
+            'date_creation': row[12], 'type_projet': row[14],
+            'nom_client': row[15], 'numero_reference': row[16]
+        })
+    
+    conn.close()
+    return soumissions
+
+def get_soumissions_pour_projet(lead_id: int) -> List[Dict]:
+    """Récupère toutes les soumissions pour un projet"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Colonnes nommées : la position de celles de s.* dépend des migrations
+    cursor.execute('''
+        SELECT s.id, s.lead_id, s.entrepreneur_id, s.montant, s.description_travaux, s.delai_execution,
+               s.validite_offre, s.inclusions, s.exclusions, s.conditions, s.documents, s.statut,
+               s.date_creation, e.nom_entreprise, e.numero_rbq, e.certifications,
+               COALESCE(AVG(ev.note), 0) as note_moyenne,
+               COUNT(ev.note) as nombre_evaluations
+        FROM soumissions s
+        JOIN entrepreneurs e ON s.entrepreneur_id = e.id
+        LEFT JOIN soumissions s2 ON s2.entrepreneur_id = e.id
+        LEFT JOIN evaluations ev ON ev.soumission_id = s2.id AND ev.evaluateur_type = 'client'
+        WHERE s.lead_id = ?
+        GROUP BY s.id, e.nom_entreprise, e.numero_rbq, e.certifications
+        ORDER BY s.date_creation DESC
+    ''', (lead_id,))
+    
+    soumissions = []
+    for row in cursor.fetchall():
+        soumissions.append({
+            'id': row[0],
+            'lead_id': row[1],
+            'entrepreneur_id': row[2],
+            'montant': row[3],
+            'description_travaux': row[4],
+            'delai_execution': row[5],
+            'validite_offre': row[6],
+            'inclusions': row[7],
+            'exclusions': row[8],
+            'conditions': row[9],
+            'documents': row[10],
+            'statut': row[11],
+            'date_creation': row[12],
+            'nom_entreprise': row[13],
+            'numero_rbq': row[14],
+            'certifications': row[15],
+            'evaluations_moyenne': round(row[16], 1) if row[16] else 0,
+            'nombre_evaluations': row[17]
+        })
+    
+    conn.close()
+    return soumissions
+
+def get_mes_projets(email: str) -> List[Dict]:
+    """Récupère les projets d'un client par email"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT l.*,
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions,
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id AND s.statut = 'acceptee') as nb_acceptees
+        FROM leads l
+        WHERE l.email = ?
+        ORDER BY l.date_creation DESC
+    ''', (email,))
+    
+    projets = []
+    for row in cursor.fetchall():
+        projets.append({
+            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
+            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
+            'budget': row[7], 'delai_realisation': row[8], 
+            'date_limite_soumissions': row[9], 'date_debut_souhaite': row[10], 'niveau_urgence': row[11],
+            'photos': row[12], 'plans': row[13], 'documents': row[14], 
+            'date_creation': row[15], 'statut': row[16], 'numero_reference': row[17],
+            'visible_entrepreneurs': row[18], 'accepte_soumissions': row[19],
+            'nb_soumissions': int(row[20]) if row[20] is not None else 0, 
+            'nb_acceptees': int(row[21]) if row[21] is not None else 0
+        })
+    
+    conn.close()
+    return projets
+
+# ================== SYSTÈME DE DÉLAIS/URGENCE ==================
+
+def calculer_jours_restants(date_limite: str) -> int:
+    """Calcule le nombre de jours restants jusqu'à une date limite"""
+    if not date_limite:
+        return 999  # Pas de limite définie
+    
+    try:
+        date_limite_obj = datetime.datetime.strptime(date_limite, '%Y-%m-%d').date()
+        aujourd_hui = datetime.date.today()
+        jours_restants = (date_limite_obj - aujourd_hui).days
+        return jours_restants
+    except:
+        return 999
+
+def determiner_niveau_urgence_automatique(date_limite_soumissions: str, date_debut_souhaite: str) -> str:
+    """Détermine automatiquement le niveau d'urgence basé sur les délais"""
+    jours_soumissions = calculer_jours_restants(date_limite_soumissions)
+    jours_debut = calculer_jours_restants(date_debut_souhaite)
+    
+    # Urgence basée sur les délais les plus courts
+    jours_min = min(jours_soumissions, jours_debut)
+    
+    if jours_min < 0:
+        return 'critique'  # Échéance dépassée
+    elif jours_min <= 3:
+        return 'critique'  # Moins de 3 jours
+    elif jours_min <= 7:
+        return 'eleve'     # Moins d'une semaine
+    elif jours_min <= 14:
+        return 'normal'    # Moins de 2 semaines
+    else:
+        return 'faible'    # Plus de 2 semaines
+
+def get_couleur_urgence(niveau_urgence: str) -> tuple:
+    """Retourne la couleur et l'icône pour un niveau d'urgence"""
+    couleurs = {
+        'faible': ('🟢', '#28a745', 'Faible'),
+        'normal': ('🟡', '#ffc107', 'Normal'),
+        'eleve': ('🟠', '#fd7e14', 'Élevé'),
+        'critique': ('🔴', '#dc3545', 'Critique')
+    }
+    return couleurs.get(niveau_urgence, couleurs['normal'])
+
+def get_message_urgence(niveau_urgence: str, jours_restants: int) -> str:
+    """Génère un message d'urgence approprié"""
+    if niveau_urgence == 'critique':
+        if jours_restants < 0:
+            return f"⚠️ ÉCHÉANCE DÉPASSÉE de {abs(jours_restants)} jour(s) !"
+        else:
+            return f"🚨 URGENT - Plus que {jours_restants} jour(s) !"
+    elif niveau_urgence == 'eleve':
+        return f"⚡ PRIORITAIRE - {jours_restants} jour(s) restant(s)"
+    elif niveau_urgence == 'normal':
+        return f"📅 {jours_restants} jour(s) restant(s)"
+    else:
+        return f"✅ {jours_restants} jour(s) - Délai confortable"
+
+def mettre_a_jour_urgence_projet(projet_id: int):
+    """Met à jour automatiquement le niveau d'urgence d'un projet"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Récupérer les dates du projet
+    cursor.execute('''
+        SELECT date_limite_soumissions, date_debut_souhaite, niveau_urgence
+        FROM leads WHERE id = ?
+    ''', (projet_id,))
+    
+    result = cursor.fetchone()
+    if result:
+        date_limite_soumissions, date_debut_souhaite, niveau_actuel = result
+        
+        # Calculer le nouveau niveau d'urgence
+        nouveau_niveau = determiner_niveau_urgence_automatique(date_limite_soumissions, date_debut_souhaite)
+        
+        # Mettre à jour seulement si le niveau a changé, sans attendre la validation :
+        # les mises à jour d'une liste de projets sont validées ensemble par l'écrivain
+        if nouveau_niveau != niveau_actuel:
+            ecrire(_changer_urgence_projet, projet_id, niveau_actuel, nouveau_niveau, chemin=DATABASE_PATH)
+    
+    conn.close()
+
+def actualiser_urgences_projets(chemin: Optional[str] = None) -> int:
+    """Réévalue en une lecture l'urgence des projets ouverts ; retourne le nombre de niveaux changés"""
+    chemin = chemin or DATABASE_PATH
+    conn = sqlite3.connect(chemin)
+    try:
+        projets = conn.execute('''
+            SELECT id, date_limite_soumissions, date_debut_souhaite, niveau_urgence
+            FROM leads WHERE visible_entrepreneurs = 1 AND accepte_soumissions = 1
+        ''').fetchall()
+    finally:
+        conn.close()
+
+    changements = []
+    for projet_id, date_limite_soumissions, date_debut_souhaite, niveau_actuel in projets:
+        nouveau_niveau = determiner_niveau_urgence_automatique(date_limite_soumissions, date_debut_souhaite)
+        if nouveau_niveau != niveau_actuel:
+            changements.append(ecrire(_changer_urgence_projet, projet_id, niveau_actuel, nouveau_niveau, chemin=chemin))
+    # Validés ensemble par l'écrivain ; attendus pour que la lecture suivante les voie
+    for changement in changements:
+        changement.result()
+    return len(changements)
+
+def _changer_urgence_projet(cursor: sqlite3.Cursor, projet_id: int, niveau_actuel: str, nouveau_niveau: str):
+    """Opération d'écriture : nouveau niveau d'urgence, notifications si l'urgence augmente"""
+    # Le niveau a pu être changé par une autre session depuis la lecture
+    cursor.execute('''
+        UPDATE leads SET niveau_urgence = ? WHERE id = ? AND niveau_urgence IS ?
+    ''', (nouveau_niveau, projet_id, niveau_actuel))
+    
+    # Créer une notification si l'urgence augmente
+    if cursor.rowcount and niveau_actuel in ['faible', 'normal'] and nouveau_niveau in ['eleve', 'critique']:
+        _inserer_notifications_urgence(cursor, projet_id, nouveau_niveau)
+
+def notifier_urgence_projet(projet_id: int, niveau_urgence: str):
+    """Crée des notifications d'urgence pour un projet"""
+    executer_ecriture(_inserer_notifications_urgence, projet_id, niveau_urgence, chemin=DATABASE_PATH)
+
+def _inserer_notifications_urgence(cursor: sqlite3.Cursor, projet_id: int, niveau_urgence: str):
+    """Opération d'écriture : notifications d'urgence au client et aux entrepreneurs soumissionnaires"""
+    # Récupérer les infos du projet
+    cursor.execute('''
+        SELECT nom, email, type_projet, numero_reference, date_limite_soumissions
+        FROM leads WHERE id = ?
+    ''', (projet_id,))
+    
+    projet = cursor.fetchone()
+    if not projet:
+        return
+    
+    nom_client, email_client, type_projet, numero_ref, date_limite = projet
+    jours_restants = calculer_jours_restants(date_limite)
+    
+    # Message selon le niveau d'urgence
+    if niveau_urgence == 'critique':
+        titre = f"🚨 URGENT - Projet {numero_ref}"
+        message = f"Le projet '{type_projet}' arrive à échéance dans {jours_restants} jour(s) !"
+    else:
+        titre = f"⚡ PRIORITAIRE - Projet {numero_ref}"
+        message = f"Le projet '{type_projet}' nécessite une attention prioritaire"
+    
+    # Notifier le client
+    cursor.execute('''
+        INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, 
+                                 titre, message, lien_id)
+        VALUES ('client', ?, 'urgence_projet', ?, ?, ?)
+    ''', (projet_id, titre, message, projet_id))
+    
+    # Notifier tous les entrepreneurs qui ont soumissionné
+    cursor.execute('''
+        SELECT DISTINCT entrepreneur_id FROM soumissions WHERE lead_id = ?
+    ''', (projet_id,))
+    
+    entrepreneurs = cursor.fetchall()
+    for (entrepreneur_id,) in entrepreneurs:
+        cursor.execute('''
+            INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, 
+                                     titre, message, lien_id)
+            VALUES ('entrepreneur', ?, 'urgence_projet', ?, ?, ?)
+        ''', (entrepreneur_id, titre, f"Projet urgent : {message}", projet_id))
+
+def get_projets_par_urgence() -> Dict[str, List[Dict]]:
+    """Récupère tous les projets groupés par niveau d'urgence"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT l.*, 
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions,
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id AND s.statut = 'acceptee') as nb_acceptees
+        FROM leads l
+        WHERE l.visible_entrepreneurs = 1 AND l.accepte_soumissions = 1
+        ORDER BY 
+            CASE l.niveau_urgence 
+                WHEN 'critique' THEN 1 
+                WHEN 'eleve' THEN 2 
+                WHEN 'normal' THEN 3 
+                WHEN 'faible' THEN 4 
+            END,
+            l.date_limite_soumissions ASC
+    ''')
+    
+    projets_par_urgence = {
+        'critique': [],
+        'eleve': [],
+        'normal': [],
+        'faible': []
+    }
+    
+    for row in cursor.fetchall():
+        projet = {
+            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
+            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
+            'budget': row[7], 'delai_realisation': row[8], 
+            'date_limite_soumissions': row[9], 'date_debut_souhaite': row[10], 'niveau_urgence': row[11],
+            'photos': row[12], 'plans': row[13], 'documents': row[14], 
+            'date_creation': row[15], 'statut': row[16], 'numero_reference': row[17],
+            'visible_entrepreneurs': row[18], 'accepte_soumissions': row[19],
+            'nb_soumissions': int(row[20]) if row[20] is not None else 0, 
+            'nb_acceptees': int(row[21]) if row[21] is not None else 0
+        }
+        
+        # Calculer les jours restants
+        projet['jours_restants_soumissions'] = calculer_jours_restants(projet['date_limite_soumissions'])
+        projet['jours_restants_debut'] = calculer_jours_restants(projet['date_debut_souhaite'])
+        
+        # Mettre à jour l'urgence automatiquement
+        mettre_a_jour_urgence_projet(projet['id'])
+        
+        niveau = projet['niveau_urgence']
+        if niveau in projets_par_urgence:
+            projets_par_urgence[niveau].append(projet)
+    
+    conn.close()
+    return projets_par_urgence
+
+# === FONCTIONS POUR SERVICE D'ARCHITECTURE ===
+
+def verifier_et_creer_table_architecture():
+    """Vérifie si la table architecture existe, sinon la crée"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Vérifier si la table existe
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='demandes_architecture'")
+        if not cursor.fetchone():
+            print("Création de la table demandes_architecture...")
+            
+            # Créer la table notifications si elle n'existe pas
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS notifications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    utilisateur_type TEXT NOT NULL,
+                    utilisateur_id INTEGER NOT NULL,
+                    type_notification TEXT NOT NULL,
+                    titre TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    lien_id INTEGER,
+                    lu BOOLEAN DEFAULT 0,
+                    date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Créer la table demandes_architecture
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS demandes_architecture (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nom_client TEXT NOT NULL,
+                    email_client TEXT NOT NULL,
+                    telephone_client TEXT NOT NULL,
+                    adresse_projet TEXT NOT NULL,
+                    ville TEXT NOT NULL,
+                    code_postal TEXT NOT NULL,
+                    type_batiment TEXT NOT NULL,
+                    usage_batiment TEXT NOT NULL,
+                    superficie_terrain REAL,
+                    superficie_batiment REAL NOT NULL,
+                    nombre_etages INTEGER DEFAULT 1,
+                    nombre_logements INTEGER,
+                    type_construction TEXT,
+                    style_architectural TEXT,
+                    contraintes_terrain TEXT,
+                    exigences_speciales TEXT,
+                    plans_requis TEXT NOT NULL,
+                    services_inclus TEXT,
+                    besoin_3d BOOLEAN DEFAULT 0,
+                    besoin_permis BOOLEAN DEFAULT 1,
+                    certificat_localisation TEXT,
+                    photos_terrain TEXT,
+                    croquis_client TEXT,
+                    documents_urbanisme TEXT,
+                    budget_construction TEXT,
+                    budget_architecture TEXT,
+                    date_debut_souhaite DATE,
+                    date_livraison_plans DATE,
+                    niveau_urgence TEXT DEFAULT 'normal',
+                    architecte_assigne TEXT,
+                    numero_oaq TEXT,
+                    plans_preliminaires TEXT,
+                    plans_finaux TEXT,
+                    devis_architecture TEXT,
+                    rapport_urbanisme TEXT,
+                    estimation_couts_construction TEXT,
+                    prix_service REAL,
+                    modalite_paiement TEXT,
+                    pourcentage_complete INTEGER DEFAULT 0,
+                    statut TEXT DEFAULT 'recue',
+                    notes_internes TEXT,
+                    commentaires_client TEXT,
+                    raison_refus TEXT,
+                    date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    date_analyse TIMESTAMP,
+                    date_acceptation TIMESTAMP,
+                    date_debut_plans TIMESTAMP,
+                    date_revision TIMESTAMP,
+                    date_approbation TIMESTAMP,
+                    date_livraison TIMESTAMP,
+                    date_paiement TIMESTAMP,
+                    numero_reference TEXT UNIQUE,
+                    numero_projet_architecte TEXT,
+                    lead_id INTEGER,
+                    conforme_zonage BOOLEAN,
+                    conforme_cnb BOOLEAN,
+                    validation_ingenieur BOOLEAN,
+                    validation_urbanisme BOOLEAN,
+                    FOREIGN KEY (lead_id) REFERENCES leads (id)
+                )
+            ''')
+            
+            # Créer les index
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_arch_statut ON demandes_architecture(statut)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_arch_client ON demandes_architecture(email_client)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_arch_date ON demandes_architecture(date_demande)')
+            
+            conn.commit()
+            print("Table demandes_architecture créée avec succès")
+            
+    except Exception as e:
+        print(f"Erreur lors de la création de la table architecture: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def verifier_et_creer_table_ingenieur():
+    """Vérifie si la table ingénieur existe, sinon la crée"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Vérifier si la table existe
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='demandes_ingenieur'")
+        if not cursor.fetchone():
+            print("Création de la table demandes_ingenieur...")
+            
+            # Créer la table demandes_ingenieur
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS demandes_ingenieur (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nom_client TEXT NOT NULL,
+                    email_client TEXT NOT NULL,
+                    telephone_client TEXT NOT NULL,
+                    adresse_projet TEXT NOT NULL,
+                    ville TEXT NOT NULL,
+                    code_postal TEXT NOT NULL,
+                    type_structure TEXT NOT NULL,
+                    type_batiment TEXT,
+                    usage_structure TEXT NOT NULL,
+                    superficie_projet REAL,
+                    hauteur_structure REAL,
+                    nombre_etages INTEGER DEFAULT 1,
+                    charge_exploitation TEXT,
+                    type_construction TEXT,
+                    sol_porteur TEXT,
+                    zone_sismique TEXT,
+                    contraintes_particulieres TEXT,
+                    normes_requises TEXT,
+                    services_demandes TEXT NOT NULL,
+                    calculs_requis TEXT,
+                    plans_requis TEXT,
+                    surveillance_chantier BOOLEAN DEFAULT 0,
+                    certification_requise BOOLEAN DEFAULT 1,
+                    plans_architecte TEXT,
+                    etude_sol TEXT,
+                    photos_existant TEXT,
+                    autres_documents TEXT,
+                    budget_structure TEXT,
+                    budget_ingenieur TEXT,
+                    date_debut_souhaite DATE,
+                    date_livraison_souhaite DATE,
+                    niveau_urgence TEXT DEFAULT 'normal',
+                    ingenieur_assigne TEXT,
+                    numero_oiq TEXT,
+                    calculs_structures TEXT,
+                    plans_structures TEXT,
+                    specifications_techniques TEXT,
+                    rapport_surveillance TEXT,
+                    certificat_conformite TEXT,
+                    prix_service REAL,
+                    modalite_paiement TEXT,
+                    taux_horaire REAL,
+                    pourcentage_complete INTEGER DEFAULT 0,
+                    statut TEXT DEFAULT 'recue',
+                    notes_internes TEXT,
+                    commentaires_client TEXT,
+                    raison_refus TEXT,
+                    date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    date_analyse TIMESTAMP,
+                    date_acceptation TIMESTAMP,
+                    date_debut_calculs TIMESTAMP,
+                    date_fin_calculs TIMESTAMP,
+                    date_debut_plans TIMESTAMP,
+                    date_fin_plans TIMESTAMP,
+                    date_livraison TIMESTAMP,
+                    date_paiement TIMESTAMP,
+                    numero_reference TEXT UNIQUE,
+                    numero_projet_ingenieur TEXT,
+                    lead_id INTEGER,
+                    demande_architecture_id INTEGER,
+                    conforme_cnb BOOLEAN,
+                    conforme_csa BOOLEAN,
+                    validation_pairs BOOLEAN,
+                    analyse_sismique BOOLEAN DEFAULT 0,
+                    analyse_vent BOOLEAN DEFAULT 0,
+                    analyse_neige BOOLEAN DEFAULT 0,
+                    analyse_dynamique BOOLEAN DEFAULT 0,
+                    modelisation_3d BOOLEAN DEFAULT 0,
+                    FOREIGN KEY (lead_id) REFERENCES leads (id),
+                    FOREIGN KEY (demande_architecture_id) REFERENCES demandes_architecture (id)
+                )
+            ''')
+            
+            # Créer les index
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ing_statut ON demandes_ingenieur(statut)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ing_client ON demandes_ingenieur(email_client)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ing_date ON demandes_ingenieur(date_demande)')
+            
+            conn.commit()
+            print("Table demandes_ingenieur créée avec succès")
+            
+    except Exception as e:
+        print(f"Erreur lors de la création de la table ingénieur: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def get_demandes_architecture_admin() -> List[Dict]:
+    """Récupère toutes les demandes d'architecture pour l'admin"""
+    # Vérifier et créer la table si nécessaire
+    verifier_et_creer_table_architecture()
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+            SELECT id, nom_client, email_client, telephone_client, ville, type_batiment,
+                   superficie_batiment, nombre_etages, budget_construction, prix_service,
+                   statut, date_demande, numero_reference, niveau_urgence, 
+                   pourcentage_complete, usage_batiment
+            FROM demandes_architecture
+            ORDER BY date_demande DESC
+        ''')
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            conn.close()
+            return []
+        else:
+            raise
+    
+    demandes = []
+    for row in cursor.fetchall():
+        demandes.append({
+            'id': row[0],
+            'nom_client': row[1],
+            'email_client': row[2],
+            'telephone_client': row[3],
+            'ville': row[4],
+            'type_batiment': row[5],
+            'superficie_batiment': row[6],
+            'nombre_etages': row[7],
+            'budget_construction': row[8],
+            'prix_service': row[9],
+            'statut': row[10],
+            'date_demande': row[11],
+            'numero_reference': row[12],
+            'niveau_urgence': row[13],
+            'pourcentage_complete': row[14],
+            'usage_batiment': row[15]
+        })
+    
+    conn.close()
+    return demandes
+
+def get_stats_architecture() -> Dict:
+    """Récupère les statistiques du service d'architecture"""
+    # Vérifier et créer la table si nécessaire
+    verifier_et_creer_table_architecture()
+    
+    stats = get_stats_services()['architecture']
+    return {
+        'total': stats['total'],
+        'en_cours': stats['en_cours'],
+        'superficie_moyenne': stats['superficie_moyenne'],
+        'ca_total': stats['ca_total']
+    }
+
+def mettre_a_jour_statut_architecture(demande_id: int, nouveau_statut: str, notes: str, pourcentage: int) -> bool:
+    """Met à jour le statut d'une demande d'architecture"""
+    return mettre_a_jour_statut_demande('architecture', demande_id, nouveau_statut, notes, pourcentage)
+
+# === FONCTIONS POUR SERVICE D'INGÉNIEUR ===
+
+def get_demandes_ingenieur_admin() -> List[Dict]:
+    """Récupère toutes les demandes d'ingénieur pour l'admin"""
+    # Vérifier et créer la table si nécessaire
+    verifier_et_creer_table_ingenieur()
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+            SELECT id, nom_client, email_client, telephone_client, ville, type_structure,
+                   superficie_projet, nombre_etages, budget_ingenieur, prix_service,
+                   statut, date_demande, numero_reference, niveau_urgence, 
+                   pourcentage_complete, usage_structure, type_construction, services_demandes
+            FROM demandes_ingenieur
+            ORDER BY date_demande DESC
+        ''')
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            conn.close()
+            return []
+        else:
+            raise
+    
+    demandes = []
+    for row in cursor.fetchall():
+        demandes.append({
+            'id': row[0],
+            'nom_client': row[1],
+            'email_client': row[2],
+            'telephone_client': row[3],
+            'ville': row[4],
+            'type_structure': row[5],
+            'superficie_projet': row[6],
+            'nombre_etages': row[7],
+            'budget_ingenieur': row[8],
+            'prix_service': row[9],
+            'statut': row[10],
+            'date_demande': row[11],
+            'numero_reference': row[12],
+            'niveau_urgence': row[13],
+            'pourcentage_complete': row[14],
+            'usage_structure': row[15],
+            'type_construction': row[16],
+            'services_demandes': row[17]
+        })
+    
+    conn.close()
+    return demandes
+
+def get_stats_ingenieur() -> Dict:
+    """Récupère les statistiques du service d'ingénieur"""
+    # Vérifier et créer la table si nécessaire
+    verifier_et_creer_table_ingenieur()
+    
+    stats = get_stats_services()['ingenieur']
+    return {
+        'total': stats['total'],
+        'en_cours': stats['en_cours'],
+        'superficie_moyenne': stats['superficie_moyenne'],
+        'ca_total': stats['ca_total']
+    }
+
+def mettre_a_jour_statut_ingenieur(demande_id: int, nouveau_statut: str, notes: str, pourcentage: int) -> bool:
+    """Met à jour le statut d'une demande d'ingénieur"""
+    return mettre_a_jour_statut_demande('ingenieur', demande_id, nouveau_statut, notes, pourcentage)
+
+# === FONCTIONS POUR SERVICE DE TECHNOLOGUE ===
+
+def calculer_prix_technologue(superficie: float, services: list, options: dict) -> float:
+    """Calcule le prix du service de technologue basé sur superficie et services"""
+    # Grille, services additionnels et options spéciales : voir moteur_tarification.TARIFS
+    options_actives = list(services) + [nom for nom, actif in options.items() if actif]
+    return calculer_prix('technologue', superficie, options_actives)
+
+def creer_demande_technologue(demande_data: Dict) -> str:
+    """Crée une nouvelle demande de plans de technologue"""
+    # Vérifier et créer la table si nécessaire
+    verifier_et_creer_table_technologue()
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Générer un numéro de référence unique
+        numero_reference = f"SEAOP-TECH-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
+        
+        # Calculer le prix estimé
+        superficie = float(demande_data.get('superficie_batiment', 0))
+        services = demande_data.get('services_inclus', '').split(',')
+        options = {
+            'modele_3d': demande_data.get('besoin_3d', False),
+            'visite_terrain': demande_data.get('visite_terrain', False),
+            'urgence_elevee': demande_data.get('niveau_urgence') == 'eleve'
+        }
+        
+        prix_service = calculer_prix_technologue(superficie, services, options)
+        
+        # Préparer les données avec le prix calculé
+        demande_data['numero_reference'] = numero_reference
+        demande_data['prix_service'] = prix_service
+        demande_data['date_demande'] = datetime.datetime.now().isoformat()
+        
+        # Insérer la demande
+        placeholders = ', '.join(['?' for _ in demande_data])
+        columns = ', '.join(demande_data.keys())
+        
+        cursor.execute(f'''
+            INSERT INTO demandes_technologue ({columns})
+            VALUES ({placeholders})
+        ''', list(demande_data.values()))
+        
+        demande_id = cursor.lastrowid
+        
+        # Créer une notification pour l'admin
+        cursor.execute('''
+            INSERT INTO notifications (
+                utilisateur_type, utilisateur_id, type_notification,
+                titre, message, lien_id
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            'admin', 0, 'nouvelle_demande_technologue',
+            'Nouvelle demande technologue',
+            f'{demande_data["nom_client"]} - {demande_data["type_batiment"]} de {superficie:,.0f} pi2',
+            demande_id
+        ))
+        
+        conn.commit()
+        return numero_reference
+        
+    except Exception as e:
+        print(f"Erreur lors de la création de la demande de technologue: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+def get_demandes_technologue_client(email_client: str) -> List[Dict]:
+    """Récupère les demandes de technologue d'un client"""
+    # Vérifier et créer la table si nécessaire
+    verifier_et_creer_table_technologue()
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+            SELECT id, type_batiment, usage_batiment, superficie_batiment,
+                   ville, prix_service, statut, date_demande, numero_reference,
+                   date_livraison_plans, pourcentage_complete, plans_finaux
+            FROM demandes_technologue
+            WHERE email_client = ?
+            ORDER BY date_demande DESC
+        ''', (email_client,))
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            conn.close()
+            return []
+        else:
+            raise
+    
+    demandes = []
+    for row in cursor.fetchall():
+        demandes.append({
+            'id': row[0],
+            'type_batiment': row[1],
+            'usage_batiment': row[2],
+            'superficie_batiment': row[3],
+            'ville': row[4],
+            'prix_service': row[5],
+            'statut': row[6],
+            'date_demande': row[7],
+            'numero_reference': row[8],
+            'date_livraison_plans': row[9],
+            'pourcentage_complete': row[10],
+            'plans_finaux': row[11]
+        })
+    
+    conn.close()
+    return demandes
+
+def verifier_et_creer_table_technologue():
+    """Vérifie si la table technologue existe, sinon la crée"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Vérifier si la table existe
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='demandes_technologue'")
+        if not cursor.fetchone():
+            print("Création de la table demandes_technologue...")
+            
+            # Créer la table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS demandes_technologue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nom_client TEXT NOT NULL,
+                    email_client TEXT NOT NULL,
+                    telephone_client TEXT NOT NULL,
+                    adresse_projet TEXT NOT NULL,
+                    ville TEXT NOT NULL,
+                    code_postal TEXT NOT NULL,
+                    type_batiment TEXT NOT NULL,
+                    usage_batiment TEXT NOT NULL,
+                    superficie_terrain REAL,
+                    superficie_batiment REAL NOT NULL,
+                    nombre_etages INTEGER DEFAULT 1,
+                    nombre_pieces INTEGER,
+                    type_construction TEXT,
+                    style_architectural TEXT,
+                    contraintes_terrain TEXT,
+                    exigences_speciales TEXT,
+                    plans_requis TEXT NOT NULL,
+                    services_inclus TEXT,
+                    besoin_3d BOOLEAN DEFAULT 0,
+                    besoin_permis BOOLEAN DEFAULT 1,
+                    visite_terrain BOOLEAN DEFAULT 0,
+                    certificat_localisation TEXT,
+                    photos_terrain TEXT,
+                    croquis_client TEXT,
+                    documents_existants TEXT,
+                    budget_construction TEXT,
+                    budget_technologue TEXT,
+                    date_debut_souhaite DATE,
+                    date_livraison_plans DATE,
+                    niveau_urgence TEXT DEFAULT 'normal',
+                    technologue_assigne TEXT,
+                    numero_otaq TEXT,
+                    plans_preliminaires TEXT,
+                    plans_finaux TEXT,
+                    devis_technique TEXT,
+                    rapport_conformite TEXT,
+                    estimation_couts TEXT,
+                    prix_service REAL,
+                    modalite_paiement TEXT,
+                    taux_horaire REAL,
+                    pourcentage_complete INTEGER DEFAULT 0,
+                    statut TEXT DEFAULT 'recue',
+                    notes_internes TEXT,
+                    commentaires_client TEXT,
+                    raison_refus TEXT,
+                    date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    date_analyse TIMESTAMP,
+                    date_acceptation TIMESTAMP,
+                    date_debut_plans TIMESTAMP,
+                    date_revision TIMESTAMP,
+                    date_livraison TIMESTAMP,
+                    date_paiement TIMESTAMP,
+                    numero_reference TEXT UNIQUE,
+                    numero_projet_technologue TEXT,
+                    lead_id INTEGER,
+                    conforme_zonage BOOLEAN,
+                    conforme_cnb BOOLEAN,
+                    conforme_municipal BOOLEAN,
+                    validation_technique BOOLEAN,
+                    plan_implantation BOOLEAN DEFAULT 1,
+                    plan_fondation BOOLEAN DEFAULT 1,
+                    plan_charpente BOOLEAN DEFAULT 1,
+                    plan_electricite BOOLEAN DEFAULT 0,
+                    plan_plomberie BOOLEAN DEFAULT 0,
+                    FOREIGN KEY (lead_id) REFERENCES leads (id)
+                )
+            ''')
+            
+            # Créer les index
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tech_statut ON demandes_technologue(statut)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tech_client ON demandes_technologue(email_client)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tech_date ON demandes_technologue(date_demande)')
+            
+            conn.commit()
+            print("Table demandes_technologue créée avec succès")
+            
+    except Exception as e:
+        print(f"Erreur lors de la création de la table technologue: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def get_demandes_technologue_admin() -> List[Dict]:
+    """Récupère toutes les demandes de technologue pour l'admin"""
+    # Vérifier et créer la table si nécessaire
+    verifier_et_creer_table_technologue()
+    
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+            SELECT id, nom_client, email_client, telephone_client, ville, type_batiment,
+                   superficie_batiment, nombre_etages, budget_technologue, prix_service,
+                   statut, date_demande, numero_reference, niveau_urgence, 
+                   pourcentage_complete, usage_batiment, type_construction, services_inclus
+            FROM demandes_technologue
+            ORDER BY date_demande DESC
+        ''')
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            # Table n'existe pas, retourner liste vide
+            conn.close()
+            return []
+        else:
+            raise
+    
+    demandes = []
+    for row in cursor.fetchall():
+        demandes.append({
+            'id': row[0],
+            'nom_client': row[1],
+            'email_client': row[2],
+            'telephone_client': row[3],
+            'ville': row[4],
+            'type_batiment': row[5],
+            'superficie_batiment': row[6],
+            'nombre_etages': row[7],
+            'budget_technologue': row[8],
+            'prix_service': row[9],
+            'statut': row[10],
+            'date_demande': row[11],
+            'numero_reference': row[12],
+            'niveau_urgence': row[13],
+            'pourcentage_complete': row[14],
+            'usage_batiment': row[15],
+            'type_construction': row[16],
+            'services_inclus': row[17]
+        })
+    
+    conn.close()
+    return demandes
+
+def get_stats_technologue() -> Dict:
+    """Récupère les statistiques du service de technologue"""
+    # Vérifier et créer la table si nécessaire
+    verifier_et_creer_table_technologue()
+    
+    stats = get_stats_services()['technologue']
+    return {
+        'total': stats['total'],
+        'en_cours': stats['en_cours'],
+        'superficie_moyenne': stats['superficie_moyenne'],
+        'ca_total': stats['ca_total']
+    }
+
+def mettre_a_jour_statut_technologue(demande_id: int, nouveau_statut: str, notes: str, pourcentage: int) -> bool:
+    """Met à jour le statut d'une demande de technologue"""
+    return mettre_a_jour_statut_demande('technologue', demande_id, nouveau_statut, notes, pourcentage)
+
+def creer_demande_architecture(demande_data: Dict) -> str:
+    """Crée une nouvelle demande de plans d'architecture"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Générer un numéro de référence unique
+        numero_reference = f"SEAOP-ARCH-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
+        
+        # Calculer le prix estimé basé sur la superficie
+        superficie = float(demande_data.get('superficie_batiment', 0))
+        
+        # Services inclus
+        services_inclus = [
+            service for service in ('structure', 'mecanique', 'electrique', 'civil')
+            if demande_data.get(f'inclure_{service}')
+        ]
+        
+        prix_estime = calculer_prix('architecture', superficie, services_inclus)
+        
+        services_str = ','.join(services_inclus) if services_inclus else ''
+        
+        cursor.execute('''
+            INSERT INTO demandes_architecture (
+                nom_client, email_client, telephone_client, adresse_projet,
+                ville, code_postal, type_batiment, usage_batiment,
+                superficie_terrain, superficie_batiment, nombre_etages,
+                nombre_logements, type_construction, style_architectural,
+                contraintes_terrain, exigences_speciales, plans_requis,
+                services_inclus, besoin_3d, besoin_permis,
+                certificat_localisation, photos_terrain, croquis_client,
+                budget_construction, budget_architecture, date_debut_souhaite,
+                date_livraison_plans, niveau_urgence, prix_service,
+                modalite_paiement, numero_reference
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            demande_data['nom_client'],
+            demande_data['email_client'],
+            demande_data['telephone_client'],
+            demande_data['adresse_projet'],
+            demande_data['ville'],
+            demande_data['code_postal'],
+            demande_data['type_batiment'],
+            demande_data['usage_batiment'],
+            demande_data.get('superficie_terrain'),
+            demande_data['superficie_batiment'],
+            demande_data.get('nombre_etages', 1),
+            demande_data.get('nombre_logements'),
+            demande_data['type_construction'],
+            demande_data.get('style_architectural', ''),
+            demande_data.get('contraintes_terrain', ''),
+            demande_data.get('exigences_speciales', ''),
+            demande_data['plans_requis'],
+            services_str,
+            1 if demande_data.get('besoin_3d') else 0,
+            1 if demande_data.get('besoin_permis', True) else 0,
+            demande_data.get('certificat_localisation', ''),
+            demande_data.get('photos_terrain', ''),
+            demande_data.get('croquis_client', ''),
+            demande_data.get('budget_construction', ''),
+            demande_data.get('budget_architecture', ''),
+            str(demande_data.get('date_debut_souhaite', '')),
+            str(demande_data.get('date_livraison_plans', '')),
+            demande_data.get('niveau_urgence', 'normal'),
+            prix_estime,
+            demande_data.get('modalite_paiement', 'forfait'),
+            numero_reference
+        ))
+        
+        demande_id = cursor.lastrowid
+        
+        # Créer une notification admin
+        cursor.execute('''
+            INSERT INTO notifications (
+                utilisateur_type, utilisateur_id, type_notification,
+                titre, message, lien_id
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            'admin', 0, 'nouvelle_demande_architecture',
+            'Nouvelle demande d\'architecture',
+            f'{demande_data["nom_client"]} - {demande_data["type_batiment"]} de {superficie:,.0f} pi2',
+            demande_id
+        ))
+        
+        conn.commit()
+        return numero_reference
+        
+    except Exception as e:
+        print(f"Erreur lors de la création de la demande d'architecture: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+def get_demandes_architecture_client(email_client: str) -> List[Dict]:
+    """Récupère les demandes d'architecture d'un client"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT id, type_batiment, usage_batiment, superficie_batiment,
+               ville, prix_service, statut, date_demande, numero_reference,
+               date_livraison_plans, pourcentage_complete, plans_finaux
+        FROM demandes_architecture
+        WHERE email_client = ?
+        ORDER BY date_demande DESC
+    ''', (email_client,))
+    
+    demandes = []
+    for row in cursor.fetchall():
+        demandes.append({
+            'id': row[0],
+            'type_batiment': row[1],
+            'usage_batiment': row[2],
+            'superficie_batiment': row[3],
+            'ville': row[4],
+            'prix_service': row[5],
+            'statut': row[6],
+            'date_demande': row[7],
+            'numero_reference': row[8],
+            'date_livraison_plans': row[9],
+            'pourcentage_complete': row[10],
+            'plans_finaux': row[11]
+        })
+    
+    conn.close()
+    return demandes
+
+def encoder_fichiers_architecture(fichiers_uploades: list) -> str:
+    """Encode une liste de fichiers en base64 pour stockage"""
+    if not fichiers_uploades:
+        return ""
+    
+    fichiers_encodes = []
+    
+    for fichier in fichiers_uploades:
+        try:
+            contenu = fichier.read()
+            contenu_b64 = base64.b64encode(contenu).decode('utf-8')
+            fichiers_encodes.append(f"{fichier.name}:{contenu_b64}")
+        except Exception as e:
+            print(f"Erreur lors de l'encodage de {fichier.name}: {e}")
+    
+    return ','.join(fichiers_encodes)
+
+# === FONCTIONS POUR SERVICE D'INGÉNIEUR EN STRUCTURE ===
+
+def creer_demande_ingenieur(demande_data: Dict) -> str:
+    """Crée une nouvelle demande de services d'ingénieur en structure"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Générer un numéro de référence unique
+        numero_reference = f"SEAOP-ING-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
+        
+        # Calculer le prix estimé basé sur le type et la complexité
+        superficie = float(demande_data.get('superficie_projet', 0))
+        type_structure = demande_data.get('type_structure', '')
+        services_demandes = demande_data.get('services_demandes', '')
+        
+        # Grille selon le type de structure, facteur selon les services
+        # ('complet' x1.8, 'plans' x1.4), puis analyses spécialisées
+        analyses = [
+            analyse for analyse in ('analyse_sismique', 'analyse_dynamique', 'modelisation_3d', 'surveillance_chantier')
+            if demande_data.get(analyse)
+        ]
+        prix_estime = calculer_prix(
+            'ingenieur', superficie, analyses,
+            categorie=type_structure, formule=services_demandes
+        )
+        
+        cursor.execute('''
+            INSERT INTO demandes_ingenieur (
+                nom_client, email_client, telephone_client, adresse_projet,
+                ville, code_postal, type_structure, type_batiment,
+                usage_structure, superficie_projet, hauteur_structure,
+                nombre_etages, charge_exploitation, type_construction,
+                sol_porteur, zone_sismique, contraintes_particulieres,
+                normes_requises, services_demandes, calculs_requis,
+                plans_requis, surveillance_chantier, certification_requise,
+                plans_architecte, etude_sol, photos_existant,
+                budget_structure, budget_ingenieur, date_debut_souhaite,
+                date_livraison_souhaite, niveau_urgence, prix_service,
+                modalite_paiement, numero_reference, analyse_sismique,
+                analyse_vent, analyse_neige, analyse_dynamique,
+                modelisation_3d
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            demande_data['nom_client'],
+            demande_data['email_client'],
+            demande_data['telephone_client'],
+            demande_data['adresse_projet'],
+            demande_data['ville'],
+            demande_data['code_postal'],
+            demande_data['type_structure'],
+            demande_data.get('type_batiment', ''),
+            demande_data['usage_structure'],
+            demande_data.get('superficie_projet'),
+            demande_data.get('hauteur_structure'),
+            demande_data.get('nombre_etages', 1),
+            demande_data.get('charge_exploitation', ''),
+            demande_data.get('type_construction', ''),
+            demande_data.get('sol_porteur', ''),
+            demande_data.get('zone_sismique', ''),
+            demande_data.get('contraintes_particulieres', ''),
+            demande_data.get('normes_requises', ''),
+            demande_data['services_demandes'],
+            demande_data.get('calculs_requis', ''),
+            demande_data.get('plans_requis', ''),
+            1 if demande_data.get('surveillance_chantier') else 0,
+            1 if demande_data.get('certification_requise', True) else 0,
+            demande_data.get('plans_architecte', ''),
+            demande_data.get('etude_sol', ''),
+            demande_data.get('photos_existant', ''),
+            demande_data.get('budget_structure', ''),
+            demande_data.get('budget_ingenieur', ''),
+            str(demande_data.get('date_debut_souhaite', '')),
+            str(demande_data.get('date_livraison_souhaite', '')),
+            demande_data.get('niveau_urgence', 'normal'),
+            prix_estime,
+            demande_data.get('modalite_paiement', 'forfait'),
+            numero_reference,
+            1 if demande_data.get('analyse_sismique') else 0,
+            1 if demande_data.get('analyse_vent') else 0,
+            1 if demande_data.get('analyse_neige') else 0,
+            1 if demande_data.get('analyse_dynamique') else 0,
+            1 if demande_data.get('modelisation_3d') else 0
+        ))
+        
+        demande_id = cursor.lastrowid
+        
+        # Créer une notification admin
+        cursor.execute('''
+            INSERT INTO notifications (
+                utilisateur_type, utilisateur_id, type_notification,
+                titre, message, lien_id
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            'admin', 0, 'nouvelle_demande_ingenieur',
+            'Nouvelle demande d\'ingenieur',
+            f'{demande_data["nom_client"]} - {demande_data["type_structure"]} {superficie:,.0f} pi2',
+            demande_id
+        ))
+        
+        conn.commit()
+        return numero_reference
+        
+    except Exception as e:
+        print(f"Erreur lors de la création de la demande d'ingénieur: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+def get_demandes_ingenieur_client(email_client: str) -> List[Dict]:
+    """Récupère les demandes d'ingénieur d'un client"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT id, type_structure, usage_structure, superficie_projet,
+               ville, prix_service, statut, date_demande, numero_reference,
+               date_livraison_souhaite, pourcentage_complete, calculs_structures,
+               plans_structures, services_demandes
+        FROM demandes_ingenieur
+        WHERE email_client = ?
+        ORDER BY date_demande DESC
+    ''', (email_client,))
+    
+    demandes = []
+    for row in cursor.fetchall():
+        demandes.append({
+            'id': row[0],
+            'type_structure': row[1],
+            'usage_structure': row[2],
+            'superficie_projet': row[3],
+            'ville': row[4],
+            'prix_service': row[5],
+            'statut': row[6],
+            'date_demande': row[7],
+            'numero_reference': row[8],
+            'date_livraison_souhaite': row[9],
+            'pourcentage_complete': row[10],
+            'calculs_structures': row[11],
+            'plans_structures': row[12],
+            'services_demandes': row[13]
+        })
+    
+    conn.close()
+    return demandes
+
+def encoder_fichiers_ingenieur(fichiers_uploades: list) -> str:
+    """Encode une liste de fichiers en base64 pour stockage"""
+    if not fichiers_uploades:
+        return ""
+    
+    fichiers_encodes = []
+    
+    for fichier in fichiers_uploades:
+        try:
+            contenu = fichier.read()
+            contenu_b64 = base64.b64encode(contenu).decode('utf-8')
+            fichiers_encodes.append(f"{fichier.name}:{contenu_b64}")
+        except Exception as e:
+            print(f"Erreur lors de l'encodage de {fichier.name}: {e}")
+    
+    return ','.join(fichiers_encodes)
+
+# Accès aux données tracés comme spans de chaque rerun
+instrumenter_fonctions(globals(), ('get_', 'filtrer_', 'count_', 'init_', 'check_'))
@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from PIL import Image
 import io
 import base64
+from moteur_tarification import calculer_prix_lead
 
 # Configuration de la page
 st.set_page_config(
@@ -174,36 +175,8 @@ def generer_numero_reference() -> str:
 
 def get_prix_lead(type_projet: str, budget: str) -> float:
     """Calcule le prix d'un lead selon le type et budget"""
-    prix_base = {
-        "Peinture": 45.0,
-        "Plancher": 55.0,
-        "Électricité": 65.0,
-        "Plomberie": 65.0,
-        "Chauffage/Climatisation": 75.0,
-        "Isolation": 60.0,
-        "Fenêtres et portes": 70.0,
-        "Maçonnerie": 80.0,
-        "Charpenterie": 85.0,
-        "Rénovation cuisine": 95.0,
-        "Rénovation salle de bain": 85.0,
-        "Toiture": 105.0,
-        "Revêtement extérieur": 90.0,
-        "Agrandissement": 120.0,
-        "Autre": 70.0
-    }
-    
-    multiplicateur_budget = {
-        "Moins de 5 000$": 0.8,
-        "5 000$ - 15 000$": 1.0,
-        "15 000$ - 30 000$": 1.3,
-        "30 000$ - 50 000$": 1.6,
-        "Plus de 50 000$": 2.0
-    }
-    
-    prix = prix_base.get(type_projet, 50.0)
-    prix *= multiplicateur_budget.get(budget, 1.0)
-    
-    return round(prix, 2)
+    # Prix par type et multiplicateurs de budget : voir moteur_tarification.TARIFS_LEADS
+    return calculer_prix_lead(type_projet, budget)
 
 def envoyer_email_confirmation(email: str, numero_reference: str):
     """Envoie un email de confirmation au client"""
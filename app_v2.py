@@ -1,24 +1,20 @@
 import streamlit as st
-import sqlite3
-import pandas as pd
-import hashlib
-import datetime
-import os
-import uuid
-from typing import Optional, List, Dict, Any
-import re
-from dataclasses import dataclass
-from PIL import Image
-import io
-import base64
-from chatroom_functions import page_chat_room_public
-
-# Configuration du stockage persistant
-DATA_DIR = os.getenv('DATA_DIR', '.')  # Utilise le répertoire courant en développement
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR, exist_ok=True)
-
-DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+import importlib
+from recherches_sauvegardees import evaluer_alertes
+from projets_similaires import maintenir_index_similarite
+from doublons_leads import indexer_leads_existants
+from statistiques_prix import recalculer_statistiques_prix
+from presence_chat import DELAI_PERSISTANCE, FENETRE_EN_LIGNE, persister_presence, purger_presence
+from taches_fond import enregistrer_tache, demarrer_taches_fond, secondes_avant
+from requetes_lentes import DELAI_PERSISTANCE as DELAI_REQUETES_LENTES, persister_requetes_lentes
+from metriques import PORT_METRIQUES, INTERVALLE_HISTORIQUE, demarrer_serveur_metriques, enregistrer_historique
+from profilage import armer_profilage, profiler_page
+from instantane_accueil import INTERVALLE_INSTANTANE, actualiser_instantane_accueil
+from instrumentation import installer, tracer_rerun
+from acces_donnees import assurer_base, get_conversations_entrepreneur, count_notifications_non_lues
+
+# Requêtes SQL et durées de chaque rerun (section Performance du panel d'administration)
+installer()
 
 # Configuration de la page
 st.set_page_config(
@@ -40,1972 +36,165 @@ def load_css():
 
 load_css()
 
-# Classes de données
-@dataclass
-class Lead:
-    id: Optional[int] = None
-    nom: str = ""
-    email: str = ""
-    telephone: str = ""
-    code_postal: str = ""
-    type_projet: str = ""
-    description: str = ""
-    budget: str = ""
-    delai_realisation: str = ""
-    date_limite_soumissions: Optional[str] = None
-    date_debut_souhaite: Optional[str] = None
-    niveau_urgence: str = "normal"
-    photos: Optional[str] = None
-    plans: Optional[str] = None
-    documents: Optional[str] = None
-    date_creation: Optional[datetime.datetime] = None
-    statut: str = "nouveau"
-    numero_reference: Optional[str] = None
-    visible_entrepreneurs: bool = True
-    accepte_soumissions: bool = True
-
-@dataclass
-class Entrepreneur:
-    id: Optional[int] = None
-    nom_entreprise: str = ""
-    nom_contact: str = ""
-    email: str = ""
-    telephone: str = ""
-    mot_de_passe_hash: str = ""
-    numero_rbq: str = ""
-    zones_desservies: str = ""
-    types_projets: str = ""
-    abonnement: str = "gratuit"
-    credits_restants: int = 5
-    date_inscription: Optional[datetime.datetime] = None
-    statut: str = "actif"
-    certifications: str = ""
-    evaluations_moyenne: float = 0.0
-    nombre_evaluations: int = 0
-
-@dataclass
-class Soumission:
-    id: Optional[int] = None
-    lead_id: int = 0
-    entrepreneur_id: int = 0
-    montant: float = 0.0
-    description_travaux: str = ""
-    delai_execution: str = ""
-    validite_offre: str = ""
-    inclusions: str = ""
-    exclusions: str = ""
-    conditions: str = ""
-    documents: Optional[str] = None
-    statut: str = "envoyee"
-    date_creation: Optional[datetime.datetime] = None
-    vue_par_client: bool = False
-    notes_client: str = ""
-    notes_entrepreneur: str = ""
-
-# Fonctions utilitaires
-def check_and_migrate_database():
-    """Vérifie et migre automatiquement la base de données si nécessaire"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Vérifier si les colonnes d'urgence existent
-        cursor.execute("PRAGMA table_info(leads)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        # Colonnes requises pour le système d'urgence
-        required_columns = ['date_limite_soumissions', 'date_debut_souhaite', 'niveau_urgence']
-        missing_columns = [col for col in required_columns if col not in columns]
-        
-        if missing_columns:
-            print(f"Migration automatique : ajout des colonnes {missing_columns}")
-            
-            # Ajouter les colonnes manquantes
-            for column in missing_columns:
-                if column == 'date_limite_soumissions':
-                    cursor.execute('ALTER TABLE leads ADD COLUMN date_limite_soumissions DATE')
-                elif column == 'date_debut_souhaite':
-                    cursor.execute('ALTER TABLE leads ADD COLUMN date_debut_souhaite DATE')
-                elif column == 'niveau_urgence':
-                    cursor.execute('ALTER TABLE leads ADD COLUMN niveau_urgence TEXT DEFAULT "normal"')
-            
-            # Mettre à jour les projets existants avec des valeurs par défaut
-            cursor.execute('''
-                UPDATE leads 
-                SET 
-                    date_limite_soumissions = COALESCE(date_limite_soumissions, date(date_creation, '+14 days')),
-                    date_debut_souhaite = COALESCE(date_debut_souhaite, date(date_creation, '+30 days')),
-                    niveau_urgence = COALESCE(niveau_urgence, 'normal')
-                WHERE id > 0
-            ''')
-            
-            print(f"Migration automatique terminée : {cursor.rowcount} projets mis à jour")
-        
-        # Vérifier et créer la table notifications
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notifications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                utilisateur_type TEXT NOT NULL,
-                utilisateur_id INTEGER NOT NULL,
-                type_notification TEXT NOT NULL,
-                titre TEXT NOT NULL,
-                message TEXT NOT NULL,
-                lien_id INTEGER,
-                lu BOOLEAN DEFAULT 0,
-                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        
-    except Exception as e:
-        print(f"Erreur lors de la migration automatique: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
+# Pages du routeur : module importé à la première navigation, puis gardé entre les reruns,
+# et fonction de la page. pandas et PIL ne sont chargés qu'avec les pages qui s'en servent.
+PAGES = {
+    'accueil': ('pages_clients', 'page_accueil'),
+    'nouveau_projet': ('pages_clients', 'page_nouveau_projet'),
+    'mes_projets': ('pages_clients', 'page_mes_projets'),
+    'service_estimation': ('pages_services', 'page_service_estimation'),
+    'service_technologue': ('pages_services', 'page_service_technologue'),
+    'service_architecture': ('pages_services', 'page_service_architecture'),
+    'service_ingenieur': ('pages_services', 'page_service_ingenieur'),
+    'experts_ia': ('pages_services', 'page_experts_ia'),
+    'takeoff_ai': ('pages_services', 'page_takeoff_ai'),
+    'erp_ai': ('pages_services', 'page_erp_ai'),
+    'chat_room': ('chatroom_functions', 'page_chat_room_public'),
+    'entrepreneur': ('pages_entrepreneurs', 'page_espace_entrepreneur'),
+    'admin': ('pages_administration', 'page_administration'),
+}
+
+def afficher_page(module: str, fonction: str):
+    """Importe le module de la page à la première navigation, puis affiche la page"""
+    getattr(importlib.import_module(module), fonction)()
 
-def init_database():
-    """Initialise la base de données SQLite avec toutes les tables"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Table des leads (projets)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS leads (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nom TEXT NOT NULL,
-            email TEXT NOT NULL,
-            telephone TEXT NOT NULL,
-            code_postal TEXT NOT NULL,
-            type_projet TEXT NOT NULL,
-            description TEXT NOT NULL,
-            budget TEXT NOT NULL,
-            delai_realisation TEXT NOT NULL,
-            date_limite_soumissions DATE,
-            date_debut_souhaite DATE,
-            niveau_urgence TEXT DEFAULT 'normal',
-            photos TEXT,
-            plans TEXT,
-            documents TEXT,
-            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            statut TEXT DEFAULT 'nouveau',
-            numero_reference TEXT UNIQUE,
-            visible_entrepreneurs BOOLEAN DEFAULT 1,
-            accepte_soumissions BOOLEAN DEFAULT 1
-        )
-    ''')
-    
-    # Table des entrepreneurs
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS entrepreneurs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nom_entreprise TEXT NOT NULL,
-            nom_contact TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            telephone TEXT NOT NULL,
-            mot_de_passe_hash TEXT NOT NULL,
-            numero_rbq TEXT,
-            zones_desservies TEXT,
-            types_projets TEXT,
-            abonnement TEXT DEFAULT 'gratuit',
-            credits_restants INTEGER DEFAULT 5,
-            date_inscription TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            statut TEXT DEFAULT 'actif',
-            certifications TEXT,
-            evaluations_moyenne REAL DEFAULT 0.0,
-            nombre_evaluations INTEGER DEFAULT 0
-        )
-    ''')
-    
-    # Table des soumissions
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS soumissions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            lead_id INTEGER NOT NULL,
-            entrepreneur_id INTEGER NOT NULL,
-            montant REAL NOT NULL,
-            description_travaux TEXT NOT NULL,
-            delai_execution TEXT NOT NULL,
-            validite_offre TEXT NOT NULL,
-            inclusions TEXT,
-            exclusions TEXT,
-            conditions TEXT,
-            documents TEXT,
-            statut TEXT DEFAULT 'envoyee',
-            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            date_modification TIMESTAMP,
-            vue_par_client BOOLEAN DEFAULT 0,
-            notes_client TEXT,
-            notes_entrepreneur TEXT,
-            FOREIGN KEY (lead_id) REFERENCES leads (id),
-            FOREIGN KEY (entrepreneur_id) REFERENCES entrepreneurs (id),
-            UNIQUE(lead_id, entrepreneur_id)
-        )
-    ''')
-    
-    # Table des messages
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            lead_id INTEGER NOT NULL,
-            entrepreneur_id INTEGER,
-            expediteur_type TEXT NOT NULL,
-            expediteur_id INTEGER NOT NULL,
-            destinataire_id INTEGER NOT NULL,
-            message TEXT NOT NULL,
-            pieces_jointes TEXT,
-            date_envoi TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            lu BOOLEAN DEFAULT 0,
-            FOREIGN KEY (lead_id) REFERENCES leads (id),
-            FOREIGN KEY (entrepreneur_id) REFERENCES entrepreneurs (id)
-        )
-    ''')
-    
-    # Table des évaluations
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS evaluations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            soumission_id INTEGER NOT NULL,
-            evaluateur_type TEXT NOT NULL,
-            note INTEGER NOT NULL CHECK(note >= 1 AND note <= 5),
-            commentaire TEXT,
-            date_evaluation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (soumission_id) REFERENCES soumissions (id),
-            UNIQUE(soumission_id, evaluateur_type)
-        )
-    ''')
-    
-    # Table des attributions (pour compatibilité)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS attributions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            lead_id INTEGER,
-            entrepreneur_id INTEGER,
-            date_attribution TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            statut TEXT DEFAULT 'attribue',
-            notes TEXT,
-            prix_paye REAL DEFAULT 0.0,
-            soumission_id INTEGER,
-            FOREIGN KEY (lead_id) REFERENCES leads (id),
-            FOREIGN KEY (entrepreneur_id) REFERENCES entrepreneurs (id),
-            FOREIGN KEY (soumission_id) REFERENCES soumissions (id)
-        )
-    ''')
-    
-    # Table des notifications
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            utilisateur_type TEXT NOT NULL,
-            utilisateur_id INTEGER NOT NULL,
-            type_notification TEXT NOT NULL,
-            titre TEXT NOT NULL,
-            message TEXT NOT NULL,
-            lien_id INTEGER,
-            lu BOOLEAN DEFAULT 0,
-            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Table des estimations (service d'estimation payant)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS estimations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            
-            -- Informations client
-            nom_client TEXT NOT NULL,
-            email_client TEXT NOT NULL,
-            telephone_client TEXT NOT NULL,
-            adresse_client TEXT,
-            
-            -- Détails de la demande
-            type_projet TEXT NOT NULL,
-            description_detaillee TEXT NOT NULL,
-            surface_approximative TEXT,
-            budget_approximatif TEXT,
-            delai_souhaite TEXT,
-            
-            -- Documents client (plans, croquis, photos)
-            plans_client TEXT,  -- Base64 des documents uploadés par le client
-            photos_client TEXT,  -- Photos de l'existant
-            documents_client TEXT,  -- Autres documents
-            
-            -- Informations estimation
-            prix_estimation REAL,  -- Prix du service d'estimation
-            statut TEXT DEFAULT 'recue',  -- 'recue', 'en_cours', 'terminee', 'envoyee', 'payee'
-            
-            -- Documents de réponse (estimation + facture)
-            estimation_document TEXT,  -- PDF/HTML de l'estimation fournie
-            facture_document TEXT,     -- Facture pour le service
-            documents_annexes TEXT,    -- Autres documents fournis
-            
-            -- Métadonnées
-            date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            date_debut_analyse TIMESTAMP,
-            date_estimation_terminee TIMESTAMP,
-            date_envoi_client TIMESTAMP,
-            date_paiement TIMESTAMP,
-            
-            -- Suivi
-            numero_reference TEXT UNIQUE,  -- Référence unique SEAOP-EST-XXXXX
-            notes_internes TEXT,  -- Notes pour l'estimateur
-            commentaires_client TEXT,  -- Retours du client
-            
-            -- Facturation
-            methode_paiement TEXT,  -- 'virement', 'cheque', 'carte', etc.
-            reference_paiement TEXT  -- Numéro de transaction
-        )
-    ''')
+# Interface principale
+def main():
+    # Migration automatique et initialisation (premier rerun du processus)
+    assurer_base()
+    
+    # Tâches de fond : alertes des recherches sauvegardées, notifiées par lot
+    enregistrer_tache('alertes_recherches', evaluer_alertes, intervalle_secondes=60, remplacer=False)
+    enregistrer_tache('index_similarite', maintenir_index_similarite, intervalle_secondes=300, remplacer=False)
+    enregistrer_tache('index_doublons', indexer_leads_existants, intervalle_secondes=3600, remplacer=False)
+    enregistrer_tache('presence_chat', persister_presence, intervalle_secondes=DELAI_PERSISTANCE, remplacer=False)
+    enregistrer_tache('purge_presence_chat', purger_presence, intervalle_secondes=FENETRE_EN_LIGNE, remplacer=False)
+    enregistrer_tache('requetes_lentes', persister_requetes_lentes, intervalle_secondes=DELAI_REQUETES_LENTES,
+                      remplacer=False)
+    enregistrer_tache('statistiques_prix', recalculer_statistiques_prix, intervalle_secondes=86400,
+                      delai_initial=secondes_avant(3), remplacer=False)
+    enregistrer_tache('instantane_accueil', actualiser_instantane_accueil, intervalle_secondes=INTERVALLE_INSTANTANE,
+                      remplacer=False)
+    enregistrer_tache('historique_metriques', enregistrer_historique, intervalle_secondes=INTERVALLE_HISTORIQUE,
+                      delai_initial=INTERVALLE_HISTORIQUE, remplacer=False)
+    demarrer_taches_fond()
+    
+    # Export des métriques au format Prometheus (une fois par processus)
+    if PORT_METRIQUES:
+        demarrer_serveur_metriques()
     
-    # Index pour optimiser les performances des estimations
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_estimations_statut ON estimations(statut)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_estimations_client ON estimations(email_client)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_estimations_date ON estimations(date_demande)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_estimations_reference ON estimations(numero_reference)')
+    # Header principal
+    st.markdown("""
+    <div class="main-header">
+        <h1>🏛️ SEAOP</h1>
+        <p>Système Électronique d'Appel d'Offres Public</p>
+        <p><strong>Le MARKETPLACE de la CONSTRUCTION au Québec</strong></p>
+    </div>
+    """, unsafe_allow_html=True)
     
-    conn.commit()
-    conn.close()
-
-def init_estimations_demo():
-    """Ajoute des données de démonstration pour les estimations si la table est vide"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    # Menu de navigation
+    if 'page' not in st.session_state:
+        st.session_state.page = 'accueil'
     
-    try:
-        # Vérifier si la table estimations a des données
-        cursor.execute("SELECT COUNT(*) FROM estimations")
-        count = cursor.fetchone()[0]
+    # Sidebar pour navigation
+    with st.sidebar:
+        # Navigation transformée en sidebar
+        st.sidebar.markdown("## 🏛️ SEAOP")
+        st.sidebar.markdown("*Système Électronique d'Appel d'Offres Public*")
+        st.sidebar.markdown("---")
         
-        if count == 0:
-            # Ajouter des estimations de démonstration
-            estimations_demo = [
-                {
-                    'nom_client': 'Marie Dubois',
-                    'email_client': 'marie.dubois@exemple.com',
-                    'telephone_client': '514-555-1234',
-                    'adresse_client': '123 Rue Saint-Denis, Montréal, QC H2X 1K1',
-                    'type_projet': 'Rénovation cuisine',
-                    'description_detaillee': '''Estimation demandée pour rénovation complète de cuisine.
-                    
-Détails de la demande:
-- Cuisine actuelle: 12x10 pieds
-- Démolition partielle (garder la plomberie existante)
-- Nouvelles armoires en bois
-- Comptoir en granite ou quartz
-- Plancher en céramique
-- Électroménagers à remplacer (lave-vaisselle, cuisinière, réfrigérateur)
-- Peinture complète
-                    
-Contraintes:
-- Budget approximatif: 25 000$ - 35 000$
-- Délai souhaité: 2-3 mois
-- Disponibilité: weekends pour visites
-                    
-J'aimerais une estimation détaillée avec breakdown des coûts par poste.''',
-                    'surface_approximative': '120 pi²',
-                    'budget_approximatif': '25 000$ - 35 000$',
-                    'delai_souhaite': '2-3 mois',
-                    'prix_estimation': 150.00,
-                    'statut': 'recue',
-                    'numero_reference': 'SEAOP-EST-20240316-001'
-                },
-                {
-                    'nom_client': 'Pierre Gagnon',
-                    'email_client': 'p.gagnon@exemple.com',
-                    'telephone_client': '450-555-5678',
-                    'adresse_client': '456 Boulevard Taschereau, Longueuil, QC J4K 2V8',
-                    'type_projet': 'Agrandissement maison',
-                    'description_detaillee': '''Demande d'estimation pour agrandissement de maison unifamiliale.
-                    
-Projet envisagé:
-- Agrandissement arrière: 16x20 pieds
-- 2 étages (rez-de-chaussée + étage)
-- Rez-de-chaussée: salon familial + salle d'eau
-- Étage: 2 chambres + salle de bain complète
-- Raccordement au système existant (plomberie, électricité, chauffage)
-- Finition complète intérieure/extérieure
-                    
-Spécifications souhaitées:
-- Fondation en béton
-- Structure bois
-- Revêtement extérieur assorti à l'existant
-- Fenêtres double vitrage
-- Isolation haute performance
-                    
-Budget approximatif: 80 000$ - 120 000$
-Délai flexible: 4-6 mois''',
-                    'surface_approximative': '640 pi² (320 pi² x 2 étages)',
-                    'budget_approximatif': '80 000$ - 120 000$',
-                    'delai_souhaite': '4-6 mois',
-                    'prix_estimation': 300.00,
-                    'statut': 'en_cours',
-                    'numero_reference': 'SEAOP-EST-20240315-002',
-                    'notes_internes': 'Projet complexe - nécessite vérification zonage municipal'
-                }
-            ]
-            
-            # Insérer les données de démonstration
-            for estimation in estimations_demo:
-                cursor.execute('''
-                    INSERT INTO estimations (
-                        nom_client, email_client, telephone_client, adresse_client,
-                        type_projet, description_detaillee, surface_approximative,
-                        budget_approximatif, delai_souhaite, prix_estimation,
-                        statut, numero_reference, notes_internes
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    estimation['nom_client'], estimation['email_client'], 
-                    estimation['telephone_client'], estimation.get('adresse_client'),
-                    estimation['type_projet'], estimation['description_detaillee'],
-                    estimation['surface_approximative'], estimation['budget_approximatif'],
-                    estimation['delai_souhaite'], estimation['prix_estimation'],
-                    estimation['statut'], estimation['numero_reference'],
-                    estimation.get('notes_internes')
-                ))
-            
-            # Ajouter des notifications pour les nouvelles estimations
-            cursor.execute('''
-                INSERT INTO notifications (
-                    utilisateur_type, utilisateur_id, type_notification,
-                    titre, message, lien_id
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                'admin', 0, 'nouvelle_estimation',
-                'Nouvelle demande d\'estimation',
-                'Marie Dubois a demandé une estimation pour une rénovation de cuisine',
-                1
-            ))
-            
-            cursor.execute('''
-                INSERT INTO notifications (
-                    utilisateur_type, utilisateur_id, type_notification,
-                    titre, message, lien_id
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                'admin', 0, 'nouvelle_estimation',
-                'Nouvelle demande d\'estimation',
-                'Pierre Gagnon a demandé une estimation pour un agrandissement',
-                2
-            ))
-            
-            conn.commit()
-            
-    except Exception as e:
-        print(f"Erreur lors de l'initialisation des estimations de démonstration: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
-
-def hash_password(password: str) -> str:
-    """Hash un mot de passe avec SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def valider_email(email: str) -> bool:
-    """Valide le format d'un email"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
-
-def valider_telephone(telephone: str) -> bool:
-    """Valide le format d'un numéro de téléphone québécois"""
-    pattern = r'^(\+1[-.\s]?)?\(?([2-9][0-9]{2})\)?[-.\s]?([2-9][0-9]{2})[-.\s]?([0-9]{4})$'
-    return re.match(pattern, telephone.replace(" ", "")) is not None
-
-def valider_code_postal(code_postal: str) -> bool:
-    """Valide le format d'un code postal canadien"""
-    pattern = r'^[A-Za-z]\d[A-Za-z][ -]?\d[A-Za-z]\d$'
-    return re.match(pattern, code_postal) is not None
-
-def generer_numero_reference() -> str:
-    """Génère un numéro de référence unique"""
-    return f"SEAOP-{datetime.datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
-
-def sauvegarder_lead(lead: Lead) -> str:
-    """Sauvegarde un lead dans la base de données"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    numero_ref = generer_numero_reference()
-    lead.numero_reference = numero_ref
-    
-    cursor.execute('''
-        INSERT INTO leads (nom, email, telephone, code_postal, type_projet, 
-                          description, budget, delai_realisation, 
-                          date_limite_soumissions, date_debut_souhaite, niveau_urgence,
-                          photos, plans, documents, numero_reference)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (lead.nom, lead.email, lead.telephone, lead.code_postal, lead.type_projet,
-          lead.description, lead.budget, lead.delai_realisation,
-          lead.date_limite_soumissions, lead.date_debut_souhaite, lead.niveau_urgence,
-          lead.photos, lead.plans, lead.documents, numero_ref))
-    
-    conn.commit()
-    conn.close()
-    
-    return numero_ref
-
-def authentifier_entrepreneur(email: str, mot_de_passe: str) -> Optional[Entrepreneur]:
-    """Authentifie un entrepreneur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT * FROM entrepreneurs WHERE email = ? AND mot_de_passe_hash = ?
-    ''', (email, hash_password(mot_de_passe)))
-    
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result:
-        return Entrepreneur(
-            id=result[0], nom_entreprise=result[1], nom_contact=result[2],
-            email=result[3], telephone=result[4], mot_de_passe_hash=result[5],
-            numero_rbq=result[6], zones_desservies=result[7], types_projets=result[8],
-            abonnement=result[9], credits_restants=result[10], 
-            date_inscription=result[11], statut=result[12], certifications=result[13],
-            evaluations_moyenne=result[14] if len(result) > 14 else 0.0,
-            nombre_evaluations=result[15] if len(result) > 15 else 0
-        )
-    return None
-
-def get_projets_disponibles() -> List[Dict]:
-    """Récupère tous les projets disponibles pour soumission avec informations d'urgence"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT l.*, 
-               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions
-        FROM leads l
-        WHERE l.visible_entrepreneurs = 1 AND l.accepte_soumissions = 1
-        ORDER BY 
-            CASE l.niveau_urgence 
-                WHEN 'critique' THEN 1 
-                WHEN 'eleve' THEN 2 
-                WHEN 'normal' THEN 3 
-                WHEN 'faible' THEN 4 
-            END,
-            l.date_limite_soumissions ASC,
-            l.date_creation DESC
-    ''')
-    
-    projets = []
-    for row in cursor.fetchall():
-        projet = {
-            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
-            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
-            'budget': row[7], 'delai_realisation': row[8], 
-            'date_limite_soumissions': row[9], 'date_debut_souhaite': row[10],
-            'niveau_urgence': row[11], 'photos': row[12], 'plans': row[13], 
-            'documents': row[14], 'date_creation': row[15], 'statut': row[16],
-            'numero_reference': row[17], 'visible_entrepreneurs': row[18], 
-            'accepte_soumissions': row[19], 'nb_soumissions': row[20]
-        }
+        # Section principale
+        st.sidebar.markdown("### 📋 Gestion de projets")
+        page = None
         
-        # Calculer les jours restants
-        projet['jours_restants_soumissions'] = calculer_jours_restants(projet['date_limite_soumissions'])
-        projet['jours_restants_debut'] = calculer_jours_restants(projet['date_debut_souhaite'])
+        if st.sidebar.button("🏠 Accueil", use_container_width=True):
+            page = "🏠 Accueil"
+        if st.sidebar.button("📝 Publier un appel d'offres", use_container_width=True):
+            page = "📝 Publier un appel d'offres"
+        if st.sidebar.button("📋 Mes appels d'offres", use_container_width=True):
+            page = "📋 Mes appels d'offres"
+        if st.sidebar.button("🏢 Espace Entrepreneurs", use_container_width=True):
+            page = "🏢 Espace Entrepreneurs"
         
-        # Mettre à jour l'urgence automatiquement
-        mettre_a_jour_urgence_projet(projet['id'])
+        st.sidebar.markdown("---")
+        st.sidebar.markdown("### 🏗️ Services professionnels")
         
-        projets.append(projet)
-    
-    conn.close()
-    return projets
-
-def sauvegarder_soumission(soumission: Soumission) -> bool:
-    """Sauvegarde une soumission d'entrepreneur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            INSERT INTO soumissions (lead_id, entrepreneur_id, montant, description_travaux,
-                                   delai_execution, validite_offre, inclusions, exclusions,
-                                   conditions, documents, statut)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (soumission.lead_id, soumission.entrepreneur_id, soumission.montant,
-              soumission.description_travaux, soumission.delai_execution,
-              soumission.validite_offre, soumission.inclusions, soumission.exclusions,
-              soumission.conditions, soumission.documents, soumission.statut))
+        if st.sidebar.button("💰 Service d'estimation", use_container_width=True):
+            page = "💰 Service d'estimation"
+        if st.sidebar.button("📐 Service de technologue", use_container_width=True):
+            page = "📐 Service de technologue"
+        if st.sidebar.button("🏛️ Service d'architecture", use_container_width=True):
+            page = "🏛️ Service d'architecture"
+        if st.sidebar.button("🔧 Service d'ingénieur", use_container_width=True):
+            page = "🔧 Service d'ingénieur"
         
-        conn.commit()
-        conn.close()
-        return True
-    except sqlite3.IntegrityError:
-        conn.close()
-        return False
-
-# Fonctions de gestion des messages
-def envoyer_message(lead_id: int, entrepreneur_id: int, expediteur_type: str, expediteur_id: int, destinataire_id: int, message: str, pieces_jointes: str = None) -> bool:
-    """Envoie un message entre client et entrepreneur"""
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        st.sidebar.markdown("---")
+        st.sidebar.markdown("### 💻 Logiciels professionnels")
         
-        cursor.execute('''
-            INSERT INTO messages (lead_id, entrepreneur_id, expediteur_type, expediteur_id, destinataire_id, message, pieces_jointes)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (lead_id, entrepreneur_id, expediteur_type, expediteur_id, destinataire_id, message, pieces_jointes))
+        if st.sidebar.button("🧠 EXPERTS IA", use_container_width=True):
+            page = "🧠 EXPERTS IA"
+        if st.sidebar.button("📐 TAKEOFF AI", use_container_width=True):
+            page = "📐 TAKEOFF AI"
+        if st.sidebar.button("📊 ERP AI", use_container_width=True):
+            page = "📊 ERP AI"
         
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Erreur lors de l'envoi du message: {e}")
-        return False
-
-def get_messages_conversation(lead_id: int, entrepreneur_id: int) -> List[Dict]:
-    """Récupère tous les messages d'une conversation entre client et entrepreneur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT m.*, 
-               CASE 
-                   WHEN m.expediteur_type = 'client' THEN l.nom
-                   ELSE e.nom_entreprise
-               END as nom_expediteur
-        FROM messages m
-        LEFT JOIN leads l ON m.lead_id = l.id
-        LEFT JOIN entrepreneurs e ON m.entrepreneur_id = e.id
-        WHERE m.lead_id = ? AND m.entrepreneur_id = ?
-        ORDER BY m.date_envoi ASC
-    ''', (lead_id, entrepreneur_id))
-    
-    messages = []
-    for row in cursor.fetchall():
-        messages.append({
-            'id': row[0],
-            'lead_id': row[1],
-            'entrepreneur_id': row[2],
-            'expediteur_type': row[3],
-            'expediteur_id': row[4],
-            'destinataire_id': row[5],
-            'message': row[6],
-            'pieces_jointes': row[7],
-            'date_envoi': row[8],
-            'lu': row[9],
-            'nom_expediteur': row[10]
-        })
-    
-    conn.close()
-    return messages
-
-def marquer_messages_lus(lead_id: int, entrepreneur_id: int, destinataire_id: int):
-    """Marque tous les messages comme lus pour un destinataire"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        UPDATE messages SET lu = 1 
-        WHERE lead_id = ? AND entrepreneur_id = ? AND destinataire_id = ? AND lu = 0
-    ''', (lead_id, entrepreneur_id, destinataire_id))
-    
-    conn.commit()
-    conn.close()
-
-def get_conversations_client(client_id: int) -> List[Dict]:
-    """Récupère toutes les conversations d'un client"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT DISTINCT m.lead_id, m.entrepreneur_id, e.nom_entreprise, l.type_projet,
-               (SELECT COUNT(*) FROM messages m2 WHERE m2.lead_id = m.lead_id AND m2.entrepreneur_id = m.entrepreneur_id AND m2.destinataire_id = ? AND m2.lu = 0) as non_lus,
-               (SELECT MAX(date_envoi) FROM messages m3 WHERE m3.lead_id = m.lead_id AND m3.entrepreneur_id = m.entrepreneur_id) as dernier_message
-        FROM messages m
-        JOIN entrepreneurs e ON m.entrepreneur_id = e.id
-        JOIN leads l ON m.lead_id = l.id
-        WHERE l.email = (SELECT email FROM leads WHERE id = ?)
-        ORDER BY dernier_message DESC
-    ''', (client_id, client_id))
-    
-    conversations = []
-    for row in cursor.fetchall():
-        conversations.append({
-            'lead_id': row[0],
-            'entrepreneur_id': row[1],
-            'nom_entreprise': row[2],
-            'type_projet': row[3],
-            'non_lus': row[4],
-            'dernier_message': row[5]
-        })
-    
-    conn.close()
-    return conversations
-
-def get_conversations_entrepreneur(entrepreneur_id: int) -> List[Dict]:
-    """Récupère toutes les conversations d'un entrepreneur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT DISTINCT m.lead_id, m.entrepreneur_id, l.nom as nom_client, l.type_projet,
-               (SELECT COUNT(*) FROM messages m2 WHERE m2.lead_id = m.lead_id AND m2.entrepreneur_id = m.entrepreneur_id AND m2.destinataire_id = ? AND m2.lu = 0) as non_lus,
-               (SELECT MAX(date_envoi) FROM messages m3 WHERE m3.lead_id = m.lead_id AND m3.entrepreneur_id = m.entrepreneur_id) as dernier_message
-        FROM messages m
-        JOIN leads l ON m.lead_id = l.id
-        WHERE m.entrepreneur_id = ?
-        ORDER BY dernier_message DESC
-    ''', (entrepreneur_id, entrepreneur_id))
-    
-    conversations = []
-    for row in cursor.fetchall():
-        conversations.append({
-            'lead_id': row[0],
-            'entrepreneur_id': row[1],
-            'nom_client': row[2],
-            'type_projet': row[3],
-            'non_lus': row[4],
-            'dernier_message': row[5]
-        })
-    
-    conn.close()
-    return conversations
-
-# Fonctions de gestion des évaluations
-def ajouter_evaluation(soumission_id: int, evaluateur_type: str, note: int, commentaire: str = "") -> bool:
-    """Ajoute une évaluation pour une soumission"""
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        st.sidebar.markdown("---")
+        st.sidebar.markdown("### 💬 Communauté")
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO evaluations (soumission_id, evaluateur_type, note, commentaire)
-            VALUES (?, ?, ?, ?)
-        ''', (soumission_id, evaluateur_type, note, commentaire))
+        if st.sidebar.button("💬 Chat Room Public", use_container_width=True):
+            page = "💬 Chat Room"
         
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Erreur lors de l'ajout de l'évaluation: {e}")
-        return False
-
-def get_evaluations_entrepreneur(entrepreneur_id: int) -> Dict:
-    """Récupère les statistiques d'évaluation d'un entrepreneur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT 
-            AVG(e.note) as note_moyenne,
-            COUNT(e.note) as nombre_evaluations,
-            COUNT(CASE WHEN e.note >= 4 THEN 1 END) as evaluations_positives
-        FROM evaluations e
-        JOIN soumissions s ON e.soumission_id = s.id
-        WHERE s.entrepreneur_id = ? AND e.evaluateur_type = 'client'
-    ''', (entrepreneur_id,))
-    
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result and result[0]:
-        return {
-            'note_moyenne': round(result[0], 1),
-            'nombre_evaluations': result[1],
-            'evaluations_positives': result[2],
-            'pourcentage_positif': round((result[2] / result[1] * 100), 1) if result[1] > 0 else 0
-        }
-    else:
-        return {
-            'note_moyenne': 0,
-            'nombre_evaluations': 0,
-            'evaluations_positives': 0,
-            'pourcentage_positif': 0
-        }
-
-def get_evaluation_soumission(soumission_id: int, evaluateur_type: str) -> Optional[Dict]:
-    """Récupère l'évaluation d'une soumission"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT note, commentaire, date_evaluation
-        FROM evaluations
-        WHERE soumission_id = ? AND evaluateur_type = ?
-    ''', (soumission_id, evaluateur_type))
-    
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result:
-        return {
-            'note': result[0],
-            'commentaire': result[1],
-            'date_evaluation': result[2]
-        }
-    return None
-
-def get_derniers_commentaires_entrepreneur(entrepreneur_id: int, limit: int = 5) -> List[Dict]:
-    """Récupère les derniers commentaires d'un entrepreneur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT e.note, e.commentaire, e.date_evaluation, l.type_projet
-        FROM evaluations e
-        JOIN soumissions s ON e.soumission_id = s.id
-        JOIN leads l ON s.lead_id = l.id
-        WHERE s.entrepreneur_id = ? AND e.evaluateur_type = 'client' 
-        AND e.commentaire IS NOT NULL AND e.commentaire != ''
-        ORDER BY e.date_evaluation DESC
-        LIMIT ?
-    ''', (entrepreneur_id, limit))
-    
-    commentaires = []
-    for row in cursor.fetchall():
-        commentaires.append({
-            'note': row[0],
-            'commentaire': row[1],
-            'date_evaluation': row[2][:10] if row[2] else "",
-            'type_projet': row[3]
-        })
-    
-    conn.close()
-    return commentaires
-
-# Fonctions de gestion des notifications
-def creer_notification(utilisateur_type: str, utilisateur_id: int, type_notif: str, titre: str, message: str, lien_id: int = None) -> bool:
-    """Crée une nouvelle notification"""
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        st.sidebar.markdown("---")
+        st.sidebar.markdown("### ⚙️ Administration")
         
-        cursor.execute('''
-            INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, titre, message, lien_id)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (utilisateur_type, utilisateur_id, type_notif, titre, message, lien_id))
+        if st.sidebar.button("⚙️ Panel d'administration", use_container_width=True):
+            page = "⚙️ Administration"
         
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Erreur lors de la création de notification: {e}")
-        return False
-
-def get_notifications_utilisateur(utilisateur_type: str, utilisateur_id: int, limit: int = 10) -> List[Dict]:
-    """Récupère les notifications d'un utilisateur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT id, type_notification, titre, message, lien_id, lu, date_creation
-        FROM notifications
-        WHERE utilisateur_type = ? AND utilisateur_id = ?
-        ORDER BY date_creation DESC
-        LIMIT ?
-    ''', (utilisateur_type, utilisateur_id, limit))
-    
-    notifications = []
-    for row in cursor.fetchall():
-        notifications.append({
-            'id': row[0],
-            'type_notification': row[1],
-            'titre': row[2],
-            'message': row[3],
-            'lien_id': row[4],
-            'lu': row[5],
-            'date_creation': row[6]
-        })
-    
-    conn.close()
-    return notifications
-
-def count_notifications_non_lues(utilisateur_type: str, utilisateur_id: int) -> int:
-    """Compte les notifications non lues d'un utilisateur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT COUNT(*) FROM notifications
-        WHERE utilisateur_type = ? AND utilisateur_id = ? AND lu = 0
-    ''', (utilisateur_type, utilisateur_id))
-    
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
-
-def marquer_notification_lue(notification_id: int) -> bool:
-    """Marque une notification comme lue"""
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        # Garder la page actuelle si aucun bouton n'est cliqué
+        if page is None:
+            page = st.session_state.get('current_page', '🏠 Accueil')
+        else:
+            st.session_state.current_page = page
         
-        cursor.execute('''
-            UPDATE notifications SET lu = 1 WHERE id = ?
-        ''', (notification_id,))
+        # Afficher la page actuelle
+        st.sidebar.markdown("---")
+        st.sidebar.markdown("### 📍 Page actuelle")
+        st.sidebar.info(f"**{page}**")
         
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Erreur lors du marquage de notification: {e}")
-        return False
-
-def marquer_toutes_notifications_lues(utilisateur_type: str, utilisateur_id: int) -> bool:
-    """Marque toutes les notifications d'un utilisateur comme lues"""
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        # Informations sur les services
+        st.sidebar.markdown("---")
+        st.sidebar.markdown("### ℹ️ À propos")
+        st.sidebar.markdown("""
+        **Services professionnels :**
         
-        cursor.execute('''
-            UPDATE notifications SET lu = 1 
-            WHERE utilisateur_type = ? AND utilisateur_id = ? AND lu = 0
-        ''', (utilisateur_type, utilisateur_id))
+        📐 **Technologue** : ≤ 6,000 pi²  
+        🏛️ **Architecture** : > 6,000 pi²  
+        🔧 **Ingénierie** : Calculs structuraux  
+        💰 **Estimation** : Évaluation de coûts
         
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Erreur lors du marquage de toutes les notifications: {e}")
-        return False
-
-# Fonctions spécifiques de création de notifications
-def notifier_nouvelle_soumission(lead_id: int):
-    """Notifie le client qu'il a reçu une nouvelle soumission"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Récupérer les infos du projet
-    cursor.execute('SELECT nom, type_projet FROM leads WHERE id = ?', (lead_id,))
-    projet = cursor.fetchone()
-    
-    if projet:
-        titre = "📩 Nouvelle soumission reçue"
-        message = f"Vous avez reçu une nouvelle soumission pour votre projet : {projet[1]}"
-        creer_notification('client', lead_id, 'nouvelle_soumission', titre, message, lead_id)
-    
-    conn.close()
-
-def notifier_soumission_acceptee(soumission_id: int):
-    """Notifie l'entrepreneur que sa soumission a été acceptée"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Récupérer les infos de la soumission
-    cursor.execute('''
-        SELECT s.entrepreneur_id, l.type_projet, s.montant
-        FROM soumissions s
-        JOIN leads l ON s.lead_id = l.id
-        WHERE s.id = ?
-    ''', (soumission_id,))
-    
-    result = cursor.fetchone()
-    if result:
-        entrepreneur_id, type_projet, montant = result
-        titre = "🎉 Soumission acceptée !"
-        message = f"Félicitations ! Votre soumission de {montant:,.2f}$ pour le projet '{type_projet}' a été acceptée."
-        creer_notification('entrepreneur', entrepreneur_id, 'soumission_acceptee', titre, message, soumission_id)
-    
-    conn.close()
-
-def notifier_soumission_refusee(soumission_id: int):
-    """Notifie l'entrepreneur que sa soumission a été refusée"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Récupérer les infos de la soumission
-    cursor.execute('''
-        SELECT s.entrepreneur_id, l.type_projet
-        FROM soumissions s
-        JOIN leads l ON s.lead_id = l.id
-        WHERE s.id = ?
-    ''', (soumission_id,))
-    
-    result = cursor.fetchone()
-    if result:
-        entrepreneur_id, type_projet = result
-        titre = "❌ Soumission non retenue"
-        message = f"Votre soumission pour le projet '{type_projet}' n'a pas été retenue. Continuez à soumissionner !"
-        creer_notification('entrepreneur', entrepreneur_id, 'soumission_refusee', titre, message, soumission_id)
-    
-    conn.close()
-
-def notifier_nouveau_message(lead_id: int, entrepreneur_id: int, expediteur_type: str):
-    """Notifie qu'un nouveau message a été reçu"""
-    if expediteur_type == 'client':
-        # Notifier l'entrepreneur
-        titre = "💬 Nouveau message client"
-        message = "Vous avez reçu un nouveau message d'un client"
-        creer_notification('entrepreneur', entrepreneur_id, 'nouveau_message', titre, message, lead_id)
-    else:
-        # Notifier le client
-        titre = "💬 Nouveau message entrepreneur"
-        message = "Vous avez reçu un nouveau message d'un entrepreneur"
-        creer_notification('client', lead_id, 'nouveau_message', titre, message, lead_id)
-
-# Fonctions de statistiques et dashboard
-def get_stats_client(client_email: str) -> Dict:
-    """Récupère les statistiques d'un client"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Projets du client
-    cursor.execute('''
-        SELECT COUNT(*) as nb_projets,
-               AVG(nb_soumissions) as moy_soumissions_par_projet
-        FROM (
-            SELECT l.id, COUNT(s.id) as nb_soumissions
-            FROM leads l
-            LEFT JOIN soumissions s ON l.id = s.lead_id
-            WHERE l.email = ?
-            GROUP BY l.id
-        )
-    ''', (client_email,))
-    
-    projets_stats = cursor.fetchone()
-    
-    # Montant moyen des soumissions
-    cursor.execute('''
-        SELECT AVG(s.montant) as montant_moyen,
-               COUNT(s.id) as total_soumissions,
-               COUNT(CASE WHEN s.statut = 'acceptee' THEN 1 END) as soumissions_acceptees
-        FROM soumissions s
-        JOIN leads l ON s.lead_id = l.id
-        WHERE l.email = ?
-    ''', (client_email,))
-    
-    soumissions_stats = cursor.fetchone()
-    
-    # Évolution mensuelle
-    cursor.execute('''
-        SELECT strftime('%Y-%m', l.date_creation) as mois,
-               COUNT(l.id) as nb_projets,
-               COUNT(s.id) as nb_soumissions
-        FROM leads l
-        LEFT JOIN soumissions s ON l.id = s.lead_id
-        WHERE l.email = ?
-        GROUP BY strftime('%Y-%m', l.date_creation)
-        ORDER BY mois DESC
-        LIMIT 6
-    ''', (client_email,))
-    
-    evolution_mensuelle = cursor.fetchall()
-    
-    conn.close()
-    
-    return {
-        'nb_projets': projets_stats[0] if projets_stats else 0,
-        'moy_soumissions_par_projet': round(projets_stats[1], 1) if projets_stats[1] else 0,
-        'montant_moyen_soumissions': round(soumissions_stats[0], 2) if soumissions_stats[0] else 0,
-        'total_soumissions': soumissions_stats[1] if soumissions_stats else 0,
-        'soumissions_acceptees': soumissions_stats[2] if soumissions_stats else 0,
-        'taux_acceptation': round((soumissions_stats[2] / soumissions_stats[1] * 100), 1) if soumissions_stats[1] and soumissions_stats[1] > 0 else 0,
-        'evolution_mensuelle': evolution_mensuelle
-    }
-
-def get_stats_entrepreneur(entrepreneur_id: int) -> Dict:
-    """Récupère les statistiques d'un entrepreneur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Statistiques générales des soumissions
-    cursor.execute('''
-        SELECT COUNT(*) as total_soumissions,
-               COUNT(CASE WHEN statut = 'acceptee' THEN 1 END) as soumissions_acceptees,
-               COUNT(CASE WHEN statut = 'refusee' THEN 1 END) as soumissions_refusees,
-               AVG(montant) as montant_moyen,
-               SUM(CASE WHEN statut = 'acceptee' THEN montant ELSE 0 END) as ca_total
-        FROM soumissions
-        WHERE entrepreneur_id = ?
-    ''', (entrepreneur_id,))
-    
-    soumissions_stats = cursor.fetchone()
-    
-    # Évolution mensuelle
-    cursor.execute('''
-        SELECT strftime('%Y-%m', date_creation) as mois,
-               COUNT(*) as nb_soumissions,
-               COUNT(CASE WHEN statut = 'acceptee' THEN 1 END) as nb_acceptees,
-               SUM(CASE WHEN statut = 'acceptee' THEN montant ELSE 0 END) as ca_mois
-        FROM soumissions
-        WHERE entrepreneur_id = ?
-        GROUP BY strftime('%Y-%m', date_creation)
-        ORDER BY mois DESC
-        LIMIT 6
-    ''', (entrepreneur_id,))
-    
-    evolution_mensuelle = cursor.fetchall()
-    
-    # Note moyenne actuelle
-    stats_eval = get_evaluations_entrepreneur(entrepreneur_id)
-    
-    conn.close()
-    
-    total_soum = soumissions_stats[0] if soumissions_stats else 0
-    acceptees = soumissions_stats[1] if soumissions_stats else 0
-    
-    return {
-        'total_soumissions': total_soum,
-        'soumissions_acceptees': acceptees,
-        'soumissions_refusees': soumissions_stats[2] if soumissions_stats else 0,
-        'taux_succes': round((acceptees / total_soum * 100), 1) if total_soum > 0 else 0,
-        'montant_moyen': round(soumissions_stats[3], 2) if soumissions_stats[3] else 0,
-        'ca_total': round(soumissions_stats[4], 2) if soumissions_stats[4] else 0,
-        'note_moyenne': stats_eval['note_moyenne'],
-        'nb_evaluations': stats_eval['nombre_evaluations'],
-        'evolution_mensuelle': evolution_mensuelle
-    }
-
-def get_stats_admin() -> Dict:
-    """Récupère les statistiques globales de la plateforme"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Statistiques générales
-    cursor.execute('''
-        SELECT 
-            (SELECT COUNT(*) FROM leads) as total_projets,
-            (SELECT COUNT(*) FROM entrepreneurs) as total_entrepreneurs,
-            (SELECT COUNT(*) FROM soumissions) as total_soumissions,
-            (SELECT SUM(CASE WHEN statut = 'acceptee' THEN montant ELSE 0 END) FROM soumissions) as ca_total
-    ''')
-    
-    stats_generales = cursor.fetchone()
-    
-    # Top entrepreneurs du mois
-    cursor.execute('''
-        SELECT e.nom_entreprise,
-               COUNT(s.id) as nb_soumissions,
-               COUNT(CASE WHEN s.statut = 'acceptee' THEN 1 END) as nb_acceptees,
-               SUM(CASE WHEN s.statut = 'acceptee' THEN s.montant ELSE 0 END) as ca_mois,
-               AVG(ev.note) as note_moyenne
-        FROM entrepreneurs e
-        LEFT JOIN soumissions s ON e.id = s.entrepreneur_id 
-            AND strftime('%Y-%m', s.date_creation) = strftime('%Y-%m', 'now')
-        LEFT JOIN evaluations ev ON s.id = ev.soumission_id AND ev.evaluateur_type = 'client'
-        GROUP BY e.id, e.nom_entreprise
-        HAVING nb_soumissions > 0
-        ORDER BY nb_acceptees DESC, ca_mois DESC
-        LIMIT 5
-    ''')
-    
-    top_entrepreneurs = cursor.fetchall()
-    
-    # Évolution mensuelle globale
-    cursor.execute('''
-        SELECT strftime('%Y-%m', date_creation) as mois,
-               COUNT(*) as nb_projets
-        FROM leads
-        GROUP BY strftime('%Y-%m', date_creation)
-        ORDER BY mois DESC
-        LIMIT 6
-    ''')
-    
-    evolution_projets = cursor.fetchall()
-    
-    cursor.execute('''
-        SELECT strftime('%Y-%m', date_creation) as mois,
-               COUNT(*) as nb_soumissions,
-               SUM(CASE WHEN statut = 'acceptee' THEN montant ELSE 0 END) as ca_mois
-        FROM soumissions
-        GROUP BY strftime('%Y-%m', date_creation)
-        ORDER BY mois DESC
-        LIMIT 6
-    ''')
-    
-    evolution_soumissions = cursor.fetchall()
-    
-    conn.close()
-    
-    return {
-        'total_projets': stats_generales[0] if stats_generales else 0,
-        'total_entrepreneurs': stats_generales[1] if stats_generales else 0,
-        'total_soumissions': stats_generales[2] if stats_generales else 0,
-        'ca_total': round(stats_generales[3], 2) if stats_generales[3] else 0,
-        'top_entrepreneurs': top_entrepreneurs,
-        'evolution_projets': evolution_projets,
-        'evolution_soumissions': evolution_soumissions
-    }
-
-# === FONCTIONS POUR SERVICE D'ESTIMATION ===
-
-def creer_demande_estimation(estimation_data: Dict) -> bool:
-    """Crée une nouvelle demande d'estimation"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Générer un numéro de référence unique
-        numero_reference = f"SEAOP-EST-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
+        **Logiciels professionnels :**
         
-        cursor.execute('''
-            INSERT INTO estimations (
-                nom_client, email_client, telephone_client, adresse_client,
-                type_projet, description_detaillee, surface_approximative,
-                budget_approximatif, delai_souhaite, plans_client, photos_client,
-                documents_client, prix_estimation, numero_reference
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            estimation_data['nom_client'],
-            estimation_data['email_client'],
-            estimation_data['telephone_client'],
-            estimation_data.get('adresse_client', ''),
-            estimation_data['type_projet'],
-            estimation_data['description_detaillee'],
-            estimation_data.get('surface_approximative', ''),
-            estimation_data.get('budget_approximatif', ''),
-            estimation_data.get('delai_souhaite', ''),
-            estimation_data.get('plans_client', ''),
-            estimation_data.get('photos_client', ''),
-            estimation_data.get('documents_client', ''),
-            estimation_data.get('prix_estimation', 0.0),
-            numero_reference
-        ))
+        🧠 **EXPERTS IA** : 60+ experts construction  
+        📐 **TAKEOFF AI** : Estimation automatique  
+        📊 **ERP AI** : Gestion de projets
         
-        estimation_id = cursor.lastrowid
+        **Contact :**
         
-        # Créer une notification admin
-        cursor.execute('''
-            INSERT INTO notifications (
-                utilisateur_type, utilisateur_id, type_notification,
-                titre, message, lien_id
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            'admin', 0, 'nouvelle_estimation',
-            'Nouvelle demande d\'estimation',
-            f'{estimation_data["nom_client"]} a demandé une estimation pour {estimation_data["type_projet"]}',
-            estimation_id
-        ))
+        📧 info@constructoai.ca  
+        📞 514-820-1972
+        """)
         
-        conn.commit()
-        return True
-        
-    except Exception as e:
-        print(f"Erreur lors de la création de l'estimation: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
-
-def get_estimations_admin() -> List[Dict]:
-    """Récupère toutes les estimations pour l'admin"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT id, nom_client, email_client, telephone_client, type_projet,
-               description_detaillee, budget_approximatif, prix_estimation,
-               statut, date_demande, numero_reference, notes_internes,
-               plans_client, photos_client, documents_client
-        FROM estimations
-        ORDER BY date_demande DESC
-    ''')
-    
-    estimations = []
-    for row in cursor.fetchall():
-        estimations.append({
-            'id': row[0],
-            'nom_client': row[1],
-            'email_client': row[2],
-            'telephone_client': row[3],
-            'type_projet': row[4],
-            'description_detaillee': row[5],
-            'budget_approximatif': row[6],
-            'prix_estimation': row[7],
-            'statut': row[8],
-            'date_demande': row[9],
-            'numero_reference': row[10],
-            'notes_internes': row[11],
-            'plans_client': row[12],
-            'photos_client': row[13],
-            'documents_client': row[14]
-        })
-    
-    conn.close()
-    return estimations
-
-def get_estimation_by_id(estimation_id: int) -> Optional[Dict]:
-    """Récupère une estimation par son ID"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT * FROM estimations WHERE id = ?
-    ''', (estimation_id,))
-    
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        return None
-    
-    # Mapper toutes les colonnes
-    columns = [description[0] for description in cursor.description]
-    estimation = dict(zip(columns, row))
-    
-    conn.close()
-    return estimation
-
-def get_estimations_client(email_client: str) -> List[Dict]:
-    """Récupère les estimations d'un client par email"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT id, type_projet, description_detaillee, prix_estimation,
-               statut, date_demande, numero_reference, 
-               date_estimation_terminee, date_envoi_client
-        FROM estimations
-        WHERE email_client = ?
-        ORDER BY date_demande DESC
-    ''', (email_client,))
-    
-    estimations = []
-    for row in cursor.fetchall():
-        estimations.append({
-            'id': row[0],
-            'type_projet': row[1],
-            'description_detaillee': row[2],
-            'prix_estimation': row[3],
-            'statut': row[4],
-            'date_demande': row[5],
-            'numero_reference': row[6],
-            'date_estimation_terminee': row[7],
-            'date_envoi_client': row[8]
-        })
-    
-    conn.close()
-    return estimations
-
-def mettre_a_jour_statut_estimation(estimation_id: int, nouveau_statut: str, notes_internes: str = None) -> bool:
-    """Met à jour le statut d'une estimation"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        updates = ['statut = ?']
-        params = [nouveau_statut]
-        
-        if nouveau_statut == 'en_cours':
-            updates.append('date_debut_analyse = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        elif nouveau_statut == 'terminee':
-            updates.append('date_estimation_terminee = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        elif nouveau_statut == 'envoyee':
-            updates.append('date_envoi_client = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        
-        if notes_internes:
-            updates.append('notes_internes = ?')
-            params.append(notes_internes)
-        
-        params.append(estimation_id)
-        
-        cursor.execute(f'''
-            UPDATE estimations 
-            SET {', '.join(updates)}
-            WHERE id = ?
-        ''', params)
-        
-        conn.commit()
-        return True
-        
-    except Exception as e:
-        print(f"Erreur lors de la mise à jour du statut: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
-
-def ajouter_documents_estimation(estimation_id: int, estimation_doc: str = None, facture_doc: str = None, annexes: str = None) -> bool:
-    """Ajoute les documents d'estimation et facture"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        updates = []
-        params = []
-        
-        if estimation_doc:
-            updates.append('estimation_document = ?')
-            params.append(estimation_doc)
-        
-        if facture_doc:
-            updates.append('facture_document = ?')
-            params.append(facture_doc)
-        
-        if annexes:
-            updates.append('documents_annexes = ?')
-            params.append(annexes)
-        
-        if updates:
-            updates.append('statut = ?')
-            params.append('envoyee')
-            updates.append('date_envoi_client = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-            params.append(estimation_id)
-            
-            cursor.execute(f'''
-                UPDATE estimations 
-                SET {', '.join(updates)}
-                WHERE id = ?
-            ''', params)
-        
-        conn.commit()
-        return True
-        
-    except Exception as e:
-        print(f"Erreur lors de l'ajout des documents: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
-
-def decoder_fichiers_client(fichiers_string: str) -> List[Dict]:
-    """Decode les fichiers base64 stockés par le client"""
-    fichiers = []
-    if not fichiers_string:
-        return fichiers
-    
-    try:
-        # Format: "nom_fichier:base64_content,nom_fichier2:base64_content2"
-        fichiers_raw = fichiers_string.split(',')
-        
-        for fichier_raw in fichiers_raw:
-            if ':' in fichier_raw:
-                nom_fichier, contenu_b64 = fichier_raw.split(':', 1)
-                fichiers.append({
-                    'nom': nom_fichier,
-                    'contenu_b64': contenu_b64,
-                    'taille': len(contenu_b64) * 3 // 4  # Approximation de la taille décodée
-                })
-    except Exception as e:
-        print(f"Erreur lors du décodage des fichiers: {e}")
-    
-    return fichiers
-
-def generer_lien_telechargement(nom_fichier: str, contenu_b64: str) -> str:
-    """Génère un lien de téléchargement pour un fichier base64"""
-    try:
-        # Déterminer le type MIME basé sur l'extension
-        extension = nom_fichier.lower().split('.')[-1] if '.' in nom_fichier else ''
-        mime_types = {
-            'pdf': 'application/pdf',
-            'jpg': 'image/jpeg', 'jpeg': 'image/jpeg',
-            'png': 'image/png',
-            'doc': 'application/msword',
-            'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'dwg': 'application/acad',
-            'txt': 'text/plain'
-        }
-        
-        mime_type = mime_types.get(extension, 'application/octet-stream')
-        
-        # Créer le lien de téléchargement HTML
-        download_link = f"""
-        <a href="data:{mime_type};base64,{contenu_b64}" 
-           download="{nom_fichier}"
-           style="
-               display: inline-block;
-               padding: 8px 16px;
-               background-color: #3B82F6;
-               color: white;
-               text-decoration: none;
-               border-radius: 6px;
-               font-size: 14px;
-               margin: 2px;
-           ">
-           📥 {nom_fichier}
-        </a>
-        """
-        return download_link
-    except Exception as e:
-        return f"❌ Erreur: {nom_fichier}"
-
-def formater_date_affichage(date_value) -> str:
-    """Formate une date pour l'affichage, gère différents types de données"""
-    if not date_value:
-        return "N/A"
-    
-    try:
-        if isinstance(date_value, str):
-            # Si c'est déjà une chaîne, vérifier si elle est valide
-            if len(date_value) >= 10 and date_value[:4].isdigit():
-                return date_value[:10]
-            else:
-                return "N/A"
-        elif isinstance(date_value, (int, float)):
-            # Si c'est un timestamp, le convertir
-            import datetime
-            
-            # Vérifier si le timestamp est raisonnable
-            if date_value <= 0:
-                return "N/A"
-            
-            # Si le timestamp semble être en millisecondes, le convertir
-            if date_value > 1e10:  # Plus grand que 1970 en secondes
-                date_value = date_value / 1000
-            
-            # Vérifier que le timestamp donne une date raisonnable (après 1990)
-            timestamp_1990 = datetime.datetime(1990, 1, 1).timestamp()
-            if date_value < timestamp_1990:
-                return "N/A"
-            
-            return datetime.datetime.fromtimestamp(date_value).strftime('%Y-%m-%d')
-        else:
-            # Autre type, convertir en string et prendre les 10 premiers caractères
-            str_value = str(date_value)[:10]
-            # Vérifier si ça ressemble à une date
-            if len(str_value) >= 4 and str_value[:4].isdigit():
-                return str_value
-            else:
-                return "N/A"
-    except:
-        return "N/A"
-
-def afficher_fichiers_client(plans_client: str, photos_client: str, documents_client: str):
-    """Affiche les fichiers uploadés par le client avec liens de téléchargement"""
-    
-    st.markdown("---")
-    st.markdown("### 📎 Documents fournis par le client")
-    
-    # Plans et croquis
-    if plans_client:
-        st.markdown("**📐 Plans et croquis :**")
-        plans = decoder_fichiers_client(plans_client)
-        if plans:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                for plan in plans:
-                    link = generer_lien_telechargement(plan['nom'], plan['contenu_b64'])
-                    st.markdown(link, unsafe_allow_html=True)
-            with col2:
-                st.info(f"📁 {len(plans)} fichier(s)")
-        else:
-            st.info("Aucun plan fourni")
-    
-    # Photos
-    if photos_client:
-        st.markdown("**📷 Photos de l'existant :**")
-        photos = decoder_fichiers_client(photos_client)
-        if photos:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                for photo in photos:
-                    link = generer_lien_telechargement(photo['nom'], photo['contenu_b64'])
-                    st.markdown(link, unsafe_allow_html=True)
-                    
-                    # Afficher un aperçu pour les images
-                    if photo['nom'].lower().endswith(('.jpg', '.jpeg', '.png')):
-                        try:
-                            import base64
-                            import io
-                            from PIL import Image
-                            
-                            # Décoder et afficher l'image
-                            image_data = base64.b64decode(photo['contenu_b64'])
-                            image = Image.open(io.BytesIO(image_data))
-                            
-                            # Redimensionner pour l'aperçu
-                            image.thumbnail((300, 300))
-                            st.image(image, caption=photo['nom'], width=300)
-                        except Exception as e:
-                            st.warning(f"Impossible d'afficher l'aperçu de {photo['nom']}")
-            with col2:
-                st.info(f"📸 {len(photos)} photo(s)")
-        else:
-            st.info("Aucune photo fournie")
-    
-    # Autres documents
-    if documents_client:
-        st.markdown("**📄 Autres documents :**")
-        docs = decoder_fichiers_client(documents_client)
-        if docs:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                for doc in docs:
-                    link = generer_lien_telechargement(doc['nom'], doc['contenu_b64'])
-                    st.markdown(link, unsafe_allow_html=True)
-            with col2:
-                st.info(f"📋 {len(docs)} document(s)")
-        else:
-            st.info("Aucun autre document fourni")
-    
-    # Si aucun fichier
-    if not any([plans_client, photos_client, documents_client]):
-        st.info("❌ Aucun document fourni par le client")
-
-# Fonctions de recherche et filtrage
-def filtrer_projets_pour_entrepreneurs(
-    type_projet: str = None,
-    budget_min: float = None,
-    budget_max: float = None,
-    code_postal: str = None,
-    delai_max: str = None,
-    recherche_texte: str = None
-) -> List[Dict]:
-    """Filtre les projets disponibles selon les critères"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Construction de la requête dynamique
-    query = '''
-        SELECT l.*, 
-               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions
-        FROM leads l
-        WHERE l.visible_entrepreneurs = 1 AND l.accepte_soumissions = 1
-    '''
-    params = []
-    
-    if type_projet and type_projet != "Tous":
-        query += " AND l.type_projet = ?"
-        params.append(type_projet)
-    
-    if budget_min is not None:
-        # Extraire le montant numérique du budget (format: "10 000 - 25 000 $")
-        query += " AND CAST(REPLACE(REPLACE(SUBSTR(l.budget, 1, INSTR(l.budget, ' ') - 1), ' ', ''), '$', '') AS INTEGER) >= ?"
-        params.append(budget_min)
-    
-    if budget_max is not None:
-        query += " AND CAST(REPLACE(REPLACE(SUBSTR(l.budget, 1, INSTR(l.budget, ' ') - 1), ' ', ''), '$', '') AS INTEGER) <= ?"
-        params.append(budget_max)
-    
-    if code_postal:
-        query += " AND l.code_postal LIKE ?"
-        params.append(f"{code_postal}%")
-    
-    if recherche_texte:
-        query += " AND (l.description LIKE ? OR l.type_projet LIKE ? OR l.nom LIKE ?)"
-        params.extend([f"%{recherche_texte}%", f"%{recherche_texte}%", f"%{recherche_texte}%"])
-    
-    query += " ORDER BY l.date_creation DESC"
-    
-    cursor.execute(query, params)
-    
-    projets = []
-    for row in cursor.fetchall():
-        projets.append({
-            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
-            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
-            'budget': row[7], 'delai_realisation': row[8], 'photos': row[9],
-            'plans': row[10], 'documents': row[11], 'date_creation': row[12],
-            'statut': row[13], 'numero_reference': row[14],
-            'visible_entrepreneurs': row[15], 'accepte_soumissions': row[16],
-            'nb_soumissions': row[17]
-        })
-    
-    conn.close()
-    return projets
-
-def filtrer_mes_projets(
-    email: str,
-    statut: str = None,
-    periode: str = None,
-    type_projet: str = None,
-    recherche_texte: str = None
-) -> List[Dict]:
-    """Filtre les projets d'un client selon les critères"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    query = '''
-        SELECT l.*,
-               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions,
-               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id AND s.statut = 'acceptee') as nb_acceptees
-        FROM leads l
-        WHERE l.email = ?
-    '''
-    params = [email]
-    
-    if statut and statut != "Tous":
-        if statut == "Avec soumissions":
-            query += " AND (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) > 0"
-        elif statut == "Sans soumissions":
-            query += " AND (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) = 0"
-        elif statut == "Projet terminé":
-            query += " AND (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id AND s.statut = 'acceptee') > 0"
-    
-    if periode and periode != "Toutes":
-        if periode == "Cette semaine":
-            query += " AND l.date_creation >= date('now', '-7 days')"
-        elif periode == "Ce mois":
-            query += " AND l.date_creation >= date('now', 'start of month')"
-        elif periode == "Ce trimestre":
-            query += " AND l.date_creation >= date('now', '-3 months')"
-    
-    if type_projet and type_projet != "Tous":
-        query += " AND l.type_projet = ?"
-        params.append(type_projet)
-    
-    if recherche_texte:
-        query += " AND (l.description LIKE ? OR l.type_projet LIKE ? OR l.numero_reference LIKE ?)"
-        params.extend([f"%{recherche_texte}%", f"%{recherche_texte}%", f"%{recherche_texte}%"])
-    
-    query += " ORDER BY l.date_creation DESC"
-    
-    cursor.execute(query, params)
-    
-    projets = []
-    for row in cursor.fetchall():
-        projets.append({
-            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
-            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
-            'budget': row[7], 'delai_realisation': row[8], 
-            'date_limite_soumissions': row[9], 'date_debut_souhaite': row[10], 'niveau_urgence': row[11],
-            'photos': row[12], 'plans': row[13], 'documents': row[14], 
-            'date_creation': row[15], 'statut': row[16], 'numero_reference': row[17],
-            'visible_entrepreneurs': row[18], 'accepte_soumissions': row[19],
-            'nb_soumissions': int(row[20]) if row[20] is not None else 0, 
-            'nb_acceptees': int(row[21]) if row[21] is not None else 0
-        })
-    
-    conn.close()
-    return projets
-
-def filtrer_soumissions_entrepreneur(
-    entrepreneur_id: int,
-    statut: str = None,
-    periode: str = None,
-    montant_min: float = None,
-    montant_max: float = None
-) -> List[Dict]:
-    """Filtre les soumissions d'un entrepreneur"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    query = '''
-        SELECT s.*, l.type_projet, l.nom as nom_client, l.numero_reference
-        FROM soumissions s
-        JOIN leads l ON s.lead_id = l.id
-        WHERE s.entrepreneur_id = ?
-    '''
-    params = [entrepreneur_id]
-    
-    if statut and statut != "Tous":
-        query += " AND s.statut = ?"
-        params.append(statut)
-    
-    if periode and periode != "Toutes":
-        if periode == "Ce mois":
-            query += " AND s.date_creation >= date('now', 'start of month')"
-        elif periode == "Ce trimestre":
-            query += " AND s.date_creation >= date('now', '-3 months')"
-        elif periode == "Cette année":
-            query += " AND s.date_creation >= date('now', 'start of year')"
-    
-    if montant_min is not None:
-        query += " AND s.montant >= ?"
-        params.append(montant_min)
-    
-    if montant_max is not None:
-        query += " AND s.montant <= ?"
-        params.append(montant_max)
-    
-    query += " ORDER BY s.date_creation DESC"
-    
-    cursor.execute(query, params)
-    
-    soumissions = []
-    for row in cursor.fetchall():
-        soumissions.append({
-            'id': row[0], 'lead_id': row[1], 'entrepreneur_id': row[2],
-            'montant': row[3], 'description_travaux': row[4], 'delai_execution': row[5],
-            'validite_offre': row[6], 'inclusions': row[7], 'exclusions': row[8],
-            'conditions': row[9], 'documents': row[10], 'statut': row[11],
-            'date_creation': row[12], 'type_projet': row[14],
-            'nom_client': row[15], 'numero_reference': row[16]
-        })
-    
-    conn.close()
-    return soumissions
-
-def get_soumissions_pour_projet(lead_id: int) -> List[Dict]:
-    """Récupère toutes les soumissions pour un projet"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT s.*, e.nom_entreprise, e.numero_rbq, e.certifications,
-               COALESCE(AVG(ev.note), 0) as note_moyenne,
-               COUNT(ev.note) as nombre_evaluations
-        FROM soumissions s
-        JOIN entrepreneurs e ON s.entrepreneur_id = e.id
-        LEFT JOIN soumissions s2 ON s2.entrepreneur_id = e.id
-        LEFT JOIN evaluations ev ON ev.soumission_id = s2.id AND ev.evaluateur_type = 'client'
-        WHERE s.lead_id = ?
-        GROUP BY s.id, e.nom_entreprise, e.numero_rbq, e.certifications
-        ORDER BY s.date_creation DESC
-    ''', (lead_id,))
-    
-    soumissions = []
-    for row in cursor.fetchall():
-        soumissions.append({
-            'id': row[0],
-            'lead_id': row[1],
-            'entrepreneur_id': row[2],
-            'montant': row[3],
-            'description_travaux': row[4],
-            'delai_execution': row[5],
-            'validite_offre': row[6],
-            'inclusions': row[7],
-            'exclusions': row[8],
-            'conditions': row[9],
-            'documents': row[10],
-            'statut': row[11],
-            'date_creation': row[12],
-            'nom_entreprise': row[14],
-            'numero_rbq': row[15],
-            'certifications': row[16],
-            'evaluations_moyenne': round(row[17], 1) if row[17] else 0,
-            'nombre_evaluations': row[18]
-        })
-    
-    conn.close()
-    return soumissions
-
-def get_mes_projets(email: str) -> List[Dict]:
-    """Récupère les projets d'un client par email"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT l.*,
-               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions,
-               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id AND s.statut = 'acceptee') as nb_acceptees
-        FROM leads l
-        WHERE l.email = ?
-        ORDER BY l.date_creation DESC
-    ''', (email,))
-    
-    projets = []
-    for row in cursor.fetchall():
-        projets.append({
-            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
-            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
-            'budget': row[7], 'delai_realisation': row[8], 
-            'date_limite_soumissions': row[9], 'date_debut_souhaite': row[10], 'niveau_urgence': row[11],
-            'photos': row[12], 'plans': row[13], 'documents': row[14], 
-            'date_creation': row[15], 'statut': row[16], 'numero_reference': row[17],
-            'visible_entrepreneurs': row[18], 'accepte_soumissions': row[19],
-            'nb_soumissions': int(row[20]) if row[20] is not None else 0, 
-            'nb_acceptees': int(row[21]) if row[21] is not None else 0
-        })
-    
-    conn.close()
-    return projets
-
-# Interface principale
-def main():
-    # Migration automatique et initialisation
-    check_and_migrate_database()
-    init_database()
-    init_estimations_demo()
-    
-    # Header principal
-    st.markdown("""
-    <div class="main-header">
-        <h1>🏛️ SEAOP</h1>
-        <p>Système Électronique d'Appel d'Offres Public</p>
-        <p><strong>Le MARKETPLACE de la CONSTRUCTION au Québec</strong></p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Menu de navigation
-    if 'page' not in st.session_state:
-        st.session_state.page = 'accueil'
-    
-    # Sidebar pour navigation
-    with st.sidebar:
-        # Navigation transformée en sidebar
-        st.sidebar.markdown("## 🏛️ SEAOP")
-        st.sidebar.markdown("*Système Électronique d'Appel d'Offres Public*")
-        st.sidebar.markdown("---")
-        
-        # Section principale
-        st.sidebar.markdown("### 📋 Gestion de projets")
-        page = None
-        
-        if st.sidebar.button("🏠 Accueil", use_container_width=True):
-            page = "🏠 Accueil"
-        if st.sidebar.button("📝 Publier un appel d'offres", use_container_width=True):
-            page = "📝 Publier un appel d'offres"
-        if st.sidebar.button("📋 Mes appels d'offres", use_container_width=True):
-            page = "📋 Mes appels d'offres"
-        if st.sidebar.button("🏢 Espace Entrepreneurs", use_container_width=True):
-            page = "🏢 Espace Entrepreneurs"
-        
-        st.sidebar.markdown("---")
-        st.sidebar.markdown("### 🏗️ Services professionnels")
-        
-        if st.sidebar.button("💰 Service d'estimation", use_container_width=True):
-            page = "💰 Service d'estimation"
-        if st.sidebar.button("📐 Service de technologue", use_container_width=True):
-            page = "📐 Service de technologue"
-        if st.sidebar.button("🏛️ Service d'architecture", use_container_width=True):
-            page = "🏛️ Service d'architecture"
-        if st.sidebar.button("🔧 Service d'ingénieur", use_container_width=True):
-            page = "🔧 Service d'ingénieur"
-        
-        st.sidebar.markdown("---")
-        st.sidebar.markdown("### 💻 Logiciels professionnels")
-        
-        if st.sidebar.button("🧠 EXPERTS IA", use_container_width=True):
-            page = "🧠 EXPERTS IA"
-        if st.sidebar.button("📐 TAKEOFF AI", use_container_width=True):
-            page = "📐 TAKEOFF AI"
-        if st.sidebar.button("📊 ERP AI", use_container_width=True):
-            page = "📊 ERP AI"
-        
-        st.sidebar.markdown("---")
-        st.sidebar.markdown("### 💬 Communauté")
-        
-        if st.sidebar.button("💬 Chat Room Public", use_container_width=True):
-            page = "💬 Chat Room"
-        
-        st.sidebar.markdown("---")
-        st.sidebar.markdown("### ⚙️ Administration")
-        
-        if st.sidebar.button("⚙️ Panel d'administration", use_container_width=True):
-            page = "⚙️ Administration"
-        
-        # Garder la page actuelle si aucun bouton n'est cliqué
-        if page is None:
-            page = st.session_state.get('current_page', '🏠 Accueil')
-        else:
-            st.session_state.current_page = page
-        
-        # Afficher la page actuelle
-        st.sidebar.markdown("---")
-        st.sidebar.markdown("### 📍 Page actuelle")
-        st.sidebar.info(f"**{page}**")
-        
-        # Informations sur les services
-        st.sidebar.markdown("---")
-        st.sidebar.markdown("### ℹ️ À propos")
-        st.sidebar.markdown("""
-        **Services professionnels :**
-        
-        📐 **Technologue** : ≤ 6,000 pi²  
-        🏛️ **Architecture** : > 6,000 pi²  
-        🔧 **Ingénierie** : Calculs structuraux  
-        💰 **Estimation** : Évaluation de coûts
-        
-        **Logiciels professionnels :**
-        
-        🧠 **EXPERTS IA** : 60+ experts construction  
-        📐 **TAKEOFF AI** : Estimation automatique  
-        📊 **ERP AI** : Gestion de projets
-        
-        **Contact :**
-        
-        📧 info@constructoai.ca  
-        📞 514-820-1972
-        """)
-        
-        # Footer de la sidebar
-        st.sidebar.markdown("---")
-        st.sidebar.markdown(
-            """
-            <div style="text-align: center; font-size: 12px; color: #666;">
-                © 2025 SEAOP<br>
-                <em>Développé par Sylvain Leduc</em>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
+        # Footer de la sidebar
+        st.sidebar.markdown("---")
+        st.sidebar.markdown(
+            """
+            <div style="text-align: center; font-size: 12px; color: #666;">
+                © 2025 SEAOP<br>
+                <em>Développé par Sylvain Leduc</em>
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
         
         # Notifications de messages non lus et notifications générales
         if st.session_state.get('entrepreneur_connecte'):
@@ -2070,43 +259,32 @@ def main():
     
     # Debug retiré - navigation par menu uniquement
     
-    # Vérifier si on est en mode chat
-    if st.session_state.get('mode_chat', False):
-        page_chat()
-        return
-    
-    # Vérifier si on est en mode notifications
-    if st.session_state.get('mode_notifications', False):
-        page_notifications()
-        return
-    
-    # Routing des pages
-    if st.session_state.page == 'accueil':
-        page_accueil()
-    elif st.session_state.page == 'nouveau_projet':
-        page_nouveau_projet()
-    elif st.session_state.page == 'mes_projets':
-        page_mes_projets()
-    elif st.session_state.page == 'service_estimation':
-        page_service_estimation()
-    elif st.session_state.page == 'service_technologue':
-        page_service_technologue()
-    elif st.session_state.page == 'service_architecture':
-        page_service_architecture()
-    elif st.session_state.page == 'service_ingenieur':
-        page_service_ingenieur()
-    elif st.session_state.page == 'experts_ia':
-        page_experts_ia()
-    elif st.session_state.page == 'takeoff_ai':
-        page_takeoff_ai()
-    elif st.session_state.page == 'erp_ai':
-        page_erp_ai()
-    elif st.session_state.page == 'chat_room':
-        page_chat_room_public()
-    elif st.session_state.page == 'entrepreneur':
-        page_espace_entrepreneur()
-    elif st.session_state.page == 'admin':
-        page_administration()
+    # Profilage à la demande : armé depuis le panel d'administration, ou par ?profiler=N
+    # (et &mode=echantillonnage) sur la page elle-même quand l'administrateur est connecté
+    if 'profiler' in st.query_params and st.session_state.get('admin_connecte'):
+        try:
+            armer_profilage(st.session_state.page, reruns=int(st.query_params['profiler']),
+                            mode=st.query_params.get('mode', 'cprofile'))
+        except ValueError as e:
+            st.warning(f"Profilage non armé : {e}")
+        for cle in ('profiler', 'mode'):
+            if cle in st.query_params:
+                del st.query_params[cle]
+    
+    with profiler_page(st.session_state.page):
+        # Vérifier si on est en mode chat
+        if st.session_state.get('mode_chat', False):
+            afficher_page('pages_entrepreneurs', 'page_chat')
+            return
+    
+        # Vérifier si on est en mode notifications
+        if st.session_state.get('mode_notifications', False):
+            afficher_page('pages_entrepreneurs', 'page_notifications')
+            return
+    
+        # Routing des pages
+        if st.session_state.page in PAGES:
+            afficher_page(*PAGES[st.session_state.page])
     
     # Footer
     st.markdown("---")
@@ -2119,5426 +297,9 @@ def main():
         unsafe_allow_html=True
     )
 
-def page_accueil():
-    """Page d'accueil avec présentation du service"""
-    
-    # Navigation uniquement par le menu
-    st.info("ℹ️ Utilisez le menu de navigation dans la barre latérale gauche pour accéder aux différentes sections.")
-    st.markdown("---")
-    
-    # Section héro
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        st.markdown("""
-        ### 🎯 Système d'Appel d'Offres Électronique
-        
-        **Pour les organismes publics et clients:**
-        1. 📝 Publiez vos appels d'offres avec tous les détails et plans
-        2. 📊 Recevez des soumissions détaillées d'entrepreneurs qualifiés RBQ
-        3. 💬 Communiquez directement avec les entrepreneurs
-        4. ✅ Sélectionnez la meilleure offre selon vos critères
-        
-        **Pour les entrepreneurs et fournisseurs:**
-        1. 🔍 Consultez les appels d'offres disponibles
-        2. 📋 Soumettez vos propositions conformes aux exigences
-        3. 💼 Présentez votre expertise et certifications
-        4. 🤝 Obtenez de nouveaux contrats publics
-        """)
-        
-        st.markdown("**Pour commencer :**")
-        st.markdown("👉 Utilisez le **menu de navigation** dans la barre latérale gauche")
-        st.markdown("👉 Sélectionnez **'📝 Publier un appel d'offres'** dans le menu déroulant")
-    
-    with col2:
-        st.markdown("""
-        ### 📊 Statistiques
-        """)
-        
-        # Stats fictives pour la démo
-        st.metric("Appels d'offres actifs", "127", "+12 cette semaine")
-        st.metric("Fournisseurs qualifiés", "342", "+8 cette semaine")
-        st.metric("Soumissions reçues", "1,245", "+89 cette semaine")
-        st.metric("Taux de conformité", "96%", "+2%")
-    
-    # Appels d'offres récents
-    st.markdown("---")
-    st.markdown("### 🆕 Appels d'offres récents")
-    
-    projets = get_projets_disponibles()[:5]
-    
-    if projets:
-        for projet in projets:
-            # Obtenir les informations d'urgence
-            icone_urgence, couleur_urgence, libelle_urgence = get_couleur_urgence(projet['niveau_urgence'])
-            jours_min = min(projet['jours_restants_soumissions'], projet['jours_restants_debut'])
-            message_urgence = get_message_urgence(projet['niveau_urgence'], jours_min)
-            
-            with st.container():
-                # Afficher un badge d'urgence visible
-                if projet['niveau_urgence'] in ['critique', 'eleve']:
-                    st.markdown(f"""
-                        <div style="background-color: {couleur_urgence}; color: white; padding: 8px; border-radius: 4px; margin-bottom: 10px; text-align: center; font-weight: bold;">
-                            {icone_urgence} {message_urgence}
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
-                
-                with col1:
-                    st.markdown(f"**{projet['type_projet']}** - {projet['code_postal']}")
-                    st.caption(f"Budget: {projet['budget']} • Délai: {projet['delai_realisation']}")
-                
-                with col2:
-                    st.caption(f"📋 {projet['nb_soumissions']} soumissions")
-                
-                with col3:
-                    date_affichage = formater_date_affichage(projet['date_creation'])
-                    st.caption(f"📅 {date_affichage}")
-                
-                with col4:
-                    # Indicateur d'urgence compact
-                    st.markdown(f"""
-                        <div style="text-align: center;">
-                            <span style="font-size: 24px;">{icone_urgence}</span><br>
-                            <small style="color: {couleur_urgence}; font-weight: bold;">{libelle_urgence}</small>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("---")
-    else:
-        st.info("Aucun appel d'offres disponible pour le moment")
-
-def page_nouveau_projet():
-    """Page pour créer un nouvel appel d'offres"""
-    
-    st.markdown("## 📝 Publier un nouvel appel d'offres")
-    st.markdown("Décrivez votre projet en détail pour recevoir des soumissions conformes aux exigences")
-    
-    with st.form("formulaire_projet"):
-        # Informations personnelles
-        st.markdown("### 👤 Vos informations")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            nom = st.text_input("Nom complet *", placeholder="Jean Tremblay")
-            telephone = st.text_input("Téléphone *", placeholder="514-123-4567")
-        
-        with col2:
-            email = st.text_input("Email *", placeholder="jean.tremblay@email.com")
-            code_postal = st.text_input("Code postal *", placeholder="H1A 1A1")
-        
-        # Détails du projet
-        st.markdown("### 🏗️ Détails du projet")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            type_projet = st.selectbox(
-                "Type de projet *",
-                ["", "Rénovation cuisine", "Rénovation salle de bain", "Toiture", 
-                 "Revêtement extérieur", "Plancher", "Peinture", "Agrandissement",
-                 "Électricité", "Plomberie", "Chauffage/Climatisation", "Isolation",
-                 "Fenêtres et portes", "Maçonnerie", "Charpenterie", "Autre"]
-            )
-            
-            budget = st.selectbox(
-                "Budget estimé *",
-                ["", "Moins de 5 000$", "5 000$ - 15 000$", "15 000$ - 30 000$", 
-                 "30 000$ - 50 000$", "Plus de 50 000$", "À déterminer"]
-            )
-        
-        with col2:
-            delai_realisation = st.selectbox(
-                "Délai de réalisation souhaité *",
-                ["", "Dès que possible", "Dans 1 mois", "Dans 2-3 mois", 
-                 "Dans 3-6 mois", "Plus de 6 mois", "Flexible"]
-            )
-            
-            niveau_urgence = st.selectbox(
-                "Niveau d'urgence",
-                ["normal", "faible", "eleve", "critique"],
-                format_func=lambda x: {
-                    'faible': '🟢 Faible - Pas pressé',
-                    'normal': '🟡 Normal - Dans les temps',
-                    'eleve': '🟠 Élevé - Assez urgent',
-                    'critique': '🔴 Critique - Très urgent'
-                }[x],
-                help="Indiquez le niveau d'urgence de votre projet"
-            )
-        
-        description = st.text_area(
-            "Description détaillée du projet *",
-            placeholder="""Décrivez votre projet en détail :
-- Dimensions et superficie
-- Matériaux souhaités
-- Contraintes particulières
-- Accès au chantier
-- Préférences spécifiques
-- Etc.""",
-            height=200
-        )
-        
-        # Délais et échéances
-        st.markdown("### ⏰ Délais et échéances")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            date_limite_soumissions = st.date_input(
-                "Date limite pour recevoir les soumissions",
-                value=datetime.date.today() + datetime.timedelta(days=14),
-                min_value=datetime.date.today() + datetime.timedelta(days=1),
-                help="Date après laquelle aucune nouvelle soumission ne sera acceptée"
-            )
-        
-        with col2:
-            date_debut_souhaite = st.date_input(
-                "Date de début souhaitée des travaux",
-                value=datetime.date.today() + datetime.timedelta(days=30),
-                min_value=datetime.date.today() + datetime.timedelta(days=1),
-                help="Date à laquelle vous souhaitez que les travaux commencent"
-            )
-        
-        # Afficher un aperçu de l'urgence basé sur les dates sélectionnées
-        if date_limite_soumissions and date_debut_souhaite:
-            urgence_calculee = determiner_niveau_urgence_automatique(
-                str(date_limite_soumissions), 
-                str(date_debut_souhaite)
-            )
-            icone_calc, couleur_calc, libelle_calc = get_couleur_urgence(urgence_calculee)
-            
-            st.info(f"""
-                **Urgence calculée automatiquement :** {icone_calc} {libelle_calc}
-                
-                Basé sur vos dates, le système recommande un niveau d'urgence **{libelle_calc.lower()}**.
-                Vous pouvez ajuster manuellement ci-dessus si nécessaire.
-            """)
-        
-        # Upload de fichiers
-        st.markdown("### 📎 Documents et plans")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            photos = st.file_uploader(
-                "Photos actuelles",
-                type=['png', 'jpg', 'jpeg'],
-                accept_multiple_files=True,
-                help="Photos de l'état actuel"
-            )
-        
-        with col2:
-            plans = st.file_uploader(
-                "Plans et croquis",
-                type=['pdf', 'png', 'jpg', 'jpeg', 'dwg'],
-                accept_multiple_files=True,
-                help="Plans architecturaux, croquis, dessins"
-            )
-        
-        with col3:
-            documents = st.file_uploader(
-                "Autres documents",
-                type=['pdf', 'doc', 'docx', 'xls', 'xlsx'],
-                accept_multiple_files=True,
-                help="Devis existants, permis, etc."
-            )
-        
-        # Options
-        st.markdown("### ⚙️ Options")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            visible_entrepreneurs = st.checkbox(
-                "Rendre mon projet visible aux entrepreneurs",
-                value=True,
-                help="Les entrepreneurs pourront voir et soumissionner sur votre projet"
-            )
-        
-        with col2:
-            accepte_soumissions = st.checkbox(
-                "Accepter les soumissions",
-                value=True,
-                help="Vous pourrez fermer les soumissions une fois satisfait"
-            )
-        
-        # Consentement
-        consentement = st.checkbox(
-            "J'accepte que mes informations soient partagées avec les entrepreneurs pour recevoir des soumissions. *"
-        )
-        
-        # Soumission
-        submitted = st.form_submit_button("🚀 Publier mon projet", type="primary")
-        
-        if submitted:
-            # Validation
-            erreurs = []
-            
-            if not nom.strip():
-                erreurs.append("Le nom est requis")
-            if not email.strip() or not valider_email(email):
-                erreurs.append("Email valide requis")
-            if not telephone.strip() or not valider_telephone(telephone):
-                erreurs.append("Téléphone valide requis")
-            if not code_postal.strip() or not valider_code_postal(code_postal):
-                erreurs.append("Code postal valide requis")
-            if not type_projet:
-                erreurs.append("Type de projet requis")
-            if not budget:
-                erreurs.append("Budget requis")
-            if not delai_realisation:
-                erreurs.append("Délai requis")
-            if not description.strip() or len(description) < 50:
-                erreurs.append("Description détaillée requise (min. 50 caractères)")
-            if not consentement:
-                erreurs.append("Consentement requis")
-            
-            if erreurs:
-                for erreur in erreurs:
-                    st.error(f"❌ {erreur}")
-            else:
-                # Traitement des fichiers
-                photos_data = None
-                if photos:
-                    photos_base64 = []
-                    for photo in photos[:5]:  # Limiter à 5 photos
-                        photo_data = base64.b64encode(photo.read()).decode()
-                        photos_base64.append(photo_data)
-                    photos_data = ",".join(photos_base64)
-                
-                plans_data = None
-                if plans:
-                    plans_base64 = []
-                    for plan in plans[:3]:  # Limiter à 3 plans
-                        plan_data = base64.b64encode(plan.read()).decode()
-                        plans_base64.append(plan_data)
-                    plans_data = ",".join(plans_base64)
-                
-                documents_data = None
-                if documents:
-                    docs_base64 = []
-                    for doc in documents[:3]:  # Limiter à 3 documents
-                        doc_data = base64.b64encode(doc.read()).decode()
-                        docs_base64.append(doc_data)
-                    documents_data = ",".join(docs_base64)
-                
-                # Création du lead
-                lead = Lead(
-                    nom=nom,
-                    email=email,
-                    telephone=telephone,
-                    code_postal=code_postal,
-                    type_projet=type_projet,
-                    description=description,
-                    budget=budget,
-                    delai_realisation=delai_realisation,
-                    date_limite_soumissions=str(date_limite_soumissions),
-                    date_debut_souhaite=str(date_debut_souhaite),
-                    niveau_urgence=niveau_urgence,
-                    photos=photos_data,
-                    plans=plans_data,
-                    documents=documents_data,
-                    visible_entrepreneurs=visible_entrepreneurs,
-                    accepte_soumissions=accepte_soumissions
-                )
-                
-                # Sauvegarde
-                numero_reference = sauvegarder_lead(lead)
-                
-                # Message de succès
-                st.success(f"""
-                ✅ **Votre projet a été publié avec succès!**
-                
-                **Numéro de référence:** {numero_reference}
-                
-                📧 Un email de confirmation vous a été envoyé.
-                
-                📋 Les entrepreneurs peuvent maintenant consulter votre projet et soumettre leurs propositions.
-                
-                💡 **Prochaines étapes:**
-                1. Consultez régulièrement vos soumissions dans "Mes projets"
-                2. Communiquez avec les entrepreneurs via la messagerie
-                3. Comparez les offres et choisissez la meilleure
-                """)
-                
-                # Stocker l'email en session pour accès rapide
-                st.session_state.client_email = email
-                
-                st.balloons()
-
-def page_mes_projets():
-    """Page pour consulter ses projets et soumissions"""
-    
-    # En-tête avec notifications
-    col1, col2 = st.columns([4, 1])
-    with col1:
-        st.markdown("## 📋 Mes projets")
-    
-    with col2:
-        # Afficher notifications si client connecté
-        if 'client_email' in st.session_state:
-            # Utiliser l'ID du premier projet comme référence client (pas optimal mais fonctionnel)
-            projets = get_mes_projets(st.session_state.client_email)
-            if projets:
-                client_id = projets[0]['id']
-                notifs_non_lues = count_notifications_non_lues('client', client_id)
-                
-                if notifs_non_lues > 0:
-                    if st.button(f"🔔 Notifications ({notifs_non_lues})", key="voir_notifs_client"):
-                        st.session_state.mode_notifications = True
-                        st.session_state.notif_type_utilisateur = 'client'
-                        st.session_state.notif_utilisateur_id = client_id
-                        st.rerun()
-    
-    # Demander l'email si pas en session
-    if 'client_email' not in st.session_state:
-        email = st.text_input("Entrez votre email pour voir vos projets:", placeholder="votre@email.com")
-        if st.button("Voir mes projets"):
-            if email and valider_email(email):
-                st.session_state.client_email = email
-                st.rerun()
-            else:
-                st.error("Email invalide")
-        return
-    
-    email = st.session_state.client_email
-    st.caption(f"Connecté en tant que: {email}")
-    
-    # Récupérer les projets
-    projets = get_mes_projets(email)
-    
-    if not projets:
-        st.info("Vous n'avez pas encore de projets. Créez votre premier projet!")
-        if st.button("📝 Créer un projet"):
-            st.session_state.page = 'nouveau_projet'
-            st.rerun()
-        return
-    
-    # Onglets pour séparer projets et dashboard
-    tab1, tab2 = st.tabs(["📋 Mes projets", "📊 Dashboard"])
-    
-    with tab1:
-        st.markdown("### 🏗️ Vos projets actifs")
-        
-        # Interface de filtrage pour les projets clients
-        with st.expander("🔍 Filtres mes projets", expanded=False):
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                recherche_client = st.text_input(
-                    "🔍 Recherche",
-                    placeholder="Description, type, référence...",
-                    key="recherche_client_projets"
-                )
-                
-                statut_client_filtre = st.selectbox(
-                    "📊 Statut",
-                    ["Tous", "Avec soumissions", "Sans soumissions", "Projet terminé"],
-                    key="statut_client_filtre"
-                )
-            
-            with col2:
-                periode_client_filtre = st.selectbox(
-                    "📅 Période",
-                    ["Toutes", "Cette semaine", "Ce mois", "Ce trimestre"],
-                    key="periode_client_filtre"
-                )
-                
-                type_projet_client_filtre = st.selectbox(
-                    "🏗️ Type de projet",
-                    ["Tous", "Rénovation résidentielle", "Construction neuve", "Rénovation commerciale", 
-                     "Toiture", "Plomberie", "Électricité", "Paysagement", "Autres"],
-                    key="type_projet_client_filtre"
-                )
-            
-            with col3:
-                trier_projets_client = st.selectbox(
-                    "📊 Trier par",
-                    ["Date (plus récent)", "Date (plus ancien)", "Nb soumissions (décroissant)", "Nb soumissions (croissant)"],
-                    key="tri_projets_client"
-                )
-        
-        # Application des filtres
-        projets_filtres = filtrer_mes_projets(
-            email=email,
-            statut=statut_client_filtre if statut_client_filtre != "Tous" else None,
-            periode=periode_client_filtre if periode_client_filtre != "Toutes" else None,
-            type_projet=type_projet_client_filtre if type_projet_client_filtre != "Tous" else None,
-            recherche_texte=recherche_client if recherche_client else None
-        )
-        
-        # Affichage des résultats
-        st.markdown(f"**{len(projets_filtres)} projet(s) trouvé(s)**")
-        
-        # Afficher les projets filtrés
-        for projet in projets_filtres:
-            with st.expander(f"🏗️ {projet['type_projet']} - {projet['numero_reference']}", expanded=True):
-                # Infos du projet
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.markdown("**Détails du projet:**")
-                    st.write(f"Budget: {projet['budget']}")
-                    st.write(f"Délai: {projet['delai_realisation']}")
-                    st.write(f"Code postal: {projet['code_postal']}")
-                
-                with col2:
-                    st.markdown("**Statut:**")
-                    if projet['nb_soumissions'] > 0:
-                        st.success(f"📋 {projet['nb_soumissions']} soumission(s) reçue(s)")
-                    else:
-                        st.info("En attente de soumissions")
-                    
-                    if projet['nb_acceptees'] > 0:
-                        st.success("✅ Soumission acceptée")
-                
-                with col3:
-                    st.markdown("**Actions:**")
-                    if projet['accepte_soumissions']:
-                        if st.button(f"🔒 Fermer les soumissions", key=f"fermer_{projet['id']}"):
-                            # Fermer les soumissions
-                            conn = sqlite3.connect(DATABASE_PATH)
-                            cursor = conn.cursor()
-                            cursor.execute('''
-                                UPDATE leads SET accepte_soumissions = 0 WHERE id = ?
-                            ''', (projet['id'],))
-                            conn.commit()
-                            conn.close()
-                            st.success("Soumissions fermées")
-                            st.rerun()
-                    else:
-                        st.caption("Soumissions fermées")
-                
-                # Description
-                st.markdown("**Description:**")
-                st.text_area("", value=projet['description'], height=100, disabled=True, key=f"desc_{projet['id']}")
-                
-                # Soumissions reçues
-                if projet['nb_soumissions'] > 0:
-                    st.markdown("---")
-                    st.markdown("### 📊 Soumissions reçues")
-                    
-                    soumissions = get_soumissions_pour_projet(projet['id'])
-                    
-                    for i, soum in enumerate(soumissions):
-                        with st.container():
-                            col1, col2, col3 = st.columns([2, 1, 1])
-                            
-                            with col1:
-                                st.markdown(f"**{soum['nom_entreprise']}**")
-                                if soum['numero_rbq']:
-                                    st.caption(f"RBQ: {soum['numero_rbq']}")
-                                if soum['evaluations_moyenne'] > 0:
-                                    stars = "⭐" * int(soum['evaluations_moyenne'])
-                                    st.caption(f"{stars} {soum['evaluations_moyenne']}/5 ({soum['nombre_evaluations']} avis)")
-                                else:
-                                    st.caption("Aucune évaluation encore")
-                            
-                            with col2:
-                                st.metric("Montant", f"{soum['montant']:,.2f}$")
-                            
-                            with col3:
-                                st.caption(f"Délai: {soum['delai_execution']}")
-                                st.caption(f"Validité: {soum['validite_offre']}")
-                            
-                            # Détails de la soumission
-                            with st.expander(f"Voir les détails de la soumission"):
-                                st.markdown("**Description des travaux:**")
-                                st.text_area("", value=soum['description_travaux'], height=200, disabled=True, key=f"travaux_{soum['id']}")
-                                
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.markdown("**Inclusions:**")
-                                    st.text_area("", value=soum['inclusions'] or "Non spécifié", height=100, disabled=True, key=f"incl_{soum['id']}")
-                                
-                                with col2:
-                                    st.markdown("**Exclusions:**")
-                                    st.text_area("", value=soum['exclusions'] or "Non spécifié", height=100, disabled=True, key=f"excl_{soum['id']}")
-                                
-                                st.markdown("**Conditions:**")
-                                st.text_area("", value=soum['conditions'] or "Non spécifié", height=80, disabled=True, key=f"cond_{soum['id']}")
-                                
-                                # Affichage des pièces jointes de la soumission
-                                if soum['documents']:
-                                    st.markdown("---")
-                                    st.markdown("### 📎 Documents joints à la soumission")
-                                    
-                                    try:
-                                        # Format: "filename1:base64data1|filename2:base64data2"
-                                        documents_list = soum['documents'].split('|')
-                                        
-                                        cols = st.columns(min(3, len(documents_list)))
-                                        
-                                        for i, doc_entry in enumerate(documents_list):
-                                            if ':' in doc_entry:
-                                                filename, doc_base64 = doc_entry.split(':', 1)
-                                                
-                                                with cols[i % 3]:
-                                                    try:
-                                                        doc_data = base64.b64decode(doc_base64)
-                                                        
-                                                        # Déterminer le type MIME basé sur l'extension
-                                                        if filename.lower().endswith('.pdf'):
-                                                            mime_type = "application/pdf"
-                                                        elif filename.lower().endswith(('.doc', '.docx')):
-                                                            mime_type = "application/msword"
-                                                        elif filename.lower().endswith(('.xls', '.xlsx')):
-                                                            mime_type = "application/vnd.ms-excel"
-                                                        elif filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                                                            mime_type = "image/png"
-                                                        else:
-                                                            mime_type = "application/octet-stream"
-                                                        
-                                                        st.download_button(
-                                                            f"📄 {filename}",
-                                                            data=doc_data,
-                                                            file_name=filename,
-                                                            mime=mime_type,
-                                                            key=f"download_{soum['id']}_{i}",
-                                                            use_container_width=True
-                                                        )
-                                                    except Exception as e:
-                                                        st.error(f"Erreur lors du chargement de {filename}")
-                                    except Exception as e:
-                                        st.error("Erreur lors du traitement des documents")
-                                
-                                # Actions sur la soumission
-                                col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                if soum['statut'] != 'acceptee':
-                                    if st.button("✅ Accepter", key=f"accept_{soum['id']}", type="primary"):
-                                        conn = sqlite3.connect(DATABASE_PATH)
-                                        cursor = conn.cursor()
-                                        cursor.execute('''
-                                            UPDATE soumissions SET statut = 'acceptee' WHERE id = ?
-                                        ''', (soum['id'],))
-                                        conn.commit()
-                                        conn.close()
-                                        
-                                        # Créer notification pour l'entrepreneur
-                                        notifier_soumission_acceptee(soum['id'])
-                                        
-                                        st.success("Soumission acceptée!")
-                                        st.rerun()
-                                else:
-                                    st.success("✅ Soumission acceptée")
-                            
-                            with col2:
-                                if soum['statut'] != 'refusee' and soum['statut'] != 'acceptee':
-                                    if st.button("❌ Refuser", key=f"refuse_{soum['id']}"):
-                                        conn = sqlite3.connect(DATABASE_PATH)
-                                        cursor = conn.cursor()
-                                        cursor.execute('''
-                                            UPDATE soumissions SET statut = 'refusee' WHERE id = ?
-                                        ''', (soum['id'],))
-                                        conn.commit()
-                                        conn.close()
-                                        
-                                        # Créer notification pour l'entrepreneur
-                                        notifier_soumission_refusee(soum['id'])
-                                        
-                                        st.info("Soumission refusée")
-                                        st.rerun()
-                            
-                            with col3:
-                                if st.button("💬 Chat", key=f"chat_{soum['id']}", help="Discuter avec l'entrepreneur"):
-                                    st.session_state.chat_lead_id = projet['id']
-                                    st.session_state.chat_entrepreneur_id = soum['entrepreneur_id']
-                                    st.session_state.chat_nom_entrepreneur = soum['nom_entreprise']
-                                    st.session_state.chat_type_utilisateur = 'client'
-                                    st.session_state.mode_chat = True
-                                    st.rerun()
-                            
-                            # Section évaluation (visible seulement si soumission acceptée)
-                            if soum['statut'] == 'acceptee':
-                                st.markdown("---")
-                                st.markdown("### ⭐ Évaluer cet entrepreneur")
-                                
-                                # Vérifier si déjà évalué
-                                evaluation_existante = get_evaluation_soumission(soum['id'], 'client')
-                                
-                                if evaluation_existante:
-                                    st.success(f"✅ Vous avez déjà évalué : {evaluation_existante['note']}/5 ⭐")
-                                    if evaluation_existante['commentaire']:
-                                        st.info(f"💬 Votre commentaire : {evaluation_existante['commentaire']}")
-                                else:
-                                    with st.form(f"evaluation_{soum['id']}"):
-                                        col_eval1, col_eval2 = st.columns([1, 2])
-                                        
-                                        with col_eval1:
-                                            note = st.selectbox(
-                                                "Note sur 5",
-                                                options=[5, 4, 3, 2, 1],
-                                                format_func=lambda x: f"{x} ⭐" + (" - Excellent" if x==5 else " - Très bon" if x==4 else " - Correct" if x==3 else " - Moyen" if x==2 else " - Décevant"),
-                                                key=f"note_{soum['id']}"
-                                            )
-                                        
-                                        with col_eval2:
-                                            commentaire = st.text_area(
-                                                "Commentaire (optionnel)",
-                                                placeholder="Décrivez votre expérience avec cet entrepreneur...",
-                                                height=100,
-                                                key=f"comment_{soum['id']}"
-                                            )
-                                        
-                                        if st.form_submit_button("📝 Publier l'évaluation", type="primary"):
-                                            if ajouter_evaluation(soum['id'], 'client', note, commentaire):
-                                                st.success("✅ Évaluation publiée avec succès!")
-                                                st.balloons()
-                                                st.rerun()
-                                            else:
-                                                st.error("❌ Erreur lors de la publication de l'évaluation")
-                        
-                        st.markdown("---")
-    
-    with tab2:
-        st.markdown("### 📊 Tableau de bord client")
-        
-        # Récupérer les statistiques
-        stats = get_stats_client(email)
-        
-        # Métriques principales
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Projets publiés", stats['nb_projets'])
-        
-        with col2:
-            st.metric("Soumissions reçues", stats['total_soumissions'])
-        
-        with col3:
-            st.metric("Soumissions acceptées", stats['soumissions_acceptees'])
-        
-        with col4:
-            st.metric("Taux d'acceptation", f"{stats['taux_acceptation']}%")
-        
-        st.markdown("---")
-        
-        # Statistiques détaillées
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### 💰 Analyse financière")
-            if stats['montant_moyen_soumissions'] > 0:
-                st.metric("Montant moyen des soumissions", f"{stats['montant_moyen_soumissions']:,.2f} $")
-                st.metric("Soumissions par projet (moyenne)", stats['moy_soumissions_par_projet'])
-            else:
-                st.info("Aucune soumission reçue encore")
-        
-        with col2:
-            st.markdown("### 📈 Performance")
-            if stats['evolution_mensuelle']:
-                st.markdown("**Évolution mensuelle :**")
-                for mois, nb_projets, nb_soumissions in stats['evolution_mensuelle'][:3]:
-                    st.write(f"**{mois}** : {nb_projets} projet(s), {nb_soumissions} soumission(s)")
-            else:
-                st.info("Pas encore d'historique disponible")
-        
-        # Conseils et recommandations
-        st.markdown("---")
-        st.markdown("### 💡 Recommandations")
-        
-        if stats['nb_projets'] == 0:
-            st.info("🚀 Commencez par publier votre premier appel d'offres !")
-        elif stats['total_soumissions'] == 0:
-            st.warning("📢 Vos projets n'ont pas encore reçu de soumissions. Vérifiez vos descriptions et budgets.")
-        elif stats['taux_acceptation'] < 50 and stats['soumissions_acceptees'] > 0:
-            st.warning("⚡ Votre taux d'acceptation est bas. Considérez réviser vos critères de sélection.")
-        else:
-            st.success("✅ Excellent ! Votre utilisation de SEAOP est optimale.")
-
-def page_chat():
-    """Interface de chat entre client et entrepreneur"""
-    if 'mode_chat' not in st.session_state or not st.session_state.mode_chat:
-        return
-    
-    # Récupérer les informations du chat
-    lead_id = st.session_state.get('chat_lead_id')
-    entrepreneur_id = st.session_state.get('chat_entrepreneur_id')
-    type_utilisateur = st.session_state.get('chat_type_utilisateur', 'client')
-    
-    if not lead_id or not entrepreneur_id:
-        st.error("Erreur: informations de chat manquantes")
-        return
-    
-    # En-tête du chat
-    col1, col2, col3 = st.columns([5, 1, 1])
-    with col1:
-        if type_utilisateur == 'client':
-            nom_correspondant = st.session_state.get('chat_nom_entrepreneur', 'Entrepreneur')
-            st.markdown(f"## 💬 Chat avec {nom_correspondant}")
-        else:
-            nom_correspondant = st.session_state.get('chat_nom_client', 'Client')
-            st.markdown(f"## 💬 Chat avec {nom_correspondant}")
-    
-    with col2:
-        if st.button("🔄 Actualiser", key="refresh_chat", help="Actualiser les messages"):
-            st.rerun()
-    
-    with col3:
-        if st.button("❌ Fermer", key="fermer_chat"):
-            st.session_state.mode_chat = False
-            for key in ['chat_lead_id', 'chat_entrepreneur_id', 'chat_nom_entrepreneur', 'chat_nom_client', 'chat_type_utilisateur']:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.rerun()
-    
-    st.markdown("---")
-    
-    # Récupérer les messages de la conversation
-    messages = get_messages_conversation(lead_id, entrepreneur_id)
-    
-    # Marquer les messages comme lus
-    if type_utilisateur == 'client':
-        # Le client lit les messages de l'entrepreneur
-        projet = get_mes_projets("dummy")[0] if get_mes_projets("dummy") else None
-        if projet:
-            marquer_messages_lus(lead_id, entrepreneur_id, projet['id'])
-    else:
-        # L'entrepreneur lit les messages du client
-        marquer_messages_lus(lead_id, entrepreneur_id, entrepreneur_id)
-    
-    # Affichage des messages
-    st.markdown("### 📝 Conversation")
-    
-    # Container pour les messages avec scroll
-    chat_container = st.container()
-    with chat_container:
-        if not messages:
-            st.info("💬 Aucun message pour le moment. Commencez la conversation !")
-        else:
-            for msg in messages:
-                date_msg = msg['date_envoi'][:16] if msg['date_envoi'] else ""
-                
-                if msg['expediteur_type'] == type_utilisateur:
-                    # Message de l'utilisateur actuel (à droite)
-                    col1, col2 = st.columns([1, 3])
-                    with col2:
-                        st.markdown(f"""
-                        <div style="background-color: #E3F2FD; padding: 10px; border-radius: 10px; margin: 5px 0; text-align: right;">
-                            <strong>Vous</strong> - {date_msg}<br>
-                            {msg['message']}
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    # Message du correspondant (à gauche)
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.markdown(f"""
-                        <div style="background-color: #F5F5F5; padding: 10px; border-radius: 10px; margin: 5px 0;">
-                            <strong>{msg['nom_expediteur']}</strong> - {date_msg}<br>
-                            {msg['message']}
-                        </div>
-                        """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Formulaire d'envoi de message
-    st.markdown("### ✍️ Envoyer un message")
-    with st.form("nouveau_message", clear_on_submit=True):
-        message = st.text_area(
-            "Votre message",
-            placeholder="Tapez votre message ici...",
-            height=100,
-            key="message_input"
-        )
-        
-        col1, col2 = st.columns([1, 4])
-        with col1:
-            if st.form_submit_button("📤 Envoyer", type="primary"):
-                if message.strip():
-                    # Déterminer les IDs d'expéditeur et destinataire
-                    if type_utilisateur == 'client':
-                        # Récupérer l'ID du client à partir du projet
-                        conn = sqlite3.connect(DATABASE_PATH)
-                        cursor = conn.cursor()
-                        cursor.execute('SELECT id FROM leads WHERE id = ?', (lead_id,))
-                        result = cursor.fetchone()
-                        conn.close()
-                        
-                        if result:
-                            expediteur_id = result[0]
-                            destinataire_id = entrepreneur_id
-                            expediteur_type = 'client'
-                        else:
-                            st.error("Erreur: impossible de récupérer les informations du client")
-                            st.stop()
-                    else:
-                        expediteur_id = entrepreneur_id
-                        destinataire_id = lead_id
-                        expediteur_type = 'entrepreneur'
-                    
-                    # Envoyer le message
-                    if envoyer_message(lead_id, entrepreneur_id, expediteur_type, expediteur_id, destinataire_id, message):
-                        # Créer notification pour le destinataire
-                        notifier_nouveau_message(lead_id, entrepreneur_id, expediteur_type)
-                        
-                        st.success("Message envoyé!")
-                        st.rerun()
-                    else:
-                        st.error("Erreur lors de l'envoi du message")
-                else:
-                    st.warning("Veuillez saisir un message")
-
-def page_notifications():
-    """Centre de notifications"""
-    if 'mode_notifications' not in st.session_state or not st.session_state.mode_notifications:
-        return
-    
-    type_utilisateur = st.session_state.get('notif_type_utilisateur')
-    utilisateur_id = st.session_state.get('notif_utilisateur_id')
-    
-    if not type_utilisateur or not utilisateur_id:
-        st.error("Erreur: informations de notification manquantes")
-        return
-    
-    # En-tête
-    col1, col2, col3 = st.columns([5, 1, 1])
-    with col1:
-        st.markdown("## 🔔 Centre de notifications")
-    
-    with col2:
-        if st.button("✅ Tout marquer lu", key="marquer_tout_lu"):
-            if marquer_toutes_notifications_lues(type_utilisateur, utilisateur_id):
-                st.success("Toutes les notifications marquées comme lues")
-                st.rerun()
-    
-    with col3:
-        if st.button("❌ Fermer", key="fermer_notifications"):
-            st.session_state.mode_notifications = False
-            for key in ['notif_type_utilisateur', 'notif_utilisateur_id']:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.rerun()
-    
-    st.markdown("---")
-    
-    # Récupérer les notifications
-    notifications = get_notifications_utilisateur(type_utilisateur, utilisateur_id, 20)
-    
-    if not notifications:
-        st.info("🎉 Aucune notification pour le moment !")
-    else:
-        st.markdown(f"📋 **{len(notifications)} notification(s)**")
-        st.markdown("---")
-        
-        for notif in notifications:
-            # Style différent pour les notifications non lues
-            if not notif['lu']:
-                st.markdown(f"""
-                <div style="background-color: #E3F2FD; padding: 15px; border-radius: 10px; margin: 10px 0; border-left: 4px solid #2196F3;">
-                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <div>
-                            <strong>{notif['titre']}</strong><br>
-                            {notif['message']}<br>
-                            <small style="color: #666;">{notif['date_creation'][:16] if notif['date_creation'] else ""}</small>
-                        </div>
-                        <div>
-                            <span style="background-color: #2196F3; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">NOUVEAU</span>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Bouton pour marquer comme lu
-                col1, col2 = st.columns([1, 5])
-                with col1:
-                    if st.button("✅ Lu", key=f"marquer_lu_{notif['id']}"):
-                        if marquer_notification_lue(notif['id']):
-                            st.rerun()
-            else:
-                st.markdown(f"""
-                <div style="background-color: #F5F5F5; padding: 15px; border-radius: 10px; margin: 10px 0;">
-                    <div>
-                        <strong>{notif['titre']}</strong><br>
-                        {notif['message']}<br>
-                        <small style="color: #666;">{notif['date_creation'][:16] if notif['date_creation'] else ""}</small>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-
-def page_espace_entrepreneur():
-    """Espace entrepreneur pour consulter projets et soumettre"""
-    
-    if 'entrepreneur_connecte' not in st.session_state:
-        st.session_state.entrepreneur_connecte = None
-    
-    if st.session_state.entrepreneur_connecte is None:
-        # Page de connexion
-        st.markdown("## 👷 Espace Entrepreneur")
-        
-        tab1, tab2 = st.tabs(["🔐 Connexion", "📝 Inscription"])
-        
-        with tab1:
-            with st.form("connexion_entrepreneur"):
-                st.markdown("### Connectez-vous")
-                
-                email = st.text_input("Email", placeholder="votre@entreprise.ca")
-                mot_de_passe = st.text_input("Mot de passe", type="password")
-                
-                if st.form_submit_button("🔐 Se connecter", type="primary"):
-                    if email and mot_de_passe:
-                        entrepreneur = authentifier_entrepreneur(email, mot_de_passe)
-                        if entrepreneur:
-                            st.session_state.entrepreneur_connecte = entrepreneur
-                            st.success("✅ Connexion réussie!")
-                            st.rerun()
-                        else:
-                            st.error("❌ Email ou mot de passe incorrect")
-                    else:
-                        st.error("❌ Veuillez remplir tous les champs")
-        
-        with tab2:
-            with st.form("inscription_entrepreneur"):
-                st.markdown("### Créer un compte entrepreneur")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    nom_entreprise = st.text_input("Nom de l'entreprise *")
-                    nom_contact = st.text_input("Nom du contact *")
-                    email_inscription = st.text_input("Email *")
-                    telephone = st.text_input("Téléphone *")
-                
-                with col2:
-                    mot_de_passe = st.text_input("Mot de passe *", type="password")
-                    confirmer_mdp = st.text_input("Confirmer mot de passe *", type="password")
-                    numero_rbq = st.text_input("Numéro RBQ", placeholder="XXXX-XXXX-XX")
-                
-                zones_desservies = st.text_area("Zones desservies (codes postaux)")
-                
-                types_projets = st.multiselect(
-                    "Types de projets *",
-                    ["Rénovation cuisine", "Rénovation salle de bain", "Toiture", 
-                     "Revêtement extérieur", "Plancher", "Peinture", "Agrandissement",
-                     "Électricité", "Plomberie", "Chauffage/Climatisation", "Isolation",
-                     "Fenêtres et portes", "Maçonnerie", "Charpenterie", "Autre"]
-                )
-                
-                certifications = st.text_area("Certifications et assurances")
-                
-                if st.form_submit_button("📝 Créer mon compte", type="primary"):
-                    if all([nom_entreprise, nom_contact, email_inscription, telephone, mot_de_passe]):
-                        if mot_de_passe == confirmer_mdp:
-                            # Créer le compte
-                            conn = sqlite3.connect(DATABASE_PATH)
-                            cursor = conn.cursor()
-                            
-                            try:
-                                cursor.execute('''
-                                    INSERT INTO entrepreneurs (nom_entreprise, nom_contact, email, telephone, 
-                                                             mot_de_passe_hash, numero_rbq, zones_desservies, 
-                                                             types_projets, certifications)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                ''', (nom_entreprise, nom_contact, email_inscription, telephone,
-                                      hash_password(mot_de_passe), numero_rbq, zones_desservies,
-                                      ",".join(types_projets), certifications))
-                                
-                                conn.commit()
-                                st.success("✅ Compte créé! Vous pouvez maintenant vous connecter.")
-                            
-                            except sqlite3.IntegrityError:
-                                st.error("❌ Un compte avec cet email existe déjà")
-                            
-                            finally:
-                                conn.close()
-                        else:
-                            st.error("❌ Les mots de passe ne correspondent pas")
-                    else:
-                        st.error("❌ Veuillez remplir tous les champs obligatoires")
-    
-    else:
-        # Dashboard entrepreneur connecté
-        entrepreneur = st.session_state.entrepreneur_connecte
-        
-        # Header
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.markdown(f"## 👷 Bienvenue, {entrepreneur.nom_entreprise}")
-        with col2:
-            if st.button("🚪 Déconnexion"):
-                st.session_state.entrepreneur_connecte = None
-                st.rerun()
-        
-        # Onglets
-        tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔍 Projets disponibles", "📋 Mes soumissions", "⭐ Mes évaluations", "📊 Dashboard", "👤 Mon profil"])
-        
-        with tab1:
-            st.markdown("### 🔍 Projets disponibles pour soumission")
-            
-            # Interface de filtrage
-            with st.expander("🔍 Filtres de recherche", expanded=False):
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    recherche_texte = st.text_input(
-                        "🔍 Recherche textuelle",
-                        placeholder="Mots-clés dans la description...",
-                        key="recherche_projets"
-                    )
-                    
-                    type_projet_filtre = st.selectbox(
-                        "🏗️ Type de projet",
-                        ["Tous", "Rénovation résidentielle", "Construction neuve", "Rénovation commerciale", 
-                         "Toiture", "Plomberie", "Électricité", "Paysagement", "Autres"],
-                        key="type_projet_filtre"
-                    )
-                
-                with col2:
-                    code_postal_filtre = st.text_input(
-                        "📍 Code postal (début)",
-                        placeholder="Ex: H1A, G1V...",
-                        key="code_postal_filtre"
-                    )
-                    
-                    budget_range = st.select_slider(
-                        "💰 Gamme de budget",
-                        options=["Tous", "< 5K", "5K-15K", "15K-50K", "50K-100K", "> 100K"],
-                        value="Tous",
-                        key="budget_range_filtre"
-                    )
-                
-                with col3:
-                    delai_filtre = st.selectbox(
-                        "⏰ Délai souhaité",
-                        ["Tous", "Urgent (< 1 mois)", "Court (1-3 mois)", "Normal (3-6 mois)", "Long (> 6 mois)"],
-                        key="delai_filtre"
-                    )
-                    
-                    trier_par = st.selectbox(
-                        "📊 Trier par",
-                        ["Date (plus récent)", "Date (plus ancien)", "Budget (croissant)", "Budget (décroissant)", "Nb soumissions"],
-                        key="tri_projets"
-                    )
-            
-            # Application des filtres
-            budget_min, budget_max = None, None
-            if budget_range != "Tous":
-                if budget_range == "< 5K":
-                    budget_max = 5000
-                elif budget_range == "5K-15K":
-                    budget_min, budget_max = 5000, 15000
-                elif budget_range == "15K-50K":
-                    budget_min, budget_max = 15000, 50000
-                elif budget_range == "50K-100K":
-                    budget_min, budget_max = 50000, 100000
-                elif budget_range == "> 100K":
-                    budget_min = 100000
-            
-            # Récupération des projets filtrés
-            projets = filtrer_projets_pour_entrepreneurs(
-                type_projet=type_projet_filtre if type_projet_filtre != "Tous" else None,
-                budget_min=budget_min,
-                budget_max=budget_max,
-                code_postal=code_postal_filtre if code_postal_filtre else None,
-                recherche_texte=recherche_texte if recherche_texte else None
-            )
-            
-            # Affichage des résultats
-            st.markdown(f"**{len(projets)} projet(s) trouvé(s)**")
-            
-            if not projets:
-                st.info("Aucun projet ne correspond à vos critères. Essayez d'ajuster les filtres.")
-            else:
-                for projet in projets:
-                    with st.expander(f"{projet['type_projet']} - {projet['code_postal']} ({projet['budget']})"):
-                        # Détails du projet
-                        col1, col2 = st.columns([2, 1])
-                        
-                        with col1:
-                            st.markdown("**Description du projet:**")
-                            st.text_area("", value=projet['description'], height=150, disabled=True, key=f"proj_desc_{projet['id']}")
-                        
-                        with col2:
-                            st.markdown("**Informations:**")
-                            st.write(f"📅 Délai: {projet['delai_realisation']}")
-                            st.write(f"💰 Budget: {projet['budget']}")
-                            st.write(f"📍 Zone: {projet['code_postal']}")
-                            st.write(f"📋 {projet['nb_soumissions']} soumission(s)")
-                            date_pub = formater_date_affichage(projet['date_creation'])
-                            st.write(f"📆 Publié: {date_pub}")
-                        
-                        # Affichage des pièces jointes
-                        st.markdown("---")
-                        st.markdown("### 📎 Documents et plans du projet")
-                        
-                        col_files1, col_files2, col_files3 = st.columns(3)
-                        
-                        with col_files1:
-                            if projet['photos']:
-                                st.markdown("**📸 Photos:**")
-                                photos_list = projet['photos'].split(',')
-                                for i, photo_base64 in enumerate(photos_list):
-                                    try:
-                                        photo_data = base64.b64decode(photo_base64)
-                                        image = Image.open(io.BytesIO(photo_data))
-                                        st.image(image, caption=f"Photo {i+1}", use_container_width=True)
-                                    except:
-                                        st.error(f"Erreur lors du chargement de la photo {i+1}")
-                            else:
-                                st.info("Aucune photo disponible")
-                        
-                        with col_files2:
-                            if projet['plans']:
-                                st.markdown("**📋 Plans:**")
-                                plans_list = projet['plans'].split(',')
-                                for i, plan_base64 in enumerate(plans_list):
-                                    try:
-                                        plan_data = base64.b64decode(plan_base64)
-                                        st.download_button(
-                                            f"📋 Télécharger Plan {i+1}",
-                                            data=plan_data,
-                                            file_name=f"plan_{i+1}_{projet['numero_reference']}.pdf",
-                                            mime="application/pdf",
-                                            key=f"plan_{projet['id']}_{i}"
-                                        )
-                                    except:
-                                        st.error(f"Erreur lors du chargement du plan {i+1}")
-                            else:
-                                st.info("Aucun plan disponible")
-                        
-                        with col_files3:
-                            if projet['documents']:
-                                st.markdown("**📄 Documents:**")
-                                documents_list = projet['documents'].split(',')
-                                for i, doc_base64 in enumerate(documents_list):
-                                    try:
-                                        doc_data = base64.b64decode(doc_base64)
-                                        st.download_button(
-                                            f"📄 Télécharger Doc {i+1}",
-                                            data=doc_data,
-                                            file_name=f"document_{i+1}_{projet['numero_reference']}.pdf",
-                                            mime="application/pdf",
-                                            key=f"doc_{projet['id']}_{i}"
-                                        )
-                                    except:
-                                        st.error(f"Erreur lors du chargement du document {i+1}")
-                            else:
-                                st.info("Aucun document disponible")
-                        
-                        # Vérifier si déjà soumissionné
-                        conn = sqlite3.connect(DATABASE_PATH)
-                        cursor = conn.cursor()
-                        cursor.execute('''
-                            SELECT id FROM soumissions 
-                            WHERE lead_id = ? AND entrepreneur_id = ?
-                        ''', (projet['id'], entrepreneur.id))
-                        deja_soumis = cursor.fetchone()
-                        conn.close()
-                        
-                        if deja_soumis:
-                            st.success("✅ Vous avez déjà soumissionné sur ce projet")
-                            
-                            # Bouton chat pour communiquer avec le client
-                            col1, col2 = st.columns([1, 4])
-                            with col1:
-                                if st.button("💬 Chat client", key=f"chat_client_{projet['id']}", help="Discuter avec le client"):
-                                    st.session_state.chat_lead_id = projet['id']
-                                    st.session_state.chat_entrepreneur_id = entrepreneur.id
-                                    st.session_state.chat_nom_client = projet['nom']
-                                    st.session_state.chat_type_utilisateur = 'entrepreneur'
-                                    st.session_state.mode_chat = True
-                                    st.rerun()
-                        else:
-                            # Formulaire de soumission
-                            st.markdown("---")
-                            st.markdown("### 📝 Soumettre une proposition")
-                            
-                            with st.form(f"soumission_{projet['id']}"):
-                                col1, col2 = st.columns(2)
-                                
-                                with col1:
-                                    montant = st.number_input(
-                                        "Montant de la soumission ($) *",
-                                        min_value=0.0,
-                                        step=100.0,
-                                        key=f"montant_{projet['id']}"
-                                    )
-                                    
-                                    delai_execution = st.text_input(
-                                        "Délai d'exécution *",
-                                        placeholder="Ex: 3 semaines",
-                                        key=f"delai_{projet['id']}"
-                                    )
-                                
-                                with col2:
-                                    validite_offre = st.text_input(
-                                        "Validité de l'offre *",
-                                        value="30 jours",
-                                        key=f"validite_{projet['id']}"
-                                    )
-                                
-                                description_travaux = st.text_area(
-                                    "Description détaillée des travaux *",
-                                    placeholder="""Décrivez en détail:
-- Les étapes des travaux
-- Les matériaux utilisés
-- La méthodologie
-- L'équipe assignée
-- Le calendrier détaillé""",
-                                    height=200,
-                                    key=f"travaux_{projet['id']}"
-                                )
-                                
-                                col1, col2 = st.columns(2)
-                                
-                                with col1:
-                                    inclusions = st.text_area(
-                                        "Inclusions",
-                                        placeholder="Ce qui est inclus dans le prix",
-                                        height=100,
-                                        key=f"inclusions_{projet['id']}"
-                                    )
-                                
-                                with col2:
-                                    exclusions = st.text_area(
-                                        "Exclusions",
-                                        placeholder="Ce qui n'est pas inclus",
-                                        height=100,
-                                        key=f"exclusions_{projet['id']}"
-                                    )
-                                
-                                conditions = st.text_area(
-                                    "Conditions et modalités de paiement",
-                                    placeholder="Ex: 30% à la signature, 40% à mi-parcours, 30% à la fin",
-                                    key=f"conditions_{projet['id']}"
-                                )
-                                
-                                # Section pièces jointes pour la soumission
-                                st.markdown("---")
-                                st.markdown("### 📎 Pièces jointes de votre soumission")
-                                st.caption("Ajoutez vos documents : devis détaillé, plans, références, catalogue...")
-                                
-                                col_doc1, col_doc2 = st.columns(2)
-                                
-                                with col_doc1:
-                                    documents_soumission = st.file_uploader(
-                                        "Documents de soumission",
-                                        type=['pdf', 'doc', 'docx', 'xls', 'xlsx', 'png', 'jpg', 'jpeg'],
-                                        accept_multiple_files=True,
-                                        help="Max 5 fichiers - Formats: PDF, DOC, XLS, Images",
-                                        key=f"docs_soumission_{projet['id']}"
-                                    )
-                                
-                                with col_doc2:
-                                    if documents_soumission:
-                                        st.markdown("**Fichiers sélectionnés:**")
-                                        for doc in documents_soumission[:5]:  # Limiter à 5 fichiers
-                                            st.write(f"📄 {doc.name}")
-                                
-                                if st.form_submit_button("📤 Envoyer ma soumission", type="primary"):
-                                    if montant > 0 and delai_execution and description_travaux:
-                                        # Traitement des fichiers uploadés
-                                        documents_data = None
-                                        if documents_soumission:
-                                            docs_base64 = []
-                                            for doc in documents_soumission[:5]:  # Limiter à 5 fichiers
-                                                doc_data = base64.b64encode(doc.read()).decode()
-                                                docs_base64.append(f"{doc.name}:{doc_data}")
-                                            documents_data = "|".join(docs_base64)
-                                        
-                                        soumission = Soumission(
-                                            lead_id=projet['id'],
-                                            entrepreneur_id=entrepreneur.id,
-                                            montant=montant,
-                                            description_travaux=description_travaux,
-                                            delai_execution=delai_execution,
-                                            validite_offre=validite_offre,
-                                            inclusions=inclusions,
-                                            exclusions=exclusions,
-                                            conditions=conditions,
-                                            documents=documents_data
-                                        )
-                                        
-                                        if sauvegarder_soumission(soumission):
-                                            # Créer notification pour le client
-                                            notifier_nouvelle_soumission(projet['id'])
-                                            
-                                            st.success("✅ Soumission envoyée avec succès!")
-                                            st.balloons()
-                                            st.rerun()
-                                        else:
-                                            st.error("❌ Erreur lors de l'envoi")
-                                    else:
-                                        st.error("❌ Veuillez remplir tous les champs obligatoires")
-        
-        with tab2:
-            st.markdown("### 📋 Mes soumissions")
-            
-            # Interface de filtrage pour les soumissions
-            with st.expander("🔍 Filtres mes soumissions", expanded=False):
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    statut_filtre = st.selectbox(
-                        "📊 Statut",
-                        ["Tous", "envoyee", "acceptee", "refusee"],
-                        format_func=lambda x: {"Tous": "Tous", "envoyee": "En attente", "acceptee": "Acceptée", "refusee": "Refusée"}[x],
-                        key="statut_soumissions_filtre"
-                    )
-                
-                with col2:
-                    periode_filtre = st.selectbox(
-                        "📅 Période",
-                        ["Toutes", "Ce mois", "Ce trimestre", "Cette année"],
-                        key="periode_soumissions_filtre"
-                    )
-                
-                with col3:
-                    col3a, col3b = st.columns(2)
-                    with col3a:
-                        montant_min = st.number_input(
-                            "💰 Montant min ($)",
-                            min_value=0,
-                            value=0,
-                            step=1000,
-                            key="montant_min_filtre"
-                        )
-                    with col3b:
-                        montant_max = st.number_input(
-                            "💰 Montant max ($)",
-                            min_value=0,
-                            value=0,
-                            step=1000,
-                            key="montant_max_filtre"
-                        )
-            
-            # Application des filtres
-            mes_soumissions = filtrer_soumissions_entrepreneur(
-                entrepreneur_id=entrepreneur.id,
-                statut=statut_filtre if statut_filtre != "Tous" else None,
-                periode=periode_filtre if periode_filtre != "Toutes" else None,
-                montant_min=montant_min if montant_min > 0 else None,
-                montant_max=montant_max if montant_max > 0 else None
-            )
-            
-            # Affichage des résultats
-            st.markdown(f"**{len(mes_soumissions)} soumission(s) trouvée(s)**")
-            
-            if not mes_soumissions:
-                if statut_filtre != "Tous" or periode_filtre != "Toutes" or montant_min > 0 or montant_max > 0:
-                    st.info("Aucune soumission ne correspond à vos critères")
-                else:
-                    st.info("Vous n'avez pas encore envoyé de soumissions")
-            else:
-                for soum in mes_soumissions:
-                    statut_emoji = {
-                        'envoyee': '📤',
-                        'vue': '👁️',
-                        'acceptee': '✅',
-                        'refusee': '❌'
-                    }
-                    
-                    with st.expander(f"{statut_emoji.get(soum['statut'], '📋')} {soum['type_projet']} - {soum['nom_client']} - {soum['montant']:,.2f}$"):
-                        col1, col2 = st.columns([2, 1])
-                        
-                        with col1:
-                            st.write(f"**Client:** {soum['nom_client']}")
-                            st.write(f"**Projet:** {soum['type_projet']}")
-                            st.write(f"**Référence:** {soum['numero_reference']}")
-                            st.write(f"**Délai proposé:** {soum['delai_execution']}")
-                        
-                        with col2:
-                            st.write(f"**Ma soumission:** {soum['montant']:,.2f}$")
-                            st.write(f"**Statut:** {soum['statut'].capitalize()}")
-                            date_soum = formater_date_affichage(soum['date_creation'])
-                            st.write(f"**Date:** {date_soum}")
-                        
-                        if soum['statut'] == 'acceptee':
-                            st.success("🎉 Félicitations! Votre soumission a été acceptée!")
-                            st.info(f"Contactez le client pour finaliser les détails")
-                        elif soum['statut'] == 'refusee':
-                            st.error("Cette soumission n'a pas été retenue")
-        
-        with tab3:
-            st.markdown("### ⭐ Mes évaluations clients")
-            
-            # Récupérer les statistiques d'évaluation
-            stats_eval = get_evaluations_entrepreneur(entrepreneur.id)
-            
-            # Affichage des statistiques générales
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Note moyenne", f"{stats_eval['note_moyenne']}/5" if stats_eval['note_moyenne'] > 0 else "Aucune", 
-                         f"⭐" * int(stats_eval['note_moyenne']) if stats_eval['note_moyenne'] > 0 else "")
-            
-            with col2:
-                st.metric("Total évaluations", stats_eval['nombre_evaluations'])
-            
-            with col3:
-                st.metric("Évaluations positives", f"{stats_eval['evaluations_positives']}")
-            
-            with col4:
-                st.metric("% de satisfaction", f"{stats_eval['pourcentage_positif']}%")
-            
-            if stats_eval['nombre_evaluations'] > 0:
-                st.markdown("---")
-                st.markdown("### 💬 Derniers commentaires clients")
-                
-                commentaires = get_derniers_commentaires_entrepreneur(entrepreneur.id)
-                
-                if commentaires:
-                    for commentaire in commentaires:
-                        with st.container():
-                            col1, col2 = st.columns([1, 3])
-                            
-                            with col1:
-                                stars = "⭐" * commentaire['note']
-                                st.markdown(f"**{stars}**")
-                                st.caption(f"{commentaire['date_evaluation']}")
-                                st.caption(f"Projet: {commentaire['type_projet']}")
-                            
-                            with col2:
-                                st.markdown(f"*\"{commentaire['commentaire']}\"*")
-                            
-                            st.markdown("---")
-                else:
-                    st.info("Aucun commentaire détaillé encore")
-            else:
-                st.info("Aucune évaluation reçue pour le moment. Continuez à fournir un excellent service pour recevoir vos premières évaluations !")
-        
-        with tab4:
-            st.markdown("### 📊 Tableau de bord entrepreneur")
-            
-            # Récupérer les statistiques
-            stats = get_stats_entrepreneur(entrepreneur.id)
-            
-            # Métriques principales
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Soumissions envoyées", stats['total_soumissions'])
-            
-            with col2:
-                st.metric("Projets remportés", stats['soumissions_acceptees'], 
-                         f"{stats['taux_succes']}%" if stats['taux_succes'] > 0 else "0%")
-            
-            with col3:
-                st.metric("Chiffre d'affaires", f"{stats['ca_total']:,.2f} $")
-            
-            with col4:
-                st.metric("Note moyenne", f"{stats['note_moyenne']}/5 ⭐" if stats['note_moyenne'] > 0 else "Aucune note")
-            
-            st.markdown("---")
-            
-            # Statistiques détaillées
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("### 💰 Performance financière")
-                if stats['total_soumissions'] > 0:
-                    st.metric("Montant moyen par soumission", f"{stats['montant_moyen']:,.2f} $")
-                    st.metric("Taux de succès", f"{stats['taux_succes']}%")
-                    if stats['taux_succes'] >= 70:
-                        st.success("🎯 Excellent taux de succès !")
-                    elif stats['taux_succes'] >= 40:
-                        st.warning("⚡ Taux de succès moyen")
-                    else:
-                        st.info("💪 Continuez vos efforts !")
-                else:
-                    st.info("Aucune soumission envoyée encore")
-            
-            with col2:
-                st.markdown("### 📈 Évolution mensuelle")
-                if stats['evolution_mensuelle']:
-                    st.markdown("**Activité récente :**")
-                    for mois, nb_soumissions, nb_acceptees, ca_mois in stats['evolution_mensuelle'][:3]:
-                        taux_mois = round((nb_acceptees / nb_soumissions * 100), 1) if nb_soumissions > 0 else 0
-                        st.write(f"**{mois}** : {nb_soumissions} soumission(s), {nb_acceptees} acceptée(s) ({taux_mois}%)")
-                        if ca_mois > 0:
-                            st.write(f"   💰 CA: {ca_mois:,.2f} $")
-                else:
-                    st.info("Pas encore d'historique disponible")
-            
-            # Conseils et recommandations
-            st.markdown("---")
-            st.markdown("### 💡 Recommandations pour améliorer vos performances")
-            
-            if stats['total_soumissions'] == 0:
-                st.info("🚀 Commencez par soumissionner sur vos premiers projets !")
-            elif stats['taux_succes'] < 30:
-                st.warning("📝 Votre taux de succès est bas. Considérez :")
-                st.write("- Réviser vos prix pour être plus compétitif")
-                st.write("- Améliorer la qualité de vos descriptions")
-                st.write("- Cibler des projets plus adaptés à votre expertise")
-            elif stats['note_moyenne'] > 0 and stats['note_moyenne'] < 3.5:
-                st.warning("⭐ Votre note moyenne est perfectible. Focalisez sur :")
-                st.write("- La qualité de votre service client")
-                st.write("- Le respect des délais annoncés")
-                st.write("- La communication avec vos clients")
-            else:
-                st.success("✅ Excellente performance ! Continuez sur cette lancée.")
-                if stats['nb_evaluations'] < 5:
-                    st.info("💬 Encouragez vos clients à vous évaluer pour augmenter votre visibilité.")
-        
-        with tab5:
-            st.markdown("### 👤 Mon profil d'entreprise")
-            
-            with st.form("profil_entrepreneur"):
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    nom_entreprise = st.text_input("Nom de l'entreprise", value=entrepreneur.nom_entreprise)
-                    nom_contact = st.text_input("Nom du contact", value=entrepreneur.nom_contact)
-                    email = st.text_input("Email", value=entrepreneur.email, disabled=True)
-                
-                with col2:
-                    telephone = st.text_input("Téléphone", value=entrepreneur.telephone)
-                    numero_rbq = st.text_input("Numéro RBQ", value=entrepreneur.numero_rbq or "")
-                
-                zones_desservies = st.text_area(
-                    "Zones desservies",
-                    value=entrepreneur.zones_desservies or ""
-                )
-                
-                certifications = st.text_area(
-                    "Certifications et assurances",
-                    value=entrepreneur.certifications or ""
-                )
-                
-                if st.form_submit_button("💾 Sauvegarder"):
-                    conn = sqlite3.connect(DATABASE_PATH)
-                    cursor = conn.cursor()
-                    
-                    cursor.execute('''
-                        UPDATE entrepreneurs 
-                        SET nom_entreprise=?, nom_contact=?, telephone=?, 
-                            numero_rbq=?, zones_desservies=?, certifications=?
-                        WHERE id=?
-                    ''', (nom_entreprise, nom_contact, telephone, numero_rbq,
-                          zones_desservies, certifications, entrepreneur.id))
-                    
-                    conn.commit()
-                    conn.close()
-                    
-                    st.success("✅ Profil mis à jour!")
-
-def page_administration():
-    """Page d'administration"""
-    
-    if 'admin_connecte' not in st.session_state:
-        st.session_state.admin_connecte = False
-    
-    if not st.session_state.admin_connecte:
-        st.markdown("## ⚙️ Administration")
-        
-        with st.form("connexion_admin"):
-            mot_de_passe_admin = st.text_input("Mot de passe administrateur", type="password")
-            
-            if st.form_submit_button("🔐 Se connecter"):
-                # Récupérer le mot de passe admin depuis les variables d'environnement
-                admin_password = os.getenv('ADMIN_PASSWORD', 'admin123')  # Fallback pour développement local
-                
-                if mot_de_passe_admin == admin_password:
-                    st.session_state.admin_connecte = True
-                    st.success("✅ Connexion réussie!")
-                    st.rerun()
-                else:
-                    st.error("❌ Mot de passe incorrect")
-    
-    else:
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.markdown("## ⚙️ Panel d'administration")
-        with col2:
-            if st.button("🚪 Déconnexion"):
-                st.session_state.admin_connecte = False
-                st.rerun()
-        
-        # Dashboard administrateur avec onglets
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["📊 Vue d'ensemble", "👥 Gestion des entrepreneurs", "📋 Gestion des soumissions", "💰 Gestion des estimations", "📐 Technologue", "🏛️ Architecture", "🔧 Ingénieur"])
-        
-        with tab1:
-            st.markdown("### 📊 Statistiques globales de SEAOP")
-            
-            # Récupérer les statistiques complètes
-            stats = get_stats_admin()
-            
-            # Métriques principales
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Total projets", stats['total_projets'])
-            with col2:
-                st.metric("Entrepreneurs inscrits", stats['total_entrepreneurs'])
-            with col3:
-                st.metric("Soumissions envoyées", stats['total_soumissions'])
-            with col4:
-                st.metric("Volume d'affaires", f"{stats['ca_total']:,.2f} $")
-            
-            st.markdown("---")
-            
-            # Top entrepreneurs du mois
-            st.markdown("### 🏆 Top entrepreneurs du mois")
-            if stats['top_entrepreneurs']:
-                for i, (nom, nb_soum, nb_acc, ca, note) in enumerate(stats['top_entrepreneurs'], 1):
-                    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-                    with col1:
-                        medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-                        st.write(f"{medal} **{nom}**")
-                    with col2:
-                        st.write(f"{nb_acc}/{nb_soum} projets")
-                    with col3:
-                        st.write(f"{ca:,.0f} $" if ca else "0 $")
-                    with col4:
-                        st.write(f"⭐ {note:.1f}" if note else "Pas de note")
-            else:
-                st.info("Aucune activité ce mois-ci")
-            
-            # Évolution de la plateforme
-            st.markdown("---")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("### 📈 Évolution des projets")
-                if stats['evolution_projets']:
-                    for mois, nb_projets in stats['evolution_projets'][:6]:
-                        st.write(f"**{mois}** : {nb_projets} projet(s)")
-                else:
-                    st.info("Pas d'historique disponible")
-            
-            with col2:
-                st.markdown("### 💰 Évolution du chiffre d'affaires")
-                if stats['evolution_soumissions']:
-                    for mois, nb_soum, ca in stats['evolution_soumissions'][:6]:
-                        st.write(f"**{mois}** : {nb_soum} soumission(s)")
-                        if ca > 0:
-                            st.write(f"   💰 {ca:,.2f} $")
-                else:
-                    st.info("Pas d'historique disponible")
-        
-        with tab2:
-            st.markdown("### 👥 Gestion des entrepreneurs")
-            
-            # Afficher le tableau des entrepreneurs
-            conn = sqlite3.connect(DATABASE_PATH)
-            df_entrepreneurs = pd.read_sql_query('''
-                SELECT id, nom_entreprise, email, numero_rbq, abonnement, date_inscription
-                FROM entrepreneurs
-                ORDER BY date_inscription DESC
-            ''', conn)
-            conn.close()
-            
-            st.dataframe(df_entrepreneurs, use_container_width=True)
-            
-            # Statistiques des entrepreneurs
-            st.markdown("---")
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                actifs_ce_mois = len([e for e in stats['top_entrepreneurs'] if e[1] > 0])
-                st.metric("Entrepreneurs actifs ce mois", actifs_ce_mois)
-            
-            with col2:
-                if df_entrepreneurs is not None and len(df_entrepreneurs) > 0:
-                    nouveaux_ce_mois = len(df_entrepreneurs[df_entrepreneurs['date_inscription'].str.startswith(datetime.datetime.now().strftime('%Y-%m'))])
-                    st.metric("Nouveaux ce mois", nouveaux_ce_mois)
-                else:
-                    st.metric("Nouveaux ce mois", 0)
-            
-            with col3:
-                # Calcul de la note moyenne globale
-                conn = sqlite3.connect(DATABASE_PATH)
-                cursor = conn.cursor()
-                cursor.execute('SELECT AVG(note) FROM evaluations WHERE evaluateur_type = "client"')
-                note_moyenne_globale = cursor.fetchone()[0] or 0
-                conn.close()
-                st.metric("Note moyenne plateforme", f"{note_moyenne_globale:.1f}/5 ⭐" if note_moyenne_globale > 0 else "Aucune")
-        
-        with tab3:
-            st.markdown("### 📋 Gestion des soumissions et projets")
-            
-            # Afficher le tableau des projets d'abord
-            st.markdown("#### 🏗️ Projets récents")
-            conn = sqlite3.connect(DATABASE_PATH)
-            df_projets = pd.read_sql_query('''
-                SELECT id, numero_reference, nom, type_projet, budget, statut, date_creation
-                FROM leads
-                ORDER BY date_creation DESC
-                LIMIT 10
-            ''', conn)
-            conn.close()
-            
-            st.dataframe(df_projets, use_container_width=True)
-            
-            st.markdown("#### 📊 Soumissions récentes")
-            conn = sqlite3.connect(DATABASE_PATH)
-            df_soumissions = pd.read_sql_query('''
-                SELECT s.id, e.nom_entreprise, l.type_projet, s.montant, s.statut, s.date_creation
-                FROM soumissions s
-                JOIN entrepreneurs e ON s.entrepreneur_id = e.id
-                JOIN leads l ON s.lead_id = l.id
-                ORDER BY s.date_creation DESC
-            ''', conn)
-            conn.close()
-            
-            st.dataframe(df_soumissions, use_container_width=True)
-        
-        with tab4:
-            st.markdown("### 💰 Gestion des estimations")
-            
-            # Récupérer toutes les estimations
-            estimations = get_estimations_admin()
-            
-            if estimations:
-                st.markdown(f"**📋 {len(estimations)} demande(s) d'estimation au total**")
-                
-                # Filtres pour les estimations
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    filtre_statut = st.selectbox(
-                        "Filtrer par statut",
-                        ["Tous", "recue", "en_cours", "terminee", "envoyee", "payee"],
-                        format_func=lambda x: {
-                            "Tous": "Tous les statuts",
-                            "recue": "🆕 Reçues", 
-                            "en_cours": "🔄 En cours",
-                            "terminee": "✅ Terminées",
-                            "envoyee": "📧 Envoyées",
-                            "payee": "💰 Payées"
-                        }[x]
-                    )
-                
-                with col2:
-                    filtre_type = st.selectbox(
-                        "Filtrer par type",
-                        ["Tous", "Rénovation cuisine", "Rénovation salle de bain", "Toiture", "Agrandissement", "Autre"]
-                    )
-                
-                with col3:
-                    trier_par = st.selectbox(
-                        "Trier par",
-                        ["Date (récent)", "Date (ancien)", "Prix (croissant)", "Prix (décroissant)", "Statut"]
-                    )
-                
-                # Appliquer les filtres
-                estimations_filtrees = estimations
-                
-                if filtre_statut != "Tous":
-                    estimations_filtrees = [e for e in estimations_filtrees if e['statut'] == filtre_statut]
-                
-                if filtre_type != "Tous":
-                    estimations_filtrees = [e for e in estimations_filtrees if e['type_projet'] == filtre_type]
-                
-                # Appliquer le tri
-                if trier_par == "Date (récent)":
-                    estimations_filtrees.sort(key=lambda x: x['date_demande'], reverse=True)
-                elif trier_par == "Date (ancien)":
-                    estimations_filtrees.sort(key=lambda x: x['date_demande'])
-                elif trier_par == "Prix (croissant)":
-                    estimations_filtrees.sort(key=lambda x: x['prix_estimation'] or 0)
-                elif trier_par == "Prix (décroissant)":
-                    estimations_filtrees.sort(key=lambda x: x['prix_estimation'] or 0, reverse=True)
-                elif trier_par == "Statut":
-                    estimations_filtrees.sort(key=lambda x: x['statut'])
-                
-                st.markdown(f"**📊 {len(estimations_filtrees)} estimation(s) affichée(s)**")
-                
-                # Afficher les estimations
-                for estimation in estimations_filtrees:
-                    # Mapper les statuts pour l'affichage
-                    statuts_affichage = {
-                        'recue': '🆕 Reçue',
-                        'en_cours': '🔄 En cours',
-                        'terminee': '✅ Terminée',
-                        'envoyee': '📧 Envoyée',
-                        'payee': '💰 Payée'
-                    }
-                    
-                    statut_badge = statuts_affichage.get(estimation['statut'], estimation['statut'])
-                    
-                    with st.expander(f"**{estimation['nom_client']}** - {estimation['type_projet']} ({estimation['numero_reference']}) - {statut_badge}", expanded=False):
-                        
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        
-                        with col1:
-                            st.markdown(f"**📧 Email :** {estimation['email_client']}")
-                            st.markdown(f"**📞 Téléphone :** {estimation['telephone_client']}")
-                            st.markdown(f"**📋 Description :** {estimation['description_detaillee'][:200]}...")
-                            if estimation['budget_approximatif']:
-                                st.markdown(f"**💰 Budget approximatif :** {estimation['budget_approximatif']}")
-                        
-                        with col2:
-                            st.markdown(f"**📅 Date demande :** {estimation['date_demande']}")
-                            st.markdown(f"**📊 Statut :** {statut_badge}")
-                            if estimation['prix_estimation']:
-                                st.markdown(f"**💵 Prix estimation :** {estimation['prix_estimation']:.2f}$")
-                        
-                        with col3:
-                            # Actions administrateur
-                            st.markdown("**⚙️ Actions :**")
-                            
-                            # Changer le statut
-                            nouveau_statut = st.selectbox(
-                                "Changer statut",
-                                ["recue", "en_cours", "terminee", "envoyee", "payee"],
-                                index=["recue", "en_cours", "terminee", "envoyee", "payee"].index(estimation['statut']),
-                                key=f"statut_{estimation['id']}",
-                                format_func=lambda x: statuts_affichage[x]
-                            )
-                            
-                            # Notes internes
-                            notes_internes = st.text_area(
-                                "Notes internes",
-                                value=estimation['notes_internes'] or "",
-                                key=f"notes_{estimation['id']}",
-                                height=100
-                            )
-                            
-                            if st.button(f"🔄 Mettre à jour", key=f"update_{estimation['id']}"):
-                                if mettre_a_jour_statut_estimation(estimation['id'], nouveau_statut, notes_internes):
-                                    st.success("✅ Estimation mise à jour!")
-                                    st.rerun()
-                                else:
-                                    st.error("❌ Erreur lors de la mise à jour")
-                        
-                        # Section upload documents si statut approprié
-                        if estimation['statut'] in ['terminee', 'envoyee']:
-                            st.markdown("---")
-                            st.markdown("**📎 Documents d'estimation**")
-                            
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                st.markdown("**📄 Estimation (PDF/HTML)**")
-                                estimation_doc = st.file_uploader(
-                                    "Upload estimation",
-                                    type=['pdf', 'html', 'doc', 'docx'],
-                                    key=f"est_doc_{estimation['id']}"
-                                )
-                            
-                            with col2:
-                                st.markdown("**🧾 Facture**")
-                                facture_doc = st.file_uploader(
-                                    "Upload facture",
-                                    type=['pdf', 'html', 'doc', 'docx'],
-                                    key=f"fact_doc_{estimation['id']}"
-                                )
-                            
-                            if st.button(f"📤 Envoyer documents", key=f"send_docs_{estimation['id']}"):
-                                docs_base64 = {}
-                                
-                                if estimation_doc:
-                                    file_content = estimation_doc.read()
-                                    docs_base64['estimation'] = f"{estimation_doc.name}:{base64.b64encode(file_content).decode()}"
-                                
-                                if facture_doc:
-                                    file_content = facture_doc.read()
-                                    docs_base64['facture'] = f"{facture_doc.name}:{base64.b64encode(file_content).decode()}"
-                                
-                                if docs_base64:
-                                    if ajouter_documents_estimation(
-                                        estimation['id'], 
-                                        docs_base64.get('estimation'),
-                                        docs_base64.get('facture')
-                                    ):
-                                        st.success("🎉 Documents envoyés avec succès!")
-                                        st.info("Le client a été notifié que son estimation est prête.")
-                                        st.rerun()
-                                    else:
-                                        st.error("❌ Erreur lors de l'envoi des documents")
-                                else:
-                                    st.warning("⚠️ Veuillez sélectionner au moins un document")
-                        
-                        # Afficher les fichiers fournis par le client
-                        afficher_fichiers_client(
-                            estimation.get('plans_client', ''),
-                            estimation.get('photos_client', ''),
-                            estimation.get('documents_client', '')
-                        )
-                
-                # Statistiques des estimations
-                st.markdown("---")
-                st.markdown("### 📊 Statistiques des estimations")
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                # Calculer les stats
-                stats_estimations = {
-                    'total': len(estimations),
-                    'recues': len([e for e in estimations if e['statut'] == 'recue']),
-                    'en_cours': len([e for e in estimations if e['statut'] == 'en_cours']),
-                    'envoyees': len([e for e in estimations if e['statut'] == 'envoyee']),
-                    'ca_estimations': sum(e['prix_estimation'] for e in estimations if e['prix_estimation'])
-                }
-                
-                with col1:
-                    st.metric("Total estimations", stats_estimations['total'])
-                
-                with col2:
-                    st.metric("En attente", stats_estimations['recues'])
-                
-                with col3:
-                    st.metric("En cours", stats_estimations['en_cours'])
-                
-                with col4:
-                    st.metric("CA estimations", f"{stats_estimations['ca_estimations']:.2f}$")
-                
-            else:
-                st.info("📭 Aucune demande d'estimation pour le moment")
-                st.markdown("""
-                **Les clients peuvent demander des estimations via :**
-                - Le menu "💰 Service d'estimation" dans l'interface principale
-                - Upload de plans, photos et description détaillée du projet
-                - Suivi en temps réel du statut de leur demande
-                """)
-        
-        with tab5:
-            st.markdown("### 📐 Gestion des demandes de technologue")
-            
-            demandes_tech = get_demandes_technologue_admin()
-            
-            if demandes_tech:
-                # Statistiques
-                st.markdown("#### 📊 Statistiques du service")
-                stats_tech = get_stats_technologue()
-                
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Total demandes", stats_tech['total'])
-                with col2:
-                    st.metric("En cours", stats_tech['en_cours'])
-                with col3:
-                    st.metric("Superficie moyenne", f"{stats_tech['superficie_moyenne']:,.0f} pi²")
-                with col4:
-                    st.metric("CA total", f"{stats_tech['ca_total']:,.2f}$")
-                
-                # Liste des demandes
-                st.markdown("#### 📋 Demandes de technologue")
-                
-                for demande in demandes_tech:
-                    with st.expander(f"📐 {demande['numero_reference']} - {demande['nom_client']}"):
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            st.markdown(f"**Client:** {demande['nom_client']}")
-                            st.markdown(f"**Email:** {demande['email_client']}")
-                            st.markdown(f"**Tél:** {demande['telephone_client']}")
-                            st.markdown(f"**Ville:** {demande['ville']}")
-                        
-                        with col2:
-                            st.markdown(f"**Type:** {demande['type_batiment']}")
-                            st.markdown(f"**Superficie:** {demande['superficie_batiment']:,.0f} pi²")
-                            st.markdown(f"**Étages:** {demande['nombre_etages']}")
-                            st.markdown(f"**Budget technologue:** {demande['budget_technologue']}")
-                        
-                        with col3:
-                            # Indicateur d'urgence
-                            urgence_colors = {
-                                'faible': '🟢', 'normal': '🟡',
-                                'eleve': '🟠', 'critique': '🔴'
-                            }
-                            urgence_icon = urgence_colors.get(demande['niveau_urgence'], '🟡')
-                            st.markdown(f"**Urgence:** {urgence_icon} {demande['niveau_urgence'].title()}")
-                            st.markdown(f"**Prix service:** {demande['prix_service']:,.2f}$")
-                            st.markdown(f"**Statut:** {demande['statut'].replace('_', ' ').title()}")
-                            
-                            if demande['pourcentage_complete']:
-                                st.progress(demande['pourcentage_complete'] / 100)
-                                st.caption(f"Progression: {demande['pourcentage_complete']}%")
-                        
-                        st.markdown("---")
-                        st.markdown(f"**Usage du bâtiment:** {demande['usage_batiment']}")
-                        st.markdown(f"**Type construction:** {demande['type_construction']}")
-                        st.markdown(f"**Services inclus:** {demande['services_inclus']}")
-                        
-                        # Gestion du statut
-                        st.markdown("#### 🔧 Gestion de la demande")
-                        
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            nouveau_statut = st.selectbox(
-                                "Changer le statut",
-                                ['recue', 'analyse', 'acceptee', 'en_cours', 'revision', 'terminee'],
-                                index=['recue', 'analyse', 'acceptee', 'en_cours', 'revision', 'terminee'].index(demande['statut']),
-                                key=f"statut_tech_{demande['id']}"
-                            )
-                            
-                            pourcentage = st.slider(
-                                "Progression (%)",
-                                0, 100, 
-                                value=demande['pourcentage_complete'] or 0,
-                                key=f"progress_tech_{demande['id']}"
-                            )
-                        
-                        with col2:
-                            notes = st.text_area(
-                                "Notes internes",
-                                value="",
-                                height=100,
-                                key=f"notes_tech_{demande['id']}"
-                            )
-                        
-                        if st.button(f"💾 Mettre à jour", key=f"update_tech_{demande['id']}"):
-                            if mettre_a_jour_statut_technologue(
-                                demande['id'], nouveau_statut, notes, pourcentage
-                            ):
-                                st.success("✅ Demande mise à jour")
-                                st.rerun()
-                            else:
-                                st.error("❌ Erreur lors de la mise à jour")
-            else:
-                st.info("📭 Aucune demande de technologue pour le moment")
-        
-        with tab6:
-            st.markdown("### 🏛️ Gestion des demandes d'architecture")
-            
-            demandes_arch = get_demandes_architecture_admin()
-            
-            if demandes_arch:
-                # Statistiques
-                st.markdown("#### 📊 Statistiques du service")
-                stats_arch = get_stats_architecture()
-                
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Total demandes", stats_arch['total'])
-                with col2:
-                    st.metric("En cours", stats_arch['en_cours'])
-                with col3:
-                    st.metric("Superficie moyenne", f"{stats_arch['superficie_moyenne']:,.0f} pi²")
-                with col4:
-                    st.metric("CA total", f"{stats_arch['ca_total']:,.2f}$")
-                
-                # Liste des demandes
-                st.markdown("#### 📋 Demandes d'architecture")
-                
-                for demande in demandes_arch:
-                    with st.expander(f"📐 {demande['numero_reference']} - {demande['nom_client']}"):
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            st.markdown(f"**Client:** {demande['nom_client']}")
-                            st.markdown(f"**Email:** {demande['email_client']}")
-                            st.markdown(f"**Tél:** {demande['telephone_client']}")
-                            st.markdown(f"**Ville:** {demande['ville']}")
-                        
-                        with col2:
-                            st.markdown(f"**Type:** {demande['type_batiment']}")
-                            st.markdown(f"**Superficie:** {demande['superficie_batiment']:,.0f} pi²")
-                            st.markdown(f"**Étages:** {demande['nombre_etages']}")
-                            st.markdown(f"**Budget construction:** {demande['budget_construction']}")
-                        
-                        with col3:
-                            # Indicateur d'urgence
-                            urgence_colors = {
-                                'faible': '🟢', 'normal': '🟡',
-                                'eleve': '🟠', 'critique': '🔴'
-                            }
-                            urgence_icon = urgence_colors.get(demande['niveau_urgence'], '🟡')
-                            st.markdown(f"**Urgence:** {urgence_icon} {demande['niveau_urgence'].title()}")
-                            st.markdown(f"**Prix service:** {demande['prix_service']:,.2f}$")
-                            st.markdown(f"**Statut:** {demande['statut'].replace('_', ' ').title()}")
-                            
-                            if demande['pourcentage_complete']:
-                                st.progress(demande['pourcentage_complete'] / 100)
-                                st.caption(f"Progression: {demande['pourcentage_complete']}%")
-                        
-                        st.markdown("---")
-                        st.markdown(f"**Usage du bâtiment:** {demande['usage_batiment']}")
-                        
-                        # Gestion du statut
-                        st.markdown("#### 🔧 Gestion de la demande")
-                        
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            nouveau_statut = st.selectbox(
-                                "Changer le statut",
-                                ['recue', 'en_analyse', 'acceptee', 'en_cours', 
-                                 'revision', 'approuvee', 'livree', 'terminee'],
-                                index=['recue', 'en_analyse', 'acceptee', 'en_cours', 
-                                       'revision', 'approuvee', 'livree', 'terminee'].index(demande['statut']),
-                                key=f"statut_arch_{demande['id']}"
-                            )
-                            
-                            pourcentage = st.slider(
-                                "Progression (%)",
-                                0, 100, 
-                                value=demande['pourcentage_complete'] or 0,
-                                key=f"progress_arch_{demande['id']}"
-                            )
-                        
-                        with col2:
-                            notes = st.text_area(
-                                "Notes internes",
-                                value="",
-                                height=100,
-                                key=f"notes_arch_{demande['id']}"
-                            )
-                        
-                        if st.button(f"💾 Mettre à jour", key=f"update_arch_{demande['id']}"):
-                            if mettre_a_jour_statut_architecture(
-                                demande['id'], nouveau_statut, notes, pourcentage
-                            ):
-                                st.success("✅ Demande mise à jour")
-                                st.rerun()
-                            else:
-                                st.error("❌ Erreur lors de la mise à jour")
-            else:
-                st.info("📭 Aucune demande d'architecture pour le moment")
-        
-        with tab7:
-            st.markdown("### 🔧 Gestion des demandes d'ingénieur")
-            
-            demandes_ing = get_demandes_ingenieur_admin()
-            
-            if demandes_ing:
-                # Statistiques
-                st.markdown("#### 📊 Statistiques du service")
-                stats_ing = get_stats_ingenieur()
-                
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Total demandes", stats_ing['total'])
-                with col2:
-                    st.metric("En cours", stats_ing['en_cours'])
-                with col3:
-                    st.metric("Superficie moyenne", f"{stats_ing['superficie_moyenne']:,.0f} pi²")
-                with col4:
-                    st.metric("CA total", f"{stats_ing['ca_total']:,.2f}$")
-                
-                # Liste des demandes
-                st.markdown("#### 📋 Demandes d'ingénieur")
-                
-                for demande in demandes_ing:
-                    with st.expander(f"🔧 {demande['numero_reference']} - {demande['nom_client']}"):
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            st.markdown(f"**Client:** {demande['nom_client']}")
-                            st.markdown(f"**Email:** {demande['email_client']}")
-                            st.markdown(f"**Tél:** {demande['telephone_client']}")
-                            st.markdown(f"**Ville:** {demande['ville']}")
-                        
-                        with col2:
-                            st.markdown(f"**Type structure:** {demande['type_structure']}")
-                            st.markdown(f"**Superficie:** {demande['superficie_projet']:,.0f} pi²")
-                            st.markdown(f"**Étages:** {demande['nombre_etages']}")
-                            st.markdown(f"**Budget ingénieur:** {demande['budget_ingenieur']}")
-                        
-                        with col3:
-                            # Indicateur d'urgence
-                            urgence_colors = {
-                                'faible': '🟢', 'normal': '🟡',
-                                'eleve': '🟠', 'critique': '🔴'
-                            }
-                            urgence_icon = urgence_colors.get(demande['niveau_urgence'], '🟡')
-                            st.markdown(f"**Urgence:** {urgence_icon} {demande['niveau_urgence'].title()}")
-                            st.markdown(f"**Prix service:** {demande['prix_service']:,.2f}$")
-                            st.markdown(f"**Statut:** {demande['statut'].replace('_', ' ').title()}")
-                            
-                            if demande['pourcentage_complete']:
-                                st.progress(demande['pourcentage_complete'] / 100)
-                                st.caption(f"Progression: {demande['pourcentage_complete']}%")
-                        
-                        st.markdown("---")
-                        st.markdown(f"**Usage structure:** {demande['usage_structure']}")
-                        st.markdown(f"**Type construction:** {demande['type_construction']}")
-                        st.markdown(f"**Services demandés:** {demande['services_demandes']}")
-                        
-                        # Gestion du statut
-                        st.markdown("#### 🔧 Gestion de la demande")
-                        
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            nouveau_statut = st.selectbox(
-                                "Changer le statut",
-                                ['recue', 'analyse', 'acceptee', 'calculs', 'plans', 'revision', 'terminee'],
-                                index=['recue', 'analyse', 'acceptee', 'calculs', 'plans', 'revision', 'terminee'].index(demande['statut']),
-                                key=f"statut_ing_{demande['id']}"
-                            )
-                            
-                            pourcentage = st.slider(
-                                "Progression (%)",
-                                0, 100, 
-                                value=demande['pourcentage_complete'] or 0,
-                                key=f"progress_ing_{demande['id']}"
-                            )
-                        
-                        with col2:
-                            notes = st.text_area(
-                                "Notes internes",
-                                value="",
-                                height=100,
-                                key=f"notes_ing_{demande['id']}"
-                            )
-                        
-                        if st.button(f"💾 Mettre à jour", key=f"update_ing_{demande['id']}"):
-                            if mettre_a_jour_statut_ingenieur(
-                                demande['id'], nouveau_statut, notes, pourcentage
-                            ):
-                                st.success("✅ Demande mise à jour")
-                                st.rerun()
-                            else:
-                                st.error("❌ Erreur lors de la mise à jour")
-            else:
-                st.info("📭 Aucune demande d'ingénieur pour le moment")
-
-# ================== SYSTÈME DE DÉLAIS/URGENCE ==================
-
-def calculer_jours_restants(date_limite: str) -> int:
-    """Calcule le nombre de jours restants jusqu'à une date limite"""
-    if not date_limite:
-        return 999  # Pas de limite définie
-    
-    try:
-        date_limite_obj = datetime.datetime.strptime(date_limite, '%Y-%m-%d').date()
-        aujourd_hui = datetime.date.today()
-        jours_restants = (date_limite_obj - aujourd_hui).days
-        return jours_restants
-    except:
-        return 999
-
-def determiner_niveau_urgence_automatique(date_limite_soumissions: str, date_debut_souhaite: str) -> str:
-    """Détermine automatiquement le niveau d'urgence basé sur les délais"""
-    jours_soumissions = calculer_jours_restants(date_limite_soumissions)
-    jours_debut = calculer_jours_restants(date_debut_souhaite)
-    
-    # Urgence basée sur les délais les plus courts
-    jours_min = min(jours_soumissions, jours_debut)
-    
-    if jours_min < 0:
-        return 'critique'  # Échéance dépassée
-    elif jours_min <= 3:
-        return 'critique'  # Moins de 3 jours
-    elif jours_min <= 7:
-        return 'eleve'     # Moins d'une semaine
-    elif jours_min <= 14:
-        return 'normal'    # Moins de 2 semaines
-    else:
-        return 'faible'    # Plus de 2 semaines
-
-def get_couleur_urgence(niveau_urgence: str) -> tuple:
-    """Retourne la couleur et l'icône pour un niveau d'urgence"""
-    couleurs = {
-        'faible': ('🟢', '#28a745', 'Faible'),
-        'normal': ('🟡', '#ffc107', 'Normal'),
-        'eleve': ('🟠', '#fd7e14', 'Élevé'),
-        'critique': ('🔴', '#dc3545', 'Critique')
-    }
-    return couleurs.get(niveau_urgence, couleurs['normal'])
-
-def get_message_urgence(niveau_urgence: str, jours_restants: int) -> str:
-    """Génère un message d'urgence approprié"""
-    if niveau_urgence == 'critique':
-        if jours_restants < 0:
-            return f"⚠️ ÉCHÉANCE DÉPASSÉE de {abs(jours_restants)} jour(s) !"
-        else:
-            return f"🚨 URGENT - Plus que {jours_restants} jour(s) !"
-    elif niveau_urgence == 'eleve':
-        return f"⚡ PRIORITAIRE - {jours_restants} jour(s) restant(s)"
-    elif niveau_urgence == 'normal':
-        return f"📅 {jours_restants} jour(s) restant(s)"
-    else:
-        return f"✅ {jours_restants} jour(s) - Délai confortable"
-
-def mettre_a_jour_urgence_projet(projet_id: int):
-    """Met à jour automatiquement le niveau d'urgence d'un projet"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Récupérer les dates du projet
-    cursor.execute('''
-        SELECT date_limite_soumissions, date_debut_souhaite, niveau_urgence
-        FROM leads WHERE id = ?
-    ''', (projet_id,))
-    
-    result = cursor.fetchone()
-    if result:
-        date_limite_soumissions, date_debut_souhaite, niveau_actuel = result
-        
-        # Calculer le nouveau niveau d'urgence
-        nouveau_niveau = determiner_niveau_urgence_automatique(date_limite_soumissions, date_debut_souhaite)
-        
-        # Mettre à jour seulement si le niveau a changé
-        if nouveau_niveau != niveau_actuel:
-            cursor.execute('''
-                UPDATE leads SET niveau_urgence = ? WHERE id = ?
-            ''', (nouveau_niveau, projet_id))
-            conn.commit()
-            
-            # Créer une notification si l'urgence augmente
-            if niveau_actuel in ['faible', 'normal'] and nouveau_niveau in ['eleve', 'critique']:
-                notifier_urgence_projet(projet_id, nouveau_niveau)
-    
-    conn.close()
-
-def notifier_urgence_projet(projet_id: int, niveau_urgence: str):
-    """Crée des notifications d'urgence pour un projet"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Récupérer les infos du projet
-    cursor.execute('''
-        SELECT nom, email, type_projet, numero_reference, date_limite_soumissions
-        FROM leads WHERE id = ?
-    ''', (projet_id,))
-    
-    projet = cursor.fetchone()
-    if not projet:
-        conn.close()
-        return
-    
-    nom_client, email_client, type_projet, numero_ref, date_limite = projet
-    jours_restants = calculer_jours_restants(date_limite)
-    
-    # Message selon le niveau d'urgence
-    if niveau_urgence == 'critique':
-        titre = f"🚨 URGENT - Projet {numero_ref}"
-        message = f"Le projet '{type_projet}' arrive à échéance dans {jours_restants} jour(s) !"
-    else:
-        titre = f"⚡ PRIORITAIRE - Projet {numero_ref}"
-        message = f"Le projet '{type_projet}' nécessite une attention prioritaire"
-    
-    # Notifier le client
-    cursor.execute('''
-        INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, 
-                                 titre, message, lien_id)
-        VALUES ('client', ?, 'urgence_projet', ?, ?, ?)
-    ''', (projet_id, titre, message, projet_id))
-    
-    # Notifier tous les entrepreneurs qui ont soumissionné
-    cursor.execute('''
-        SELECT DISTINCT entrepreneur_id FROM soumissions WHERE lead_id = ?
-    ''', (projet_id,))
-    
-    entrepreneurs = cursor.fetchall()
-    for (entrepreneur_id,) in entrepreneurs:
-        cursor.execute('''
-            INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, 
-                                     titre, message, lien_id)
-            VALUES ('entrepreneur', ?, 'urgence_projet', ?, ?, ?)
-        ''', (entrepreneur_id, titre, f"Projet urgent : {message}", projet_id))
-    
-    conn.commit()
-    conn.close()
-
-def get_projets_par_urgence() -> Dict[str, List[Dict]]:
-    """Récupère tous les projets groupés par niveau d'urgence"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT l.*, 
-               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions,
-               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id AND s.statut = 'acceptee') as nb_acceptees
-        FROM leads l
-        WHERE l.visible_entrepreneurs = 1 AND l.accepte_soumissions = 1
-        ORDER BY 
-            CASE l.niveau_urgence 
-                WHEN 'critique' THEN 1 
-                WHEN 'eleve' THEN 2 
-                WHEN 'normal' THEN 3 
-                WHEN 'faible' THEN 4 
-            END,
-            l.date_limite_soumissions ASC
-    ''')
-    
-    projets_par_urgence = {
-        'critique': [],
-        'eleve': [],
-        'normal': [],
-        'faible': []
-    }
-    
-    for row in cursor.fetchall():
-        projet = {
-            'id': row[0], 'nom': row[1], 'email': row[2], 'telephone': row[3],
-            'code_postal': row[4], 'type_projet': row[5], 'description': row[6],
-            'budget': row[7], 'delai_realisation': row[8], 
-            'date_limite_soumissions': row[9], 'date_debut_souhaite': row[10], 'niveau_urgence': row[11],
-            'photos': row[12], 'plans': row[13], 'documents': row[14], 
-            'date_creation': row[15], 'statut': row[16], 'numero_reference': row[17],
-            'visible_entrepreneurs': row[18], 'accepte_soumissions': row[19],
-            'nb_soumissions': int(row[20]) if row[20] is not None else 0, 
-            'nb_acceptees': int(row[21]) if row[21] is not None else 0
-        }
-        
-        # Calculer les jours restants
-        projet['jours_restants_soumissions'] = calculer_jours_restants(projet['date_limite_soumissions'])
-        projet['jours_restants_debut'] = calculer_jours_restants(projet['date_debut_souhaite'])
-        
-        # Mettre à jour l'urgence automatiquement
-        mettre_a_jour_urgence_projet(projet['id'])
-        
-        niveau = projet['niveau_urgence']
-        if niveau in projets_par_urgence:
-            projets_par_urgence[niveau].append(projet)
-    
-    conn.close()
-    return projets_par_urgence
-
-def page_service_estimation():
-    """Page du service d'estimation payant"""
-    
-    st.markdown("""
-    <div class="main-header">
-        <h1>💰 Service d'estimation professionnel</h1>
-        <p>Obtenez une estimation détaillée pour votre projet avec notre service expert</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Tabs pour séparer demande d'estimation et suivi
-    tab1, tab2 = st.tabs(["📝 Demander une estimation", "📊 Mes estimations"])
-    
-    with tab1:
-        st.markdown("### 🎯 Nouvelle demande d'estimation")
-        
-        with st.form("demande_estimation"):
-            st.markdown("**📋 Informations de contact**")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                nom_client = st.text_input("Nom complet *", placeholder="Ex: Marie Dubois")
-                email_client = st.text_input("Email *", placeholder="marie.dubois@email.com")
-            
-            with col2:
-                telephone_client = st.text_input("Téléphone *", placeholder="514-555-1234")
-                adresse_client = st.text_input("Adresse du projet", placeholder="123 Rue Principale, Montréal, QC")
-            
-            st.markdown("**🏗️ Détails du projet**")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                type_projet = st.selectbox(
-                    "Type de projet *",
-                    ["", "Rénovation cuisine", "Rénovation salle de bain", "Toiture", 
-                     "Revêtement extérieur", "Plancher", "Peinture", "Agrandissement",
-                     "Fondation", "Plomberie", "Électricité", "Isolation", "CVC",
-                     "Fenêtres et portes", "Maçonnerie", "Charpenterie", "Paysagement", "Autre"]
-                )
-                
-                budget_approximatif = st.selectbox(
-                    "Budget approximatif",
-                    ["À déterminer", "Moins de 5 000$", "5 000$ - 15 000$", "15 000$ - 30 000$", 
-                     "30 000$ - 50 000$", "50 000$ - 100 000$", "Plus de 100 000$"]
-                )
-            
-            with col2:
-                surface_approximative = st.text_input("Surface approximative", placeholder="Ex: 120 pi²")
-                delai_souhaite = st.selectbox(
-                    "Délai souhaité pour les travaux",
-                    ["Flexible", "Dès que possible", "Dans 1 mois", "Dans 2-3 mois", 
-                     "Dans 3-6 mois", "Plus de 6 mois"]
-                )
-            
-            description_detaillee = st.text_area(
-                "Description détaillée du projet *",
-                placeholder="""Décrivez précisément votre projet:
-- Travaux souhaités
-- Matériaux préférés
-- Contraintes particulières
-- Objectifs spécifiques
-- Toute information utile pour l'estimation""",
-                height=200
-            )
-            
-            st.markdown("**📎 Documents du projet**")
-            st.info("💡 Plus vous fournissez de documents précis (plans, photos, croquis), plus l'estimation sera précise.")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown("**📐 Plans et croquis**")
-                plans_files = st.file_uploader(
-                    "Plans, croquis, schémas",
-                    type=['pdf', 'png', 'jpg', 'jpeg', 'dwg'],
-                    accept_multiple_files=True,
-                    key="plans_estimation"
-                )
-            
-            with col2:
-                st.markdown("**📷 Photos existant**")
-                photos_files = st.file_uploader(
-                    "Photos de l'état actuel",
-                    type=['png', 'jpg', 'jpeg'],
-                    accept_multiple_files=True,
-                    key="photos_estimation"
-                )
-            
-            with col3:
-                st.markdown("**📄 Autres documents**")
-                docs_files = st.file_uploader(
-                    "Devis existants, spécifications...",
-                    type=['pdf', 'doc', 'docx', 'txt'],
-                    accept_multiple_files=True,
-                    key="docs_estimation"
-                )
-            
-            st.markdown("---")
-            st.markdown("**💰 Service d'estimation**")
-            st.info("""
-            **Notre service d'estimation professionnel inclut :**
-            - ✅ Analyse détaillée de votre projet
-            - ✅ Estimation précise des coûts par poste
-            - ✅ Recommandations de matériaux et techniques
-            - ✅ Planning approximatif des travaux
-            - ✅ Liste des permis/autorisations nécessaires
-            - ✅ Rapport d'estimation professionnel (PDF)
-            - ✅ Facture détaillée
-            
-            **Tarif : 150$ - 300$ selon la complexité**
-            """)
-            
-            soumis = st.form_submit_button("📤 Envoyer ma demande d'estimation", type="primary")
-            
-            if soumis:
-                # Validation des champs obligatoires
-                erreurs = []
-                if not nom_client.strip():
-                    erreurs.append("Le nom est obligatoire")
-                if not email_client.strip():
-                    erreurs.append("L'email est obligatoire")
-                if not valider_email(email_client):
-                    erreurs.append("Format d'email invalide")
-                if not telephone_client.strip():
-                    erreurs.append("Le téléphone est obligatoire")
-                if not type_projet or type_projet == "":
-                    erreurs.append("Le type de projet est obligatoire")
-                if not description_detaillee.strip():
-                    erreurs.append("La description du projet est obligatoire")
-                
-                if erreurs:
-                    for erreur in erreurs:
-                        st.error(f"❌ {erreur}")
-                else:
-                    # Traiter les fichiers uploadés
-                    plans_base64 = []
-                    photos_base64 = []
-                    docs_base64 = []
-                    
-                    if plans_files:
-                        for file in plans_files:
-                            try:
-                                file_content = file.read()
-                                file_b64 = base64.b64encode(file_content).decode()
-                                plans_base64.append(f"{file.name}:{file_b64}")
-                            except Exception as e:
-                                st.error(f"Erreur lors du traitement de {file.name}: {e}")
-                    
-                    if photos_files:
-                        for file in photos_files:
-                            try:
-                                file_content = file.read()
-                                file_b64 = base64.b64encode(file_content).decode()
-                                photos_base64.append(f"{file.name}:{file_b64}")
-                            except Exception as e:
-                                st.error(f"Erreur lors du traitement de {file.name}: {e}")
-                    
-                    if docs_files:
-                        for file in docs_files:
-                            try:
-                                file_content = file.read()
-                                file_b64 = base64.b64encode(file_content).decode()
-                                docs_base64.append(f"{file.name}:{file_b64}")
-                            except Exception as e:
-                                st.error(f"Erreur lors du traitement de {file.name}: {e}")
-                    
-                    # Créer la demande d'estimation
-                    estimation_data = {
-                        'nom_client': nom_client.strip(),
-                        'email_client': email_client.strip().lower(),
-                        'telephone_client': telephone_client.strip(),
-                        'adresse_client': adresse_client.strip(),
-                        'type_projet': type_projet,
-                        'description_detaillee': description_detaillee.strip(),
-                        'surface_approximative': surface_approximative.strip(),
-                        'budget_approximatif': budget_approximatif,
-                        'delai_souhaite': delai_souhaite,
-                        'plans_client': ",".join(plans_base64),
-                        'photos_client': ",".join(photos_base64),
-                        'documents_client': ",".join(docs_base64),
-                        'prix_estimation': 200.0  # Prix de base, ajustable selon complexité
-                    }
-                    
-                    if creer_demande_estimation(estimation_data):
-                        st.success("🎉 Votre demande d'estimation a été envoyée avec succès!")
-                        st.info("""
-                        **Prochaines étapes :**
-                        1. Vous recevrez un email de confirmation dans les prochaines minutes
-                        2. Notre équipe analysera votre projet sous 24-48h
-                        3. Vous serez contacté pour discuter des détails si nécessaire  
-                        4. L'estimation sera préparée et envoyée sous 3-5 jours ouvrables
-                        
-                        Vous pouvez suivre l'état de votre demande dans l'onglet "Mes estimations".
-                        """)
-                        st.balloons()
-                    else:
-                        st.error("❌ Erreur lors de l'envoi de votre demande. Veuillez réessayer.")
-    
-    with tab2:
-        st.markdown("### 📊 Suivi de mes estimations")
-        
-        # Formulaire pour consulter les estimations
-        with st.form("consultation_estimations"):
-            email_consultation = st.text_input("Email pour consulter vos estimations", 
-                                             placeholder="votre.email@exemple.com")
-            consulter = st.form_submit_button("🔍 Consulter mes estimations")
-        
-        if consulter and email_consultation:
-            if valider_email(email_consultation):
-                estimations = get_estimations_client(email_consultation.strip().lower())
-                
-                if estimations:
-                    st.success(f"📋 {len(estimations)} estimation(s) trouvée(s)")
-                    
-                    for estimation in estimations:
-                        # Mapper les statuts pour l'affichage
-                        statuts_affichage = {
-                            'recue': '🆕 Demande reçue',
-                            'en_cours': '🔄 En cours d\'analyse',
-                            'terminee': '✅ Estimation terminée',
-                            'envoyee': '📧 Estimation envoyée',
-                            'payee': '💰 Payée'
-                        }
-                        
-                        with st.expander(f"**{estimation['type_projet']}** - {estimation['numero_reference']}", expanded=True):
-                            col1, col2, col3 = st.columns([2, 1, 1])
-                            
-                            with col1:
-                                st.write(f"**Description :** {estimation['description_detaillee'][:200]}...")
-                                st.write(f"**Date de demande :** {estimation['date_demande']}")
-                            
-                            with col2:
-                                statut_badge = statuts_affichage.get(estimation['statut'], estimation['statut'])
-                                st.markdown(f"**Statut :** {statut_badge}")
-                                if estimation['prix_estimation']:
-                                    st.write(f"**Prix estimation :** {estimation['prix_estimation']:.2f}$")
-                            
-                            with col3:
-                                if estimation['date_estimation_terminee']:
-                                    st.write(f"**Terminée le :** {estimation['date_estimation_terminee']}")
-                                if estimation['date_envoi_client']:
-                                    st.write(f"**Envoyée le :** {estimation['date_envoi_client']}")
-                            
-                            # Si l'estimation est envoyée, proposer de télécharger
-                            if estimation['statut'] == 'envoyee':
-                                st.success("🎉 Votre estimation est prête ! Contactez-nous pour recevoir les documents.")
-                else:
-                    st.info("Aucune estimation trouvée pour cet email.")
-            else:
-                st.error("Format d'email invalide")
-
-# === FONCTIONS POUR SERVICE D'ARCHITECTURE ===
-
-def verifier_et_creer_table_architecture():
-    """Vérifie si la table architecture existe, sinon la crée"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Vérifier si la table existe
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='demandes_architecture'")
-        if not cursor.fetchone():
-            print("Création de la table demandes_architecture...")
-            
-            # Créer la table notifications si elle n'existe pas
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS notifications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    utilisateur_type TEXT NOT NULL,
-                    utilisateur_id INTEGER NOT NULL,
-                    type_notification TEXT NOT NULL,
-                    titre TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    lien_id INTEGER,
-                    lu BOOLEAN DEFAULT 0,
-                    date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Créer la table demandes_architecture
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS demandes_architecture (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nom_client TEXT NOT NULL,
-                    email_client TEXT NOT NULL,
-                    telephone_client TEXT NOT NULL,
-                    adresse_projet TEXT NOT NULL,
-                    ville TEXT NOT NULL,
-                    code_postal TEXT NOT NULL,
-                    type_batiment TEXT NOT NULL,
-                    usage_batiment TEXT NOT NULL,
-                    superficie_terrain REAL,
-                    superficie_batiment REAL NOT NULL,
-                    nombre_etages INTEGER DEFAULT 1,
-                    nombre_logements INTEGER,
-                    type_construction TEXT,
-                    style_architectural TEXT,
-                    contraintes_terrain TEXT,
-                    exigences_speciales TEXT,
-                    plans_requis TEXT NOT NULL,
-                    services_inclus TEXT,
-                    besoin_3d BOOLEAN DEFAULT 0,
-                    besoin_permis BOOLEAN DEFAULT 1,
-                    certificat_localisation TEXT,
-                    photos_terrain TEXT,
-                    croquis_client TEXT,
-                    documents_urbanisme TEXT,
-                    budget_construction TEXT,
-                    budget_architecture TEXT,
-                    date_debut_souhaite DATE,
-                    date_livraison_plans DATE,
-                    niveau_urgence TEXT DEFAULT 'normal',
-                    architecte_assigne TEXT,
-                    numero_oaq TEXT,
-                    plans_preliminaires TEXT,
-                    plans_finaux TEXT,
-                    devis_architecture TEXT,
-                    rapport_urbanisme TEXT,
-                    estimation_couts_construction TEXT,
-                    prix_service REAL,
-                    modalite_paiement TEXT,
-                    pourcentage_complete INTEGER DEFAULT 0,
-                    statut TEXT DEFAULT 'recue',
-                    notes_internes TEXT,
-                    commentaires_client TEXT,
-                    raison_refus TEXT,
-                    date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    date_analyse TIMESTAMP,
-                    date_acceptation TIMESTAMP,
-                    date_debut_plans TIMESTAMP,
-                    date_revision TIMESTAMP,
-                    date_approbation TIMESTAMP,
-                    date_livraison TIMESTAMP,
-                    date_paiement TIMESTAMP,
-                    numero_reference TEXT UNIQUE,
-                    numero_projet_architecte TEXT,
-                    lead_id INTEGER,
-                    conforme_zonage BOOLEAN,
-                    conforme_cnb BOOLEAN,
-                    validation_ingenieur BOOLEAN,
-                    validation_urbanisme BOOLEAN,
-                    FOREIGN KEY (lead_id) REFERENCES leads (id)
-                )
-            ''')
-            
-            # Créer les index
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_arch_statut ON demandes_architecture(statut)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_arch_client ON demandes_architecture(email_client)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_arch_date ON demandes_architecture(date_demande)')
-            
-            conn.commit()
-            print("Table demandes_architecture créée avec succès")
-            
-    except Exception as e:
-        print(f"Erreur lors de la création de la table architecture: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
-
-def verifier_et_creer_table_ingenieur():
-    """Vérifie si la table ingénieur existe, sinon la crée"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Vérifier si la table existe
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='demandes_ingenieur'")
-        if not cursor.fetchone():
-            print("Création de la table demandes_ingenieur...")
-            
-            # Créer la table demandes_ingenieur
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS demandes_ingenieur (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nom_client TEXT NOT NULL,
-                    email_client TEXT NOT NULL,
-                    telephone_client TEXT NOT NULL,
-                    adresse_projet TEXT NOT NULL,
-                    ville TEXT NOT NULL,
-                    code_postal TEXT NOT NULL,
-                    type_structure TEXT NOT NULL,
-                    type_batiment TEXT,
-                    usage_structure TEXT NOT NULL,
-                    superficie_projet REAL,
-                    hauteur_structure REAL,
-                    nombre_etages INTEGER DEFAULT 1,
-                    charge_exploitation TEXT,
-                    type_construction TEXT,
-                    sol_porteur TEXT,
-                    zone_sismique TEXT,
-                    contraintes_particulieres TEXT,
-                    normes_requises TEXT,
-                    services_demandes TEXT NOT NULL,
-                    calculs_requis TEXT,
-                    plans_requis TEXT,
-                    surveillance_chantier BOOLEAN DEFAULT 0,
-                    certification_requise BOOLEAN DEFAULT 1,
-                    plans_architecte TEXT,
-                    etude_sol TEXT,
-                    photos_existant TEXT,
-                    autres_documents TEXT,
-                    budget_structure TEXT,
-                    budget_ingenieur TEXT,
-                    date_debut_souhaite DATE,
-                    date_livraison_souhaite DATE,
-                    niveau_urgence TEXT DEFAULT 'normal',
-                    ingenieur_assigne TEXT,
-                    numero_oiq TEXT,
-                    calculs_structures TEXT,
-                    plans_structures TEXT,
-                    specifications_techniques TEXT,
-                    rapport_surveillance TEXT,
-                    certificat_conformite TEXT,
-                    prix_service REAL,
-                    modalite_paiement TEXT,
-                    taux_horaire REAL,
-                    pourcentage_complete INTEGER DEFAULT 0,
-                    statut TEXT DEFAULT 'recue',
-                    notes_internes TEXT,
-                    commentaires_client TEXT,
-                    raison_refus TEXT,
-                    date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    date_analyse TIMESTAMP,
-                    date_acceptation TIMESTAMP,
-                    date_debut_calculs TIMESTAMP,
-                    date_fin_calculs TIMESTAMP,
-                    date_debut_plans TIMESTAMP,
-                    date_fin_plans TIMESTAMP,
-                    date_livraison TIMESTAMP,
-                    date_paiement TIMESTAMP,
-                    numero_reference TEXT UNIQUE,
-                    numero_projet_ingenieur TEXT,
-                    lead_id INTEGER,
-                    demande_architecture_id INTEGER,
-                    conforme_cnb BOOLEAN,
-                    conforme_csa BOOLEAN,
-                    validation_pairs BOOLEAN,
-                    analyse_sismique BOOLEAN DEFAULT 0,
-                    analyse_vent BOOLEAN DEFAULT 0,
-                    analyse_neige BOOLEAN DEFAULT 0,
-                    analyse_dynamique BOOLEAN DEFAULT 0,
-                    modelisation_3d BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (lead_id) REFERENCES leads (id),
-                    FOREIGN KEY (demande_architecture_id) REFERENCES demandes_architecture (id)
-                )
-            ''')
-            
-            # Créer les index
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ing_statut ON demandes_ingenieur(statut)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ing_client ON demandes_ingenieur(email_client)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ing_date ON demandes_ingenieur(date_demande)')
-            
-            conn.commit()
-            print("Table demandes_ingenieur créée avec succès")
-            
-    except Exception as e:
-        print(f"Erreur lors de la création de la table ingénieur: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
-
-def get_demandes_architecture_admin() -> List[Dict]:
-    """Récupère toutes les demandes d'architecture pour l'admin"""
-    # Vérifier et créer la table si nécessaire
-    verifier_et_creer_table_architecture()
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            SELECT id, nom_client, email_client, telephone_client, ville, type_batiment,
-                   superficie_batiment, nombre_etages, budget_construction, prix_service,
-                   statut, date_demande, numero_reference, niveau_urgence, 
-                   pourcentage_complete, usage_batiment
-            FROM demandes_architecture
-            ORDER BY date_demande DESC
-        ''')
-    except sqlite3.OperationalError as e:
-        if "no such table" in str(e):
-            conn.close()
-            return []
-        else:
-            raise
-    
-    demandes = []
-    for row in cursor.fetchall():
-        demandes.append({
-            'id': row[0],
-            'nom_client': row[1],
-            'email_client': row[2],
-            'telephone_client': row[3],
-            'ville': row[4],
-            'type_batiment': row[5],
-            'superficie_batiment': row[6],
-            'nombre_etages': row[7],
-            'budget_construction': row[8],
-            'prix_service': row[9],
-            'statut': row[10],
-            'date_demande': row[11],
-            'numero_reference': row[12],
-            'niveau_urgence': row[13],
-            'pourcentage_complete': row[14],
-            'usage_batiment': row[15]
-        })
-    
-    conn.close()
-    return demandes
-
-def get_stats_architecture() -> Dict:
-    """Récupère les statistiques du service d'architecture"""
-    # Vérifier et créer la table si nécessaire
-    verifier_et_creer_table_architecture()
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('SELECT COUNT(*) FROM demandes_architecture')
-        total = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM demandes_architecture WHERE statut IN ('en_cours', 'revision', 'acceptee')")
-        en_cours = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT AVG(superficie_batiment) FROM demandes_architecture WHERE superficie_batiment IS NOT NULL')
-        superficie_avg = cursor.fetchone()[0] or 0
-        
-        cursor.execute('SELECT SUM(prix_service) FROM demandes_architecture WHERE prix_service IS NOT NULL')
-        ca_total = cursor.fetchone()[0] or 0
-        
-        conn.close()
-        
-        return {
-            'total': total,
-            'en_cours': en_cours,
-            'superficie_moyenne': superficie_avg,
-            'ca_total': ca_total
-        }
-    except sqlite3.OperationalError as e:
-        if "no such table" in str(e):
-            conn.close()
-            return {'total': 0, 'en_cours': 0, 'superficie_moyenne': 0, 'ca_total': 0}
-        else:
-            raise
-
-def mettre_a_jour_statut_architecture(demande_id: int, nouveau_statut: str, notes: str, pourcentage: int) -> bool:
-    """Met à jour le statut d'une demande d'architecture"""
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE demandes_architecture 
-            SET statut = ?, notes_internes = ?, pourcentage_complete = ?
-            WHERE id = ?
-        ''', (nouveau_statut, notes, pourcentage, demande_id))
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Erreur mise à jour architecture: {e}")
-        return False
-
-# === FONCTIONS POUR SERVICE D'INGÉNIEUR ===
-
-def get_demandes_ingenieur_admin() -> List[Dict]:
-    """Récupère toutes les demandes d'ingénieur pour l'admin"""
-    # Vérifier et créer la table si nécessaire
-    verifier_et_creer_table_ingenieur()
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            SELECT id, nom_client, email_client, telephone_client, ville, type_structure,
-                   superficie_projet, nombre_etages, budget_ingenieur, prix_service,
-                   statut, date_demande, numero_reference, niveau_urgence, 
-                   pourcentage_complete, usage_structure, type_construction, services_demandes
-            FROM demandes_ingenieur
-            ORDER BY date_demande DESC
-        ''')
-    except sqlite3.OperationalError as e:
-        if "no such table" in str(e):
-            conn.close()
-            return []
-        else:
-            raise
-    
-    demandes = []
-    for row in cursor.fetchall():
-        demandes.append({
-            'id': row[0],
-            'nom_client': row[1],
-            'email_client': row[2],
-            'telephone_client': row[3],
-            'ville': row[4],
-            'type_structure': row[5],
-            'superficie_projet': row[6],
-            'nombre_etages': row[7],
-            'budget_ingenieur': row[8],
-            'prix_service': row[9],
-            'statut': row[10],
-            'date_demande': row[11],
-            'numero_reference': row[12],
-            'niveau_urgence': row[13],
-            'pourcentage_complete': row[14],
-            'usage_structure': row[15],
-            'type_construction': row[16],
-            'services_demandes': row[17]
-        })
-    
-    conn.close()
-    return demandes
-
-def get_stats_ingenieur() -> Dict:
-    """Récupère les statistiques du service d'ingénieur"""
-    # Vérifier et créer la table si nécessaire
-    verifier_et_creer_table_ingenieur()
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('SELECT COUNT(*) FROM demandes_ingenieur')
-        total = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM demandes_ingenieur WHERE statut IN ('calculs', 'plans', 'revision', 'acceptee')")
-        en_cours = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT AVG(superficie_projet) FROM demandes_ingenieur WHERE superficie_projet IS NOT NULL')
-        superficie_avg = cursor.fetchone()[0] or 0
-        
-        cursor.execute('SELECT SUM(prix_service) FROM demandes_ingenieur WHERE prix_service IS NOT NULL')
-        ca_total = cursor.fetchone()[0] or 0
-        
-        conn.close()
-        
-        return {
-            'total': total,
-            'en_cours': en_cours,
-            'superficie_moyenne': superficie_avg,
-            'ca_total': ca_total
-        }
-    except sqlite3.OperationalError as e:
-        if "no such table" in str(e):
-            conn.close()
-            return {'total': 0, 'en_cours': 0, 'superficie_moyenne': 0, 'ca_total': 0}
-        else:
-            raise
-
-def mettre_a_jour_statut_ingenieur(demande_id: int, nouveau_statut: str, notes: str, pourcentage: int) -> bool:
-    """Met à jour le statut d'une demande d'ingénieur"""
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE demandes_ingenieur 
-            SET statut = ?, notes_internes = ?, pourcentage_complete = ?
-            WHERE id = ?
-        ''', (nouveau_statut, notes, pourcentage, demande_id))
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Erreur mise à jour ingénieur: {e}")
-        return False
-
-# === FONCTIONS POUR SERVICE DE TECHNOLOGUE ===
-
-def calculer_prix_technologue(superficie: float, services: list, options: dict) -> float:
-    """Calcule le prix du service de technologue basé sur superficie et services"""
-    # Prix de base selon la superficie (≤ 6000 pi²)
-    if superficie <= 1000:
-        prix_base = 2500
-    elif superficie <= 2500:
-        prix_base = 3500
-    elif superficie <= 4000:
-        prix_base = 4500
-    elif superficie <= 6000:
-        prix_base = 6000
-    else:
-        # Au-delà de 6000 pi², recommander un architecte
-        prix_base = 7500
-    
-    # Ajout par pied carré selon la complexité
-    if superficie <= 3000:
-        prix_base += superficie * 0.80  # Projets simples
-    else:
-        prix_base += superficie * 1.00  # Projets plus complexes
-    
-    # Services additionnels
-    multiplicateur_services = 1.0
-    if 'electricite' in services:
-        multiplicateur_services += 0.15
-    if 'plomberie' in services:
-        multiplicateur_services += 0.12
-    if 'chauffage' in services:
-        multiplicateur_services += 0.10
-    
-    # Options spéciales
-    if options.get('modele_3d', False):
-        prix_base += 800
-    if options.get('visite_terrain', False):
-        prix_base += 350
-    if options.get('revision_multiple', False):
-        prix_base += 400
-    if options.get('urgence_elevee', False):
-        multiplicateur_services += 0.25
-    
-    return round(prix_base * multiplicateur_services, 2)
-
-def creer_demande_technologue(demande_data: Dict) -> str:
-    """Crée une nouvelle demande de plans de technologue"""
-    # Vérifier et créer la table si nécessaire
-    verifier_et_creer_table_technologue()
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Générer un numéro de référence unique
-        numero_reference = f"SEAOP-TECH-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
-        
-        # Calculer le prix estimé
-        superficie = float(demande_data.get('superficie_batiment', 0))
-        services = demande_data.get('services_inclus', '').split(',')
-        options = {
-            'modele_3d': demande_data.get('besoin_3d', False),
-            'visite_terrain': demande_data.get('visite_terrain', False),
-            'urgence_elevee': demande_data.get('niveau_urgence') == 'eleve'
-        }
-        
-        prix_service = calculer_prix_technologue(superficie, services, options)
-        
-        # Préparer les données avec le prix calculé
-        demande_data['numero_reference'] = numero_reference
-        demande_data['prix_service'] = prix_service
-        demande_data['date_demande'] = datetime.datetime.now().isoformat()
-        
-        # Insérer la demande
-        placeholders = ', '.join(['?' for _ in demande_data])
-        columns = ', '.join(demande_data.keys())
-        
-        cursor.execute(f'''
-            INSERT INTO demandes_technologue ({columns})
-            VALUES ({placeholders})
-        ''', list(demande_data.values()))
-        
-        demande_id = cursor.lastrowid
-        
-        # Créer une notification pour l'admin
-        cursor.execute('''
-            INSERT INTO notifications (
-                utilisateur_type, utilisateur_id, type_notification,
-                titre, message, lien_id
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            'admin', 0, 'nouvelle_demande_technologue',
-            'Nouvelle demande technologue',
-            f'{demande_data["nom_client"]} - {demande_data["type_batiment"]} de {superficie:,.0f} pi2',
-            demande_id
-        ))
-        
-        conn.commit()
-        return numero_reference
-        
-    except Exception as e:
-        print(f"Erreur lors de la création de la demande de technologue: {e}")
-        conn.rollback()
-        return None
-    finally:
-        conn.close()
-
-def get_demandes_technologue_client(email_client: str) -> List[Dict]:
-    """Récupère les demandes de technologue d'un client"""
-    # Vérifier et créer la table si nécessaire
-    verifier_et_creer_table_technologue()
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            SELECT id, type_batiment, usage_batiment, superficie_batiment,
-                   ville, prix_service, statut, date_demande, numero_reference,
-                   date_livraison_plans, pourcentage_complete, plans_finaux
-            FROM demandes_technologue
-            WHERE email_client = ?
-            ORDER BY date_demande DESC
-        ''', (email_client,))
-    except sqlite3.OperationalError as e:
-        if "no such table" in str(e):
-            conn.close()
-            return []
-        else:
-            raise
-    
-    demandes = []
-    for row in cursor.fetchall():
-        demandes.append({
-            'id': row[0],
-            'type_batiment': row[1],
-            'usage_batiment': row[2],
-            'superficie_batiment': row[3],
-            'ville': row[4],
-            'prix_service': row[5],
-            'statut': row[6],
-            'date_demande': row[7],
-            'numero_reference': row[8],
-            'date_livraison_plans': row[9],
-            'pourcentage_complete': row[10],
-            'plans_finaux': row[11]
-        })
-    
-    conn.close()
-    return demandes
-
-def verifier_et_creer_table_technologue():
-    """Vérifie si la table technologue existe, sinon la crée"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Vérifier si la table existe
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='demandes_technologue'")
-        if not cursor.fetchone():
-            print("Création de la table demandes_technologue...")
-            
-            # Créer la table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS demandes_technologue (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nom_client TEXT NOT NULL,
-                    email_client TEXT NOT NULL,
-                    telephone_client TEXT NOT NULL,
-                    adresse_projet TEXT NOT NULL,
-                    ville TEXT NOT NULL,
-                    code_postal TEXT NOT NULL,
-                    type_batiment TEXT NOT NULL,
-                    usage_batiment TEXT NOT NULL,
-                    superficie_terrain REAL,
-                    superficie_batiment REAL NOT NULL,
-                    nombre_etages INTEGER DEFAULT 1,
-                    nombre_pieces INTEGER,
-                    type_construction TEXT,
-                    style_architectural TEXT,
-                    contraintes_terrain TEXT,
-                    exigences_speciales TEXT,
-                    plans_requis TEXT NOT NULL,
-                    services_inclus TEXT,
-                    besoin_3d BOOLEAN DEFAULT 0,
-                    besoin_permis BOOLEAN DEFAULT 1,
-                    visite_terrain BOOLEAN DEFAULT 0,
-                    certificat_localisation TEXT,
-                    photos_terrain TEXT,
-                    croquis_client TEXT,
-                    documents_existants TEXT,
-                    budget_construction TEXT,
-                    budget_technologue TEXT,
-                    date_debut_souhaite DATE,
-                    date_livraison_plans DATE,
-                    niveau_urgence TEXT DEFAULT 'normal',
-                    technologue_assigne TEXT,
-                    numero_otaq TEXT,
-                    plans_preliminaires TEXT,
-                    plans_finaux TEXT,
-                    devis_technique TEXT,
-                    rapport_conformite TEXT,
-                    estimation_couts TEXT,
-                    prix_service REAL,
-                    modalite_paiement TEXT,
-                    taux_horaire REAL,
-                    pourcentage_complete INTEGER DEFAULT 0,
-                    statut TEXT DEFAULT 'recue',
-                    notes_internes TEXT,
-                    commentaires_client TEXT,
-                    raison_refus TEXT,
-                    date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    date_analyse TIMESTAMP,
-                    date_acceptation TIMESTAMP,
-                    date_debut_plans TIMESTAMP,
-                    date_revision TIMESTAMP,
-                    date_livraison TIMESTAMP,
-                    date_paiement TIMESTAMP,
-                    numero_reference TEXT UNIQUE,
-                    numero_projet_technologue TEXT,
-                    lead_id INTEGER,
-                    conforme_zonage BOOLEAN,
-                    conforme_cnb BOOLEAN,
-                    conforme_municipal BOOLEAN,
-                    validation_technique BOOLEAN,
-                    plan_implantation BOOLEAN DEFAULT 1,
-                    plan_fondation BOOLEAN DEFAULT 1,
-                    plan_charpente BOOLEAN DEFAULT 1,
-                    plan_electricite BOOLEAN DEFAULT 0,
-                    plan_plomberie BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (lead_id) REFERENCES leads (id)
-                )
-            ''')
-            
-            # Créer les index
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tech_statut ON demandes_technologue(statut)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tech_client ON demandes_technologue(email_client)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tech_date ON demandes_technologue(date_demande)')
-            
-            conn.commit()
-            print("Table demandes_technologue créée avec succès")
-            
-    except Exception as e:
-        print(f"Erreur lors de la création de la table technologue: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
-
-def get_demandes_technologue_admin() -> List[Dict]:
-    """Récupère toutes les demandes de technologue pour l'admin"""
-    # Vérifier et créer la table si nécessaire
-    verifier_et_creer_table_technologue()
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            SELECT id, nom_client, email_client, telephone_client, ville, type_batiment,
-                   superficie_batiment, nombre_etages, budget_technologue, prix_service,
-                   statut, date_demande, numero_reference, niveau_urgence, 
-                   pourcentage_complete, usage_batiment, type_construction, services_inclus
-            FROM demandes_technologue
-            ORDER BY date_demande DESC
-        ''')
-    except sqlite3.OperationalError as e:
-        if "no such table" in str(e):
-            # Table n'existe pas, retourner liste vide
-            conn.close()
-            return []
-        else:
-            raise
-    
-    demandes = []
-    for row in cursor.fetchall():
-        demandes.append({
-            'id': row[0],
-            'nom_client': row[1],
-            'email_client': row[2],
-            'telephone_client': row[3],
-            'ville': row[4],
-            'type_batiment': row[5],
-            'superficie_batiment': row[6],
-            'nombre_etages': row[7],
-            'budget_technologue': row[8],
-            'prix_service': row[9],
-            'statut': row[10],
-            'date_demande': row[11],
-            'numero_reference': row[12],
-            'niveau_urgence': row[13],
-            'pourcentage_complete': row[14],
-            'usage_batiment': row[15],
-            'type_construction': row[16],
-            'services_inclus': row[17]
-        })
-    
-    conn.close()
-    return demandes
-
-def get_stats_technologue() -> Dict:
-    """Récupère les statistiques du service de technologue"""
-    # Vérifier et créer la table si nécessaire
-    verifier_et_creer_table_technologue()
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('SELECT COUNT(*) FROM demandes_technologue')
-        total = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM demandes_technologue WHERE statut IN ('en_cours', 'revision', 'acceptee')")
-        en_cours = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT AVG(superficie_batiment) FROM demandes_technologue WHERE superficie_batiment IS NOT NULL')
-        superficie_avg = cursor.fetchone()[0] or 0
-        
-        cursor.execute('SELECT SUM(prix_service) FROM demandes_technologue WHERE prix_service IS NOT NULL')
-        ca_total = cursor.fetchone()[0] or 0
-        
-        conn.close()
-        
-        return {
-            'total': total,
-            'en_cours': en_cours,
-            'superficie_moyenne': superficie_avg,
-            'ca_total': ca_total
-        }
-    except sqlite3.OperationalError as e:
-        if "no such table" in str(e):
-            conn.close()
-            return {'total': 0, 'en_cours': 0, 'superficie_moyenne': 0, 'ca_total': 0}
-        else:
-            raise
-
-def mettre_a_jour_statut_technologue(demande_id: int, nouveau_statut: str, notes: str, pourcentage: int) -> bool:
-    """Met à jour le statut d'une demande de technologue"""
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE demandes_technologue 
-            SET statut = ?, notes_internes = ?, pourcentage_complete = ?
-            WHERE id = ?
-        ''', (nouveau_statut, notes, pourcentage, demande_id))
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Erreur mise à jour technologue: {e}")
-        return False
-
-def page_service_technologue():
-    """Page du service de technologue pour projets ≤ 6000 pi²"""
-    
-    st.markdown("""
-    <div class="main-header">
-        <h1>📐 Service de Technologue en Architecture</h1>
-        <p>Plans techniques pour projets de 6,000 pi² et moins</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Onglets pour client et consultation
-    tab1, tab2, tab3 = st.tabs(["📐 Nouvelle demande", "📋 Mes demandes", "ℹ️ Informations"])
-    
-    with tab1:
-        st.markdown("""
-        #### Obtenez des plans techniques professionnels
-        
-        **Service complet incluant :**
-        - Plans d'implantation, fondation et charpente
-        - Plans électriques et plomberie (optionnel)
-        - Conformité aux codes du bâtiment
-        - Aide pour permis de construction
-        - Visite de terrain (optionnel)
-        - Modélisation 3D (optionnel)
-        """)
-        
-        # Vérification de la superficie
-        st.info("""
-        ℹ️ **Service de technologue** : Pour projets de **6,000 pi² et moins**. 
-        Pour les projets plus grands, utilisez le Service d'architecture (architecte OAQ requis).
-        """)
-        
-        with st.form("demande_technologue"):
-            st.markdown("### 👤 Informations du client")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                nom_client = st.text_input("Nom complet *", placeholder="Jean Dupont")
-                email_client = st.text_input("Email *", placeholder="jean.dupont@email.com")
-                telephone_client = st.text_input("Téléphone *", placeholder="418-555-1234")
-            
-            with col2:
-                adresse_projet = st.text_input("Adresse du projet *", placeholder="123 Rue de la Construction")
-                ville = st.text_input("Ville *", placeholder="Québec")
-                code_postal = st.text_input("Code postal *", placeholder="G1X 2Y3")
-            
-            st.markdown("---")
-            st.markdown("### 🏠 Détails du projet")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                type_batiment = st.selectbox(
-                    "Type de bâtiment *",
-                    ["résidentiel", "commercial", "industriel", "garage", "cabanon", "autre"]
-                )
-                
-                usage_batiment = st.text_area(
-                    "Description de l'usage *",
-                    placeholder="Ex: Agrandissement cuisine avec bureau, Garage détaché 2 voitures, etc.",
-                    height=100
-                )
-                
-                superficie_terrain = st.number_input(
-                    "Superficie du terrain (pi²)",
-                    min_value=0,
-                    max_value=50000,
-                    value=8000,
-                    step=100
-                )
-            
-            with col2:
-                superficie_batiment = st.number_input(
-                    "Superficie du bâtiment (pi²) *",
-                    min_value=50,
-                    max_value=6000,
-                    value=1500,
-                    step=50,
-                    help="Maximum 6,000 pi² pour service de technologue"
-                )
-                
-                nombre_etages = st.selectbox("Nombre d'étages", [1, 2, 3])
-                nombre_pieces = st.number_input("Nombre de pièces/espaces", min_value=1, max_value=20, value=5)
-            
-            # Validation de la superficie
-            if superficie_batiment > 6000:
-                st.error("""
-                ⚠️ **Superficie trop grande** : Ce projet dépasse 6,000 pi² et nécessite un architecte.
-                Veuillez utiliser le **Service d'architecture** pour ce projet.
-                """)
-            
-            st.markdown("---")
-            st.markdown("### 🔧 Spécifications techniques")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                type_construction = st.selectbox(
-                    "Type de construction *",
-                    ["nouvelle", "agrandissement", "renovation", "garage", "remise"]
-                )
-                
-                style_architectural = st.selectbox(
-                    "Style architectural",
-                    ["traditionnel", "moderne", "rustique", "contemporain", "industriel"]
-                )
-                
-                contraintes_terrain = st.text_area(
-                    "Contraintes du terrain",
-                    placeholder="Ex: Pente, servitudes, proximité voisins, accès, etc.",
-                    height=80
-                )
-            
-            with col2:
-                exigences_speciales = st.text_area(
-                    "Exigences spéciales",
-                    placeholder="Ex: Isolation supérieure, accessibilité, normes spéciales, etc.",
-                    height=80
-                )
-                
-                plans_requis = st.selectbox(
-                    "Type de plans requis *",
-                    ["complet", "preliminaire", "concept", "permis"]
-                )
-            
-            st.markdown("---")
-            st.markdown("### 📋 Services et options")
-            
-            # Services de base inclus
-            st.markdown("**Services de base inclus :**")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                plan_implantation = st.checkbox("Plan d'implantation", value=True, disabled=True)
-                plan_fondation = st.checkbox("Plan de fondation", value=True, disabled=True)
-            with col2:
-                plan_charpente = st.checkbox("Plan de charpente", value=True, disabled=True)
-                besoin_permis = st.checkbox("Aide permis construction", value=True)
-            with col3:
-                conforme_cnb = st.checkbox("Conformité CNB", value=True, disabled=True)
-                conforme_municipal = st.checkbox("Conformité municipale", value=True, disabled=True)
-            
-            # Services optionnels
-            st.markdown("**Services optionnels :**")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                plan_electricite = st.checkbox("Plan électrique (+15%)")
-                plan_plomberie = st.checkbox("Plan de plomberie (+12%)")
-            with col2:
-                besoin_3d = st.checkbox("Modélisation 3D (+800$)")
-                visite_terrain = st.checkbox("Visite de terrain (+350$)")
-            with col3:
-                revision_multiple = st.checkbox("Révisions multiples (+400$)")
-            
-            # Construire la liste des services
-            services_inclus = ["implantation", "fondation", "charpente"]
-            if plan_electricite:
-                services_inclus.append("electricite")
-            if plan_plomberie:
-                services_inclus.append("plomberie")
-            
-            st.markdown("---")
-            st.markdown("### 💰 Budget et délais")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                budget_construction = st.text_input(
-                    "Budget de construction estimé",
-                    placeholder="Ex: 50,000$ - 75,000$"
-                )
-                
-                date_debut_souhaite = st.date_input(
-                    "Date de début souhaitée",
-                    value=datetime.date.today() + datetime.timedelta(days=30)
-                )
-            
-            with col2:
-                budget_technologue = st.text_input(
-                    "Budget pour services technologue",
-                    placeholder="Ex: 3,000$ - 5,000$"
-                )
-                
-                date_livraison_plans = st.date_input(
-                    "Date de livraison souhaitée",
-                    value=datetime.date.today() + datetime.timedelta(days=21)
-                )
-            
-            niveau_urgence = st.selectbox(
-                "Niveau d'urgence",
-                ["normal", "eleve", "critique"],
-                format_func=lambda x: {"normal": "Normal", "eleve": "Élevé (+25%)", "critique": "Critique (+50%)"}[x]
-            )
-            
-            # Calcul du prix estimé en temps réel
-            if superficie_batiment <= 6000:
-                services_list = services_inclus
-                options = {
-                    'modele_3d': besoin_3d,
-                    'visite_terrain': visite_terrain,
-                    'revision_multiple': revision_multiple,
-                    'urgence_elevee': niveau_urgence in ['eleve', 'critique']
-                }
-                prix_estime = calculer_prix_technologue(superficie_batiment, services_list, options)
-                
-                st.markdown("---")
-                st.markdown("### 💵 Estimation du prix")
-                st.success(f"**Prix estimé : {prix_estime:,.2f}$ CAD**")
-                st.caption("Prix indicatif incluant tous les services sélectionnés")
-            
-            st.markdown("---")
-            st.markdown("### 📎 Documents à fournir (optionnel)")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                certificat_localisation = st.file_uploader(
-                    "Certificat de localisation",
-                    type=['pdf', 'jpg', 'png'],
-                    help="Document d'arpentage du terrain"
-                )
-                photos_terrain = st.file_uploader(
-                    "Photos du terrain/existant",
-                    type=['jpg', 'png', 'jpeg'],
-                    accept_multiple_files=True
-                )
-            
-            with col2:
-                croquis_client = st.file_uploader(
-                    "Croquis/idées du client",
-                    type=['pdf', 'jpg', 'png', 'jpeg'],
-                    accept_multiple_files=True
-                )
-                documents_existants = st.file_uploader(
-                    "Plans existants (si rénovation)",
-                    type=['pdf', 'dwg'],
-                    accept_multiple_files=True
-                )
-            
-            # Bouton de soumission
-            submitted = st.form_submit_button(
-                "🚀 Soumettre la demande", 
-                use_container_width=True,
-                type="primary"
-            )
-            
-            if submitted:
-                # Validation des champs obligatoires
-                if not all([nom_client, email_client, telephone_client, adresse_projet, ville, code_postal, type_batiment, usage_batiment, superficie_batiment]):
-                    st.error("❌ Veuillez remplir tous les champs obligatoires (*)")
-                elif superficie_batiment > 6000:
-                    st.error("❌ Superficie trop grande pour le service de technologue. Utilisez le Service d'architecture.")
-                elif not re.match(r'^[^@]+@[^@]+\.[^@]+$', email_client):
-                    st.error("❌ Format d'email invalide")
-                else:
-                    # Préparer les données de la demande
-                    demande_data = {
-                        'nom_client': nom_client,
-                        'email_client': email_client,
-                        'telephone_client': telephone_client,
-                        'adresse_projet': adresse_projet,
-                        'ville': ville,
-                        'code_postal': code_postal,
-                        'type_batiment': type_batiment,
-                        'usage_batiment': usage_batiment,
-                        'superficie_terrain': superficie_terrain,
-                        'superficie_batiment': superficie_batiment,
-                        'nombre_etages': nombre_etages,
-                        'nombre_pieces': nombre_pieces,
-                        'type_construction': type_construction,
-                        'style_architectural': style_architectural,
-                        'contraintes_terrain': contraintes_terrain,
-                        'exigences_speciales': exigences_speciales,
-                        'plans_requis': plans_requis,
-                        'services_inclus': ','.join(services_inclus),
-                        'besoin_3d': besoin_3d,
-                        'besoin_permis': besoin_permis,
-                        'visite_terrain': visite_terrain,
-                        'budget_construction': budget_construction,
-                        'budget_technologue': budget_technologue,
-                        'date_debut_souhaite': date_debut_souhaite.isoformat(),
-                        'date_livraison_plans': date_livraison_plans.isoformat(),
-                        'niveau_urgence': niveau_urgence,
-                        'plan_implantation': plan_implantation,
-                        'plan_fondation': plan_fondation,
-                        'plan_charpente': plan_charpente,
-                        'plan_electricite': plan_electricite,
-                        'plan_plomberie': plan_plomberie
-                    }
-                    
-                    # Encoder les fichiers si présents
-                    if certificat_localisation:
-                        demande_data['certificat_localisation'] = f"{certificat_localisation.name}:{base64.b64encode(certificat_localisation.read()).decode()}"
-                    
-                    if photos_terrain:
-                        photos_encoded = []
-                        for photo in photos_terrain:
-                            photos_encoded.append(f"{photo.name}:{base64.b64encode(photo.read()).decode()}")
-                        demande_data['photos_terrain'] = ','.join(photos_encoded)
-                    
-                    if croquis_client:
-                        croquis_encoded = []
-                        for croquis in croquis_client:
-                            croquis_encoded.append(f"{croquis.name}:{base64.b64encode(croquis.read()).decode()}")
-                        demande_data['croquis_client'] = ','.join(croquis_encoded)
-                    
-                    if documents_existants:
-                        docs_encoded = []
-                        for doc in documents_existants:
-                            docs_encoded.append(f"{doc.name}:{base64.b64encode(doc.read()).decode()}")
-                        demande_data['documents_existants'] = ','.join(docs_encoded)
-                    
-                    # Créer la demande
-                    numero_reference = creer_demande_technologue(demande_data)
-                    
-                    if numero_reference:
-                        st.success(f"""
-                        ✅ **Demande créée avec succès !**
-                        
-                        **Numéro de référence :** {numero_reference}
-                        **Prix estimé :** {prix_estime:,.2f}$ CAD
-                        
-                        Vous recevrez une confirmation par email sous peu.
-                        """)
-                        
-                        # Afficher le résumé
-                        with st.expander("📋 Résumé de votre demande"):
-                            st.write(f"**Projet :** {usage_batiment}")
-                            st.write(f"**Superficie :** {superficie_batiment:,.0f} pi²")
-                            st.write(f"**Type :** {type_batiment.title()}")
-                            st.write(f"**Services :** {', '.join(services_inclus)}")
-                            st.write(f"**Délai souhaité :** {date_livraison_plans}")
-                    else:
-                        st.error("❌ Erreur lors de la création de la demande. Veuillez réessayer.")
-    
-    with tab2:
-        st.markdown("### 📋 Consultation de mes demandes")
-        
-        # Interface de consultation pour les clients
-        email_consultation = st.text_input(
-            "Entrez votre email pour consulter vos demandes",
-            placeholder="votre.email@exemple.com"
-        )
-        
-        if email_consultation and re.match(r'^[^@]+@[^@]+\.[^@]+$', email_consultation):
-            demandes = get_demandes_technologue_client(email_consultation)
-            
-            if demandes:
-                st.success(f"📋 {len(demandes)} demande(s) trouvée(s)")
-                
-                for demande in demandes:
-                    # Mapper les statuts pour l'affichage
-                    statuts_affichage = {
-                        'recue': '🆕 Reçue',
-                        'analyse': '🔍 En analyse',
-                        'acceptee': '✅ Acceptée',
-                        'en_cours': '🔄 En cours',
-                        'revision': '📝 En révision',
-                        'terminee': '🎉 Terminée'
-                    }
-                    
-                    statut_badge = statuts_affichage.get(demande['statut'], demande['statut'])
-                    
-                    with st.expander(f"**{demande['type_batiment'].title()}** - {demande['numero_reference']} - {statut_badge}", expanded=True):
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        
-                        with col1:
-                            st.write(f"**Description :** {demande['usage_batiment'][:200]}...")
-                            st.write(f"**Superficie :** {demande['superficie_batiment']:,.0f} pi²")
-                            st.write(f"**Ville :** {demande['ville']}")
-                        
-                        with col2:
-                            st.markdown(f"**Statut :** {statut_badge}")
-                            if demande['prix_service']:
-                                st.write(f"**Prix :** {demande['prix_service']:,.2f}$")
-                            st.write(f"**Date demande :** {demande['date_demande'][:10]}")
-                        
-                        with col3:
-                            if demande['pourcentage_complete']:
-                                st.progress(demande['pourcentage_complete'] / 100)
-                                st.caption(f"Progression: {demande['pourcentage_complete']}%")
-                            
-                            if demande['date_livraison_plans']:
-                                st.write(f"**Livraison prévue :** {demande['date_livraison_plans']}")
-                        
-                        # Si les plans sont prêts, permettre le téléchargement
-                        if demande['statut'] == 'terminee' and demande['plans_finaux']:
-                            st.success("🎉 Vos plans sont prêts ! Contactez-nous pour les recevoir.")
-            else:
-                st.info("Aucune demande trouvée pour cet email.")
-        elif email_consultation:
-            st.error("Format d'email invalide")
-    
-    with tab3:
-        st.markdown("### ℹ️ Informations sur le Service de Technologue")
-        
-        st.markdown("""
-        #### 🎯 À qui s'adresse ce service ?
-        
-        Le **Service de technologue** est conçu pour les projets de **6,000 pi² et moins** qui nécessitent :
-        - Plans techniques professionnels
-        - Conformité aux codes du bâtiment
-        - Aide pour obtenir les permis
-        - Solutions économiques et efficaces
-        
-        #### 📐 Types de projets acceptés
-        
-        **Résidentiel :**
-        - Agrandissements et rénovations
-        - Chalets et résidences secondaires
-        - Garages détachés
-        - Cabanons et remises
-        
-        **Commercial léger :**
-        - Petits commerces et bureaux
-        - Ateliers et garages commerciaux
-        - Entrepôts de petite taille
-        
-        #### 🔧 Services inclus
-        
-        **Plans de base :**
-        - Plan d'implantation sur le terrain
-        - Plan de fondation avec détails
-        - Plan de charpente structurale
-        - Conformité codes du bâtiment
-        
-        **Services optionnels :**
-        - Plan électrique (+15% du prix)
-        - Plan de plomberie (+12% du prix)
-        - Modélisation 3D (+800$)
-        - Visite de terrain (+350$)
-        - Révisions multiples (+400$)
-        
-        #### 💰 Tarification
-        
-        **Prix de base selon superficie :**
-        - Jusqu'à 1,000 pi² : À partir de 2,500$
-        - 1,001 à 2,500 pi² : À partir de 3,500$
-        - 2,501 à 4,000 pi² : À partir de 4,500$
-        - 4,001 à 6,000 pi² : À partir de 6,000$
-        
-        *Prix final calculé selon superficie, services et options choisis*
-        
-        #### ⏱️ Délais typiques
-        
-        - **Plans préliminaires :** 1-2 semaines
-        - **Plans complets :** 2-4 semaines
-        - **Projets urgents :** Sur demande (+25%)
-        
-        #### 🏛️ Différence avec Service d'Architecture
-        
-        | Critère | Technologue | Architecte |
-        |---------|-------------|------------|
-        | **Superficie** | ≤ 6,000 pi² | > 6,000 pi² |
-        | **Professionnel** | Technologue | Architecte OAQ |
-        | **Prix** | Plus économique | Plus élevé |
-        | **Complexité** | Projets standards | Projets complexes |
-        | **Légal** | Suffisant pour permis | Obligatoire >6,000 pi² |
-        
-        #### 📞 Support et suivi
-        
-        - Consultation gratuite pour évaluer votre projet
-        - Suivi personnalisé tout au long du processus
-        - Support pour démarches de permis
-        - Révisions incluses selon forfait
-        
-        #### 🎯 Prochaines étapes
-        
-        1. **Évaluez votre projet** : Superficie ≤ 6,000 pi² ?
-        2. **Rassemblez vos documents** : Certificat localisation, photos, idées
-        3. **Remplissez le formulaire** : Onglet "Nouvelle demande"
-        4. **Recevez votre devis** : Confirmation sous 24-48h
-        5. **Démarrage des plans** : Après acceptation du devis
-        """)
-
-def creer_demande_architecture(demande_data: Dict) -> str:
-    """Crée une nouvelle demande de plans d'architecture"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Générer un numéro de référence unique
-        numero_reference = f"SEAOP-ARCH-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
-        
-        # Calculer le prix estimé basé sur la superficie
-        superficie = float(demande_data.get('superficie_batiment', 0))
-        if superficie < 10000:
-            prix_base = 15000
-            prix_par_pi2 = 1.50
-        elif superficie < 25000:
-            prix_base = 25000
-            prix_par_pi2 = 1.25
-        elif superficie < 50000:
-            prix_base = 40000
-            prix_par_pi2 = 1.00
-        else:
-            prix_base = 60000
-            prix_par_pi2 = 0.85
-        
-        prix_estime = prix_base + (superficie * prix_par_pi2)
-        
-        # Services inclus
-        services_inclus = []
-        if demande_data.get('inclure_structure'):
-            services_inclus.append('structure')
-            prix_estime += superficie * 0.25
-        if demande_data.get('inclure_mecanique'):
-            services_inclus.append('mecanique')
-            prix_estime += superficie * 0.20
-        if demande_data.get('inclure_electrique'):
-            services_inclus.append('electrique')
-            prix_estime += superficie * 0.15
-        if demande_data.get('inclure_civil'):
-            services_inclus.append('civil')
-            prix_estime += superficie * 0.10
-        
-        services_str = ','.join(services_inclus) if services_inclus else ''
-        
-        cursor.execute('''
-            INSERT INTO demandes_architecture (
-                nom_client, email_client, telephone_client, adresse_projet,
-                ville, code_postal, type_batiment, usage_batiment,
-                superficie_terrain, superficie_batiment, nombre_etages,
-                nombre_logements, type_construction, style_architectural,
-                contraintes_terrain, exigences_speciales, plans_requis,
-                services_inclus, besoin_3d, besoin_permis,
-                certificat_localisation, photos_terrain, croquis_client,
-                budget_construction, budget_architecture, date_debut_souhaite,
-                date_livraison_plans, niveau_urgence, prix_service,
-                modalite_paiement, numero_reference
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            demande_data['nom_client'],
-            demande_data['email_client'],
-            demande_data['telephone_client'],
-            demande_data['adresse_projet'],
-            demande_data['ville'],
-            demande_data['code_postal'],
-            demande_data['type_batiment'],
-            demande_data['usage_batiment'],
-            demande_data.get('superficie_terrain'),
-            demande_data['superficie_batiment'],
-            demande_data.get('nombre_etages', 1),
-            demande_data.get('nombre_logements'),
-            demande_data['type_construction'],
-            demande_data.get('style_architectural', ''),
-            demande_data.get('contraintes_terrain', ''),
-            demande_data.get('exigences_speciales', ''),
-            demande_data['plans_requis'],
-            services_str,
-            1 if demande_data.get('besoin_3d') else 0,
-            1 if demande_data.get('besoin_permis', True) else 0,
-            demande_data.get('certificat_localisation', ''),
-            demande_data.get('photos_terrain', ''),
-            demande_data.get('croquis_client', ''),
-            demande_data.get('budget_construction', ''),
-            demande_data.get('budget_architecture', ''),
-            str(demande_data.get('date_debut_souhaite', '')),
-            str(demande_data.get('date_livraison_plans', '')),
-            demande_data.get('niveau_urgence', 'normal'),
-            prix_estime,
-            demande_data.get('modalite_paiement', 'forfait'),
-            numero_reference
-        ))
-        
-        demande_id = cursor.lastrowid
-        
-        # Créer une notification admin
-        cursor.execute('''
-            INSERT INTO notifications (
-                utilisateur_type, utilisateur_id, type_notification,
-                titre, message, lien_id
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            'admin', 0, 'nouvelle_demande_architecture',
-            'Nouvelle demande d\'architecture',
-            f'{demande_data["nom_client"]} - {demande_data["type_batiment"]} de {superficie:,.0f} pi2',
-            demande_id
-        ))
-        
-        conn.commit()
-        return numero_reference
-        
-    except Exception as e:
-        print(f"Erreur lors de la création de la demande d'architecture: {e}")
-        conn.rollback()
-        return None
-    finally:
-        conn.close()
-
-def get_demandes_architecture_client(email_client: str) -> List[Dict]:
-    """Récupère les demandes d'architecture d'un client"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT id, type_batiment, usage_batiment, superficie_batiment,
-               ville, prix_service, statut, date_demande, numero_reference,
-               date_livraison_plans, pourcentage_complete, plans_finaux
-        FROM demandes_architecture
-        WHERE email_client = ?
-        ORDER BY date_demande DESC
-    ''', (email_client,))
-    
-    demandes = []
-    for row in cursor.fetchall():
-        demandes.append({
-            'id': row[0],
-            'type_batiment': row[1],
-            'usage_batiment': row[2],
-            'superficie_batiment': row[3],
-            'ville': row[4],
-            'prix_service': row[5],
-            'statut': row[6],
-            'date_demande': row[7],
-            'numero_reference': row[8],
-            'date_livraison_plans': row[9],
-            'pourcentage_complete': row[10],
-            'plans_finaux': row[11]
-        })
-    
-    conn.close()
-    return demandes
-
-def encoder_fichiers_architecture(fichiers_uploades: list) -> str:
-    """Encode une liste de fichiers en base64 pour stockage"""
-    if not fichiers_uploades:
-        return ""
-    
-    fichiers_encodes = []
-    
-    for fichier in fichiers_uploades:
-        try:
-            contenu = fichier.read()
-            contenu_b64 = base64.b64encode(contenu).decode('utf-8')
-            fichiers_encodes.append(f"{fichier.name}:{contenu_b64}")
-        except Exception as e:
-            print(f"Erreur lors de l'encodage de {fichier.name}: {e}")
-    
-    return ','.join(fichiers_encodes)
-
-def page_service_architecture():
-    """Page du service d'architecture pour projets > 6000 pi²"""
-    
-    st.markdown("""
-    <div class="main-header">
-        <h1>🏛️ Service d'Architecture Professionnelle</h1>
-        <p>Plans d'architecte pour projets de grande envergure (> 6,000 pi²)</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Onglets pour client et consultation
-    tab1, tab2, tab3 = st.tabs(["📐 Nouvelle demande", "📋 Mes demandes", "ℹ️ Informations"])
-    
-    with tab1:
-        st.markdown("""
-        #### Obtenez des plans d'architecte professionnels
-        
-        **Service complet incluant :**
-        - Plans d'architecture scellés par architecte OAQ
-        - Conformité au Code National du Bâtiment
-        - Aide pour permis de construction
-        - Modélisation 3D (optionnel)
-        - Coordination avec ingénieurs (structure, mécanique, électrique)
-        """)
-        
-        # Vérification de la superficie
-        st.warning("""
-        ⚠️ **Important** : Ce service est **obligatoire** pour les projets de plus de 6,000 pi² 
-        selon la réglementation québécoise. Un architecte membre de l'OAQ doit signer les plans.
-        """)
-        
-        with st.form("formulaire_architecture"):
-            # Section 1: Informations client
-            st.markdown("### 1️⃣ Vos informations")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                nom_client = st.text_input("Nom complet ou entreprise *", placeholder="Corporation ABC Inc.")
-                telephone = st.text_input("Téléphone *", placeholder="514-555-1234")
-                ville = st.text_input("Ville du projet *", placeholder="Montréal")
-            
-            with col2:
-                email = st.text_input("Email *", placeholder="contact@entreprise.com")
-                adresse_projet = st.text_input("Adresse du projet *", placeholder="1234 Rue Principale")
-                code_postal = st.text_input("Code postal *", placeholder="H1A 1A1")
-            
-            # Section 2: Détails du projet
-            st.markdown("### 2️⃣ Détails du projet architectural")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                type_batiment = st.selectbox(
-                    "Type de bâtiment *",
-                    ["", "résidentiel", "commercial", "industriel", "institutionnel", "mixte"]
-                )
-                
-                superficie_batiment = st.number_input(
-                    "Superficie totale du bâtiment (pi²) *",
-                    min_value=6000,
-                    value=6000,
-                    step=100,
-                    help="Minimum 6,000 pi² pour ce service"
-                )
-                
-                nombre_etages = st.number_input(
-                    "Nombre d'étages",
-                    min_value=1,
-                    max_value=50,
-                    value=1
-                )
-                
-                if type_batiment == "résidentiel":
-                    nombre_logements = st.number_input(
-                        "Nombre de logements",
-                        min_value=1,
-                        value=1
-                    )
-                else:
-                    nombre_logements = None
-            
-            with col2:
-                type_construction = st.selectbox(
-                    "Type de construction *",
-                    ["", "nouvelle", "agrandissement", "renovation_majeure"]
-                )
-                
-                superficie_terrain = st.number_input(
-                    "Superficie du terrain (pi²)",
-                    min_value=0,
-                    value=0,
-                    step=100,
-                    help="Laissez 0 si non applicable"
-                )
-                
-                style_architectural = st.selectbox(
-                    "Style architectural souhaité",
-                    ["", "moderne", "contemporain", "traditionnel", "industriel", "minimaliste", "autre"]
-                )
-            
-            usage_batiment = st.text_area(
-                "Usage prévu du bâtiment *",
-                placeholder="Ex: Immeuble de 24 condos avec stationnement souterrain et espaces commerciaux au RDC",
-                height=100
-            )
-            
-            # Section 3: Spécifications techniques
-            st.markdown("### 3️⃣ Spécifications et contraintes")
-            
-            contraintes_terrain = st.text_area(
-                "Contraintes du terrain",
-                placeholder="Ex: Terrain en pente, servitudes, zone inondable, proximité d'un cours d'eau...",
-                height=80
-            )
-            
-            exigences_speciales = st.text_area(
-                "Exigences spéciales",
-                placeholder="Ex: Certification LEED, accessibilité universelle, insonorisation supérieure...",
-                height=80
-            )
-            
-            # Section 4: Services requis
-            st.markdown("### 4️⃣ Services requis")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                plans_requis = st.selectbox(
-                    "Type de plans requis *",
-                    ["", "preliminaire", "concept", "execution", "complet"],
-                    help="Préliminaire: esquisse, Concept: 30%, Exécution: 100%, Complet: tous les plans"
-                )
-                
-                besoin_3d = st.checkbox("Modélisation 3D requise", value=False)
-                besoin_permis = st.checkbox("Aide pour permis de construction", value=True)
-            
-            with col2:
-                st.markdown("**Services d'ingénierie additionnels:**")
-                inclure_structure = st.checkbox("Structure", help="+0.25$/pi²")
-                inclure_mecanique = st.checkbox("Mécanique (CVAC, plomberie)", help="+0.20$/pi²")
-                inclure_electrique = st.checkbox("Électrique", help="+0.15$/pi²")
-                inclure_civil = st.checkbox("Civil (drainage, égouts)", help="+0.10$/pi²")
-            
-            # Section 5: Budget et délais
-            st.markdown("### 5️⃣ Budget et échéancier")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                budget_construction = st.selectbox(
-                    "Budget de construction estimé",
-                    ["", "Moins de 1M$", "1M$ - 5M$", "5M$ - 10M$", 
-                     "10M$ - 25M$", "25M$ - 50M$", "Plus de 50M$"]
-                )
-                
-                date_debut_souhaite = st.date_input(
-                    "Date de début de construction souhaitée",
-                    min_value=datetime.date.today() + datetime.timedelta(days=60),
-                    value=datetime.date.today() + datetime.timedelta(days=120)
-                )
-            
-            with col2:
-                budget_architecture = st.selectbox(
-                    "Budget pour services d'architecture",
-                    ["", "À déterminer", "50k$ - 100k$", "100k$ - 250k$", 
-                     "250k$ - 500k$", "500k$ - 1M$", "Plus de 1M$"]
-                )
-                
-                date_livraison_plans = st.date_input(
-                    "Date de livraison des plans souhaitée",
-                    min_value=datetime.date.today() + datetime.timedelta(days=30),
-                    value=datetime.date.today() + datetime.timedelta(days=60)
-                )
-            
-            niveau_urgence = st.selectbox(
-                "Niveau d'urgence",
-                ["normal", "faible", "eleve", "critique"],
-                format_func=lambda x: {
-                    'faible': '🟢 Faible - Délai flexible',
-                    'normal': '🟡 Normal - Délai standard',
-                    'eleve': '🟠 Élevé - Prioritaire',
-                    'critique': '🔴 Critique - Très urgent'
-                }[x]
-            )
-            
-            # Section 6: Documents
-            st.markdown("### 6️⃣ Documents à fournir")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                certificat = st.file_uploader(
-                    "Certificat de localisation",
-                    type=['pdf', 'jpg', 'png'],
-                    help="Document du terrain existant"
-                )
-            
-            with col2:
-                photos = st.file_uploader(
-                    "Photos du terrain/bâtiment",
-                    type=['jpg', 'png', 'jpeg'],
-                    accept_multiple_files=True,
-                    help="Photos actuelles du site"
-                )
-            
-            with col3:
-                croquis = st.file_uploader(
-                    "Croquis ou esquisses",
-                    type=['pdf', 'jpg', 'png', 'dwg'],
-                    accept_multiple_files=True,
-                    help="Vos idées préliminaires"
-                )
-            
-            # Estimation du prix
-            st.markdown("### 💰 Estimation du coût")
-            
-            if superficie_batiment > 0:
-                # Calcul estimé
-                if superficie_batiment < 10000:
-                    prix_base = 15000
-                    prix_pi2 = 1.50
-                elif superficie_batiment < 25000:
-                    prix_base = 25000
-                    prix_pi2 = 1.25
-                elif superficie_batiment < 50000:
-                    prix_base = 40000
-                    prix_pi2 = 1.00
-                else:
-                    prix_base = 60000
-                    prix_pi2 = 0.85
-                
-                prix_estime = prix_base + (superficie_batiment * prix_pi2)
-                
-                # Ajouts pour services
-                if inclure_structure:
-                    prix_estime += superficie_batiment * 0.25
-                if inclure_mecanique:
-                    prix_estime += superficie_batiment * 0.20
-                if inclure_electrique:
-                    prix_estime += superficie_batiment * 0.15
-                if inclure_civil:
-                    prix_estime += superficie_batiment * 0.10
-                
-                st.info(f"""
-                **Estimation préliminaire : {prix_estime:,.2f}$**
-                
-                Cette estimation inclut:
-                - Plans d'architecture de base : {prix_base:,.2f}$
-                - Superficie ({superficie_batiment:,.0f} pi² × {prix_pi2}$/pi²) : {(superficie_batiment * prix_pi2):,.2f}$
-                {f"- Services de structure : {(superficie_batiment * 0.25):,.2f}$" if inclure_structure else ""}
-                {f"- Services mécaniques : {(superficie_batiment * 0.20):,.2f}$" if inclure_mecanique else ""}
-                {f"- Services électriques : {(superficie_batiment * 0.15):,.2f}$" if inclure_electrique else ""}
-                {f"- Services civils : {(superficie_batiment * 0.10):,.2f}$" if inclure_civil else ""}
-                
-                *Prix final sujet à analyse détaillée du projet*
-                """)
-            
-            # Bouton de soumission
-            submitted = st.form_submit_button("📤 Soumettre la demande", type="primary")
-            
-            if submitted:
-                # Validation
-                if not all([nom_client, email, telephone, adresse_projet, ville, code_postal,
-                           type_batiment, type_construction, usage_batiment, plans_requis]):
-                    st.error("❌ Veuillez remplir tous les champs obligatoires (*)")
-                elif superficie_batiment < 6000:
-                    st.error("❌ La superficie doit être d'au moins 6,000 pi²")
-                else:
-                    # Préparer les données
-                    demande_data = {
-                        'nom_client': nom_client,
-                        'email_client': email,
-                        'telephone_client': telephone,
-                        'adresse_projet': adresse_projet,
-                        'ville': ville,
-                        'code_postal': code_postal,
-                        'type_batiment': type_batiment,
-                        'usage_batiment': usage_batiment,
-                        'superficie_terrain': superficie_terrain if superficie_terrain > 0 else None,
-                        'superficie_batiment': superficie_batiment,
-                        'nombre_etages': nombre_etages,
-                        'nombre_logements': nombre_logements,
-                        'type_construction': type_construction,
-                        'style_architectural': style_architectural,
-                        'contraintes_terrain': contraintes_terrain,
-                        'exigences_speciales': exigences_speciales,
-                        'plans_requis': plans_requis,
-                        'inclure_structure': inclure_structure,
-                        'inclure_mecanique': inclure_mecanique,
-                        'inclure_electrique': inclure_electrique,
-                        'inclure_civil': inclure_civil,
-                        'besoin_3d': besoin_3d,
-                        'besoin_permis': besoin_permis,
-                        'budget_construction': budget_construction,
-                        'budget_architecture': budget_architecture,
-                        'date_debut_souhaite': date_debut_souhaite,
-                        'date_livraison_plans': date_livraison_plans,
-                        'niveau_urgence': niveau_urgence,
-                        'modalite_paiement': 'forfait'
-                    }
-                    
-                    # Encoder les fichiers
-                    if certificat:
-                        demande_data['certificat_localisation'] = encoder_fichiers_architecture([certificat])
-                    if photos:
-                        demande_data['photos_terrain'] = encoder_fichiers_architecture(photos)
-                    if croquis:
-                        demande_data['croquis_client'] = encoder_fichiers_architecture(croquis)
-                    
-                    # Créer la demande
-                    numero_ref = creer_demande_architecture(demande_data)
-                    
-                    if numero_ref:
-                        st.success(f"""
-                        ✅ **Demande créée avec succès!**
-                        
-                        **Numéro de référence : {numero_ref}**
-                        
-                        Vous recevrez une réponse dans les 48 heures ouvrables.
-                        
-                        **Prochaines étapes:**
-                        1. Analyse de votre demande par notre équipe
-                        2. Contact d'un architecte OAQ pour validation
-                        3. Proposition détaillée avec échéancier
-                        4. Début des plans après acceptation
-                        """)
-                        
-                        st.balloons()
-                    else:
-                        st.error("❌ Erreur lors de la création de la demande. Veuillez réessayer.")
-    
-    with tab2:
-        st.markdown("### 📋 Suivi de vos demandes d'architecture")
-        
-        email_consultation = st.text_input(
-            "Entrez votre email pour consulter vos demandes",
-            placeholder="contact@entreprise.com"
-        )
-        
-        if st.button("🔍 Rechercher mes demandes"):
-            if email_consultation:
-                demandes = get_demandes_architecture_client(email_consultation)
-                
-                if demandes:
-                    st.success(f"✅ {len(demandes)} demande(s) trouvée(s)")
-                    
-                    for demande in demandes:
-                        with st.expander(f"📐 {demande['numero_reference']} - {demande['type_batiment'].title()}"):
-                            col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                st.markdown(f"**Type:** {demande['type_batiment'].title()}")
-                                st.markdown(f"**Superficie:** {demande['superficie_batiment']:,.0f} pi²")
-                                st.markdown(f"**Ville:** {demande['ville']}")
-                            
-                            with col2:
-                                statut_emoji = {
-                                    'recue': '📨', 'en_analyse': '🔍', 'acceptee': '✅',
-                                    'en_cours': '📐', 'revision': '📝', 'approuvee': '👍',
-                                    'livree': '📦', 'terminee': '✔️'
-                                }.get(demande['statut'], '📋')
-                                
-                                st.markdown(f"**Statut:** {statut_emoji} {demande['statut'].replace('_', ' ').title()}")
-                                st.markdown(f"**Prix:** {demande['prix_service']:,.2f}$")
-                                if demande['pourcentage_complete']:
-                                    st.progress(demande['pourcentage_complete'] / 100)
-                                    st.caption(f"Progression: {demande['pourcentage_complete']}%")
-                            
-                            with col3:
-                                st.markdown(f"**Date demande:** {demande['date_demande'][:10] if demande['date_demande'] else 'N/A'}")
-                                st.markdown(f"**Livraison prévue:** {demande['date_livraison_plans'] if demande['date_livraison_plans'] else 'À déterminer'}")
-                            
-                            st.markdown("---")
-                            st.markdown(f"**Usage:** {demande['usage_batiment']}")
-                            
-                            # Téléchargement des plans si disponibles
-                            if demande['plans_finaux']:
-                                st.markdown("### 📥 Documents disponibles")
-                                st.download_button(
-                                    "⬇️ Télécharger les plans finaux",
-                                    data=demande['plans_finaux'],
-                                    file_name=f"Plans_{demande['numero_reference']}.pdf",
-                                    mime="application/pdf"
-                                )
-                else:
-                    st.info("❌ Aucune demande trouvée pour cet email")
-            else:
-                st.warning("⚠️ Veuillez entrer votre email")
-    
-    with tab3:
-        st.markdown("""
-        ### ℹ️ Informations sur le service d'architecture
-        
-        #### 📏 Quand un architecte est-il obligatoire au Québec?
-        
-        Selon la Loi sur les architectes du Québec, un architecte membre de l'OAQ est **obligatoire** pour:
-        
-        - **Bâtiments publics** : Toute superficie
-        - **Édifices à bureaux** : Plus de 300 m² (3,230 pi²) par étage
-        - **Commerces** : Plus de 300 m² (3,230 pi²) par étage
-        - **Industries** : Plus de 300 m² (3,230 pi²) par étage
-        - **Habitations** : 5 logements et plus OU plus de 600 m² (6,460 pi²) total
-        
-        #### 💰 Structure de prix typique
-        
-        | Superficie | Prix de base | Prix/pi² | Services inclus |
-        |------------|--------------|----------|-----------------|
-        | 6,000 - 10,000 pi² | 15,000$ | 1.50$ | Plans de base |
-        | 10,000 - 25,000 pi² | 25,000$ | 1.25$ | Plans détaillés |
-        | 25,000 - 50,000 pi² | 40,000$ | 1.00$ | Coordination complète |
-        | 50,000 pi² et + | 60,000$ | 0.85$ | Gestion de projet |
-        
-        **Services additionnels:**
-        - Structure : +0.25$/pi²
-        - Mécanique : +0.20$/pi²
-        - Électrique : +0.15$/pi²
-        - Civil : +0.10$/pi²
-        
-        #### 📋 Documents livrables
-        
-        **Plans préliminaires (30%):**
-        - Plan d'implantation
-        - Plans d'étage
-        - Élévations
-        - Coupes principales
-        
-        **Plans d'exécution (100%):**
-        - Plans architecturaux complets
-        - Détails de construction
-        - Devis descriptif
-        - Bordereau des finis
-        - Plans pour permis
-        
-        #### ⏱️ Délais typiques
-        
-        - **Analyse initiale** : 2-3 jours ouvrables
-        - **Plans préliminaires** : 2-3 semaines
-        - **Plans d'exécution** : 4-8 semaines
-        - **Révisions** : 1-2 semaines
-        - **Approbation finale** : 3-5 jours
-        
-        #### 📞 Support
-        
-        Pour toute question sur le service d'architecture:
-        - 📧 architecture@seaop.ca
-        - 📞 1-800-SEAOP-QC
-        - 💬 Chat en direct disponible
-        """)
-
-# === FONCTIONS POUR SERVICE D'INGÉNIEUR EN STRUCTURE ===
-
-def creer_demande_ingenieur(demande_data: Dict) -> str:
-    """Crée une nouvelle demande de services d'ingénieur en structure"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Générer un numéro de référence unique
-        numero_reference = f"SEAOP-ING-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
-        
-        # Calculer le prix estimé basé sur le type et la complexité
-        superficie = float(demande_data.get('superficie_projet', 0))
-        type_structure = demande_data.get('type_structure', '')
-        services_demandes = demande_data.get('services_demandes', '')
-        
-        # Prix de base selon le type de structure
-        if type_structure == 'batiment':
-            if superficie < 5000:
-                prix_base = 8000
-                prix_pi2 = 0.80
-            elif superficie < 15000:
-                prix_base = 12000
-                prix_pi2 = 0.65
-            elif superficie < 50000:
-                prix_base = 18000
-                prix_pi2 = 0.50
-            else:
-                prix_base = 25000
-                prix_pi2 = 0.40
-        elif type_structure == 'industriel':
-            prix_base = 15000
-            prix_pi2 = 0.75
-        else:  # pont, fondation, autre
-            prix_base = 20000
-            prix_pi2 = 1.00
-        
-        prix_estime = prix_base + (superficie * prix_pi2)
-        
-        # Ajustements selon les services
-        if services_demandes == 'complet':
-            prix_estime *= 1.8  # Calculs + plans + surveillance
-        elif services_demandes == 'plans':
-            prix_estime *= 1.4  # Calculs + plans
-        # 'calculs' reste au prix de base
-        
-        # Analyses spécialisées
-        if demande_data.get('analyse_sismique'):
-            prix_estime += superficie * 0.15
-        if demande_data.get('analyse_dynamique'):
-            prix_estime += superficie * 0.20
-        if demande_data.get('modelisation_3d'):
-            prix_estime += superficie * 0.10
-        if demande_data.get('surveillance_chantier'):
-            prix_estime += superficie * 0.25
-        
-        cursor.execute('''
-            INSERT INTO demandes_ingenieur (
-                nom_client, email_client, telephone_client, adresse_projet,
-                ville, code_postal, type_structure, type_batiment,
-                usage_structure, superficie_projet, hauteur_structure,
-                nombre_etages, charge_exploitation, type_construction,
-                sol_porteur, zone_sismique, contraintes_particulieres,
-                normes_requises, services_demandes, calculs_requis,
-                plans_requis, surveillance_chantier, certification_requise,
-                plans_architecte, etude_sol, photos_existant,
-                budget_structure, budget_ingenieur, date_debut_souhaite,
-                date_livraison_souhaite, niveau_urgence, prix_service,
-                modalite_paiement, numero_reference, analyse_sismique,
-                analyse_vent, analyse_neige, analyse_dynamique,
-                modelisation_3d
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            demande_data['nom_client'],
-            demande_data['email_client'],
-            demande_data['telephone_client'],
-            demande_data['adresse_projet'],
-            demande_data['ville'],
-            demande_data['code_postal'],
-            demande_data['type_structure'],
-            demande_data.get('type_batiment', ''),
-            demande_data['usage_structure'],
-            demande_data.get('superficie_projet'),
-            demande_data.get('hauteur_structure'),
-            demande_data.get('nombre_etages', 1),
-            demande_data.get('charge_exploitation', ''),
-            demande_data.get('type_construction', ''),
-            demande_data.get('sol_porteur', ''),
-            demande_data.get('zone_sismique', ''),
-            demande_data.get('contraintes_particulieres', ''),
-            demande_data.get('normes_requises', ''),
-            demande_data['services_demandes'],
-            demande_data.get('calculs_requis', ''),
-            demande_data.get('plans_requis', ''),
-            1 if demande_data.get('surveillance_chantier') else 0,
-            1 if demande_data.get('certification_requise', True) else 0,
-            demande_data.get('plans_architecte', ''),
-            demande_data.get('etude_sol', ''),
-            demande_data.get('photos_existant', ''),
-            demande_data.get('budget_structure', ''),
-            demande_data.get('budget_ingenieur', ''),
-            str(demande_data.get('date_debut_souhaite', '')),
-            str(demande_data.get('date_livraison_souhaite', '')),
-            demande_data.get('niveau_urgence', 'normal'),
-            prix_estime,
-            demande_data.get('modalite_paiement', 'forfait'),
-            numero_reference,
-            1 if demande_data.get('analyse_sismique') else 0,
-            1 if demande_data.get('analyse_vent') else 0,
-            1 if demande_data.get('analyse_neige') else 0,
-            1 if demande_data.get('analyse_dynamique') else 0,
-            1 if demande_data.get('modelisation_3d') else 0
-        ))
-        
-        demande_id = cursor.lastrowid
-        
-        # Créer une notification admin
-        cursor.execute('''
-            INSERT INTO notifications (
-                utilisateur_type, utilisateur_id, type_notification,
-                titre, message, lien_id
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            'admin', 0, 'nouvelle_demande_ingenieur',
-            'Nouvelle demande d\'ingenieur',
-            f'{demande_data["nom_client"]} - {demande_data["type_structure"]} {superficie:,.0f} pi2',
-            demande_id
-        ))
-        
-        conn.commit()
-        return numero_reference
-        
-    except Exception as e:
-        print(f"Erreur lors de la création de la demande d'ingénieur: {e}")
-        conn.rollback()
-        return None
-    finally:
-        conn.close()
-
-def get_demandes_ingenieur_client(email_client: str) -> List[Dict]:
-    """Récupère les demandes d'ingénieur d'un client"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT id, type_structure, usage_structure, superficie_projet,
-               ville, prix_service, statut, date_demande, numero_reference,
-               date_livraison_souhaite, pourcentage_complete, calculs_structures,
-               plans_structures, services_demandes
-        FROM demandes_ingenieur
-        WHERE email_client = ?
-        ORDER BY date_demande DESC
-    ''', (email_client,))
-    
-    demandes = []
-    for row in cursor.fetchall():
-        demandes.append({
-            'id': row[0],
-            'type_structure': row[1],
-            'usage_structure': row[2],
-            'superficie_projet': row[3],
-            'ville': row[4],
-            'prix_service': row[5],
-            'statut': row[6],
-            'date_demande': row[7],
-            'numero_reference': row[8],
-            'date_livraison_souhaite': row[9],
-            'pourcentage_complete': row[10],
-            'calculs_structures': row[11],
-            'plans_structures': row[12],
-            'services_demandes': row[13]
-        })
-    
-    conn.close()
-    return demandes
-
-def encoder_fichiers_ingenieur(fichiers_uploades: list) -> str:
-    """Encode une liste de fichiers en base64 pour stockage"""
-    if not fichiers_uploades:
-        return ""
-    
-    fichiers_encodes = []
-    
-    for fichier in fichiers_uploades:
-        try:
-            contenu = fichier.read()
-            contenu_b64 = base64.b64encode(contenu).decode('utf-8')
-            fichiers_encodes.append(f"{fichier.name}:{contenu_b64}")
-        except Exception as e:
-            print(f"Erreur lors de l'encodage de {fichier.name}: {e}")
-    
-    return ','.join(fichiers_encodes)
-
-def page_service_ingenieur():
-    """Page du service d'ingénieur en structure"""
-    
-    st.markdown("""
-    <div class="main-header">
-        <h1>🔧 Service d'Ingénieur en Structure</h1>
-        <p>Calculs structuraux et plans d'ingénieur par professionnels OIQ</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Onglets pour client et consultation
-    tab1, tab2, tab3 = st.tabs(["🔧 Nouvelle demande", "📋 Mes demandes", "ℹ️ Informations"])
-    
-    with tab1:
-        st.markdown("""
-        #### Obtenez des services d'ingénieur en structure professionnels
-        
-        **Service complet incluant :**
-        - Calculs structuraux par ingénieur OIQ
-        - Plans de structure scellés
-        - Analyses sismique, vent et neige
-        - Surveillance de chantier (optionnel)
-        - Conformité CNB et normes CSA
-        """)
-        
-        st.info("""
-        💡 **Quand faire appel à un ingénieur en structure ?**
-        - Modifications structurales (murs porteurs, poutres)
-        - Nouvelles constructions
-        - Agrandissements et surélévations
-        - Structures industrielles et commerciales
-        - Problèmes structuraux existants
-        """)
-        
-        with st.form("formulaire_ingenieur"):
-            # Section 1: Informations client
-            st.markdown("### 1️⃣ Vos informations")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                nom_client = st.text_input("Nom complet ou entreprise *", placeholder="Entreprise ABC Inc.")
-                telephone = st.text_input("Téléphone *", placeholder="514-555-1234")
-                ville = st.text_input("Ville du projet *", placeholder="Montréal")
-            
-            with col2:
-                email = st.text_input("Email *", placeholder="contact@entreprise.com")
-                adresse_projet = st.text_input("Adresse du projet *", placeholder="1234 Rue Principale")
-                code_postal = st.text_input("Code postal *", placeholder="H1A 1A1")
-            
-            # Section 2: Détails du projet structural
-            st.markdown("### 2️⃣ Détails du projet structural")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                type_structure = st.selectbox(
-                    "Type de structure *",
-                    ["", "batiment", "fondation", "industriel", "pont", "autre"]
-                )
-                
-                if type_structure == "batiment":
-                    type_batiment = st.selectbox(
-                        "Type de bâtiment",
-                        ["", "résidentiel", "commercial", "industriel", "institutionnel"]
-                    )
-                else:
-                    type_batiment = ""
-                
-                superficie_projet = st.number_input(
-                    "Superficie du projet (pi²)",
-                    min_value=0,
-                    value=0,
-                    step=100,
-                    help="Superficie totale concernée par les travaux"
-                )
-                
-                hauteur_structure = st.number_input(
-                    "Hauteur de la structure (pi)",
-                    min_value=0,
-                    value=0,
-                    step=1,
-                    help="Hauteur totale ou hauteur libre"
-                )
-            
-            with col2:
-                nombre_etages = st.number_input(
-                    "Nombre d'étages",
-                    min_value=1,
-                    max_value=100,
-                    value=1
-                )
-                
-                type_construction = st.selectbox(
-                    "Type de construction/matériau *",
-                    ["", "beton", "acier", "bois", "mixte", "maconnerie"]
-                )
-                
-                charge_exploitation = st.text_input(
-                    "Charges d'exploitation",
-                    placeholder="Ex: 100 lb/pi², équipements lourds, etc.",
-                    help="Décrivez les charges prévues"
-                )
-                
-                zone_sismique = st.selectbox(
-                    "Zone sismique",
-                    ["", "Zone 1 - Faible", "Zone 2 - Modéré", "Zone 3 - Élevé", "Zone 4 - Très élevé", "Zone 5 - Extrême"]
-                )
-            
-            usage_structure = st.text_area(
-                "Description de l'usage et du projet *",
-                placeholder="Ex: Agrandissement résidentiel 2 étages avec sous-sol, retrait mur porteur, nouvelle poutre acier...",
-                height=100
-            )
-            
-            # Section 3: Conditions du site
-            st.markdown("### 3️⃣ Conditions du site et contraintes")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                sol_porteur = st.text_area(
-                    "Type de sol et capacité portante",
-                    placeholder="Ex: Argile compacte, capacité 3000 lb/pi² à 4 pi de profondeur",
-                    height=80
-                )
-                
-                contraintes_particulieres = st.text_area(
-                    "Contraintes particulières",
-                    placeholder="Ex: Proximité d'autres bâtiments, accès limité, vibrations, etc.",
-                    height=80
-                )
-            
-            with col2:
-                normes_requises = st.multiselect(
-                    "Normes et codes requis",
-                    ["CNB 2020", "CSA A23.3 (Béton)", "CSA S16 (Acier)", "CSA O86 (Bois)", 
-                     "AISC", "ACI", "Normes municipales"],
-                    default=["CNB 2020"]
-                )
-                
-                # Conversion pour stockage
-                normes_str = ', '.join(normes_requises) if normes_requises else ''
-            
-            # Section 4: Services requis
-            st.markdown("### 4️⃣ Services d'ingénierie requis")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                services_demandes = st.selectbox(
-                    "Type de services *",
-                    ["", "calculs", "plans", "complet"],
-                    format_func=lambda x: {
-                        'calculs': 'Calculs seulement',
-                        'plans': 'Calculs + Plans',
-                        'complet': 'Calculs + Plans + Surveillance'
-                    }.get(x, x),
-                    help="Calculs: notes de calcul, Plans: + plans structuraux, Complet: + surveillance chantier"
-                )
-                
-                calculs_requis = st.multiselect(
-                    "Types de calculs nécessaires",
-                    ["Fondations", "Poutres et colonnes", "Dalles", "Murs porteurs", 
-                     "Connexions", "Stabilité", "Analyse sismique", "Analyse vent"]
-                )
-                
-                plans_requis = st.multiselect(
-                    "Types de plans requis",
-                    ["Plan de fondation", "Plan de charpente", "Détails connexions", 
-                     "Coupes structurales", "Plan de coffrage", "Plan d'armature"]
-                )
-            
-            with col2:
-                surveillance_chantier = st.checkbox("Surveillance de chantier", value=False)
-                certification_requise = st.checkbox("Sceau d'ingénieur requis", value=True)
-                
-                st.markdown("**Analyses spécialisées :**")
-                analyse_sismique = st.checkbox("Analyse sismique", help="+15¢/pi²")
-                analyse_vent = st.checkbox("Analyse au vent", help="+10¢/pi²")
-                analyse_neige = st.checkbox("Analyse surcharge neige", help="+8¢/pi²")
-                analyse_dynamique = st.checkbox("Analyse dynamique", help="+20¢/pi²")
-                modelisation_3d = st.checkbox("Modélisation 3D", help="+10¢/pi²")
-            
-            # Section 5: Budget et échéancier
-            st.markdown("### 5️⃣ Budget et échéancier")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                budget_structure = st.selectbox(
-                    "Budget pour travaux structuraux",
-                    ["", "Moins de 25k$", "25k$ - 75k$", "75k$ - 150k$", 
-                     "150k$ - 300k$", "300k$ - 500k$", "Plus de 500k$"]
-                )
-                
-                date_debut_souhaite = st.date_input(
-                    "Date de début souhaitée des travaux",
-                    min_value=datetime.date.today() + datetime.timedelta(days=14),
-                    value=datetime.date.today() + datetime.timedelta(days=60)
-                )
-            
-            with col2:
-                budget_ingenieur = st.selectbox(
-                    "Budget pour services d'ingénieur",
-                    ["", "À déterminer", "Moins de 5k$", "5k$ - 15k$", 
-                     "15k$ - 30k$", "30k$ - 50k$", "Plus de 50k$"]
-                )
-                
-                date_livraison_souhaite = st.date_input(
-                    "Date de livraison souhaitée",
-                    min_value=datetime.date.today() + datetime.timedelta(days=7),
-                    value=datetime.date.today() + datetime.timedelta(days=21)
-                )
-            
-            niveau_urgence = st.selectbox(
-                "Niveau d'urgence",
-                ["normal", "faible", "eleve", "critique"],
-                format_func=lambda x: {
-                    'faible': '🟢 Faible - Délai flexible',
-                    'normal': '🟡 Normal - Délai standard',
-                    'eleve': '🟠 Élevé - Prioritaire',
-                    'critique': '🔴 Critique - Très urgent'
-                }[x]
-            )
-            
-            # Section 6: Documents
-            st.markdown("### 6️⃣ Documents techniques")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                plans_architecte = st.file_uploader(
-                    "Plans d'architecte",
-                    type=['pdf', 'dwg', 'jpg', 'png'],
-                    accept_multiple_files=True,
-                    help="Plans existants du projet"
-                )
-            
-            with col2:
-                etude_sol = st.file_uploader(
-                    "Rapport géotechnique",
-                    type=['pdf', 'doc', 'docx'],
-                    help="Étude de sol si disponible"
-                )
-            
-            with col3:
-                photos_existant = st.file_uploader(
-                    "Photos de l'existant",
-                    type=['jpg', 'png', 'jpeg'],
-                    accept_multiple_files=True,
-                    help="Photos de la structure actuelle"
-                )
-            
-            # Estimation du prix
-            st.markdown("### 💰 Estimation du coût")
-            
-            if superficie_projet > 0 and type_structure and services_demandes:
-                # Calcul estimé
-                if type_structure == 'batiment':
-                    if superficie_projet < 5000:
-                        prix_base = 8000
-                        prix_pi2 = 0.80
-                    elif superficie_projet < 15000:
-                        prix_base = 12000
-                        prix_pi2 = 0.65
-                    elif superficie_projet < 50000:
-                        prix_base = 18000
-                        prix_pi2 = 0.50
-                    else:
-                        prix_base = 25000
-                        prix_pi2 = 0.40
-                elif type_structure == 'industriel':
-                    prix_base = 15000
-                    prix_pi2 = 0.75
-                else:
-                    prix_base = 20000
-                    prix_pi2 = 1.00
-                
-                prix_estime = prix_base + (superficie_projet * prix_pi2)
-                
-                # Ajustements selon les services
-                if services_demandes == 'complet':
-                    prix_estime *= 1.8
-                elif services_demandes == 'plans':
-                    prix_estime *= 1.4
-                
-                # Analyses spécialisées
-                if analyse_sismique:
-                    prix_estime += superficie_projet * 0.15
-                if analyse_dynamique:
-                    prix_estime += superficie_projet * 0.20
-                if modelisation_3d:
-                    prix_estime += superficie_projet * 0.10
-                if surveillance_chantier:
-                    prix_estime += superficie_projet * 0.25
-                
-                st.info(f"""
-                **Estimation préliminaire : {prix_estime:,.2f}$**
-                
-                Cette estimation inclut:
-                - Services de base : {prix_base:,.2f}$
-                - Superficie ({superficie_projet:,.0f} pi² × {prix_pi2}$/pi²) : {(superficie_projet * prix_pi2):,.2f}$
-                - Ajustement services ({services_demandes}) : {('x1.8' if services_demandes == 'complet' else 'x1.4' if services_demandes == 'plans' else 'x1.0')}
-                {f"- Analyse sismique : {(superficie_projet * 0.15):,.2f}$" if analyse_sismique else ""}
-                {f"- Analyse dynamique : {(superficie_projet * 0.20):,.2f}$" if analyse_dynamique else ""}
-                {f"- Modélisation 3D : {(superficie_projet * 0.10):,.2f}$" if modelisation_3d else ""}
-                {f"- Surveillance chantier : {(superficie_projet * 0.25):,.2f}$" if surveillance_chantier else ""}
-                
-                *Prix final sujet à analyse détaillée du projet*
-                """)
-            
-            # Bouton de soumission
-            submitted = st.form_submit_button("📤 Soumettre la demande", type="primary")
-            
-            if submitted:
-                # Validation
-                if not all([nom_client, email, telephone, adresse_projet, ville, code_postal,
-                           type_structure, type_construction, usage_structure, services_demandes]):
-                    st.error("❌ Veuillez remplir tous les champs obligatoires (*)")
-                else:
-                    # Préparer les données
-                    demande_data = {
-                        'nom_client': nom_client,
-                        'email_client': email,
-                        'telephone_client': telephone,
-                        'adresse_projet': adresse_projet,
-                        'ville': ville,
-                        'code_postal': code_postal,
-                        'type_structure': type_structure,
-                        'type_batiment': type_batiment,
-                        'usage_structure': usage_structure,
-                        'superficie_projet': superficie_projet if superficie_projet > 0 else None,
-                        'hauteur_structure': hauteur_structure if hauteur_structure > 0 else None,
-                        'nombre_etages': nombre_etages,
-                        'charge_exploitation': charge_exploitation,
-                        'type_construction': type_construction,
-                        'sol_porteur': sol_porteur,
-                        'zone_sismique': zone_sismique,
-                        'contraintes_particulieres': contraintes_particulieres,
-                        'normes_requises': normes_str,
-                        'services_demandes': services_demandes,
-                        'calculs_requis': ', '.join(calculs_requis) if calculs_requis else '',
-                        'plans_requis': ', '.join(plans_requis) if plans_requis else '',
-                        'surveillance_chantier': surveillance_chantier,
-                        'certification_requise': certification_requise,
-                        'budget_structure': budget_structure,
-                        'budget_ingenieur': budget_ingenieur,
-                        'date_debut_souhaite': date_debut_souhaite,
-                        'date_livraison_souhaite': date_livraison_souhaite,
-                        'niveau_urgence': niveau_urgence,
-                        'modalite_paiement': 'forfait',
-                        'analyse_sismique': analyse_sismique,
-                        'analyse_vent': analyse_vent,
-                        'analyse_neige': analyse_neige,
-                        'analyse_dynamique': analyse_dynamique,
-                        'modelisation_3d': modelisation_3d
-                    }
-                    
-                    # Encoder les fichiers
-                    if plans_architecte:
-                        demande_data['plans_architecte'] = encoder_fichiers_ingenieur(plans_architecte)
-                    if etude_sol:
-                        demande_data['etude_sol'] = encoder_fichiers_ingenieur([etude_sol])
-                    if photos_existant:
-                        demande_data['photos_existant'] = encoder_fichiers_ingenieur(photos_existant)
-                    
-                    # Créer la demande
-                    numero_ref = creer_demande_ingenieur(demande_data)
-                    
-                    if numero_ref:
-                        st.success(f"""
-                        ✅ **Demande créée avec succès!**
-                        
-                        **Numéro de référence : {numero_ref}**
-                        
-                        Vous recevrez une réponse dans les 24-48 heures ouvrables.
-                        
-                        **Prochaines étapes:**
-                        1. Analyse technique de votre demande
-                        2. Contact d'un ingénieur OIQ pour validation
-                        3. Proposition détaillée avec méthodologie
-                        4. Début des calculs après acceptation
-                        """)
-                        
-                        st.balloons()
-                    else:
-                        st.error("❌ Erreur lors de la création de la demande. Veuillez réessayer.")
-    
-    with tab2:
-        st.markdown("### 📋 Suivi de vos demandes d'ingénieur")
-        
-        email_consultation = st.text_input(
-            "Entrez votre email pour consulter vos demandes",
-            placeholder="contact@entreprise.com"
-        )
-        
-        if st.button("🔍 Rechercher mes demandes"):
-            if email_consultation:
-                demandes = get_demandes_ingenieur_client(email_consultation)
-                
-                if demandes:
-                    st.success(f"✅ {len(demandes)} demande(s) trouvée(s)")
-                    
-                    for demande in demandes:
-                        with st.expander(f"🔧 {demande['numero_reference']} - {demande['type_structure'].title()}"):
-                            col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                st.markdown(f"**Type:** {demande['type_structure'].title()}")
-                                if demande['superficie_projet']:
-                                    st.markdown(f"**Superficie:** {demande['superficie_projet']:,.0f} pi²")
-                                st.markdown(f"**Ville:** {demande['ville']}")
-                                st.markdown(f"**Services:** {demande['services_demandes'].title()}")
-                            
-                            with col2:
-                                statut_emoji = {
-                                    'recue': '📨', 'analyse': '🔍', 'acceptee': '✅',
-                                    'calculs': '🧮', 'plans': '📐', 'revision': '📝',
-                                    'terminee': '✔️'
-                                }.get(demande['statut'], '📋')
-                                
-                                st.markdown(f"**Statut:** {statut_emoji} {demande['statut'].replace('_', ' ').title()}")
-                                st.markdown(f"**Prix:** {demande['prix_service']:,.2f}$")
-                                if demande['pourcentage_complete']:
-                                    st.progress(demande['pourcentage_complete'] / 100)
-                                    st.caption(f"Progression: {demande['pourcentage_complete']}%")
-                            
-                            with col3:
-                                st.markdown(f"**Date demande:** {demande['date_demande'][:10] if demande['date_demande'] else 'N/A'}")
-                                st.markdown(f"**Livraison prévue:** {demande['date_livraison_souhaite'] if demande['date_livraison_souhaite'] else 'À déterminer'}")
-                            
-                            st.markdown("---")
-                            st.markdown(f"**Description:** {demande['usage_structure']}")
-                            
-                            # Téléchargement des documents si disponibles
-                            documents_disponibles = []
-                            if demande['calculs_structures']:
-                                documents_disponibles.append(("Calculs structuraux", demande['calculs_structures'], "Calculs"))
-                            if demande['plans_structures']:
-                                documents_disponibles.append(("Plans structuraux", demande['plans_structures'], "Plans"))
-                            
-                            if documents_disponibles:
-                                st.markdown("### 📥 Documents disponibles")
-                                for nom, contenu, type_doc in documents_disponibles:
-                                    st.download_button(
-                                        f"⬇️ Télécharger {nom}",
-                                        data=contenu,
-                                        file_name=f"{type_doc}_{demande['numero_reference']}.pdf",
-                                        mime="application/pdf"
-                                    )
-                else:
-                    st.info("❌ Aucune demande trouvée pour cet email")
-            else:
-                st.warning("⚠️ Veuillez entrer votre email")
-    
-    with tab3:
-        st.markdown("""
-        ### ℹ️ Informations sur le service d'ingénieur en structure
-        
-        #### 🔧 Quand faire appel à un ingénieur en structure au Québec?
-        
-        Un ingénieur en structure est **obligatoire** pour:
-        
-        - **Modifications structurales** : Retrait de murs porteurs, ouvertures dans dalles
-        - **Nouvelles constructions** : Calculs de charpente et fondations
-        - **Agrandissements** : Extensions, surélévations
-        - **Structures spécialisées** : Ponts, structures industrielles
-        - **Réparations majeures** : Renforcement, reprise en sous-œuvre
-        
-        #### 💰 Structure de prix typique
-        
-        | Type de projet | Prix de base | Prix/pi² | Services |
-        |----------------|--------------|----------|----------|
-        | Bâtiment < 5,000 pi² | 8,000$ | 0.80$ | Calculs de base |
-        | Bâtiment 5,000-15,000 pi² | 12,000$ | 0.65$ | Calculs détaillés |
-        | Bâtiment 15,000-50,000 pi² | 18,000$ | 0.50$ | Analyse complète |
-        | Bâtiment > 50,000 pi² | 25,000$ | 0.40$ | Gestion projet |
-        | Industriel | 15,000$ | 0.75$ | Spécialisé |
-        | Autre (pont, fondation) | 20,000$ | 1.00$ | Sur mesure |
-        
-        **Ajustements de services:**
-        - Calculs seulement : Prix de base
-        - Calculs + Plans : +40%
-        - Service complet + Surveillance : +80%
-        
-        **Analyses spécialisées:**
-        - Analyse sismique : +15¢/pi²
-        - Analyse dynamique : +20¢/pi²
-        - Modélisation 3D : +10¢/pi²
-        - Surveillance chantier : +25¢/pi²
-        
-        #### 📋 Livrables typiques
-        
-        **Calculs structuraux:**
-        - Note de calculs détaillée
-        - Vérifications CNB et normes CSA
-        - Recommandations techniques
-        
-        **Plans structuraux:**
-        - Plans de fondation
-        - Plans de charpente
-        - Détails de connexions
-        - Coupes et sections
-        
-        **Surveillance (optionnel):**
-        - Visites de chantier
-        - Vérification conformité
-        - Rapports d'avancement
-        
-        #### ⏱️ Délais typiques
-        
-        - **Projets simples** : 5-10 jours ouvrables
-        - **Projets moyens** : 2-3 semaines
-        - **Projets complexes** : 3-6 semaines
-        - **Révisions** : 3-5 jours ouvrables
-        
-        #### 📞 Support technique
-        
-        Pour toute question sur le service d'ingénieur:
-        - 📧 structure@seaop.ca
-        - 📞 1-800-SEAOP-QC
-        - 💬 Chat technique disponible
-        
-        #### 🏗️ Matériaux supportés
-        
-        - **Béton armé** : Dalles, poutres, colonnes, murs
-        - **Charpente acier** : Poutres IPE/HEA, connexions boulonnées/soudées
-        - **Charpente bois** : Bois d'œuvre, bois lamellé-collé, CLT
-        - **Maçonnerie** : Murs porteurs, linteaux, renforcements
-        - **Mixte** : Combinaisons de matériaux
-        """)
-
-# === PAGES POUR LOGICIELS PROFESSIONNELS ===
-
-def page_experts_ia():
-    """Page dédiée à EXPERTS IA"""
-    st.markdown("""
-    <div class="main-header">
-        <h1>🧠 EXPERTS IA - 60+ Experts Construction</h1>
-        <p>L'Assistant IA le Plus Avancé de la Construction Québécoise</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-    ## 🏆 Fonctionnalités révolutionnaires
-    
-    ✨ **60+ profils d'experts spécialisés** (2,400+ années d'expérience)
-    - **Entrepreneur Général, Architecte, Électricien CMEQ, Plombier CMMTQ**
-    - **Assistant IA adaptatif** qui sélectionne l'expert optimal
-    - **Calculs techniques automatiques** (poutres, colonnes, linteaux)
-    - **Conformité RBQ/CCQ** automatique
-    
-    ## 🎯 Parfait pour vos appels d'offres SEAOP
-    - Validation technique de vos projets
-    - Estimations ultra-précises par expert
-    - Conseils réglementaires spécialisés
-    - Optimisation coûts et délais
-    """)
-    
-    st.info("""
-    💼 **Installation & Support EXPERTS IA**
-    
-    Pour l'installation et la configuration personnalisée d'EXPERTS IA :
-    - 📧 **Email** : info@constructoai.ca
-    - 📱 **Téléphone** : 514-820-1972
-    - 💬 **Support 24/7** via l'application
-    """)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.link_button("🚀 **Accéder à EXPERTS IA**", "https://experts-ai.constructoai.ca/", use_container_width=True, type="primary")
-    with col2:
-        if st.button("📚 **Documentation**", use_container_width=True):
-            st.markdown("**[→ Guide d'utilisation](https://experts-ai.constructoai.ca/docs)**")
-
-def page_takeoff_ai():
-    """Page dédiée à TAKEOFF AI"""
-    st.markdown("""
-    <div class="main-header">
-        <h1>📐 TAKEOFF AI - Estimation de Construction</h1>
-        <p>Calculs précis de matériaux et coûts</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-    ## 🎯 Optimisé pour l'industrie québécoise
-    
-    ✨ **Calculs automatiques précis**
-    - **Matériaux** : Béton, acier, bois selon normes CSA/BNQ
-    - **Main-d'œuvre** : Tarifs CCQ actualisés
-    - **Équipements** : Location et utilisation optimisées
-    - **Conformité** : Codes du bâtiment québécois
-    
-    ## 🏗️ Fonctionnalités avancées
-    - Import plans PDF/DWG pour mesures automatiques
-    - Base de données prix matériaux temps réel
-    - Génération rapports détaillés
-    - Intégration avec SEAOP pour soumissions
-    """)
-    
-    st.info("""
-    💼 **Installation & Support TAKEOFF AI**
-    
-    Pour l'installation et la configuration personnalisée :
-    - 📧 **Email** : info@constructoai.ca
-    - 📱 **Téléphone** : 514-820-1972
-    - 💬 **Formation** personnalisée incluse
-    """)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.link_button("🚀 **Accéder à TAKEOFF AI**", "https://takeoff-ai.constructoai.ca/", use_container_width=True, type="primary")
-    with col2:
-        if st.button("📊 **Exemples d'estimations**", use_container_width=True):
-            st.markdown("**[→ Voir les démos](https://takeoff-ai.constructoai.ca/demo)**")
-
-def page_erp_ai():
-    """Page dédiée à ERP AI"""
-    st.markdown("""
-    <div class="main-header">
-        <h1>📊 ERP AI - Gestion de Projets Construction</h1>
-        <p>ERP Spécialisé Construction avec 24 Étapes de Chantier</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-    ## 🏗️ Fonctionnalités construction québécoise
-    
-    ✨ **Gestion complète de chantier**
-    - **24 étapes de construction** (excavation → livraison)
-    - **Bons de Travail (BT)** avec traçabilité complète
-    - **TimeTracker chantier** temps réel
-    - **Multi-vues** : Dashboard, Kanban, Gantt, Calendrier
-    
-    ## 🎯 Parfait pour projets attribués SEAOP
-    - Gestion complète de vos chantiers
-    - Suivi progression par étape construction
-    - Conformité RBQ/CCQ automatique
-    - Pointage employés et sous-traitants
-    - Livraison dans les délais contractuels
-    
-    ## 🚀 Modules spécialisés
-    - **CRM construction** et gestion RH spécialisée
-    - **Inventaire matériaux** avec normes CSA/BNQ
-    - **Assistant IA** pour la gestion de vos projets
-    """)
-    
-    st.info("""
-    💼 **Installation & Support ERP AI**
-    
-    Pour l'installation et la configuration personnalisée d'ERP AI :
-    - 📧 **Email** : info@constructoai.ca
-    - 📱 **Téléphone** : 514-820-1972
-    - 🏗️ **Formation** sur site incluse
-    - 💻 **Personnalisation** selon vos processus
-    """)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.link_button("🚀 **Accéder à ERP AI**", "https://erp-ai.constructoai.ca/", use_container_width=True, type="primary")
-    with col2:
-        if st.button("📚 **Documentation**", use_container_width=True):
-            st.markdown("**[→ Guide d'utilisation](https://erp-ai.constructoai.ca/docs)**")
-    
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with tracer_rerun() as trace:
+        try:
+            main()
+        finally:
+            trace.page = st.session_state.get('page')
\ No newline at end of file
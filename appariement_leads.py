@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Appariement des projets (leads) aux entrepreneurs SEAOP
+
+Les zones desservies (codes postaux saisis librement) et les types de projets
+(liste séparée par des virgules) des entrepreneurs sont normalisés dans deux
+tables indexées :
+- entrepreneur_zones : RTA (3 premiers caractères du code postal), lettre de
+  région (ex. « H ») ou « * » pour toutes les zones ;
+- entrepreneur_types : type de projet, ou « * » pour tous les types.
+
+Leur produit est matérialisé dans entrepreneur_couverture (zone, type, id),
+clé primaire comprise : à la publication d'un projet, les entrepreneurs
+admissibles sont lus par au plus six parcours de plage de cette clé (RTA,
+région ou « * », croisés avec le type ou « * ») sans examiner de candidats
+non pertinents, puis reçoivent une notification « nouveau projet
+correspondant » insérée en un seul INSERT ... SELECT.
+"""
+
+import sqlite3
+import os
+import re
+from typing import Optional, List, Set
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Valeur d'index signifiant « toutes les zones » ou « tous les types »
+TOUTES = '*'
+
+TYPE_NOTIFICATION = 'projet_correspondant'
+
+_RE_CODE_POSTAL = re.compile(r'^[A-Z]\d[A-Z](\d[A-Z]\d)?$')
+_RE_REGION = re.compile(r'^[A-Z]\*?$')
+_RE_SEPARATEURS = re.compile(r'[,;\n]+')
+
+# Bases dont les tables d'appariement sont en place et reprises
+_bases_indexees = set()
+
+def extraire_zones(zones_desservies: Optional[str]) -> Set[str]:
+    """
+    Normalise les zones desservies saisies librement.
+
+    Accepte les codes postaux complets ou partiels (« H2B 3C4 », « h2b »), les
+    lettres de région (« H », « H* ») et « * ». Les mentions non reconnues (noms
+    de villes...) sont ignorées ; sans aucune zone reconnue, l'entrepreneur
+    dessert toutes les zones, comme avant l'appariement.
+    """
+    zones = set()
+    for jeton in _RE_SEPARATEURS.split((zones_desservies or '').upper()):
+        jeton = jeton.replace(' ', '').strip()
+        if jeton == TOUTES:
+            zones.add(TOUTES)
+        elif _RE_CODE_POSTAL.match(jeton):
+            zones.add(jeton[:3])
+        elif _RE_REGION.match(jeton):
+            zones.add(jeton[0])
+    return zones or {TOUTES}
+
+def extraire_types(types_projets: Optional[str]) -> Set[str]:
+    """Types de projets d'un entrepreneur ; aucun type déclaré signifie tous les types"""
+    types = {t.strip() for t in (types_projets or '').split(',') if t.strip()}
+    return types or {TOUTES}
+
+def zones_du_code_postal(code_postal: Optional[str]) -> List[str]:
+    """Clés d'index à interroger pour un projet : RTA, région et « toutes zones »"""
+    code = (code_postal or '').upper().replace(' ', '')
+    zones = [TOUTES]
+    if re.match(r'^[A-Z]\d[A-Z]', code):
+        zones += [code[0], code[:3]]
+    return zones
+
+def _creer_tables(cursor: sqlite3.Cursor):
+    """Tables d'appariement, index inverses et nettoyage à la suppression"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS entrepreneur_zones (
+            zone TEXT NOT NULL,
+            entrepreneur_id INTEGER NOT NULL,
+            PRIMARY KEY (zone, entrepreneur_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS entrepreneur_types (
+            type_projet TEXT NOT NULL,
+            entrepreneur_id INTEGER NOT NULL,
+            PRIMARY KEY (type_projet, entrepreneur_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS entrepreneur_couverture (
+            zone TEXT NOT NULL,
+            type_projet TEXT NOT NULL,
+            entrepreneur_id INTEGER NOT NULL,
+            PRIMARY KEY (zone, type_projet, entrepreneur_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ez_entrepreneur ON entrepreneur_zones(entrepreneur_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_et_entrepreneur ON entrepreneur_types(entrepreneur_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ec_entrepreneur ON entrepreneur_couverture(entrepreneur_id)')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_appariement_entrepreneur_delete AFTER DELETE ON entrepreneurs
+        BEGIN
+            DELETE FROM entrepreneur_zones WHERE entrepreneur_id = OLD.id;
+            DELETE FROM entrepreneur_types WHERE entrepreneur_id = OLD.id;
+            DELETE FROM entrepreneur_couverture WHERE entrepreneur_id = OLD.id;
+        END
+    ''')
+    # La diffusion multiplie les notifications : leur lecture par utilisateur doit rester indexée
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_notifications_utilisateur
+        ON notifications(utilisateur_type, utilisateur_id, date_creation)
+    ''')
+
+def _indexer(cursor: sqlite3.Cursor, entrepreneurs):
+    """Remplace les lignes d'index des entrepreneurs (id, zones_desservies, types_projets)"""
+    profils = [(e[0], extraire_zones(e[1]), extraire_types(e[2])) for e in entrepreneurs]
+    ids = [(p[0],) for p in profils]
+    for table in ('entrepreneur_zones', 'entrepreneur_types', 'entrepreneur_couverture'):
+        cursor.executemany(f'DELETE FROM {table} WHERE entrepreneur_id = ?', ids)
+    cursor.executemany(
+        'INSERT INTO entrepreneur_zones (zone, entrepreneur_id) VALUES (?, ?)',
+        [(zone, id_) for id_, zones, _ in profils for zone in zones]
+    )
+    cursor.executemany(
+        'INSERT INTO entrepreneur_types (type_projet, entrepreneur_id) VALUES (?, ?)',
+        [(type_projet, id_) for id_, _, types in profils for type_projet in types]
+    )
+    cursor.executemany(
+        'INSERT INTO entrepreneur_couverture (zone, type_projet, entrepreneur_id) VALUES (?, ?, ?)',
+        [(zone, type_projet, id_) for id_, zones, types in profils for zone in zones for type_projet in types]
+    )
+
+def assurer_index_appariement():
+    """
+    Crée les tables d'appariement et indexe les entrepreneurs absents de l'index.
+
+    Tout entrepreneur indexé a au moins une ligne de types (« * » à défaut) :
+    ceux qui n'en ont pas ont été créés hors de l'application (scripts, import)
+    ou avant l'appariement et sont repris ici.
+    """
+    if DATABASE_PATH in _bases_indexees:
+        return
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('BEGIN IMMEDIATE')
+        _creer_tables(cursor)
+        cursor.execute('''
+            SELECT id, zones_desservies, types_projets FROM entrepreneurs e
+            WHERE NOT EXISTS (SELECT 1 FROM entrepreneur_types t WHERE t.entrepreneur_id = e.id)
+        ''')
+        _indexer(cursor, cursor.fetchall())
+        conn.commit()
+        _bases_indexees.add(DATABASE_PATH)
+    except Exception as e:
+        print(f"Erreur lors de l'indexation des entrepreneurs: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def indexer_entrepreneur(entrepreneur_id: int, zones_desservies: Optional[str], types_projets: Optional[str]) -> bool:
+    """Réindexe un entrepreneur après son inscription ou la mise à jour de son profil"""
+    assurer_index_appariement()
+    try:
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        _indexer(cursor, [(entrepreneur_id, zones_desservies, types_projets)])
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Erreur lors de l'indexation de l'entrepreneur: {e}")
+        return False
+
+_REQUETE_ADMISSIBLES = '''
+    SELECT DISTINCT c.entrepreneur_id
+    FROM entrepreneur_couverture c
+    JOIN entrepreneurs e ON e.id = c.entrepreneur_id
+    WHERE c.zone IN ({zones})
+      AND c.type_projet IN (?, '*')
+      AND e.statut = 'actif'
+'''
+
+def _requete_admissibles(code_postal: Optional[str], type_projet: str):
+    zones = zones_du_code_postal(code_postal)
+    requete = _REQUETE_ADMISSIBLES.format(zones=', '.join('?' * len(zones)))
+    return requete, zones + [type_projet]
+
+def get_entrepreneurs_admissibles(code_postal: Optional[str], type_projet: str) -> List[int]:
+    """Ids des entrepreneurs actifs dont les zones et les types couvrent le projet"""
+    assurer_index_appariement()
+    requete, parametres = _requete_admissibles(code_postal, type_projet)
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    cursor.execute(requete, parametres)
+    ids = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return ids
+
+def notifier_entrepreneurs_admissibles(cursor: sqlite3.Cursor, lead_id: int,
+                                       code_postal: Optional[str], type_projet: str) -> int:
+    """
+    Notifie en un seul INSERT ... SELECT les entrepreneurs admissibles d'un projet.
+
+    Utilise le curseur de l'appelant pour que la publication du projet et sa
+    diffusion soient validées dans la même transaction. Retourne le nombre
+    d'entrepreneurs notifiés.
+    """
+    requete, parametres = _requete_admissibles(code_postal, type_projet)
+    zone = (code_postal or '').upper().replace(' ', '')[:3]
+    titre = "🎯 Nouveau projet correspondant"
+    message = f"Un nouveau projet « {type_projet} » correspond à votre profil" + (f" ({zone})" if zone else "")
+    cursor.execute(f'''
+        INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, titre, message, lien_id)
+        SELECT 'entrepreneur', entrepreneur_id, ?, ?, ?, ?
+        FROM ({requete})
+    ''', [TYPE_NOTIFICATION, titre, message, lead_id] + parametres)
+    return cursor.rowcount
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Accès à la base SEAOP : connexions WAL et écrivain unique
+
+Chaque session Streamlit s'exécute dans son propre fil. Quand chaque
+écriture ouvre sa connexion et valide seule, les sessions se disputent le
+verrou d'écriture et payent chacune une synchronisation disque. Ici :
+- la base passe en journal WAL : les lectures voient un instantané cohérent
+  et ne bloquent ni ne sont bloquées par l'écriture en cours ;
+- les écritures sont confiées à un fil écrivain unique par base, via une
+  file : il regroupe les opérations en attente (TAILLE_MAX_GROUPE au plus,
+  DELAI_GROUPE d'attente au plus) dans une seule transaction, chacune dans
+  son point de sauvegarde, et rend le résultat de chacune par un Future.
+
+Une opération est une fonction operation(cursor, *args) : elle écrit avec le
+curseur fourni, sans valider, et retourne son résultat. Son exception est
+propagée à l'appelant sans annuler les autres opérations du groupe.
+
+Usage :
+    soumission_id = executer_ecriture(inserer_soumission, soumission)   # attend la validation
+    ecrire(maj_urgence, projet_id, 'critique')                          # n'attend pas
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Attente maximale (secondes) d'autres opérations après la première d'un groupe
+DELAI_GROUPE = 0.0005
+
+# Nombre maximal d'opérations validées ensemble
+TAILLE_MAX_GROUPE = 256
+
+# Attente du verrou d'écriture (secondes) face aux écritures hors de la file
+DELAI_VERROU = 10.0
+
+# Attente maximale du résultat d'une écriture par executer_ecriture
+DELAI_RESULTAT = 30.0
+
+_bases_wal = set()
+_ecrivains: Dict[str, 'EcrivainUnique'] = {}
+_verrou = threading.Lock()
+
+def activer_wal(chemin: Optional[str] = None):
+    """Passe la base en journal WAL (persistant dans le fichier : une fois suffit)"""
+    chemin = chemin or DATABASE_PATH
+    if chemin in _bases_wal:
+        return
+    conn = sqlite3.connect(chemin, timeout=DELAI_VERROU)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        _bases_wal.add(chemin)
+    except sqlite3.Error as e:
+        print(f"Erreur lors de l'activation du journal WAL: {e}")
+    finally:
+        conn.close()
+
+def connecter_lecture(chemin: Optional[str] = None) -> sqlite3.Connection:
+    """Connexion de lecture : instantané WAL, écriture refusée"""
+    chemin = chemin or DATABASE_PATH
+    activer_wal(chemin)
+    conn = sqlite3.connect(chemin, timeout=DELAI_VERROU)
+    conn.execute('PRAGMA query_only = 1')
+    return conn
+
+class EcrivainUnique:
+    """Fil écrivain d'une base : file d'opérations, validation par groupes"""
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self.operations = 0
+        self.groupes = 0
+        self._file: queue.Queue = queue.Queue()
+        self._fil = threading.Thread(target=self._boucle, name='seaop-ecrivain', daemon=True)
+        self._fil.start()
+
+    def soumettre(self, operation: Callable[..., Any], *args) -> Future:
+        """Place une opération dans la file ; le Future reçoit son résultat une fois validé"""
+        if threading.current_thread() is self._fil:
+            # Une opération qui attendrait une autre opération bloquerait l'écrivain
+            raise RuntimeError("Écriture soumise depuis le fil écrivain : utiliser le curseur de l'opération")
+        future = Future()
+        self._file.put((operation, args, future))
+        return future
+
+    def _connecter(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.chemin, timeout=DELAI_VERROU, isolation_level=None,
+                               check_same_thread=False)
+
+    def _boucle(self):
+        activer_wal(self.chemin)
+        conn = self._connecter()
+        while True:
+            groupe = [self._file.get()]
+            echeance = time.monotonic() + DELAI_GROUPE
+            while len(groupe) < TAILLE_MAX_GROUPE:
+                try:
+                    groupe.append(self._file.get(timeout=max(echeance - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                self._valider_groupe(conn.cursor(), groupe)
+            except Exception as e:
+                # Transaction interrompue (point de sauvegarde perdu, erreur SQLite) : le groupe
+                # échoue en entier, l'écrivain repart d'une connexion neuve
+                print(f"Erreur lors de l'écriture d'un groupe d'opérations: {e}")
+                for _, _, future in groupe:
+                    if not future.done():
+                        if future.running() or future.set_running_or_notify_cancel():
+                            future.set_exception(e)
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+                conn = self._connecter()
+
+    def _valider_groupe(self, cursor: sqlite3.Cursor, groupe: list):
+        """Une transaction pour le groupe, un point de sauvegarde par opération"""
+        resultats = []
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+        except sqlite3.Error as e:
+            for _, _, future in groupe:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            return
+
+        for operation, args, future in groupe:
+            if not future.set_running_or_notify_cancel():
+                continue
+            cursor.execute('SAVEPOINT operation')
+            try:
+                resultats.append((future, operation(cursor, *args), None))
+                cursor.execute('RELEASE operation')
+            except Exception as e:
+                cursor.execute('ROLLBACK TO operation')
+                cursor.execute('RELEASE operation')
+                resultats.append((future, None, e))
+
+        try:
+            cursor.execute('COMMIT')
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la validation d'un groupe d'écritures: {e}")
+            cursor.execute('ROLLBACK')
+            resultats = [(future, None, e) for future, _, _ in resultats]
+
+        self.operations += len(resultats)
+        self.groupes += 1
+        for future, resultat, erreur in resultats:
+            if erreur is None:
+                future.set_result(resultat)
+            else:
+                future.set_exception(erreur)
+
+def get_ecrivain(chemin: Optional[str] = None) -> EcrivainUnique:
+    """Écrivain de la base (démarré au premier appel dans ce processus, redémarré s'il s'est arrêté)"""
+    chemin = chemin or DATABASE_PATH
+    with _verrou:
+        # Un fil écrivain arrêté (erreur imprévue hors d'un groupe) est remplacé
+        if chemin not in _ecrivains or not _ecrivains[chemin]._fil.is_alive():
+            _ecrivains[chemin] = EcrivainUnique(chemin)
+        return _ecrivains[chemin]
+
+def ecrire(operation: Callable[..., Any], *args, chemin: Optional[str] = None) -> Future:
+    """Soumet une opération d'écriture sans attendre sa validation"""
+    return get_ecrivain(chemin).soumettre(operation, *args)
+
+def executer_ecriture(operation: Callable[..., Any], *args, chemin: Optional[str] = None) -> Any:
+    """Soumet une opération d'écriture et retourne son résultat une fois validé (ou lève son exception)"""
+    return ecrire(operation, *args, chemin=chemin).result(timeout=DELAI_RESULTAT)
+
+def executer_sql(sql: str, parametres: tuple = (), chemin: Optional[str] = None) -> int:
+    """Exécute une instruction d'écriture par l'écrivain ; retourne lastrowid"""
+    return executer_ecriture(lambda cursor: cursor.execute(sql, parametres).lastrowid, chemin=chemin)
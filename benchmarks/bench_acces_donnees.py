@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la couche d'accès aux données SEAOP
+
+Les fonctions dont dépendent toutes les pages (projets disponibles, filtres,
+conversations, soumissions d'un projet, statistiques, notifications non
+lues) sont importées de acces_donnees sans lancer l'interface Streamlit, puis
+mesurées sur des bases générées par generer_donnees (graine fixe) de trois
+tailles : petite, moyenne et grande. Pour chaque fonction :
+- latence : médiane, 95e et 99e centiles sur REPETITIONS appels ;
+- requêtes SQL exécutées sur les connexions ouvertes par la fonction, et
+  écritures confiées à l'écrivain unique (vidé entre deux appels) ;
+- pic de mémoire Python (tracemalloc) pendant un appel.
+
+Chaque taille s'exécute dans son propre processus : les modules lisent
+DATA_DIR à l'import. Les bases sont générées une fois, dans le dossier
+temporaire du système, puis réutilisées.
+
+Les résultats sont comparés à la référence enregistrée
+(reference_acces_donnees.json) : une latence au 95e centile ou un pic de
+mémoire au-delà de la tolérance, ou des requêtes en plus, sont signalés et
+le code de sortie vaut 1. --enregistrer remplace la référence des tailles
+mesurées (machine de référence : celle qui exécute le benchmark).
+
+Usage : python benchmarks/bench_acces_donnees.py [petite moyenne grande] [--enregistrer]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+RACINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RACINE)
+
+FICHIER_REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reference_acces_donnees.json')
+
+GRAINE = 42
+
+# Volumes passés à generer_donnees.generer
+TAILLES = {
+    'petite': dict(nb_leads=1_000, nb_entrepreneurs=100, nb_soumissions=10_000, nb_messages=50_000,
+                   nb_notifications=10_000, nb_chat=0, nb_likes_chat=0),
+    'moyenne': dict(nb_leads=10_000, nb_entrepreneurs=1_000, nb_soumissions=100_000, nb_messages=500_000,
+                    nb_notifications=100_000, nb_chat=0, nb_likes_chat=0),
+    'grande': dict(nb_leads=100_000, nb_entrepreneurs=5_000, nb_soumissions=1_000_000, nb_messages=5_000_000,
+                   nb_notifications=1_000_000, nb_chat=0, nb_likes_chat=0),
+}
+
+REPETITIONS = {'petite': 50, 'moyenne': 20, 'grande': 5}
+
+# Au-delà, une mesure est une régression ; les écarts de latence de moins de SEUIL_LATENCE_MS sont du bruit
+TOLERANCE_LATENCE = 0.25
+SEUIL_LATENCE_MS = 1.0
+TOLERANCE_MEMOIRE = 0.25
+
+def dossier_base(taille: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"seaop_bench_{taille}_{GRAINE}")
+
+def preparer_base(taille: str) -> str:
+    """Base générée de la taille demandée (réutilisée si elle existe) ; retourne son dossier"""
+    dossier = dossier_base(taille)
+    if not os.path.exists(os.path.join(dossier, 'pret')):
+        subprocess.run([sys.executable, os.path.join(RACINE, 'generer_donnees.py'), '--data-dir', dossier,
+                        '--graine', str(GRAINE)]
+                       + [arg for cle, valeur in TAILLES[taille].items()
+                          for arg in (f"--{cle[3:].replace('_', '-')}", str(valeur))],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        open(os.path.join(dossier, 'pret'), 'w').close()
+    return dossier
+
+class Compteurs:
+    """Compte les requêtes des connexions ouvertes et les écritures soumises pendant un bloc with"""
+
+    def __init__(self):
+        self.requetes = 0
+        self.ecritures = 0
+
+    def __enter__(self):
+        import sqlite3
+        import base_donnees
+
+        self._sqlite3, self._ecrivain = sqlite3, base_donnees.EcrivainUnique
+        self._connect, self._soumettre = sqlite3.connect, base_donnees.EcrivainUnique.soumettre
+        compteurs = self
+
+        def connecter(*args, **kwargs):
+            conn = compteurs._connect(*args, **kwargs)
+            conn.set_trace_callback(compteurs._compter_requete)
+            return conn
+
+        def soumettre(ecrivain, operation, *args):
+            compteurs.ecritures += 1
+            return compteurs._soumettre(ecrivain, operation, *args)
+
+        sqlite3.connect = connecter
+        base_donnees.EcrivainUnique.soumettre = soumettre
+        return self
+
+    def _compter_requete(self, instruction):
+        self.requetes += 1
+
+    def __exit__(self, *exc):
+        self._sqlite3.connect = self._connect
+        self._ecrivain.soumettre = self._soumettre
+
+def cas_de_mesure(acces_donnees):
+    """(nom, fonction sans argument) : arguments tirés de la base (profils les plus actifs)"""
+    import sqlite3
+
+    conn = sqlite3.connect(acces_donnees.DATABASE_PATH)
+    requete = lambda sql: conn.execute(sql).fetchone()[0]
+    entrepreneur = requete('SELECT entrepreneur_id FROM messages GROUP BY entrepreneur_id ORDER BY COUNT(*) DESC LIMIT 1')
+    lead = requete('SELECT lead_id FROM soumissions GROUP BY lead_id ORDER BY COUNT(*) DESC LIMIT 1')
+    client = requete('SELECT email FROM leads GROUP BY email ORDER BY COUNT(*) DESC LIMIT 1')
+    code_postal = requete('SELECT code_postal FROM leads GROUP BY code_postal ORDER BY COUNT(*) DESC LIMIT 1')
+    conn.close()
+
+    return [
+        ('get_projets_disponibles', lambda: acces_donnees.get_projets_disponibles()),
+        ('filtrer_projets (type, texte)',
+         lambda: acces_donnees.filtrer_projets_pour_entrepreneurs(type_projet='Toiture', recherche_texte='isolation')),
+        ('filtrer_projets (rayon 25 km)',
+         lambda: acces_donnees.filtrer_projets_pour_entrepreneurs(rayon_km=25, code_postal_origine=code_postal)),
+        ('get_conversations_entrepreneur', lambda: acces_donnees.get_conversations_entrepreneur(entrepreneur)),
+        ('get_soumissions_pour_projet', lambda: acces_donnees.get_soumissions_pour_projet(lead)),
+        ('get_stats_client', lambda: acces_donnees.get_stats_client(client)),
+        ('get_stats_entrepreneur', lambda: acces_donnees.get_stats_entrepreneur(entrepreneur)),
+        ('get_stats_admin', lambda: acces_donnees.get_stats_admin()),
+        ('count_notifications_non_lues', lambda: acces_donnees.count_notifications_non_lues('entrepreneur', entrepreneur)),
+    ]
+
+def mesurer_taille(taille: str) -> dict:
+    """Mesures de toutes les fonctions sur la base de la taille donnée (DATA_DIR déjà positionné)"""
+    import acces_donnees
+    from base_donnees import executer_ecriture
+
+    def vider_file():
+        # Les écritures différées d'un appel ne doivent pas ralentir le suivant
+        executer_ecriture(lambda cursor: None, chemin=acces_donnees.DATABASE_PATH)
+
+    acces_donnees.init_database()
+    resultats = {}
+    for nom, fonction in cas_de_mesure(acces_donnees):
+        fonction()
+        vider_file()
+
+        durees = []
+        for _ in range(REPETITIONS[taille]):
+            debut = time.perf_counter()
+            fonction()
+            durees.append((time.perf_counter() - debut) * 1000)
+            vider_file()
+
+        with Compteurs() as compteurs:
+            fonction()
+        vider_file()
+
+        tracemalloc.start()
+        fonction()
+        pic = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        vider_file()
+
+        resultats[nom] = {
+            'p50_ms': round(float(np.percentile(durees, 50)), 3),
+            'p95_ms': round(float(np.percentile(durees, 95)), 3),
+            'p99_ms': round(float(np.percentile(durees, 99)), 3),
+            'requetes': compteurs.requetes,
+            'ecritures': compteurs.ecritures,
+            'memoire_ko': round(pic / 1024, 1),
+        }
+    return resultats
+
+def regressions(mesures: dict, reference: dict) -> list:
+    """Écarts au-delà des tolérances, par fonction"""
+    ecarts = []
+    for nom, mesure in mesures.items():
+        ref = reference.get(nom)
+        if not ref:
+            continue
+        if (mesure['p95_ms'] > ref['p95_ms'] * (1 + TOLERANCE_LATENCE)
+                and mesure['p95_ms'] - ref['p95_ms'] > SEUIL_LATENCE_MS):
+            ecarts.append(f"{nom} : p95 {mesure['p95_ms']:.2f} ms (référence {ref['p95_ms']:.2f} ms)")
+        if mesure['requetes'] > ref['requetes']:
+            ecarts.append(f"{nom} : {mesure['requetes']} requêtes (référence {ref['requetes']})")
+        if mesure['memoire_ko'] > ref['memoire_ko'] * (1 + TOLERANCE_MEMOIRE):
+            ecarts.append(f"{nom} : {mesure['memoire_ko']:.0f} Ko (référence {ref['memoire_ko']:.0f} Ko)")
+    return ecarts
+
+def afficher(taille: str, mesures: dict):
+    print(f"\nBase {taille} ({TAILLES[taille]['nb_leads']:,} projets, {REPETITIONS[taille]} appels)")
+    print(f"  {'fonction':34s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'requêtes':>9s} "
+          f"{'écritures':>9s} {'mém. Ko':>9s}")
+    for nom, m in mesures.items():
+        print(f"  {nom:34s} {m['p50_ms']:9.2f} {m['p95_ms']:9.2f} {m['p99_ms']:9.2f} {m['requetes']:9d} "
+              f"{m['ecritures']:9d} {m['memoire_ko']:9.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('tailles', nargs='*', default=['petite', 'moyenne'], choices=list(TAILLES))
+    parser.add_argument('--enregistrer', action='store_true', help="Remplace la référence des tailles mesurées")
+    parser.add_argument('--resultats', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Processus enfant : une taille, DATA_DIR positionné par le parent
+    if args.resultats:
+        with open(args.resultats, 'w', encoding='utf-8') as fichier:
+            json.dump(mesurer_taille(args.tailles[0]), fichier)
+        return
+
+    reference = {}
+    if os.path.exists(FICHIER_REFERENCE):
+        with open(FICHIER_REFERENCE, encoding='utf-8') as fichier:
+            reference = json.load(fichier)
+
+    toutes_regressions = []
+    for taille in args.tailles:
+        dossier = preparer_base(taille)
+        sortie = os.path.join(tempfile.mkdtemp(), 'resultats.json')
+        subprocess.run([sys.executable, os.path.abspath(__file__), taille, '--resultats', sortie],
+                       env=dict(os.environ, DATA_DIR=dossier), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(sortie, encoding='utf-8') as fichier:
+            mesures = json.load(fichier)
+        afficher(taille, mesures)
+        if args.enregistrer:
+            reference[taille] = mesures
+        else:
+            toutes_regressions += [f"[{taille}] {e}" for e in regressions(mesures, reference.get(taille, {}))]
+
+    if args.enregistrer:
+        with open(FICHIER_REFERENCE, 'w', encoding='utf-8') as fichier:
+            json.dump(reference, fichier, indent=2, ensure_ascii=False)
+        print(f"\nRéférence enregistrée : {FICHIER_REFERENCE}")
+    elif toutes_regressions:
+        print("\nRégressions :")
+        for ecart in toutes_regressions:
+            print(f"  {ecart}")
+        sys.exit(1)
+    else:
+        print("\nAucune régression par rapport à la référence")
+
+if __name__ == "__main__":
+    main()
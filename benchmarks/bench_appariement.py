@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'appariement projets / entrepreneurs SEAOP
+
+Sur une base temporaire d'entrepreneurs synthétiques (RTA du Québec, 1 à 4
+types de projets, une part desservant une région entière ou toutes les zones),
+mesure :
+- l'indexation initiale (reprise) ;
+- la résolution des entrepreneurs admissibles par projet ;
+- la diffusion des notifications (INSERT ... SELECT) par projet.
+
+Usage : python benchmarks/bench_appariement.py [nombre_d_entrepreneurs]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import appariement_leads
+
+TYPES = ["Rénovation cuisine", "Rénovation salle de bain", "Toiture", "Revêtement extérieur",
+         "Plancher", "Peinture", "Agrandissement", "Électricité", "Plomberie",
+         "Chauffage/Climatisation", "Isolation", "Fenêtres et portes", "Maçonnerie",
+         "Charpenterie", "Autre"]
+
+def generer_rta(rng, nombre):
+    """RTA synthétiques des régions postales du Québec (G, H, J)"""
+    lettres = np.array(list('ABCEGHJKLMNPRSTVWXYZ'))
+    return [
+        f"{rng.choice(['G', 'H', 'J'])}{rng.integers(0, 10)}{rng.choice(lettres)}"
+        for _ in range(nombre)
+    ]
+
+def preparer_base(nombre: int, rng) -> str:
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('''
+        CREATE TABLE entrepreneurs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, nom_entreprise TEXT,
+            zones_desservies TEXT, types_projets TEXT, statut TEXT DEFAULT 'actif'
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, utilisateur_type TEXT NOT NULL,
+            utilisateur_id INTEGER NOT NULL, type_notification TEXT NOT NULL,
+            titre TEXT NOT NULL, message TEXT NOT NULL, lien_id INTEGER,
+            lu BOOLEAN DEFAULT 0, date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    rta = generer_rta(rng, 1500)
+    lignes = []
+    for i in range(nombre):
+        tirage = rng.random()
+        if tirage < 0.01:
+            zones = ''
+        elif tirage < 0.05:
+            zones = str(rng.choice(['G', 'H', 'J']))
+        else:
+            zones = ', '.join(rng.choice(rta, rng.integers(1, 9)))
+        types = ','.join(rng.choice(TYPES, rng.integers(1, 5), replace=False))
+        lignes.append((f"Entreprise {i}", zones, types))
+    conn.executemany(
+        "INSERT INTO entrepreneurs (nom_entreprise, zones_desservies, types_projets) VALUES (?, ?, ?)", lignes
+    )
+    conn.commit()
+    conn.close()
+    return chemin, rta
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = np.random.default_rng(42)
+    appariement_leads.DATABASE_PATH, rta = preparer_base(nombre, rng)
+
+    debut = time.perf_counter()
+    appariement_leads.assurer_index_appariement()
+    duree_index = time.perf_counter() - debut
+
+    projets = [(f"{rng.choice(rta)} 1A1", str(rng.choice(TYPES))) for _ in range(1000)]
+
+    conn = sqlite3.connect(appariement_leads.DATABASE_PATH)
+    cursor = conn.cursor()
+    requetes = [appariement_leads._requete_admissibles(cp, t) for cp, t in projets]
+
+    debut = time.perf_counter()
+    admissibles = [cursor.execute(requete, parametres).fetchall() for requete, parametres in requetes]
+    duree_resolution = (time.perf_counter() - debut) / len(projets)
+
+    debut = time.perf_counter()
+    notifies = 0
+    for lead_id, (cp, t) in enumerate(projets, 1):
+        notifies += appariement_leads.notifier_entrepreneurs_admissibles(cursor, lead_id, cp, t)
+    conn.commit()
+    duree_diffusion = (time.perf_counter() - debut) / len(projets)
+    conn.close()
+
+    moyenne = sum(len(a) for a in admissibles) / len(admissibles)
+    assert notifies == sum(len(a) for a in admissibles)
+
+    print(f"Appariement sur {nombre:,} entrepreneurs, {len(projets):,} projets")
+    print(f"  indexation initiale           : {duree_index * 1000:9.1f} ms")
+    print(f"  résolution par projet         : {duree_resolution * 1000:9.3f} ms"
+          f"  ({moyenne:.0f} admissibles en moyenne)")
+    print(f"  diffusion par projet          : {duree_diffusion * 1000:9.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de charge des pages SEAOP : durée des reruns Streamlit
+
+Des utilisateurs simulés (8 par défaut) rejouent en parallèle des parcours
+réalistes sur app_v2.py par streamlit.testing (AppTest), navigation par le
+menu latéral comprise, contre une copie d'une base générée par
+generer_donnees :
+- client : publie un projet, puis consulte ses appels d'offres ;
+- entrepreneur : se connecte, parcourt les projets et dépose une soumission ;
+- administrateur : se connecte et ouvre chaque section du panel ;
+- chat : ouvre le Chat Room et le relance à intervalles (sondage).
+
+Rapporte, par page et action, les centiles 50/95/99 de la durée des reruns
+et les erreurs de page, puis les attentes de verrou SQLite : durée des
+instructions qui prennent le verrou d'écriture (BEGIN IMMEDIATE, première
+écriture d'une transaction implicite), seules à pouvoir attendre un autre
+écrivain en journal WAL, et nombre d'erreurs « database is locked ».
+
+Chaque utilisateur simulé a son propre processus : AppTest installe un
+Runtime et une configuration globaux le temps d'un rerun et ne peut pas
+exécuter deux scripts à la fois dans un même processus. Chaque processus a
+donc aussi son écrivain unique : le verrou d'écriture est disputé comme
+entre plusieurs répliques du serveur, ce qui majore les attentes par
+rapport à un serveur unique.
+
+Usage : python benchmarks/bench_charge_pages.py [utilisateurs] [--taille petite] [--duree 60]
+        [--reflexion 0.5] [--graine 42]
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_acces_donnees import TAILLES, preparer_base
+from generer_donnees import MOT_DE_PASSE_GENERE, MOTS
+
+CHEMIN_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app_v2.py')
+
+# Répartition des rôles, attribués à tour de rôle aux utilisateurs simulés
+ROLES = ['entrepreneur', 'client', 'chat', 'entrepreneur', 'admin', 'chat', 'client', 'entrepreneur']
+
+# Relances du Chat Room par visite, et attente (secondes) entre deux relances
+SONDAGES_CHAT = 5
+INTERVALLE_SONDAGE = 2.0
+
+DELAI_RERUN = 300
+
+_connecter = sqlite3.connect
+
+class Mesures:
+    """Durées de reruns par page et attentes de verrou d'un processus, fusionnables"""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.reruns = defaultdict(list)
+        self.erreurs = defaultdict(int)
+        self.messages_erreur = {}
+        self.attentes_verrou = []
+        self.verrous_occupes = 0
+
+    def rerun(self, page: str, duree: float, exceptions: list):
+        with self._verrou:
+            self.reruns[page].append(duree * 1000)
+            if exceptions:
+                self.erreurs[page] += 1
+                self.messages_erreur.setdefault(page, str(exceptions[0])[:200])
+
+    def attente(self, duree: float):
+        with self._verrou:
+            self.attentes_verrou.append(duree * 1000)
+
+    def verrou_occupe(self):
+        with self._verrou:
+            self.verrous_occupes += 1
+
+    def exporter(self) -> dict:
+        return {'reruns': dict(self.reruns), 'erreurs': dict(self.erreurs),
+                'messages_erreur': self.messages_erreur, 'attentes_verrou': self.attentes_verrou,
+                'verrous_occupes': self.verrous_occupes}
+
+    def fusionner(self, donnees: dict):
+        for page, durees in donnees['reruns'].items():
+            self.reruns[page] += durees
+        for page, nombre in donnees['erreurs'].items():
+            self.erreurs[page] += nombre
+        for page, message in donnees['messages_erreur'].items():
+            self.messages_erreur.setdefault(page, message)
+        self.attentes_verrou += donnees['attentes_verrou']
+        self.verrous_occupes += donnees['verrous_occupes']
+
+MESURES = Mesures()
+
+def _prend_verrou(connexion: sqlite3.Connection, sql: str) -> bool:
+    """Instruction qui acquiert le verrou d'écriture (et peut donc attendre un autre écrivain)"""
+    debut = sql.lstrip()[:16].upper()
+    if debut.startswith(('BEGIN IMMEDIATE', 'BEGIN EXCLUSIVE')):
+        return True
+    return not connexion.in_transaction and debut.startswith(('INSERT', 'UPDATE', 'DELETE', 'REPLACE'))
+
+def _executer(connexion: sqlite3.Connection, methode, sql: str, *args):
+    mesurer = _prend_verrou(connexion, sql)
+    debut = time.perf_counter()
+    try:
+        return methode(sql, *args)
+    except sqlite3.OperationalError as e:
+        if 'locked' in str(e):
+            MESURES.verrou_occupe()
+        raise
+    finally:
+        if mesurer:
+            MESURES.attente(time.perf_counter() - debut)
+
+class CurseurMesure(sqlite3.Cursor):
+    def execute(self, sql, *args):
+        return _executer(self.connection, super().execute, sql, *args)
+
+    def executemany(self, sql, *args):
+        return _executer(self.connection, super().executemany, sql, *args)
+
+class ConnexionMesuree(sqlite3.Connection):
+    def cursor(self, factory=CurseurMesure):
+        return super().cursor(factory)
+
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+def _connecter_mesure(*args, **kwargs):
+    kwargs.setdefault('factory', ConnexionMesuree)
+    return _connecter(*args, **kwargs)
+
+class Session:
+    """Un utilisateur simulé : une AppTest, ses reruns chronométrés"""
+
+    def __init__(self, rng, reflexion: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = rng
+        self.reflexion = reflexion
+        self.at = AppTest.from_file(CHEMIN_APP, default_timeout=DELAI_RERUN)
+
+    def pause(self, duree: float = None):
+        time.sleep(self.rng.exponential(self.reflexion) if duree is None else duree)
+
+    def rerun(self, page: str, action=None):
+        """Exécute un rerun (action qui modifie un widget et relance, ou simple relance) et le chronomètre"""
+        debut = time.perf_counter()
+        (action or self.at.run)()
+        MESURES.rerun(page, time.perf_counter() - debut, [e.value for e in self.at.exception])
+        self.pause()
+
+    def menu(self, libelle: str, page: str):
+        bouton = [b for b in self.at.sidebar.button if b.label == libelle][0]
+        self.rerun(page, lambda: bouton.click().run())
+
+    def bouton(self, libelle: str, page: str, rang: int = 0):
+        boutons = [b for b in self.at.button if b.label == libelle]
+        if len(boutons) > rang:
+            self.rerun(page, lambda: boutons[rang].click().run())
+            return True
+        return False
+
+def parcours_client(session: Session, profil: dict):
+    at = session.at
+    session.rerun('accueil')
+    session.menu("📝 Publier un appel d'offres", 'publier (formulaire)')
+    mots = ' '.join(MOTS[i] for i in session.rng.integers(0, len(MOTS), 25))
+    at.text_input[0].set_value(profil['nom'])
+    at.text_input[1].set_value("514-555-0101")
+    at.text_input[2].set_value(profil['email'])
+    at.text_input[3].set_value(profil['code_postal'])
+    at.text_area[0].set_value(f"Travaux demandés : {mots}")
+    at.checkbox[-1].check()
+    for selection in at.selectbox[:3]:
+        selection.set_value(selection.options[1 + int(session.rng.integers(0, len(selection.options) - 1))])
+    session.bouton("🚀 Publier mon projet", 'publier (envoi)')
+    at.session_state['client_email'] = profil['email']
+    session.menu("📋 Mes appels d'offres", "mes appels d'offres")
+
+def parcours_entrepreneur(session: Session, profil: dict):
+    at = session.at
+    session.rerun('accueil')
+    session.menu("🏢 Espace Entrepreneurs", 'entrepreneurs (connexion)')
+    if at.session_state['entrepreneur_connecte'] is None:
+        [t for t in at.text_input if t.label == "Email"][0].set_value(profil['email'])
+        [t for t in at.text_input if t.label == "Mot de passe"][0].set_value(MOT_DE_PASSE_GENERE)
+        session.bouton("🔐 Se connecter", 'entrepreneurs (connexion)')
+    session.rerun('entrepreneurs (projets)')
+
+    # Soumission sur un des projets proposés (formulaires dans l'ordre des projets affichés)
+    montants = [n for n in at.number_input if n.key and n.key.startswith('montant_')]
+    if montants:
+        rang = int(session.rng.integers(0, len(montants)))
+        projet_id = montants[rang].key.split('_', 1)[1]
+        montants[rang].set_value(float(session.rng.integers(20, 400)) * 100)
+        at.text_input(key=f"delai_{projet_id}").set_value("3 semaines")
+        at.text_area(key=f"travaux_{projet_id}").set_value("Travaux selon les plans, matériaux inclus.")
+        session.bouton("📤 Envoyer ma soumission", 'entrepreneurs (soumission)', rang)
+
+def parcours_admin(session: Session, profil: dict):
+    at = session.at
+    session.rerun('accueil')
+    session.menu("⚙️ Panel d'administration", 'admin (connexion)')
+    if not at.session_state['admin_connecte']:
+        [t for t in at.text_input if t.label == "Mot de passe administrateur"][0].set_value(
+            os.getenv('ADMIN_PASSWORD', 'admin123'))
+        session.bouton("🔐 Se connecter", 'admin (connexion)')
+    sections = [r for r in at.radio if r.key == 'admin_section']
+    for section in (sections[0].options if sections else []):
+        radio = [r for r in at.radio if r.key == 'admin_section'][0]
+        session.rerun(f"admin : {section}", lambda: radio.set_value(section).run())
+
+def parcours_chat(session: Session, profil: dict):
+    session.at.session_state['client_email'] = profil['email']
+    session.at.session_state['client_nom'] = profil['nom']
+    session.rerun('accueil')
+    session.menu("💬 Chat Room Public", 'chat (ouverture)')
+    for _ in range(SONDAGES_CHAT):
+        session.pause(INTERVALLE_SONDAGE)
+        session.rerun('chat (sondage)')
+
+PARCOURS = {
+    'client': parcours_client,
+    'entrepreneur': parcours_entrepreneur,
+    'admin': parcours_admin,
+    'chat': parcours_chat,
+}
+
+def profils(chemin: str, nombre: int, rng) -> list:
+    """Un profil par utilisateur simulé : client existant (courriel, code postal) et entrepreneur existant"""
+    conn = _connecter(chemin)
+    clients = conn.execute('SELECT nom, email, code_postal FROM leads ORDER BY id LIMIT 1000').fetchall()
+    entrepreneurs = conn.execute('SELECT email FROM entrepreneurs ORDER BY id').fetchall()
+    conn.close()
+    resultat = []
+    for i in range(nombre):
+        nom, email, code_postal = clients[int(rng.integers(0, len(clients)))]
+        resultat.append({'role': ROLES[i % len(ROLES)], 'nom': nom, 'email': email, 'code_postal': code_postal,
+                         'entrepreneur': entrepreneurs[i % len(entrepreneurs)][0]})
+    return resultat
+
+def utilisateur(profil: dict, graine: int, fin: float, reflexion: float) -> dict:
+    """Processus d'un utilisateur : nouvelles sessions du même parcours jusqu'à la fin du test"""
+    sqlite3.connect = _connecter_mesure
+    rng = np.random.default_rng(graine)
+    if profil['role'] == 'entrepreneur':
+        profil = dict(profil, email=profil['entrepreneur'])
+    while time.time() < fin:
+        try:
+            PARCOURS[profil['role']](Session(rng, reflexion), profil)
+        except Exception:
+            MESURES.rerun(f"{profil['role']} (parcours interrompu)", 0.0, [traceback.format_exc(limit=3)])
+    return MESURES.exporter()
+
+def preparer_copie(taille: str) -> str:
+    """Copie de travail de la base générée : les parcours y écrivent ; retourne son dossier"""
+    source = os.path.join(preparer_base(taille), 'seaop.db')
+    conn = _connecter(source)
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conn.close()
+    dossier = tempfile.mkdtemp()
+    shutil.copy(source, os.path.join(dossier, 'seaop.db'))
+    return dossier
+
+def centiles(valeurs: list) -> tuple:
+    return tuple(float(np.percentile(valeurs, p)) for p in (50, 95, 99)) + (max(valeurs),)
+
+def rapport(duree: float):
+    print(f"\nReruns par page ({duree:.0f} s)")
+    print(f"  {'page':48s} {'reruns':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s} {'erreurs':>8s}")
+    for page in sorted(MESURES.reruns):
+        durees = MESURES.reruns[page]
+        p50, p95, p99, maximum = centiles(durees)
+        print(f"  {page[:48]:48s} {len(durees):7d} {p50:9.1f} {p95:9.1f} {p99:9.1f} {maximum:9.1f} "
+              f"{MESURES.erreurs[page]:8d}")
+    for page, message in MESURES.messages_erreur.items():
+        print(f"\n  Première erreur, {page} :\n    {message}")
+
+    print("\nVerrou d'écriture SQLite")
+    if MESURES.attentes_verrou:
+        p50, p95, p99, maximum = centiles(MESURES.attentes_verrou)
+        print(f"  {len(MESURES.attentes_verrou)} acquisitions, {sum(MESURES.attentes_verrou):.0f} ms au total ; "
+              f"p50 {p50:.2f} ms, p95 {p95:.2f} ms, p99 {p99:.2f} ms, max {maximum:.1f} ms")
+    else:
+        print("  Aucune acquisition")
+    print(f"  Erreurs « database is locked » : {MESURES.verrous_occupes}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('utilisateurs', nargs='?', type=int, default=8)
+    parser.add_argument('--taille', default='petite', choices=list(TAILLES))
+    parser.add_argument('--duree', type=float, default=60.0, help="Durée du test (secondes)")
+    parser.add_argument('--reflexion', type=float, default=0.5, help="Pause moyenne entre deux actions (secondes)")
+    parser.add_argument('--graine', type=int, default=42)
+    args = parser.parse_args()
+
+    # Les modules de l'application lisent DATA_DIR à l'import : hérité par les processus
+    dossier = preparer_copie(args.taille)
+    os.environ['DATA_DIR'] = dossier
+
+    rng = np.random.default_rng(args.graine)
+    liste_profils = profils(os.path.join(dossier, 'seaop.db'), args.utilisateurs, rng)
+    print(f"{args.utilisateurs} utilisateurs, base {args.taille} ({TAILLES[args.taille]['nb_leads']:,} projets), "
+          f"{args.duree:.0f} s")
+    debut = time.time()
+    fin = debut + args.duree
+    with multiprocessing.get_context('spawn').Pool(args.utilisateurs) as pool:
+        for donnees in pool.starmap(utilisateur, [(profil, args.graine + i, fin, args.reflexion)
+                                                  for i, profil in enumerate(liste_profils)]):
+            MESURES.fusionner(donnees)
+    rapport(time.time() - debut)
+    shutil.rmtree(dossier, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la détection des republications SEAOP (MinHash / LSH)
+
+Sur une base temporaire de projets aux descriptions synthétiques (1 000 000
+par défaut), mesure :
+- la construction de l'index par la reprise indexer_leads_existants
+  (fragments, signatures, écriture des bandes), et la part des signatures ;
+- la consultation à la publication (detecter_doublon), comparée à la
+  comparaison de la signature avec celles de tous les projets.
+
+Usage : python benchmarks/bench_doublons.py [nombre_de_projets]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import doublons_leads as dl
+from bench_similarite import generer_projets
+
+def preparer_base(nombre: int, rng) -> str:
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, email TEXT, telephone TEXT, code_postal TEXT,
+            description TEXT, numero_reference TEXT,
+            visible_entrepreneurs BOOLEAN DEFAULT 1, accepte_soumissions BOOLEAN DEFAULT 1
+        )
+    ''')
+    for debut in range(0, nombre, 100_000):
+        projets = generer_projets(min(100_000, nombre - debut), rng)
+        conn.executemany(
+            'INSERT INTO leads (email, description) VALUES (?, ?)',
+            [(f"client{debut + i}@exemple.ca", description) for i, (_, description) in enumerate(projets)]
+        )
+    conn.commit()
+    conn.close()
+    dl.DATABASE_PATH = chemin
+    return chemin
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(42)
+    preparer_base(nombre, rng)
+    print(f"Index MinHash / LSH de {nombre:,} projets")
+
+    conn = sqlite3.connect(dl.DATABASE_PATH)
+    echantillon = [r[0] for r in conn.execute('SELECT description FROM leads LIMIT 100000')]
+    conn.close()
+    debut = time.perf_counter()
+    dl.signatures([dl.fragments(d) for d in echantillon])
+    duree_signatures = (time.perf_counter() - debut) / len(echantillon) * nombre
+
+    debut = time.perf_counter()
+    assert dl.indexer_leads_existants(taille_lot=50_000) == nombre
+    duree_construction = time.perf_counter() - debut
+    print(f"  construction (reprise) : {duree_construction:8.1f} s"
+          f"  (dont fragments et signatures ≈ {duree_signatures:.1f} s)")
+
+    # Republications : description d'un projet existant, deux mots remplacés, même courriel
+    conn = sqlite3.connect(dl.DATABASE_PATH)
+    cursor = conn.cursor()
+    references = rng.integers(1, nombre + 1, 200)
+    trouves, durees = 0, []
+    for lead_id in references.tolist():
+        email, description = cursor.execute('SELECT email, description FROM leads WHERE id = ?', (lead_id,)).fetchone()
+        mots = description.split()
+        mots[3], mots[-2] = 'ceramique', 'thermopompe'
+        retouchee = ' '.join(mots)
+        debut = time.perf_counter()
+        cursor.execute('INSERT INTO leads (email, description) VALUES (?, ?)', (email, retouchee))
+        original = dl.detecter_doublon(cursor, cursor.lastrowid, retouchee, email, None, None)
+        durees.append(time.perf_counter() - debut)
+        conn.rollback()
+        trouves += original is not None and original['id'] == lead_id
+    print(f"  publication + LSH      : {np.median(durees) * 1000:8.3f} ms (médiane)"
+          f"  ({trouves}/{len(references)} republications retrouvées)")
+
+    signature = dl.signatures([dl.fragments(retouchee)])[0]
+    debut = time.perf_counter()
+    toutes = np.frombuffer(b''.join(r[0] for r in cursor.execute('SELECT signature FROM lead_minhash')),
+                           dtype=np.uint32).reshape(-1, dl.NOMBRE_HACHAGES)
+    similaires = np.flatnonzero((toutes == signature).mean(axis=1) >= dl.SEUIL_DOUBLON)
+    duree_balayage = time.perf_counter() - debut
+    conn.close()
+    print(f"  comparaison à tous     : {duree_balayage * 1000:8.1f} ms  ({len(similaires)} similaires)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark des écritures concurrentes SEAOP (écrivain unique, validation par groupes)
+
+Des sessions simultanées (16 fils par défaut) écrivent chacune des
+notifications pendant que 4 fils lisent en continu. Trois configurations :
+- journal classique, une connexion et une validation par écriture (l'existant) ;
+- journal WAL, une connexion et une validation par écriture ;
+- journal WAL, écrivain unique (base_donnees.executer_ecriture).
+Mesure le débit d'écriture, la latence par écriture (médiane, 99e centile)
+et le nombre de lectures effectuées pendant ce temps.
+
+Usage : python benchmarks/bench_ecritures.py [sessions] [ecritures_par_session]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import base_donnees
+
+NOMBRE_LECTEURS = 4
+
+def preparer_base(wal: bool) -> str:
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('''
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, utilisateur_type TEXT, utilisateur_id INTEGER,
+            type_notification TEXT, titre TEXT, message TEXT, lu BOOLEAN DEFAULT 0,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_notifications_utilisateur ON notifications(utilisateur_type, utilisateur_id)')
+    conn.commit()
+    conn.close()
+    if wal:
+        base_donnees.activer_wal(chemin)
+    return chemin
+
+PARAMETRES = ('entrepreneur', 7, 'nouveau_message', "💬 Nouveau message client",
+              "Vous avez reçu un nouveau message d'un client")
+SQL = '''INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, titre, message)
+         VALUES (?, ?, ?, ?, ?)'''
+
+def ecrire_directement(chemin: str):
+    """Comme creer_notification avant l'écrivain unique"""
+    conn = sqlite3.connect(chemin, timeout=60)
+    conn.execute(SQL, PARAMETRES)
+    conn.commit()
+    conn.close()
+
+def ecrire_par_ecrivain(chemin: str):
+    base_donnees.executer_sql(SQL, PARAMETRES, chemin=chemin)
+
+def mesurer(nom: str, ecriture, wal: bool, sessions: int, ecritures: int):
+    chemin = preparer_base(wal)
+    latences = [[] for _ in range(sessions)]
+    lectures = [0] * NOMBRE_LECTEURS
+    fin = threading.Event()
+
+    def session(numero):
+        for _ in range(ecritures):
+            debut = time.perf_counter()
+            ecriture(chemin)
+            latences[numero].append(time.perf_counter() - debut)
+
+    def lecteur(numero):
+        conn = sqlite3.connect(chemin, timeout=60)
+        while not fin.is_set():
+            conn.execute("SELECT COUNT(*) FROM notifications WHERE utilisateur_type = 'entrepreneur' "
+                         "AND utilisateur_id = 7 AND lu = 0").fetchone()
+            lectures[numero] += 1
+        conn.close()
+
+    lecteurs = [threading.Thread(target=lecteur, args=(n,)) for n in range(NOMBRE_LECTEURS)]
+    fils = [threading.Thread(target=session, args=(n,)) for n in range(sessions)]
+    for fil in lecteurs:
+        fil.start()
+    debut = time.perf_counter()
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    duree = time.perf_counter() - debut
+    fin.set()
+    for fil in lecteurs:
+        fil.join()
+
+    conn = sqlite3.connect(chemin)
+    total = conn.execute('SELECT COUNT(*) FROM notifications').fetchone()[0]
+    conn.close()
+    assert total == sessions * ecritures, total
+    toutes = np.concatenate([np.array(l) for l in latences]) * 1000
+    print(f"  {nom:<28} {total / duree:8.0f} écritures/s   latence {np.median(toutes):6.2f} ms"
+          f" (p99 {np.percentile(toutes, 99):6.1f} ms)   {sum(lectures) / duree:8.0f} lectures/s")
+    return chemin
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    ecritures = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{sessions} sessions x {ecritures} écritures, {NOMBRE_LECTEURS} lecteurs")
+    mesurer("journal classique, direct", ecrire_directement, False, sessions, ecritures)
+    mesurer("WAL, direct", ecrire_directement, True, sessions, ecritures)
+    chemin = mesurer("WAL, écrivain unique", ecrire_par_ecrivain, True, sessions, ecritures)
+    ecrivain = base_donnees.get_ecrivain(chemin)
+    print(f"  (écrivain unique : {ecrivain.operations / ecrivain.groupes:.1f} écritures par validation)")
+
+if __name__ == "__main__":
+    main()
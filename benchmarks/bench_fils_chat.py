@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du chargement du Chat Room SEAOP
+
+Sur une base temporaire de messages (100 000 par défaut, un tiers de
+réponses à des messages récents), compare le chargement d'une page de 50 fils :
+- avant : messages épinglés, 50 messages, puis une requête de like par
+  message affiché (sans les réponses) ;
+- charger_fils : fils, réponses, comptes et likes en une requête.
+
+Usage : python benchmarks/bench_fils_chat.py [nombre_de_messages]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import fils_chat
+from test_fils_chat import preparer_base_test
+
+def preparer_base(nombre: int, rng) -> str:
+    chemin = preparer_base_test()
+    conn = sqlite3.connect(chemin)
+    conn.execute('DELETE FROM chat_room')
+    parents = [None if i <= 200 or rng.random() < 0.67 else i - int(rng.integers(1, 200)) for i in range(1, nombre + 1)]
+    conn.executemany('''
+        INSERT INTO chat_room (user_type, user_name, user_email, message, parent_id, created_at)
+        VALUES ('client', 'Client', ?, 'Question sur les travaux', ?, datetime('2025-01-01', ? || ' minutes'))
+    ''', [(f"client{i % 500}@exemple.ca", parent, i) for i, parent in enumerate(parents, start=1)])
+    conn.executemany('INSERT OR IGNORE INTO chat_room_likes (message_id, user_email) VALUES (?, ?)',
+                     [(int(m), f"client{int(u)}@exemple.ca")
+                      for m, u in zip(rng.integers(1, nombre, nombre // 2), rng.integers(0, 500, nombre // 2))])
+    conn.commit()
+    conn.close()
+    fils_chat.assurer_index_fils(chemin)
+    return chemin
+
+def page_avant(chemin: str, email: str):
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM chat_room WHERE is_deleted = 0 AND is_pinned = 1 ORDER BY created_at DESC')
+    messages = cursor.fetchall()
+    cursor.execute('SELECT * FROM chat_room WHERE is_deleted = 0 AND is_pinned = 0 ORDER BY created_at DESC LIMIT 50')
+    messages += cursor.fetchall()
+    for message in messages:
+        cursor.execute('SELECT COUNT(*) FROM chat_room_likes WHERE message_id = ? AND user_email = ?',
+                       (message[0], email))
+        cursor.fetchone()
+    conn.close()
+
+def mesurer(fonction, repetitions: int = 50) -> float:
+    durees = []
+    for i in range(repetitions):
+        debut = time.perf_counter()
+        fonction(f"client{i}@exemple.ca")
+        durees.append(time.perf_counter() - debut)
+    return float(np.median(durees)) * 1000
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(42)
+    chemin = preparer_base(nombre, rng)
+    fils = fils_chat.charger_fils(chemin=chemin)
+    print(f"Page de 50 fils sur {nombre:,} messages"
+          f" ({sum(f['nb_reponses'] for f in fils)} réponses dans la page)")
+    print(f"  avant (sans réponses)   : {mesurer(lambda e: page_avant(chemin, e)):8.2f} ms")
+    print(f"  charger_fils (replié)   : {mesurer(lambda e: fils_chat.charger_fils(e, chemin=chemin)):8.2f} ms")
+    ouverts = [f['message']['id'] for f in fils[:5]]
+    print(f"  charger_fils (5 dépliés): "
+          f"{mesurer(lambda e: fils_chat.charger_fils(e, fils_ouverts=ouverts, chemin=chemin)):8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du temps d'import des modules de l'application SEAOP
+
+Chaque module est importé dans un processus neuf par python -X importtime,
+REPETITIONS fois : app_v2 (routeur, ce que paie le démarrage à froid avant
+la première page), la couche d'accès aux données et chacun des modules de
+pages, importés par le routeur à la première navigation. Pour chaque module :
+- temps d'import cumulé (médiane), dépendances comprises ;
+- nombre de modules chargés par l'import ;
+- modules lourds chargés (streamlit, numpy, pandas, PIL).
+
+Les résultats sont comparés à la référence enregistrée (reference_import.json) :
+un temps au-delà de la tolérance, ou un module lourd qui n'était pas chargé
+(pandas tiré par le routeur par exemple), sont signalés et le code de sortie
+vaut 1. --enregistrer remplace la référence (machine de référence : celle
+qui exécute le benchmark).
+
+Usage : python benchmarks/bench_import.py [module ...] [--enregistrer]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+FICHIER_REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reference_import.json')
+
+MODULES = ['app_v2', 'acces_donnees', 'pages_clients', 'pages_entrepreneurs', 'pages_administration',
+           'pages_services']
+
+MODULES_LOURDS = ['streamlit', 'numpy', 'pandas', 'PIL']
+
+REPETITIONS = 7
+
+# Au-delà, une mesure est une régression ; les écarts de moins de SEUIL_MS sont du bruit
+TOLERANCE = 0.25
+SEUIL_MS = 30
+
+_LIGNE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+def importer(module: str, data_dir: str) -> dict:
+    """Un import dans un processus neuf : temps cumulé du module, modules chargés"""
+    processus = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import sys; sys.path.insert(0, {RACINE!r}); import {module}"],
+        cwd=RACINE, env=dict(os.environ, DATA_DIR=data_dir), capture_output=True, text=True, check=True)
+    cumule_us, charges = None, []
+    for ligne in processus.stderr.splitlines():
+        correspondance = _LIGNE.match(ligne)
+        if not correspondance:
+            continue
+        _, cumule, retrait, nom = correspondance.groups()
+        charges.append(nom)
+        # Le module importé par -c est au premier niveau (une espace, puis deux par niveau)
+        if nom == module and retrait == ' ':
+            cumule_us = int(cumule)
+    return {'cumule_ms': cumule_us / 1000, 'modules': len(charges),
+            'lourds': [lourd for lourd in MODULES_LOURDS if lourd in charges]}
+
+def mesurer(module: str, data_dir: str) -> dict:
+    # Premier import hors mesure : compilation des .pyc
+    importer(module, data_dir)
+    imports = [importer(module, data_dir) for _ in range(REPETITIONS)]
+    return {
+        'cumule_ms': round(float(np.median([i['cumule_ms'] for i in imports])), 1),
+        'modules': imports[-1]['modules'],
+        'lourds': imports[-1]['lourds'],
+    }
+
+def regressions(mesures: dict, reference: dict) -> list:
+    """Écarts au-delà de la tolérance, et modules lourds nouvellement chargés, par module"""
+    ecarts = []
+    for module, mesure in mesures.items():
+        ref = reference.get(module)
+        if not ref:
+            continue
+        if (mesure['cumule_ms'] > ref['cumule_ms'] * (1 + TOLERANCE)
+                and mesure['cumule_ms'] - ref['cumule_ms'] > SEUIL_MS):
+            ecarts.append(f"{module} : {mesure['cumule_ms']:.0f} ms (référence {ref['cumule_ms']:.0f} ms)")
+        nouveaux = [lourd for lourd in mesure['lourds'] if lourd not in ref['lourds']]
+        if nouveaux:
+            ecarts.append(f"{module} : charge désormais {', '.join(nouveaux)}")
+    return ecarts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('modules', nargs='*', default=MODULES, help=f"Parmi {', '.join(MODULES)} (défaut : tous)")
+    parser.add_argument('--enregistrer', action='store_true', help="Remplace la référence des modules mesurés")
+    args = parser.parse_args()
+    inconnus = [module for module in args.modules if module not in MODULES]
+    if inconnus:
+        parser.error(f"module inconnu : {', '.join(inconnus)}")
+
+    reference = {}
+    if os.path.exists(FICHIER_REFERENCE):
+        with open(FICHIER_REFERENCE, encoding='utf-8') as fichier:
+            reference = json.load(fichier)
+
+    # Les modules lisent DATA_DIR à l'import ; aucun n'ouvre la base
+    data_dir = tempfile.mkdtemp()
+    mesures = {}
+    print(f"{'module':24s} {'cumulé ms':>10s} {'modules':>8s}  lourds")
+    for module in args.modules:
+        mesures[module] = mesurer(module, data_dir)
+        m = mesures[module]
+        print(f"{module:24s} {m['cumule_ms']:10.0f} {m['modules']:8d}  {', '.join(m['lourds']) or '-'}")
+
+    if args.enregistrer:
+        reference.update(mesures)
+        with open(FICHIER_REFERENCE, 'w', encoding='utf-8') as fichier:
+            json.dump(reference, fichier, indent=2, ensure_ascii=False)
+        print(f"\nRéférence enregistrée : {FICHIER_REFERENCE}")
+        return
+
+    ecarts = regressions(mesures, reference)
+    if ecarts:
+        print("\nRégressions :")
+        for ecart in ecarts:
+            print(f"  {ecart}")
+        sys.exit(1)
+    print("\nAucune régression par rapport à la référence")
+
+if __name__ == "__main__":
+    main()
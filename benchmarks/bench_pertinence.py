@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du classement des projets par pertinence SEAOP
+
+Sur une base temporaire de projets ouverts synthétiques, mesure :
+- le chargement initial de la matrice de caractéristiques ;
+- l'intégration incrémentale de nouveaux projets et soumissions ;
+- le score de tous les projets et la sélection des 50 meilleurs,
+  comparés au tri complet en Python.
+
+Usage : python benchmarks/bench_pertinence.py [nombre_de_projets]
+"""
+
+import datetime
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pertinence_projets
+from bench_appariement import TYPES, generer_rta
+
+def preparer_base(nombre: int, rng) -> str:
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, type_projet TEXT, code_postal TEXT,
+            niveau_urgence TEXT, date_limite_soumissions DATE,
+            visible_entrepreneurs BOOLEAN DEFAULT 1, accepte_soumissions BOOLEAN DEFAULT 1
+        )
+    ''')
+    conn.execute('CREATE TABLE soumissions (id INTEGER PRIMARY KEY AUTOINCREMENT, lead_id INTEGER)')
+    conn.execute('CREATE INDEX idx_soumissions_lead ON soumissions(lead_id)')
+    rta = generer_rta(rng, 1500)
+    aujourd_hui = datetime.date.today()
+    conn.executemany(
+        "INSERT INTO leads (type_projet, code_postal, niveau_urgence, date_limite_soumissions) VALUES (?, ?, ?, ?)",
+        [
+            (str(rng.choice(TYPES)), f"{rng.choice(rta)} 1A1",
+             str(rng.choice(['faible', 'normal', 'eleve', 'critique'])),
+             (aujourd_hui + datetime.timedelta(days=int(rng.integers(-5, 60)))).isoformat())
+            for _ in range(nombre)
+        ]
+    )
+    conn.executemany("INSERT INTO soumissions (lead_id) VALUES (?)",
+                     [(int(i),) for i in rng.integers(1, nombre + 1, nombre // 2)])
+    conn.commit()
+    conn.close()
+    return chemin
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(42)
+    pertinence_projets.DATABASE_PATH = preparer_base(nombre, rng)
+    zones, types = 'H2B, H2C, H3A, J4*', 'Toiture,Plancher,Peinture'
+
+    debut = time.perf_counter()
+    matrice = pertinence_projets.get_matrice_projets()
+    duree_chargement = time.perf_counter() - debut
+
+    conn = sqlite3.connect(pertinence_projets.DATABASE_PATH)
+    conn.executemany("INSERT INTO leads (type_projet, code_postal, niveau_urgence) VALUES (?, ?, ?)",
+                     [('Toiture', 'H2B 1A1', 'normal')] * 20)
+    conn.executemany("INSERT INTO soumissions (lead_id) VALUES (?)",
+                     [(int(i),) for i in rng.integers(1, nombre + 1, 100)])
+    conn.commit()
+    conn.close()
+    debut = time.perf_counter()
+    pertinence_projets.get_matrice_projets()
+    duree_increment = time.perf_counter() - debut
+
+    repetitions = 20
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        meilleurs = pertinence_projets.selectionner_meilleurs(
+            matrice.ids, pertinence_projets.calculer_scores(matrice, zones, types), 50
+        )
+    duree_classement = (time.perf_counter() - debut) / repetitions
+
+    scores = pertinence_projets.calculer_scores(matrice, zones, types)
+    debut = time.perf_counter()
+    tri_complet = sorted(zip(matrice.ids.tolist(), scores.tolist()), key=lambda x: (-x[1], -x[0]))[:50]
+    duree_tri = time.perf_counter() - debut
+    assert meilleurs == tri_complet
+
+    print(f"Classement de {len(matrice.ids):,} projets ouverts")
+    print(f"  chargement initial de la matrice : {duree_chargement * 1000:9.1f} ms")
+    print(f"  incrément (20 projets, 100 soum.): {duree_increment * 1000:9.1f} ms")
+    print(f"  score + 50 meilleurs (NumPy)     : {duree_classement * 1000:9.1f} ms")
+    print(f"  tri complet Python (scores faits): {duree_tri * 1000:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la présence du Chat Room SEAOP
+
+Pour une table de présence de 10 000 utilisateurs (dont une centaine en
+ligne), compare le coût par affichage du chat :
+- avant : INSERT OR REPLACE validé puis balayage datetime(last_seen) ;
+- registre : battement en mémoire puis liste en mémoire ;
+et la persistance périodique du registre (tous les battements d'un
+intervalle en une écriture).
+
+Usage : python benchmarks/bench_presence.py [affichages]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import presence_chat
+
+def preparer_base() -> str:
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    presence_chat.assurer_table_presence(chemin)
+    conn = sqlite3.connect(chemin)
+    conn.executemany('''
+        INSERT INTO chat_room_online (user_type, user_name, user_email, last_seen)
+        VALUES ('client', ?, ?, datetime('now', ?))
+    ''', [(f"Client {i}", f"client{i}@exemple.ca", f"-{i % 100 if i < 100 else 600 + i} minutes")
+          for i in range(10_000)])
+    conn.commit()
+    conn.close()
+    return chemin
+
+def affichage_avant(chemin: str, email: str):
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT OR REPLACE INTO chat_room_online (user_type, user_name, user_email, last_seen)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ''', ('client', 'Client', email))
+    conn.commit()
+    cursor.execute('''
+        SELECT user_type, user_name, user_email FROM chat_room_online
+        WHERE datetime(last_seen) > datetime('now', '-5 minutes')
+        ORDER BY last_seen DESC LIMIT 20
+    ''')
+    cursor.fetchall()
+    conn.close()
+
+def main():
+    affichages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    chemin = preparer_base()
+    emails = [f"client{i % 100}@exemple.ca" for i in range(affichages)]
+    print(f"{affichages} affichages du chat, 10 000 présences en table")
+
+    debut = time.perf_counter()
+    for email in emails:
+        affichage_avant(chemin, email)
+    duree = time.perf_counter() - debut
+    print(f"  avant (écriture + balayage) : {duree / affichages * 1000:8.3f} ms par affichage")
+
+    registre = presence_chat.RegistrePresence(chemin)
+    registre.persister()
+    debut = time.perf_counter()
+    for email in emails:
+        registre.battement('client', 'Client', email)
+        registre.en_ligne(limite=20)
+    duree = time.perf_counter() - debut
+    print(f"  registre (mémoire)          : {duree / affichages * 1000:8.3f} ms par affichage")
+
+    debut = time.perf_counter()
+    lignes = registre.persister()
+    print(f"  persistance périodique      : {(time.perf_counter() - debut) * 1000:8.1f} ms"
+          f" ({lignes} lignes pour {affichages} battements)")
+
+if __name__ == "__main__":
+    main()
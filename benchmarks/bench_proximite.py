@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la recherche de projets par rayon SEAOP
+
+Sur une base temporaire de projets répartis dans les RTA réelles du Québec
+(centroïdes de donnees/centroides_rta.csv), compare pour « projets à moins de
+40 km » autour d'une zone dense (H2B, Montréal) et d'une zone peu
+dense (G5L, Rimouski) :
+- la lecture de tous les projets et le calcul de distance ligne par ligne ;
+- l'élagage par grille des centroïdes suivi d'une requête sur l'index RTA.
+
+Usage : python benchmarks/bench_proximite.py [nombre_de_projets]
+"""
+
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import proximite_projets as pp
+
+def preparer_base(nombre: int, rng) -> str:
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, code_postal TEXT NOT NULL, type_projet TEXT,
+            visible_entrepreneurs BOOLEAN DEFAULT 1, accepte_soumissions BOOLEAN DEFAULT 1
+        )
+    ''')
+    conn.commit()
+    conn.close()
+    pp.DATABASE_PATH = chemin
+    grille = pp.get_grille_centroides()
+    rta_quebec = [r for r in grille.rta.tolist() if r[0] in 'GHJ']
+    conn = sqlite3.connect(chemin)
+    conn.executemany("INSERT INTO leads (code_postal, type_projet) VALUES (?, 'Toiture')",
+                     [(f"{rta} 1A1",) for rta in rng.choice(rta_quebec, nombre)])
+    conn.commit()
+    conn.close()
+    return chemin
+
+def distance_python(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * pp.RAYON_TERRE_KM * math.asin(math.sqrt(a))
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(42)
+    preparer_base(nombre, rng)
+    grille = pp.get_grille_centroides()
+    conn = sqlite3.connect(pp.DATABASE_PATH)
+    rayon = 40.0
+    print(f"Projets à moins de {rayon:.0f} km parmi {nombre:,}")
+
+    # Montréal (zone dense) puis Rimouski (zone peu dense)
+    for origine in ('H2B', 'G5L'):
+        lat, lon = grille.centroide(origine)
+
+        def balayage():
+            retenus = []
+            for id_, code_postal in conn.execute("SELECT id, code_postal FROM leads WHERE visible_entrepreneurs = 1"):
+                centre = grille.centroide(pp.normaliser_rta(code_postal))
+                if centre and distance_python(lat, lon, centre[0], centre[1]) <= rayon:
+                    retenus.append(id_)
+            return retenus
+
+        def grille_et_index():
+            proches = pp.rta_dans_rayon(origine, rayon)
+            return [r[0] for r in conn.execute(f'''
+                SELECT l.id FROM leads l
+                WHERE l.visible_entrepreneurs = 1
+                  AND {pp.EXPRESSION_RTA_LEAD} IN ({', '.join('?' * len(proches))})
+                ORDER BY l.id
+            ''', list(proches))]
+
+        debut = time.perf_counter()
+        attendu = balayage()
+        duree_balayage = time.perf_counter() - debut
+
+        repetitions = 20
+        debut = time.perf_counter()
+        for _ in range(repetitions):
+            obtenu = grille_et_index()
+        duree_index = (time.perf_counter() - debut) / repetitions
+
+        debut = time.perf_counter()
+        for _ in range(1000):
+            candidats = grille.candidats(lat, lon, rayon)
+        duree_elagage = (time.perf_counter() - debut) / 1000
+
+        assert obtenu == attendu
+        print(f"  autour de {origine} ({len(attendu):,} projets retenus)")
+        print(f"    balayage + distance par projet : {duree_balayage * 1000:9.1f} ms")
+        print(f"    grille + index RTA             : {duree_index * 1000:9.1f} ms"
+              f"  (x{duree_balayage / duree_index:.0f})")
+        print(f"    élagage seul                   : {duree_elagage * 1e6:9.1f} µs"
+              f"  ({len(candidats)} centroïdes candidats sur {len(grille.rta)})")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
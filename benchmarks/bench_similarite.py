@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark des projets similaires SEAOP
+
+Sur une base temporaire de projets aux descriptions synthétiques, mesure :
+- la construction de l'index TF-IDF sur disque et l'ajout de 1 000 projets ;
+- une requête « projets similaires » par les listes inversées, comparée au
+  parcours de tous les vecteurs (produit creux complet).
+
+Usage : python benchmarks/bench_similarite.py [nombre_de_projets]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import projets_similaires as ps
+from bench_appariement import TYPES
+
+MOTS = '''
+    armoires comptoir quartz granit dosseret ilot evier robinetterie ceramique douche bain vanite
+    bardeaux asphalte membrane elastomere solin gouttieres soffites fascia ventilation isolation
+    laine cellulose pare vapeur gypse joints peinture apprêt plafond moulures plinthes plancher
+    bois franc flottant vinyle tapis escalier rampe balcon terrasse patio pave uni muret cloture
+    fondation fissure drain francais imperméabilisation sous sol chauffe eau thermopompe plinthes
+    electriques panneau disjoncteurs filage luminaires fenetres portes patio calfeutrage brique
+    pierre revetement canexel aluminium agrandissement garage cabanon demolition permis plans
+'''.split()
+
+# Longue traîne : marques, modèles, termes rares propres à chaque chantier
+VOCABULAIRE = MOTS + [f"materiau{i}" for i in range(5000)]
+
+def preparer_base(nombre: int, rng) -> str:
+    dossier = tempfile.mkdtemp()
+    chemin = os.path.join(dossier, 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('CREATE TABLE leads (id INTEGER PRIMARY KEY AUTOINCREMENT, type_projet TEXT, description TEXT)')
+    conn.executemany('INSERT INTO leads (type_projet, description) VALUES (?, ?)', generer_projets(nombre, rng))
+    conn.commit()
+    conn.close()
+    ps.DATABASE_PATH = chemin
+    ps.DOSSIER_INDEX = os.path.join(dossier, 'index_similarite')
+    return chemin
+
+def generer_projets(nombre: int, rng) -> list:
+    # Loi de Zipf sur les mots : quelques termes très fréquents, une longue traîne
+    rangs = (rng.zipf(1.2, size=(nombre, 25)) - 1) % len(VOCABULAIRE)
+    types = rng.choice(TYPES, nombre)
+    return [(str(t), ' '.join(VOCABULAIRE[r] for r in ligne)) for t, ligne in zip(types, rangs)]
+
+def scores_parcours_complet(index, termes, poids):
+    requete = np.zeros(len(index.vocabulaire), dtype=np.float32)
+    requete[termes] = poids
+    lignes = np.repeat(np.arange(len(index.ids)), np.diff(index.ligne_ptr))
+    return np.bincount(lignes, weights=index.ligne_poids * requete[index.ligne_termes], minlength=len(index.ids))
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(42)
+    preparer_base(nombre, rng)
+    print(f"Index TF-IDF de {nombre:,} projets")
+
+    debut = time.perf_counter()
+    dimensions = ps.construire_index()
+    print(f"  construction         : {time.perf_counter() - debut:8.2f} s"
+          f"  ({dimensions['termes']} termes, {dimensions['nnz']:,} poids non nuls)")
+
+    conn = sqlite3.connect(ps.DATABASE_PATH)
+    conn.executemany('INSERT INTO leads (type_projet, description) VALUES (?, ?)', generer_projets(1000, rng))
+    conn.commit()
+    conn.close()
+    debut = time.perf_counter()
+    ps.ajouter_nouveaux_projets()
+    print(f"  ajout de 1 000       : {(time.perf_counter() - debut) * 1000:8.1f} ms")
+
+    index = ps.get_index_similarite()
+    references = rng.integers(1, nombre + 1, 200)
+    repetitions = len(references)
+
+    debut = time.perf_counter()
+    for lead_id in references:
+        termes, poids = index.vecteur(int(lead_id))
+        attendu = scores_parcours_complet(index, termes, poids)
+    duree_complet = (time.perf_counter() - debut) / repetitions
+
+    debut = time.perf_counter()
+    for lead_id in references:
+        termes, poids = index.vecteur(int(lead_id))
+        _, obtenu = index.scores(termes, poids)
+    duree_inverse = (time.perf_counter() - debut) / repetitions
+
+    debut = time.perf_counter()
+    for lead_id in references:
+        voisins = ps.projets_similaires([int(lead_id)], k=5)
+    duree_top = (time.perf_counter() - debut) / repetitions
+
+    assert np.allclose(obtenu[:len(attendu)], attendu, atol=1e-5)
+    print(f"  parcours complet     : {duree_complet * 1000:8.2f} ms / requête")
+    print(f"  listes inversées     : {duree_inverse * 1000:8.2f} ms / requête  (x{duree_complet / duree_inverse:.1f})")
+    print(f"  top 5 complet        : {duree_top * 1000:8.2f} ms / requête")
+
+if __name__ == "__main__":
+    main()
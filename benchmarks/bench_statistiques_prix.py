@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark des statistiques de prix des soumissions SEAOP
+
+Sur une base temporaire de soumissions synthétiques (500 000 par défaut,
+réparties sur des projets de types, budgets et urgences variés), mesure :
+- le calcul complet de nuit (recalculer_statistiques_prix) ;
+- l'affichage du formulaire (get_contexte_prix, tables précalculées),
+  comparé au calcul des percentiles à la volée pour le même projet ;
+- la mise à jour incrémentale d'une acceptation (enregistrer_acceptation).
+
+Usage : python benchmarks/bench_statistiques_prix.py [nombre_de_soumissions]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import statistiques_prix as sp
+
+TYPES_PROJETS = ["Rénovation cuisine", "Rénovation salle de bain", "Toiture", "Agrandissement",
+                 "Sous-sol", "Fenêtres et portes", "Revêtement extérieur", "Électricité", "Plomberie"]
+GAMMES = list(sp.MONTANTS_GAMMES_BUDGET) + ["À déterminer"]
+
+def preparer_base(nombre: int, rng) -> str:
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.executescript('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, type_projet TEXT, budget TEXT, niveau_urgence TEXT DEFAULT 'normal'
+        );
+        CREATE TABLE soumissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, lead_id INTEGER, montant REAL, statut TEXT DEFAULT 'envoyee'
+        );
+    ''')
+    nombre_leads = max(nombre // 5, 1)
+    types = rng.integers(0, len(TYPES_PROJETS), nombre_leads)
+    gammes = rng.integers(0, len(GAMMES), nombre_leads)
+    urgences = rng.integers(0, len(sp.NIVEAUX_URGENCE), nombre_leads)
+    conn.executemany('INSERT INTO leads (type_projet, budget, niveau_urgence) VALUES (?, ?, ?)',
+                     [(TYPES_PROJETS[t], GAMMES[g], sp.NIVEAUX_URGENCE[u])
+                      for t, g, u in zip(types.tolist(), gammes.tolist(), urgences.tolist())])
+
+    lead_ids = rng.integers(1, nombre_leads + 1, nombre)
+    budgets = np.array([sp.MONTANTS_GAMMES_BUDGET.get(g, 20000) for g in GAMMES])[gammes[lead_ids - 1]]
+    montants = np.round(budgets * np.exp(rng.normal(0, 0.3, nombre)), -1)
+    acceptees = rng.random(nombre) < 0.2
+    conn.executemany('INSERT INTO soumissions (lead_id, montant, statut) VALUES (?, ?, ?)',
+                     zip(lead_ids.tolist(), montants.tolist(), np.where(acceptees, 'acceptee', 'envoyee').tolist()))
+    conn.execute('CREATE INDEX idx_soumissions_lead ON soumissions(lead_id)')
+    conn.commit()
+    conn.close()
+    sp.DATABASE_PATH = chemin
+    return chemin
+
+def contexte_a_la_volee(type_projet: str, gamme_budget: str):
+    """Ce que le formulaire devrait calculer sans table précalculée"""
+    conn = sqlite3.connect(sp.DATABASE_PATH)
+    lignes = conn.execute('''
+        SELECT s.montant, s.statut = 'acceptee' FROM soumissions s JOIN leads l ON l.id = s.lead_id
+        WHERE l.type_projet = ? AND l.budget = ?
+    ''', (type_projet, gamme_budget)).fetchall()
+    conn.close()
+    montants = np.array([l[0] for l in lignes])
+    return np.percentile(montants, sp.PERCENTILES), np.mean([l[1] for l in lignes])
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rng = np.random.default_rng(42)
+    preparer_base(nombre, rng)
+    print(f"Statistiques de prix sur {nombre:,} soumissions")
+
+    sp.assurer_statistiques_prix()
+    debut = time.perf_counter()
+    resultat = sp.recalculer_statistiques_prix()
+    print(f"  calcul complet (nuit)  : {time.perf_counter() - debut:8.2f} s  ({resultat['groupes']} groupes)")
+
+    requetes = [(TYPES_PROJETS[t], GAMMES[g]) for t, g in zip(rng.integers(0, len(TYPES_PROJETS), 50).tolist(),
+                                                             rng.integers(0, len(GAMMES), 50).tolist())]
+    durees = []
+    for type_projet, gamme in requetes:
+        debut = time.perf_counter()
+        sp.get_contexte_prix(type_projet, gamme, 'normal')
+        durees.append(time.perf_counter() - debut)
+    print(f"  formulaire (précalculé): {np.median(durees) * 1000:8.3f} ms (médiane)")
+
+    durees = []
+    for type_projet, gamme in requetes[:10]:
+        debut = time.perf_counter()
+        contexte_a_la_volee(type_projet, gamme)
+        durees.append(time.perf_counter() - debut)
+    print(f"  calcul à la volée      : {np.median(durees) * 1000:8.1f} ms (médiane)")
+
+    conn = sqlite3.connect(sp.DATABASE_PATH)
+    cursor = conn.cursor()
+    durees = []
+    for soumission_id in rng.integers(1, nombre + 1, 200).tolist():
+        debut = time.perf_counter()
+        sp.enregistrer_acceptation(cursor, soumission_id)
+        durees.append(time.perf_counter() - debut)
+    conn.rollback()
+    conn.close()
+    print(f"  acceptation (incrément): {np.median(durees) * 1000:8.3f} ms (médiane)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chargement parallèle des lectures indépendantes des tableaux de bord SEAOP
+
+La vue d'ensemble de l'administration et les onglets évaluations et tableau
+de bord de l'espace entrepreneur enchaînent des requêtes de lecture qui ne
+dépendent pas les unes des autres : affichées à la suite, leur durée est la
+somme des requêtes. charger_en_parallele() les confie à un pool borné de
+TAILLE_POOL fils et assemble les résultats par clé ; la durée approche celle
+de la lecture la plus lente (SQLite relâche le GIL pendant les requêtes).
+- chaque fil du pool garde, par base, sa connexion de lecture
+  (connecter_lecture : journal WAL, écriture refusée), ouverte à sa première
+  lecture puis réutilisée ; en WAL, les lectures concurrentes ne se bloquent
+  ni entre elles ni avec l'écrivain unique ;
+- chaque lecture voit son propre instantané de la base, pas celui des autres :
+  ne regrouper que des lectures qui n'ont pas à être cohérentes entre elles ;
+- chaque lecture s'exécute dans une copie du contexte de l'appelant, sous un
+  span à son nom : ses requêtes comptent dans la trace du rerun en cours ;
+- toutes les lectures vont à leur terme, puis la première exception levée
+  est propagée à l'appelant.
+Appelé depuis un fil du pool (une lecture qui charge elle-même en parallèle),
+les lectures s'exécutent à la suite dans ce fil : un pool borné dont les fils
+attendraient leurs propres sous-tâches pourrait se bloquer.
+
+Usage :
+    resultats = charger_en_parallele({
+        'evaluations': lambda conn: lire_evaluations(conn, entrepreneur_id),
+        'commentaires': lambda conn: lire_commentaires(conn, entrepreneur_id),
+    }, chemin=DATABASE_PATH)
+"""
+
+import contextvars
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from base_donnees import connecter_lecture
+from instrumentation import instrumenter
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Fils de lecture du pool, partagés par toutes les sessions du processus
+TAILLE_POOL = 4
+
+_fil = threading.local()
+
+def _initialiser_fil():
+    _fil.connexions = {}
+
+_pool = ThreadPoolExecutor(max_workers=TAILLE_POOL, thread_name_prefix='seaop-lecture',
+                           initializer=_initialiser_fil)
+
+def dans_le_pool() -> bool:
+    """Vrai dans un fil du pool de lecture"""
+    return hasattr(_fil, 'connexions')
+
+def _connexion_du_fil(chemin: str) -> sqlite3.Connection:
+    conn = _fil.connexions.get(chemin)
+    if conn is None:
+        conn = _fil.connexions[chemin] = connecter_lecture(chemin)
+    return conn
+
+def _executer(cle: str, lecture: Callable[[sqlite3.Connection], Any], chemin: str) -> Any:
+    return instrumenter(cle, lecture)(_connexion_du_fil(chemin))
+
+def charger_en_parallele(lectures: Dict[str, Callable[[sqlite3.Connection], Any]],
+                         chemin: Optional[str] = None) -> Dict[str, Any]:
+    """Exécute des lectures indépendantes sur le pool ; résultats par clé, dans l'ordre des lectures"""
+    chemin = chemin or DATABASE_PATH
+    if dans_le_pool():
+        return {cle: _executer(cle, lecture, chemin) for cle, lecture in lectures.items()}
+
+    futures = {cle: _pool.submit(contextvars.copy_context().run, _executer, cle, lecture, chemin)
+               for cle, lecture in lectures.items()}
+    wait(futures.values())
+    return {cle: future.result() for cle, future in futures.items()}
@@ -9,26 +9,23 @@ import sqlite3
 import datetime
 import os
 
+from base_donnees import executer_sql
+from presence_chat import assurer_table_presence, get_registre_presence
+from fils_chat import REPONSES_APERCU, charger_fils
+from likes_chat import assurer_likes, basculer_like
+
+# Retrait maximal (en colonnes sur 12) des réponses imbriquées
+RETRAIT_MAX = 3
+
 # Configuration du stockage persistant
 DATA_DIR = os.getenv('DATA_DIR', '.')
 DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
 
-def page_chat_room_public():
-    """Page Chat Room Public - Style commentaires Facebook"""
-    
-    # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>💬 Chat Room SEAOP</h1>
-        <p>Espace de discussion communautaire pour clients et entrepreneurs</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Connexion à la base de données
-    conn = sqlite3.connect(DATABASE_PATH)
+def assurer_tables_chat(chemin=None):
+    """Crée les tables du Chat Room si elles n'existent pas"""
+    conn = sqlite3.connect(chemin or DATABASE_PATH)
     cursor = conn.cursor()
     
-    # Créer les tables si elles n'existent pas
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS chat_room (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -62,19 +59,33 @@ def page_chat_room_public():
         )
     ''')
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS chat_room_online (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_type TEXT NOT NULL,
-            user_name TEXT NOT NULL,
-            user_email TEXT NOT NULL,
-            last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_typing BOOLEAN DEFAULT 0,
-            UNIQUE(user_email)
-        )
-    ''')
-    
     conn.commit()
+    conn.close()
+
+def page_chat_room_public():
+    """Page Chat Room Public - Style commentaires Facebook"""
+    
+    # Header
+    st.markdown("""
+    <div class="main-header">
+        <h1>💬 Chat Room SEAOP</h1>
+        <p>Espace de discussion communautaire pour clients et entrepreneurs</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Créer les tables si elles n'existent pas
+    assurer_tables_chat(DATABASE_PATH)
+    
+    # Connexion à la base de données
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    
+    # Compteurs de likes tenus par triggers
+    assurer_likes(DATABASE_PATH)
+    
+    # Présence : registre en mémoire, persisté par la tâche de fond
+    assurer_table_presence(DATABASE_PATH)
+    registre = get_registre_presence(DATABASE_PATH)
     
     # Identifier l'utilisateur actuel
     user_type = "visiteur"
@@ -101,14 +112,9 @@ def page_chat_room_public():
         user_email = st.session_state.client_email
         user_name = st.session_state.get('client_nom', user_email.split('@')[0])
     
-    # Mise à jour statut en ligne
+    # Mise à jour statut en ligne (mémoire seulement)
     if user_email:
-        cursor.execute('''
-            INSERT OR REPLACE INTO chat_room_online 
-            (user_type, user_name, user_email, last_seen) 
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (user_type, user_name, user_email))
-        conn.commit()
+        registre.battement(user_type, user_name, user_email)
     
     # Layout en colonnes
     col_main, col_sidebar = st.columns([3, 1])
@@ -116,15 +122,8 @@ def page_chat_room_public():
     with col_sidebar:
         st.markdown("### 👥 En ligne")
         
-        # Récupérer utilisateurs en ligne (actifs dans les 5 dernières minutes)
-        cursor.execute('''
-            SELECT user_type, user_name, user_email
-            FROM chat_room_online
-            WHERE datetime(last_seen) > datetime('now', '-5 minutes')
-            ORDER BY last_seen DESC
-            LIMIT 20
-        ''')
-        online_users = cursor.fetchall()
+        # Utilisateurs en ligne (actifs dans les 5 dernières minutes), lus en mémoire
+        online_users = registre.en_ligne(limite=20)
         
         if online_users:
             for u_type, u_name, u_email in online_users:
@@ -173,12 +172,7 @@ def page_chat_room_public():
                 
                 if submit_button and message_input:
                     # Insérer le message
-                    cursor.execute('''
-                        INSERT INTO chat_room 
-                        (user_type, user_name, user_email, user_id, message, user_badge)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (user_type, user_name, user_email, user_id, message_input, user_badge))
-                    conn.commit()
+                    publier_message((user_type, user_name, user_email, user_id, user_badge), message_input)
                     st.success("✅ Message publié!")
                     st.rerun()
         else:
@@ -208,43 +202,60 @@ def page_chat_room_public():
         # Affichage des messages
         st.markdown("### 📝 Messages récents")
         
-        # Messages épinglés d'abord
-        cursor.execute('''
-            SELECT id, user_type, user_name, user_email, message, likes, 
-                   created_at, user_badge, is_pinned
-            FROM chat_room
-            WHERE is_deleted = 0 AND is_pinned = 1
-            ORDER BY created_at DESC
-        ''')
-        pinned_messages = cursor.fetchall()
+        # Fils de discussion (épinglés d'abord) : messages, réponses et likes en une requête
+        fils_ouverts = st.session_state.setdefault('chat_fils_ouverts', set())
+        fils = charger_fils(user_email, limite=50, fils_ouverts=fils_ouverts, chemin=DATABASE_PATH)
+        auteur = (user_type, user_name, user_email, user_id, user_badge)
         
-        if pinned_messages:
-            for msg in pinned_messages:
-                display_chat_message(msg, cursor, conn, user_email, is_pinned=True)
+        pinned_threads = [fil for fil in fils if fil['message']['is_pinned']]
+        if pinned_threads:
+            for fil in pinned_threads:
+                display_chat_thread(fil, auteur, is_pinned=True)
             st.markdown("---")
         
-        # Messages normaux
-        cursor.execute('''
-            SELECT id, user_type, user_name, user_email, message, likes, 
-                   created_at, user_badge, is_pinned
-            FROM chat_room
-            WHERE is_deleted = 0 AND is_pinned = 0
-            ORDER BY created_at DESC
-            LIMIT 50
-        ''')
-        messages = cursor.fetchall()
-        
-        if messages:
-            for msg in messages:
-                display_chat_message(msg, cursor, conn, user_email)
+        threads = [fil for fil in fils if not fil['message']['is_pinned']]
+        if threads:
+            for fil in threads:
+                display_chat_thread(fil, auteur)
         else:
             st.info("💬 Aucun message pour le moment. Soyez le premier à écrire!")
     
     conn.close()
 
-def display_chat_message(msg, cursor, conn, current_user_email, is_pinned=False):
+def publier_message(auteur, message, parent_id=None):
+    """Insère un message, ou une réponse à parent_id ; retourne son id"""
+    user_type, user_name, user_email, user_id, user_badge = auteur
+    return executer_sql('''
+        INSERT INTO chat_room 
+        (user_type, user_name, user_email, user_id, message, user_badge, parent_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (user_type, user_name, user_email, user_id, message, user_badge, parent_id), chemin=DATABASE_PATH)
+
+def display_chat_thread(fil, auteur, is_pinned=False):
+    """Affiche un fil : message racine, réponses chargées et bouton pour déplier ou replier"""
+    display_chat_message(fil['message'], auteur, is_pinned=is_pinned)
+    for reponse in fil['reponses']:
+        retrait = min(reponse['profondeur'], RETRAIT_MAX)
+        _, col_reponse = st.columns([retrait, 12 - retrait])
+        with col_reponse:
+            display_chat_message(reponse, auteur)
+    
+    racine = fil['message']['id']
+    if not fil['complet']:
+        reste = fil['nb_reponses'] - len(fil['reponses'])
+        if st.button(f"💬 Voir {reste} autre(s) réponse(s)", key=f"open_thread_{racine}"):
+            st.session_state.chat_fils_ouverts.add(racine)
+            st.rerun()
+    elif racine in st.session_state.get('chat_fils_ouverts', set()) and fil['nb_reponses'] > REPONSES_APERCU:
+        if st.button("🔼 Masquer les réponses", key=f"close_thread_{racine}"):
+            st.session_state.chat_fils_ouverts.discard(racine)
+            st.rerun()
+
+def display_chat_message(msg, auteur, is_pinned=False):
     """Affiche un message du chat avec style Facebook"""
-    msg_id, u_type, u_name, u_email, message, likes, created_at, badge, _ = msg
+    msg_id, u_type, u_name, u_email = msg['id'], msg['user_type'], msg['user_name'], msg['user_email']
+    message, likes, created_at, badge = msg['message'], msg['likes'], msg['created_at'], msg['user_badge']
+    current_user_email = auteur[2]
     
     # Container pour le message
     with st.container():
@@ -299,41 +310,52 @@ def display_chat_message(msg, cursor, conn, current_user_email, is_pinned=False)
         with col2:
             # Actions
             if current_user_email:
-                # Vérifier si déjà liké
-                cursor.execute('''
-                    SELECT COUNT(*) FROM chat_room_likes 
-                    WHERE message_id = ? AND user_email = ?
-                ''', (msg_id, current_user_email))
-                already_liked = cursor.fetchone()[0] > 0
-                
-                like_label = f"👍 {likes}" if likes > 0 else "👍"
-                
-                if not already_liked:
-                    if st.button(like_label, key=f"like_{msg_id}"):
-                        cursor.execute('''
-                            INSERT INTO chat_room_likes (message_id, user_email)
-                            VALUES (?, ?)
-                        ''', (msg_id, current_user_email))
-                        cursor.execute('''
-                            UPDATE chat_room SET likes = likes + 1 WHERE id = ?
-                        ''', (msg_id,))
-                        conn.commit()
-                        st.rerun()
+                # Like : un clic l'ajoute, un second le retire (déjà liké : chargé avec le fil)
+                if msg['aime']:
+                    like_label, like_help = f"✅ {likes}", "Retirer mon like"
                 else:
-                    st.button(f"✅ {likes}", key=f"liked_{msg_id}", disabled=True)
+                    like_label, like_help = (f"👍 {likes}" if likes > 0 else "👍"), "J'aime"
+                
+                if st.button(like_label, key=f"like_{msg_id}", help=like_help):
+                    basculer_like(msg_id, current_user_email, chemin=DATABASE_PATH)
+                    st.rerun()
                 
                 # Supprimer si c'est son message
                 if current_user_email == u_email:
                     if st.button("🗑️", key=f"delete_{msg_id}"):
-                        cursor.execute('''
+                        executer_sql('''
                             UPDATE chat_room 
                             SET is_deleted = 1, deleted_by = 'user'
                             WHERE id = ?
-                        ''', (msg_id,))
-                        conn.commit()
+                        ''', (msg_id,), chemin=DATABASE_PATH)
                         st.rerun()
+                
+                # Répondre au message
+                if st.button("↩️", key=f"reply_{msg_id}", help="Répondre"):
+                    st.session_state.chat_reponse_a = msg_id
+                    st.rerun()
             else:
                 if likes > 0:
                     st.markdown(f"👍 {likes}")
         
+        # Formulaire de réponse sous le message choisi
+        if current_user_email and st.session_state.get('chat_reponse_a') == msg_id:
+            with st.form(f"reply_form_{msg_id}", clear_on_submit=True):
+                reponse = st.text_area(f"↩️ Répondre à {u_name}", height=80, key=f"reply_input_{msg_id}")
+                col_envoyer, col_annuler = st.columns(2)
+                with col_envoyer:
+                    envoyer = st.form_submit_button("📤 Répondre", use_container_width=True, type="primary")
+                with col_annuler:
+                    annuler = st.form_submit_button("Annuler", use_container_width=True)
+            
+            if envoyer and reponse:
+                publier_message(auteur, reponse, parent_id=msg_id)
+                # Le fil reste déplié pour montrer la réponse
+                st.session_state.chat_fils_ouverts.add(msg['racine'])
+                st.session_state.chat_reponse_a = None
+                st.rerun()
+            elif annuler:
+                st.session_state.chat_reponse_a = None
+                st.rerun()
+        
         st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file
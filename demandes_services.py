@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registre unifié des demandes de services SEAOP
+
+Les demandes d'estimation, de technologue, d'architecture et d'ingénieur
+gardent leurs attributs propres dans leurs tables respectives. Le cycle de vie
+commun (référence, client, statut, prix, progression, dates) est répliqué dans
+la table demandes_services par des triggers, ce qui permet de servir la vue
+d'ensemble admin, le suivi « toutes mes demandes » et les statistiques avec
+une seule requête indexée au lieu de quatre.
+"""
+
+import sqlite3
+import datetime
+import os
+from typing import Optional, List, Dict
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Description de chaque service : table d'attributs, colonnes communes
+# (None si la table n'a pas d'équivalent), statuts considérés « en cours » et
+# colonne de date renseignée lors du passage à un statut
+SERVICES = {
+    'estimation': {
+        'table': 'estimations',
+        'libelle': "💰 Estimation",
+        'prix': 'prix_estimation',
+        'superficie': None,
+        'pourcentage': None,
+        'urgence': None,
+        'statuts_en_cours': ('en_cours',),
+        'dates_statut': {
+            'en_cours': 'date_debut_analyse',
+            'terminee': 'date_estimation_terminee',
+            'envoyee': 'date_envoi_client',
+        },
+    },
+    'technologue': {
+        'table': 'demandes_technologue',
+        'libelle': "📐 Technologue",
+        'prix': 'prix_service',
+        'superficie': 'superficie_batiment',
+        'pourcentage': 'pourcentage_complete',
+        'urgence': 'niveau_urgence',
+        'statuts_en_cours': ('en_cours', 'revision', 'acceptee'),
+        'dates_statut': {
+            'analyse': 'date_analyse',
+            'acceptee': 'date_acceptation',
+            'en_cours': 'date_debut_plans',
+            'revision': 'date_revision',
+        },
+    },
+    'architecture': {
+        'table': 'demandes_architecture',
+        'libelle': "🏛️ Architecture",
+        'prix': 'prix_service',
+        'superficie': 'superficie_batiment',
+        'pourcentage': 'pourcentage_complete',
+        'urgence': 'niveau_urgence',
+        'statuts_en_cours': ('en_cours', 'revision', 'acceptee'),
+        'dates_statut': {
+            'en_analyse': 'date_analyse',
+            'acceptee': 'date_acceptation',
+            'en_cours': 'date_debut_plans',
+            'revision': 'date_revision',
+            'approuvee': 'date_approbation',
+            'livree': 'date_livraison',
+        },
+    },
+    'ingenieur': {
+        'table': 'demandes_ingenieur',
+        'libelle': "🔧 Ingénieur",
+        'prix': 'prix_service',
+        'superficie': 'superficie_projet',
+        'pourcentage': 'pourcentage_complete',
+        'urgence': 'niveau_urgence',
+        'statuts_en_cours': ('calculs', 'plans', 'revision', 'acceptee'),
+        'dates_statut': {
+            'analyse': 'date_analyse',
+            'acceptee': 'date_acceptation',
+            'calculs': 'date_debut_calculs',
+            'plans': 'date_debut_plans',
+        },
+    },
+}
+
+# Colonnes communes répliquées : colonne du registre -> clé de SERVICES ou colonne identique
+COLONNES_COMMUNES = [
+    ('numero_reference', 'numero_reference'),
+    ('nom_client', 'nom_client'),
+    ('email_client', 'email_client'),
+    ('statut', 'statut'),
+    ('prix', 'prix'),
+    ('superficie', 'superficie'),
+    ('pourcentage_complete', 'pourcentage'),
+    ('niveau_urgence', 'urgence'),
+    ('date_demande', 'date_demande'),
+]
+
+# Services dont les triggers sont en place, par base de données
+_services_synchronises = set()
+
+def _colonne_source(config: Dict, cle: str) -> Optional[str]:
+    """Nom de la colonne de la table d'attributs correspondant à une colonne commune"""
+    return config[cle] if cle in config else cle
+
+def _expressions_source(config: Dict, prefixe: str) -> List[str]:
+    """Expressions SQL des colonnes communes lues depuis la table d'attributs"""
+    expressions = []
+    for _, cle in COLONNES_COMMUNES:
+        colonne = _colonne_source(config, cle)
+        expressions.append(f"{prefixe}{colonne}" if colonne else "NULL")
+    return expressions
+
+def _creer_synchronisation(cursor: sqlite3.Cursor, type_service: str):
+    """Crée les triggers d'un service et reprend ses demandes existantes"""
+    config = SERVICES[type_service]
+    table = config['table']
+    colonnes = ', '.join(colonne for colonne, _ in COLONNES_COMMUNES)
+    valeurs_new = ', '.join(_expressions_source(config, 'NEW.'))
+    affectations = ', '.join(
+        f"{colonne} = {expression}"
+        for (colonne, _), expression in zip(COLONNES_COMMUNES, _expressions_source(config, 'NEW.'))
+    )
+    colonnes_suivies = ', '.join(
+        colonne for colonne in (_colonne_source(config, cle) for _, cle in COLONNES_COMMUNES) if colonne
+    )
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_ds_{type_service}_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT OR REPLACE INTO demandes_services (type_service, demande_id, {colonnes})
+            VALUES ('{type_service}', NEW.id, {valeurs_new});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_ds_{type_service}_update AFTER UPDATE OF {colonnes_suivies} ON {table}
+        BEGIN
+            UPDATE demandes_services SET {affectations}
+            WHERE type_service = '{type_service}' AND demande_id = NEW.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_ds_{type_service}_delete AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM demandes_services
+            WHERE type_service = '{type_service}' AND demande_id = OLD.id;
+        END
+    ''')
+
+    # Reprise des demandes créées avant la mise en place des triggers
+    cursor.execute(f'''
+        INSERT OR REPLACE INTO demandes_services (type_service, demande_id, {colonnes})
+        SELECT '{type_service}', id, {', '.join(_expressions_source(config, ''))}
+        FROM {table}
+    ''')
+
+def _lire_schema(cursor: sqlite3.Cursor):
+    """Retourne les noms des tables et des triggers de la base"""
+    cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+    tables = set()
+    triggers = set()
+    for type_objet, nom in cursor.fetchall():
+        (tables if type_objet == 'table' else triggers).add(nom)
+    return tables, triggers
+
+def assurer_demandes_services():
+    """
+    Crée le registre unifié et synchronise chaque service dont la table existe.
+
+    Idempotent et peu coûteux une fois tous les services synchronisés ; les
+    tables de services créées plus tard sont prises en charge à l'appel suivant.
+    """
+    if all((DATABASE_PATH, type_service) in _services_synchronises for type_service in SERVICES):
+        return
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        tables, triggers = _lire_schema(cursor)
+        a_synchroniser = [
+            type_service for type_service, config in SERVICES.items()
+            if config['table'] in tables and f"trg_ds_{type_service}_delete" not in triggers
+        ]
+
+        if 'demandes_services' not in tables or a_synchroniser:
+            # Triggers et reprise dans une même transaction : jamais de triggers sans reprise
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS demandes_services (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    type_service TEXT NOT NULL,
+                    demande_id INTEGER NOT NULL,
+                    numero_reference TEXT,
+                    nom_client TEXT,
+                    email_client TEXT,
+                    statut TEXT,
+                    prix REAL,
+                    superficie REAL,
+                    pourcentage_complete INTEGER,
+                    niveau_urgence TEXT,
+                    date_demande TIMESTAMP,
+                    UNIQUE (type_service, demande_id)
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ds_client_date ON demandes_services(email_client, date_demande)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ds_date ON demandes_services(date_demande)')
+            # Index couvrant pour l'agrégat des statistiques
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ds_type_statut ON demandes_services(type_service, statut, prix, superficie)')
+
+            # Relecture sous verrou : un autre processus a pu synchroniser entre-temps
+            tables, triggers = _lire_schema(cursor)
+            for type_service in a_synchroniser:
+                if f"trg_ds_{type_service}_delete" not in triggers:
+                    _creer_synchronisation(cursor, type_service)
+
+            conn.commit()
+
+        for type_service, config in SERVICES.items():
+            if config['table'] in tables:
+                _services_synchronises.add((DATABASE_PATH, type_service))
+    except Exception as e:
+        print(f"Erreur lors de la synchronisation des demandes de services: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def get_stats_services() -> Dict[str, Dict]:
+    """Statistiques de tous les services en un seul agrégat groupé"""
+    assurer_demandes_services()
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        return lire_stats_services(conn)
+    finally:
+        conn.close()
+
+def lire_stats_services(conn: sqlite3.Connection) -> Dict[str, Dict]:
+    """Agrégat de get_stats_services sur une connexion ouverte (registre déjà synchronisé)"""
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT type_service, statut, COUNT(*),
+               SUM(prix), COUNT(prix), SUM(superficie), COUNT(superficie)
+        FROM demandes_services
+        GROUP BY type_service, statut
+    ''')
+    rows = cursor.fetchall()
+
+    stats = {
+        type_service: {'total': 0, 'en_cours': 0, 'superficie_moyenne': 0, 'ca_total': 0, 'par_statut': {}}
+        for type_service in SERVICES
+    }
+    superficies = {type_service: [0, 0] for type_service in SERVICES}
+
+    for type_service, statut, nombre, prix_total, prix_nb, superficie_total, superficie_nb in rows:
+        if type_service not in stats:
+            continue
+        stats_service = stats[type_service]
+        stats_service['total'] += nombre
+        if statut in SERVICES[type_service]['statuts_en_cours']:
+            stats_service['en_cours'] += nombre
+        stats_service['ca_total'] += prix_total or 0
+        stats_service['par_statut'][statut] = {
+            'nombre': nombre,
+            'prix_total': prix_total or 0,
+            'prix_nb': prix_nb
+        }
+        superficies[type_service][0] += superficie_total or 0
+        superficies[type_service][1] += superficie_nb
+
+    for type_service, (total, nombre) in superficies.items():
+        if nombre:
+            stats[type_service]['superficie_moyenne'] = total / nombre
+
+    return stats
+
+def get_demandes_services(email_client: Optional[str] = None, type_service: Optional[str] = None,
+                          statut: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+    """Liste les demandes de tous les services, des plus récentes aux plus anciennes"""
+    assurer_demandes_services()
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        return lire_demandes_services(conn, email_client, type_service, statut, limite)
+    finally:
+        conn.close()
+
+def lire_demandes_services(conn: sqlite3.Connection, email_client: Optional[str] = None,
+                           type_service: Optional[str] = None, statut: Optional[str] = None,
+                           limite: Optional[int] = None) -> List[Dict]:
+    """Requête de get_demandes_services sur une connexion ouverte (registre déjà synchronisé)"""
+    clauses = []
+    params = []
+    if email_client:
+        clauses.append("email_client = ?")
+        params.append(email_client)
+    if type_service:
+        clauses.append("type_service = ?")
+        params.append(type_service)
+    if statut:
+        clauses.append("statut = ?")
+        params.append(statut)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    limit = "LIMIT ?" if limite else ""
+    if limite:
+        params.append(limite)
+
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT type_service, demande_id, numero_reference, nom_client, email_client,
+               statut, prix, superficie, pourcentage_complete, niveau_urgence, date_demande
+        FROM demandes_services
+        {where}
+        ORDER BY date_demande DESC, id DESC
+        {limit}
+    ''', params)
+
+    demandes = []
+    for row in cursor.fetchall():
+        demandes.append({
+            'type_service': row[0],
+            'demande_id': row[1],
+            'numero_reference': row[2],
+            'nom_client': row[3],
+            'email_client': row[4],
+            'statut': row[5],
+            'prix': row[6],
+            'superficie': row[7],
+            'pourcentage_complete': row[8],
+            'niveau_urgence': row[9],
+            'date_demande': row[10]
+        })
+
+    return demandes
+
+def mettre_a_jour_statut_demande(type_service: str, demande_id: int, nouveau_statut: str,
+                                 notes: str = None, pourcentage: int = None) -> bool:
+    """Met à jour le statut d'une demande de service (le registre suit par trigger)"""
+    config = SERVICES[type_service]
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        updates = ['statut = ?']
+        params = [nouveau_statut]
+
+        # Date associée au nouveau statut
+        colonne_date = config['dates_statut'].get(nouveau_statut)
+        if colonne_date:
+            updates.append(f'{colonne_date} = ?')
+            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+        if notes:
+            updates.append('notes_internes = ?')
+            params.append(notes)
+
+        if pourcentage is not None and config['pourcentage']:
+            updates.append(f"{config['pourcentage']} = ?")
+            params.append(pourcentage)
+
+        params.append(demande_id)
+
+        cursor.execute(f'''
+            UPDATE {config['table']}
+            SET {', '.join(updates)}
+            WHERE id = ?
+        ''', params)
+
+        conn.commit()
+        return True
+
+    except Exception as e:
+        print(f"Erreur lors de la mise à jour du statut: {e}")
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Détection des projets republiés SEAOP (MinHash / LSH)
+
+Un client qui republie le même projet, description à peine retouchée,
+disperse les soumissions et encombre le fil des entrepreneurs. À la
+publication, sauvegarder_lead consulte un index LSH :
+- la description normalisée (accents pliés, mots vides retirés) est découpée
+  en fragments (mots et paires de mots consécutifs) ;
+- sa signature MinHash (NOMBRE_HACHAGES minimums de hachages universels)
+  estime la similarité de Jaccard par la proportion de valeurs égales ;
+- la signature est coupée en NOMBRE_BANDES bandes ; deux projets sont
+  candidats s'ils partagent une bande, ce que l'index lead_bandes_lsh
+  retrouve en NOMBRE_BANDES lectures de clé primaire.
+Un candidat encore ouvert, du même client (courriel, téléphone ou code
+postal identique) et assez semblable fait du nouveau projet un doublon :
+doublon_de pointe vers l'original et le doublon n'est pas diffusé.
+"""
+
+import sqlite3
+import os
+import re
+import zlib
+from typing import Optional, List, Dict, Tuple
+
+import numpy as np
+
+from projets_similaires import normaliser_texte
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# 16 bandes de 4 valeurs : probabilité d'être candidat 1 - (1 - s^4)^16,
+# soit 50 % à s = 0,5, 89 % à s = 0,6 et 99 % à s = 0,7
+NOMBRE_HACHAGES = 64
+NOMBRE_BANDES = 16
+SEUIL_DOUBLON = 0.6
+
+# En deçà, une description est trop courte pour juger d'une republication
+FRAGMENTS_MIN = 6
+
+# Hachages multiplicatifs h(x) = ((a * x + b) mod 2^64) >> 32, a impair : sans division,
+# le débordement des entiers 64 bits fait le modulo. Graine fixe : les signatures sont persistées
+_generateur = np.random.default_rng(20250816)
+_A = _generateur.integers(0, 1 << 64, NOMBRE_HACHAGES, dtype=np.uint64, endpoint=False) | np.uint64(1)
+_B = _generateur.integers(0, 1 << 64, NOMBRE_HACHAGES, dtype=np.uint64, endpoint=False)
+
+# Valeur d'une signature sans aucun fragment (description vide)
+SIGNATURE_VIDE = 0xFFFFFFFF
+
+# Nombre de fragments traités ensemble lors du calcul des signatures par lot
+TAILLE_BLOC_FRAGMENTS = 200_000
+
+_bases_pretes = set()
+
+# Par base : id en deçà duquel tous les projets sont indexés (constaté par la reprise).
+# MAX(lead_id) de lead_minhash ne convient pas : detecter_doublon indexe les nouveaux
+# projets à la publication, avant que la reprise n'ait traité les plus anciens
+_reprises_faites: Dict[str, int] = {}
+
+def fragments(description: Optional[str]) -> np.ndarray:
+    """Hachages 32 bits des mots et des paires de mots consécutifs, sans répétition"""
+    mots = [zlib.crc32(m.encode()) for m in normaliser_texte(description)]
+    paires = [(m * 0x9E3779B1 + n) & 0xFFFFFFFF for m, n in zip(mots, mots[1:])]
+    valeurs = set(mots)
+    valeurs.update(paires)
+    return np.fromiter(valeurs, dtype=np.uint64, count=len(valeurs))
+
+def signatures(liste_fragments: List[np.ndarray]) -> np.ndarray:
+    """Signatures MinHash (n, NOMBRE_HACHAGES) en uint32 ; une description vide donne SIGNATURE_VIDE partout"""
+    resultat = np.full((len(liste_fragments), NOMBRE_HACHAGES), SIGNATURE_VIDE, dtype=np.uint32)
+    debut = 0
+    while debut < len(liste_fragments):
+        # Bloc de descriptions dont les fragments tiennent dans TAILLE_BLOC_FRAGMENTS
+        fin, total = debut, 0
+        while fin < len(liste_fragments) and (fin == debut or total + len(liste_fragments[fin]) <= TAILLE_BLOC_FRAGMENTS):
+            total += len(liste_fragments[fin])
+            fin += 1
+        bloc = liste_fragments[debut:fin]
+        longueurs = np.array([len(f) for f in bloc])
+        non_vides = np.flatnonzero(longueurs)
+        if len(non_vides):
+            valeurs = np.concatenate([bloc[i] for i in non_vides])
+            with np.errstate(over='ignore'):
+                hachages = ((_A[:, None] * valeurs[None, :] + _B[:, None]) >> np.uint64(32)).astype(np.uint32)
+            departs = np.concatenate([[0], np.cumsum(longueurs[non_vides])[:-1]])
+            resultat[debut + non_vides] = np.minimum.reduceat(hachages, departs, axis=1).T
+        debut = fin
+    return resultat
+
+def cles_bandes(signatures_: np.ndarray) -> np.ndarray:
+    """Clé entière (positive, 63 bits) de chaque bande de chaque signature : (n, NOMBRE_BANDES)"""
+    bandes = signatures_.reshape(len(signatures_), NOMBRE_BANDES, -1).astype(np.uint64)
+    cles = np.broadcast_to(np.arange(NOMBRE_BANDES, dtype=np.uint64), bandes.shape[:2]).copy()
+    with np.errstate(over='ignore'):
+        for j in range(bandes.shape[2]):
+            cles = (cles ^ bandes[:, :, j]) * np.uint64(0x9E3779B97F4A7C15)
+    return (cles >> np.uint64(1)).astype(np.int64)
+
+def similarite(signature_1: np.ndarray, signature_2: np.ndarray) -> float:
+    """Estimation de la similarité de Jaccard de deux descriptions"""
+    return float(np.mean(signature_1 == signature_2))
+
+def assurer_index_doublons():
+    """Crée la colonne doublon_de, les tables de signatures et de bandes LSH"""
+    if DATABASE_PATH in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("PRAGMA table_info(leads)")
+        if 'doublon_de' not in [colonne[1] for colonne in cursor.fetchall()]:
+            cursor.execute('ALTER TABLE leads ADD COLUMN doublon_de INTEGER REFERENCES leads(id)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS lead_minhash (
+                lead_id INTEGER PRIMARY KEY,
+                signature BLOB NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS lead_bandes_lsh (
+                cle INTEGER NOT NULL,
+                lead_id INTEGER NOT NULL,
+                PRIMARY KEY (cle, lead_id)
+            ) WITHOUT ROWID
+        ''')
+        # Les bandes d'un projet supprimé restent : la jointure sur lead_minhash les écarte
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_doublons_lead_delete AFTER DELETE ON leads
+            BEGIN
+                DELETE FROM lead_minhash WHERE lead_id = OLD.id;
+            END
+        ''')
+        conn.commit()
+        _bases_pretes.add(DATABASE_PATH)
+    except Exception as e:
+        print(f"Erreur lors de la création de l'index des doublons: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def _indexer(cursor: sqlite3.Cursor, lead_ids: List[int], signatures_: np.ndarray) -> np.ndarray:
+    """Enregistre signatures et bandes ; retourne les clés de bandes"""
+    cles = cles_bandes(signatures_)
+    cursor.executemany('INSERT OR REPLACE INTO lead_minhash (lead_id, signature) VALUES (?, ?)',
+                       [(lead_id, s.tobytes()) for lead_id, s in zip(lead_ids, signatures_)])
+    lignes = sorted((cle, lead_id) for lead_id, ligne in zip(lead_ids, cles.tolist()) for cle in ligne)
+    cursor.executemany('INSERT OR IGNORE INTO lead_bandes_lsh (cle, lead_id) VALUES (?, ?)', lignes)
+    return cles
+
+def _normaliser_contact(valeur: Optional[str]) -> str:
+    return re.sub(r'[\s\-().+]', '', (valeur or '').lower())
+
+def _meme_client(nouveau: Tuple, candidat: Tuple) -> bool:
+    """Courriel, téléphone ou code postal complet identiques (non vides)"""
+    return any(a and a == b for a, b in zip(map(_normaliser_contact, nouveau), map(_normaliser_contact, candidat)))
+
+def detecter_doublon(cursor: sqlite3.Cursor, lead_id: int, description: Optional[str], email: Optional[str],
+                     telephone: Optional[str], code_postal: Optional[str]) -> Optional[Dict]:
+    """
+    Indexe un projet qui vient d'être inséré et le marque s'il republie un projet ouvert.
+
+    S'exécute dans la transaction de l'insertion (cursor). Retourne
+    {id, numero_reference, similarite} de l'original, ou None.
+    """
+    fragments_projet = fragments(description)
+    signature = signatures([fragments_projet])[0]
+    cles = _indexer(cursor, [lead_id], signature[None, :])[0].tolist()
+    if len(fragments_projet) < FRAGMENTS_MIN:
+        return None
+
+    cursor.execute(f'''
+        SELECT l.id, COALESCE(l.doublon_de, l.id), l.email, l.telephone, l.code_postal, m.signature
+        FROM leads l
+        JOIN lead_minhash m ON m.lead_id = l.id
+        WHERE l.id IN (SELECT lead_id FROM lead_bandes_lsh WHERE cle IN ({', '.join('?' * len(cles))}))
+          AND l.id != ?
+    ''', cles + [lead_id])
+
+    meilleur = None
+    for _, original_id, *contact, signature_candidat in cursor.fetchall():
+        if not _meme_client((email, telephone, code_postal), tuple(contact)):
+            continue
+        score = similarite(signature, np.frombuffer(signature_candidat, dtype=np.uint32))
+        if score >= SEUIL_DOUBLON and (meilleur is None or (score, -original_id) > (meilleur[1], -meilleur[0])):
+            meilleur = (original_id, score)
+    if meilleur is None:
+        return None
+
+    # L'original doit encore accepter des soumissions : republier un projet fermé est légitime
+    cursor.execute('SELECT numero_reference FROM leads WHERE id = ? AND accepte_soumissions = 1', (meilleur[0],))
+    original = cursor.fetchone()
+    if original is None:
+        return None
+    cursor.execute('UPDATE leads SET doublon_de = ?, visible_entrepreneurs = 0 WHERE id = ?', (meilleur[0], lead_id))
+    return {'id': meilleur[0], 'numero_reference': original[0], 'similarite': meilleur[1]}
+
+def indexer_leads_existants(taille_lot: int = 5000) -> int:
+    """Reprise : signe et indexe les projets absents de l'index, par lots ; retourne leur nombre
+
+    Seuls les projets au-delà de la dernière reprise complète sont parcourus : une
+    fois à jour, la tâche ne lit que les projets publiés depuis.
+    """
+    assurer_index_doublons()
+    total, dernier_id = 0, _reprises_faites.get(DATABASE_PATH, 0)
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        # Projets déjà publiés : ceux-ci seront tous indexés à la fin du parcours
+        plafond = cursor.execute('SELECT MAX(id) FROM leads').fetchone()[0] or 0
+        # Parcours unique par plages d'ids croissants
+        while True:
+            cursor.execute('''
+                SELECT l.id, l.description FROM leads l
+                LEFT JOIN lead_minhash m ON m.lead_id = l.id
+                WHERE l.id > ? AND m.lead_id IS NULL
+                ORDER BY l.id
+                LIMIT ?
+            ''', (dernier_id, taille_lot))
+            lignes = cursor.fetchall()
+            if not lignes:
+                break
+            _indexer(cursor, [l[0] for l in lignes], signatures([fragments(l[1]) for l in lignes]))
+            conn.commit()
+            total += len(lignes)
+            dernier_id = lignes[-1][0]
+        _reprises_faites[DATABASE_PATH] = max(plafond, dernier_id)
+    except Exception as e:
+        print(f"Erreur lors de l'indexation des doublons: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+    return total
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fils de discussion du Chat Room SEAOP
+
+Une réponse pointe vers son message par parent_id. Une seule requête
+récursive charge une page de fils :
+- les racines : messages épinglés, puis les `limite` plus récents ;
+- leurs réponses à toute profondeur, dans l'ordre de la conversation
+  (chemin des ids depuis la racine) ;
+- pour chaque fil, le nombre de réponses ; pour chaque message, si
+  l'utilisateur courant l'a aimé (plus de requête par message).
+Un fil replié ne ramène que ses `reponses_par_fil` premières réponses ; un
+fil déplié (fils_ouverts) les ramène toutes. Une réponse supprimée masque
+les réponses qui lui sont adressées.
+"""
+
+import sqlite3
+import os
+from typing import Dict, Iterable, List, Optional
+
+from base_donnees import connecter_lecture
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Réponses affichées sous un fil replié
+REPONSES_APERCU = 2
+
+_bases_pretes = set()
+
+def assurer_index_fils(chemin: Optional[str] = None):
+    """Index des réponses par message et des racines par date"""
+    chemin = chemin or DATABASE_PATH
+    if chemin in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_chatroom_parent ON chat_room(parent_id)')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_chatroom_racines ON chat_room(is_pinned, created_at)
+            WHERE parent_id IS NULL AND is_deleted = 0
+        ''')
+        conn.commit()
+        _bases_pretes.add(chemin)
+    except Exception as e:
+        print(f"Erreur lors de la création des index du chat: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+REQUETE_FILS = '''
+    WITH RECURSIVE
+    racines(id) AS (
+        SELECT id FROM chat_room WHERE parent_id IS NULL AND is_deleted = 0 AND is_pinned = 1
+        UNION ALL
+        SELECT * FROM (
+            SELECT id FROM chat_room WHERE parent_id IS NULL AND is_deleted = 0 AND is_pinned = 0
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        )
+    ),
+    fil(id, racine, profondeur, chemin) AS (
+        SELECT id, id, 0, printf('%010d', id) FROM racines
+        UNION ALL
+        SELECT c.id, fil.racine, fil.profondeur + 1, fil.chemin || printf('/%010d', c.id)
+        FROM chat_room c
+        JOIN fil ON c.parent_id = fil.id
+        WHERE c.is_deleted = 0
+    ),
+    numerote AS (
+        SELECT fil.*,
+               ROW_NUMBER() OVER (PARTITION BY racine ORDER BY chemin) - 1 AS rang,
+               COUNT(*) OVER (PARTITION BY racine) - 1 AS nb_reponses
+        FROM fil
+    )
+    SELECT n.racine, n.profondeur, n.rang, n.nb_reponses,
+           m.id, m.user_type, m.user_name, m.user_email, m.message, m.likes,
+           m.created_at, m.user_badge, m.is_pinned,
+           EXISTS (SELECT 1 FROM chat_room_likes l WHERE l.message_id = m.id AND l.user_email = ?) AS aime
+    FROM numerote n
+    JOIN chat_room m ON m.id = n.id
+    JOIN chat_room r ON r.id = n.racine
+    WHERE n.rang <= ? OR n.racine IN ({ouverts})
+    ORDER BY r.is_pinned DESC, r.created_at DESC, r.id DESC, n.chemin
+'''
+
+COLONNES_MESSAGE = ('id', 'user_type', 'user_name', 'user_email', 'message', 'likes',
+                    'created_at', 'user_badge', 'is_pinned', 'aime')
+
+def charger_fils(user_email: str = '', limite: int = 50, reponses_par_fil: int = REPONSES_APERCU,
+                 fils_ouverts: Iterable[int] = (), chemin: Optional[str] = None) -> List[Dict]:
+    """
+    Page de fils en une requête : [{message, reponses, nb_reponses, complet}].
+
+    reponses est dans l'ordre de la conversation, chaque réponse portant sa
+    racine et sa profondeur (1 pour une réponse directe) ; complet indique
+    que toutes les réponses du fil sont chargées.
+    """
+    chemin = chemin or DATABASE_PATH
+    assurer_index_fils(chemin)
+    ouverts = [int(i) for i in fils_ouverts]
+    conn = connecter_lecture(chemin)
+    try:
+        lignes = conn.execute(REQUETE_FILS.format(ouverts=', '.join('?' * len(ouverts))),
+                              [limite, user_email or '', reponses_par_fil] + ouverts).fetchall()
+    finally:
+        conn.close()
+
+    fils = []
+    for racine, profondeur, rang, nb_reponses, *valeurs in lignes:
+        message = dict(zip(COLONNES_MESSAGE, valeurs))
+        message['racine'] = racine
+        message['profondeur'] = profondeur
+        if rang == 0:
+            fils.append({'message': message, 'reponses': [], 'nb_reponses': nb_reponses,
+                         'complet': nb_reponses <= reponses_par_fil or racine in ouverts})
+        else:
+            fils[-1]['reponses'].append(message)
+    return fils
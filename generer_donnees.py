@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Générateur de données synthétiques SEAOP (tests de volumétrie)
+
+Remplit une base cible aux volumes de production (100 000 projets,
+1 000 000 de soumissions, 5 000 000 de messages, notifications, Chat Room et
+pièces jointes optionnelles) pour observer get_projets_disponibles,
+get_stats_admin et les pages à l'échelle. Le schéma est celui de
+l'application (init_database) ; les lignes sont tirées par lots vectorisés
+(numpy) et insérées par executemany, une transaction par table.
+
+Une même graine donne la même base : les dates sont tirées avant une date de
+fin fixe, les courriels et références sont dérivés des numéros de ligne. Les
+valeurs suivent celles des formulaires (types, gammes de budget, délais,
+niveaux d'urgence, codes postaux de RTA québécoises) et les contraintes du
+schéma (une soumission par entrepreneur et par projet, au plus une soumission
+acceptée par projet, likes uniques).
+
+Les index dérivés (appariement, doublons, similarité) sont repris par
+l'application à son démarrage et par ses tâches de fond ; les statistiques de
+prix sont recalculées à la fin de la génération. Tous les entrepreneurs
+générés se connectent avec le mot de passe MOT_DE_PASSE_GENERE.
+
+Usage : python generer_donnees.py --data-dir /tmp/seaop_volume [--graine 42]
+        [--leads 100000] [--soumissions 1000000] [--messages 5000000]
+        [--taille-pieces-jointes 20000 --proportion-pieces-jointes 0.05]
+"""
+
+import argparse
+import base64
+import datetime
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+TYPES_PROJETS = ["Rénovation cuisine", "Rénovation salle de bain", "Toiture", "Revêtement extérieur",
+                 "Plancher", "Peinture", "Agrandissement", "Électricité", "Plomberie",
+                 "Chauffage/Climatisation", "Isolation", "Fenêtres et portes", "Maçonnerie",
+                 "Charpenterie", "Autre"]
+GAMMES_BUDGET = ["Moins de 5 000$", "5 000$ - 15 000$", "15 000$ - 30 000$",
+                 "30 000$ - 50 000$", "Plus de 50 000$", "À déterminer"]
+PROPORTIONS_BUDGET = [0.12, 0.30, 0.25, 0.15, 0.10, 0.08]
+DELAIS_REALISATION = ["Dès que possible", "Dans 1 mois", "Dans 2-3 mois",
+                      "Dans 3-6 mois", "Plus de 6 mois", "Flexible"]
+NIVEAUX_URGENCE = ['faible', 'normal', 'eleve', 'critique']
+PROPORTIONS_URGENCE = [0.20, 0.55, 0.20, 0.05]
+FACTEURS_URGENCE = [0.95, 1.0, 1.1, 1.25]
+ABONNEMENTS = ['gratuit', 'standard', 'premium', 'entreprise']
+PROPORTIONS_ABONNEMENT = [0.60, 0.25, 0.10, 0.05]
+
+# Montant typique d'un projet au budget « À déterminer »
+MONTANT_SANS_BUDGET = 20000
+
+DELAIS_EXECUTION = ["1 semaine", "2 semaines", "3-4 semaines", "1-2 mois", "2-3 mois"]
+VALIDITES_OFFRE = ["30 jours", "60 jours", "90 jours"]
+
+MOTS = '''
+    armoires comptoir quartz granit dosseret ilot evier robinetterie ceramique douche bain vanite
+    bardeaux asphalte membrane elastomere solin gouttieres soffites fascia ventilation isolation
+    laine cellulose pare-vapeur gypse joints peinture apprêt plafond moulures plinthes plancher
+    bois franc flottant vinyle tapis escalier rampe balcon terrasse patio pavé uni muret clôture
+    fondation fissure drain français imperméabilisation sous-sol chauffe-eau thermopompe
+    électriques panneau disjoncteurs filage luminaires fenêtres portes calfeutrage brique
+    pierre revêtement canexel aluminium agrandissement garage cabanon démolition permis plans
+    remplacer refaire installer réparer agrandir moderniser complet partiel existant neuf
+'''.split()
+
+MESSAGES_CONVERSATION = [
+    "Bonjour, est-ce que le prix inclut l'enlèvement des débris ?",
+    "Pouvez-vous passer voir les lieux cette semaine ?",
+    "Oui, je suis disponible jeudi en fin de journée.",
+    "Le délai indiqué tient-il compte des permis ?",
+    "Nous pouvons commencer dès la semaine prochaine.",
+    "Merci pour les photos, cela confirme notre estimation.",
+    "Est-ce que les matériaux sont garantis ?",
+    "La garantie est de 5 ans sur la main-d'œuvre.",
+    "Pouvez-vous détailler le coût des matériaux ?",
+    "Je vous envoie le plan révisé.",
+    "Parfait, je confirme le rendez-vous.",
+    "Avez-vous une assurance responsabilité ?",
+]
+MESSAGES_CHAT = [
+    "Quelqu'un a déjà refait sa toiture en hiver ?",
+    "Bonne question, je recommande d'attendre le printemps.",
+    "Quel délai avez-vous eu pour un permis d'agrandissement ?",
+    "Environ six semaines à Montréal.",
+    "Merci pour les conseils !",
+    "Les prix des matériaux ont beaucoup monté cette année.",
+    "Je cherche un bon électricien sur la Rive-Sud.",
+    "Vérifiez toujours la licence RBQ avant de signer.",
+]
+
+MOT_DE_PASSE_GENERE = 'seaop-volume'
+
+# Fin fixe de la période générée (1er septembre 2025) : la base ne dépend pas de la date du jour
+DATE_FIN = int(datetime.datetime(2025, 9, 1, tzinfo=datetime.timezone.utc).timestamp())
+DUREE_PERIODE = 2 * 365 * 86400
+JOUR = 86400
+
+# Variantes de pièces jointes distinctes ; la base stocke une copie par ligne comme l'application
+NB_VARIANTES_PIECES = 8
+
+TAILLE_LOT = 100_000
+
+def _lots(nombre: int, taille_lot: int):
+    """Bornes (début, fin) des lots de lignes"""
+    for debut in range(0, nombre, taille_lot):
+        yield debut, min(debut + taille_lot, nombre)
+
+def _dates_avant_fin(dates: np.ndarray, delais: np.ndarray) -> np.ndarray:
+    """Dates décalées d'un délai, sans dépasser la fin de la période"""
+    return np.minimum(dates + delais.astype(np.int64), DATE_FIN)
+
+def _poids(rng, nombre: int, forme: float) -> np.ndarray:
+    """Probabilités inégales (loi gamma) : quelques projets ou entrepreneurs très actifs"""
+    poids = rng.gamma(forme, size=nombre)
+    return poids / poids.sum()
+
+def _max_id(conn: sqlite3.Connection, table: str) -> int:
+    return conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+
+class PiecesJointes:
+    """Pièces jointes encodées en base64, dans les formats de colonnes de l'application"""
+
+    def __init__(self, rng, taille: int, proportion: float):
+        self.rng = rng
+        self.proportion = proportion if taille > 0 else 0.0
+        self.variantes = [base64.b64encode(rng.bytes(taille)).decode() for _ in range(NB_VARIANTES_PIECES)] \
+            if taille > 0 else []
+
+    def colonne(self, nombre: int, nombre_max: int, separateur: str = ',', prefixe: Optional[str] = None) -> List[Optional[str]]:
+        """Valeurs d'une colonne : None, ou 1 à nombre_max fichiers joints par le séparateur"""
+        valeurs = [None] * nombre
+        if not self.proportion:
+            return valeurs
+        lignes = np.flatnonzero(self.rng.random(nombre) < self.proportion)
+        nombres = self.rng.integers(1, nombre_max + 1, len(lignes))
+        choix = self.rng.integers(0, NB_VARIANTES_PIECES, (len(lignes), nombre_max))
+        for ligne, n, variantes in zip(lignes.tolist(), nombres.tolist(), choix.tolist()):
+            fichiers = [self.variantes[v] for v in variantes[:n]]
+            if prefixe:
+                fichiers = [f"{prefixe}_{ligne}_{k}.pdf:{f}" for k, f in enumerate(fichiers)]
+            valeurs[ligne] = separateur.join(fichiers)
+        return valeurs
+
+def _textes(rng, nombre: int, longueur: int) -> List[str]:
+    """Textes de travaux : mots tirés selon une loi de Zipf (quelques termes très fréquents)"""
+    rangs = (rng.zipf(1.3, size=(nombre, longueur)) - 1) % len(MOTS)
+    return [' '.join(MOTS[r] for r in ligne) for ligne in rangs.tolist()]
+
+def generer_entrepreneurs(conn: sqlite3.Connection, rng, nombre: int, rtas: List[str], mot_de_passe_hash: str) -> np.ndarray:
+    """Entrepreneurs, zones desservies (RTA et régions) et types de projets ; retourne leurs ids"""
+    ids = np.arange(1, nombre + 1) + _max_id(conn, 'entrepreneurs')
+    nb_zones = rng.integers(1, 7, nombre)
+    zones = rng.integers(0, len(rtas), (nombre, 6))
+    region_entiere = rng.random(nombre) < 0.1
+    nb_types = rng.integers(1, 5, nombre)
+    types = np.argsort(rng.random((nombre, len(TYPES_PROJETS))), axis=1)[:, :4]
+    abonnements = rng.choice(len(ABONNEMENTS), nombre, p=PROPORTIONS_ABONNEMENT)
+    avec_rbq = rng.random(nombre) < 0.8
+    credits = rng.integers(0, 50, nombre)
+    inscriptions = DATE_FIN - DUREE_PERIODE - rng.integers(0, DUREE_PERIODE, nombre)
+
+    lignes = []
+    for i, id_ in enumerate(ids.tolist()):
+        zones_desservies = [rtas[z] for z in zones[i, :nb_zones[i]]]
+        if region_entiere[i]:
+            zones_desservies = [zones_desservies[0][0]]
+        lignes.append((
+            id_, f"Construction {id_}", f"Contact {id_}", f"entrepreneur{id_}@volume.seaop.ca",
+            f"514-{id_ // 10000 % 1000:03d}-{id_ % 10000:04d}", mot_de_passe_hash,
+            f"{id_ % 10000:04d}-{id_ // 10000 % 10000:04d}-01" if avec_rbq[i] else None,
+            ','.join(zones_desservies), ','.join(TYPES_PROJETS[t] for t in types[i, :nb_types[i]]),
+            ABONNEMENTS[abonnements[i]], int(credits[i]), int(inscriptions[i])
+        ))
+    conn.executemany('''
+        INSERT INTO entrepreneurs (id, nom_entreprise, nom_contact, email, telephone, mot_de_passe_hash,
+                                   numero_rbq, zones_desservies, types_projets, abonnement, credits_restants,
+                                   date_inscription)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime(?, 'unixepoch'))
+    ''', lignes)
+    conn.commit()
+    return ids
+
+def generer_leads(conn: sqlite3.Connection, rng, nombre: int, rtas: List[str], pieces: PiecesJointes,
+                  taille_lot: int = TAILLE_LOT) -> Dict[str, np.ndarray]:
+    """Projets publiés sur la période ; retourne leurs ids, dates, types, budgets et urgences"""
+    projets = {
+        'ids': np.arange(1, nombre + 1) + _max_id(conn, 'leads'),
+        'dates': np.sort(DATE_FIN - rng.integers(0, DUREE_PERIODE, nombre)),
+        'types': rng.integers(0, len(TYPES_PROJETS), nombre),
+        'budgets': rng.choice(len(GAMMES_BUDGET), nombre, p=PROPORTIONS_BUDGET),
+        'urgences': rng.choice(len(NIVEAUX_URGENCE), nombre, p=PROPORTIONS_URGENCE),
+    }
+    # Un client sur cinq publie plusieurs projets
+    clients = rng.integers(0, max(1, int(nombre * 0.8)), nombre)
+
+    for debut, fin in _lots(nombre, taille_lot):
+        n = fin - debut
+        ids = projets['ids'][debut:fin].tolist()
+        dates = projets['dates'][debut:fin]
+        codes = rng.integers(0, 10, (n, 2))
+        lettres = rng.integers(0, 26, n)
+        delais = rng.integers(0, len(DELAIS_REALISATION), n)
+        descriptions = _textes(rng, n, 20)
+        limites = _dates_avant_fin(dates, rng.integers(14, 46, n) * JOUR)
+        debuts = dates + rng.integers(14, 180, n) * JOUR
+        photos = pieces.colonne(n, 5)
+        plans = pieces.colonne(n, 3)
+        documents = pieces.colonne(n, 3)
+        lignes = [
+            (id_, f"Client {c}", f"client{c}@volume.seaop.ca", f"438-{c // 10000 % 1000:03d}-{c % 10000:04d}",
+             f"{rtas[c % len(rtas)]} {cp[0]}{chr(65 + l)}{cp[1]}",
+             TYPES_PROJETS[t], f"{TYPES_PROJETS[t]} : {d}", GAMMES_BUDGET[b], DELAIS_REALISATION[dl],
+             ph, pl, do, date, date, id_ * 2654435761 & 0xFFFFFFFF, lim, deb, NIVEAUX_URGENCE[u])
+            for id_, c, cp, l, t, d, b, dl, ph, pl, do, date, lim, deb, u in zip(
+                ids, clients[debut:fin].tolist(), codes.tolist(), lettres.tolist(),
+                projets['types'][debut:fin].tolist(), descriptions, projets['budgets'][debut:fin].tolist(),
+                delais.tolist(), photos, plans, documents, dates.tolist(), limites.tolist(), debuts.tolist(),
+                projets['urgences'][debut:fin].tolist())
+        ]
+        conn.executemany('''
+            INSERT INTO leads (id, nom, email, telephone, code_postal, type_projet, description, budget,
+                               delai_realisation, photos, plans, documents, date_creation, numero_reference,
+                               date_limite_soumissions, date_debut_souhaite, niveau_urgence)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime(?, 'unixepoch'),
+                    'SEAOP-' || strftime('%Y%m%d', ?, 'unixepoch') || '-' || printf('%08X', ?),
+                    date(?, 'unixepoch'), date(?, 'unixepoch'), ?)
+        ''', lignes)
+    conn.commit()
+    return projets
+
+def _paires_soumissions(rng, nombre: int, nb_projets: int, nb_entrepreneurs: int) -> np.ndarray:
+    """Paires (projet, entrepreneur) distinctes, triées, sous forme de clés projet * E + entrepreneur"""
+    nombre = min(nombre, nb_projets * nb_entrepreneurs)
+    poids_projets = _poids(rng, nb_projets, 1.0)
+    poids_entrepreneurs = _poids(rng, nb_entrepreneurs, 0.7)
+    cles = np.empty(0, dtype=np.int64)
+    while len(cles) < nombre:
+        tirage = int((nombre - len(cles)) * 1.2) + 1000
+        nouvelles = (rng.choice(nb_projets, tirage, p=poids_projets).astype(np.int64) * nb_entrepreneurs
+                     + rng.choice(nb_entrepreneurs, tirage, p=poids_entrepreneurs))
+        cles = np.unique(np.concatenate([cles, nouvelles]))
+    return np.sort(rng.choice(cles, nombre, replace=False))
+
+def generer_soumissions(conn: sqlite3.Connection, rng, nombre: int, projets: Dict[str, np.ndarray],
+                        entrepreneurs: np.ndarray, pieces: PiecesJointes,
+                        taille_lot: int = TAILLE_LOT) -> Dict[str, np.ndarray]:
+    """Soumissions des entrepreneurs ; au plus une acceptée par projet, les autres refusées ou vues"""
+    from statistiques_prix import MONTANTS_GAMMES_BUDGET
+
+    cles = _paires_soumissions(rng, nombre, len(projets['ids']), len(entrepreneurs))
+    nombre = len(cles)
+    projet = cles // len(entrepreneurs)
+    soumissions = {
+        'ids': np.arange(1, nombre + 1) + _max_id(conn, 'soumissions'),
+        'projets': projet,
+        'entrepreneurs': entrepreneurs[cles % len(entrepreneurs)],
+        'dates': _dates_avant_fin(projets['dates'][projet], rng.exponential(3 * JOUR, nombre)),
+    }
+
+    # Montant : budget annoncé, écart propre au type, urgence et dispersion log-normale
+    montants_gammes = np.array([MONTANTS_GAMMES_BUDGET.get(g, MONTANT_SANS_BUDGET) for g in GAMMES_BUDGET])
+    facteurs_types = rng.uniform(0.7, 1.4, len(TYPES_PROJETS))
+    montants = (montants_gammes[projets['budgets'][projet]] * facteurs_types[projets['types'][projet]]
+                * np.array(FACTEURS_URGENCE)[projets['urgences'][projet]]
+                * rng.lognormal(0.0, 0.35, nombre))
+    montants = np.maximum(np.round(montants / 50) * 50, 100.0)
+
+    # Un projet sur trois, publié depuis plus d'un mois, a choisi une soumission
+    premiere = np.r_[True, projet[1:] != projet[:-1]]
+    attribue = (rng.random(len(projets['ids'])) < 0.35) & (projets['dates'] < DATE_FIN - 30 * JOUR)
+    statuts = np.where(rng.random(nombre) < 0.55, 'vue', 'envoyee').astype(object)
+    decide = attribue[projet]
+    statuts[decide] = np.where(rng.random(int(decide.sum())) < 0.7, 'refusee', 'vue')
+    statuts[decide & premiere] = 'acceptee'
+    soumissions['statuts'] = statuts
+
+    descriptions = _textes(rng, 2000, 30)
+    for debut, fin in _lots(nombre, taille_lot):
+        n = fin - debut
+        textes = rng.integers(0, len(descriptions), n)
+        delais = rng.integers(0, len(DELAIS_EXECUTION), n)
+        validites = rng.integers(0, len(VALIDITES_OFFRE), n)
+        documents = pieces.colonne(n, 5, separateur='|', prefixe='soumission')
+        conn.executemany('''
+            INSERT INTO soumissions (id, lead_id, entrepreneur_id, montant, description_travaux, delai_execution,
+                                     validite_offre, inclusions, exclusions, documents, statut, date_creation,
+                                     vue_par_client)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'Main-d''oeuvre et matériaux', 'Permis municipaux', ?, ?,
+                    datetime(?, 'unixepoch'), ?)
+        ''', [(id_, lead, ent, m, descriptions[t], DELAIS_EXECUTION[dl], VALIDITES_OFFRE[v], doc, s, date,
+               int(s != 'envoyee'))
+              for id_, lead, ent, m, t, dl, v, doc, s, date in zip(
+                  soumissions['ids'][debut:fin].tolist(), projets['ids'][projet[debut:fin]].tolist(),
+                  soumissions['entrepreneurs'][debut:fin].tolist(), montants[debut:fin].tolist(),
+                  textes.tolist(), delais.tolist(), validites.tolist(), documents,
+                  statuts[debut:fin].tolist(), soumissions['dates'][debut:fin].tolist())])
+
+    # Un projet attribué ne reçoit plus de soumissions
+    conn.execute('''
+        UPDATE leads SET accepte_soumissions = 0
+        WHERE id IN (SELECT lead_id FROM soumissions WHERE statut = 'acceptee')
+    ''')
+    conn.commit()
+    return soumissions
+
+def generer_messages(conn: sqlite3.Connection, rng, nombre: int, projets: Dict[str, np.ndarray],
+                     soumissions: Dict[str, np.ndarray], pieces: PiecesJointes, taille_lot: int = TAILLE_LOT) -> int:
+    """Conversations client-entrepreneur autour des soumissions, identifiants comme envoyer_message"""
+    if not len(soumissions['ids']):
+        return 0
+    poids = _poids(rng, len(soumissions['ids']), 0.5)
+    for debut, fin in _lots(nombre, taille_lot):
+        n = fin - debut
+        conversations = rng.choice(len(soumissions['ids']), n, p=poids)
+        leads = projets['ids'][soumissions['projets'][conversations]]
+        entrepreneurs = soumissions['entrepreneurs'][conversations]
+        dates = _dates_avant_fin(soumissions['dates'][conversations], rng.exponential(5 * JOUR, n))
+        du_client = rng.random(n) < 0.5
+        textes = rng.integers(0, len(MESSAGES_CONVERSATION), n)
+        lus = (rng.random(n) < 0.9) | (dates < DATE_FIN - 7 * JOUR)
+        pieces_jointes = pieces.colonne(n, 2)
+        ordre = np.argsort(dates, kind='stable')
+        conn.executemany('''
+            INSERT INTO messages (lead_id, entrepreneur_id, expediteur_type, expediteur_id, destinataire_id,
+                                  message, pieces_jointes, date_envoi, lu)
+            VALUES (?, ?, ?, ?, ?, ?, ?, datetime(?, 'unixepoch'), ?)
+        ''', [(lead, ent, 'client' if client else 'entrepreneur', lead if client else ent,
+               ent if client else lead, MESSAGES_CONVERSATION[t], pieces_jointes[i], date, lu)
+              for i, lead, ent, client, t, date, lu in zip(
+                  ordre.tolist(), leads[ordre].tolist(), entrepreneurs[ordre].tolist(), du_client[ordre].tolist(),
+                  textes[ordre].tolist(), dates[ordre].tolist(), lus[ordre].astype(int).tolist())])
+    conn.commit()
+    return nombre
+
+def generer_notifications(conn: sqlite3.Connection, rng, nombre: int, projets: Dict[str, np.ndarray],
+                          soumissions: Dict[str, np.ndarray], taille_lot: int = TAILLE_LOT) -> int:
+    """Notifications des types créés par l'application (soumissions, décisions, messages, appariement)"""
+    if not len(soumissions['ids']):
+        return 0
+    for debut, fin in _lots(nombre, taille_lot):
+        n = fin - debut
+        choix = rng.integers(0, len(soumissions['ids']), n)
+        sortes = rng.choice(4, n, p=[0.4, 0.2, 0.2, 0.2])
+        dates = _dates_avant_fin(soumissions['dates'][choix], rng.exponential(2 * JOUR, n))
+        lues = rng.random(n) < 0.8
+        lignes = []
+        for sorte, s, date, lu in zip(sortes.tolist(), choix.tolist(), dates.tolist(), lues.tolist()):
+            lead = int(projets['ids'][soumissions['projets'][s]])
+            entrepreneur = int(soumissions['entrepreneurs'][s])
+            type_projet = TYPES_PROJETS[projets['types'][soumissions['projets'][s]]]
+            statut = soumissions['statuts'][s]
+            if sorte == 0:
+                ligne = ('client', lead, 'nouvelle_soumission', "📩 Nouvelle soumission reçue",
+                         f"Vous avez reçu une nouvelle soumission pour votre projet : {type_projet}", lead)
+            elif sorte == 1 and statut == 'acceptee':
+                ligne = ('entrepreneur', entrepreneur, 'soumission_acceptee', "🎉 Soumission acceptée !",
+                         f"Félicitations ! Votre soumission pour le projet '{type_projet}' a été acceptée.",
+                         int(soumissions['ids'][s]))
+            elif sorte == 1 and statut == 'refusee':
+                ligne = ('entrepreneur', entrepreneur, 'soumission_refusee', "❌ Soumission non retenue",
+                         f"Votre soumission pour le projet '{type_projet}' n'a pas été retenue. "
+                         f"Continuez à soumissionner !", int(soumissions['ids'][s]))
+            elif sorte == 1:
+                ligne = ('entrepreneur', entrepreneur, 'projet_correspondant', "🔔 Nouveau projet correspondant",
+                         f"Un nouveau projet correspond à votre profil : {type_projet}", lead)
+            elif sorte == 2:
+                ligne = ('entrepreneur', entrepreneur, 'nouveau_message', "💬 Nouveau message client",
+                         "Vous avez reçu un nouveau message d'un client", lead)
+            else:
+                ligne = ('client', lead, 'nouveau_message', "💬 Nouveau message entrepreneur",
+                         "Vous avez reçu un nouveau message d'un entrepreneur", lead)
+            lignes.append(ligne + (int(lu), date))
+        conn.executemany('''
+            INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, titre, message,
+                                       lien_id, lu, date_creation)
+            VALUES (?, ?, ?, ?, ?, ?, ?, datetime(?, 'unixepoch'))
+        ''', lignes)
+    conn.commit()
+    return nombre
+
+def generer_chat(conn: sqlite3.Connection, rng, nombre: int, nb_likes: int, entrepreneurs: np.ndarray,
+                 nb_clients: int, taille_lot: int = TAILLE_LOT) -> int:
+    """Chat Room : un tiers de réponses à des messages récents, likes uniques comptés par les triggers"""
+    premier = _max_id(conn, 'chat_room') + 1
+    dates = np.sort(DATE_FIN - rng.integers(0, DUREE_PERIODE, nombre))
+    ids = np.arange(premier, premier + nombre)
+    reponses = (ids - premier >= 200) & (rng.random(nombre) < 0.33)
+    parents = np.where(reponses, ids - rng.integers(1, 200, nombre), 0)
+    # Trois auteurs sur dix sont des entrepreneurs
+    auteurs = rng.integers(0, max(1, nb_clients), nombre)
+    par_entrepreneur = (rng.random(nombre) < 0.3) & (len(entrepreneurs) > 0)
+    textes = rng.integers(0, len(MESSAGES_CHAT), nombre)
+
+    lignes = []
+    for id_, parent, auteur, ent, t, date in zip(ids.tolist(), parents.tolist(), auteurs.tolist(),
+                                                 par_entrepreneur.tolist(), textes.tolist(), dates.tolist()):
+        if ent:
+            e = int(entrepreneurs[auteur % len(entrepreneurs)])
+            auteur_ligne = ('entrepreneur', f"Contact {e} - Construction {e}", f"entrepreneur{e}@volume.seaop.ca",
+                            e, 'verified')
+        else:
+            auteur_ligne = ('client', f"Client {auteur}", f"client{auteur}@volume.seaop.ca", None, None)
+        lignes.append((id_,) + auteur_ligne + (MESSAGES_CHAT[t], parent or None, int(id_ - premier < 3), date))
+    for debut, fin in _lots(nombre, taille_lot):
+        conn.executemany('''
+            INSERT INTO chat_room (id, user_type, user_name, user_email, user_id, user_badge, message, parent_id,
+                                   is_pinned, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime(?, 'unixepoch'))
+        ''', lignes[debut:fin])
+
+    if nombre and nb_likes:
+        messages = rng.integers(premier, premier + nombre, nb_likes)
+        utilisateurs = rng.integers(0, max(1, nb_clients), nb_likes)
+        dates_likes = _dates_avant_fin(dates[messages - premier], rng.exponential(JOUR, nb_likes))
+        conn.executemany('''
+            INSERT OR IGNORE INTO chat_room_likes (message_id, user_email, created_at)
+            VALUES (?, ?, datetime(?, 'unixepoch'))
+        ''', [(m, f"client{u}@volume.seaop.ca", date)
+              for m, u, date in zip(messages.tolist(), utilisateurs.tolist(), dates_likes.tolist())])
+    conn.commit()
+    return nombre
+
+def generer(chemin: str, graine: int = 42, nb_leads: int = 100_000, nb_entrepreneurs: int = 5_000,
+            nb_soumissions: int = 1_000_000, nb_messages: int = 5_000_000, nb_notifications: int = 1_000_000,
+            nb_chat: int = 200_000, nb_likes_chat: int = 400_000, taille_pieces_jointes: int = 0,
+            proportion_pieces_jointes: float = 0.05, taille_lot: int = TAILLE_LOT,
+            mot_de_passe_hash: str = '') -> Dict[str, int]:
+    """
+    Remplit la base (schéma déjà créé) et retourne le nombre de lignes par table.
+    Les tables du Chat Room, ses index et ses triggers de likes sont créés au besoin.
+    """
+    from chatroom_functions import assurer_tables_chat
+    from fils_chat import assurer_index_fils
+    from likes_chat import assurer_likes
+
+    assurer_tables_chat(chemin)
+    assurer_index_fils(chemin)
+    assurer_likes(chemin)
+
+    rng = np.random.default_rng(graine)
+    pieces = PiecesJointes(rng, taille_pieces_jointes, proportion_pieces_jointes)
+
+    conn = sqlite3.connect(chemin)
+    # Génération seulement : une coupure laisse une base à régénérer
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA cache_size = -262144')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    rtas = [r[0] for r in conn.execute("SELECT rta FROM centroides_rta WHERE rta GLOB '[GHJ]*' ORDER BY rta")] \
+        or ['H2X', 'H3A', 'G1R', 'J4K']
+
+    volumes = {}
+    resultats = {}
+    etapes = [
+        ('entrepreneurs', lambda: generer_entrepreneurs(conn, rng, nb_entrepreneurs, rtas, mot_de_passe_hash)),
+        ('leads', lambda: generer_leads(conn, rng, nb_leads, rtas, pieces, taille_lot)),
+        ('soumissions', lambda: generer_soumissions(conn, rng, nb_soumissions, resultats['leads'],
+                                                    resultats['entrepreneurs'], pieces, taille_lot)),
+        ('messages', lambda: generer_messages(conn, rng, nb_messages, resultats['leads'],
+                                              resultats['soumissions'], pieces, taille_lot)),
+        ('notifications', lambda: generer_notifications(conn, rng, nb_notifications, resultats['leads'],
+                                                        resultats['soumissions'], taille_lot)),
+        ('chat_room', lambda: generer_chat(conn, rng, nb_chat, nb_likes_chat, resultats['entrepreneurs'],
+                                           int(nb_leads * 0.8), taille_lot)),
+    ]
+    try:
+        for table, etape in etapes:
+            debut = time.perf_counter()
+            resultats[table] = etape()
+            volumes[table] = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            duree = time.perf_counter() - debut
+            print(f"{table:15s} {volumes[table]:>12,} lignes  {duree:7.1f} s")
+        volumes['chat_room_likes'] = conn.execute('SELECT COUNT(*) FROM chat_room_likes').fetchone()[0]
+    finally:
+        conn.close()
+    return volumes
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère une base SEAOP synthétique aux volumes de production")
+    parser.add_argument('--data-dir', required=True, help="Dossier de la base cible (seaop.db, créée au besoin)")
+    parser.add_argument('--graine', type=int, default=42)
+    parser.add_argument('--leads', type=int, default=100_000)
+    parser.add_argument('--entrepreneurs', type=int, default=5_000)
+    parser.add_argument('--soumissions', type=int, default=1_000_000)
+    parser.add_argument('--messages', type=int, default=5_000_000)
+    parser.add_argument('--notifications', type=int, default=1_000_000)
+    parser.add_argument('--chat', type=int, default=200_000, help="Messages du Chat Room")
+    parser.add_argument('--likes-chat', type=int, default=400_000, help="Likes tirés (doublons écartés)")
+    parser.add_argument('--taille-pieces-jointes', type=int, default=0,
+                        help="Octets par pièce jointe avant encodage base64 (0 : aucune)")
+    parser.add_argument('--proportion-pieces-jointes', type=float, default=0.05,
+                        help="Part des projets, soumissions et messages qui ont des pièces jointes")
+    parser.add_argument('--taille-lot', type=int, default=TAILLE_LOT)
+    args = parser.parse_args()
+
+    # Les modules de l'application lisent DATA_DIR à l'import
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.environ['DATA_DIR'] = args.data_dir
+    import acces_donnees
+    from statistiques_prix import recalculer_statistiques_prix
+
+    debut = time.perf_counter()
+    acces_donnees.init_database()
+    volumes = generer(acces_donnees.DATABASE_PATH, graine=args.graine, nb_leads=args.leads,
+                      nb_entrepreneurs=args.entrepreneurs, nb_soumissions=args.soumissions,
+                      nb_messages=args.messages, nb_notifications=args.notifications, nb_chat=args.chat,
+                      nb_likes_chat=args.likes_chat, taille_pieces_jointes=args.taille_pieces_jointes,
+                      proportion_pieces_jointes=args.proportion_pieces_jointes, taille_lot=args.taille_lot,
+                      mot_de_passe_hash=acces_donnees.hash_password(MOT_DE_PASSE_GENERE))
+    recalculer_statistiques_prix()
+    duree = time.perf_counter() - debut
+    total = sum(volumes.values())
+    print(f"\n{total:,} lignes en {duree:.1f} s ({total / duree:,.0f} lignes/s) dans {acces_donnees.DATABASE_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Grilles d'administration SEAOP - filtrage, tri et pagination côté SQL
+
+Les listes de l'administration (estimations, technologue, architecture,
+ingénieur) sont paginées par clé (keyset) : chaque page reprend après la
+dernière ligne affichée au lieu d'utiliser OFFSET, et le total est obtenu par
+un COUNT servi par les index (statut, date_demande). Le temps de réponse reste
+ainsi constant quelle que soit la taille des tables. Les expressions de tri
+remplacent NULL (COALESCE) : une comparaison de valeurs de ligne avec NULL
+n'est jamais vraie et la ligne disparaîtrait des pages suivantes. Les colonnes volumineuses
+(plans, photos, documents en base64) ne font jamais partie des lignes.
+"""
+
+import sqlite3
+import os
+from typing import Optional, List, Dict, Any, Tuple
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+TAILLE_PAGE_DEFAUT = 20
+
+# Tris communs aux demandes de services professionnels
+TRIS_SERVICES = {
+    'date_desc': ("COALESCE(date_demande, '')", 'DESC'),
+    'date_asc': ("COALESCE(date_demande, '')", 'ASC'),
+    'prix_desc': ('COALESCE(prix_service, 0)', 'DESC'),
+    'prix_asc': ('COALESCE(prix_service, 0)', 'ASC'),
+    'statut': ("COALESCE(statut, '')", 'ASC'),
+}
+
+# Définition des grilles : table, colonnes affichées, filtres et tris autorisés,
+# index nécessaires. Le rowid (id) est ajouté implicitement à chaque index, ce
+# qui couvre le départage des ex aequo de la pagination.
+GRILLES_ADMIN = {
+    'estimations': {
+        'table': 'estimations',
+        'colonnes': [
+            'id', 'nom_client', 'email_client', 'telephone_client', 'type_projet',
+            'description_detaillee', 'budget_approximatif', 'prix_estimation',
+            'statut', 'date_demande', 'numero_reference', 'notes_internes'
+        ],
+        'filtres': ('statut', 'type_projet'),
+        'tris': {
+            'date_desc': ("COALESCE(date_demande, '')", 'DESC'),
+            'date_asc': ("COALESCE(date_demande, '')", 'ASC'),
+            'prix_asc': ('COALESCE(prix_estimation, 0)', 'ASC'),
+            'prix_desc': ('COALESCE(prix_estimation, 0)', 'DESC'),
+            'statut': ("COALESCE(statut, '')", 'ASC'),
+        },
+        'index': {
+            'idx_estimations_statut_date_tri': "(statut, COALESCE(date_demande, ''))",
+            'idx_estimations_type_date_tri': "(type_projet, COALESCE(date_demande, ''))",
+            'idx_estimations_date_tri': "(COALESCE(date_demande, ''))",
+            'idx_estimations_statut_tri': "(COALESCE(statut, ''))",
+            'idx_estimations_prix': '(COALESCE(prix_estimation, 0))',
+        },
+        'index_remplaces': ('idx_estimations_statut_date', 'idx_estimations_type_date'),
+    },
+    'technologue': {
+        'table': 'demandes_technologue',
+        'colonnes': [
+            'id', 'nom_client', 'email_client', 'telephone_client', 'ville', 'type_batiment',
+            'superficie_batiment', 'nombre_etages', 'budget_technologue', 'prix_service',
+            'statut', 'date_demande', 'numero_reference', 'niveau_urgence',
+            'pourcentage_complete', 'usage_batiment', 'type_construction', 'services_inclus'
+        ],
+        'filtres': ('statut',),
+        'tris': TRIS_SERVICES,
+        'index': {
+            'idx_tech_statut_date_tri': "(statut, COALESCE(date_demande, ''))",
+            'idx_tech_date_tri': "(COALESCE(date_demande, ''))",
+            'idx_tech_statut_tri': "(COALESCE(statut, ''))",
+            'idx_tech_prix': '(COALESCE(prix_service, 0))',
+        },
+        'index_remplaces': ('idx_tech_statut_date',),
+    },
+    'architecture': {
+        'table': 'demandes_architecture',
+        'colonnes': [
+            'id', 'nom_client', 'email_client', 'telephone_client', 'ville', 'type_batiment',
+            'superficie_batiment', 'nombre_etages', 'budget_construction', 'prix_service',
+            'statut', 'date_demande', 'numero_reference', 'niveau_urgence',
+            'pourcentage_complete', 'usage_batiment'
+        ],
+        'filtres': ('statut',),
+        'tris': TRIS_SERVICES,
+        'index': {
+            'idx_arch_statut_date_tri': "(statut, COALESCE(date_demande, ''))",
+            'idx_arch_date_tri': "(COALESCE(date_demande, ''))",
+            'idx_arch_statut_tri': "(COALESCE(statut, ''))",
+            'idx_arch_prix': '(COALESCE(prix_service, 0))',
+        },
+        'index_remplaces': ('idx_arch_statut_date',),
+    },
+    'ingenieur': {
+        'table': 'demandes_ingenieur',
+        'colonnes': [
+            'id', 'nom_client', 'email_client', 'telephone_client', 'ville', 'type_structure',
+            'superficie_projet', 'nombre_etages', 'budget_ingenieur', 'prix_service',
+            'statut', 'date_demande', 'numero_reference', 'niveau_urgence',
+            'pourcentage_complete', 'usage_structure', 'type_construction', 'services_demandes'
+        ],
+        'filtres': ('statut',),
+        'tris': TRIS_SERVICES,
+        'index': {
+            'idx_ing_statut_date_tri': "(statut, COALESCE(date_demande, ''))",
+            'idx_ing_date_tri': "(COALESCE(date_demande, ''))",
+            'idx_ing_statut_tri': "(COALESCE(statut, ''))",
+            'idx_ing_prix': '(COALESCE(prix_service, 0))',
+        },
+        'index_remplaces': ('idx_ing_statut_date',),
+    },
+}
+
+# Tables dont les index de grille ont déjà été vérifiés dans ce processus
+_index_verifies = set()
+
+def assurer_index_grille(conn: sqlite3.Connection, nom_grille: str):
+    """Crée les index composites de la grille s'ils n'existent pas encore (et retire ceux qu'ils remplacent)"""
+    if nom_grille in _index_verifies:
+        return
+
+    config = GRILLES_ADMIN[nom_grille]
+    cursor = conn.cursor()
+    for nom_index in config.get('index_remplaces', ()):
+        cursor.execute(f"DROP INDEX IF EXISTS {nom_index}")
+    for nom_index, definition in config['index'].items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {nom_index} ON {config['table']}{definition}")
+    conn.commit()
+    _index_verifies.add(nom_grille)
+
+def _construire_where(config: Dict, filtres: Optional[Dict]) -> Tuple[List[str], List[Any]]:
+    """Traduit les filtres autorisés en clauses WHERE paramétrées"""
+    clauses = []
+    params = []
+    for colonne, valeur in (filtres or {}).items():
+        if colonne not in config['filtres']:
+            raise ValueError(f"Filtre non autorisé pour cette grille: {colonne}")
+        if valeur in (None, '', 'Tous'):
+            continue
+        clauses.append(f"{colonne} = ?")
+        params.append(valeur)
+    return clauses, params
+
+def compter_grille(nom_grille: str, filtres: Optional[Dict] = None) -> int:
+    """Compte les lignes correspondant aux filtres (COUNT servi par les index)"""
+    config = GRILLES_ADMIN[nom_grille]
+    clauses, params = _construire_where(config, filtres)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        assurer_index_grille(conn, nom_grille)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {config['table']} {where}", params)
+        return cursor.fetchone()[0]
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            return 0
+        raise
+    finally:
+        conn.close()
+
+def charger_page_grille(nom_grille: str, filtres: Optional[Dict] = None, tri: Optional[str] = None,
+                        curseur: Optional[Tuple] = None, taille_page: int = TAILLE_PAGE_DEFAUT) -> Dict:
+    """
+    Charge une page d'une grille d'administration.
+
+    Le curseur est la paire (valeur de tri, id) de la dernière ligne de la page
+    précédente, telle que renvoyée dans 'curseur_suivant'. Retourne un dict avec
+    'lignes', 'total' et 'curseur_suivant' (None s'il n'y a pas de page suivante).
+    """
+    config = GRILLES_ADMIN[nom_grille]
+    if tri not in config['tris']:
+        tri = next(iter(config['tris']))
+    expression_tri, sens = config['tris'][tri]
+
+    clauses, params = _construire_where(config, filtres)
+    clauses_page = list(clauses)
+    params_page = list(params)
+    if curseur is not None:
+        # Comparaison de valeurs de ligne : reprend strictement après le curseur
+        operateur = '<' if sens == 'DESC' else '>'
+        clauses_page.append(f"({expression_tri}, id) {operateur} (?, ?)")
+        params_page.extend(curseur)
+    where_page = f"WHERE {' AND '.join(clauses_page)}" if clauses_page else ""
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        assurer_index_grille(conn, nom_grille)
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT {', '.join(config['colonnes'])}, {expression_tri}
+            FROM {config['table']}
+            {where_page}
+            ORDER BY {expression_tri} {sens}, id {sens}
+            LIMIT ?
+        ''', params_page + [taille_page + 1])
+        rows = cursor.fetchall()
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor.execute(f"SELECT COUNT(*) FROM {config['table']} {where}", params)
+        total = cursor.fetchone()[0]
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            return {'lignes': [], 'total': 0, 'curseur_suivant': None}
+        raise
+    finally:
+        conn.close()
+
+    nb_colonnes = len(config['colonnes'])
+    lignes = [dict(zip(config['colonnes'], row[:nb_colonnes])) for row in rows[:taille_page]]
+
+    curseur_suivant = None
+    if len(rows) > taille_page:
+        derniere = rows[taille_page - 1]
+        curseur_suivant = (derniere[nb_colonnes], derniere[0])
+
+    return {
+        'lignes': lignes,
+        'total': total,
+        'curseur_suivant': curseur_suivant
+    }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instantané de la page d'accueil SEAOP
+
+La page d'accueil est affichée à chaque rerun de chaque visiteur, anonymes
+compris. Plutôt que de relire tous les projets visibles (pièces jointes
+comprises) et de réévaluer leur urgence à chaque affichage, un instantané
+est calculé par la tâche de fond toutes les INTERVALLE_INSTANTANE secondes
+et partagé en mémoire par les sessions du processus :
+- les NOMBRE_PROJETS_ACCUEIL premiers projets ouverts, dans l'ordre de
+  get_projets_disponibles (urgence, date limite, date de création), avec
+  les seules colonnes des cartes ;
+- les compteurs affichés (appels d'offres actifs, fournisseurs actifs,
+  soumissions) et leur progression sur 7 jours.
+La tâche réévalue d'abord l'urgence des projets ouverts. get_instantane_accueil()
+ne fait aucune requête, sauf au premier affichage d'un processus si la tâche
+n'a pas encore tourné (un seul calcul, les autres sessions l'attendent).
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from base_donnees import connecter_lecture
+from acces_donnees import actualiser_urgences_projets, calculer_jours_restants
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Intervalle de recalcul de l'instantané (tâche de fond, secondes)
+INTERVALLE_INSTANTANE = 30
+
+# Projets présentés sur la page d'accueil
+NOMBRE_PROJETS_ACCUEIL = 5
+
+_instantanes: Dict[str, Dict] = {}
+_verrou_calcul = threading.Lock()
+
+def calculer_instantane_accueil(chemin: Optional[str] = None) -> Dict:
+    """Lit les projets et les compteurs de la page d'accueil"""
+    chemin = chemin or DATABASE_PATH
+    conn = connecter_lecture(chemin)
+    try:
+        lignes = conn.execute('''
+            SELECT l.id, l.type_projet, l.code_postal, l.budget, l.delai_realisation,
+                   l.date_limite_soumissions, l.date_debut_souhaite, l.niveau_urgence, l.date_creation,
+                   (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id) as nb_soumissions
+            FROM leads l
+            WHERE l.visible_entrepreneurs = 1 AND l.accepte_soumissions = 1
+            ORDER BY
+                CASE l.niveau_urgence
+                    WHEN 'critique' THEN 1
+                    WHEN 'eleve' THEN 2
+                    WHEN 'normal' THEN 3
+                    WHEN 'faible' THEN 4
+                END,
+                l.date_limite_soumissions ASC,
+                l.date_creation DESC
+            LIMIT ?
+        ''', (NOMBRE_PROJETS_ACCUEIL,)).fetchall()
+
+        compteurs = conn.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM leads
+                 WHERE visible_entrepreneurs = 1 AND accepte_soumissions = 1),
+                (SELECT COUNT(*) FROM leads
+                 WHERE visible_entrepreneurs = 1 AND accepte_soumissions = 1
+                   AND date_creation >= datetime('now', '-7 days')),
+                (SELECT COUNT(*) FROM entrepreneurs WHERE statut = 'actif'),
+                (SELECT COUNT(*) FROM entrepreneurs
+                 WHERE statut = 'actif' AND date_inscription >= datetime('now', '-7 days')),
+                (SELECT COUNT(*) FROM soumissions),
+                (SELECT COUNT(*) FROM soumissions WHERE date_creation >= datetime('now', '-7 days'))
+        ''').fetchone()
+    finally:
+        conn.close()
+
+    projets = []
+    for ligne in lignes:
+        projet = dict(zip(('id', 'type_projet', 'code_postal', 'budget', 'delai_realisation',
+                           'date_limite_soumissions', 'date_debut_souhaite', 'niveau_urgence',
+                           'date_creation', 'nb_soumissions'), ligne))
+        projet['jours_restants_soumissions'] = calculer_jours_restants(projet['date_limite_soumissions'])
+        projet['jours_restants_debut'] = calculer_jours_restants(projet['date_debut_souhaite'])
+        projets.append(projet)
+
+    return {
+        'horodatage': time.time(),
+        'projets': projets,
+        'appels_offres_actifs': compteurs[0],
+        'appels_offres_semaine': compteurs[1],
+        'fournisseurs': compteurs[2],
+        'fournisseurs_semaine': compteurs[3],
+        'soumissions': compteurs[4],
+        'soumissions_semaine': compteurs[5],
+    }
+
+def _actualiser(chemin: str) -> Dict:
+    actualiser_urgences_projets(chemin)
+    instantane = calculer_instantane_accueil(chemin)
+    _instantanes[chemin] = instantane
+    return instantane
+
+def actualiser_instantane_accueil(chemin: Optional[str] = None) -> Dict:
+    """Tâche de fond : réévalue l'urgence des projets ouverts puis remplace l'instantané partagé"""
+    chemin = chemin or DATABASE_PATH
+    with _verrou_calcul:
+        return _actualiser(chemin)
+
+def get_instantane_accueil(chemin: Optional[str] = None) -> Dict:
+    """Instantané partagé de la page d'accueil, calculé ici seulement s'il n'existe pas encore"""
+    chemin = chemin or DATABASE_PATH
+    instantane = _instantanes.get(chemin)
+    if instantane is None:
+        with _verrou_calcul:
+            instantane = _instantanes.get(chemin) or _actualiser(chemin)
+    return instantane
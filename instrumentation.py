@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentation des reruns SEAOP : requêtes SQL, durées et arbre d'appels
+
+Chaque rerun Streamlit est tracé de bout en bout (tracer_rerun) :
+- les connexions sqlite3 utilisées pendant le rerun, dans son fil (ou dans
+  les fils de lecture de chargement_parallele, qui reprennent son contexte),
+  comptent leurs requêtes et le temps passé dans SQLite (exécution et
+  lecture des lignes), et retiennent les INSTRUCTIONS_LENTES plus lentes ;
+- les fonctions de page et d'accès aux données enveloppées par
+  instrumenter_fonctions forment un arbre de spans (appels, durée,
+  requêtes et temps SQL de chacune, sous-appels compris) ; les appels
+  répétés d'une fonction sous un même parent sont cumulés dans un span.
+
+Une trace terminée est gardée en mémoire (les TRACES_EN_MEMOIRE dernières,
+pour la section Performance du panel d'administration) et ajoutée comme
+une ligne JSON au fichier traces_reruns.jsonl de DATA_DIR, en rotation
+(TAILLE_MAX_FICHIER octets, FICHIERS_CONSERVES anciens fichiers).
+
+Hors d'un rerun tracé (tâches de fond, écrivain unique, scripts), les
+connexions et fonctions instrumentées ne tracent rien ; les connexions
+signalent toutefois leurs instructions lentes au journal requetes_lentes. SEAOP_INSTRUMENTATION=0
+désactive l'instrumentation.
+
+Usage :
+    installer()                                             # une fois par processus
+    instrumenter_fonctions(globals(), ('page_', 'get_'))    # fin du module de l'application
+    with tracer_rerun() as trace:
+        main()
+        trace.page = st.session_state.get('page')
+"""
+
+import contextvars
+import functools
+import heapq
+import json
+import logging
+import logging.handlers
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import requetes_lentes
+from metriques import compteur, histogramme
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+FICHIER_TRACES = os.path.join(DATA_DIR, 'traces_reruns.jsonl')
+
+INSTRUMENTATION_ACTIVE = os.getenv('SEAOP_INSTRUMENTATION', '1') != '0'
+
+# Instructions les plus lentes retenues par rerun, et longueur maximale de leur texte
+INSTRUCTIONS_LENTES = 5
+LONGUEUR_SQL = 300
+
+# Rotation du fichier de traces
+TAILLE_MAX_FICHIER = 5 * 1024 * 1024
+FICHIERS_CONSERVES = 3
+
+TRACES_EN_MEMOIRE = 500
+
+_trace_courante = contextvars.ContextVar('seaop_trace', default=None)
+_span_courant = contextvars.ContextVar('seaop_span', default=None)
+_traces_recentes = deque(maxlen=TRACES_EN_MEMOIRE)
+_journaux: Dict[str, logging.Logger] = {}
+_verrou = threading.Lock()
+_connecter = sqlite3.connect
+
+REQUETES_SQL = compteur('seaop_requetes_sql_total', "Instructions SQL exécutées")
+DUREE_SQL = compteur('seaop_sql_secondes_total', "Temps passé dans SQLite (exécution et lecture des lignes)")
+REQUETES_LENTES = compteur('seaop_requetes_lentes_total', "Instructions au-delà du seuil des requêtes lentes")
+DUREE_RERUNS = histogramme('seaop_rerun_duree_secondes', "Durée des reruns par page", ('page',))
+RERUNS = compteur('seaop_reruns_total', "Reruns par page et issue", ('page', 'issue'))
+
+class Span:
+    """Fonction mesurée sous un parent : appels, durée, requêtes et temps SQL, sous-appels compris"""
+
+    def __init__(self, nom: str, parent: Optional['Span'] = None):
+        self.nom = nom
+        self.parent = parent
+        self.appels = 0
+        self.duree_ms = 0.0
+        self.requetes = 0
+        self.duree_sql_ms = 0.0
+        self.enfants: Dict[str, 'Span'] = {}
+
+    def enfant(self, nom: str) -> 'Span':
+        """Span d'une fonction appelée sous celui-ci (les appels répétés sont cumulés)"""
+        with _verrou:
+            if nom not in self.enfants:
+                self.enfants[nom] = Span(nom, self)
+            return self.enfants[nom]
+
+    def imputer(self, requetes: int, duree_ms: float):
+        """Impute des requêtes et du temps SQL à ce span et à ses ancêtres"""
+        span = self
+        while span is not None:
+            span.requetes += requetes
+            span.duree_sql_ms += duree_ms
+            span = span.parent
+
+    def en_dict(self) -> dict:
+        return {
+            'nom': self.nom,
+            'appels': self.appels,
+            'duree_ms': round(self.duree_ms, 3),
+            'requetes': self.requetes,
+            'duree_sql_ms': round(self.duree_sql_ms, 3),
+            'enfants': [enfant.en_dict() for enfant in self.enfants.values()],
+        }
+
+class Trace:
+    """Un rerun : span racine, instructions les plus lentes, page et issue"""
+
+    def __init__(self):
+        self.horodatage = time.time()
+        self.page: Optional[str] = None
+        self.issue = 'ok'
+        self.debut = time.perf_counter()
+        self.racine = Span('rerun')
+        self._lentes: list = []   # tas (durée, rang, instruction, span) des plus lentes
+        self._rang = 0
+        # Les lectures parallèles d'un rerun imputent leurs requêtes depuis plusieurs fils
+        self._verrou = threading.Lock()
+
+    def instruction(self, sql: str, duree_ms: float):
+        """Enregistre une instruction SQL exécutée dans le span courant"""
+        span = _span_courant.get() or self.racine
+        with self._verrou:
+            span.imputer(1, duree_ms)
+            self._rang += 1
+            entree = (duree_ms, self._rang, sql, span.nom)
+            if len(self._lentes) < INSTRUCTIONS_LENTES:
+                heapq.heappush(self._lentes, entree)
+            elif duree_ms > self._lentes[0][0]:
+                heapq.heapreplace(self._lentes, entree)
+
+    def lecture(self, duree_ms: float):
+        """Temps de lecture des lignes, imputé au span courant sans compter de requête"""
+        span = _span_courant.get() or self.racine
+        with self._verrou:
+            span.imputer(0, duree_ms)
+
+    def en_dict(self) -> dict:
+        return {
+            'horodatage': round(self.horodatage, 3),
+            'page': self.page,
+            'issue': self.issue,
+            'duree_ms': round(self.racine.duree_ms, 3),
+            'requetes': self.racine.requetes,
+            'duree_sql_ms': round(self.racine.duree_sql_ms, 3),
+            'instructions_lentes': [
+                {'sql': ' '.join(sql.split())[:LONGUEUR_SQL], 'duree_ms': round(duree, 3), 'span': span}
+                for duree, _, sql, span in sorted(self._lentes, reverse=True)
+            ],
+            'spans': self.racine.en_dict()['enfants'],
+        }
+
+class CurseurInstrumente(sqlite3.Cursor):
+    """Curseur qui impute ses exécutions et lectures à la trace du rerun en cours et signale les lentes"""
+
+    # [sql, paramètres, durée cumulée (ms), plan relevable] de la dernière instruction, jusqu'au seuil
+    _instruction = None
+
+    def _mesurer(self, methode, sql, parametres, explicable: bool):
+        self._instruction = None
+        debut = time.perf_counter()
+        try:
+            resultat = methode()
+        finally:
+            duree_ms = (time.perf_counter() - debut) * 1000
+            REQUETES_SQL.incrementer()
+            DUREE_SQL.incrementer(duree_ms / 1000)
+            trace = _trace_courante.get()
+            if trace is not None:
+                trace.instruction(sql, duree_ms)
+        # La lecture des lignes peut encore allonger l'instruction : suivie jusqu'au seuil
+        self._instruction = [sql, parametres, duree_ms, explicable]
+        self._verifier_lenteur()
+        return resultat
+
+    def _lire(self, methode, *args):
+        debut = time.perf_counter()
+        try:
+            return methode(*args)
+        finally:
+            duree_ms = (time.perf_counter() - debut) * 1000
+            DUREE_SQL.incrementer(duree_ms / 1000)
+            trace = _trace_courante.get()
+            if trace is not None:
+                trace.lecture(duree_ms)
+            if self._instruction is not None:
+                self._instruction[2] += duree_ms
+                self._verifier_lenteur()
+
+    def _verifier_lenteur(self):
+        sql, parametres, duree_ms, explicable = self._instruction
+        if duree_ms >= requetes_lentes.SEUIL_MS:
+            self._instruction = None
+            REQUETES_LENTES.incrementer()
+            requetes_lentes.noter_requete_lente(self.connection, getattr(self.connection, 'chemin', None),
+                                                sql, parametres, duree_ms, explicable)
+
+    def execute(self, sql, parametres=()):
+        return self._mesurer(lambda: super(CurseurInstrumente, self).execute(sql, parametres),
+                             sql, parametres, True)
+
+    def executemany(self, sql, suite):
+        # Le plan est relevé avec les paramètres de la première ligne, si la suite est une liste
+        premiers = suite[0] if isinstance(suite, (list, tuple)) and suite else ()
+        return self._mesurer(lambda: super(CurseurInstrumente, self).executemany(sql, suite),
+                             sql, premiers, bool(premiers))
+
+    def executescript(self, script):
+        return self._mesurer(lambda: super(CurseurInstrumente, self).executescript(script), script, (), False)
+
+    def fetchone(self):
+        return self._lire(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self._lire(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self._lire(super().fetchall)
+
+class ConnexionInstrumentee(sqlite3.Connection):
+    """Connexion dont les curseurs (explicites ou implicites) sont instrumentés"""
+
+    def cursor(self, factory=CurseurInstrumente):
+        return super().cursor(factory)
+
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+def _connecter_instrumente(*args, **kwargs):
+    kwargs.setdefault('factory', ConnexionInstrumentee)
+    conn = _connecter(*args, **kwargs)
+    if isinstance(conn, ConnexionInstrumentee):
+        conn.chemin = str(args[0] if args else kwargs.get('database'))
+    return conn
+
+def installer():
+    """Instrumente les connexions sqlite3 ouvertes ensuite dans le processus (idempotent)"""
+    if INSTRUMENTATION_ACTIVE:
+        sqlite3.connect = _connecter_instrumente
+
+def instrumenter(nom: str, fonction: Callable) -> Callable:
+    """Enveloppe une fonction : chaque appel pendant un rerun tracé devient un span"""
+    if getattr(fonction, '_seaop_span', False):
+        return fonction
+
+    @functools.wraps(fonction)
+    def enveloppe(*args, **kwargs):
+        if _trace_courante.get() is None:
+            return fonction(*args, **kwargs)
+        span = _span_courant.get().enfant(nom)
+        span.appels += 1
+        jeton = _span_courant.set(span)
+        debut = time.perf_counter()
+        try:
+            return fonction(*args, **kwargs)
+        finally:
+            span.duree_ms += (time.perf_counter() - debut) * 1000
+            _span_courant.reset(jeton)
+
+    enveloppe._seaop_span = True
+    return enveloppe
+
+def instrumenter_fonctions(espace: dict, prefixes: tuple):
+    """Remplace, dans l'espace de noms d'un module, les fonctions dont le nom a l'un des préfixes"""
+    if not INSTRUMENTATION_ACTIVE:
+        return
+    for nom, valeur in list(espace.items()):
+        if nom.startswith(prefixes) and callable(valeur) and not isinstance(valeur, type):
+            espace[nom] = instrumenter(nom, valeur)
+
+class tracer_rerun:
+    """Bloc with tracé comme un rerun : la trace est enregistrée à la sortie, même interrompue"""
+
+    def __enter__(self) -> Trace:
+        self.trace = Trace()
+        self._jetons = (_trace_courante.set(self.trace), _span_courant.set(self.trace.racine))
+        return self.trace
+
+    def __exit__(self, type_exception, exception, pile):
+        _trace_courante.reset(self._jetons[0])
+        _span_courant.reset(self._jetons[1])
+        self.trace.racine.appels = 1
+        self.trace.racine.duree_ms = (time.perf_counter() - self.trace.debut) * 1000
+        if type_exception is not None:
+            # st.rerun() et st.stop() interrompent le script par une exception dédiée
+            self.trace.issue = ('interrompu' if type_exception.__name__ in ('RerunException', 'StopException')
+                                else f"erreur : {type_exception.__name__}")
+        page = self.trace.page or '—'
+        DUREE_RERUNS.observer(self.trace.racine.duree_ms / 1000, page=page)
+        RERUNS.incrementer(page=page, issue=self.trace.issue.split(' ')[0])
+        if INSTRUMENTATION_ACTIVE:
+            enregistrer_trace(self.trace)
+        return False
+
+def _journal(chemin: str) -> logging.Logger:
+    """Journal JSONL en rotation d'un fichier de traces (créé au premier usage)"""
+    with _verrou:
+        if chemin not in _journaux:
+            journal = logging.getLogger(f"seaop.traces.{len(_journaux)}")
+            journal.setLevel(logging.INFO)
+            journal.propagate = False
+            gestionnaire = logging.handlers.RotatingFileHandler(
+                chemin, maxBytes=TAILLE_MAX_FICHIER, backupCount=FICHIERS_CONSERVES, encoding='utf-8')
+            gestionnaire.setFormatter(logging.Formatter('%(message)s'))
+            journal.addHandler(gestionnaire)
+            _journaux[chemin] = journal
+        return _journaux[chemin]
+
+def enregistrer_trace(trace: Trace):
+    """Garde la trace en mémoire et l'ajoute au fichier de traces"""
+    donnees = trace.en_dict()
+    _traces_recentes.append(donnees)
+    try:
+        _journal(FICHIER_TRACES).info(json.dumps(donnees, ensure_ascii=False))
+    except OSError as e:
+        print(f"Erreur lors de l'écriture d'une trace de rerun: {e}")
+
+def traces_recentes(page: Optional[str] = None, limite: int = 100) -> List[dict]:
+    """Dernières traces de ce processus, les plus récentes d'abord"""
+    traces = [t for t in reversed(_traces_recentes) if page is None or t['page'] == page]
+    return traces[:limite]
+
+def lire_traces(chemin: Optional[str] = None, limite: int = 1000) -> List[dict]:
+    """Dernières traces du fichier courant (tous processus confondus), les plus récentes d'abord"""
+    chemin = chemin or FICHIER_TRACES
+    if not os.path.exists(chemin):
+        return []
+    with open(chemin, encoding='utf-8') as fichier:
+        lignes = deque(fichier, maxlen=limite)
+    traces = []
+    for ligne in reversed(lignes):
+        try:
+            traces.append(json.loads(ligne))
+        except json.JSONDecodeError:
+            continue   # ligne en cours d'écriture par un autre processus
+    return traces
+
+def resume_par_page(traces: List[dict]) -> List[dict]:
+    """Par page : nombre de reruns, centiles de durée, requêtes et temps SQL moyens"""
+    pages: Dict[str, List[dict]] = {}
+    for trace in traces:
+        pages.setdefault(trace['page'] or '—', []).append(trace)
+
+    def centile(valeurs: List[float], q: float) -> float:
+        valeurs = sorted(valeurs)
+        return valeurs[min(int(q * len(valeurs)), len(valeurs) - 1)]
+
+    resume = []
+    for page, liste in pages.items():
+        durees = [t['duree_ms'] for t in liste]
+        resume.append({
+            'page': page,
+            'reruns': len(liste),
+            'p50_ms': round(centile(durees, 0.50), 1),
+            'p95_ms': round(centile(durees, 0.95), 1),
+            'max_ms': round(max(durees), 1),
+            'requetes_moy': round(sum(t['requetes'] for t in liste) / len(liste), 1),
+            'sql_moy_ms': round(sum(t['duree_sql_ms'] for t in liste) / len(liste), 1),
+        })
+    return sorted(resume, key=lambda r: r['p95_ms'], reverse=True)
+
+def aplatir_spans(spans: List[dict], niveau: int = 0) -> List[dict]:
+    """Arbre de spans d'une trace en lignes (parcours en profondeur), avec leur niveau d'imbrication"""
+    lignes = []
+    for span in spans:
+        lignes.append({'niveau': niveau, **{cle: valeur for cle, valeur in span.items() if cle != 'enfants'}})
+        lignes += aplatir_spans(span['enfants'], niveau + 1)
+    return lignes
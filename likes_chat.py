@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Likes du Chat Room SEAOP
+
+Le compteur chat_room.likes est tenu par des triggers sur chat_room_likes :
+il suit chaque ligne réellement insérée ou supprimée, quel que soit
+l'écrivain. Un clic bascule le like en une opération de l'écrivain unique :
+INSERT OR IGNORE, et si la ligne existait déjà (aucune ligne insérée), la
+suppression. Deux clics simultanés ne peuvent donc ni compter deux fois ni
+échouer sur la contrainte UNIQUE(message_id, user_email).
+
+Les likes de l'utilisateur pour la page affichée sont résolus avec les fils
+(fils_chat.charger_fils), dans la même requête.
+"""
+
+import sqlite3
+import os
+from typing import Optional, Tuple
+
+from base_donnees import executer_ecriture
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+_bases_pretes = set()
+
+def assurer_likes(chemin: Optional[str] = None):
+    """Crée les triggers qui tiennent chat_room.likes à jour"""
+    chemin = chemin or DATABASE_PATH
+    if chemin in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+
+    try:
+        # Les compteurs existants sont conservés : les triggers n'appliquent que des écarts
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_chat_like_insert AFTER INSERT ON chat_room_likes
+            BEGIN
+                UPDATE chat_room SET likes = likes + 1 WHERE id = NEW.message_id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_chat_like_delete AFTER DELETE ON chat_room_likes
+            BEGIN
+                UPDATE chat_room SET likes = MAX(likes - 1, 0) WHERE id = OLD.message_id;
+            END
+        ''')
+        conn.commit()
+        _bases_pretes.add(chemin)
+    except Exception as e:
+        print(f"Erreur lors de la création des triggers de likes: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def _basculer_like(cursor: sqlite3.Cursor, message_id: int, user_email: str) -> Tuple[bool, int]:
+    """Opération d'écriture : ajoute le like, ou le retire s'il existait ; retourne (aime, likes)"""
+    cursor.execute('INSERT OR IGNORE INTO chat_room_likes (message_id, user_email) VALUES (?, ?)',
+                   (message_id, user_email))
+    aime = cursor.rowcount == 1
+    if not aime:
+        cursor.execute('DELETE FROM chat_room_likes WHERE message_id = ? AND user_email = ?',
+                       (message_id, user_email))
+    cursor.execute('SELECT likes FROM chat_room WHERE id = ?', (message_id,))
+    ligne = cursor.fetchone()
+    return aime, ligne[0] if ligne else 0
+
+def basculer_like(message_id: int, user_email: str, chemin: Optional[str] = None) -> Tuple[bool, int]:
+    """Bascule le like de l'utilisateur sur un message ; retourne (aime, nombre de likes)"""
+    chemin = chemin or DATABASE_PATH
+    assurer_likes(chemin)
+    return executer_ecriture(_basculer_like, message_id, user_email, chemin=chemin)
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Métriques SEAOP : registre, export Prometheus et historique
+
+Un registre par processus tient des compteurs, des jauges et des
+histogrammes étiquetés, alimentés par :
+- la couche d'accès aux données (instrumentation : requêtes SQL, temps SQL,
+  requêtes lentes) ;
+- le rendu des pages (durée des reruns par page, issue) ;
+- la diffusion des fichiers joints (nombre et octets par type) ;
+- les tâches de fond (durée et erreurs par tâche).
+Des collecteurs complètent le registre au moment de la lecture : taux de
+succès des caches du moteur de tarification, écrivain unique (opérations,
+groupes, file d'attente), taille de la base et du journal WAL.
+
+Le registre est exposé au format texte Prometheus par un petit serveur HTTP
+(/metrics) démarré une fois par processus sur PORT_METRIQUES, et une tâche
+de fond en copie un instantané (compteurs, jauges, nombre et somme des
+histogrammes) dans la table historique_metriques toutes les
+INTERVALLE_HISTORIQUE secondes, pour les courbes du panel d'administration.
+
+Usage :
+    REQUETES = compteur('seaop_requetes_sql_total', "Instructions SQL exécutées")
+    REQUETES.incrementer()
+    DUREE = histogramme('seaop_rerun_duree_secondes', "Durée des reruns", ('page',))
+    DUREE.observer(0.12, page='accueil')
+    demarrer_serveur_metriques()     # idempotent, appelé à chaque rendu de page si PORT_METRIQUES
+"""
+
+import bisect
+import datetime
+import json
+import math
+import os
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from base_donnees import connecter_lecture, executer_ecriture, get_ecrivain
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Serveur d'export (0 : pas de serveur) ; 0.0.0.0 pour une collecte depuis le réseau privé
+PORT_METRIQUES = int(os.getenv('SEAOP_PORT_METRIQUES', '9464'))
+HOTE_METRIQUES = os.getenv('SEAOP_HOTE_METRIQUES', '127.0.0.1')
+
+# Historique : intervalle des instantanés (secondes) et durée de conservation (jours)
+INTERVALLE_HISTORIQUE = 300
+CONSERVATION_JOURS = 30
+
+# Bornes (secondes) des histogrammes de durée
+BORNES_DUREE = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_bases_pretes = set()
+
+def _etiquettes_texte(noms: Tuple[str, ...], valeurs: Tuple[str, ...], extra: str = '') -> str:
+    paires = [f'{nom}="{_echapper(valeur)}"' for nom, valeur in zip(noms, valeurs)]
+    if extra:
+        paires.append(extra)
+    return '{' + ','.join(paires) + '}' if paires else ''
+
+def _echapper(valeur: str) -> str:
+    return str(valeur).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _nombre(valeur: float) -> str:
+    if math.isinf(valeur):
+        return '+Inf'
+    return repr(float(valeur)) if not float(valeur).is_integer() else str(int(valeur))
+
+class _Metrique:
+    """Série de valeurs d'une métrique, une par combinaison d'étiquettes"""
+
+    type_prometheus = ''
+
+    def __init__(self, nom: str, aide: str, etiquettes: Tuple[str, ...] = ()):
+        self.nom = nom
+        self.aide = aide
+        self.etiquettes = tuple(etiquettes)
+        self._verrou = threading.Lock()
+        self._valeurs: Dict[Tuple[str, ...], object] = {}
+
+    def _cle(self, etiquettes: dict) -> Tuple[str, ...]:
+        return tuple(str(etiquettes.get(nom, '')) for nom in self.etiquettes)
+
+    def series(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._verrou:
+            return list(self._valeurs.items())
+
+class Compteur(_Metrique):
+    """Valeur qui ne fait que croître (événements, durées cumulées)"""
+
+    type_prometheus = 'counter'
+
+    def incrementer(self, valeur: float = 1.0, **etiquettes):
+        cle = self._cle(etiquettes)
+        with self._verrou:
+            self._valeurs[cle] = self._valeurs.get(cle, 0.0) + valeur
+
+    def fixer(self, valeur: float, **etiquettes):
+        """Reporte un total tenu ailleurs (statistiques d'un cache, d'un écrivain)"""
+        with self._verrou:
+            self._valeurs[self._cle(etiquettes)] = float(valeur)
+
+    def valeur(self, **etiquettes) -> float:
+        with self._verrou:
+            return self._valeurs.get(self._cle(etiquettes), 0.0)
+
+class Jauge(Compteur):
+    """Valeur instantanée (taille de file, taille de fichier, ratio)"""
+
+    type_prometheus = 'gauge'
+
+class Histogramme(_Metrique):
+    """Répartition d'observations par bornes, avec leur nombre et leur somme"""
+
+    type_prometheus = 'histogram'
+
+    def __init__(self, nom: str, aide: str, etiquettes: Tuple[str, ...] = (), bornes: Tuple[float, ...] = BORNES_DUREE):
+        super().__init__(nom, aide, etiquettes)
+        self.bornes = tuple(sorted(bornes))
+
+    def observer(self, valeur: float, **etiquettes):
+        cle = self._cle(etiquettes)
+        i = bisect.bisect_left(self.bornes, valeur)
+        with self._verrou:
+            serie = self._valeurs.get(cle)
+            if serie is None:
+                serie = self._valeurs[cle] = [[0] * (len(self.bornes) + 1), 0, 0.0]
+            serie[0][i] += 1
+            serie[1] += 1
+            serie[2] += valeur
+
+    def series(self):
+        with self._verrou:
+            return [(cle, [list(serie[0]), serie[1], serie[2]]) for cle, serie in self._valeurs.items()]
+
+class RegistreMetriques:
+    """Métriques d'un processus et collecteurs exécutés avant chaque lecture"""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self._metriques: Dict[str, _Metrique] = {}
+        self._collecteurs: List[Callable[[], None]] = []
+
+    def _enregistrer(self, classe, nom: str, aide: str, etiquettes: Tuple[str, ...], **options) -> _Metrique:
+        with self._verrou:
+            if nom not in self._metriques:
+                self._metriques[nom] = classe(nom, aide, tuple(etiquettes), **options)
+            return self._metriques[nom]
+
+    def compteur(self, nom: str, aide: str, etiquettes: Tuple[str, ...] = ()) -> Compteur:
+        return self._enregistrer(Compteur, nom, aide, etiquettes)
+
+    def jauge(self, nom: str, aide: str, etiquettes: Tuple[str, ...] = ()) -> Jauge:
+        return self._enregistrer(Jauge, nom, aide, etiquettes)
+
+    def histogramme(self, nom: str, aide: str, etiquettes: Tuple[str, ...] = (),
+                    bornes: Tuple[float, ...] = BORNES_DUREE) -> Histogramme:
+        return self._enregistrer(Histogramme, nom, aide, etiquettes, bornes=bornes)
+
+    def collecteur(self, fonction: Callable[[], None]):
+        """Ajoute une fonction qui met à jour des métriques juste avant chaque lecture (une fois)"""
+        with self._verrou:
+            if fonction not in self._collecteurs:
+                self._collecteurs.append(fonction)
+
+    def _collecter(self) -> List[_Metrique]:
+        with self._verrou:
+            collecteurs = list(self._collecteurs)
+        for fonction in collecteurs:
+            try:
+                fonction()
+            except Exception as e:
+                print(f"Erreur dans un collecteur de métriques: {e}")
+        with self._verrou:
+            return sorted(self._metriques.values(), key=lambda m: m.nom)
+
+    def format_prometheus(self) -> str:
+        """Toutes les métriques au format texte d'exposition Prometheus (version 0.0.4)"""
+        lignes = []
+        for metrique in self._collecter():
+            lignes.append(f"# HELP {metrique.nom} {metrique.aide.replace(chr(92), chr(92) * 2)}")
+            lignes.append(f"# TYPE {metrique.nom} {metrique.type_prometheus}")
+            for cle, valeur in metrique.series():
+                if isinstance(metrique, Histogramme):
+                    cumul = 0
+                    for borne, nombre in zip(metrique.bornes + (math.inf,), valeur[0]):
+                        cumul += nombre
+                        etiquettes = _etiquettes_texte(metrique.etiquettes, cle, f'le="{_nombre(borne)}"')
+                        lignes.append(f"{metrique.nom}_bucket{etiquettes} {cumul}")
+                    etiquettes = _etiquettes_texte(metrique.etiquettes, cle)
+                    lignes.append(f"{metrique.nom}_count{etiquettes} {valeur[1]}")
+                    lignes.append(f"{metrique.nom}_sum{etiquettes} {_nombre(valeur[2])}")
+                else:
+                    lignes.append(f"{metrique.nom}{_etiquettes_texte(metrique.etiquettes, cle)} {_nombre(valeur)}")
+        return '\n'.join(lignes) + '\n'
+
+    def instantane(self) -> List[Tuple[str, str, float]]:
+        """(nom, étiquettes JSON, valeur) de chaque série ; nombre et somme pour les histogrammes"""
+        lignes = []
+        for metrique in self._collecter():
+            for cle, valeur in metrique.series():
+                etiquettes = json.dumps(dict(zip(metrique.etiquettes, cle)), ensure_ascii=False, sort_keys=True)
+                if isinstance(metrique, Histogramme):
+                    lignes.append((f"{metrique.nom}_count", etiquettes, float(valeur[1])))
+                    lignes.append((f"{metrique.nom}_sum", etiquettes, float(valeur[2])))
+                else:
+                    lignes.append((metrique.nom, etiquettes, float(valeur)))
+        return lignes
+
+REGISTRE = RegistreMetriques()
+
+def compteur(nom: str, aide: str, etiquettes: Tuple[str, ...] = ()) -> Compteur:
+    return REGISTRE.compteur(nom, aide, etiquettes)
+
+def jauge(nom: str, aide: str, etiquettes: Tuple[str, ...] = ()) -> Jauge:
+    return REGISTRE.jauge(nom, aide, etiquettes)
+
+def histogramme(nom: str, aide: str, etiquettes: Tuple[str, ...] = (),
+                bornes: Tuple[float, ...] = BORNES_DUREE) -> Histogramme:
+    return REGISTRE.histogramme(nom, aide, etiquettes, bornes)
+
+# Fichiers joints diffusés (aperçus et téléchargements), par type
+FICHIERS_SERVIS = compteur('seaop_fichiers_servis_total', "Fichiers joints diffusés", ('type',))
+OCTETS_SERVIS = compteur('seaop_fichiers_octets_total', "Octets de fichiers joints diffusés", ('type',))
+
+def fichier_servi(type_fichier: str, contenu) -> object:
+    """Compte un fichier joint diffusé ; retourne son contenu inchangé"""
+    FICHIERS_SERVIS.incrementer(type=type_fichier)
+    OCTETS_SERVIS.incrementer(len(contenu or b''), type=type_fichier)
+    return contenu
+
+# === COLLECTEURS ===
+
+def collecter_caches():
+    """Succès et échecs des caches mémoïsés du moteur de tarification"""
+    import moteur_tarification
+
+    requetes = compteur('seaop_cache_requetes_total', "Consultations des caches", ('cache', 'resultat'))
+    ratio = jauge('seaop_cache_ratio_succes', "Part des consultations servies par le cache", ('cache',))
+    for nom in ('_calculer_prix_memo', 'calculer_prix_lead'):
+        infos = getattr(moteur_tarification, nom).cache_info()
+        requetes.fixer(infos.hits, cache=nom, resultat='succes')
+        requetes.fixer(infos.misses, cache=nom, resultat='echec')
+        ratio.fixer(infos.hits / (infos.hits + infos.misses) if infos.hits + infos.misses else 0.0, cache=nom)
+
+def collecter_base():
+    """Écrivain unique (opérations, groupes, file) et taille de la base et de son journal WAL"""
+    ecrivain = get_ecrivain(DATABASE_PATH)
+    compteur('seaop_ecritures_total', "Opérations validées par l'écrivain unique").fixer(ecrivain.operations)
+    compteur('seaop_groupes_ecriture_total', "Transactions de l'écrivain unique").fixer(ecrivain.groupes)
+    jauge('seaop_file_ecriture', "Opérations en attente de l'écrivain unique").fixer(ecrivain._file.qsize())
+    taille = jauge('seaop_base_octets', "Taille des fichiers de la base", ('fichier',))
+    for fichier, suffixe in (('base', ''), ('wal', '-wal')):
+        chemin = DATABASE_PATH + suffixe
+        taille.fixer(os.path.getsize(chemin) if os.path.exists(chemin) else 0, fichier=fichier)
+
+REGISTRE.collecteur(collecter_caches)
+REGISTRE.collecteur(collecter_base)
+
+# === SERVEUR D'EXPORT ===
+
+class _GestionnaireMetriques(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        corps = REGISTRE.format_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        pass   # une ligne par collecte : sans intérêt dans les journaux
+
+_serveur = None   # serveur démarré, ou False après un échec (signalé une seule fois)
+_verrou_serveur = threading.Lock()
+
+def demarrer_serveur_metriques(port: Optional[int] = None, hote: Optional[str] = None) -> Optional[int]:
+    """
+    Démarre le serveur /metrics s'il ne tourne pas déjà dans ce processus ; retourne son port.
+
+    port=0 laisse le système choisir un port libre.
+    """
+    global _serveur
+    with _verrou_serveur:
+        if _serveur is None:
+            port = PORT_METRIQUES if port is None else port
+            try:
+                _serveur = ThreadingHTTPServer((hote or HOTE_METRIQUES, port), _GestionnaireMetriques)
+            except OSError as e:
+                print(f"Erreur lors du démarrage du serveur de métriques sur le port {port}: {e}")
+                _serveur = False
+                return None
+            _serveur.daemon_threads = True
+            threading.Thread(target=_serveur.serve_forever, name='seaop-metriques', daemon=True).start()
+        return _serveur.server_address[1] if _serveur else None
+
+# === HISTORIQUE ===
+
+def assurer_table_historique(chemin: Optional[str] = None):
+    """Crée la table de l'historique des métriques et son index par métrique et date"""
+    chemin = chemin or DATABASE_PATH
+    if chemin in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS historique_metriques (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                horodatage TIMESTAMP NOT NULL,
+                nom TEXT NOT NULL,
+                etiquettes TEXT NOT NULL DEFAULT '{}',
+                valeur REAL NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_historique_metriques ON historique_metriques(nom, horodatage)
+        ''')
+        conn.commit()
+        _bases_pretes.add(chemin)
+    except Exception as e:
+        print(f"Erreur lors de la création de la table d'historique des métriques: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def _ecrire_instantane(cursor: sqlite3.Cursor, horodatage: str, lignes: list, limite: str):
+    """Opération d'écriture : ajoute l'instantané et purge ce qui dépasse la conservation"""
+    cursor.executemany('''
+        INSERT INTO historique_metriques (horodatage, nom, etiquettes, valeur) VALUES (?, ?, ?, ?)
+    ''', [(horodatage, nom, etiquettes, valeur) for nom, etiquettes, valeur in lignes])
+    cursor.execute('DELETE FROM historique_metriques WHERE horodatage < ?', (limite,))
+
+def enregistrer_historique(chemin: Optional[str] = None, maintenant: Optional[datetime.datetime] = None) -> int:
+    """Tâche de fond : copie un instantané du registre dans l'historique ; retourne le nombre de séries"""
+    chemin = chemin or DATABASE_PATH
+    maintenant = maintenant or datetime.datetime.now()
+    assurer_table_historique(chemin)
+    lignes = REGISTRE.instantane()
+    limite = (maintenant - datetime.timedelta(days=CONSERVATION_JOURS)).isoformat(sep=' ', timespec='seconds')
+    executer_ecriture(_ecrire_instantane, maintenant.isoformat(sep=' ', timespec='seconds'), lignes, limite,
+                      chemin=chemin)
+    return len(lignes)
+
+def get_noms_historique(chemin: Optional[str] = None) -> List[str]:
+    """Métriques présentes dans l'historique"""
+    chemin = chemin or DATABASE_PATH
+    assurer_table_historique(chemin)
+    conn = connecter_lecture(chemin)
+    try:
+        return [ligne[0] for ligne in conn.execute('SELECT DISTINCT nom FROM historique_metriques ORDER BY nom')]
+    finally:
+        conn.close()
+
+def get_historique(nom: str, jours: float = 7, chemin: Optional[str] = None) -> List[Dict]:
+    """Instantanés d'une métrique sur les derniers jours, par date puis étiquettes"""
+    chemin = chemin or DATABASE_PATH
+    assurer_table_historique(chemin)
+    depuis = (datetime.datetime.now() - datetime.timedelta(days=jours)).isoformat(sep=' ', timespec='seconds')
+    conn = connecter_lecture(chemin)
+    try:
+        lignes = conn.execute('''
+            SELECT horodatage, etiquettes, valeur FROM historique_metriques
+            WHERE nom = ? AND horodatage >= ?
+            ORDER BY horodatage, etiquettes
+        ''', (nom, depuis)).fetchall()
+    finally:
+        conn.close()
+    return [{'horodatage': h, 'etiquettes': json.loads(e), 'valeur': v} for h, e, v in lignes]
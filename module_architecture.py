@@ -12,6 +12,8 @@ import uuid
 import os
 import base64
 from typing import Dict, List, Optional
+from demandes_services import get_stats_services, mettre_a_jour_statut_demande
+from moteur_tarification import calculer_prix, palier_tarifaire
 
 # Configuration du stockage persistant
 DATA_DIR = os.getenv('DATA_DIR', '/opt/render/project/data')
@@ -33,35 +35,14 @@ def creer_demande_architecture(demande_data: Dict) -> str:
         
         # Calculer le prix estimé basé sur la superficie
         superficie = float(demande_data.get('superficie_batiment', 0))
-        if superficie < 10000:
-            prix_base = 15000
-            prix_par_pi2 = 1.50
-        elif superficie < 25000:
-            prix_base = 25000
-            prix_par_pi2 = 1.25
-        elif superficie < 50000:
-            prix_base = 40000
-            prix_par_pi2 = 1.00
-        else:
-            prix_base = 60000
-            prix_par_pi2 = 0.85
-        
-        prix_estime = prix_base + (superficie * prix_par_pi2)
         
         # Services inclus
-        services_inclus = []
-        if demande_data.get('inclure_structure'):
-            services_inclus.append('structure')
-            prix_estime += superficie * 0.25
-        if demande_data.get('inclure_mecanique'):
-            services_inclus.append('mecanique')
-            prix_estime += superficie * 0.20
-        if demande_data.get('inclure_electrique'):
-            services_inclus.append('electrique')
-            prix_estime += superficie * 0.15
-        if demande_data.get('inclure_civil'):
-            services_inclus.append('civil')
-            prix_estime += superficie * 0.10
+        services_inclus = [
+            service for service in ('structure', 'mecanique', 'electrique', 'civil')
+            if demande_data.get(f'inclure_{service}')
+        ]
+        
+        prix_estime = calculer_prix('architecture', superficie, services_inclus)
         
         services_str = ','.join(services_inclus) if services_inclus else ''
         
@@ -247,58 +228,7 @@ def get_demande_architecture_by_id(demande_id: int) -> Optional[Dict]:
 
 def mettre_a_jour_statut_architecture(demande_id: int, nouveau_statut: str, notes: str = None, pourcentage: int = None) -> bool:
     """Met à jour le statut d'une demande d'architecture"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        updates = ['statut = ?']
-        params = [nouveau_statut]
-        
-        # Ajouter les dates selon le statut
-        if nouveau_statut == 'en_analyse':
-            updates.append('date_analyse = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        elif nouveau_statut == 'acceptee':
-            updates.append('date_acceptation = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        elif nouveau_statut == 'en_cours':
-            updates.append('date_debut_plans = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        elif nouveau_statut == 'revision':
-            updates.append('date_revision = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        elif nouveau_statut == 'approuvee':
-            updates.append('date_approbation = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        elif nouveau_statut == 'livree':
-            updates.append('date_livraison = ?')
-            params.append(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        
-        if notes:
-            updates.append('notes_internes = ?')
-            params.append(notes)
-        
-        if pourcentage is not None:
-            updates.append('pourcentage_complete = ?')
-            params.append(pourcentage)
-        
-        params.append(demande_id)
-        
-        cursor.execute(f'''
-            UPDATE demandes_architecture 
-            SET {', '.join(updates)}
-            WHERE id = ?
-        ''', params)
-        
-        conn.commit()
-        return True
-        
-    except Exception as e:
-        print(f"Erreur lors de la mise à jour du statut: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+    return mettre_a_jour_statut_demande('architecture', demande_id, nouveau_statut, notes, pourcentage)
 
 def ajouter_plans_architecture(demande_id: int, plans_preliminaires: str = None, plans_finaux: str = None, devis: str = None) -> bool:
     """Ajoute les plans d'architecture à une demande"""
@@ -359,25 +289,20 @@ def encoder_fichiers_architecture(fichiers_uploades: list) -> str:
 
 def get_stats_architecture() -> Dict:
     """Récupère les statistiques du service d'architecture"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    # Compteurs et montants depuis l'agrégat groupé du registre des services
+    stats = get_stats_services()['architecture']
+    par_statut = stats['par_statut']
     
-    # Stats générales
-    cursor.execute('''
-        SELECT 
-            COUNT(*) as total,
-            COUNT(CASE WHEN statut = 'recue' THEN 1 END) as recues,
-            COUNT(CASE WHEN statut IN ('en_analyse', 'acceptee', 'en_cours', 'revision') THEN 1 END) as en_cours,
-            COUNT(CASE WHEN statut IN ('livree', 'terminee') THEN 1 END) as terminees,
-            SUM(CASE WHEN statut IN ('livree', 'terminee') THEN prix_service ELSE 0 END) as ca_total,
-            AVG(superficie_batiment) as superficie_moyenne,
-            AVG(CASE WHEN statut IN ('livree', 'terminee') THEN prix_service END) as prix_moyen
-        FROM demandes_architecture
-    ''')
+    def cumul(statuts, cle):
+        return sum(par_statut.get(statut, {}).get(cle, 0) for statut in statuts)
     
-    stats = cursor.fetchone()
+    terminees = ('livree', 'terminee')
+    ca_total = cumul(terminees, 'prix_total')
+    nb_prix = cumul(terminees, 'prix_nb')
     
-    # Distribution par type de bâtiment
+    # Distribution par type de bâtiment (attribut propre au service)
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
     cursor.execute('''
         SELECT type_batiment, COUNT(*) as nombre
         FROM demandes_architecture
@@ -389,13 +314,13 @@ def get_stats_architecture() -> Dict:
     conn.close()
     
     return {
-        'total': stats[0] if stats[0] else 0,
-        'recues': stats[1] if stats[1] else 0,
-        'en_cours': stats[2] if stats[2] else 0,
-        'terminees': stats[3] if stats[3] else 0,
-        'ca_total': stats[4] if stats[4] else 0,
-        'superficie_moyenne': stats[5] if stats[5] else 0,
-        'prix_moyen': stats[6] if stats[6] else 0,
+        'total': stats['total'],
+        'recues': cumul(('recue',), 'nombre'),
+        'en_cours': cumul(('en_analyse', 'acceptee', 'en_cours', 'revision'), 'nombre'),
+        'terminees': cumul(terminees, 'nombre'),
+        'ca_total': ca_total,
+        'superficie_moyenne': stats['superficie_moyenne'],
+        'prix_moyen': ca_total / nb_prix if nb_prix else 0,
         'types_batiments': types_batiments
     }
 
@@ -614,31 +539,15 @@ def page_service_architecture():
             st.markdown("### 💰 Estimation du coût")
             
             if superficie_batiment > 0:
-                # Calcul estimé
-                if superficie_batiment < 10000:
-                    prix_base = 15000
-                    prix_pi2 = 1.50
-                elif superficie_batiment < 25000:
-                    prix_base = 25000
-                    prix_pi2 = 1.25
-                elif superficie_batiment < 50000:
-                    prix_base = 40000
-                    prix_pi2 = 1.00
-                else:
-                    prix_base = 60000
-                    prix_pi2 = 0.85
-                
-                prix_estime = prix_base + (superficie_batiment * prix_pi2)
-                
-                # Ajouts pour services
-                if inclure_structure:
-                    prix_estime += superficie_batiment * 0.25
-                if inclure_mecanique:
-                    prix_estime += superficie_batiment * 0.20
-                if inclure_electrique:
-                    prix_estime += superficie_batiment * 0.15
-                if inclure_civil:
-                    prix_estime += superficie_batiment * 0.10
+                # Calcul estimé (mémoïsé : recalculé seulement si les paramètres changent)
+                prix_base, prix_pi2 = palier_tarifaire('architecture', superficie_batiment)
+                services_choisis = [
+                    service for service, inclus in (
+                        ('structure', inclure_structure), ('mecanique', inclure_mecanique),
+                        ('electrique', inclure_electrique), ('civil', inclure_civil)
+                    ) if inclus
+                ]
+                prix_estime = calculer_prix('architecture', superficie_batiment, services_choisis)
                 
                 st.info(f"""
                 **Estimation préliminaire : {prix_estime:,.2f}$**
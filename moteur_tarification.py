@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur de tarification SEAOP
+
+Les grilles de prix des services professionnels (technologue, architecture,
+ingénieur) et des leads sont décrites ici sous forme de tables déclaratives :
+paliers de superficie, taux au pied carré, facteurs de formule, suppléments,
+forfaits et majorations. Chaque grille est compilée une fois en tableaux de
+recherche ; le calcul unitaire (aperçus interactifs) est mémoïsé et un mode
+par lot vectorisé permet de recalculer d'un coup les demandes en attente
+lorsqu'un tarif change.
+
+L'ordre des opérations reproduit exactement les anciens calculs :
+(prix de base + superficie × taux) × facteur de formule, puis suppléments
+au pied carré, puis forfaits, puis × (1 + somme des majorations), arrondi
+éventuel au cent.
+"""
+
+import sqlite3
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, List, Dict, Tuple, Iterable
+
+import numpy as np
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Grilles déclaratives. Un barème est une suite de (borne supérieure, valeur),
+# la dernière borne étant None (au-delà). 'borne_incluse' indique si la borne
+# appartient au palier (superficie <= borne) ou non (superficie < borne).
+TARIFS = {
+    'technologue': {
+        'grilles': {
+            None: {
+                'borne_incluse': True,
+                'prix_base': ((1000, 2500), (2500, 3500), (4000, 4500), (6000, 6000), (None, 7500)),
+                'taux_pi2': ((3000, 0.80), (None, 1.00)),
+            },
+        },
+        'forfaits': (('modele_3d', 800), ('visite_terrain', 350), ('revision_multiple', 400)),
+        'majorations': (('electricite', 0.15), ('plomberie', 0.12), ('chauffage', 0.10), ('urgence_elevee', 0.25)),
+        'arrondi': 2,
+    },
+    'architecture': {
+        'grilles': {
+            None: {
+                'borne_incluse': False,
+                'prix_base': ((10000, 15000), (25000, 25000), (50000, 40000), (None, 60000)),
+                'taux_pi2': ((10000, 1.50), (25000, 1.25), (50000, 1.00), (None, 0.85)),
+            },
+        },
+        'supplements_pi2': (('structure', 0.25), ('mecanique', 0.20), ('electrique', 0.15), ('civil', 0.10)),
+    },
+    'ingenieur': {
+        'grilles': {
+            'batiment': {
+                'borne_incluse': False,
+                'prix_base': ((5000, 8000), (15000, 12000), (50000, 18000), (None, 25000)),
+                'taux_pi2': ((5000, 0.80), (15000, 0.65), (50000, 0.50), (None, 0.40)),
+            },
+            'industriel': {
+                'borne_incluse': False,
+                'prix_base': ((None, 15000),),
+                'taux_pi2': ((None, 0.75),),
+            },
+            # Pont, fondation, autre
+            None: {
+                'borne_incluse': False,
+                'prix_base': ((None, 20000),),
+                'taux_pi2': ((None, 1.00),),
+            },
+        },
+        'formules': {'complet': 1.8, 'plans': 1.4},
+        'supplements_pi2': (
+            ('analyse_sismique', 0.15), ('analyse_dynamique', 0.20),
+            ('modelisation_3d', 0.10), ('surveillance_chantier', 0.25)
+        ),
+    },
+}
+
+TARIFS_LEADS = {
+    'prix_par_type': {
+        "Peinture": 45.0,
+        "Plancher": 55.0,
+        "Électricité": 65.0,
+        "Plomberie": 65.0,
+        "Chauffage/Climatisation": 75.0,
+        "Isolation": 60.0,
+        "Fenêtres et portes": 70.0,
+        "Maçonnerie": 80.0,
+        "Charpenterie": 85.0,
+        "Rénovation cuisine": 95.0,
+        "Rénovation salle de bain": 85.0,
+        "Toiture": 105.0,
+        "Revêtement extérieur": 90.0,
+        "Agrandissement": 120.0,
+        "Autre": 70.0
+    },
+    'prix_defaut': 50.0,
+    'multiplicateurs_budget': {
+        "Moins de 5 000$": 0.8,
+        "5 000$ - 15 000$": 1.0,
+        "15 000$ - 30 000$": 1.3,
+        "30 000$ - 50 000$": 1.6,
+        "Plus de 50 000$": 2.0
+    },
+    'multiplicateur_defaut': 1.0,
+    'arrondi': 2,
+}
+
+# Statuts pour lesquels un prix peut encore être recalculé
+STATUTS_EN_ATTENTE = {
+    'technologue': ('recue', 'analyse'),
+    'architecture': ('recue', 'en_analyse'),
+    'ingenieur': ('recue', 'analyse'),
+}
+
+@dataclass(frozen=True)
+class GrilleCompilee:
+    """Barème de superficie compilé : bornes fusionnées, prix de base et taux par palier"""
+    bornes: Tuple[float, ...]
+    prix_base: Tuple[float, ...]
+    taux_pi2: Tuple[float, ...]
+    borne_incluse: bool
+    bornes_np: np.ndarray
+    prix_base_np: np.ndarray
+    taux_pi2_np: np.ndarray
+
+    def indice(self, superficie: float) -> int:
+        """Palier d'une superficie (recherche binaire)"""
+        if self.borne_incluse:
+            return bisect_left(self.bornes, superficie)
+        return bisect_right(self.bornes, superficie)
+
+    def indices(self, superficies: np.ndarray) -> np.ndarray:
+        """Paliers d'un tableau de superficies"""
+        return np.searchsorted(self.bornes_np, superficies, side='left' if self.borne_incluse else 'right')
+
+@dataclass(frozen=True)
+class TarifCompile:
+    """Tarif d'un service compilé en tables de recherche"""
+    grilles: Dict[Optional[str], GrilleCompilee]
+    formules: Dict[str, float]
+    supplements_pi2: Tuple[Tuple[str, float], ...]
+    forfaits: Tuple[Tuple[str, float], ...]
+    majorations: Tuple[Tuple[str, float], ...]
+    arrondi: Optional[int]
+    options: frozenset
+
+def _valeur_palier(bareme: Tuple, borne: Optional[float]):
+    """Valeur d'un barème pour le palier fusionné se terminant à 'borne' (None : dernier palier)"""
+    for borne_bareme, valeur in bareme:
+        if borne_bareme is None:
+            return valeur
+        if borne is not None and borne <= borne_bareme:
+            return valeur
+    raise ValueError("Barème sans palier final (borne None)")
+
+def compiler_grille(definition: Dict) -> GrilleCompilee:
+    """Fusionne les barèmes de prix de base et de taux en un seul tableau de paliers"""
+    borne_incluse = definition['borne_incluse']
+    bornes = sorted({
+        borne for bareme in (definition['prix_base'], definition['taux_pi2'])
+        for borne, _ in bareme if borne is not None
+    })
+    paliers = bornes + [None]
+    prix_base = tuple(float(_valeur_palier(definition['prix_base'], b)) for b in paliers)
+    taux_pi2 = tuple(float(_valeur_palier(definition['taux_pi2'], b)) for b in paliers)
+    bornes = tuple(float(b) for b in bornes)
+
+    return GrilleCompilee(
+        bornes=bornes,
+        prix_base=prix_base,
+        taux_pi2=taux_pi2,
+        borne_incluse=borne_incluse,
+        bornes_np=np.array(bornes, dtype=np.float64),
+        prix_base_np=np.array(prix_base, dtype=np.float64),
+        taux_pi2_np=np.array(taux_pi2, dtype=np.float64)
+    )
+
+def compiler_tarif(definition: Dict) -> TarifCompile:
+    """Compile la définition déclarative d'un service"""
+    supplements = tuple((nom, float(v)) for nom, v in definition.get('supplements_pi2', ()))
+    forfaits = tuple((nom, float(v)) for nom, v in definition.get('forfaits', ()))
+    majorations = tuple((nom, float(v)) for nom, v in definition.get('majorations', ()))
+
+    return TarifCompile(
+        grilles={categorie: compiler_grille(grille) for categorie, grille in definition['grilles'].items()},
+        formules={nom: float(v) for nom, v in definition.get('formules', {}).items()},
+        supplements_pi2=supplements,
+        forfaits=forfaits,
+        majorations=majorations,
+        arrondi=definition.get('arrondi'),
+        options=frozenset(nom for nom, _ in supplements + forfaits + majorations)
+    )
+
+_tarifs_compiles = {service: compiler_tarif(definition) for service, definition in TARIFS.items()}
+
+def definir_tarif(service: str, definition: Dict):
+    """Remplace la grille d'un service (recompilation et invalidation du cache)"""
+    _tarifs_compiles[service] = compiler_tarif(definition)
+    TARIFS[service] = definition
+    _calculer_prix_memo.cache_clear()
+
+def _grille(tarif: TarifCompile, categorie: Optional[str]) -> GrilleCompilee:
+    return tarif.grilles.get(categorie, tarif.grilles[None])
+
+def palier_tarifaire(service: str, superficie: float, categorie: Optional[str] = None) -> Tuple[float, float]:
+    """Prix de base et taux au pied carré applicables à une superficie"""
+    grille = _grille(_tarifs_compiles[service], categorie)
+    i = grille.indice(superficie)
+    return grille.prix_base[i], grille.taux_pi2[i]
+
+@lru_cache(maxsize=4096)
+def _calculer_prix_memo(service: str, superficie: float, options: frozenset,
+                        categorie: Optional[str], formule: Optional[str]) -> float:
+    tarif = _tarifs_compiles[service]
+    grille = _grille(tarif, categorie)
+    i = grille.indice(superficie)
+
+    prix = grille.prix_base[i] + superficie * grille.taux_pi2[i]
+    prix *= tarif.formules.get(formule, 1.0)
+
+    for nom, taux in tarif.supplements_pi2:
+        if nom in options:
+            prix += superficie * taux
+    for nom, montant in tarif.forfaits:
+        if nom in options:
+            prix += montant
+
+    multiplicateur = 1.0
+    for nom, majoration in tarif.majorations:
+        if nom in options:
+            multiplicateur += majoration
+    prix = prix * multiplicateur
+
+    if tarif.arrondi is not None:
+        prix = round(prix, tarif.arrondi)
+    return prix
+
+def calculer_prix(service: str, superficie: float, options: Iterable[str] = (),
+                  categorie: Optional[str] = None, formule: Optional[str] = None) -> float:
+    """
+    Calcule le prix d'une demande (mémoïsé pour les aperçus interactifs).
+
+    options : noms des suppléments, forfaits et majorations retenus ; les noms
+    inconnus du tarif sont ignorés.
+    """
+    tarif = _tarifs_compiles[service]
+    return _calculer_prix_memo(
+        service, float(superficie), tarif.options.intersection(options), categorie, formule
+    )
+
+def _tableau_chaines(valeurs) -> np.ndarray:
+    """Tableau de chaînes à largeur fixe (les comparaisons restent en C)"""
+    valeurs = np.asarray(valeurs)
+    if valeurs.dtype.kind == 'O':
+        valeurs = np.array(['' if v is None else str(v) for v in valeurs.tolist()])
+    return valeurs
+
+def _appliquer_grille(grille: GrilleCompilee, superficies: np.ndarray, masque: np.ndarray,
+                      prix_base: np.ndarray, taux: np.ndarray):
+    """Renseigne prix de base et taux des lignes sélectionnées selon leur palier"""
+    indices = grille.indices(superficies[masque])
+    prix_base[masque] = grille.prix_base_np[indices]
+    taux[masque] = grille.taux_pi2_np[indices]
+
+def calculer_prix_lot(service: str, superficies, options: Optional[Dict[str, Iterable[bool]]] = None,
+                      categories=None, formules=None) -> np.ndarray:
+    """
+    Calcule les prix d'un lot de demandes en une passe vectorisée.
+
+    superficies : tableau de superficies ; options : nom -> tableau de booléens ;
+    categories / formules : tableaux de chaînes (ou None). Les résultats sont
+    identiques à ceux de calculer_prix, élément par élément.
+    """
+    tarif = _tarifs_compiles[service]
+    superficies = np.asarray(superficies, dtype=np.float64)
+    options = {nom: np.asarray(valeurs, dtype=bool) for nom, valeurs in (options or {}).items()}
+
+    # Prix de base et taux selon la catégorie puis le palier
+    prix_base = np.empty_like(superficies)
+    taux = np.empty_like(superficies)
+    reste = np.ones(superficies.shape, dtype=bool)
+    if categories is not None:
+        categories = _tableau_chaines(categories)
+        for categorie, grille in tarif.grilles.items():
+            if categorie is None:
+                continue
+            masque = categories == categorie
+            reste &= ~masque
+            _appliquer_grille(grille, superficies, masque, prix_base, taux)
+    _appliquer_grille(tarif.grilles[None], superficies, reste, prix_base, taux)
+
+    prix = prix_base + superficies * taux
+
+    facteurs = np.ones_like(superficies)
+    if formules is not None:
+        formules = _tableau_chaines(formules)
+        for formule, facteur in tarif.formules.items():
+            facteurs[formules == formule] = facteur
+    prix = prix * facteurs
+
+    # Ajouter 0.0 aux lignes sans l'option laisse leur prix inchangé bit à bit
+    for nom, taux_supplement in tarif.supplements_pi2:
+        if nom in options:
+            prix = prix + np.where(options[nom], superficies * taux_supplement, 0.0)
+    for nom, montant in tarif.forfaits:
+        if nom in options:
+            prix = prix + np.where(options[nom], montant, 0.0)
+
+    multiplicateurs = np.ones_like(superficies)
+    for nom, majoration in tarif.majorations:
+        if nom in options:
+            multiplicateurs = multiplicateurs + np.where(options[nom], majoration, 0.0)
+    prix = prix * multiplicateurs
+
+    if tarif.arrondi is not None:
+        # round() de Python (arrondi décimal exact) pour rester identique au calcul unitaire
+        prix = np.array([round(p, tarif.arrondi) for p in prix.tolist()], dtype=np.float64)
+    return prix
+
+# === LEADS ===
+
+@lru_cache(maxsize=1024)
+def calculer_prix_lead(type_projet: str, budget: str) -> float:
+    """Calcule le prix d'un lead selon le type et budget"""
+    prix = TARIFS_LEADS['prix_par_type'].get(type_projet, TARIFS_LEADS['prix_defaut'])
+    prix *= TARIFS_LEADS['multiplicateurs_budget'].get(budget, TARIFS_LEADS['multiplicateur_defaut'])
+    return round(prix, TARIFS_LEADS['arrondi'])
+
+def calculer_prix_leads_lot(types_projet, budgets) -> np.ndarray:
+    """Calcule les prix d'un lot de leads (recherche par codes de catégories)"""
+    types_projet = np.asarray(types_projet, dtype=object)
+    budgets = np.asarray(budgets, dtype=object)
+
+    types_uniques, codes_types = np.unique(types_projet.astype(str), return_inverse=True)
+    budgets_uniques, codes_budgets = np.unique(budgets.astype(str), return_inverse=True)
+    prix_types = np.array([
+        TARIFS_LEADS['prix_par_type'].get(t, TARIFS_LEADS['prix_defaut']) for t in types_uniques
+    ], dtype=np.float64)
+    multiplicateurs = np.array([
+        TARIFS_LEADS['multiplicateurs_budget'].get(b, TARIFS_LEADS['multiplicateur_defaut']) for b in budgets_uniques
+    ], dtype=np.float64)
+
+    prix = prix_types[codes_types] * multiplicateurs[codes_budgets]
+    return np.array([round(p, TARIFS_LEADS['arrondi']) for p in prix.tolist()], dtype=np.float64)
+
+# === RECALCUL DES DEMANDES EN ATTENTE ===
+
+def _options_depuis_csv(valeurs: List[Optional[str]], noms: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Options actives à partir d'une colonne de services séparés par des virgules"""
+    ensembles = [set((v or '').split(',')) for v in valeurs]
+    return {nom: np.array([nom in e for e in ensembles], dtype=bool) for nom in noms}
+
+def _charger_demandes_en_attente(cursor: sqlite3.Cursor, service: str):
+    """Lit les demandes en attente et reconstruit les paramètres de tarification"""
+    statuts = STATUTS_EN_ATTENTE[service]
+    marqueurs = ', '.join('?' * len(statuts))
+
+    if service == 'technologue':
+        cursor.execute(f'''
+            SELECT id, prix_service, superficie_batiment, services_inclus,
+                   besoin_3d, visite_terrain, niveau_urgence
+            FROM demandes_technologue WHERE statut IN ({marqueurs})
+        ''', statuts)
+        rows = cursor.fetchall()
+        options = _options_depuis_csv([r[3] for r in rows], ('electricite', 'plomberie', 'chauffage'))
+        options['modele_3d'] = np.array([bool(r[4]) for r in rows], dtype=bool)
+        options['visite_terrain'] = np.array([bool(r[5]) for r in rows], dtype=bool)
+        options['urgence_elevee'] = np.array([r[6] == 'eleve' for r in rows], dtype=bool)
+        return rows, {'options': options}
+
+    if service == 'architecture':
+        cursor.execute(f'''
+            SELECT id, prix_service, superficie_batiment, services_inclus
+            FROM demandes_architecture WHERE statut IN ({marqueurs})
+        ''', statuts)
+        rows = cursor.fetchall()
+        noms = [nom for nom, _ in TARIFS['architecture']['supplements_pi2']]
+        return rows, {'options': _options_depuis_csv([r[3] for r in rows], noms)}
+
+    if service == 'ingenieur':
+        cursor.execute(f'''
+            SELECT id, prix_service, superficie_projet, type_structure, services_demandes,
+                   analyse_sismique, analyse_dynamique, modelisation_3d, surveillance_chantier
+            FROM demandes_ingenieur WHERE statut IN ({marqueurs})
+        ''', statuts)
+        rows = cursor.fetchall()
+        options = {
+            nom: np.array([bool(r[5 + i]) for r in rows], dtype=bool)
+            for i, nom in enumerate(('analyse_sismique', 'analyse_dynamique', 'modelisation_3d', 'surveillance_chantier'))
+        }
+        return rows, {
+            'options': options,
+            'categories': [r[3] for r in rows],
+            'formules': [r[4] for r in rows]
+        }
+
+    raise ValueError(f"Service inconnu: {service}")
+
+def requoter_demandes_en_attente(service: str, appliquer: bool = False) -> Dict:
+    """
+    Recalcule en lot le prix des demandes en attente selon la grille actuelle.
+
+    Sans 'appliquer', retourne seulement l'aperçu des écarts. Retourne un dict
+    avec 'demandes', 'modifiees' et 'ecart_total'.
+    """
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        rows, parametres = _charger_demandes_en_attente(cursor, service)
+        if not rows:
+            return {'demandes': 0, 'modifiees': 0, 'ecart_total': 0.0}
+
+        anciens = np.array([r[1] if r[1] is not None else np.nan for r in rows], dtype=np.float64)
+        superficies = np.array([r[2] or 0 for r in rows], dtype=np.float64)
+        nouveaux = calculer_prix_lot(service, superficies, **parametres)
+
+        modifies = ~np.isclose(anciens, nouveaux, rtol=0, atol=0.005) | np.isnan(anciens)
+        ids = [r[0] for r in rows]
+        mises_a_jour = [(float(nouveaux[i]), ids[i]) for i in np.flatnonzero(modifies)]
+
+        if appliquer and mises_a_jour:
+            table = {
+                'technologue': 'demandes_technologue',
+                'architecture': 'demandes_architecture',
+                'ingenieur': 'demandes_ingenieur'
+            }[service]
+            cursor.executemany(f"UPDATE {table} SET prix_service = ? WHERE id = ?", mises_a_jour)
+            conn.commit()
+
+        return {
+            'demandes': len(rows),
+            'modifiees': len(mises_a_jour),
+            'ecart_total': float(np.nansum(nouveaux[modifies] - anciens[modifies]))
+        }
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            return {'demandes': 0, 'modifiees': 0, 'ecart_total': 0.0}
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,1265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Panel d'administration SEAOP - sections, grilles et outils de performance
+
+Importé par le routeur de app_v2 à la première ouverture du panel, puis
+conservé entre les reruns ; seul module des pages à utiliser pandas.
+"""
+
+import streamlit as st
+import sqlite3
+import pandas as pd
+import datetime
+import os
+import base64
+from typing import List, Dict
+from grille_admin import charger_page_grille
+from moteur_tarification import requoter_demandes_en_attente
+from demandes_services import SERVICES
+from requetes_lentes import (
+    SEUIL_MS as SEUIL_REQUETE_LENTE_MS, TRIS as TRIS_REQUETES_LENTES, get_requetes_lentes,
+    persister_requetes_lentes, vider_requetes_lentes
+)
+from metriques import (
+    REGISTRE, PORT_METRIQUES, INTERVALLE_HISTORIQUE, fichier_servi, get_noms_historique, get_historique
+)
+from profilage import (
+    MODES as MODES_PROFILAGE, RERUNS_MAX as RERUNS_MAX_PROFILAGE, armer_profilage, desarmer_profilage,
+    get_armements, lister_profils, top_fonctions
+)
+from instrumentation import (
+    TRACES_EN_MEMOIRE, traces_recentes, lire_traces, resume_par_page, aplatir_spans,
+    instrumenter_fonctions
+)
+from acces_donnees import (
+    get_tableau_de_bord_admin, get_stats_estimations, get_fichiers_client_estimation,
+    mettre_a_jour_statut_estimation, ajouter_documents_estimation, get_stats_architecture,
+    mettre_a_jour_statut_architecture, get_stats_ingenieur, mettre_a_jour_statut_ingenieur,
+    get_stats_technologue, mettre_a_jour_statut_technologue
+)
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+def decoder_fichiers_client(fichiers_string: str) -> List[Dict]:
+    """Decode les fichiers base64 stockés par le client"""
+    fichiers = []
+    if not fichiers_string:
+        return fichiers
+    
+    try:
+        # Format: "nom_fichier:base64_content,nom_fichier2:base64_content2"
+        fichiers_raw = fichiers_string.split(',')
+        
+        for fichier_raw in fichiers_raw:
+            if ':' in fichier_raw:
+                nom_fichier, contenu_b64 = fichier_raw.split(':', 1)
+                fichiers.append({
+                    'nom': nom_fichier,
+                    'contenu_b64': contenu_b64,
+                    'taille': len(contenu_b64) * 3 // 4  # Approximation de la taille décodée
+                })
+    except Exception as e:
+        print(f"Erreur lors du décodage des fichiers: {e}")
+    
+    return fichiers
+
+def generer_lien_telechargement(nom_fichier: str, contenu_b64: str) -> str:
+    """Génère un lien de téléchargement pour un fichier base64"""
+    try:
+        # Déterminer le type MIME basé sur l'extension
+        extension = nom_fichier.lower().split('.')[-1] if '.' in nom_fichier else ''
+        mime_types = {
+            'pdf': 'application/pdf',
+            'jpg': 'image/jpeg', 'jpeg': 'image/jpeg',
+            'png': 'image/png',
+            'doc': 'application/msword',
+            'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+            'dwg': 'application/acad',
+            'txt': 'text/plain'
+        }
+        
+        mime_type = mime_types.get(extension, 'application/octet-stream')
+        
+        # Créer le lien de téléchargement HTML
+        download_link = f"""
+        <a href="data:{mime_type};base64,{contenu_b64}" 
+           download="{nom_fichier}"
+           style="
+               display: inline-block;
+               padding: 8px 16px;
+               background-color: #3B82F6;
+               color: white;
+               text-decoration: none;
+               border-radius: 6px;
+               font-size: 14px;
+               margin: 2px;
+           ">
+           📥 {nom_fichier}
+        </a>
+        """
+        return download_link
+    except Exception as e:
+        return f"❌ Erreur: {nom_fichier}"
+
+def afficher_fichiers_client(plans_client: str, photos_client: str, documents_client: str):
+    """Affiche les fichiers uploadés par le client avec liens de téléchargement"""
+    
+    st.markdown("---")
+    st.markdown("### 📎 Documents fournis par le client")
+    
+    # Plans et croquis
+    if plans_client:
+        st.markdown("**📐 Plans et croquis :**")
+        plans = decoder_fichiers_client(plans_client)
+        if plans:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                for plan in plans:
+                    link = generer_lien_telechargement(plan['nom'], plan['contenu_b64'])
+                    st.markdown(link, unsafe_allow_html=True)
+            with col2:
+                st.info(f"📁 {len(plans)} fichier(s)")
+        else:
+            st.info("Aucun plan fourni")
+    
+    # Photos
+    if photos_client:
+        st.markdown("**📷 Photos de l'existant :**")
+        photos = decoder_fichiers_client(photos_client)
+        if photos:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                for photo in photos:
+                    link = generer_lien_telechargement(photo['nom'], photo['contenu_b64'])
+                    st.markdown(link, unsafe_allow_html=True)
+                    
+                    # Afficher un aperçu pour les images
+                    if photo['nom'].lower().endswith(('.jpg', '.jpeg', '.png')):
+                        try:
+                            import base64
+                            import io
+                            from PIL import Image
+                            
+                            # Décoder et afficher l'image
+                            image_data = fichier_servi('photo', base64.b64decode(photo['contenu_b64']))
+                            image = Image.open(io.BytesIO(image_data))
+                            
+                            # Redimensionner pour l'aperçu
+                            image.thumbnail((300, 300))
+                            st.image(image, caption=photo['nom'], width=300)
+                        except Exception as e:
+                            st.warning(f"Impossible d'afficher l'aperçu de {photo['nom']}")
+            with col2:
+                st.info(f"📸 {len(photos)} photo(s)")
+        else:
+            st.info("Aucune photo fournie")
+    
+    # Autres documents
+    if documents_client:
+        st.markdown("**📄 Autres documents :**")
+        docs = decoder_fichiers_client(documents_client)
+        if docs:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                for doc in docs:
+                    link = generer_lien_telechargement(doc['nom'], doc['contenu_b64'])
+                    st.markdown(link, unsafe_allow_html=True)
+            with col2:
+                st.info(f"📋 {len(docs)} document(s)")
+        else:
+            st.info("Aucun autre document fourni")
+    
+    # Si aucun fichier
+    if not any([plans_client, photos_client, documents_client]):
+        st.info("❌ Aucun document fourni par le client")
+
+def page_administration():
+    """Page d'administration"""
+    
+    if 'admin_connecte' not in st.session_state:
+        st.session_state.admin_connecte = False
+    
+    if not st.session_state.admin_connecte:
+        st.markdown("## ⚙️ Administration")
+        
+        with st.form("connexion_admin"):
+            mot_de_passe_admin = st.text_input("Mot de passe administrateur", type="password")
+            
+            if st.form_submit_button("🔐 Se connecter"):
+                # Récupérer le mot de passe admin depuis les variables d'environnement
+                admin_password = os.getenv('ADMIN_PASSWORD', 'admin123')  # Fallback pour développement local
+                
+                if mot_de_passe_admin == admin_password:
+                    st.session_state.admin_connecte = True
+                    st.success("✅ Connexion réussie!")
+                    st.rerun()
+                else:
+                    st.error("❌ Mot de passe incorrect")
+    
+    else:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown("## ⚙️ Panel d'administration")
+        with col2:
+            if st.button("🚪 Déconnexion"):
+                st.session_state.admin_connecte = False
+                st.rerun()
+        
+        # Sections du panel : seule la section sélectionnée est exécutée à chaque rerun,
+        # et chacune est un fragment pour que ses interactions ne relancent pas les autres
+        sections_admin = {
+            "📊 Vue d'ensemble": admin_section_vue_ensemble,
+            "👥 Gestion des entrepreneurs": admin_section_entrepreneurs,
+            "📋 Gestion des soumissions": admin_section_soumissions,
+            "💰 Gestion des estimations": admin_section_estimations,
+            "📐 Technologue": admin_section_technologue,
+            "🏛️ Architecture": admin_section_architecture,
+            "🔧 Ingénieur": admin_section_ingenieur,
+            "⏱️ Performance": admin_section_performance,
+            "📈 Métriques": admin_section_metriques,
+            "🔬 Profilage": admin_section_profilage
+        }
+        
+        section = st.radio(
+            "Section",
+            list(sections_admin.keys()),
+            horizontal=True,
+            key="admin_section",
+            label_visibility="collapsed"
+        )
+        
+        sections_admin[section]()
+
+# Statuts possibles des demandes de services professionnels
+STATUTS_TECHNOLOGUE = ['recue', 'analyse', 'acceptee', 'en_cours', 'revision', 'terminee']
+STATUTS_ARCHITECTURE = ['recue', 'en_analyse', 'acceptee', 'en_cours',
+                        'revision', 'approuvee', 'livree', 'terminee']
+STATUTS_INGENIEUR = ['recue', 'analyse', 'acceptee', 'calculs', 'plans', 'revision', 'terminee']
+
+# Tris proposés dans les grilles des services professionnels
+TRIS_GRILLE_SERVICES = {
+    "Date (récent)": 'date_desc',
+    "Date (ancien)": 'date_asc',
+    "Prix (décroissant)": 'prix_desc',
+    "Prix (croissant)": 'prix_asc',
+    "Statut": 'statut'
+}
+
+def afficher_page_grille_admin(nom_grille: str, cle: str, filtres: Dict, tri: str) -> List[Dict]:
+    """Charge et affiche la page courante d'une grille d'administration avec sa navigation"""
+    etat_cle = f"grille_{cle}"
+    signature = (tuple(sorted(filtres.items())), tri)
+    
+    # Nouvelle recherche : revenir à la première page
+    etat = st.session_state.get(etat_cle)
+    if not etat or etat['signature'] != signature:
+        etat = {'signature': signature, 'curseurs': [None]}
+        st.session_state[etat_cle] = etat
+    
+    page = charger_page_grille(nom_grille, filtres, tri, curseur=etat['curseurs'][-1])
+    numero_page = len(etat['curseurs'])
+    
+    def page_precedente():
+        etat['curseurs'].pop()
+    
+    def page_suivante():
+        etat['curseurs'].append(page['curseur_suivant'])
+    
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        st.markdown(f"**📊 {page['total']} résultat(s) — page {numero_page}**")
+    with col2:
+        st.button("⬅️ Précédent", key=f"prec_{cle}", disabled=numero_page == 1,
+                  on_click=page_precedente, use_container_width=True)
+    with col3:
+        st.button("Suivant ➡️", key=f"suiv_{cle}", disabled=page['curseur_suivant'] is None,
+                  on_click=page_suivante, use_container_width=True)
+    
+    return page['lignes']
+
+def afficher_requotation_admin(service: str):
+    """Aperçu et application du recalcul des prix des demandes en attente selon la grille actuelle"""
+    # Le corps d'un expander s'exécute à chaque rerun : l'aperçu n'est calculé que sur demande
+    cle_apercu = f"apercu_requotation_{service}"
+    with st.expander("🔁 Recalcul des prix des demandes en attente"):
+        if st.button("Calculer l'aperçu", key=f"apercu_requoter_{service}"):
+            st.session_state[cle_apercu] = requoter_demandes_en_attente(service)
+        apercu = st.session_state.get(cle_apercu)
+        if apercu is None:
+            st.caption("Calculez l'aperçu pour voir les prix à ajuster selon la grille actuelle")
+            return
+        st.caption(
+            f"{apercu['demandes']} demande(s) en attente, {apercu['modifiees']} prix à ajuster "
+            f"(écart total : {apercu['ecart_total']:+,.2f}$)"
+        )
+        if st.button("Appliquer la grille actuelle", key=f"requoter_{service}", disabled=apercu['modifiees'] == 0):
+            resultat = requoter_demandes_en_attente(service, appliquer=True)
+            del st.session_state[cle_apercu]
+            st.success(f"✅ {resultat['modifiees']} prix mis à jour")
+
+@st.fragment
+def admin_section_vue_ensemble():
+    """Section « Vue d'ensemble » : statistiques globales de la plateforme"""
+    st.markdown("### 📊 Statistiques globales de SEAOP")
+    
+    # Statistiques complètes, statistiques des services et dernières demandes, lues en parallèle
+    tableau = get_tableau_de_bord_admin(limite_demandes=10)
+    stats = tableau['stats']
+    
+    # Métriques principales
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total projets", stats['total_projets'])
+    with col2:
+        st.metric("Entrepreneurs inscrits", stats['total_entrepreneurs'])
+    with col3:
+        st.metric("Soumissions envoyées", stats['total_soumissions'])
+    with col4:
+        st.metric("Volume d'affaires", f"{stats['ca_total']:,.2f} $")
+    
+    st.markdown("---")
+    
+    # Top entrepreneurs du mois
+    st.markdown("### 🏆 Top entrepreneurs du mois")
+    if stats['top_entrepreneurs']:
+        for i, (nom, nb_soum, nb_acc, ca, note) in enumerate(stats['top_entrepreneurs'], 1):
+            col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+            with col1:
+                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+                st.write(f"{medal} **{nom}**")
+            with col2:
+                st.write(f"{nb_acc}/{nb_soum} projets")
+            with col3:
+                st.write(f"{ca:,.0f} $" if ca else "0 $")
+            with col4:
+                st.write(f"⭐ {note:.1f}" if note else "Pas de note")
+    else:
+        st.info("Aucune activité ce mois-ci")
+    
+    # Demandes de services (estimation, technologue, architecture, ingénieur)
+    st.markdown("---")
+    st.markdown("### 🧾 Demandes de services")
+    stats_services = tableau['stats_services']
+    colonnes = st.columns(len(SERVICES))
+    for col, (type_service, config) in zip(colonnes, SERVICES.items()):
+        with col:
+            st.metric(
+                config['libelle'],
+                stats_services[type_service]['total'],
+                f"{stats_services[type_service]['en_cours']} en cours",
+                delta_color="off"
+            )
+    
+    demandes_recentes = tableau['demandes_recentes']
+    if demandes_recentes:
+        st.markdown("**Dernières demandes reçues**")
+        st.dataframe(pd.DataFrame([{
+            'Service': SERVICES[d['type_service']]['libelle'],
+            'Référence': d['numero_reference'],
+            'Client': d['nom_client'],
+            'Statut': d['statut'],
+            'Prix': d['prix'],
+            'Date': d['date_demande']
+        } for d in demandes_recentes]), use_container_width=True, hide_index=True)
+    
+    # Évolution de la plateforme
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📈 Évolution des projets")
+        if stats['evolution_projets']:
+            for mois, nb_projets in stats['evolution_projets'][:6]:
+                st.write(f"**{mois}** : {nb_projets} projet(s)")
+        else:
+            st.info("Pas d'historique disponible")
+    
+    with col2:
+        st.markdown("### 💰 Évolution du chiffre d'affaires")
+        if stats['evolution_soumissions']:
+            for mois, nb_soum, ca in stats['evolution_soumissions'][:6]:
+                st.write(f"**{mois}** : {nb_soum} soumission(s)")
+                if ca > 0:
+                    st.write(f"   💰 {ca:,.2f} $")
+        else:
+            st.info("Pas d'historique disponible")
+
+@st.fragment
+def admin_section_entrepreneurs():
+    """Section « Gestion des entrepreneurs »"""
+    st.markdown("### 👥 Gestion des entrepreneurs")
+    
+    # Afficher le tableau des entrepreneurs
+    conn = sqlite3.connect(DATABASE_PATH)
+    df_entrepreneurs = pd.read_sql_query('''
+        SELECT id, nom_entreprise, email, numero_rbq, abonnement, date_inscription
+        FROM entrepreneurs
+        ORDER BY date_inscription DESC
+    ''', conn)
+    conn.close()
+    
+    st.dataframe(df_entrepreneurs, use_container_width=True)
+    
+    # Statistiques des entrepreneurs
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        # Entrepreneurs ayant soumissionné depuis le début du mois
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(DISTINCT entrepreneur_id) FROM soumissions
+            WHERE date_creation >= date('now', 'start of month')
+        ''')
+        actifs_ce_mois = cursor.fetchone()[0]
+        conn.close()
+        st.metric("Entrepreneurs actifs ce mois", actifs_ce_mois)
+    
+    with col2:
+        if df_entrepreneurs is not None and len(df_entrepreneurs) > 0:
+            nouveaux_ce_mois = len(df_entrepreneurs[df_entrepreneurs['date_inscription'].str.startswith(datetime.datetime.now().strftime('%Y-%m'))])
+            st.metric("Nouveaux ce mois", nouveaux_ce_mois)
+        else:
+            st.metric("Nouveaux ce mois", 0)
+    
+    with col3:
+        # Calcul de la note moyenne globale
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        cursor.execute('SELECT AVG(note) FROM evaluations WHERE evaluateur_type = "client"')
+        note_moyenne_globale = cursor.fetchone()[0] or 0
+        conn.close()
+        st.metric("Note moyenne plateforme", f"{note_moyenne_globale:.1f}/5 ⭐" if note_moyenne_globale > 0 else "Aucune")
+
+@st.fragment
+def admin_section_soumissions():
+    """Section « Gestion des soumissions et projets »"""
+    st.markdown("### 📋 Gestion des soumissions et projets")
+    
+    # Afficher le tableau des projets d'abord
+    st.markdown("#### 🏗️ Projets récents")
+    conn = sqlite3.connect(DATABASE_PATH)
+    df_projets = pd.read_sql_query('''
+        SELECT id, numero_reference, nom, type_projet, budget, statut, date_creation
+        FROM leads
+        ORDER BY date_creation DESC
+        LIMIT 10
+    ''', conn)
+    conn.close()
+    
+    st.dataframe(df_projets, use_container_width=True)
+    
+    st.markdown("#### 📊 Soumissions récentes")
+    conn = sqlite3.connect(DATABASE_PATH)
+    df_soumissions = pd.read_sql_query('''
+        SELECT s.id, e.nom_entreprise, l.type_projet, s.montant, s.statut, s.date_creation
+        FROM soumissions s
+        JOIN entrepreneurs e ON s.entrepreneur_id = e.id
+        JOIN leads l ON s.lead_id = l.id
+        ORDER BY s.date_creation DESC
+        LIMIT 100
+    ''', conn)
+    conn.close()
+    
+    st.dataframe(df_soumissions, use_container_width=True)
+
+@st.fragment
+def admin_section_estimations():
+    """Section « Gestion des estimations »"""
+    st.markdown("### 💰 Gestion des estimations")
+    
+    # Statistiques agrégées en SQL ; la liste elle-même est paginée
+    stats_estimations = get_stats_estimations()
+    
+    if stats_estimations['total']:
+        st.markdown(f"**📋 {stats_estimations['total']} demande(s) d'estimation au total**")
+        
+        # Filtres pour les estimations
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            filtre_statut = st.selectbox(
+                "Filtrer par statut",
+                ["Tous", "recue", "en_cours", "terminee", "envoyee", "payee"],
+                format_func=lambda x: {
+                    "Tous": "Tous les statuts",
+                    "recue": "🆕 Reçues", 
+                    "en_cours": "🔄 En cours",
+                    "terminee": "✅ Terminées",
+                    "envoyee": "📧 Envoyées",
+                    "payee": "💰 Payées"
+                }[x]
+            )
+        
+        with col2:
+            filtre_type = st.selectbox(
+                "Filtrer par type",
+                ["Tous", "Rénovation cuisine", "Rénovation salle de bain", "Toiture", "Agrandissement", "Autre"]
+            )
+        
+        with col3:
+            trier_par = st.selectbox(
+                "Trier par",
+                ["Date (récent)", "Date (ancien)", "Prix (croissant)", "Prix (décroissant)", "Statut"]
+            )
+        
+        # Filtres et tri appliqués en SQL, une page à la fois
+        tris = {
+            "Date (récent)": 'date_desc',
+            "Date (ancien)": 'date_asc',
+            "Prix (croissant)": 'prix_asc',
+            "Prix (décroissant)": 'prix_desc',
+            "Statut": 'statut'
+        }
+        estimations_filtrees = afficher_page_grille_admin(
+            'estimations', 'estimations',
+            {'statut': filtre_statut, 'type_projet': filtre_type},
+            tris[trier_par]
+        )
+        
+        # Afficher les estimations
+        for estimation in estimations_filtrees:
+            # Mapper les statuts pour l'affichage
+            statuts_affichage = {
+                'recue': '🆕 Reçue',
+                'en_cours': '🔄 En cours',
+                'terminee': '✅ Terminée',
+                'envoyee': '📧 Envoyée',
+                'payee': '💰 Payée'
+            }
+            
+            statut_badge = statuts_affichage.get(estimation['statut'], estimation['statut'])
+            
+            with st.expander(f"**{estimation['nom_client']}** - {estimation['type_projet']} ({estimation['numero_reference']}) - {statut_badge}", expanded=False):
+                
+                col1, col2, col3 = st.columns([2, 1, 1])
+                
+                with col1:
+                    st.markdown(f"**📧 Email :** {estimation['email_client']}")
+                    st.markdown(f"**📞 Téléphone :** {estimation['telephone_client']}")
+                    st.markdown(f"**📋 Description :** {estimation['description_detaillee'][:200]}...")
+                    if estimation['budget_approximatif']:
+                        st.markdown(f"**💰 Budget approximatif :** {estimation['budget_approximatif']}")
+                
+                with col2:
+                    st.markdown(f"**📅 Date demande :** {estimation['date_demande']}")
+                    st.markdown(f"**📊 Statut :** {statut_badge}")
+                    if estimation['prix_estimation']:
+                        st.markdown(f"**💵 Prix estimation :** {estimation['prix_estimation']:.2f}$")
+                
+                with col3:
+                    # Actions administrateur
+                    st.markdown("**⚙️ Actions :**")
+                    
+                    # Changer le statut
+                    nouveau_statut = st.selectbox(
+                        "Changer statut",
+                        ["recue", "en_cours", "terminee", "envoyee", "payee"],
+                        index=["recue", "en_cours", "terminee", "envoyee", "payee"].index(estimation['statut']),
+                        key=f"statut_{estimation['id']}",
+                        format_func=lambda x: statuts_affichage[x]
+                    )
+                    
+                    # Notes internes
+                    notes_internes = st.text_area(
+                        "Notes internes",
+                        value=estimation['notes_internes'] or "",
+                        key=f"notes_{estimation['id']}",
+                        height=100
+                    )
+                    
+                    if st.button(f"🔄 Mettre à jour", key=f"update_{estimation['id']}"):
+                        if mettre_a_jour_statut_estimation(estimation['id'], nouveau_statut, notes_internes):
+                            st.success("✅ Estimation mise à jour!")
+                            st.rerun(scope="fragment")
+                        else:
+                            st.error("❌ Erreur lors de la mise à jour")
+                
+                # Section upload documents si statut approprié
+                if estimation['statut'] in ['terminee', 'envoyee']:
+                    st.markdown("---")
+                    st.markdown("**📎 Documents d'estimation**")
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        st.markdown("**📄 Estimation (PDF/HTML)**")
+                        estimation_doc = st.file_uploader(
+                            "Upload estimation",
+                            type=['pdf', 'html', 'doc', 'docx'],
+                            key=f"est_doc_{estimation['id']}"
+                        )
+                    
+                    with col2:
+                        st.markdown("**🧾 Facture**")
+                        facture_doc = st.file_uploader(
+                            "Upload facture",
+                            type=['pdf', 'html', 'doc', 'docx'],
+                            key=f"fact_doc_{estimation['id']}"
+                        )
+                    
+                    if st.button(f"📤 Envoyer documents", key=f"send_docs_{estimation['id']}"):
+                        docs_base64 = {}
+                        
+                        if estimation_doc:
+                            file_content = estimation_doc.read()
+                            docs_base64['estimation'] = f"{estimation_doc.name}:{base64.b64encode(file_content).decode()}"
+                        
+                        if facture_doc:
+                            file_content = facture_doc.read()
+                            docs_base64['facture'] = f"{facture_doc.name}:{base64.b64encode(file_content).decode()}"
+                        
+                        if docs_base64:
+                            if ajouter_documents_estimation(
+                                estimation['id'], 
+                                docs_base64.get('estimation'),
+                                docs_base64.get('facture')
+                            ):
+                                st.success("🎉 Documents envoyés avec succès!")
+                                st.info("Le client a été notifié que son estimation est prête.")
+                                st.rerun(scope="fragment")
+                            else:
+                                st.error("❌ Erreur lors de l'envoi des documents")
+                        else:
+                            st.warning("⚠️ Veuillez sélectionner au moins un document")
+                
+                # Fichiers fournis par le client, chargés seulement à la demande
+                if st.toggle("📎 Afficher les documents du client", key=f"docs_client_{estimation['id']}"):
+                    fichiers = get_fichiers_client_estimation(estimation['id'])
+                    afficher_fichiers_client(
+                        fichiers['plans_client'],
+                        fichiers['photos_client'],
+                        fichiers['documents_client']
+                    )
+        
+        # Statistiques des estimations
+        st.markdown("---")
+        st.markdown("### 📊 Statistiques des estimations")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total estimations", stats_estimations['total'])
+        
+        with col2:
+            st.metric("En attente", stats_estimations['recues'])
+        
+        with col3:
+            st.metric("En cours", stats_estimations['en_cours'])
+        
+        with col4:
+            st.metric("CA estimations", f"{stats_estimations['ca_estimations']:.2f}$")
+        
+    else:
+        st.info("📭 Aucune demande d'estimation pour le moment")
+        st.markdown("""
+        **Les clients peuvent demander des estimations via :**
+        - Le menu "💰 Service d'estimation" dans l'interface principale
+        - Upload de plans, photos et description détaillée du projet
+        - Suivi en temps réel du statut de leur demande
+        """)
+
+@st.fragment
+def admin_section_technologue():
+    """Section « Technologue » : demandes de plans de technologue"""
+    st.markdown("### 📐 Gestion des demandes de technologue")
+    
+    stats_tech = get_stats_technologue()
+    
+    if stats_tech['total']:
+        # Statistiques
+        st.markdown("#### 📊 Statistiques du service")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total demandes", stats_tech['total'])
+        with col2:
+            st.metric("En cours", stats_tech['en_cours'])
+        with col3:
+            st.metric("Superficie moyenne", f"{stats_tech['superficie_moyenne']:,.0f} pi²")
+        with col4:
+            st.metric("CA total", f"{stats_tech['ca_total']:,.2f}$")
+        
+        afficher_requotation_admin('technologue')
+        
+        # Liste des demandes
+        st.markdown("#### 📋 Demandes de technologue")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            filtre_statut = st.selectbox(
+                "Filtrer par statut",
+                ["Tous"] + STATUTS_TECHNOLOGUE,
+                key="filtre_statut_tech"
+            )
+        with col2:
+            trier_par = st.selectbox(
+                "Trier par",
+                list(TRIS_GRILLE_SERVICES.keys()),
+                key="tri_tech"
+            )
+        
+        demandes_tech = afficher_page_grille_admin(
+            'technologue', 'tech',
+            {'statut': filtre_statut},
+            TRIS_GRILLE_SERVICES[trier_par]
+        )
+        
+        for demande in demandes_tech:
+            with st.expander(f"📐 {demande['numero_reference']} - {demande['nom_client']}"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.markdown(f"**Client:** {demande['nom_client']}")
+                    st.markdown(f"**Email:** {demande['email_client']}")
+                    st.markdown(f"**Tél:** {demande['telephone_client']}")
+                    st.markdown(f"**Ville:** {demande['ville']}")
+                
+                with col2:
+                    st.markdown(f"**Type:** {demande['type_batiment']}")
+                    st.markdown(f"**Superficie:** {demande['superficie_batiment']:,.0f} pi²")
+                    st.markdown(f"**Étages:** {demande['nombre_etages']}")
+                    st.markdown(f"**Budget technologue:** {demande['budget_technologue']}")
+                
+                with col3:
+                    # Indicateur d'urgence
+                    urgence_colors = {
+                        'faible': '🟢', 'normal': '🟡',
+                        'eleve': '🟠', 'critique': '🔴'
+                    }
+                    urgence_icon = urgence_colors.get(demande['niveau_urgence'], '🟡')
+                    st.markdown(f"**Urgence:** {urgence_icon} {demande['niveau_urgence'].title()}")
+                    st.markdown(f"**Prix service:** {demande['prix_service']:,.2f}$")
+                    st.markdown(f"**Statut:** {demande['statut'].replace('_', ' ').title()}")
+                    
+                    if demande['pourcentage_complete']:
+                        st.progress(demande['pourcentage_complete'] / 100)
+                        st.caption(f"Progression: {demande['pourcentage_complete']}%")
+                
+                st.markdown("---")
+                st.markdown(f"**Usage du bâtiment:** {demande['usage_batiment']}")
+                st.markdown(f"**Type construction:** {demande['type_construction']}")
+                st.markdown(f"**Services inclus:** {demande['services_inclus']}")
+                
+                # Gestion du statut
+                st.markdown("#### 🔧 Gestion de la demande")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    nouveau_statut = st.selectbox(
+                        "Changer le statut",
+                        STATUTS_TECHNOLOGUE,
+                        index=STATUTS_TECHNOLOGUE.index(demande['statut']),
+                        key=f"statut_tech_{demande['id']}"
+                    )
+                    
+                    pourcentage = st.slider(
+                        "Progression (%)",
+                        0, 100, 
+                        value=demande['pourcentage_complete'] or 0,
+                        key=f"progress_tech_{demande['id']}"
+                    )
+                
+                with col2:
+                    notes = st.text_area(
+                        "Notes internes",
+                        value="",
+                        height=100,
+                        key=f"notes_tech_{demande['id']}"
+                    )
+                
+                if st.button(f"💾 Mettre à jour", key=f"update_tech_{demande['id']}"):
+                    if mettre_a_jour_statut_technologue(
+                        demande['id'], nouveau_statut, notes, pourcentage
+                    ):
+                        st.success("✅ Demande mise à jour")
+                        st.rerun(scope="fragment")
+                    else:
+                        st.error("❌ Erreur lors de la mise à jour")
+    else:
+        st.info("📭 Aucune demande de technologue pour le moment")
+
+@st.fragment
+def admin_section_architecture():
+    """Section « Architecture » : demandes d'architecture"""
+    st.markdown("### 🏛️ Gestion des demandes d'architecture")
+    
+    stats_arch = get_stats_architecture()
+    
+    if stats_arch['total']:
+        # Statistiques
+        st.markdown("#### 📊 Statistiques du service")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total demandes", stats_arch['total'])
+        with col2:
+            st.metric("En cours", stats_arch['en_cours'])
+        with col3:
+            st.metric("Superficie moyenne", f"{stats_arch['superficie_moyenne']:,.0f} pi²")
+        with col4:
+            st.metric("CA total", f"{stats_arch['ca_total']:,.2f}$")
+        
+        afficher_requotation_admin('architecture')
+        
+        # Liste des demandes
+        st.markdown("#### 📋 Demandes d'architecture")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            filtre_statut = st.selectbox(
+                "Filtrer par statut",
+                ["Tous"] + STATUTS_ARCHITECTURE,
+                key="filtre_statut_arch"
+            )
+        with col2:
+            trier_par = st.selectbox(
+                "Trier par",
+                list(TRIS_GRILLE_SERVICES.keys()),
+                key="tri_arch"
+            )
+        
+        demandes_arch = afficher_page_grille_admin(
+            'architecture', 'arch',
+            {'statut': filtre_statut},
+            TRIS_GRILLE_SERVICES[trier_par]
+        )
+        
+        for demande in demandes_arch:
+            with st.expander(f"📐 {demande['numero_reference']} - {demande['nom_client']}"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.markdown(f"**Client:** {demande['nom_client']}")
+                    st.markdown(f"**Email:** {demande['email_client']}")
+                    st.markdown(f"**Tél:** {demande['telephone_client']}")
+                    st.markdown(f"**Ville:** {demande['ville']}")
+                
+                with col2:
+                    st.markdown(f"**Type:** {demande['type_batiment']}")
+                    st.markdown(f"**Superficie:** {demande['superficie_batiment']:,.0f} pi²")
+                    st.markdown(f"**Étages:** {demande['nombre_etages']}")
+                    st.markdown(f"**Budget construction:** {demande['budget_construction']}")
+                
+                with col3:
+                    # Indicateur d'urgence
+                    urgence_colors = {
+                        'faible': '🟢', 'normal': '🟡',
+                        'eleve': '🟠', 'critique': '🔴'
+                    }
+                    urgence_icon = urgence_colors.get(demande['niveau_urgence'], '🟡')
+                    st.markdown(f"**Urgence:** {urgence_icon} {demande['niveau_urgence'].title()}")
+                    st.markdown(f"**Prix service:** {demande['prix_service']:,.2f}$")
+                    st.markdown(f"**Statut:** {demande['statut'].replace('_', ' ').title()}")
+                    
+                    if demande['pourcentage_complete']:
+                        st.progress(demande['pourcentage_complete'] / 100)
+                        st.caption(f"Progression: {demande['pourcentage_complete']}%")
+                
+                st.markdown("---")
+                st.markdown(f"**Usage du bâtiment:** {demande['usage_batiment']}")
+                
+                # Gestion du statut
+                st.markdown("#### 🔧 Gestion de la demande")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    nouveau_statut = st.selectbox(
+                        "Changer le statut",
+                        STATUTS_ARCHITECTURE,
+                        index=STATUTS_ARCHITECTURE.index(demande['statut']),
+                        key=f"statut_arch_{demande['id']}"
+                    )
+                    
+                    pourcentage = st.slider(
+                        "Progression (%)",
+                        0, 100, 
+                        value=demande['pourcentage_complete'] or 0,
+                        key=f"progress_arch_{demande['id']}"
+                    )
+                
+                with col2:
+                    notes = st.text_area(
+                        "Notes internes",
+                        value="",
+                        height=100,
+                        key=f"notes_arch_{demande['id']}"
+                    )
+                
+                if st.button(f"💾 Mettre à jour", key=f"update_arch_{demande['id']}"):
+                    if mettre_a_jour_statut_architecture(
+                        demande['id'], nouveau_statut, notes, pourcentage
+                    ):
+                        st.success("✅ Demande mise à jour")
+                        st.rerun(scope="fragment")
+                    else:
+                        st.error("❌ Erreur lors de la mise à jour")
+    else:
+        st.info("📭 Aucune demande d'architecture pour le moment")
+
+@st.fragment
+def admin_section_ingenieur():
+    """Section « Ingénieur » : demandes d'ingénieur en structure"""
+    st.markdown("### 🔧 Gestion des demandes d'ingénieur")
+    
+    stats_ing = get_stats_ingenieur()
+    
+    if stats_ing['total']:
+        # Statistiques
+        st.markdown("#### 📊 Statistiques du service")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total demandes", stats_ing['total'])
+        with col2:
+            st.metric("En cours", stats_ing['en_cours'])
+        with col3:
+            st.metric("Superficie moyenne", f"{stats_ing['superficie_moyenne']:,.0f} pi²")
+        with col4:
+            st.metric("CA total", f"{stats_ing['ca_total']:,.2f}$")
+        
+        afficher_requotation_admin('ingenieur')
+        
+        # Liste des demandes
+        st.markdown("#### 📋 Demandes d'ingénieur")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            filtre_statut = st.selectbox(
+                "Filtrer par statut",
+                ["Tous"] + STATUTS_INGENIEUR,
+                key="filtre_statut_ing"
+            )
+        with col2:
+            trier_par = st.selectbox(
+                "Trier par",
+                list(TRIS_GRILLE_SERVICES.keys()),
+                key="tri_ing"
+            )
+        
+        demandes_ing = afficher_page_grille_admin(
+            'ingenieur', 'ing',
+            {'statut': filtre_statut},
+            TRIS_GRILLE_SERVICES[trier_par]
+        )
+        
+        for demande in demandes_ing:
+            with st.expander(f"🔧 {demande['numero_reference']} - {demande['nom_client']}"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.markdown(f"**Client:** {demande['nom_client']}")
+                    st.markdown(f"**Email:** {demande['email_client']}")
+                    st.markdown(f"**Tél:** {demande['telephone_client']}")
+                    st.markdown(f"**Ville:** {demande['ville']}")
+                
+                with col2:
+                    st.markdown(f"**Type structure:** {demande['type_structure']}")
+                    st.markdown(f"**Superficie:** {demande['superficie_projet']:,.0f} pi²")
+                    st.markdown(f"**Étages:** {demande['nombre_etages']}")
+                    st.markdown(f"**Budget ingénieur:** {demande['budget_ingenieur']}")
+                
+                with col3:
+                    # Indicateur d'urgence
+                    urgence_colors = {
+                        'faible': '🟢', 'normal': '🟡',
+                        'eleve': '🟠', 'critique': '🔴'
+                    }
+                    urgence_icon = urgence_colors.get(demande['niveau_urgence'], '🟡')
+                    st.markdown(f"**Urgence:** {urgence_icon} {demande['niveau_urgence'].title()}")
+                    st.markdown(f"**Prix service:** {demande['prix_service']:,.2f}$")
+                    st.markdown(f"**Statut:** {demande['statut'].replace('_', ' ').title()}")
+                    
+                    if demande['pourcentage_complete']:
+                        st.progress(demande['pourcentage_complete'] / 100)
+                        st.caption(f"Progression: {demande['pourcentage_complete']}%")
+                
+                st.markdown("---")
+                st.markdown(f"**Usage structure:** {demande['usage_structure']}")
+                st.markdown(f"**Type construction:** {demande['type_construction']}")
+                st.markdown(f"**Services demandés:** {demande['services_demandes']}")
+                
+                # Gestion du statut
+                st.markdown("#### 🔧 Gestion de la demande")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    nouveau_statut = st.selectbox(
+                        "Changer le statut",
+                        STATUTS_INGENIEUR,
+                        index=STATUTS_INGENIEUR.index(demande['statut']),
+                        key=f"statut_ing_{demande['id']}"
+                    )
+                    
+                    pourcentage = st.slider(
+                        "Progression (%)",
+                        0, 100, 
+                        value=demande['pourcentage_complete'] or 0,
+                        key=f"progress_ing_{demande['id']}"
+                    )
+                
+                with col2:
+                    notes = st.text_area(
+                        "Notes internes",
+                        value="",
+                        height=100,
+                        key=f"notes_ing_{demande['id']}"
+                    )
+                
+                if st.button(f"💾 Mettre à jour", key=f"update_ing_{demande['id']}"):
+                    if mettre_a_jour_statut_ingenieur(
+                        demande['id'], nouveau_statut, notes, pourcentage
+                    ):
+                        st.success("✅ Demande mise à jour")
+                        st.rerun(scope="fragment")
+                    else:
+                        st.error("❌ Erreur lors de la mise à jour")
+    else:
+        st.info("📭 Aucune demande d'ingénieur pour le moment")
+
+@st.fragment
+def admin_section_performance():
+    """Section « Performance » : durée, requêtes SQL et arbre d'appels des derniers reruns"""
+    st.markdown("### ⏱️ Performance des pages")
+    
+    historique = st.checkbox("Inclure l'historique du fichier de traces (tous processus)", key="perf_historique")
+    traces = lire_traces() if historique else traces_recentes(limite=TRACES_EN_MEMOIRE)
+    if not traces:
+        st.info("Aucun rerun tracé pour le moment")
+        return
+    
+    durees = sorted(t['duree_ms'] for t in traces)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Reruns tracés", len(traces))
+    with col2:
+        st.metric("Durée p95", f"{durees[min(int(0.95 * len(durees)), len(durees) - 1)]:,.0f} ms")
+    with col3:
+        st.metric("Requêtes par rerun", f"{sum(t['requetes'] for t in traces) / len(traces):.1f}")
+    with col4:
+        st.metric("Temps SQL par rerun", f"{sum(t['duree_sql_ms'] for t in traces) / len(traces):,.0f} ms")
+    
+    st.markdown("**Par page**")
+    st.dataframe(pd.DataFrame([{
+        'Page': r['page'],
+        'Reruns': r['reruns'],
+        'p50 (ms)': r['p50_ms'],
+        'p95 (ms)': r['p95_ms'],
+        'Max (ms)': r['max_ms'],
+        'Requêtes (moy.)': r['requetes_moy'],
+        'SQL (moy. ms)': r['sql_moy_ms']
+    } for r in resume_par_page(traces)]), use_container_width=True, hide_index=True)
+    
+    pages = sorted({t['page'] or '—' for t in traces})
+    page = st.selectbox("Page", ["Toutes"] + pages, key="perf_page")
+    if page != "Toutes":
+        traces = [t for t in traces if (t['page'] or '—') == page]
+    traces = traces[:50]
+    
+    st.markdown("**Derniers reruns**")
+    libelles = [
+        f"{datetime.datetime.fromtimestamp(t['horodatage']).strftime('%H:%M:%S')} — {t['page'] or '—'} — "
+        f"{t['duree_ms']:,.0f} ms, {t['requetes']} requête(s)" + ("" if t['issue'] == 'ok' else f" ({t['issue']})")
+        for t in traces
+    ]
+    rang = st.selectbox("Rerun", range(len(traces)), format_func=lambda i: libelles[i], key="perf_rerun")
+    trace = traces[rang]
+    
+    if trace['instructions_lentes']:
+        st.markdown("**Instructions SQL les plus lentes**")
+        st.dataframe(pd.DataFrame([{
+            'Durée (ms)': i['duree_ms'],
+            'Fonction': i['span'],
+            'SQL': i['sql']
+        } for i in trace['instructions_lentes']]), use_container_width=True, hide_index=True)
+    
+    st.markdown("**Arbre d'appels**")
+    st.dataframe(pd.DataFrame([{
+        'Fonction': "\u2003" * s['niveau'] + s['nom'],
+        'Appels': s['appels'],
+        'Durée (ms)': s['duree_ms'],
+        'Requêtes': s['requetes'],
+        'SQL (ms)': s['duree_sql_ms']
+    } for s in aplatir_spans(trace['spans'])]), use_container_width=True, hide_index=True)
+    
+    st.markdown("---")
+    afficher_requetes_lentes_admin()
+
+def courbe_historique_metrique(nom: str, jours: float) -> pd.DataFrame:
+    """Courbes d'une métrique par série d'étiquettes : valeur (jauge), variation par intervalle
+    (compteur) ou durée moyenne par intervalle (somme d'un histogramme)"""
+    def tableau(nom_serie):
+        lignes = get_historique(nom_serie, jours=jours)
+        if not lignes:
+            return pd.DataFrame()
+        return pd.DataFrame([{
+            'Date': pd.to_datetime(l['horodatage']),
+            'Série': ', '.join(f"{k}={v}" for k, v in l['etiquettes'].items()) or nom,
+            'Valeur': l['valeur']
+        } for l in lignes]).pivot_table(index='Date', columns='Série', values='Valeur')
+    
+    valeurs = tableau(nom)
+    if valeurs.empty or not nom.endswith(('_total', '_count', '_sum')):
+        return valeurs
+    # Un redémarrage remet les compteurs à zéro : variation négative ignorée
+    variations = valeurs.diff().clip(lower=0).iloc[1:]
+    if nom.endswith('_sum'):
+        nombres = tableau(nom[:-len('_sum')] + '_count').diff().clip(lower=0).iloc[1:]
+        variations = (variations / nombres.replace(0, float('nan'))).reindex(columns=variations.columns)
+    return variations
+
+@st.fragment
+def admin_section_metriques():
+    """Section « Métriques » : courbes de l'historique des métriques et export Prometheus courant"""
+    st.markdown("### 📈 Métriques")
+    if PORT_METRIQUES:
+        st.caption(f"Export Prometheus : port {PORT_METRIQUES}, chemin /metrics — "
+                   f"un instantané toutes les {INTERVALLE_HISTORIQUE // 60} minutes dans l'historique")
+    
+    noms = get_noms_historique()
+    if not noms:
+        st.info("Aucun instantané dans l'historique pour le moment")
+    else:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            nom = st.selectbox("Métrique", noms, key="metriques_nom")
+        with col2:
+            jours = st.selectbox("Période", [1, 7, 30], index=1, format_func=lambda j: f"{j} jour(s)",
+                                 key="metriques_jours")
+        courbes = courbe_historique_metrique(nom, jours)
+        if courbes.empty:
+            st.info("Pas assez d'instantanés sur la période")
+        else:
+            if nom.endswith('_sum'):
+                st.caption("Durée moyenne par intervalle (secondes)")
+            elif nom.endswith(('_total', '_count')):
+                st.caption("Variation par intervalle")
+            st.line_chart(courbes)
+    
+    with st.expander("Valeurs courantes (format Prometheus)"):
+        st.code(REGISTRE.format_prometheus(), language='text')
+
+# Pages du routeur de main() qui peuvent être profilées
+PAGES_PROFILABLES = ['accueil', 'nouveau_projet', 'mes_projets', 'entrepreneur', 'service_estimation',
+                     'service_technologue', 'service_architecture', 'service_ingenieur', 'experts_ia',
+                     'takeoff_ai', 'erp_ai', 'chat_room', 'admin']
+
+@st.fragment
+def admin_section_profilage():
+    """Section « Profilage » : armement du profileur par page et fonctions les plus coûteuses des profils"""
+    st.markdown("### 🔬 Profilage des pages")
+    st.caption("Les prochains reruns de la page choisie sont profilés, quel que soit l'utilisateur. "
+               "Sur une page, ?profiler=N (et &mode=echantillonnage) arme aussi le profilage "
+               "pour un administrateur connecté.")
+    
+    with st.form("armer_profilage"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            page = st.selectbox("Page", PAGES_PROFILABLES)
+        with col2:
+            reruns = st.number_input("Reruns", min_value=1, max_value=RERUNS_MAX_PROFILAGE, value=3)
+        with col3:
+            mode = st.selectbox("Mode", MODES_PROFILAGE,
+                                format_func={'cprofile': "cProfile", 'echantillonnage': "Échantillonnage"}.get)
+        if st.form_submit_button("▶️ Armer le profilage"):
+            armer_profilage(page, reruns=reruns, mode=mode)
+            st.success(f"✅ Les {reruns} prochain(s) rerun(s) de « {page} » seront profilés")
+    
+    for page_armee, armement in get_armements().items():
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.info(f"⏳ {page_armee} : {armement['reruns']} rerun(s) restant(s), {armement['mode']}, "
+                    f"depuis {armement['depuis']}")
+        with col2:
+            if st.button("Annuler", key=f"desarmer_{page_armee}", use_container_width=True):
+                desarmer_profilage(page_armee)
+                st.rerun(scope="fragment")
+    
+    profils = lister_profils()
+    if not profils:
+        st.info("Aucun profil enregistré")
+        return
+    
+    st.markdown("**Profils enregistrés**")
+    rang = st.selectbox(
+        "Profil", range(len(profils)), key="profil_choisi",
+        format_func=lambda i: f"{profils[i]['date']} — {profils[i]['page']} — {profils[i]['duree_ms']:,} ms "
+                              f"({profils[i]['mode']})"
+    )
+    profil = profils[rang]
+    
+    fonctions = top_fonctions(profil['fichier'])
+    if profil['mode'] == 'cprofile':
+        st.dataframe(pd.DataFrame([{
+            'Fonction': f['fonction'],
+            'Appels': f['appels'],
+            'Temps propre (s)': f['temps_propre'],
+            'Temps cumulé (s)': f['temps_cumule']
+        } for f in fonctions]), use_container_width=True, hide_index=True)
+    else:
+        st.dataframe(pd.DataFrame([{
+            'Fonction': f['fonction'],
+            'Échantillons': f['echantillons'],
+            'Au sommet de la pile': f['propre'],
+            'Part cumulée': f"{f['part_cumulee']:.1%}"
+        } for f in fonctions]), use_container_width=True, hide_index=True)
+    
+    with open(profil['fichier'], 'rb') as fichier:
+        st.download_button(f"⬇️ {profil['nom']}", data=fichier.read(), file_name=profil['nom'],
+                           key="telecharger_profil")
+
+# Libellés des tris du journal des requêtes lentes
+LIBELLES_TRIS_REQUETES_LENTES = {
+    'duree_totale_ms': "Durée totale",
+    'duree_max_ms': "Durée maximale",
+    'executions': "Exécutions",
+    'derniere_date': "Plus récentes"
+}
+
+def afficher_requetes_lentes_admin():
+    """Journal des requêtes lentes, regroupées par empreinte, avec leur plan d'exécution"""
+    st.markdown(f"### 🐢 Requêtes lentes (≥ {SEUIL_REQUETE_LENTE_MS:g} ms)")
+    
+    # Les occurrences de ce processus pas encore persistées par la tâche de fond
+    persister_requetes_lentes()
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        tri = st.selectbox("Trier par", TRIS_REQUETES_LENTES, format_func=LIBELLES_TRIS_REQUETES_LENTES.get,
+                           key="perf_tri_lentes")
+    with col2:
+        if st.button("🗑️ Vider le journal", key="perf_vider_lentes", use_container_width=True):
+            vider_requetes_lentes()
+    
+    requetes = get_requetes_lentes(tri=tri)
+    if not requetes:
+        st.info("Aucune requête lente journalisée")
+        return
+    
+    st.dataframe(pd.DataFrame([{
+        'Durée totale (ms)': round(r['duree_totale_ms'], 1),
+        'Exécutions': r['executions'],
+        'Moyenne (ms)': round(r['duree_totale_ms'] / r['executions'], 1),
+        'Max (ms)': round(r['duree_max_ms'], 1),
+        'Balayage': "⚠️" if r['balayage'] else "",
+        'Paramètres': r['formes_parametres'],
+        'SQL': r['sql_normalise'][:200],
+        'Dernière': r['derniere_date']
+    } for r in requetes]), use_container_width=True, hide_index=True)
+    
+    for r in requetes[:10]:
+        with st.expander(f"{'⚠️ ' if r['balayage'] else ''}{r['duree_totale_ms']:,.0f} ms — {r['sql_normalise'][:90]}"):
+            st.code(r['sql_normalise'], language='sql')
+            st.caption(f"Paramètres : {r['formes_parametres']} — empreinte {r['empreinte']}")
+            st.text(r['plan'] or "Plan non disponible")
+
+# Sections tracées comme spans de chaque rerun
+instrumenter_fonctions(globals(), ('page_', 'admin_section_', 'get_'))
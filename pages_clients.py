@@ -0,0 +1,795 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pages clients SEAOP - accueil, publication et suivi des appels d'offres
+
+Importé par le routeur de app_v2 à la première navigation vers l'une de ces
+pages, puis conservé entre les reruns.
+"""
+
+import streamlit as st
+import sqlite3
+import datetime
+import base64
+import os
+from demandes_services import SERVICES, get_demandes_services
+from statistiques_prix import enregistrer_acceptation
+from metriques import fichier_servi
+from instantane_accueil import get_instantane_accueil
+from acces_donnees import (
+    Lead, valider_email, valider_telephone, valider_code_postal, sauvegarder_lead,
+    ajouter_evaluation, get_evaluation_soumission, count_notifications_non_lues,
+    notifier_soumission_acceptee, notifier_soumission_refusee, get_stats_client, formater_date_affichage,
+    filtrer_mes_projets, get_soumissions_pour_projet, get_mes_projets,
+    determiner_niveau_urgence_automatique, get_couleur_urgence, get_message_urgence
+)
+from instrumentation import instrumenter_fonctions
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+def page_accueil():
+    """Page d'accueil avec présentation du service"""
+    
+    # Projets et compteurs partagés par les sessions, recalculés par la tâche de fond
+    instantane = get_instantane_accueil()
+    
+    # Navigation uniquement par le menu
+    st.info("ℹ️ Utilisez le menu de navigation dans la barre latérale gauche pour accéder aux différentes sections.")
+    st.markdown("---")
+    
+    # Section héro
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("""
+        ### 🎯 Système d'Appel d'Offres Électronique
+        
+        **Pour les organismes publics et clients:**
+        1. 📝 Publiez vos appels d'offres avec tous les détails et plans
+        2. 📊 Recevez des soumissions détaillées d'entrepreneurs qualifiés RBQ
+        3. 💬 Communiquez directement avec les entrepreneurs
+        4. ✅ Sélectionnez la meilleure offre selon vos critères
+        
+        **Pour les entrepreneurs et fournisseurs:**
+        1. 🔍 Consultez les appels d'offres disponibles
+        2. 📋 Soumettez vos propositions conformes aux exigences
+        3. 💼 Présentez votre expertise et certifications
+        4. 🤝 Obtenez de nouveaux contrats publics
+        """)
+        
+        st.markdown("**Pour commencer :**")
+        st.markdown("👉 Utilisez le **menu de navigation** dans la barre latérale gauche")
+        st.markdown("👉 Sélectionnez **'📝 Publier un appel d'offres'** dans le menu déroulant")
+    
+    with col2:
+        st.markdown("""
+        ### 📊 Statistiques
+        """)
+        
+        st.metric("Appels d'offres actifs", f"{instantane['appels_offres_actifs']:,}",
+                  f"+{instantane['appels_offres_semaine']:,} cette semaine")
+        st.metric("Fournisseurs qualifiés", f"{instantane['fournisseurs']:,}",
+                  f"+{instantane['fournisseurs_semaine']:,} cette semaine")
+        st.metric("Soumissions reçues", f"{instantane['soumissions']:,}",
+                  f"+{instantane['soumissions_semaine']:,} cette semaine")
+        # Indicateur de démonstration, sans source en base
+        st.metric("Taux de conformité", "96%", "+2%")
+    
+    # Appels d'offres récents
+    st.markdown("---")
+    st.markdown("### 🆕 Appels d'offres récents")
+    
+    projets = instantane['projets']
+    
+    if projets:
+        for projet in projets:
+            # Obtenir les informations d'urgence
+            icone_urgence, couleur_urgence, libelle_urgence = get_couleur_urgence(projet['niveau_urgence'])
+            jours_min = min(projet['jours_restants_soumissions'], projet['jours_restants_debut'])
+            message_urgence = get_message_urgence(projet['niveau_urgence'], jours_min)
+            
+            with st.container():
+                # Afficher un badge d'urgence visible
+                if projet['niveau_urgence'] in ['critique', 'eleve']:
+                    st.markdown(f"""
+                        <div style="background-color: {couleur_urgence}; color: white; padding: 8px; border-radius: 4px; margin-bottom: 10px; text-align: center; font-weight: bold;">
+                            {icone_urgence} {message_urgence}
+                        </div>
+                    """, unsafe_allow_html=True)
+                
+                col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+                
+                with col1:
+                    st.markdown(f"**{projet['type_projet']}** - {projet['code_postal']}")
+                    st.caption(f"Budget: {projet['budget']} • Délai: {projet['delai_realisation']}")
+                
+                with col2:
+                    st.caption(f"📋 {projet['nb_soumissions']} soumissions")
+                
+                with col3:
+                    date_affichage = formater_date_affichage(projet['date_creation'])
+                    st.caption(f"📅 {date_affichage}")
+                
+                with col4:
+                    # Indicateur d'urgence compact
+                    st.markdown(f"""
+                        <div style="text-align: center;">
+                            <span style="font-size: 24px;">{icone_urgence}</span><br>
+                            <small style="color: {couleur_urgence}; font-weight: bold;">{libelle_urgence}</small>
+                        </div>
+                    """, unsafe_allow_html=True)
+                
+                st.markdown("---")
+    else:
+        st.info("Aucun appel d'offres disponible pour le moment")
+
+def page_nouveau_projet():
+    """Page pour créer un nouvel appel d'offres"""
+    
+    st.markdown("## 📝 Publier un nouvel appel d'offres")
+    st.markdown("Décrivez votre projet en détail pour recevoir des soumissions conformes aux exigences")
+    
+    with st.form("formulaire_projet"):
+        # Informations personnelles
+        st.markdown("### 👤 Vos informations")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            nom = st.text_input("Nom complet *", placeholder="Jean Tremblay")
+            telephone = st.text_input("Téléphone *", placeholder="514-123-4567")
+        
+        with col2:
+            email = st.text_input("Email *", placeholder="jean.tremblay@email.com")
+            code_postal = st.text_input("Code postal *", placeholder="H1A 1A1")
+        
+        # Détails du projet
+        st.markdown("### 🏗️ Détails du projet")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            type_projet = st.selectbox(
+                "Type de projet *",
+                ["", "Rénovation cuisine", "Rénovation salle de bain", "Toiture", 
+                 "Revêtement extérieur", "Plancher", "Peinture", "Agrandissement",
+                 "Électricité", "Plomberie", "Chauffage/Climatisation", "Isolation",
+                 "Fenêtres et portes", "Maçonnerie", "Charpenterie", "Autre"]
+            )
+            
+            budget = st.selectbox(
+                "Budget estimé *",
+                ["", "Moins de 5 000$", "5 000$ - 15 000$", "15 000$ - 30 000$", 
+                 "30 000$ - 50 000$", "Plus de 50 000$", "À déterminer"]
+            )
+        
+        with col2:
+            delai_realisation = st.selectbox(
+                "Délai de réalisation souhaité *",
+                ["", "Dès que possible", "Dans 1 mois", "Dans 2-3 mois", 
+                 "Dans 3-6 mois", "Plus de 6 mois", "Flexible"]
+            )
+            
+            niveau_urgence = st.selectbox(
+                "Niveau d'urgence",
+                ["normal", "faible", "eleve", "critique"],
+                format_func=lambda x: {
+                    'faible': '🟢 Faible - Pas pressé',
+                    'normal': '🟡 Normal - Dans les temps',
+                    'eleve': '🟠 Élevé - Assez urgent',
+                    'critique': '🔴 Critique - Très urgent'
+                }[x],
+                help="Indiquez le niveau d'urgence de votre projet"
+            )
+        
+        description = st.text_area(
+            "Description détaillée du projet *",
+            placeholder="""Décrivez votre projet en détail :
+- Dimensions et superficie
+- Matériaux souhaités
+- Contraintes particulières
+- Accès au chantier
+- Préférences spécifiques
+- Etc.""",
+            height=200
+        )
+        
+        # Délais et échéances
+        st.markdown("### ⏰ Délais et échéances")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            date_limite_soumissions = st.date_input(
+                "Date limite pour recevoir les soumissions",
+                value=datetime.date.today() + datetime.timedelta(days=14),
+                min_value=datetime.date.today() + datetime.timedelta(days=1),
+                help="Date après laquelle aucune nouvelle soumission ne sera acceptée"
+            )
+        
+        with col2:
+            date_debut_souhaite = st.date_input(
+                "Date de début souhaitée des travaux",
+                value=datetime.date.today() + datetime.timedelta(days=30),
+                min_value=datetime.date.today() + datetime.timedelta(days=1),
+                help="Date à laquelle vous souhaitez que les travaux commencent"
+            )
+        
+        # Afficher un aperçu de l'urgence basé sur les dates sélectionnées
+        if date_limite_soumissions and date_debut_souhaite:
+            urgence_calculee = determiner_niveau_urgence_automatique(
+                str(date_limite_soumissions), 
+                str(date_debut_souhaite)
+            )
+            icone_calc, couleur_calc, libelle_calc = get_couleur_urgence(urgence_calculee)
+            
+            st.info(f"""
+                **Urgence calculée automatiquement :** {icone_calc} {libelle_calc}
+                
+                Basé sur vos dates, le système recommande un niveau d'urgence **{libelle_calc.lower()}**.
+                Vous pouvez ajuster manuellement ci-dessus si nécessaire.
+            """)
+        
+        # Upload de fichiers
+        st.markdown("### 📎 Documents et plans")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            photos = st.file_uploader(
+                "Photos actuelles",
+                type=['png', 'jpg', 'jpeg'],
+                accept_multiple_files=True,
+                help="Photos de l'état actuel"
+            )
+        
+        with col2:
+            plans = st.file_uploader(
+                "Plans et croquis",
+                type=['pdf', 'png', 'jpg', 'jpeg', 'dwg'],
+                accept_multiple_files=True,
+                help="Plans architecturaux, croquis, dessins"
+            )
+        
+        with col3:
+            documents = st.file_uploader(
+                "Autres documents",
+                type=['pdf', 'doc', 'docx', 'xls', 'xlsx'],
+                accept_multiple_files=True,
+                help="Devis existants, permis, etc."
+            )
+        
+        # Options
+        st.markdown("### ⚙️ Options")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            visible_entrepreneurs = st.checkbox(
+                "Rendre mon projet visible aux entrepreneurs",
+                value=True,
+                help="Les entrepreneurs pourront voir et soumissionner sur votre projet"
+            )
+        
+        with col2:
+            accepte_soumissions = st.checkbox(
+                "Accepter les soumissions",
+                value=True,
+                help="Vous pourrez fermer les soumissions une fois satisfait"
+            )
+        
+        # Consentement
+        consentement = st.checkbox(
+            "J'accepte que mes informations soient partagées avec les entrepreneurs pour recevoir des soumissions. *"
+        )
+        
+        # Soumission
+        submitted = st.form_submit_button("🚀 Publier mon projet", type="primary")
+        
+        if submitted:
+            # Validation
+            erreurs = []
+            
+            if not nom.strip():
+                erreurs.append("Le nom est requis")
+            if not email.strip() or not valider_email(email):
+                erreurs.append("Email valide requis")
+            if not telephone.strip() or not valider_telephone(telephone):
+                erreurs.append("Téléphone valide requis")
+            if not code_postal.strip() or not valider_code_postal(code_postal):
+                erreurs.append("Code postal valide requis")
+            if not type_projet:
+                erreurs.append("Type de projet requis")
+            if not budget:
+                erreurs.append("Budget requis")
+            if not delai_realisation:
+                erreurs.append("Délai requis")
+            if not description.strip() or len(description) < 50:
+                erreurs.append("Description détaillée requise (min. 50 caractères)")
+            if not consentement:
+                erreurs.append("Consentement requis")
+            
+            if erreurs:
+                for erreur in erreurs:
+                    st.error(f"❌ {erreur}")
+            else:
+                # Traitement des fichiers
+                photos_data = None
+                if photos:
+                    photos_base64 = []
+                    for photo in photos[:5]:  # Limiter à 5 photos
+                        photo_data = base64.b64encode(photo.read()).decode()
+                        photos_base64.append(photo_data)
+                    photos_data = ",".join(photos_base64)
+                
+                plans_data = None
+                if plans:
+                    plans_base64 = []
+                    for plan in plans[:3]:  # Limiter à 3 plans
+                        plan_data = base64.b64encode(plan.read()).decode()
+                        plans_base64.append(plan_data)
+                    plans_data = ",".join(plans_base64)
+                
+                documents_data = None
+                if documents:
+                    docs_base64 = []
+                    for doc in documents[:3]:  # Limiter à 3 documents
+                        doc_data = base64.b64encode(doc.read()).decode()
+                        docs_base64.append(doc_data)
+                    documents_data = ",".join(docs_base64)
+                
+                # Création du lead
+                lead = Lead(
+                    nom=nom,
+                    email=email,
+                    telephone=telephone,
+                    code_postal=code_postal,
+                    type_projet=type_projet,
+                    description=description,
+                    budget=budget,
+                    delai_realisation=delai_realisation,
+                    date_limite_soumissions=str(date_limite_soumissions),
+                    date_debut_souhaite=str(date_debut_souhaite),
+                    niveau_urgence=niveau_urgence,
+                    photos=photos_data,
+                    plans=plans_data,
+                    documents=documents_data,
+                    visible_entrepreneurs=visible_entrepreneurs,
+                    accepte_soumissions=accepte_soumissions
+                )
+                
+                # Sauvegarde
+                numero_reference = sauvegarder_lead(lead)
+                
+                if lead.doublon_de:
+                    st.warning(f"""
+                    🔁 **Ce projet ressemble fortement à votre projet {lead.doublon_de['numero_reference']} déjà publié.**
+                    
+                    Il a été enregistré sous la référence {numero_reference} mais n'est pas diffusé séparément :
+                    les entrepreneurs continuent de soumissionner sur le projet original.
+                    S'il s'agit d'un projet distinct, contactez-nous pour le publier.
+                    """)
+                else:
+                    # Message de succès
+                    st.success(f"""
+                ✅ **Votre projet a été publié avec succès!**
+                
+                **Numéro de référence:** {numero_reference}
+                
+                📧 Un email de confirmation vous a été envoyé.
+                
+                📋 Les entrepreneurs peuvent maintenant consulter votre projet et soumettre leurs propositions.
+                
+                💡 **Prochaines étapes:**
+                1. Consultez régulièrement vos soumissions dans "Mes projets"
+                2. Communiquez avec les entrepreneurs via la messagerie
+                3. Comparez les offres et choisissez la meilleure
+                """)
+                
+                # Stocker l'email en session pour accès rapide
+                st.session_state.client_email = email
+                
+                st.balloons()
+
+def page_mes_projets():
+    """Page pour consulter ses projets et soumissions"""
+    
+    # En-tête avec notifications
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.markdown("## 📋 Mes projets")
+    
+    with col2:
+        # Afficher notifications si client connecté
+        if 'client_email' in st.session_state:
+            # Utiliser l'ID du premier projet comme référence client (pas optimal mais fonctionnel)
+            projets = get_mes_projets(st.session_state.client_email)
+            if projets:
+                client_id = projets[0]['id']
+                notifs_non_lues = count_notifications_non_lues('client', client_id)
+                
+                if notifs_non_lues > 0:
+                    if st.button(f"🔔 Notifications ({notifs_non_lues})", key="voir_notifs_client"):
+                        st.session_state.mode_notifications = True
+                        st.session_state.notif_type_utilisateur = 'client'
+                        st.session_state.notif_utilisateur_id = client_id
+                        st.rerun()
+    
+    # Demander l'email si pas en session
+    if 'client_email' not in st.session_state:
+        email = st.text_input("Entrez votre email pour voir vos projets:", placeholder="votre@email.com")
+        if st.button("Voir mes projets"):
+            if email and valider_email(email):
+                st.session_state.client_email = email
+                st.rerun()
+            else:
+                st.error("Email invalide")
+        return
+    
+    email = st.session_state.client_email
+    st.caption(f"Connecté en tant que: {email}")
+    
+    # Récupérer les projets
+    projets = get_mes_projets(email)
+    
+    if not projets:
+        st.info("Vous n'avez pas encore de projets. Créez votre premier projet!")
+        if st.button("📝 Créer un projet"):
+            st.session_state.page = 'nouveau_projet'
+            st.rerun()
+        return
+    
+    # Onglets pour séparer projets et dashboard
+    tab1, tab2 = st.tabs(["📋 Mes projets", "📊 Dashboard"])
+    
+    with tab1:
+        st.markdown("### 🏗️ Vos projets actifs")
+        
+        # Interface de filtrage pour les projets clients
+        with st.expander("🔍 Filtres mes projets", expanded=False):
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                recherche_client = st.text_input(
+                    "🔍 Recherche",
+                    placeholder="Description, type, référence...",
+                    key="recherche_client_projets"
+                )
+                
+                statut_client_filtre = st.selectbox(
+                    "📊 Statut",
+                    ["Tous", "Avec soumissions", "Sans soumissions", "Projet terminé"],
+                    key="statut_client_filtre"
+                )
+            
+            with col2:
+                periode_client_filtre = st.selectbox(
+                    "📅 Période",
+                    ["Toutes", "Cette semaine", "Ce mois", "Ce trimestre"],
+                    key="periode_client_filtre"
+                )
+                
+                type_projet_client_filtre = st.selectbox(
+                    "🏗️ Type de projet",
+                    ["Tous", "Rénovation résidentielle", "Construction neuve", "Rénovation commerciale", 
+                     "Toiture", "Plomberie", "Électricité", "Paysagement", "Autres"],
+                    key="type_projet_client_filtre"
+                )
+            
+            with col3:
+                trier_projets_client = st.selectbox(
+                    "📊 Trier par",
+                    ["Date (plus récent)", "Date (plus ancien)", "Nb soumissions (décroissant)", "Nb soumissions (croissant)"],
+                    key="tri_projets_client"
+                )
+        
+        # Application des filtres
+        projets_filtres = filtrer_mes_projets(
+            email=email,
+            statut=statut_client_filtre if statut_client_filtre != "Tous" else None,
+            periode=periode_client_filtre if periode_client_filtre != "Toutes" else None,
+            type_projet=type_projet_client_filtre if type_projet_client_filtre != "Tous" else None,
+            recherche_texte=recherche_client if recherche_client else None
+        )
+        
+        # Affichage des résultats
+        st.markdown(f"**{len(projets_filtres)} projet(s) trouvé(s)**")
+        
+        # Afficher les projets filtrés
+        for projet in projets_filtres:
+            with st.expander(f"🏗️ {projet['type_projet']} - {projet['numero_reference']}", expanded=True):
+                # Infos du projet
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.markdown("**Détails du projet:**")
+                    st.write(f"Budget: {projet['budget']}")
+                    st.write(f"Délai: {projet['delai_realisation']}")
+                    st.write(f"Code postal: {projet['code_postal']}")
+                
+                with col2:
+                    st.markdown("**Statut:**")
+                    if projet['nb_soumissions'] > 0:
+                        st.success(f"📋 {projet['nb_soumissions']} soumission(s) reçue(s)")
+                    else:
+                        st.info("En attente de soumissions")
+                    
+                    if projet['nb_acceptees'] > 0:
+                        st.success("✅ Soumission acceptée")
+                
+                with col3:
+                    st.markdown("**Actions:**")
+                    if projet['accepte_soumissions']:
+                        if st.button(f"🔒 Fermer les soumissions", key=f"fermer_{projet['id']}"):
+                            # Fermer les soumissions
+                            conn = sqlite3.connect(DATABASE_PATH)
+                            cursor = conn.cursor()
+                            cursor.execute('''
+                                UPDATE leads SET accepte_soumissions = 0 WHERE id = ?
+                            ''', (projet['id'],))
+                            conn.commit()
+                            conn.close()
+                            st.success("Soumissions fermées")
+                            st.rerun()
+                    else:
+                        st.caption("Soumissions fermées")
+                
+                # Description
+                st.markdown("**Description:**")
+                st.text_area("", value=projet['description'], height=100, disabled=True, key=f"desc_{projet['id']}")
+                
+                # Soumissions reçues
+                if projet['nb_soumissions'] > 0:
+                    st.markdown("---")
+                    st.markdown("### 📊 Soumissions reçues")
+                    
+                    soumissions = get_soumissions_pour_projet(projet['id'])
+                    
+                    for i, soum in enumerate(soumissions):
+                        with st.container():
+                            col1, col2, col3 = st.columns([2, 1, 1])
+                            
+                            with col1:
+                                st.markdown(f"**{soum['nom_entreprise']}**")
+                                if soum['numero_rbq']:
+                                    st.caption(f"RBQ: {soum['numero_rbq']}")
+                                if soum['evaluations_moyenne'] > 0:
+                                    stars = "⭐" * int(soum['evaluations_moyenne'])
+                                    st.caption(f"{stars} {soum['evaluations_moyenne']}/5 ({soum['nombre_evaluations']} avis)")
+                                else:
+                                    st.caption("Aucune évaluation encore")
+                            
+                            with col2:
+                                st.metric("Montant", f"{soum['montant']:,.2f}$")
+                            
+                            with col3:
+                                st.caption(f"Délai: {soum['delai_execution']}")
+                                st.caption(f"Validité: {soum['validite_offre']}")
+                            
+                            # Détails de la soumission
+                            with st.expander(f"Voir les détails de la soumission"):
+                                st.markdown("**Description des travaux:**")
+                                st.text_area("", value=soum['description_travaux'], height=200, disabled=True, key=f"travaux_{soum['id']}")
+                                
+                                col1, col2 = st.columns(2)
+                                with col1:
+                                    st.markdown("**Inclusions:**")
+                                    st.text_area("", value=soum['inclusions'] or "Non spécifié", height=100, disabled=True, key=f"incl_{soum['id']}")
+                                
+                                with col2:
+                                    st.markdown("**Exclusions:**")
+                                    st.text_area("", value=soum['exclusions'] or "Non spécifié", height=100, disabled=True, key=f"excl_{soum['id']}")
+                                
+                                st.markdown("**Conditions:**")
+                                st.text_area("", value=soum['conditions'] or "Non spécifié", height=80, disabled=True, key=f"cond_{soum['id']}")
+                                
+                                # Affichage des pièces jointes de la soumission
+                                if soum['documents']:
+                                    st.markdown("---")
+                                    st.markdown("### 📎 Documents joints à la soumission")
+                                    
+                                    try:
+                                        # Format: "filename1:base64data1|filename2:base64data2"
+                                        documents_list = soum['documents'].split('|')
+                                        
+                                        cols = st.columns(min(3, len(documents_list)))
+                                        
+                                        for i, doc_entry in enumerate(documents_list):
+                                            if ':' in doc_entry:
+                                                filename, doc_base64 = doc_entry.split(':', 1)
+                                                
+                                                with cols[i % 3]:
+                                                    try:
+                                                        doc_data = fichier_servi('document', base64.b64decode(doc_base64))
+                                                        
+                                                        # Déterminer le type MIME basé sur l'extension
+                                                        if filename.lower().endswith('.pdf'):
+                                                            mime_type = "application/pdf"
+                                                        elif filename.lower().endswith(('.doc', '.docx')):
+                                                            mime_type = "application/msword"
+                                                        elif filename.lower().endswith(('.xls', '.xlsx')):
+                                                            mime_type = "application/vnd.ms-excel"
+                                                        elif filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+                                                            mime_type = "image/png"
+                                                        else:
+                                                            mime_type = "application/octet-stream"
+                                                        
+                                                        st.download_button(
+                                                            f"📄 {filename}",
+                                                            data=doc_data,
+                                                            file_name=filename,
+                                                            mime=mime_type,
+                                                            key=f"download_{soum['id']}_{i}",
+                                                            use_container_width=True
+                                                        )
+                                                    except Exception as e:
+                                                        st.error(f"Erreur lors du chargement de {filename}")
+                                    except Exception as e:
+                                        st.error("Erreur lors du traitement des documents")
+                                
+                                # Actions sur la soumission
+                                col1, col2, col3 = st.columns(3)
+                            
+                            with col1:
+                                if soum['statut'] != 'acceptee':
+                                    if st.button("✅ Accepter", key=f"accept_{soum['id']}", type="primary"):
+                                        conn = sqlite3.connect(DATABASE_PATH)
+                                        cursor = conn.cursor()
+                                        cursor.execute('''
+                                            UPDATE soumissions SET statut = 'acceptee' WHERE id = ?
+                                        ''', (soum['id'],))
+                                        try:
+                                            enregistrer_acceptation(cursor, soum['id'])
+                                        except Exception as e:
+                                            print(f"Erreur lors de la mise à jour des statistiques de prix: {e}")
+                                        conn.commit()
+                                        conn.close()
+                                        
+                                        # Créer notification pour l'entrepreneur
+                                        notifier_soumission_acceptee(soum['id'])
+                                        
+                                        st.success("Soumission acceptée!")
+                                        st.rerun()
+                                else:
+                                    st.success("✅ Soumission acceptée")
+                            
+                            with col2:
+                                if soum['statut'] != 'refusee' and soum['statut'] != 'acceptee':
+                                    if st.button("❌ Refuser", key=f"refuse_{soum['id']}"):
+                                        conn = sqlite3.connect(DATABASE_PATH)
+                                        cursor = conn.cursor()
+                                        cursor.execute('''
+                                            UPDATE soumissions SET statut = 'refusee' WHERE id = ?
+                                        ''', (soum['id'],))
+                                        conn.commit()
+                                        conn.close()
+                                        
+                                        # Créer notification pour l'entrepreneur
+                                        notifier_soumission_refusee(soum['id'])
+                                        
+                                        st.info("Soumission refusée")
+                                        st.rerun()
+                            
+                            with col3:
+                                if st.button("💬 Chat", key=f"chat_{soum['id']}", help="Discuter avec l'entrepreneur"):
+                                    st.session_state.chat_lead_id = projet['id']
+                                    st.session_state.chat_entrepreneur_id = soum['entrepreneur_id']
+                                    st.session_state.chat_nom_entrepreneur = soum['nom_entreprise']
+                                    st.session_state.chat_type_utilisateur = 'client'
+                                    st.session_state.mode_chat = True
+                                    st.rerun()
+                            
+                            # Section évaluation (visible seulement si soumission acceptée)
+                            if soum['statut'] == 'acceptee':
+                                st.markdown("---")
+                                st.markdown("### ⭐ Évaluer cet entrepreneur")
+                                
+                                # Vérifier si déjà évalué
+                                evaluation_existante = get_evaluation_soumission(soum['id'], 'client')
+                                
+                                if evaluation_existante:
+                                    st.success(f"✅ Vous avez déjà évalué : {evaluation_existante['note']}/5 ⭐")
+                                    if evaluation_existante['commentaire']:
+                                        st.info(f"💬 Votre commentaire : {evaluation_existante['commentaire']}")
+                                else:
+                                    with st.form(f"evaluation_{soum['id']}"):
+                                        col_eval1, col_eval2 = st.columns([1, 2])
+                                        
+                                        with col_eval1:
+                                            note = st.selectbox(
+                                                "Note sur 5",
+                                                options=[5, 4, 3, 2, 1],
+                                                format_func=lambda x: f"{x} ⭐" + (" - Excellent" if x==5 else " - Très bon" if x==4 else " - Correct" if x==3 else " - Moyen" if x==2 else " - Décevant"),
+                                                key=f"note_{soum['id']}"
+                                            )
+                                        
+                                        with col_eval2:
+                                            commentaire = st.text_area(
+                                                "Commentaire (optionnel)",
+                                                placeholder="Décrivez votre expérience avec cet entrepreneur...",
+                                                height=100,
+                                                key=f"comment_{soum['id']}"
+                                            )
+                                        
+                                        if st.form_submit_button("📝 Publier l'évaluation", type="primary"):
+                                            if ajouter_evaluation(soum['id'], 'client', note, commentaire):
+                                                st.success("✅ Évaluation publiée avec succès!")
+                                                st.balloons()
+                                                st.rerun()
+                                            else:
+                                                st.error("❌ Erreur lors de la publication de l'évaluation")
+                        
+                        st.markdown("---")
+    
+    with tab2:
+        st.markdown("### 📊 Tableau de bord client")
+        
+        # Récupérer les statistiques
+        stats = get_stats_client(email)
+        
+        # Métriques principales
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Projets publiés", stats['nb_projets'])
+        
+        with col2:
+            st.metric("Soumissions reçues", stats['total_soumissions'])
+        
+        with col3:
+            st.metric("Soumissions acceptées", stats['soumissions_acceptees'])
+        
+        with col4:
+            st.metric("Taux d'acceptation", f"{stats['taux_acceptation']}%")
+        
+        st.markdown("---")
+        
+        # Statistiques détaillées
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("### 💰 Analyse financière")
+            if stats['montant_moyen_soumissions'] > 0:
+                st.metric("Montant moyen des soumissions", f"{stats['montant_moyen_soumissions']:,.2f} $")
+                st.metric("Soumissions par projet (moyenne)", stats['moy_soumissions_par_projet'])
+            else:
+                st.info("Aucune soumission reçue encore")
+        
+        with col2:
+            st.markdown("### 📈 Performance")
+            if stats['evolution_mensuelle']:
+                st.markdown("**Évolution mensuelle :**")
+                for mois, nb_projets, nb_soumissions in stats['evolution_mensuelle'][:3]:
+                    st.write(f"**{mois}** : {nb_projets} projet(s), {nb_soumissions} soumission(s)")
+            else:
+                st.info("Pas encore d'historique disponible")
+        
+        # Conseils et recommandations
+        st.markdown("---")
+        st.markdown("### 💡 Recommandations")
+        
+        if stats['nb_projets'] == 0:
+            st.info("🚀 Commencez par publier votre premier appel d'offres !")
+        elif stats['total_soumissions'] == 0:
+            st.warning("📢 Vos projets n'ont pas encore reçu de soumissions. Vérifiez vos descriptions et budgets.")
+        elif stats['taux_acceptation'] < 50 and stats['soumissions_acceptees'] > 0:
+            st.warning("⚡ Votre taux d'acceptation est bas. Considérez réviser vos critères de sélection.")
+        else:
+            st.success("✅ Excellent ! Votre utilisation de SEAOP est optimale.")
+        
+        # Toutes les demandes de services du client, en une requête
+        demandes_services = get_demandes_services(email_client=email)
+        if demandes_services:
+            st.markdown("---")
+            st.markdown("### 🧾 Mes demandes de services")
+            for demande in demandes_services:
+                col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+                with col1:
+                    st.write(f"**{SERVICES[demande['type_service']]['libelle']}** — {demande['numero_reference']}")
+                with col2:
+                    st.write(f"Statut : {demande['statut'].replace('_', ' ').title()}")
+                with col3:
+                    st.write(f"{demande['prix']:,.2f} $" if demande['prix'] else "-")
+                with col4:
+                    st.write(str(demande['date_demande'])[:10])
+
+# Pages tracées comme spans de chaque rerun
+instrumenter_fonctions(globals(), ('page_', 'get_'))
@@ -0,0 +1,1061 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pages entrepreneurs SEAOP - espace entrepreneur, messagerie et notifications
+
+Importé par le routeur de app_v2 à la première navigation vers l'espace
+entrepreneurs, le chat ou les notifications, puis conservé entre les reruns.
+"""
+
+import streamlit as st
+import sqlite3
+import re
+import base64
+import os
+from typing import List, Dict, Optional
+from appariement_leads import indexer_entrepreneur
+from proximite_projets import get_centroide
+from recherches_sauvegardees import (
+    GAMMES_BUDGET, sauvegarder_recherche, get_recherches_entrepreneur, supprimer_recherche,
+    decrire_recherche
+)
+from statistiques_prix import get_contextes_prix
+from metriques import fichier_servi
+from acces_donnees import (
+    Entrepreneur, Soumission, hash_password, authentifier_entrepreneur, sauvegarder_soumission,
+    envoyer_message, get_messages_conversation, marquer_messages_lus, get_tableau_de_bord_entrepreneur,
+    get_notifications_utilisateur, marquer_notification_lue,
+    marquer_toutes_notifications_lues, notifier_nouvelle_soumission, notifier_nouveau_message,
+    formater_date_affichage, filtrer_projets_pour_entrepreneurs,
+    trier_projets_pour_entrepreneur, get_projets_similaires_ouverts, filtrer_soumissions_entrepreneur,
+    get_mes_projets
+)
+from instrumentation import instrumenter_fonctions
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+def afficher_projets_similaires(similaires: List[Dict]):
+    for projet in similaires:
+        st.write(f"• {projet['type_projet']} - {projet['code_postal']} ({projet['budget']}) "
+                 f"· réf. {projet['numero_reference']} · similarité {projet['similarite']:.0%}")
+
+def afficher_contexte_prix(projet: Dict, contexte: Optional[Dict]):
+    """Montants des soumissions sur des projets comparables et fourchette suggérée (get_contextes_prix)"""
+    if not contexte:
+        return
+    
+    if contexte['type_projet'] == '*':
+        portee = "tous les projets"
+    elif contexte['gamme_budget'] == '*':
+        portee = f"les projets {projet['type_projet']}"
+    else:
+        portee = f"les projets {projet['type_projet']} ({projet['budget']})"
+    
+    with st.expander(f"📊 Repères de prix - {portee}"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Montant médian", f"{contexte['p50']:,.0f} $")
+        with col2:
+            st.metric("50 % des soumissions", f"{contexte['p25']:,.0f} - {contexte['p75']:,.0f} $")
+        with col3:
+            st.metric("Taux d'acceptation", f"{contexte['taux_acceptation']:.0%}")
+        
+        if contexte['fourchette']:
+            bas, _, haut = contexte['fourchette']
+            st.info(f"💡 Fourchette suggérée pour ce projet : {bas:,.0f} $ - {haut:,.0f} $")
+        
+        libelles = []
+        for tranche in contexte['tranches']:
+            if tranche['taux_acceptation'] is None:
+                continue
+            if tranche['borne_min'] is None:
+                libelle = f"moins de {tranche['borne_max']:,.0f} $"
+            elif tranche['borne_max'] is None:
+                libelle = f"{tranche['borne_min']:,.0f} $ et plus"
+            else:
+                libelle = f"{tranche['borne_min']:,.0f} - {tranche['borne_max']:,.0f} $"
+            libelles.append(f"{libelle} : {tranche['taux_acceptation']:.0%} acceptées")
+        if libelles:
+            st.caption(" · ".join(libelles))
+        st.caption(f"Basé sur {contexte['nb_soumissions']} soumission(s)")
+
+def page_chat():
+    """Interface de chat entre client et entrepreneur"""
+    if 'mode_chat' not in st.session_state or not st.session_state.mode_chat:
+        return
+    
+    # Récupérer les informations du chat
+    lead_id = st.session_state.get('chat_lead_id')
+    entrepreneur_id = st.session_state.get('chat_entrepreneur_id')
+    type_utilisateur = st.session_state.get('chat_type_utilisateur', 'client')
+    
+    if not lead_id or not entrepreneur_id:
+        st.error("Erreur: informations de chat manquantes")
+        return
+    
+    # En-tête du chat
+    col1, col2, col3 = st.columns([5, 1, 1])
+    with col1:
+        if type_utilisateur == 'client':
+            nom_correspondant = st.session_state.get('chat_nom_entrepreneur', 'Entrepreneur')
+            st.markdown(f"## 💬 Chat avec {nom_correspondant}")
+        else:
+            nom_correspondant = st.session_state.get('chat_nom_client', 'Client')
+            st.markdown(f"## 💬 Chat avec {nom_correspondant}")
+    
+    with col2:
+        if st.button("🔄 Actualiser", key="refresh_chat", help="Actualiser les messages"):
+            st.rerun()
+    
+    with col3:
+        if st.button("❌ Fermer", key="fermer_chat"):
+            st.session_state.mode_chat = False
+            for key in ['chat_lead_id', 'chat_entrepreneur_id', 'chat_nom_entrepreneur', 'chat_nom_client', 'chat_type_utilisateur']:
+                if key in st.session_state:
+                    del st.session_state[key]
+            st.rerun()
+    
+    st.markdown("---")
+    
+    # Récupérer les messages de la conversation
+    messages = get_messages_conversation(lead_id, entrepreneur_id)
+    
+    # Marquer les messages comme lus
+    if type_utilisateur == 'client':
+        # Le client lit les messages de l'entrepreneur
+        projet = get_mes_projets("dummy")[0] if get_mes_projets("dummy") else None
+        if projet:
+            marquer_messages_lus(lead_id, entrepreneur_id, projet['id'])
+    else:
+        # L'entrepreneur lit les messages du client
+        marquer_messages_lus(lead_id, entrepreneur_id, entrepreneur_id)
+    
+    # Affichage des messages
+    st.markdown("### 📝 Conversation")
+    
+    # Container pour les messages avec scroll
+    chat_container = st.container()
+    with chat_container:
+        if not messages:
+            st.info("💬 Aucun message pour le moment. Commencez la conversation !")
+        else:
+            for msg in messages:
+                date_msg = msg['date_envoi'][:16] if msg['date_envoi'] else ""
+                
+                if msg['expediteur_type'] == type_utilisateur:
+                    # Message de l'utilisateur actuel (à droite)
+                    col1, col2 = st.columns([1, 3])
+                    with col2:
+                        st.markdown(f"""
+                        <div style="background-color: #E3F2FD; padding: 10px; border-radius: 10px; margin: 5px 0; text-align: right;">
+                            <strong>Vous</strong> - {date_msg}<br>
+                            {msg['message']}
+                        </div>
+                        """, unsafe_allow_html=True)
+                else:
+                    # Message du correspondant (à gauche)
+                    col1, col2 = st.columns([3, 1])
+                    with col1:
+                        st.markdown(f"""
+                        <div style="background-color: #F5F5F5; padding: 10px; border-radius: 10px; margin: 5px 0;">
+                            <strong>{msg['nom_expediteur']}</strong> - {date_msg}<br>
+                            {msg['message']}
+                        </div>
+                        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Formulaire d'envoi de message
+    st.markdown("### ✍️ Envoyer un message")
+    with st.form("nouveau_message", clear_on_submit=True):
+        message = st.text_area(
+            "Votre message",
+            placeholder="Tapez votre message ici...",
+            height=100,
+            key="message_input"
+        )
+        
+        col1, col2 = st.columns([1, 4])
+        with col1:
+            if st.form_submit_button("📤 Envoyer", type="primary"):
+                if message.strip():
+                    # Déterminer les IDs d'expéditeur et destinataire
+                    if type_utilisateur == 'client':
+                        # Récupérer l'ID du client à partir du projet
+                        conn = sqlite3.connect(DATABASE_PATH)
+                        cursor = conn.cursor()
+                        cursor.execute('SELECT id FROM leads WHERE id = ?', (lead_id,))
+                        result = cursor.fetchone()
+                        conn.close()
+                        
+                        if result:
+                            expediteur_id = result[0]
+                            destinataire_id = entrepreneur_id
+                            expediteur_type = 'client'
+                        else:
+                            st.error("Erreur: impossible de récupérer les informations du client")
+                            st.stop()
+                    else:
+                        expediteur_id = entrepreneur_id
+                        destinataire_id = lead_id
+                        expediteur_type = 'entrepreneur'
+                    
+                    # Envoyer le message
+                    if envoyer_message(lead_id, entrepreneur_id, expediteur_type, expediteur_id, destinataire_id, message):
+                        # Créer notification pour le destinataire
+                        notifier_nouveau_message(lead_id, entrepreneur_id, expediteur_type)
+                        
+                        st.success("Message envoyé!")
+                        st.rerun()
+                    else:
+                        st.error("Erreur lors de l'envoi du message")
+                else:
+                    st.warning("Veuillez saisir un message")
+
+def page_notifications():
+    """Centre de notifications"""
+    if 'mode_notifications' not in st.session_state or not st.session_state.mode_notifications:
+        return
+    
+    type_utilisateur = st.session_state.get('notif_type_utilisateur')
+    utilisateur_id = st.session_state.get('notif_utilisateur_id')
+    
+    if not type_utilisateur or not utilisateur_id:
+        st.error("Erreur: informations de notification manquantes")
+        return
+    
+    # En-tête
+    col1, col2, col3 = st.columns([5, 1, 1])
+    with col1:
+        st.markdown("## 🔔 Centre de notifications")
+    
+    with col2:
+        if st.button("✅ Tout marquer lu", key="marquer_tout_lu"):
+            if marquer_toutes_notifications_lues(type_utilisateur, utilisateur_id):
+                st.success("Toutes les notifications marquées comme lues")
+                st.rerun()
+    
+    with col3:
+        if st.button("❌ Fermer", key="fermer_notifications"):
+            st.session_state.mode_notifications = False
+            for key in ['notif_type_utilisateur', 'notif_utilisateur_id']:
+                if key in st.session_state:
+                    del st.session_state[key]
+            st.rerun()
+    
+    st.markdown("---")
+    
+    # Récupérer les notifications
+    notifications = get_notifications_utilisateur(type_utilisateur, utilisateur_id, 20)
+    
+    if not notifications:
+        st.info("🎉 Aucune notification pour le moment !")
+    else:
+        st.markdown(f"📋 **{len(notifications)} notification(s)**")
+        st.markdown("---")
+        
+        for notif in notifications:
+            # Style différent pour les notifications non lues
+            if not notif['lu']:
+                st.markdown(f"""
+                <div style="background-color: #E3F2FD; padding: 15px; border-radius: 10px; margin: 10px 0; border-left: 4px solid #2196F3;">
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <div>
+                            <strong>{notif['titre']}</strong><br>
+                            {notif['message']}<br>
+                            <small style="color: #666;">{notif['date_creation'][:16] if notif['date_creation'] else ""}</small>
+                        </div>
+                        <div>
+                            <span style="background-color: #2196F3; color: white; padding: 3px 8px; border-radius: 12px; font-size: 12px;">NOUVEAU</span>
+                        </div>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                # Bouton pour marquer comme lu
+                col1, col2 = st.columns([1, 5])
+                with col1:
+                    if st.button("✅ Lu", key=f"marquer_lu_{notif['id']}"):
+                        if marquer_notification_lue(notif['id']):
+                            st.rerun()
+            else:
+                st.markdown(f"""
+                <div style="background-color: #F5F5F5; padding: 15px; border-radius: 10px; margin: 10px 0;">
+                    <div>
+                        <strong>{notif['titre']}</strong><br>
+                        {notif['message']}<br>
+                        <small style="color: #666;">{notif['date_creation'][:16] if notif['date_creation'] else ""}</small>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            st.markdown("---")
+
+def appliquer_recherche_sauvegardee(recherche: Dict):
+    """Recopie les critères d'une recherche sauvegardée dans les filtres du fil (rappel de bouton)"""
+    st.session_state.type_projet_filtre = recherche['type_projet'] or "Tous"
+    st.session_state.budget_range_filtre = recherche['gamme_budget'] or "Tous"
+    st.session_state.code_postal_filtre = recherche['code_postal'] or ""
+    st.session_state.recherche_projets = recherche['recherche_texte'] or ""
+    st.session_state.rayon_filtre = f"{recherche['rayon_km']:.0f} km" if recherche['rayon_km'] else "Tous"
+    if recherche['code_postal_origine']:
+        st.session_state.code_postal_atelier = recherche['code_postal_origine']
+
+def afficher_recherches_sauvegardees(entrepreneur: Entrepreneur, filtres: Dict):
+    """Sauvegarde des filtres courants et liste des recherches avec alertes"""
+    recherches = get_recherches_entrepreneur(entrepreneur.id)
+    with st.expander(f"🔔 Mes recherches sauvegardées ({len(recherches)})", expanded=False):
+        st.caption("Vous recevez une notification lorsque de nouveaux projets correspondent à une recherche sauvegardée.")
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            nom_recherche = st.text_input("Nom de la recherche", placeholder="Ex: Toitures Rive-Sud", key="nom_recherche")
+        with col2:
+            st.write("")
+            if st.button("💾 Sauvegarder les filtres", key="sauver_recherche"):
+                if not nom_recherche:
+                    st.error("❌ Donnez un nom à la recherche")
+                elif sauvegarder_recherche(entrepreneur.id, nom_recherche, **filtres):
+                    st.success("✅ Recherche sauvegardée")
+                    st.rerun()
+                else:
+                    st.error("❌ Erreur lors de la sauvegarde")
+        
+        for recherche in recherches:
+            col1, col2, col3 = st.columns([4, 1, 1])
+            with col1:
+                st.markdown(f"**{recherche['nom']}** — {decrire_recherche(recherche)}")
+                st.caption(f"{recherche['nb_alertes']} projet(s) signalé(s)")
+            with col2:
+                st.button("↩️ Appliquer", key=f"appliquer_recherche_{recherche['id']}",
+                          on_click=appliquer_recherche_sauvegardee, args=(recherche,))
+            with col3:
+                st.button("🗑️", key=f"supprimer_recherche_{recherche['id']}",
+                          on_click=supprimer_recherche, args=(recherche['id'], entrepreneur.id))
+
+def page_espace_entrepreneur():
+    """Espace entrepreneur pour consulter projets et soumettre"""
+    
+    if 'entrepreneur_connecte' not in st.session_state:
+        st.session_state.entrepreneur_connecte = None
+    
+    if st.session_state.entrepreneur_connecte is None:
+        # Page de connexion
+        st.markdown("## 👷 Espace Entrepreneur")
+        
+        tab1, tab2 = st.tabs(["🔐 Connexion", "📝 Inscription"])
+        
+        with tab1:
+            with st.form("connexion_entrepreneur"):
+                st.markdown("### Connectez-vous")
+                
+                email = st.text_input("Email", placeholder="votre@entreprise.ca")
+                mot_de_passe = st.text_input("Mot de passe", type="password")
+                
+                if st.form_submit_button("🔐 Se connecter", type="primary"):
+                    if email and mot_de_passe:
+                        entrepreneur = authentifier_entrepreneur(email, mot_de_passe)
+                        if entrepreneur:
+                            st.session_state.entrepreneur_connecte = entrepreneur
+                            st.success("✅ Connexion réussie!")
+                            st.rerun()
+                        else:
+                            st.error("❌ Email ou mot de passe incorrect")
+                    else:
+                        st.error("❌ Veuillez remplir tous les champs")
+        
+        with tab2:
+            with st.form("inscription_entrepreneur"):
+                st.markdown("### Créer un compte entrepreneur")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    nom_entreprise = st.text_input("Nom de l'entreprise *")
+                    nom_contact = st.text_input("Nom du contact *")
+                    email_inscription = st.text_input("Email *")
+                    telephone = st.text_input("Téléphone *")
+                
+                with col2:
+                    mot_de_passe = st.text_input("Mot de passe *", type="password")
+                    confirmer_mdp = st.text_input("Confirmer mot de passe *", type="password")
+                    numero_rbq = st.text_input("Numéro RBQ", placeholder="XXXX-XXXX-XX")
+                
+                zones_desservies = st.text_area("Zones desservies (codes postaux)")
+                
+                types_projets = st.multiselect(
+                    "Types de projets *",
+                    ["Rénovation cuisine", "Rénovation salle de bain", "Toiture", 
+                     "Revêtement extérieur", "Plancher", "Peinture", "Agrandissement",
+                     "Électricité", "Plomberie", "Chauffage/Climatisation", "Isolation",
+                     "Fenêtres et portes", "Maçonnerie", "Charpenterie", "Autre"]
+                )
+                
+                certifications = st.text_area("Certifications et assurances")
+                
+                if st.form_submit_button("📝 Créer mon compte", type="primary"):
+                    if all([nom_entreprise, nom_contact, email_inscription, telephone, mot_de_passe]):
+                        if mot_de_passe == confirmer_mdp:
+                            # Créer le compte
+                            conn = sqlite3.connect(DATABASE_PATH)
+                            cursor = conn.cursor()
+                            
+                            try:
+                                cursor.execute('''
+                                    INSERT INTO entrepreneurs (nom_entreprise, nom_contact, email, telephone, 
+                                                             mot_de_passe_hash, numero_rbq, zones_desservies, 
+                                                             types_projets, certifications)
+                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                ''', (nom_entreprise, nom_contact, email_inscription, telephone,
+                                      hash_password(mot_de_passe), numero_rbq, zones_desservies,
+                                      ",".join(types_projets), certifications))
+                                
+                                conn.commit()
+                                indexer_entrepreneur(cursor.lastrowid, zones_desservies, ",".join(types_projets))
+                                st.success("✅ Compte créé! Vous pouvez maintenant vous connecter.")
+                            
+                            except sqlite3.IntegrityError:
+                                st.error("❌ Un compte avec cet email existe déjà")
+                            
+                            finally:
+                                conn.close()
+                        else:
+                            st.error("❌ Les mots de passe ne correspondent pas")
+                    else:
+                        st.error("❌ Veuillez remplir tous les champs obligatoires")
+    
+    else:
+        # Dashboard entrepreneur connecté
+        entrepreneur = st.session_state.entrepreneur_connecte
+        
+        # Header
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"## 👷 Bienvenue, {entrepreneur.nom_entreprise}")
+        with col2:
+            if st.button("🚪 Déconnexion"):
+                st.session_state.entrepreneur_connecte = None
+                st.rerun()
+        
+        # Onglets
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔍 Projets disponibles", "📋 Mes soumissions", "⭐ Mes évaluations", "📊 Dashboard", "👤 Mon profil"])
+        
+        with tab1:
+            st.markdown("### 🔍 Projets disponibles pour soumission")
+            
+            # Interface de filtrage
+            with st.expander("🔍 Filtres de recherche", expanded=False):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    recherche_texte = st.text_input(
+                        "🔍 Recherche textuelle",
+                        placeholder="Mots-clés dans la description...",
+                        key="recherche_projets"
+                    )
+                    
+                    type_projet_filtre = st.selectbox(
+                        "🏗️ Type de projet",
+                        ["Tous", "Rénovation résidentielle", "Construction neuve", "Rénovation commerciale", 
+                         "Toiture", "Plomberie", "Électricité", "Paysagement", "Autres"],
+                        key="type_projet_filtre"
+                    )
+                
+                with col2:
+                    code_postal_filtre = st.text_input(
+                        "📍 Code postal (début)",
+                        placeholder="Ex: H1A, G1V...",
+                        key="code_postal_filtre"
+                    )
+                    
+                    rayon_filtre = st.select_slider(
+                        "📏 Rayon autour de mon atelier",
+                        options=["Tous", "10 km", "25 km", "40 km", "60 km", "100 km", "200 km"],
+                        value="Tous",
+                        key="rayon_filtre"
+                    )
+                    code_postal_atelier = st.text_input(
+                        "🏠 Code postal de l'atelier",
+                        value=next(iter(re.findall(r'[A-Za-z]\d[A-Za-z]', entrepreneur.zones_desservies or '')), ""),
+                        key="code_postal_atelier"
+                    )
+                    
+                    budget_range = st.select_slider(
+                        "💰 Gamme de budget",
+                        options=list(GAMMES_BUDGET),
+                        value="Tous",
+                        key="budget_range_filtre"
+                    )
+                
+                with col3:
+                    delai_filtre = st.selectbox(
+                        "⏰ Délai souhaité",
+                        ["Tous", "Urgent (< 1 mois)", "Court (1-3 mois)", "Normal (3-6 mois)", "Long (> 6 mois)"],
+                        key="delai_filtre"
+                    )
+                    
+                    trier_par = st.selectbox(
+                        "📊 Trier par",
+                        ["Pertinence", "Date (plus récent)", "Date (plus ancien)", "Budget (croissant)", "Budget (décroissant)", "Nb soumissions", "Distance"],
+                        key="tri_projets"
+                    )
+            
+            # Application des filtres
+            budget_min, budget_max = GAMMES_BUDGET[budget_range]
+            
+            rayon_km = None
+            if rayon_filtre != "Tous":
+                if get_centroide(code_postal_atelier):
+                    rayon_km = float(rayon_filtre.split()[0])
+                else:
+                    st.warning("📏 Code postal de l'atelier inconnu : le filtre de rayon est ignoré")
+            
+            afficher_recherches_sauvegardees(entrepreneur, {
+                'type_projet': type_projet_filtre,
+                'gamme_budget': budget_range,
+                'code_postal': code_postal_filtre,
+                'recherche_texte': recherche_texte,
+                'rayon_km': rayon_km,
+                'code_postal_origine': code_postal_atelier,
+            })
+            
+            # Récupération des projets filtrés
+            projets = filtrer_projets_pour_entrepreneurs(
+                type_projet=type_projet_filtre if type_projet_filtre != "Tous" else None,
+                budget_min=budget_min,
+                budget_max=budget_max,
+                code_postal=code_postal_filtre if code_postal_filtre else None,
+                recherche_texte=recherche_texte if recherche_texte else None,
+                rayon_km=rayon_km,
+                code_postal_origine=code_postal_atelier
+            )
+            nombre_trouves = len(projets)
+            projets = trier_projets_pour_entrepreneur(projets, trier_par, entrepreneur)
+            
+            # Affichage des résultats
+            st.markdown(f"**{nombre_trouves} projet(s) trouvé(s)**")
+            if len(projets) < nombre_trouves:
+                st.caption(f"🎯 Les {len(projets)} projets les plus pertinents pour votre profil sont affichés")
+            
+            if not projets:
+                st.info("Aucun projet ne correspond à vos critères. Essayez d'ajuster les filtres.")
+            else:
+                # Repères de prix de la page : un groupe lu par couple (type, gamme de budget)
+                contextes_prix = get_contextes_prix(projets)
+                for projet in projets:
+                    with st.expander(f"{projet['type_projet']} - {projet['code_postal']} ({projet['budget']})"):
+                        # Détails du projet
+                        col1, col2 = st.columns([2, 1])
+                        
+                        with col1:
+                            st.markdown("**Description du projet:**")
+                            st.text_area("", value=projet['description'], height=150, disabled=True, key=f"proj_desc_{projet['id']}")
+                        
+                        with col2:
+                            st.markdown("**Informations:**")
+                            st.write(f"📅 Délai: {projet['delai_realisation']}")
+                            st.write(f"💰 Budget: {projet['budget']}")
+                            st.write(f"📍 Zone: {projet['code_postal']}")
+                            st.write(f"📋 {projet['nb_soumissions']} soumission(s)")
+                            date_pub = formater_date_affichage(projet['date_creation'])
+                            st.write(f"📆 Publié: {date_pub}")
+                            if projet.get('distance_km') is not None:
+                                st.write(f"📏 Distance: {projet['distance_km']:.0f} km")
+                            if 'score_pertinence' in projet:
+                                st.write(f"🎯 Pertinence: {projet['score_pertinence']:.0%}")
+                        
+                        # Affichage des pièces jointes
+                        st.markdown("---")
+                        st.markdown("### 📎 Documents et plans du projet")
+                        
+                        col_files1, col_files2, col_files3 = st.columns(3)
+                        
+                        with col_files1:
+                            if projet['photos']:
+                                st.markdown("**📸 Photos:**")
+                                import io
+                                from PIL import Image
+                                
+                                photos_list = projet['photos'].split(',')
+                                for i, photo_base64 in enumerate(photos_list):
+                                    try:
+                                        photo_data = fichier_servi('photo', base64.b64decode(photo_base64))
+                                        image = Image.open(io.BytesIO(photo_data))
+                                        st.image(image, caption=f"Photo {i+1}", use_container_width=True)
+                                    except:
+                                        st.error(f"Erreur lors du chargement de la photo {i+1}")
+                            else:
+                                st.info("Aucune photo disponible")
+                        
+                        with col_files2:
+                            if projet['plans']:
+                                st.markdown("**📋 Plans:**")
+                                plans_list = projet['plans'].split(',')
+                                for i, plan_base64 in enumerate(plans_list):
+                                    try:
+                                        plan_data = fichier_servi('plan', base64.b64decode(plan_base64))
+                                        st.download_button(
+                                            f"📋 Télécharger Plan {i+1}",
+                                            data=plan_data,
+                                            file_name=f"plan_{i+1}_{projet['numero_reference']}.pdf",
+                                            mime="application/pdf",
+                                            key=f"plan_{projet['id']}_{i}"
+                                        )
+                                    except:
+                                        st.error(f"Erreur lors du chargement du plan {i+1}")
+                            else:
+                                st.info("Aucun plan disponible")
+                        
+                        with col_files3:
+                            if projet['documents']:
+                                st.markdown("**📄 Documents:**")
+                                documents_list = projet['documents'].split(',')
+                                for i, doc_base64 in enumerate(documents_list):
+                                    try:
+                                        doc_data = fichier_servi('document', base64.b64decode(doc_base64))
+                                        st.download_button(
+                                            f"📄 Télécharger Doc {i+1}",
+                                            data=doc_data,
+                                            file_name=f"document_{i+1}_{projet['numero_reference']}.pdf",
+                                            mime="application/pdf",
+                                            key=f"doc_{projet['id']}_{i}"
+                                        )
+                                    except:
+                                        st.error(f"Erreur lors du chargement du document {i+1}")
+                            else:
+                                st.info("Aucun document disponible")
+                        
+                        # Vérifier si déjà soumissionné
+                        conn = sqlite3.connect(DATABASE_PATH)
+                        cursor = conn.cursor()
+                        cursor.execute('''
+                            SELECT id FROM soumissions 
+                            WHERE lead_id = ? AND entrepreneur_id = ?
+                        ''', (projet['id'], entrepreneur.id))
+                        deja_soumis = cursor.fetchone()
+                        conn.close()
+                        
+                        if deja_soumis:
+                            st.success("✅ Vous avez déjà soumissionné sur ce projet")
+                            
+                            # Bouton chat pour communiquer avec le client
+                            col1, col2 = st.columns([1, 4])
+                            with col1:
+                                if st.button("💬 Chat client", key=f"chat_client_{projet['id']}", help="Discuter avec le client"):
+                                    st.session_state.chat_lead_id = projet['id']
+                                    st.session_state.chat_entrepreneur_id = entrepreneur.id
+                                    st.session_state.chat_nom_client = projet['nom']
+                                    st.session_state.chat_type_utilisateur = 'entrepreneur'
+                                    st.session_state.mode_chat = True
+                                    st.rerun()
+                        else:
+                            # Formulaire de soumission
+                            st.markdown("---")
+                            st.markdown("### 📝 Soumettre une proposition")
+                            
+                            afficher_contexte_prix(projet, contextes_prix[projet['id']])
+                            
+                            with st.form(f"soumission_{projet['id']}"):
+                                col1, col2 = st.columns(2)
+                                
+                                with col1:
+                                    montant = st.number_input(
+                                        "Montant de la soumission ($) *",
+                                        min_value=0.0,
+                                        step=100.0,
+                                        key=f"montant_{projet['id']}"
+                                    )
+                                    
+                                    delai_execution = st.text_input(
+                                        "Délai d'exécution *",
+                                        placeholder="Ex: 3 semaines",
+                                        key=f"delai_{projet['id']}"
+                                    )
+                                
+                                with col2:
+                                    validite_offre = st.text_input(
+                                        "Validité de l'offre *",
+                                        value="30 jours",
+                                        key=f"validite_{projet['id']}"
+                                    )
+                                
+                                description_travaux = st.text_area(
+                                    "Description détaillée des travaux *",
+                                    placeholder="""Décrivez en détail:
+- Les étapes des travaux
+- Les matériaux utilisés
+- La méthodologie
+- L'équipe assignée
+- Le calendrier détaillé""",
+                                    height=200,
+                                    key=f"travaux_{projet['id']}"
+                                )
+                                
+                                col1, col2 = st.columns(2)
+                                
+                                with col1:
+                                    inclusions = st.text_area(
+                                        "Inclusions",
+                                        placeholder="Ce qui est inclus dans le prix",
+                                        height=100,
+                                        key=f"inclusions_{projet['id']}"
+                                    )
+                                
+                                with col2:
+                                    exclusions = st.text_area(
+                                        "Exclusions",
+                                        placeholder="Ce qui n'est pas inclus",
+                                        height=100,
+                                        key=f"exclusions_{projet['id']}"
+                                    )
+                                
+                                conditions = st.text_area(
+                                    "Conditions et modalités de paiement",
+                                    placeholder="Ex: 30% à la signature, 40% à mi-parcours, 30% à la fin",
+                                    key=f"conditions_{projet['id']}"
+                                )
+                                
+                                # Section pièces jointes pour la soumission
+                                st.markdown("---")
+                                st.markdown("### 📎 Pièces jointes de votre soumission")
+                                st.caption("Ajoutez vos documents : devis détaillé, plans, références, catalogue...")
+                                
+                                col_doc1, col_doc2 = st.columns(2)
+                                
+                                with col_doc1:
+                                    documents_soumission = st.file_uploader(
+                                        "Documents de soumission",
+                                        type=['pdf', 'doc', 'docx', 'xls', 'xlsx', 'png', 'jpg', 'jpeg'],
+                                        accept_multiple_files=True,
+                                        help="Max 5 fichiers - Formats: PDF, DOC, XLS, Images",
+                                        key=f"docs_soumission_{projet['id']}"
+                                    )
+                                
+                                with col_doc2:
+                                    if documents_soumission:
+                                        st.markdown("**Fichiers sélectionnés:**")
+                                        for doc in documents_soumission[:5]:  # Limiter à 5 fichiers
+                                            st.write(f"📄 {doc.name}")
+                                
+                                if st.form_submit_button("📤 Envoyer ma soumission", type="primary"):
+                                    if montant > 0 and delai_execution and description_travaux:
+                                        # Traitement des fichiers uploadés
+                                        documents_data = None
+                                        if documents_soumission:
+                                            docs_base64 = []
+                                            for doc in documents_soumission[:5]:  # Limiter à 5 fichiers
+                                                doc_data = base64.b64encode(doc.read()).decode()
+                                                docs_base64.append(f"{doc.name}:{doc_data}")
+                                            documents_data = "|".join(docs_base64)
+                                        
+                                        soumission = Soumission(
+                                            lead_id=projet['id'],
+                                            entrepreneur_id=entrepreneur.id,
+                                            montant=montant,
+                                            description_travaux=description_travaux,
+                                            delai_execution=delai_execution,
+                                            validite_offre=validite_offre,
+                                            inclusions=inclusions,
+                                            exclusions=exclusions,
+                                            conditions=conditions,
+                                            documents=documents_data
+                                        )
+                                        
+                                        if sauvegarder_soumission(soumission):
+                                            # Créer notification pour le client
+                                            notifier_nouvelle_soumission(projet['id'])
+                                            
+                                            st.success("✅ Soumission envoyée avec succès!")
+                                            st.balloons()
+                                            st.rerun()
+                                        else:
+                                            st.error("❌ Erreur lors de l'envoi")
+                                    else:
+                                        st.error("❌ Veuillez remplir tous les champs obligatoires")
+        
+        with tab2:
+            st.markdown("### 📋 Mes soumissions")
+            
+            # Interface de filtrage pour les soumissions
+            with st.expander("🔍 Filtres mes soumissions", expanded=False):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    statut_filtre = st.selectbox(
+                        "📊 Statut",
+                        ["Tous", "envoyee", "acceptee", "refusee"],
+                        format_func=lambda x: {"Tous": "Tous", "envoyee": "En attente", "acceptee": "Acceptée", "refusee": "Refusée"}[x],
+                        key="statut_soumissions_filtre"
+                    )
+                
+                with col2:
+                    periode_filtre = st.selectbox(
+                        "📅 Période",
+                        ["Toutes", "Ce mois", "Ce trimestre", "Cette année"],
+                        key="periode_soumissions_filtre"
+                    )
+                
+                with col3:
+                    col3a, col3b = st.columns(2)
+                    with col3a:
+                        montant_min = st.number_input(
+                            "💰 Montant min ($)",
+                            min_value=0,
+                            value=0,
+                            step=1000,
+                            key="montant_min_filtre"
+                        )
+                    with col3b:
+                        montant_max = st.number_input(
+                            "💰 Montant max ($)",
+                            min_value=0,
+                            value=0,
+                            step=1000,
+                            key="montant_max_filtre"
+                        )
+            
+            # Application des filtres
+            mes_soumissions = filtrer_soumissions_entrepreneur(
+                entrepreneur_id=entrepreneur.id,
+                statut=statut_filtre if statut_filtre != "Tous" else None,
+                periode=periode_filtre if periode_filtre != "Toutes" else None,
+                montant_min=montant_min if montant_min > 0 else None,
+                montant_max=montant_max if montant_max > 0 else None
+            )
+            
+            # Affichage des résultats
+            st.markdown(f"**{len(mes_soumissions)} soumission(s) trouvée(s)**")
+            
+            if not mes_soumissions:
+                if statut_filtre != "Tous" or periode_filtre != "Toutes" or montant_min > 0 or montant_max > 0:
+                    st.info("Aucune soumission ne correspond à vos critères")
+                else:
+                    st.info("Vous n'avez pas encore envoyé de soumissions")
+            else:
+                # Projets ouverts proches de ceux déjà soumissionnés (sans ceux-ci)
+                projets_soumis = [soum['lead_id'] for soum in mes_soumissions]
+                similaires = get_projets_similaires_ouverts(projets_soumis, exclure_ids=projets_soumis, k=5)
+                if similaires:
+                    with st.expander("🔗 Projets similaires à vos soumissions", expanded=True):
+                        afficher_projets_similaires(similaires)
+                        st.caption("Retrouvez ces projets dans l'onglet « 🔍 Projets disponibles ».")
+                
+                for soum in mes_soumissions:
+                    statut_emoji = {
+                        'envoyee': '📤',
+                        'vue': '👁️',
+                        'acceptee': '✅',
+                        'refusee': '❌'
+                    }
+                    
+                    with st.expander(f"{statut_emoji.get(soum['statut'], '📋')} {soum['type_projet']} - {soum['nom_client']} - {soum['montant']:,.2f}$"):
+                        col1, col2 = st.columns([2, 1])
+                        
+                        with col1:
+                            st.write(f"**Client:** {soum['nom_client']}")
+                            st.write(f"**Projet:** {soum['type_projet']}")
+                            st.write(f"**Référence:** {soum['numero_reference']}")
+                            st.write(f"**Délai proposé:** {soum['delai_execution']}")
+                        
+                        with col2:
+                            st.write(f"**Ma soumission:** {soum['montant']:,.2f}$")
+                            st.write(f"**Statut:** {soum['statut'].capitalize()}")
+                            date_soum = formater_date_affichage(soum['date_creation'])
+                            st.write(f"**Date:** {date_soum}")
+                        
+                        if soum['statut'] == 'acceptee':
+                            st.success("🎉 Félicitations! Votre soumission a été acceptée!")
+                            st.info(f"Contactez le client pour finaliser les détails")
+                        elif soum['statut'] == 'refusee':
+                            st.error("Cette soumission n'a pas été retenue")
+                        
+                        # Le corps d'un expander s'exécute à chaque rerun : recherche à la demande seulement
+                        if st.toggle("🔗 Projets similaires à ce projet", key=f"similaires_soumission_{soum['id']}"):
+                            similaires = get_projets_similaires_ouverts([soum['lead_id']], exclure_ids=projets_soumis)
+                            if similaires:
+                                afficher_projets_similaires(similaires)
+                            else:
+                                st.info("Aucun projet ouvert similaire")
+        
+        with tab3:
+            st.markdown("### ⭐ Mes évaluations clients")
+            
+            # Évaluations, commentaires et statistiques (onglet suivant), lus en parallèle
+            tableau = get_tableau_de_bord_entrepreneur(entrepreneur.id)
+            stats_eval = tableau['evaluations']
+            
+            # Affichage des statistiques générales
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Note moyenne", f"{stats_eval['note_moyenne']}/5" if stats_eval['note_moyenne'] > 0 else "Aucune", 
+                         f"⭐" * int(stats_eval['note_moyenne']) if stats_eval['note_moyenne'] > 0 else "")
+            
+            with col2:
+                st.metric("Total évaluations", stats_eval['nombre_evaluations'])
+            
+            with col3:
+                st.metric("Évaluations positives", f"{stats_eval['evaluations_positives']}")
+            
+            with col4:
+                st.metric("% de satisfaction", f"{stats_eval['pourcentage_positif']}%")
+            
+            if stats_eval['nombre_evaluations'] > 0:
+                st.markdown("---")
+                st.markdown("### 💬 Derniers commentaires clients")
+                
+                commentaires = tableau['commentaires']
+                
+                if commentaires:
+                    for commentaire in commentaires:
+                        with st.container():
+                            col1, col2 = st.columns([1, 3])
+                            
+                            with col1:
+                                stars = "⭐" * commentaire['note']
+                                st.markdown(f"**{stars}**")
+                                st.caption(f"{commentaire['date_evaluation']}")
+                                st.caption(f"Projet: {commentaire['type_projet']}")
+                            
+                            with col2:
+                                st.markdown(f"*\"{commentaire['commentaire']}\"*")
+                            
+                            st.markdown("---")
+                else:
+                    st.info("Aucun commentaire détaillé encore")
+            else:
+                st.info("Aucune évaluation reçue pour le moment. Continuez à fournir un excellent service pour recevoir vos premières évaluations !")
+        
+        with tab4:
+            st.markdown("### 📊 Tableau de bord entrepreneur")
+            
+            stats = tableau['stats']
+            
+            # Métriques principales
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Soumissions envoyées", stats['total_soumissions'])
+            
+            with col2:
+                st.metric("Projets remportés", stats['soumissions_acceptees'], 
+                         f"{stats['taux_succes']}%" if stats['taux_succes'] > 0 else "0%")
+            
+            with col3:
+                st.metric("Chiffre d'affaires", f"{stats['ca_total']:,.2f} $")
+            
+            with col4:
+                st.metric("Note moyenne", f"{stats['note_moyenne']}/5 ⭐" if stats['note_moyenne'] > 0 else "Aucune note")
+            
+            st.markdown("---")
+            
+            # Statistiques détaillées
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("### 💰 Performance financière")
+                if stats['total_soumissions'] > 0:
+                    st.metric("Montant moyen par soumission", f"{stats['montant_moyen']:,.2f} $")
+                    st.metric("Taux de succès", f"{stats['taux_succes']}%")
+                    if stats['taux_succes'] >= 70:
+                        st.success("🎯 Excellent taux de succès !")
+                    elif stats['taux_succes'] >= 40:
+                        st.warning("⚡ Taux de succès moyen")
+                    else:
+                        st.info("💪 Continuez vos efforts !")
+                else:
+                    st.info("Aucune soumission envoyée encore")
+            
+            with col2:
+                st.markdown("### 📈 Évolution mensuelle")
+                if stats['evolution_mensuelle']:
+                    st.markdown("**Activité récente :**")
+                    for mois, nb_soumissions, nb_acceptees, ca_mois in stats['evolution_mensuelle'][:3]:
+                        taux_mois = round((nb_acceptees / nb_soumissions * 100), 1) if nb_soumissions > 0 else 0
+                        st.write(f"**{mois}** : {nb_soumissions} soumission(s), {nb_acceptees} acceptée(s) ({taux_mois}%)")
+                        if ca_mois > 0:
+                            st.write(f"   💰 CA: {ca_mois:,.2f} $")
+                else:
+                    st.info("Pas encore d'historique disponible")
+            
+            # Conseils et recommandations
+            st.markdown("---")
+            st.markdown("### 💡 Recommandations pour améliorer vos performances")
+            
+            if stats['total_soumissions'] == 0:
+                st.info("🚀 Commencez par soumissionner sur vos premiers projets !")
+            elif stats['taux_succes'] < 30:
+                st.warning("📝 Votre taux de succès est bas. Considérez :")
+                st.write("- Réviser vos prix pour être plus compétitif")
+                st.write("- Améliorer la qualité de vos descriptions")
+                st.write("- Cibler des projets plus adaptés à votre expertise")
+            elif stats['note_moyenne'] > 0 and stats['note_moyenne'] < 3.5:
+                st.warning("⭐ Votre note moyenne est perfectible. Focalisez sur :")
+                st.write("- La qualité de votre service client")
+                st.write("- Le respect des délais annoncés")
+                st.write("- La communication avec vos clients")
+            else:
+                st.success("✅ Excellente performance ! Continuez sur cette lancée.")
+                if stats['nb_evaluations'] < 5:
+                    st.info("💬 Encouragez vos clients à vous évaluer pour augmenter votre visibilité.")
+        
+        with tab5:
+            st.markdown("### 👤 Mon profil d'entreprise")
+            
+            with st.form("profil_entrepreneur"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    nom_entreprise = st.text_input("Nom de l'entreprise", value=entrepreneur.nom_entreprise)
+                    nom_contact = st.text_input("Nom du contact", value=entrepreneur.nom_contact)
+                    email = st.text_input("Email", value=entrepreneur.email, disabled=True)
+                
+                with col2:
+                    telephone = st.text_input("Téléphone", value=entrepreneur.telephone)
+                    numero_rbq = st.text_input("Numéro RBQ", value=entrepreneur.numero_rbq or "")
+                
+                zones_desservies = st.text_area(
+                    "Zones desservies",
+                    value=entrepreneur.zones_desservies or "",
+                    help="Codes postaux ou RTA (ex. H2B) séparés par des virgules, lettre de région (ex. H) ou * pour toutes les zones"
+                )
+                
+                types_projets_actuels = entrepreneur.types_projets.split(",") if entrepreneur.types_projets else []
+                types_projets = st.multiselect(
+                    "Types de projets",
+                    ["Rénovation cuisine", "Rénovation salle de bain", "Toiture", 
+                     "Revêtement extérieur", "Plancher", "Peinture", "Agrandissement",
+                     "Électricité", "Plomberie", "Chauffage/Climatisation", "Isolation",
+                     "Fenêtres et portes", "Maçonnerie", "Charpenterie", "Autre"],
+                    default=types_projets_actuels
+                )
+                
+                certifications = st.text_area(
+                    "Certifications et assurances",
+                    value=entrepreneur.certifications or ""
+                )
+                
+                if st.form_submit_button("💾 Sauvegarder"):
+                    conn = sqlite3.connect(DATABASE_PATH)
+                    cursor = conn.cursor()
+                    
+                    cursor.execute('''
+                        UPDATE entrepreneurs 
+                        SET nom_entreprise=?, nom_contact=?, telephone=?, 
+                            numero_rbq=?, zones_desservies=?, types_projets=?, certifications=?
+                        WHERE id=?
+                    ''', (nom_entreprise, nom_contact, telephone, numero_rbq,
+                          zones_desservies, ",".join(types_projets), certifications, entrepreneur.id))
+                    
+                    conn.commit()
+                    conn.close()
+                    
+                    entrepreneur.zones_desservies = zones_desservies
+                    entrepreneur.types_projets = ",".join(types_projets)
+                    indexer_entrepreneur(entrepreneur.id, entrepreneur.zones_desservies, entrepreneur.types_projets)
+                    
+                    st.success("✅ Profil mis à jour!")
+
+# Pages tracées comme spans de chaque rerun
+instrumenter_fonctions(globals(), ('page_', 'get_'))
@@ -0,0 +1,1818 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pages des services professionnels SEAOP - estimation, technologue, architecture, ingénieur
+
+Également les pages des logiciels professionnels (EXPERTS IA, TAKEOFF AI,
+ERP AI). Importé par le routeur de app_v2 à la première navigation vers
+l'une de ces pages, puis conservé entre les reruns.
+"""
+
+import streamlit as st
+import datetime
+import re
+import base64
+from moteur_tarification import calculer_prix, palier_tarifaire
+from metriques import fichier_servi
+from acces_donnees import (
+    valider_email, creer_demande_estimation, get_estimations_client, calculer_prix_technologue,
+    creer_demande_technologue, get_demandes_technologue_client, creer_demande_architecture,
+    get_demandes_architecture_client, encoder_fichiers_architecture, creer_demande_ingenieur,
+    get_demandes_ingenieur_client, encoder_fichiers_ingenieur
+)
+from instrumentation import instrumenter_fonctions
+
+def page_service_estimation():
+    """Page du service d'estimation payant"""
+    
+    st.markdown("""
+    <div class="main-header">
+        <h1>💰 Service d'estimation professionnel</h1>
+        <p>Obtenez une estimation détaillée pour votre projet avec notre service expert</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Tabs pour séparer demande d'estimation et suivi
+    tab1, tab2 = st.tabs(["📝 Demander une estimation", "📊 Mes estimations"])
+    
+    with tab1:
+        st.markdown("### 🎯 Nouvelle demande d'estimation")
+        
+        with st.form("demande_estimation"):
+            st.markdown("**📋 Informations de contact**")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                nom_client = st.text_input("Nom complet *", placeholder="Ex: Marie Dubois")
+                email_client = st.text_input("Email *", placeholder="marie.dubois@email.com")
+            
+            with col2:
+                telephone_client = st.text_input("Téléphone *", placeholder="514-555-1234")
+                adresse_client = st.text_input("Adresse du projet", placeholder="123 Rue Principale, Montréal, QC")
+            
+            st.markdown("**🏗️ Détails du projet**")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                type_projet = st.selectbox(
+                    "Type de projet *",
+                    ["", "Rénovation cuisine", "Rénovation salle de bain", "Toiture", 
+                     "Revêtement extérieur", "Plancher", "Peinture", "Agrandissement",
+                     "Fondation", "Plomberie", "Électricité", "Isolation", "CVC",
+                     "Fenêtres et portes", "Maçonnerie", "Charpenterie", "Paysagement", "Autre"]
+                )
+                
+                budget_approximatif = st.selectbox(
+                    "Budget approximatif",
+                    ["À déterminer", "Moins de 5 000$", "5 000$ - 15 000$", "15 000$ - 30 000$", 
+                     "30 000$ - 50 000$", "50 000$ - 100 000$", "Plus de 100 000$"]
+                )
+            
+            with col2:
+                surface_approximative = st.text_input("Surface approximative", placeholder="Ex: 120 pi²")
+                delai_souhaite = st.selectbox(
+                    "Délai souhaité pour les travaux",
+                    ["Flexible", "Dès que possible", "Dans 1 mois", "Dans 2-3 mois", 
+                     "Dans 3-6 mois", "Plus de 6 mois"]
+                )
+            
+            description_detaillee = st.text_area(
+                "Description détaillée du projet *",
+                placeholder="""Décrivez précisément votre projet:
+- Travaux souhaités
+- Matériaux préférés
+- Contraintes particulières
+- Objectifs spécifiques
+- Toute information utile pour l'estimation""",
+                height=200
+            )
+            
+            st.markdown("**📎 Documents du projet**")
+            st.info("💡 Plus vous fournissez de documents précis (plans, photos, croquis), plus l'estimation sera précise.")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.markdown("**📐 Plans et croquis**")
+                plans_files = st.file_uploader(
+                    "Plans, croquis, schémas",
+                    type=['pdf', 'png', 'jpg', 'jpeg', 'dwg'],
+                    accept_multiple_files=True,
+                    key="plans_estimation"
+                )
+            
+            with col2:
+                st.markdown("**📷 Photos existant**")
+                photos_files = st.file_uploader(
+                    "Photos de l'état actuel",
+                    type=['png', 'jpg', 'jpeg'],
+                    accept_multiple_files=True,
+                    key="photos_estimation"
+                )
+            
+            with col3:
+                st.markdown("**📄 Autres documents**")
+                docs_files = st.file_uploader(
+                    "Devis existants, spécifications...",
+                    type=['pdf', 'doc', 'docx', 'txt'],
+                    accept_multiple_files=True,
+                    key="docs_estimation"
+                )
+            
+            st.markdown("---")
+            st.markdown("**💰 Service d'estimation**")
+            st.info("""
+            **Notre service d'estimation professionnel inclut :**
+            - ✅ Analyse détaillée de votre projet
+            - ✅ Estimation précise des coûts par poste
+            - ✅ Recommandations de matériaux et techniques
+            - ✅ Planning approximatif des travaux
+            - ✅ Liste des permis/autorisations nécessaires
+            - ✅ Rapport d'estimation professionnel (PDF)
+            - ✅ Facture détaillée
+            
+            **Tarif : 150$ - 300$ selon la complexité**
+            """)
+            
+            soumis = st.form_submit_button("📤 Envoyer ma demande d'estimation", type="primary")
+            
+            if soumis:
+                # Validation des champs obligatoires
+                erreurs = []
+                if not nom_client.strip():
+                    erreurs.append("Le nom est obligatoire")
+                if not email_client.strip():
+                    erreurs.append("L'email est obligatoire")
+                if not valider_email(email_client):
+                    erreurs.append("Format d'email invalide")
+                if not telephone_client.strip():
+                    erreurs.append("Le téléphone est obligatoire")
+                if not type_projet or type_projet == "":
+                    erreurs.append("Le type de projet est obligatoire")
+                if not description_detaillee.strip():
+                    erreurs.append("La description du projet est obligatoire")
+                
+                if erreurs:
+                    for erreur in erreurs:
+                        st.error(f"❌ {erreur}")
+                else:
+                    # Traiter les fichiers uploadés
+                    plans_base64 = []
+                    photos_base64 = []
+                    docs_base64 = []
+                    
+                    if plans_files:
+                        for file in plans_files:
+                            try:
+                                file_content = file.read()
+                                file_b64 = base64.b64encode(file_content).decode()
+                                plans_base64.append(f"{file.name}:{file_b64}")
+                            except Exception as e:
+                                st.error(f"Erreur lors du traitement de {file.name}: {e}")
+                    
+                    if photos_files:
+                        for file in photos_files:
+                            try:
+                                file_content = file.read()
+                                file_b64 = base64.b64encode(file_content).decode()
+                                photos_base64.append(f"{file.name}:{file_b64}")
+                            except Exception as e:
+                                st.error(f"Erreur lors du traitement de {file.name}: {e}")
+                    
+                    if docs_files:
+                        for file in docs_files:
+                            try:
+                                file_content = file.read()
+                                file_b64 = base64.b64encode(file_content).decode()
+                                docs_base64.append(f"{file.name}:{file_b64}")
+                            except Exception as e:
+                                st.error(f"Erreur lors du traitement de {file.name}: {e}")
+                    
+                    # Créer la demande d'estimation
+                    estimation_data = {
+                        'nom_client': nom_client.strip(),
+                        'email_client': email_client.strip().lower(),
+                        'telephone_client': telephone_client.strip(),
+                        'adresse_client': adresse_client.strip(),
+                        'type_projet': type_projet,
+                        'description_detaillee': description_detaillee.strip(),
+                        'surface_approximative': surface_approximative.strip(),
+                        'budget_approximatif': budget_approximatif,
+                        'delai_souhaite': delai_souhaite,
+                        'plans_client': ",".join(plans_base64),
+                        'photos_client': ",".join(photos_base64),
+                        'documents_client': ",".join(docs_base64),
+                        'prix_estimation': 200.0  # Prix de base, ajustable selon complexité
+                    }
+                    
+                    if creer_demande_estimation(estimation_data):
+                        st.success("🎉 Votre demande d'estimation a été envoyée avec succès!")
+                        st.info("""
+                        **Prochaines étapes :**
+                        1. Vous recevrez un email de confirmation dans les prochaines minutes
+                        2. Notre équipe analysera votre projet sous 24-48h
+                        3. Vous serez contacté pour discuter des détails si nécessaire  
+                        4. L'estimation sera préparée et envoyée sous 3-5 jours ouvrables
+                        
+                        Vous pouvez suivre l'état de votre demande dans l'onglet "Mes estimations".
+                        """)
+                        st.balloons()
+                    else:
+                        st.error("❌ Erreur lors de l'envoi de votre demande. Veuillez réessayer.")
+    
+    with tab2:
+        st.markdown("### 📊 Suivi de mes estimations")
+        
+        # Formulaire pour consulter les estimations
+        with st.form("consultation_estimations"):
+            email_consultation = st.text_input("Email pour consulter vos estimations", 
+                                             placeholder="votre.email@exemple.com")
+            consulter = st.form_submit_button("🔍 Consulter mes estimations")
+        
+        if consulter and email_consultation:
+            if valider_email(email_consultation):
+                estimations = get_estimations_client(email_consultation.strip().lower())
+                
+                if estimations:
+                    st.success(f"📋 {len(estimations)} estimation(s) trouvée(s)")
+                    
+                    for estimation in estimations:
+                        # Mapper les statuts pour l'affichage
+                        statuts_affichage = {
+                            'recue': '🆕 Demande reçue',
+                            'en_cours': '🔄 En cours d\'analyse',
+                            'terminee': '✅ Estimation terminée',
+                            'envoyee': '📧 Estimation envoyée',
+                            'payee': '💰 Payée'
+                        }
+                        
+                        with st.expander(f"**{estimation['type_projet']}** - {estimation['numero_reference']}", expanded=True):
+                            col1, col2, col3 = st.columns([2, 1, 1])
+                            
+                            with col1:
+                                st.write(f"**Description :** {estimation['description_detaillee'][:200]}...")
+                                st.write(f"**Date de demande :** {estimation['date_demande']}")
+                            
+                            with col2:
+                                statut_badge = statuts_affichage.get(estimation['statut'], estimation['statut'])
+                                st.markdown(f"**Statut :** {statut_badge}")
+                                if estimation['prix_estimation']:
+                                    st.write(f"**Prix estimation :** {estimation['prix_estimation']:.2f}$")
+                            
+                            with col3:
+                                if estimation['date_estimation_terminee']:
+                                    st.write(f"**Terminée le :** {estimation['date_estimation_terminee']}")
+                                if estimation['date_envoi_client']:
+                                    st.write(f"**Envoyée le :** {estimation['date_envoi_client']}")
+                            
+                            # Si l'estimation est envoyée, proposer de télécharger
+                            if estimation['statut'] == 'envoyee':
+                                st.success("🎉 Votre estimation est prête ! Contactez-nous pour recevoir les documents.")
+                else:
+                    st.info("Aucune estimation trouvée pour cet email.")
+            else:
+                st.error("Format d'email invalide")
+
+def page_service_technologue():
+    """Page du service de technologue pour projets ≤ 6000 pi²"""
+    
+    st.markdown("""
+    <div class="main-header">
+        <h1>📐 Service de Technologue en Architecture</h1>
+        <p>Plans techniques pour projets de 6,000 pi² et moins</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Onglets pour client et consultation
+    tab1, tab2, tab3 = st.tabs(["📐 Nouvelle demande", "📋 Mes demandes", "ℹ️ Informations"])
+    
+    with tab1:
+        st.markdown("""
+        #### Obtenez des plans techniques professionnels
+        
+        **Service complet incluant :**
+        - Plans d'implantation, fondation et charpente
+        - Plans électriques et plomberie (optionnel)
+        - Conformité aux codes du bâtiment
+        - Aide pour permis de construction
+        - Visite de terrain (optionnel)
+        - Modélisation 3D (optionnel)
+        """)
+        
+        # Vérification de la superficie
+        st.info("""
+        ℹ️ **Service de technologue** : Pour projets de **6,000 pi² et moins**. 
+        Pour les projets plus grands, utilisez le Service d'architecture (architecte OAQ requis).
+        """)
+        
+        with st.form("demande_technologue"):
+            st.markdown("### 👤 Informations du client")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                nom_client = st.text_input("Nom complet *", placeholder="Jean Dupont")
+                email_client = st.text_input("Email *", placeholder="jean.dupont@email.com")
+                telephone_client = st.text_input("Téléphone *", placeholder="418-555-1234")
+            
+            with col2:
+                adresse_projet = st.text_input("Adresse du projet *", placeholder="123 Rue de la Construction")
+                ville = st.text_input("Ville *", placeholder="Québec")
+                code_postal = st.text_input("Code postal *", placeholder="G1X 2Y3")
+            
+            st.markdown("---")
+            st.markdown("### 🏠 Détails du projet")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                type_batiment = st.selectbox(
+                    "Type de bâtiment *",
+                    ["résidentiel", "commercial", "industriel", "garage", "cabanon", "autre"]
+                )
+                
+                usage_batiment = st.text_area(
+                    "Description de l'usage *",
+                    placeholder="Ex: Agrandissement cuisine avec bureau, Garage détaché 2 voitures, etc.",
+                    height=100
+                )
+                
+                superficie_terrain = st.number_input(
+                    "Superficie du terrain (pi²)",
+                    min_value=0,
+                    max_value=50000,
+                    value=8000,
+                    step=100
+                )
+            
+            with col2:
+                superficie_batiment = st.number_input(
+                    "Superficie du bâtiment (pi²) *",
+                    min_value=50,
+                    max_value=6000,
+                    value=1500,
+                    step=50,
+                    help="Maximum 6,000 pi² pour service de technologue"
+                )
+                
+                nombre_etages = st.selectbox("Nombre d'étages", [1, 2, 3])
+                nombre_pieces = st.number_input("Nombre de pièces/espaces", min_value=1, max_value=20, value=5)
+            
+            # Validation de la superficie
+            if superficie_batiment > 6000:
+                st.error("""
+                ⚠️ **Superficie trop grande** : Ce projet dépasse 6,000 pi² et nécessite un architecte.
+                Veuillez utiliser le **Service d'architecture** pour ce projet.
+                """)
+            
+            st.markdown("---")
+            st.markdown("### 🔧 Spécifications techniques")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                type_construction = st.selectbox(
+                    "Type de construction *",
+                    ["nouvelle", "agrandissement", "renovation", "garage", "remise"]
+                )
+                
+                style_architectural = st.selectbox(
+                    "Style architectural",
+                    ["traditionnel", "moderne", "rustique", "contemporain", "industriel"]
+                )
+                
+                contraintes_terrain = st.text_area(
+                    "Contraintes du terrain",
+                    placeholder="Ex: Pente, servitudes, proximité voisins, accès, etc.",
+                    height=80
+                )
+            
+            with col2:
+                exigences_speciales = st.text_area(
+                    "Exigences spéciales",
+                    placeholder="Ex: Isolation supérieure, accessibilité, normes spéciales, etc.",
+                    height=80
+                )
+                
+                plans_requis = st.selectbox(
+                    "Type de plans requis *",
+                    ["complet", "preliminaire", "concept", "permis"]
+                )
+            
+            st.markdown("---")
+            st.markdown("### 📋 Services et options")
+            
+            # Services de base inclus
+            st.markdown("**Services de base inclus :**")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                plan_implantation = st.checkbox("Plan d'implantation", value=True, disabled=True)
+                plan_fondation = st.checkbox("Plan de fondation", value=True, disabled=True)
+            with col2:
+                plan_charpente = st.checkbox("Plan de charpente", value=True, disabled=True)
+                besoin_permis = st.checkbox("Aide permis construction", value=True)
+            with col3:
+                conforme_cnb = st.checkbox("Conformité CNB", value=True, disabled=True)
+                conforme_municipal = st.checkbox("Conformité municipale", value=True, disabled=True)
+            
+            # Services optionnels
+            st.markdown("**Services optionnels :**")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                plan_electricite = st.checkbox("Plan électrique (+15%)")
+                plan_plomberie = st.checkbox("Plan de plomberie (+12%)")
+            with col2:
+                besoin_3d = st.checkbox("Modélisation 3D (+800$)")
+                visite_terrain = st.checkbox("Visite de terrain (+350$)")
+            with col3:
+                revision_multiple = st.checkbox("Révisions multiples (+400$)")
+            
+            # Construire la liste des services
+            services_inclus = ["implantation", "fondation", "charpente"]
+            if plan_electricite:
+                services_inclus.append("electricite")
+            if plan_plomberie:
+                services_inclus.append("plomberie")
+            
+            st.markdown("---")
+            st.markdown("### 💰 Budget et délais")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                budget_construction = st.text_input(
+                    "Budget de construction estimé",
+                    placeholder="Ex: 50,000$ - 75,000$"
+                )
+                
+                date_debut_souhaite = st.date_input(
+                    "Date de début souhaitée",
+                    value=datetime.date.today() + datetime.timedelta(days=30)
+                )
+            
+            with col2:
+                budget_technologue = st.text_input(
+                    "Budget pour services technologue",
+                    placeholder="Ex: 3,000$ - 5,000$"
+                )
+                
+                date_livraison_plans = st.date_input(
+                    "Date de livraison souhaitée",
+                    value=datetime.date.today() + datetime.timedelta(days=21)
+                )
+            
+            niveau_urgence = st.selectbox(
+                "Niveau d'urgence",
+                ["normal", "eleve", "critique"],
+                format_func=lambda x: {"normal": "Normal", "eleve": "Élevé (+25%)", "critique": "Critique (+50%)"}[x]
+            )
+            
+            # Calcul du prix estimé en temps réel
+            if superficie_batiment <= 6000:
+                services_list = services_inclus
+                options = {
+                    'modele_3d': besoin_3d,
+                    'visite_terrain': visite_terrain,
+                    'revision_multiple': revision_multiple,
+                    'urgence_elevee': niveau_urgence in ['eleve', 'critique']
+                }
+                prix_estime = calculer_prix_technologue(superficie_batiment, services_list, options)
+                
+                st.markdown("---")
+                st.markdown("### 💵 Estimation du prix")
+                st.success(f"**Prix estimé : {prix_estime:,.2f}$ CAD**")
+                st.caption("Prix indicatif incluant tous les services sélectionnés")
+            
+            st.markdown("---")
+            st.markdown("### 📎 Documents à fournir (optionnel)")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                certificat_localisation = st.file_uploader(
+                    "Certificat de localisation",
+                    type=['pdf', 'jpg', 'png'],
+                    help="Document d'arpentage du terrain"
+                )
+                photos_terrain = st.file_uploader(
+                    "Photos du terrain/existant",
+                    type=['jpg', 'png', 'jpeg'],
+                    accept_multiple_files=True
+                )
+            
+            with col2:
+                croquis_client = st.file_uploader(
+                    "Croquis/idées du client",
+                    type=['pdf', 'jpg', 'png', 'jpeg'],
+                    accept_multiple_files=True
+                )
+                documents_existants = st.file_uploader(
+                    "Plans existants (si rénovation)",
+                    type=['pdf', 'dwg'],
+                    accept_multiple_files=True
+                )
+            
+            # Bouton de soumission
+            submitted = st.form_submit_button(
+                "🚀 Soumettre la demande", 
+                use_container_width=True,
+                type="primary"
+            )
+            
+            if submitted:
+                # Validation des champs obligatoires
+                if not all([nom_client, email_client, telephone_client, adresse_projet, ville, code_postal, type_batiment, usage_batiment, superficie_batiment]):
+                    st.error("❌ Veuillez remplir tous les champs obligatoires (*)")
+                elif superficie_batiment > 6000:
+                    st.error("❌ Superficie trop grande pour le service de technologue. Utilisez le Service d'architecture.")
+                elif not re.match(r'^[^@]+@[^@]+\.[^@]+$', email_client):
+                    st.error("❌ Format d'email invalide")
+                else:
+                    # Préparer les données de la demande
+                    demande_data = {
+                        'nom_client': nom_client,
+                        'email_client': email_client,
+                        'telephone_client': telephone_client,
+                        'adresse_projet': adresse_projet,
+                        'ville': ville,
+                        'code_postal': code_postal,
+                        'type_batiment': type_batiment,
+                        'usage_batiment': usage_batiment,
+                        'superficie_terrain': superficie_terrain,
+                        'superficie_batiment': superficie_batiment,
+                        'nombre_etages': nombre_etages,
+                        'nombre_pieces': nombre_pieces,
+                        'type_construction': type_construction,
+                        'style_architectural': style_architectural,
+                        'contraintes_terrain': contraintes_terrain,
+                        'exigences_speciales': exigences_speciales,
+                        'plans_requis': plans_requis,
+                        'services_inclus': ','.join(services_inclus),
+                        'besoin_3d': besoin_3d,
+                        'besoin_permis': besoin_permis,
+                        'visite_terrain': visite_terrain,
+                        'budget_construction': budget_construction,
+                        'budget_technologue': budget_technologue,
+                        'date_debut_souhaite': date_debut_souhaite.isoformat(),
+                        'date_livraison_plans': date_livraison_plans.isoformat(),
+                        'niveau_urgence': niveau_urgence,
+                        'plan_implantation': plan_implantation,
+                        'plan_fondation': plan_fondation,
+                        'plan_charpente': plan_charpente,
+                        'plan_electricite': plan_electricite,
+                        'plan_plomberie': plan_plomberie
+                    }
+                    
+                    # Encoder les fichiers si présents
+                    if certificat_localisation:
+                        demande_data['certificat_localisation'] = f"{certificat_localisation.name}:{base64.b64encode(certificat_localisation.read()).decode()}"
+                    
+                    if photos_terrain:
+                        photos_encoded = []
+                        for photo in photos_terrain:
+                            photos_encoded.append(f"{photo.name}:{base64.b64encode(photo.read()).decode()}")
+                        demande_data['photos_terrain'] = ','.join(photos_encoded)
+                    
+                    if croquis_client:
+                        croquis_encoded = []
+                        for croquis in croquis_client:
+                            croquis_encoded.append(f"{croquis.name}:{base64.b64encode(croquis.read()).decode()}")
+                        demande_data['croquis_client'] = ','.join(croquis_encoded)
+                    
+                    if documents_existants:
+                        docs_encoded = []
+                        for doc in documents_existants:
+                            docs_encoded.append(f"{doc.name}:{base64.b64encode(doc.read()).decode()}")
+                        demande_data['documents_existants'] = ','.join(docs_encoded)
+                    
+                    # Créer la demande
+                    numero_reference = creer_demande_technologue(demande_data)
+                    
+                    if numero_reference:
+                        st.success(f"""
+                        ✅ **Demande créée avec succès !**
+                        
+                        **Numéro de référence :** {numero_reference}
+                        **Prix estimé :** {prix_estime:,.2f}$ CAD
+                        
+                        Vous recevrez une confirmation par email sous peu.
+                        """)
+                        
+                        # Afficher le résumé
+                        with st.expander("📋 Résumé de votre demande"):
+                            st.write(f"**Projet :** {usage_batiment}")
+                            st.write(f"**Superficie :** {superficie_batiment:,.0f} pi²")
+                            st.write(f"**Type :** {type_batiment.title()}")
+                            st.write(f"**Services :** {', '.join(services_inclus)}")
+                            st.write(f"**Délai souhaité :** {date_livraison_plans}")
+                    else:
+                        st.error("❌ Erreur lors de la création de la demande. Veuillez réessayer.")
+    
+    with tab2:
+        st.markdown("### 📋 Consultation de mes demandes")
+        
+        # Interface de consultation pour les clients
+        email_consultation = st.text_input(
+            "Entrez votre email pour consulter vos demandes",
+            placeholder="votre.email@exemple.com"
+        )
+        
+        if email_consultation and re.match(r'^[^@]+@[^@]+\.[^@]+$', email_consultation):
+            demandes = get_demandes_technologue_client(email_consultation)
+            
+            if demandes:
+                st.success(f"📋 {len(demandes)} demande(s) trouvée(s)")
+                
+                for demande in demandes:
+                    # Mapper les statuts pour l'affichage
+                    statuts_affichage = {
+                        'recue': '🆕 Reçue',
+                        'analyse': '🔍 En analyse',
+                        'acceptee': '✅ Acceptée',
+                        'en_cours': '🔄 En cours',
+                        'revision': '📝 En révision',
+                        'terminee': '🎉 Terminée'
+                    }
+                    
+                    statut_badge = statuts_affichage.get(demande['statut'], demande['statut'])
+                    
+                    with st.expander(f"**{demande['type_batiment'].title()}** - {demande['numero_reference']} - {statut_badge}", expanded=True):
+                        col1, col2, col3 = st.columns([2, 1, 1])
+                        
+                        with col1:
+                            st.write(f"**Description :** {demande['usage_batiment'][:200]}...")
+                            st.write(f"**Superficie :** {demande['superficie_batiment']:,.0f} pi²")
+                            st.write(f"**Ville :** {demande['ville']}")
+                        
+                        with col2:
+                            st.markdown(f"**Statut :** {statut_badge}")
+                            if demande['prix_service']:
+                                st.write(f"**Prix :** {demande['prix_service']:,.2f}$")
+                            st.write(f"**Date demande :** {demande['date_demande'][:10]}")
+                        
+                        with col3:
+                            if demande['pourcentage_complete']:
+                                st.progress(demande['pourcentage_complete'] / 100)
+                                st.caption(f"Progression: {demande['pourcentage_complete']}%")
+                            
+                            if demande['date_livraison_plans']:
+                                st.write(f"**Livraison prévue :** {demande['date_livraison_plans']}")
+                        
+                        # Si les plans sont prêts, permettre le téléchargement
+                        if demande['statut'] == 'terminee' and demande['plans_finaux']:
+                            st.success("🎉 Vos plans sont prêts ! Contactez-nous pour les recevoir.")
+            else:
+                st.info("Aucune demande trouvée pour cet email.")
+        elif email_consultation:
+            st.error("Format d'email invalide")
+    
+    with tab3:
+        st.markdown("### ℹ️ Informations sur le Service de Technologue")
+        
+        st.markdown("""
+        #### 🎯 À qui s'adresse ce service ?
+        
+        Le **Service de technologue** est conçu pour les projets de **6,000 pi² et moins** qui nécessitent :
+        - Plans techniques professionnels
+        - Conformité aux codes du bâtiment
+        - Aide pour obtenir les permis
+        - Solutions économiques et efficaces
+        
+        #### 📐 Types de projets acceptés
+        
+        **Résidentiel :**
+        - Agrandissements et rénovations
+        - Chalets et résidences secondaires
+        - Garages détachés
+        - Cabanons et remises
+        
+        **Commercial léger :**
+        - Petits commerces et bureaux
+        - Ateliers et garages commerciaux
+        - Entrepôts de petite taille
+        
+        #### 🔧 Services inclus
+        
+        **Plans de base :**
+        - Plan d'implantation sur le terrain
+        - Plan de fondation avec détails
+        - Plan de charpente structurale
+        - Conformité codes du bâtiment
+        
+        **Services optionnels :**
+        - Plan électrique (+15% du prix)
+        - Plan de plomberie (+12% du prix)
+        - Modélisation 3D (+800$)
+        - Visite de terrain (+350$)
+        - Révisions multiples (+400$)
+        
+        #### 💰 Tarification
+        
+        **Prix de base selon superficie :**
+        - Jusqu'à 1,000 pi² : À partir de 2,500$
+        - 1,001 à 2,500 pi² : À partir de 3,500$
+        - 2,501 à 4,000 pi² : À partir de 4,500$
+        - 4,001 à 6,000 pi² : À partir de 6,000$
+        
+        *Prix final calculé selon superficie, services et options choisis*
+        
+        #### ⏱️ Délais typiques
+        
+        - **Plans préliminaires :** 1-2 semaines
+        - **Plans complets :** 2-4 semaines
+        - **Projets urgents :** Sur demande (+25%)
+        
+        #### 🏛️ Différence avec Service d'Architecture
+        
+        | Critère | Technologue | Architecte |
+        |---------|-------------|------------|
+        | **Superficie** | ≤ 6,000 pi² | > 6,000 pi² |
+        | **Professionnel** | Technologue | Architecte OAQ |
+        | **Prix** | Plus économique | Plus élevé |
+        | **Complexité** | Projets standards | Projets complexes |
+        | **Légal** | Suffisant pour permis | Obligatoire >6,000 pi² |
+        
+        #### 📞 Support et suivi
+        
+        - Consultation gratuite pour évaluer votre projet
+        - Suivi personnalisé tout au long du processus
+        - Support pour démarches de permis
+        - Révisions incluses selon forfait
+        
+        #### 🎯 Prochaines étapes
+        
+        1. **Évaluez votre projet** : Superficie ≤ 6,000 pi² ?
+        2. **Rassemblez vos documents** : Certificat localisation, photos, idées
+        3. **Remplissez le formulaire** : Onglet "Nouvelle demande"
+        4. **Recevez votre devis** : Confirmation sous 24-48h
+        5. **Démarrage des plans** : Après acceptation du devis
+        """)
+
+def page_service_architecture():
+    """Page du service d'architecture pour projets > 6000 pi²"""
+    
+    st.markdown("""
+    <div class="main-header">
+        <h1>🏛️ Service d'Architecture Professionnelle</h1>
+        <p>Plans d'architecte pour projets de grande envergure (> 6,000 pi²)</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Onglets pour client et consultation
+    tab1, tab2, tab3 = st.tabs(["📐 Nouvelle demande", "📋 Mes demandes", "ℹ️ Informations"])
+    
+    with tab1:
+        st.markdown("""
+        #### Obtenez des plans d'architecte professionnels
+        
+        **Service complet incluant :**
+        - Plans d'architecture scellés par architecte OAQ
+        - Conformité au Code National du Bâtiment
+        - Aide pour permis de construction
+        - Modélisation 3D (optionnel)
+        - Coordination avec ingénieurs (structure, mécanique, électrique)
+        """)
+        
+        # Vérification de la superficie
+        st.warning("""
+        ⚠️ **Important** : Ce service est **obligatoire** pour les projets de plus de 6,000 pi² 
+        selon la réglementation québécoise. Un architecte membre de l'OAQ doit signer les plans.
+        """)
+        
+        with st.form("formulaire_architecture"):
+            # Section 1: Informations client
+            st.markdown("### 1️⃣ Vos informations")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                nom_client = st.text_input("Nom complet ou entreprise *", placeholder="Corporation ABC Inc.")
+                telephone = st.text_input("Téléphone *", placeholder="514-555-1234")
+                ville = st.text_input("Ville du projet *", placeholder="Montréal")
+            
+            with col2:
+                email = st.text_input("Email *", placeholder="contact@entreprise.com")
+                adresse_projet = st.text_input("Adresse du projet *", placeholder="1234 Rue Principale")
+                code_postal = st.text_input("Code postal *", placeholder="H1A 1A1")
+            
+            # Section 2: Détails du projet
+            st.markdown("### 2️⃣ Détails du projet architectural")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                type_batiment = st.selectbox(
+                    "Type de bâtiment *",
+                    ["", "résidentiel", "commercial", "industriel", "institutionnel", "mixte"]
+                )
+                
+                superficie_batiment = st.number_input(
+                    "Superficie totale du bâtiment (pi²) *",
+                    min_value=6000,
+                    value=6000,
+                    step=100,
+                    help="Minimum 6,000 pi² pour ce service"
+                )
+                
+                nombre_etages = st.number_input(
+                    "Nombre d'étages",
+                    min_value=1,
+                    max_value=50,
+                    value=1
+                )
+                
+                if type_batiment == "résidentiel":
+                    nombre_logements = st.number_input(
+                        "Nombre de logements",
+                        min_value=1,
+                        value=1
+                    )
+                else:
+                    nombre_logements = None
+            
+            with col2:
+                type_construction = st.selectbox(
+                    "Type de construction *",
+                    ["", "nouvelle", "agrandissement", "renovation_majeure"]
+                )
+                
+                superficie_terrain = st.number_input(
+                    "Superficie du terrain (pi²)",
+                    min_value=0,
+                    value=0,
+                    step=100,
+                    help="Laissez 0 si non applicable"
+                )
+                
+                style_architectural = st.selectbox(
+                    "Style architectural souhaité",
+                    ["", "moderne", "contemporain", "traditionnel", "industriel", "minimaliste", "autre"]
+                )
+            
+            usage_batiment = st.text_area(
+                "Usage prévu du bâtiment *",
+                placeholder="Ex: Immeuble de 24 condos avec stationnement souterrain et espaces commerciaux au RDC",
+                height=100
+            )
+            
+            # Section 3: Spécifications techniques
+            st.markdown("### 3️⃣ Spécifications et contraintes")
+            
+            contraintes_terrain = st.text_area(
+                "Contraintes du terrain",
+                placeholder="Ex: Terrain en pente, servitudes, zone inondable, proximité d'un cours d'eau...",
+                height=80
+            )
+            
+            exigences_speciales = st.text_area(
+                "Exigences spéciales",
+                placeholder="Ex: Certification LEED, accessibilité universelle, insonorisation supérieure...",
+                height=80
+            )
+            
+            # Section 4: Services requis
+            st.markdown("### 4️⃣ Services requis")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                plans_requis = st.selectbox(
+                    "Type de plans requis *",
+                    ["", "preliminaire", "concept", "execution", "complet"],
+                    help="Préliminaire: esquisse, Concept: 30%, Exécution: 100%, Complet: tous les plans"
+                )
+                
+                besoin_3d = st.checkbox("Modélisation 3D requise", value=False)
+                besoin_permis = st.checkbox("Aide pour permis de construction", value=True)
+            
+            with col2:
+                st.markdown("**Services d'ingénierie additionnels:**")
+                inclure_structure = st.checkbox("Structure", help="+0.25$/pi²")
+                inclure_mecanique = st.checkbox("Mécanique (CVAC, plomberie)", help="+0.20$/pi²")
+                inclure_electrique = st.checkbox("Électrique", help="+0.15$/pi²")
+                inclure_civil = st.checkbox("Civil (drainage, égouts)", help="+0.10$/pi²")
+            
+            # Section 5: Budget et délais
+            st.markdown("### 5️⃣ Budget et échéancier")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                budget_construction = st.selectbox(
+                    "Budget de construction estimé",
+                    ["", "Moins de 1M$", "1M$ - 5M$", "5M$ - 10M$", 
+                     "10M$ - 25M$", "25M$ - 50M$", "Plus de 50M$"]
+                )
+                
+                date_debut_souhaite = st.date_input(
+                    "Date de début de construction souhaitée",
+                    min_value=datetime.date.today() + datetime.timedelta(days=60),
+                    value=datetime.date.today() + datetime.timedelta(days=120)
+                )
+            
+            with col2:
+                budget_architecture = st.selectbox(
+                    "Budget pour services d'architecture",
+                    ["", "À déterminer", "50k$ - 100k$", "100k$ - 250k$", 
+                     "250k$ - 500k$", "500k$ - 1M$", "Plus de 1M$"]
+                )
+                
+                date_livraison_plans = st.date_input(
+                    "Date de livraison des plans souhaitée",
+                    min_value=datetime.date.today() + datetime.timedelta(days=30),
+                    value=datetime.date.today() + datetime.timedelta(days=60)
+                )
+            
+            niveau_urgence = st.selectbox(
+                "Niveau d'urgence",
+                ["normal", "faible", "eleve", "critique"],
+                format_func=lambda x: {
+                    'faible': '🟢 Faible - Délai flexible',
+                    'normal': '🟡 Normal - Délai standard',
+                    'eleve': '🟠 Élevé - Prioritaire',
+                    'critique': '🔴 Critique - Très urgent'
+                }[x]
+            )
+            
+            # Section 6: Documents
+            st.markdown("### 6️⃣ Documents à fournir")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                certificat = st.file_uploader(
+                    "Certificat de localisation",
+                    type=['pdf', 'jpg', 'png'],
+                    help="Document du terrain existant"
+                )
+            
+            with col2:
+                photos = st.file_uploader(
+                    "Photos du terrain/bâtiment",
+                    type=['jpg', 'png', 'jpeg'],
+                    accept_multiple_files=True,
+                    help="Photos actuelles du site"
+                )
+            
+            with col3:
+                croquis = st.file_uploader(
+                    "Croquis ou esquisses",
+                    type=['pdf', 'jpg', 'png', 'dwg'],
+                    accept_multiple_files=True,
+                    help="Vos idées préliminaires"
+                )
+            
+            # Estimation du prix
+            st.markdown("### 💰 Estimation du coût")
+            
+            if superficie_batiment > 0:
+                # Calcul estimé (mémoïsé : recalculé seulement si les paramètres changent)
+                prix_base, prix_pi2 = palier_tarifaire('architecture', superficie_batiment)
+                services_choisis = [
+                    service for service, inclus in (
+                        ('structure', inclure_structure), ('mecanique', inclure_mecanique),
+                        ('electrique', inclure_electrique), ('civil', inclure_civil)
+                    ) if inclus
+                ]
+                prix_estime = calculer_prix('architecture', superficie_batiment, services_choisis)
+                
+                st.info(f"""
+                **Estimation préliminaire : {prix_estime:,.2f}$**
+                
+                Cette estimation inclut:
+                - Plans d'architecture de base : {prix_base:,.2f}$
+                - Superficie ({superficie_batiment:,.0f} pi² × {prix_pi2}$/pi²) : {(superficie_batiment * prix_pi2):,.2f}$
+                {f"- Services de structure : {(superficie_batiment * 0.25):,.2f}$" if inclure_structure else ""}
+                {f"- Services mécaniques : {(superficie_batiment * 0.20):,.2f}$" if inclure_mecanique else ""}
+                {f"- Services électriques : {(superficie_batiment * 0.15):,.2f}$" if inclure_electrique else ""}
+                {f"- Services civils : {(superficie_batiment * 0.10):,.2f}$" if inclure_civil else ""}
+                
+                *Prix final sujet à analyse détaillée du projet*
+                """)
+            
+            # Bouton de soumission
+            submitted = st.form_submit_button("📤 Soumettre la demande", type="primary")
+            
+            if submitted:
+                # Validation
+                if not all([nom_client, email, telephone, adresse_projet, ville, code_postal,
+                           type_batiment, type_construction, usage_batiment, plans_requis]):
+                    st.error("❌ Veuillez remplir tous les champs obligatoires (*)")
+                elif superficie_batiment < 6000:
+                    st.error("❌ La superficie doit être d'au moins 6,000 pi²")
+                else:
+                    # Préparer les données
+                    demande_data = {
+                        'nom_client': nom_client,
+                        'email_client': email,
+                        'telephone_client': telephone,
+                        'adresse_projet': adresse_projet,
+                        'ville': ville,
+                        'code_postal': code_postal,
+                        'type_batiment': type_batiment,
+                        'usage_batiment': usage_batiment,
+                        'superficie_terrain': superficie_terrain if superficie_terrain > 0 else None,
+                        'superficie_batiment': superficie_batiment,
+                        'nombre_etages': nombre_etages,
+                        'nombre_logements': nombre_logements,
+                        'type_construction': type_construction,
+                        'style_architectural': style_architectural,
+                        'contraintes_terrain': contraintes_terrain,
+                        'exigences_speciales': exigences_speciales,
+                        'plans_requis': plans_requis,
+                        'inclure_structure': inclure_structure,
+                        'inclure_mecanique': inclure_mecanique,
+                        'inclure_electrique': inclure_electrique,
+                        'inclure_civil': inclure_civil,
+                        'besoin_3d': besoin_3d,
+                        'besoin_permis': besoin_permis,
+                        'budget_construction': budget_construction,
+                        'budget_architecture': budget_architecture,
+                        'date_debut_souhaite': date_debut_souhaite,
+                        'date_livraison_plans': date_livraison_plans,
+                        'niveau_urgence': niveau_urgence,
+                        'modalite_paiement': 'forfait'
+                    }
+                    
+                    # Encoder les fichiers
+                    if certificat:
+                        demande_data['certificat_localisation'] = encoder_fichiers_architecture([certificat])
+                    if photos:
+                        demande_data['photos_terrain'] = encoder_fichiers_architecture(photos)
+                    if croquis:
+                        demande_data['croquis_client'] = encoder_fichiers_architecture(croquis)
+                    
+                    # Créer la demande
+                    numero_ref = creer_demande_architecture(demande_data)
+                    
+                    if numero_ref:
+                        st.success(f"""
+                        ✅ **Demande créée avec succès!**
+                        
+                        **Numéro de référence : {numero_ref}**
+                        
+                        Vous recevrez une réponse dans les 48 heures ouvrables.
+                        
+                        **Prochaines étapes:**
+                        1. Analyse de votre demande par notre équipe
+                        2. Contact d'un architecte OAQ pour validation
+                        3. Proposition détaillée avec échéancier
+                        4. Début des plans après acceptation
+                        """)
+                        
+                        st.balloons()
+                    else:
+                        st.error("❌ Erreur lors de la création de la demande. Veuillez réessayer.")
+    
+    with tab2:
+        st.markdown("### 📋 Suivi de vos demandes d'architecture")
+        
+        email_consultation = st.text_input(
+            "Entrez votre email pour consulter vos demandes",
+            placeholder="contact@entreprise.com"
+        )
+        
+        if st.button("🔍 Rechercher mes demandes"):
+            if email_consultation:
+                demandes = get_demandes_architecture_client(email_consultation)
+                
+                if demandes:
+                    st.success(f"✅ {len(demandes)} demande(s) trouvée(s)")
+                    
+                    for demande in demandes:
+                        with st.expander(f"📐 {demande['numero_reference']} - {demande['type_batiment'].title()}"):
+                            col1, col2, col3 = st.columns(3)
+                            
+                            with col1:
+                                st.markdown(f"**Type:** {demande['type_batiment'].title()}")
+                                st.markdown(f"**Superficie:** {demande['superficie_batiment']:,.0f} pi²")
+                                st.markdown(f"**Ville:** {demande['ville']}")
+                            
+                            with col2:
+                                statut_emoji = {
+                                    'recue': '📨', 'en_analyse': '🔍', 'acceptee': '✅',
+                                    'en_cours': '📐', 'revision': '📝', 'approuvee': '👍',
+                                    'livree': '📦', 'terminee': '✔️'
+                                }.get(demande['statut'], '📋')
+                                
+                                st.markdown(f"**Statut:** {statut_emoji} {demande['statut'].replace('_', ' ').title()}")
+                                st.markdown(f"**Prix:** {demande['prix_service']:,.2f}$")
+                                if demande['pourcentage_complete']:
+                                    st.progress(demande['pourcentage_complete'] / 100)
+                                    st.caption(f"Progression: {demande['pourcentage_complete']}%")
+                            
+                            with col3:
+                                st.markdown(f"**Date demande:** {demande['date_demande'][:10] if demande['date_demande'] else 'N/A'}")
+                                st.markdown(f"**Livraison prévue:** {demande['date_livraison_plans'] if demande['date_livraison_plans'] else 'À déterminer'}")
+                            
+                            st.markdown("---")
+                            st.markdown(f"**Usage:** {demande['usage_batiment']}")
+                            
+                            # Téléchargement des plans si disponibles
+                            if demande['plans_finaux']:
+                                st.markdown("### 📥 Documents disponibles")
+                                st.download_button(
+                                    "⬇️ Télécharger les plans finaux",
+                                    data=fichier_servi('plans_finaux', demande['plans_finaux']),
+                                    file_name=f"Plans_{demande['numero_reference']}.pdf",
+                                    mime="application/pdf"
+                                )
+                else:
+                    st.info("❌ Aucune demande trouvée pour cet email")
+            else:
+                st.warning("⚠️ Veuillez entrer votre email")
+    
+    with tab3:
+        st.markdown("""
+        ### ℹ️ Informations sur le service d'architecture
+        
+        #### 📏 Quand un architecte est-il obligatoire au Québec?
+        
+        Selon la Loi sur les architectes du Québec, un architecte membre de l'OAQ est **obligatoire** pour:
+        
+        - **Bâtiments publics** : Toute superficie
+        - **Édifices à bureaux** : Plus de 300 m² (3,230 pi²) par étage
+        - **Commerces** : Plus de 300 m² (3,230 pi²) par étage
+        - **Industries** : Plus de 300 m² (3,230 pi²) par étage
+        - **Habitations** : 5 logements et plus OU plus de 600 m² (6,460 pi²) total
+        
+        #### 💰 Structure de prix typique
+        
+        | Superficie | Prix de base | Prix/pi² | Services inclus |
+        |------------|--------------|----------|-----------------|
+        | 6,000 - 10,000 pi² | 15,000$ | 1.50$ | Plans de base |
+        | 10,000 - 25,000 pi² | 25,000$ | 1.25$ | Plans détaillés |
+        | 25,000 - 50,000 pi² | 40,000$ | 1.00$ | Coordination complète |
+        | 50,000 pi² et + | 60,000$ | 0.85$ | Gestion de projet |
+        
+        **Services additionnels:**
+        - Structure : +0.25$/pi²
+        - Mécanique : +0.20$/pi²
+        - Électrique : +0.15$/pi²
+        - Civil : +0.10$/pi²
+        
+        #### 📋 Documents livrables
+        
+        **Plans préliminaires (30%):**
+        - Plan d'implantation
+        - Plans d'étage
+        - Élévations
+        - Coupes principales
+        
+        **Plans d'exécution (100%):**
+        - Plans architecturaux complets
+        - Détails de construction
+        - Devis descriptif
+        - Bordereau des finis
+        - Plans pour permis
+        
+        #### ⏱️ Délais typiques
+        
+        - **Analyse initiale** : 2-3 jours ouvrables
+        - **Plans préliminaires** : 2-3 semaines
+        - **Plans d'exécution** : 4-8 semaines
+        - **Révisions** : 1-2 semaines
+        - **Approbation finale** : 3-5 jours
+        
+        #### 📞 Support
+        
+        Pour toute question sur le service d'architecture:
+        - 📧 architecture@seaop.ca
+        - 📞 1-800-SEAOP-QC
+        - 💬 Chat en direct disponible
+        """)
+
+def page_service_ingenieur():
+    """Page du service d'ingénieur en structure"""
+    
+    st.markdown("""
+    <div class="main-header">
+        <h1>🔧 Service d'Ingénieur en Structure</h1>
+        <p>Calculs structuraux et plans d'ingénieur par professionnels OIQ</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Onglets pour client et consultation
+    tab1, tab2, tab3 = st.tabs(["🔧 Nouvelle demande", "📋 Mes demandes", "ℹ️ Informations"])
+    
+    with tab1:
+        st.markdown("""
+        #### Obtenez des services d'ingénieur en structure professionnels
+        
+        **Service complet incluant :**
+        - Calculs structuraux par ingénieur OIQ
+        - Plans de structure scellés
+        - Analyses sismique, vent et neige
+        - Surveillance de chantier (optionnel)
+        - Conformité CNB et normes CSA
+        """)
+        
+        st.info("""
+        💡 **Quand faire appel à un ingénieur en structure ?**
+        - Modifications structurales (murs porteurs, poutres)
+        - Nouvelles constructions
+        - Agrandissements et surélévations
+        - Structures industrielles et commerciales
+        - Problèmes structuraux existants
+        """)
+        
+        with st.form("formulaire_ingenieur"):
+            # Section 1: Informations client
+            st.markdown("### 1️⃣ Vos informations")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                nom_client = st.text_input("Nom complet ou entreprise *", placeholder="Entreprise ABC Inc.")
+                telephone = st.text_input("Téléphone *", placeholder="514-555-1234")
+                ville = st.text_input("Ville du projet *", placeholder="Montréal")
+            
+            with col2:
+                email = st.text_input("Email *", placeholder="contact@entreprise.com")
+                adresse_projet = st.text_input("Adresse du projet *", placeholder="1234 Rue Principale")
+                code_postal = st.text_input("Code postal *", placeholder="H1A 1A1")
+            
+            # Section 2: Détails du projet structural
+            st.markdown("### 2️⃣ Détails du projet structural")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                type_structure = st.selectbox(
+                    "Type de structure *",
+                    ["", "batiment", "fondation", "industriel", "pont", "autre"]
+                )
+                
+                if type_structure == "batiment":
+                    type_batiment = st.selectbox(
+                        "Type de bâtiment",
+                        ["", "résidentiel", "commercial", "industriel", "institutionnel"]
+                    )
+                else:
+                    type_batiment = ""
+                
+                superficie_projet = st.number_input(
+                    "Superficie du projet (pi²)",
+                    min_value=0,
+                    value=0,
+                    step=100,
+                    help="Superficie totale concernée par les travaux"
+                )
+                
+                hauteur_structure = st.number_input(
+                    "Hauteur de la structure (pi)",
+                    min_value=0,
+                    value=0,
+                    step=1,
+                    help="Hauteur totale ou hauteur libre"
+                )
+            
+            with col2:
+                nombre_etages = st.number_input(
+                    "Nombre d'étages",
+                    min_value=1,
+                    max_value=100,
+                    value=1
+                )
+                
+                type_construction = st.selectbox(
+                    "Type de construction/matériau *",
+                    ["", "beton", "acier", "bois", "mixte", "maconnerie"]
+                )
+                
+                charge_exploitation = st.text_input(
+                    "Charges d'exploitation",
+                    placeholder="Ex: 100 lb/pi², équipements lourds, etc.",
+                    help="Décrivez les charges prévues"
+                )
+                
+                zone_sismique = st.selectbox(
+                    "Zone sismique",
+                    ["", "Zone 1 - Faible", "Zone 2 - Modéré", "Zone 3 - Élevé", "Zone 4 - Très élevé", "Zone 5 - Extrême"]
+                )
+            
+            usage_structure = st.text_area(
+                "Description de l'usage et du projet *",
+                placeholder="Ex: Agrandissement résidentiel 2 étages avec sous-sol, retrait mur porteur, nouvelle poutre acier...",
+                height=100
+            )
+            
+            # Section 3: Conditions du site
+            st.markdown("### 3️⃣ Conditions du site et contraintes")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                sol_porteur = st.text_area(
+                    "Type de sol et capacité portante",
+                    placeholder="Ex: Argile compacte, capacité 3000 lb/pi² à 4 pi de profondeur",
+                    height=80
+                )
+                
+                contraintes_particulieres = st.text_area(
+                    "Contraintes particulières",
+                    placeholder="Ex: Proximité d'autres bâtiments, accès limité, vibrations, etc.",
+                    height=80
+                )
+            
+            with col2:
+                normes_requises = st.multiselect(
+                    "Normes et codes requis",
+                    ["CNB 2020", "CSA A23.3 (Béton)", "CSA S16 (Acier)", "CSA O86 (Bois)", 
+                     "AISC", "ACI", "Normes municipales"],
+                    default=["CNB 2020"]
+                )
+                
+                # Conversion pour stockage
+                normes_str = ', '.join(normes_requises) if normes_requises else ''
+            
+            # Section 4: Services requis
+            st.markdown("### 4️⃣ Services d'ingénierie requis")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                services_demandes = st.selectbox(
+                    "Type de services *",
+                    ["", "calculs", "plans", "complet"],
+                    format_func=lambda x: {
+                        'calculs': 'Calculs seulement',
+                        'plans': 'Calculs + Plans',
+                        'complet': 'Calculs + Plans + Surveillance'
+                    }.get(x, x),
+                    help="Calculs: notes de calcul, Plans: + plans structuraux, Complet: + surveillance chantier"
+                )
+                
+                calculs_requis = st.multiselect(
+                    "Types de calculs nécessaires",
+                    ["Fondations", "Poutres et colonnes", "Dalles", "Murs porteurs", 
+                     "Connexions", "Stabilité", "Analyse sismique", "Analyse vent"]
+                )
+                
+                plans_requis = st.multiselect(
+                    "Types de plans requis",
+                    ["Plan de fondation", "Plan de charpente", "Détails connexions", 
+                     "Coupes structurales", "Plan de coffrage", "Plan d'armature"]
+                )
+            
+            with col2:
+                surveillance_chantier = st.checkbox("Surveillance de chantier", value=False)
+                certification_requise = st.checkbox("Sceau d'ingénieur requis", value=True)
+                
+                st.markdown("**Analyses spécialisées :**")
+                analyse_sismique = st.checkbox("Analyse sismique", help="+15¢/pi²")
+                analyse_vent = st.checkbox("Analyse au vent", help="+10¢/pi²")
+                analyse_neige = st.checkbox("Analyse surcharge neige", help="+8¢/pi²")
+                analyse_dynamique = st.checkbox("Analyse dynamique", help="+20¢/pi²")
+                modelisation_3d = st.checkbox("Modélisation 3D", help="+10¢/pi²")
+            
+            # Section 5: Budget et échéancier
+            st.markdown("### 5️⃣ Budget et échéancier")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                budget_structure = st.selectbox(
+                    "Budget pour travaux structuraux",
+                    ["", "Moins de 25k$", "25k$ - 75k$", "75k$ - 150k$", 
+                     "150k$ - 300k$", "300k$ - 500k$", "Plus de 500k$"]
+                )
+                
+                date_debut_souhaite = st.date_input(
+                    "Date de début souhaitée des travaux",
+                    min_value=datetime.date.today() + datetime.timedelta(days=14),
+                    value=datetime.date.today() + datetime.timedelta(days=60)
+                )
+            
+            with col2:
+                budget_ingenieur = st.selectbox(
+                    "Budget pour services d'ingénieur",
+                    ["", "À déterminer", "Moins de 5k$", "5k$ - 15k$", 
+                     "15k$ - 30k$", "30k$ - 50k$", "Plus de 50k$"]
+                )
+                
+                date_livraison_souhaite = st.date_input(
+                    "Date de livraison souhaitée",
+                    min_value=datetime.date.today() + datetime.timedelta(days=7),
+                    value=datetime.date.today() + datetime.timedelta(days=21)
+                )
+            
+            niveau_urgence = st.selectbox(
+                "Niveau d'urgence",
+                ["normal", "faible", "eleve", "critique"],
+                format_func=lambda x: {
+                    'faible': '🟢 Faible - Délai flexible',
+                    'normal': '🟡 Normal - Délai standard',
+                    'eleve': '🟠 Élevé - Prioritaire',
+                    'critique': '🔴 Critique - Très urgent'
+                }[x]
+            )
+            
+            # Section 6: Documents
+            st.markdown("### 6️⃣ Documents techniques")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                plans_architecte = st.file_uploader(
+                    "Plans d'architecte",
+                    type=['pdf', 'dwg', 'jpg', 'png'],
+                    accept_multiple_files=True,
+                    help="Plans existants du projet"
+                )
+            
+            with col2:
+                etude_sol = st.file_uploader(
+                    "Rapport géotechnique",
+                    type=['pdf', 'doc', 'docx'],
+                    help="Étude de sol si disponible"
+                )
+            
+            with col3:
+                photos_existant = st.file_uploader(
+                    "Photos de l'existant",
+                    type=['jpg', 'png', 'jpeg'],
+                    accept_multiple_files=True,
+                    help="Photos de la structure actuelle"
+                )
+            
+            # Estimation du prix
+            st.markdown("### 💰 Estimation du coût")
+            
+            if superficie_projet > 0 and type_structure and services_demandes:
+                # Calcul estimé (mémoïsé : recalculé seulement si les paramètres changent)
+                prix_base, prix_pi2 = palier_tarifaire('ingenieur', superficie_projet, type_structure)
+                analyses = [
+                    analyse for analyse, demandee in (
+                        ('analyse_sismique', analyse_sismique), ('analyse_dynamique', analyse_dynamique),
+                        ('modelisation_3d', modelisation_3d), ('surveillance_chantier', surveillance_chantier)
+                    ) if demandee
+                ]
+                prix_estime = calculer_prix(
+                    'ingenieur', superficie_projet, analyses,
+                    categorie=type_structure, formule=services_demandes
+                )
+                
+                st.info(f"""
+                **Estimation préliminaire : {prix_estime:,.2f}$**
+                
+                Cette estimation inclut:
+                - Services de base : {prix_base:,.2f}$
+                - Superficie ({superficie_projet:,.0f} pi² × {prix_pi2}$/pi²) : {(superficie_projet * prix_pi2):,.2f}$
+                - Ajustement services ({services_demandes}) : {('x1.8' if services_demandes == 'complet' else 'x1.4' if services_demandes == 'plans' else 'x1.0')}
+                {f"- Analyse sismique : {(superficie_projet * 0.15):,.2f}$" if analyse_sismique else ""}
+                {f"- Analyse dynamique : {(superficie_projet * 0.20):,.2f}$" if analyse_dynamique else ""}
+                {f"- Modélisation 3D : {(superficie_projet * 0.10):,.2f}$" if modelisation_3d else ""}
+                {f"- Surveillance chantier : {(superficie_projet * 0.25):,.2f}$" if surveillance_chantier else ""}
+                
+                *Prix final sujet à analyse détaillée du projet*
+                """)
+            
+            # Bouton de soumission
+            submitted = st.form_submit_button("📤 Soumettre la demande", type="primary")
+            
+            if submitted:
+                # Validation
+                if not all([nom_client, email, telephone, adresse_projet, ville, code_postal,
+                           type_structure, type_construction, usage_structure, services_demandes]):
+                    st.error("❌ Veuillez remplir tous les champs obligatoires (*)")
+                else:
+                    # Préparer les données
+                    demande_data = {
+                        'nom_client': nom_client,
+                        'email_client': email,
+                        'telephone_client': telephone,
+                        'adresse_projet': adresse_projet,
+                        'ville': ville,
+                        'code_postal': code_postal,
+                        'type_structure': type_structure,
+                        'type_batiment': type_batiment,
+                        'usage_structure': usage_structure,
+                        'superficie_projet': superficie_projet if superficie_projet > 0 else None,
+                        'hauteur_structure': hauteur_structure if hauteur_structure > 0 else None,
+                        'nombre_etages': nombre_etages,
+                        'charge_exploitation': charge_exploitation,
+                        'type_construction': type_construction,
+                        'sol_porteur': sol_porteur,
+                        'zone_sismique': zone_sismique,
+                        'contraintes_particulieres': contraintes_particulieres,
+                        'normes_requises': normes_str,
+                        'services_demandes': services_demandes,
+                        'calculs_requis': ', '.join(calculs_requis) if calculs_requis else '',
+                        'plans_requis': ', '.join(plans_requis) if plans_requis else '',
+                        'surveillance_chantier': surveillance_chantier,
+                        'certification_requise': certification_requise,
+                        'budget_structure': budget_structure,
+                        'budget_ingenieur': budget_ingenieur,
+                        'date_debut_souhaite': date_debut_souhaite,
+                        'date_livraison_souhaite': date_livraison_souhaite,
+                        'niveau_urgence': niveau_urgence,
+                        'modalite_paiement': 'forfait',
+                        'analyse_sismique': analyse_sismique,
+                        'analyse_vent': analyse_vent,
+                        'analyse_neige': analyse_neige,
+                        'analyse_dynamique': analyse_dynamique,
+                        'modelisation_3d': modelisation_3d
+                    }
+                    
+                    # Encoder les fichiers
+                    if plans_architecte:
+                        demande_data['plans_architecte'] = encoder_fichiers_ingenieur(plans_architecte)
+                    if etude_sol:
+                        demande_data['etude_sol'] = encoder_fichiers_ingenieur([etude_sol])
+                    if photos_existant:
+                        demande_data['photos_existant'] = encoder_fichiers_ingenieur(photos_existant)
+                    
+                    # Créer la demande
+                    numero_ref = creer_demande_ingenieur(demande_data)
+                    
+                    if numero_ref:
+                        st.success(f"""
+                        ✅ **Demande créée avec succès!**
+                        
+                        **Numéro de référence : {numero_ref}**
+                        
+                        Vous recevrez une réponse dans les 24-48 heures ouvrables.
+                        
+                        **Prochaines étapes:**
+                        1. Analyse technique de votre demande
+                        2. Contact d'un ingénieur OIQ pour validation
+                        3. Proposition détaillée avec méthodologie
+                        4. Début des calculs après acceptation
+                        """)
+                        
+                        st.balloons()
+                    else:
+                        st.error("❌ Erreur lors de la création de la demande. Veuillez réessayer.")
+    
+    with tab2:
+        st.markdown("### 📋 Suivi de vos demandes d'ingénieur")
+        
+        email_consultation = st.text_input(
+            "Entrez votre email pour consulter vos demandes",
+            placeholder="contact@entreprise.com"
+        )
+        
+        if st.button("🔍 Rechercher mes demandes"):
+            if email_consultation:
+                demandes = get_demandes_ingenieur_client(email_consultation)
+                
+                if demandes:
+                    st.success(f"✅ {len(demandes)} demande(s) trouvée(s)")
+                    
+                    for demande in demandes:
+                        with st.expander(f"🔧 {demande['numero_reference']} - {demande['type_structure'].title()}"):
+                            col1, col2, col3 = st.columns(3)
+                            
+                            with col1:
+                                st.markdown(f"**Type:** {demande['type_structure'].title()}")
+                                if demande['superficie_projet']:
+                                    st.markdown(f"**Superficie:** {demande['superficie_projet']:,.0f} pi²")
+                                st.markdown(f"**Ville:** {demande['ville']}")
+                                st.markdown(f"**Services:** {demande['services_demandes'].title()}")
+                            
+                            with col2:
+                                statut_emoji = {
+                                    'recue': '📨', 'analyse': '🔍', 'acceptee': '✅',
+                                    'calculs': '🧮', 'plans': '📐', 'revision': '📝',
+                                    'terminee': '✔️'
+                                }.get(demande['statut'], '📋')
+                                
+                                st.markdown(f"**Statut:** {statut_emoji} {demande['statut'].replace('_', ' ').title()}")
+                                st.markdown(f"**Prix:** {demande['prix_service']:,.2f}$")
+                                if demande['pourcentage_complete']:
+                                    st.progress(demande['pourcentage_complete'] / 100)
+                                    st.caption(f"Progression: {demande['pourcentage_complete']}%")
+                            
+                            with col3:
+                                st.markdown(f"**Date demande:** {demande['date_demande'][:10] if demande['date_demande'] else 'N/A'}")
+                                st.markdown(f"**Livraison prévue:** {demande['date_livraison_souhaite'] if demande['date_livraison_souhaite'] else 'À déterminer'}")
+                            
+                            st.markdown("---")
+                            st.markdown(f"**Description:** {demande['usage_structure']}")
+                            
+                            # Téléchargement des documents si disponibles
+                            documents_disponibles = []
+                            if demande['calculs_structures']:
+                                documents_disponibles.append(("Calculs structuraux", demande['calculs_structures'], "Calculs"))
+                            if demande['plans_structures']:
+                                documents_disponibles.append(("Plans structuraux", demande['plans_structures'], "Plans"))
+                            
+                            if documents_disponibles:
+                                st.markdown("### 📥 Documents disponibles")
+                                for nom, contenu, type_doc in documents_disponibles:
+                                    st.download_button(
+                                        f"⬇️ Télécharger {nom}",
+                                        data=fichier_servi('livrable_ingenieur', contenu),
+                                        file_name=f"{type_doc}_{demande['numero_reference']}.pdf",
+                                        mime="application/pdf"
+                                    )
+                else:
+                    st.info("❌ Aucune demande trouvée pour cet email")
+            else:
+                st.warning("⚠️ Veuillez entrer votre email")
+    
+    with tab3:
+        st.markdown("""
+        ### ℹ️ Informations sur le service d'ingénieur en structure
+        
+        #### 🔧 Quand faire appel à un ingénieur en structure au Québec?
+        
+        Un ingénieur en structure est **obligatoire** pour:
+        
+        - **Modifications structurales** : Retrait de murs porteurs, ouvertures dans dalles
+        - **Nouvelles constructions** : Calculs de charpente et fondations
+        - **Agrandissements** : Extensions, surélévations
+        - **Structures spécialisées** : Ponts, structures industrielles
+        - **Réparations majeures** : Renforcement, reprise en sous-œuvre
+        
+        #### 💰 Structure de prix typique
+        
+        | Type de projet | Prix de base | Prix/pi² | Services |
+        |----------------|--------------|----------|----------|
+        | Bâtiment < 5,000 pi² | 8,000$ | 0.80$ | Calculs de base |
+        | Bâtiment 5,000-15,000 pi² | 12,000$ | 0.65$ | Calculs détaillés |
+        | Bâtiment 15,000-50,000 pi² | 18,000$ | 0.50$ | Analyse complète |
+        | Bâtiment > 50,000 pi² | 25,000$ | 0.40$ | Gestion projet |
+        | Industriel | 15,000$ | 0.75$ | Spécialisé |
+        | Autre (pont, fondation) | 20,000$ | 1.00$ | Sur mesure |
+        
+        **Ajustements de services:**
+        - Calculs seulement : Prix de base
+        - Calculs + Plans : +40%
+        - Service complet + Surveillance : +80%
+        
+        **Analyses spécialisées:**
+        - Analyse sismique : +15¢/pi²
+        - Analyse dynamique : +20¢/pi²
+        - Modélisation 3D : +10¢/pi²
+        - Surveillance chantier : +25¢/pi²
+        
+        #### 📋 Livrables typiques
+        
+        **Calculs structuraux:**
+        - Note de calculs détaillée
+        - Vérifications CNB et normes CSA
+        - Recommandations techniques
+        
+        **Plans structuraux:**
+        - Plans de fondation
+        - Plans de charpente
+        - Détails de connexions
+        - Coupes et sections
+        
+        **Surveillance (optionnel):**
+        - Visites de chantier
+        - Vérification conformité
+        - Rapports d'avancement
+        
+        #### ⏱️ Délais typiques
+        
+        - **Projets simples** : 5-10 jours ouvrables
+        - **Projets moyens** : 2-3 semaines
+        - **Projets complexes** : 3-6 semaines
+        - **Révisions** : 3-5 jours ouvrables
+        
+        #### 📞 Support technique
+        
+        Pour toute question sur le service d'ingénieur:
+        - 📧 structure@seaop.ca
+        - 📞 1-800-SEAOP-QC
+        - 💬 Chat technique disponible
+        
+        #### 🏗️ Matériaux supportés
+        
+        - **Béton armé** : Dalles, poutres, colonnes, murs
+        - **Charpente acier** : Poutres IPE/HEA, connexions boulonnées/soudées
+        - **Charpente bois** : Bois d'œuvre, bois lamellé-collé, CLT
+        - **Maçonnerie** : Murs porteurs, linteaux, renforcements
+        - **Mixte** : Combinaisons de matériaux
+        """)
+
+# === PAGES POUR LOGICIELS PROFESSIONNELS ===
+
+def page_experts_ia():
+    """Page dédiée à EXPERTS IA"""
+    st.markdown("""
+    <div class="main-header">
+        <h1>🧠 EXPERTS IA - 60+ Experts Construction</h1>
+        <p>L'Assistant IA le Plus Avancé de la Construction Québécoise</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    ## 🏆 Fonctionnalités révolutionnaires
+    
+    ✨ **60+ profils d'experts spécialisés** (2,400+ années d'expérience)
+    - **Entrepreneur Général, Architecte, Électricien CMEQ, Plombier CMMTQ**
+    - **Assistant IA adaptatif** qui sélectionne l'expert optimal
+    - **Calculs techniques automatiques** (poutres, colonnes, linteaux)
+    - **Conformité RBQ/CCQ** automatique
+    
+    ## 🎯 Parfait pour vos appels d'offres SEAOP
+    - Validation technique de vos projets
+    - Estimations ultra-précises par expert
+    - Conseils réglementaires spécialisés
+    - Optimisation coûts et délais
+    """)
+    
+    st.info("""
+    💼 **Installation & Support EXPERTS IA**
+    
+    Pour l'installation et la configuration personnalisée d'EXPERTS IA :
+    - 📧 **Email** : info@constructoai.ca
+    - 📱 **Téléphone** : 514-820-1972
+    - 💬 **Support 24/7** via l'application
+    """)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.link_button("🚀 **Accéder à EXPERTS IA**", "https://experts-ai.constructoai.ca/", use_container_width=True, type="primary")
+    with col2:
+        if st.button("📚 **Documentation**", use_container_width=True):
+            st.markdown("**[→ Guide d'utilisation](https://experts-ai.constructoai.ca/docs)**")
+
+def page_takeoff_ai():
+    """Page dédiée à TAKEOFF AI"""
+    st.markdown("""
+    <div class="main-header">
+        <h1>📐 TAKEOFF AI - Estimation de Construction</h1>
+        <p>Calculs précis de matériaux et coûts</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    ## 🎯 Optimisé pour l'industrie québécoise
+    
+    ✨ **Calculs automatiques précis**
+    - **Matériaux** : Béton, acier, bois selon normes CSA/BNQ
+    - **Main-d'œuvre** : Tarifs CCQ actualisés
+    - **Équipements** : Location et utilisation optimisées
+    - **Conformité** : Codes du bâtiment québécois
+    
+    ## 🏗️ Fonctionnalités avancées
+    - Import plans PDF/DWG pour mesures automatiques
+    - Base de données prix matériaux temps réel
+    - Génération rapports détaillés
+    - Intégration avec SEAOP pour soumissions
+    """)
+    
+    st.info("""
+    💼 **Installation & Support TAKEOFF AI**
+    
+    Pour l'installation et la configuration personnalisée :
+    - 📧 **Email** : info@constructoai.ca
+    - 📱 **Téléphone** : 514-820-1972
+    - 💬 **Formation** personnalisée incluse
+    """)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.link_button("🚀 **Accéder à TAKEOFF AI**", "https://takeoff-ai.constructoai.ca/", use_container_width=True, type="primary")
+    with col2:
+        if st.button("📊 **Exemples d'estimations**", use_container_width=True):
+            st.markdown("**[→ Voir les démos](https://takeoff-ai.constructoai.ca/demo)**")
+
+def page_erp_ai():
+    """Page dédiée à ERP AI"""
+    st.markdown("""
+    <div class="main-header">
+        <h1>📊 ERP AI - Gestion de Projets Construction</h1>
+        <p>ERP Spécialisé Construction avec 24 Étapes de Chantier</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    ## 🏗️ Fonctionnalités construction québécoise
+    
+    ✨ **Gestion complète de chantier**
+    - **24 étapes de construction** (excavation → livraison)
+    - **Bons de Travail (BT)** avec traçabilité complète
+    - **TimeTracker chantier** temps réel
+    - **Multi-vues** : Dashboard, Kanban, Gantt, Calendrier
+    
+    ## 🎯 Parfait pour projets attribués SEAOP
+    - Gestion complète de vos chantiers
+    - Suivi progression par étape construction
+    - Conformité RBQ/CCQ automatique
+    - Pointage employés et sous-traitants
+    - Livraison dans les délais contractuels
+    
+    ## 🚀 Modules spécialisés
+    - **CRM construction** et gestion RH spécialisée
+    - **Inventaire matériaux** avec normes CSA/BNQ
+    - **Assistant IA** pour la gestion de vos projets
+    """)
+    
+    st.info("""
+    💼 **Installation & Support ERP AI**
+    
+    Pour l'installation et la configuration personnalisée d'ERP AI :
+    - 📧 **Email** : info@constructoai.ca
+    - 📱 **Téléphone** : 514-820-1972
+    - 🏗️ **Formation** sur site incluse
+    - 💻 **Personnalisation** selon vos processus
+    """)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.link_button("🚀 **Accéder à ERP AI**", "https://erp-ai.constructoai.ca/", use_container_width=True, type="primary")
+    with col2:
+        if st.button("📚 **Documentation**", use_container_width=True):
+            st.markdown("**[→ Guide d'utilisation](https://erp-ai.constructoai.ca/docs)**")
+
+# Pages tracées comme spans de chaque rerun
+instrumenter_fonctions(globals(), ('page_', 'get_'))
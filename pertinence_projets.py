@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classement des projets par pertinence pour un entrepreneur SEAOP
+
+Les caractéristiques des projets ouverts (type, zone, urgence, échéance,
+nombre de soumissions) sont gardées en mémoire sous forme de matrice NumPy.
+La matrice est complétée de façon incrémentale : à chaque consultation, seuls
+les projets et les soumissions créés depuis le dernier chargement sont lus
+(filigranes sur les ids). Elle est rechargée entièrement à intervalle
+régulier pour suivre les fermetures et les changements d'urgence.
+
+Le score d'un entrepreneur est calculé pour tous les projets d'un coup, puis
+seuls les K meilleurs sont triés (sélection partielle np.partition).
+"""
+
+import sqlite3
+import datetime
+import os
+import threading
+import time
+from typing import Optional, List, Dict, Tuple, Iterable
+
+import numpy as np
+
+from appariement_leads import extraire_zones, extraire_types, TOUTES
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Pondération des composantes du score (chacune entre 0 et 1)
+POIDS_PERTINENCE = {
+    'type': 0.35,         # Type de projet offert par l'entrepreneur
+    'zone': 0.25,         # Projet dans ses zones (1), dans sa région (0,5)
+    'urgence': 0.15,      # Niveau d'urgence du projet
+    'echeance': 0.15,     # Proximité de la date limite des soumissions
+    'concurrence': 0.10,  # Peu de soumissions déjà reçues
+}
+
+SCORES_URGENCE = {'critique': 1.0, 'eleve': 0.66, 'normal': 0.33, 'faible': 0.0}
+
+# Demi-vie (jours) de l'attrait d'une échéance : 14 jours restants valent 0,5
+DEMI_VIE_ECHEANCE = 14.0
+
+# Délai (secondes) avant un rechargement complet de la matrice
+DUREE_VIE_MATRICE = 300
+
+class _Vocabulaire:
+    """Codes entiers stables attribués aux valeurs textuelles (types, RTA, régions)"""
+
+    def __init__(self):
+        self.codes = {}
+
+    def coder(self, valeurs: Iterable[str]) -> np.ndarray:
+        codes = self.codes
+        return np.array([codes.setdefault(v, len(codes)) for v in valeurs], dtype=np.int32)
+
+    def masque(self, valeurs: Iterable[str]) -> np.ndarray:
+        """Tableau booléen indexé par code : vrai pour les valeurs données"""
+        masque = np.zeros(len(self.codes), dtype=bool)
+        for v in valeurs:
+            if v in self.codes:
+                masque[self.codes[v]] = True
+        return masque
+
+class _MatriceProjets:
+    """Caractéristiques des projets ouverts, une ligne par projet (ids croissants)"""
+
+    def __init__(self):
+        self.types = _Vocabulaire()
+        self.rta = _Vocabulaire()
+        self.regions = _Vocabulaire()
+        self.ids = np.empty(0, dtype=np.int64)
+        self.code_type = np.empty(0, dtype=np.int32)
+        self.code_rta = np.empty(0, dtype=np.int32)
+        self.code_region = np.empty(0, dtype=np.int32)
+        self.urgence = np.empty(0, dtype=np.float64)
+        self.echeance = np.empty(0, dtype='datetime64[D]')
+        self.nb_soumissions = np.empty(0, dtype=np.float64)
+        self.dernier_lead = 0
+        self.derniere_soumission = 0
+        self.date_chargement = 0.0
+
+    def ajouter_projets(self, lignes: List[tuple]):
+        """Ajoute des projets (id, type_projet, code_postal, niveau_urgence, date_limite, nb_soumissions)"""
+        if not lignes:
+            return
+        colonnes = list(zip(*lignes))
+        codes_postaux = [(cp or '').upper().replace(' ', '') for cp in colonnes[2]]
+        self.ids = np.concatenate([self.ids, np.array(colonnes[0], dtype=np.int64)])
+        self.code_type = np.concatenate([self.code_type, self.types.coder(t or '' for t in colonnes[1])])
+        self.code_rta = np.concatenate([self.code_rta, self.rta.coder(cp[:3] for cp in codes_postaux)])
+        self.code_region = np.concatenate([self.code_region, self.regions.coder(cp[:1] for cp in codes_postaux)])
+        self.urgence = np.concatenate([
+            self.urgence, np.array([SCORES_URGENCE.get(u, SCORES_URGENCE['normal']) for u in colonnes[3]])
+        ])
+        self.echeance = np.concatenate([self.echeance, np.array(
+            [_date_ou_nat(d) for d in colonnes[4]], dtype='datetime64[D]'
+        )])
+        self.nb_soumissions = np.concatenate([self.nb_soumissions, np.array(colonnes[5], dtype=np.float64)])
+        self.dernier_lead = max(self.dernier_lead, int(self.ids[-1]))
+
+    def compter_soumissions(self, lignes: List[tuple]):
+        """Ajoute les nouvelles soumissions (lead_id, nombre) aux projets connus"""
+        if not lignes or not len(self.ids):
+            return
+        lead_ids = np.array([l[0] for l in lignes], dtype=np.int64)
+        nombres = np.array([l[1] for l in lignes], dtype=np.float64)
+        positions = np.searchsorted(self.ids, lead_ids)
+        connus = (positions < len(self.ids)) & (self.ids[np.minimum(positions, len(self.ids) - 1)] == lead_ids)
+        np.add.at(self.nb_soumissions, positions[connus], nombres[connus])
+
+def _date_ou_nat(valeur: Optional[str]):
+    try:
+        return np.datetime64(str(valeur)[:10], 'D')
+    except (TypeError, ValueError):
+        return np.datetime64('NaT')
+
+_matrices: Dict[str, _MatriceProjets] = {}
+_verrou = threading.Lock()
+
+_CONDITION_OUVERT = "l.visible_entrepreneurs = 1 AND l.accepte_soumissions = 1"
+
+def _charger_projets(cursor: sqlite3.Cursor, apres_id: int) -> List[tuple]:
+    cursor.execute(f'''
+        SELECT l.id, l.type_projet, l.code_postal, l.niveau_urgence, l.date_limite_soumissions,
+               (SELECT COUNT(*) FROM soumissions s WHERE s.lead_id = l.id)
+        FROM leads l
+        WHERE {_CONDITION_OUVERT} AND l.id > ?
+        ORDER BY l.id
+    ''', (apres_id,))
+    return cursor.fetchall()
+
+def get_matrice_projets() -> _MatriceProjets:
+    """Matrice des projets ouverts, complétée des projets et soumissions arrivés depuis le dernier appel"""
+    with _verrou:
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        try:
+            # Lecture cohérente des filigranes et des projets
+            cursor.execute('BEGIN')
+            matrice = _matrices.get(DATABASE_PATH)
+            if matrice is None or time.time() - matrice.date_chargement > DUREE_VIE_MATRICE:
+                matrice = _MatriceProjets()
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM soumissions")
+                matrice.derniere_soumission = cursor.fetchone()[0]
+                matrice.ajouter_projets(_charger_projets(cursor, 0))
+                matrice.date_chargement = time.time()
+                _matrices[DATABASE_PATH] = matrice
+                return matrice
+
+            # Soumissions d'abord : les nouveaux projets sont chargés avec leur compte à jour
+            cursor.execute('''
+                SELECT lead_id, COUNT(*), MAX(id) FROM soumissions WHERE id > ? GROUP BY lead_id
+            ''', (matrice.derniere_soumission,))
+            nouvelles = cursor.fetchall()
+            matrice.compter_soumissions(nouvelles)
+            if nouvelles:
+                matrice.derniere_soumission = max(l[2] for l in nouvelles)
+            matrice.ajouter_projets(_charger_projets(cursor, matrice.dernier_lead))
+            return matrice
+        finally:
+            conn.close()
+
+def invalider_matrice_projets():
+    """Force un rechargement complet (projet fermé ou retiré, soumission supprimée)"""
+    with _verrou:
+        _matrices.pop(DATABASE_PATH, None)
+
+def calculer_scores(matrice: _MatriceProjets, zones_desservies: Optional[str], types_projets: Optional[str],
+                    aujourd_hui: Optional[datetime.date] = None) -> np.ndarray:
+    """Score de pertinence de chaque projet de la matrice pour un profil d'entrepreneur"""
+    zones = extraire_zones(zones_desservies)
+    types = extraire_types(types_projets)
+    nombre = len(matrice.ids)
+
+    if TOUTES in types:
+        score_type = np.ones(nombre)
+    else:
+        score_type = matrice.types.masque(types)[matrice.code_type].astype(np.float64)
+
+    if TOUTES in zones:
+        score_zone = np.ones(nombre)
+    else:
+        dans_zone = matrice.rta.masque(z for z in zones if len(z) == 3)[matrice.code_rta]
+        regions = matrice.regions.masque({z[0] for z in zones})[matrice.code_region]
+        # Régions entières desservies (« H ») : le projet est dans une zone desservie
+        dans_zone |= matrice.regions.masque(z for z in zones if len(z) == 1)[matrice.code_region]
+        score_zone = np.where(dans_zone, 1.0, np.where(regions, 0.5, 0.0))
+
+    aujourd_hui = np.datetime64(aujourd_hui or datetime.date.today(), 'D')
+    jours = (matrice.echeance - aujourd_hui).astype(np.float64)
+    with np.errstate(invalid='ignore'):
+        score_echeance = np.where(jours >= 0, np.exp2(-np.maximum(jours, 0.0) / DEMI_VIE_ECHEANCE), 0.0)
+    score_echeance[np.isnan(jours)] = 0.0
+
+    score_concurrence = 1.0 / (1.0 + matrice.nb_soumissions)
+
+    return (POIDS_PERTINENCE['type'] * score_type
+            + POIDS_PERTINENCE['zone'] * score_zone
+            + POIDS_PERTINENCE['urgence'] * matrice.urgence
+            + POIDS_PERTINENCE['echeance'] * score_echeance
+            + POIDS_PERTINENCE['concurrence'] * score_concurrence)
+
+def selectionner_meilleurs(ids: np.ndarray, scores: np.ndarray, k: Optional[int]) -> List[Tuple[int, float]]:
+    """Les k meilleurs (id, score), par score décroissant puis projet le plus récent"""
+    if k is not None and k <= 0:
+        return []
+    if k is not None and k < len(scores):
+        # Score du k-ième : tout ce qui le dépasse est retenu, les ex aequo au plus récent
+        seuil = -np.partition(-scores, k - 1)[k - 1]
+        au_dessus = np.flatnonzero(scores > seuil)
+        ex_aequo = np.flatnonzero(scores == seuil)
+        ex_aequo = ex_aequo[np.argsort(-ids[ex_aequo])][:k - len(au_dessus)]
+        retenus = np.concatenate([au_dessus, ex_aequo])
+    else:
+        retenus = np.arange(len(scores))
+    ordre = retenus[np.lexsort((-ids[retenus], -scores[retenus]))]
+    return list(zip(ids[ordre].tolist(), scores[ordre].tolist()))
+
+def classer_projets(zones_desservies: Optional[str], types_projets: Optional[str],
+                    ids_candidats: Optional[Iterable[int]] = None,
+                    k: Optional[int] = None) -> List[Tuple[int, Optional[float]]]:
+    """
+    Classe les projets ouverts pour un entrepreneur.
+
+    ids_candidats restreint le classement (ex. résultat des filtres de
+    recherche) ; k limite le résultat aux k projets les plus pertinents.
+    Un candidat absent de la matrice (projet rouvert ou rendu visible depuis
+    son chargement) la fait recharger ; s'il reste absent, il est placé après
+    les projets classés, sans score.
+    """
+    matrice = get_matrice_projets()
+    candidats = None
+    if ids_candidats is not None:
+        candidats = np.fromiter(ids_candidats, dtype=np.int64)
+        if not np.isin(candidats, matrice.ids).all():
+            invalider_matrice_projets()
+            matrice = get_matrice_projets()
+    scores = calculer_scores(matrice, zones_desservies, types_projets)
+    ids = matrice.ids
+    if candidats is None:
+        return selectionner_meilleurs(ids, scores, k)
+
+    retenus = np.isin(ids, candidats)
+    classement = selectionner_meilleurs(ids[retenus], scores[retenus], k)
+    absents = candidats[~np.isin(candidats, ids)].tolist()
+    places = len(absents) if k is None else max(k - len(classement), 0)
+    return classement + [(projet_id, None) for projet_id in absents[:places]]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Présence dans le Chat Room SEAOP
+
+Chaque affichage du chat signale l'utilisateur comme en ligne. Plutôt qu'une
+écriture par affichage, les battements sont tenus en mémoire dans un
+registre partagé par les sessions du processus :
+- battement() met à jour la mémoire seulement ;
+- la tâche de fond persiste les battements reçus depuis la dernière fois
+  (au plus tous les DELAI_PERSISTANCE secondes, une ligne par utilisateur)
+  dans chat_room_online et relit les utilisateurs des autres processus ;
+- en_ligne() fusionne la mémoire et cette dernière lecture, sans requête ;
+- purger_presence() supprime les lignes sorties de la fenêtre en ligne.
+last_seen garde le format de CURRENT_TIMESTAMP (UTC), indexé et comparé
+directement à une borne calculée.
+"""
+
+import calendar
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from base_donnees import connecter_lecture, executer_ecriture
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Un utilisateur est en ligne s'il a donné signe de vie dans cette fenêtre (secondes)
+FENETRE_EN_LIGNE = 300
+
+# Intervalle de persistance des battements (tâche de fond)
+DELAI_PERSISTANCE = 5
+
+FORMAT_DATE = '%Y-%m-%d %H:%M:%S'
+
+_bases_pretes = set()
+_registres: Dict[str, 'RegistrePresence'] = {}
+_verrou_registres = threading.Lock()
+
+def assurer_table_presence(chemin: Optional[str] = None):
+    """Crée la table de présence et son index sur last_seen"""
+    chemin = chemin or DATABASE_PATH
+    if chemin in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chat_room_online (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_type TEXT NOT NULL,
+                user_name TEXT NOT NULL,
+                user_email TEXT NOT NULL,
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                is_typing BOOLEAN DEFAULT 0,
+                UNIQUE(user_email)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_chatroom_online ON chat_room_online(last_seen)')
+        conn.commit()
+        _bases_pretes.add(chemin)
+    except Exception as e:
+        print(f"Erreur lors de la création de la table de présence: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def _date_sql(instant: float) -> str:
+    return time.strftime(FORMAT_DATE, time.gmtime(instant))
+
+def _instant(date_sql: str) -> float:
+    try:
+        return float(calendar.timegm(time.strptime(date_sql[:19], FORMAT_DATE)))
+    except (TypeError, ValueError):
+        return 0.0
+
+class RegistrePresence:
+    """Présence des utilisateurs du chat : mémoire du processus, persistée par lots"""
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self._verrou = threading.Lock()
+        # courriel -> (type, nom, instant du dernier battement)
+        self._presences: Dict[str, Tuple[str, str, float]] = {}
+        self._a_persister = set()
+        # Utilisateurs lus dans la table à la dernière persistance (tous processus)
+        self._lus: Dict[str, Tuple[str, str, float]] = {}
+
+    def battement(self, user_type: str, user_name: str, user_email: str, maintenant: Optional[float] = None):
+        """Signale l'utilisateur en ligne (mémoire seulement)"""
+        maintenant = time.time() if maintenant is None else maintenant
+        with self._verrou:
+            self._presences[user_email] = (user_type, user_name, maintenant)
+            self._a_persister.add(user_email)
+
+    def en_ligne(self, limite: int = 20, maintenant: Optional[float] = None) -> List[Tuple[str, str, str]]:
+        """(type, nom, courriel) des utilisateurs en ligne, le plus récent d'abord"""
+        maintenant = time.time() if maintenant is None else maintenant
+        with self._verrou:
+            presences = dict(self._lus)
+            for email, presence in self._presences.items():
+                if email not in presences or presence[2] > presences[email][2]:
+                    presences[email] = presence
+        recents = sorted(((p[2], email, p) for email, p in presences.items()
+                          if p[2] > maintenant - FENETRE_EN_LIGNE), reverse=True)
+        return [(p[0], p[1], email) for _, email, p in recents[:limite]]
+
+    def persister(self, maintenant: Optional[float] = None) -> int:
+        """Écrit les battements reçus depuis la dernière persistance ; retourne le nombre de lignes"""
+        maintenant = time.time() if maintenant is None else maintenant
+        assurer_table_presence(self.chemin)
+        with self._verrou:
+            lignes = [(p[0], p[1], email, _date_sql(p[2]))
+                      for email, p in self._presences.items() if email in self._a_persister]
+            self._a_persister.clear()
+            # La mémoire ne garde que la fenêtre en ligne
+            self._presences = {e: p for e, p in self._presences.items() if p[2] > maintenant - FENETRE_EN_LIGNE}
+
+        if lignes:
+            try:
+                executer_ecriture(_ecrire_presences, lignes, chemin=self.chemin)
+            except Exception as e:
+                print(f"Erreur lors de la persistance de la présence: {e}")
+                with self._verrou:
+                    self._a_persister.update(l[2] for l in lignes)
+                return 0
+
+        conn = connecter_lecture(self.chemin)
+        try:
+            lus = conn.execute('''
+                SELECT user_email, user_type, user_name, last_seen FROM chat_room_online
+                WHERE last_seen > ?
+            ''', (_date_sql(maintenant - FENETRE_EN_LIGNE),)).fetchall()
+        finally:
+            conn.close()
+        with self._verrou:
+            self._lus = {email: (user_type, user_name, _instant(last_seen))
+                         for email, user_type, user_name, last_seen in lus}
+        return len(lignes)
+
+def _ecrire_presences(cursor: sqlite3.Cursor, lignes: List[Tuple[str, str, str, str]]):
+    """Opération d'écriture : une ligne par utilisateur, sans reculer un last_seen plus récent"""
+    cursor.executemany('''
+        INSERT INTO chat_room_online (user_type, user_name, user_email, last_seen)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_email) DO UPDATE SET
+            user_type = excluded.user_type,
+            user_name = excluded.user_name,
+            last_seen = excluded.last_seen
+        WHERE excluded.last_seen > chat_room_online.last_seen
+    ''', lignes)
+
+def get_registre_presence(chemin: Optional[str] = None) -> RegistrePresence:
+    """Registre de présence de la base, partagé par les sessions du processus"""
+    chemin = chemin or DATABASE_PATH
+    with _verrou_registres:
+        if chemin not in _registres:
+            _registres[chemin] = RegistrePresence(chemin)
+        return _registres[chemin]
+
+def persister_presence() -> int:
+    """Tâche de fond : persiste les battements du registre de la base"""
+    return get_registre_presence(DATABASE_PATH).persister()
+
+def purger_presence(maintenant: Optional[float] = None) -> int:
+    """Tâche de fond : supprime les présences sorties de la fenêtre en ligne ; retourne leur nombre"""
+    maintenant = time.time() if maintenant is None else maintenant
+    assurer_table_presence(DATABASE_PATH)
+    return executer_ecriture(
+        lambda cursor: cursor.execute('DELETE FROM chat_room_online WHERE last_seen <= ?',
+                                      (_date_sql(maintenant - FENETRE_EN_LIGNE),)).rowcount,
+        chemin=DATABASE_PATH
+    )
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profilage à la demande des pages SEAOP
+
+Quand une page est lente en production, l'administrateur arme le profilage
+des N prochains reruns d'une page du routeur de main() (panel
+d'administration, ou ?profiler=N sur la page elle-même une fois connecté
+comme administrateur). Deux modes :
+- cprofile : cProfile sur le fil du rerun ; fichier .prof (pstats,
+  snakeviz...) avec nombre d'appels et temps propre et cumulé par fonction ;
+- echantillonnage : un fil relève la pile du rerun toutes les
+  INTERVALLE_ECHANTILLON secondes ; fichier .collapsed (une ligne par pile,
+  format flamegraph.pl / speedscope), sans ralentir les appels courts.
+
+Les fichiers sont écrits dans DATA_DIR/profils (les FICHIERS_CONSERVES plus
+récents sont gardés). Un seul rerun est profilé à la fois dans le processus :
+les autres s'exécutent normalement et le compteur n'est pas décrémenté.
+
+Usage :
+    armer_profilage('entrepreneur', reruns=3, mode='echantillonnage')
+    with profiler_page(st.session_state.page):
+        page_espace_entrepreneur()
+    top_fonctions(lister_profils()[0]['fichier'])
+"""
+
+import cProfile
+import datetime
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DOSSIER_PROFILS = os.path.join(DATA_DIR, 'profils')
+
+MODES = ['cprofile', 'echantillonnage']
+EXTENSIONS = {'cprofile': '.prof', 'echantillonnage': '.collapsed'}
+
+# Période d'échantillonnage de la pile (secondes)
+INTERVALLE_ECHANTILLON = 0.002
+
+# Profils gardés dans le dossier, les plus récents
+FICHIERS_CONSERVES = 50
+
+# Reruns profilés au plus par armement
+RERUNS_MAX = 20
+
+_armements: Dict[str, Dict] = {}
+_verrou = threading.Lock()
+_profilage_en_cours = threading.Lock()
+
+def armer_profilage(page: str, reruns: int = 1, mode: str = 'cprofile'):
+    """Profile les prochains reruns de la page (tous utilisateurs du processus confondus)"""
+    if mode not in MODES:
+        raise ValueError(f"Mode de profilage inconnu : {mode}")
+    with _verrou:
+        _armements[page] = {'reruns': max(1, min(int(reruns), RERUNS_MAX)), 'mode': mode,
+                            'depuis': datetime.datetime.now().isoformat(sep=' ', timespec='seconds')}
+
+def desarmer_profilage(page: str):
+    with _verrou:
+        _armements.pop(page, None)
+
+def get_armements() -> Dict[str, Dict]:
+    """Pages armées : reruns restants, mode et date d'armement"""
+    with _verrou:
+        return {page: dict(armement) for page, armement in _armements.items()}
+
+def _prendre(page: str) -> Optional[str]:
+    """Mode de profilage de ce rerun, ou None ; décompte le rerun pris"""
+    with _verrou:
+        armement = _armements.get(page)
+        if armement is None or not _profilage_en_cours.acquire(blocking=False):
+            return None
+        armement['reruns'] -= 1
+        if armement['reruns'] <= 0:
+            del _armements[page]
+        return armement['mode']
+
+def _nom_cadre(cadre) -> str:
+    code = cadre.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+class _Echantillonneur:
+    """Fil qui relève périodiquement la pile d'un autre fil"""
+
+    def __init__(self, ident: int):
+        self.ident = ident
+        self.piles: Counter = Counter()
+        self._arret = threading.Event()
+        self._fil = threading.Thread(target=self._boucle, name='seaop-profilage', daemon=True)
+
+    def _boucle(self):
+        while not self._arret.wait(INTERVALLE_ECHANTILLON):
+            cadre = sys._current_frames().get(self.ident)
+            pile = []
+            while cadre is not None:
+                pile.append(_nom_cadre(cadre))
+                cadre = cadre.f_back
+            if pile:
+                self.piles[';'.join(reversed(pile))] += 1
+
+    def __enter__(self):
+        self._fil.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._arret.set()
+        self._fil.join()
+
+class profiler_page:
+    """Bloc with du routage d'une page : profilé si la page est armée, sans effet sinon"""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.mode = None
+
+    def __enter__(self):
+        self.mode = _prendre(self.page)
+        if self.mode == 'cprofile':
+            self._profil = cProfile.Profile()
+            self._profil.enable()
+        elif self.mode == 'echantillonnage':
+            self._echantillonneur = _Echantillonneur(threading.get_ident()).__enter__()
+        self._debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.mode is None:
+            return False
+        duree = time.perf_counter() - self._debut
+        try:
+            if self.mode == 'cprofile':
+                self._profil.disable()
+            else:
+                self._echantillonneur.__exit__()
+            self._enregistrer(duree)
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement du profil de la page {self.page}: {e}")
+        finally:
+            _profilage_en_cours.release()
+        return False
+
+    def _enregistrer(self, duree: float):
+        os.makedirs(DOSSIER_PROFILS, exist_ok=True)
+        horodatage = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        fichier = os.path.join(DOSSIER_PROFILS, f"{horodatage}_{self.page}_{int(duree * 1000)}ms"
+                                                + EXTENSIONS[self.mode])
+        if self.mode == 'cprofile':
+            self._profil.dump_stats(fichier)
+        else:
+            with open(fichier, 'w', encoding='utf-8') as sortie:
+                for pile, nombre in self._echantillonneur.piles.most_common():
+                    sortie.write(f"{pile} {nombre}\n")
+        _purger()
+
+def _purger():
+    """Ne garde que les FICHIERS_CONSERVES profils les plus récents"""
+    for profil in lister_profils()[FICHIERS_CONSERVES:]:
+        try:
+            os.remove(profil['fichier'])
+        except OSError:
+            pass
+
+_MOTIF_FICHIER = re.compile(r'^(\d{8}_\d{6})_\d+_(.+)_(\d+)ms(\.prof|\.collapsed)$')
+
+def lister_profils() -> List[Dict]:
+    """Profils du dossier, les plus récents d'abord : fichier, page, date, durée du rerun, mode"""
+    if not os.path.isdir(DOSSIER_PROFILS):
+        return []
+    profils = []
+    for nom in os.listdir(DOSSIER_PROFILS):
+        correspondance = _MOTIF_FICHIER.match(nom)
+        if not correspondance:
+            continue
+        date, page, duree_ms, extension = correspondance.groups()
+        profils.append({
+            'fichier': os.path.join(DOSSIER_PROFILS, nom),
+            'nom': nom,
+            'page': page,
+            'date': datetime.datetime.strptime(date, '%Y%m%d_%H%M%S').isoformat(sep=' '),
+            'duree_ms': int(duree_ms),
+            'mode': 'cprofile' if extension == '.prof' else 'echantillonnage',
+        })
+    return sorted(profils, key=lambda p: p['nom'], reverse=True)
+
+def top_fonctions(fichier: str, limite: int = 25) -> List[Dict]:
+    """Fonctions par temps cumulé décroissant (secondes pour cProfile, échantillons sinon)"""
+    if fichier.endswith('.prof'):
+        statistiques = pstats.Stats(fichier)
+        lignes = []
+        for (chemin, ligne, fonction), (_, appels, propre, cumule, _) in statistiques.stats.items():
+            lignes.append({
+                'fonction': f"{fonction} ({os.path.basename(chemin)}:{ligne})",
+                'appels': appels,
+                'temps_propre': round(propre, 6),
+                'temps_cumule': round(cumule, 6),
+            })
+        return sorted(lignes, key=lambda l: l['temps_cumule'], reverse=True)[:limite]
+
+    # Pile repliée : une fonction compte une fois par échantillon où elle figure (cumulé),
+    # au sommet de la pile pour le temps propre
+    cumules, propres, total = Counter(), Counter(), 0
+    with open(fichier, encoding='utf-8') as entree:
+        for ligne in entree:
+            pile, _, nombre = ligne.rstrip('\n').rpartition(' ')
+            cadres = pile.split(';')
+            nombre = int(nombre)
+            total += nombre
+            for cadre in set(cadres):
+                cumules[cadre] += nombre
+            propres[cadres[-1]] += nombre
+    return [{
+        'fonction': cadre,
+        'echantillons': nombre,
+        'propre': propres[cadre],
+        'part_cumulee': round(nombre / total, 4) if total else 0.0,
+    } for cadre, nombre in cumules.most_common(limite)]
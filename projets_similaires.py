@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Projets similaires SEAOP (TF-IDF)
+
+Chaque projet est représenté par le vecteur TF-IDF de son type et de sa
+description : accents pliés, mots vides français retirés, tf logarithmique,
+normalisation L2 (le produit scalaire est le cosinus). L'index est construit
+hors ligne dans DATA_DIR/index_similarite/, en tableaux binaires lus par
+np.memmap (rien n'est chargé en mémoire avant d'être lu) :
+- segment principal, construit d'un bloc : vecteurs par projet (CSR) et
+  listes inversées par terme, pour ne parcourir que les projets qui
+  partagent un terme avec la requête ;
+- segment d'ajout : vecteurs des projets publiés depuis, ajoutés en fin de
+  fichier avec le vocabulaire et l'IDF figés à la construction.
+La tâche de fond maintenir_index_similarite complète le segment d'ajout et
+reconstruit l'index (IDF à jour) lorsqu'il vieillit ou que l'ajout grossit.
+"""
+
+import sqlite3
+import glob
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Tuple, Iterable
+
+import numpy as np
+
+from pertinence_projets import selectionner_meilleurs
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+DOSSIER_INDEX = os.path.join(DATA_DIR, 'index_similarite')
+
+# Reconstruction complète après 24 h ou quand l'ajout dépasse 20 % du segment principal
+DUREE_VIE_INDEX = 24 * 3600
+FRACTION_AJOUT_MAX = 0.2
+
+# Un verrou de maintenance plus vieux que ceci est considéré abandonné (secondes)
+DUREE_VERROU = 600
+
+# Mots vides français, sous leur forme sans accents
+MOTS_VIDES = frozenset('''
+    au aux avec ce ces cet cette dans de des du elle en et eux il ils je la le les leur leurs lui ma mais
+    me meme mes moi mon ne nos notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi
+    ton tu un une vos votre vous ceci cela ca ici la sont est etre ete avoir ai as avons avez ont sera
+    seront etait fait faire faut peut doit plus moins tres tout tous toute toutes aussi alors donc car
+    comme si sans sous entre vers chez apres avant depuis pendant encore deja bien afin ainsi autre
+    autres chaque quelque quelques nos dont etc svp merci bonjour besoin souhaite voudrais aimerais
+'''.split())
+
+_FICHIERS = {
+    # nom : type des éléments
+    'ids': np.int64, 'ligne_ptr': np.int64, 'ligne_termes': np.int32, 'ligne_poids': np.float32,
+    'terme_ptr': np.int64, 'terme_lignes': np.int32, 'terme_poids': np.float32, 'idf': np.float64,
+    'ajout_ids': np.int64, 'ajout_ptr': np.int64, 'ajout_termes': np.int32, 'ajout_poids': np.float32,
+}
+
+_index: Dict[str, '_IndexSimilarite'] = {}
+_verrou = threading.Lock()
+
+def normaliser_texte(texte: Optional[str]) -> List[str]:
+    """Termes d'un texte : minuscules, accents pliés, sans mots vides ni nombres"""
+    plie = (texte or '').lower()
+    if not plie.isascii():
+        plie = unicodedata.normalize('NFKD', plie).encode('ascii', 'ignore').decode()
+    return [m for m in re.findall(r'[a-z0-9]+', plie)
+            if len(m) > 1 and not m.isdigit() and m not in MOTS_VIDES]
+
+def texte_projet(type_projet: Optional[str], description: Optional[str]) -> str:
+    return f"{type_projet or ''} {description or ''}"
+
+def vecteur_tfidf(termes: List[str], vocabulaire: Dict[str, int], idf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(indices de termes croissants, poids normalisés L2) ; les termes hors vocabulaire sont ignorés"""
+    comptes = Counter(vocabulaire[t] for t in termes if t in vocabulaire)
+    if not comptes:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    indices = np.array(sorted(comptes), dtype=np.int32)
+    poids = (1.0 + np.log([comptes[i] for i in indices.tolist()])) * idf[indices]
+    return indices, (poids / np.linalg.norm(poids)).astype(np.float32)
+
+def _chemin(generation: int, nom: str) -> str:
+    return os.path.join(DOSSIER_INDEX, f"g{generation}_{nom}.bin")
+
+def _carte(generation: int, nom: str, nombre: int) -> np.ndarray:
+    """Tableau en lecture seule projeté depuis le disque (les nombre premiers éléments)"""
+    if nombre == 0:
+        return np.empty(0, dtype=_FICHIERS[nom])
+    return np.memmap(_chemin(generation, nom), dtype=_FICHIERS[nom], mode='r', shape=(nombre,))
+
+def _ajouter_au_fichier(generation: int, nom: str, tableau: np.ndarray, nombre_valides: int):
+    """Écrit à la suite des nombre_valides premiers éléments : un ajout interrompu est écrasé, meta.json borne la lecture"""
+    taille_valide = nombre_valides * np.dtype(_FICHIERS[nom]).itemsize
+    with open(_chemin(generation, nom), 'r+b') as fichier:
+        fichier.seek(taille_valide)
+        fichier.write(np.ascontiguousarray(tableau, dtype=_FICHIERS[nom]).tobytes())
+
+def _lire_meta() -> Optional[Dict]:
+    try:
+        with open(os.path.join(DOSSIER_INDEX, 'meta.json'), encoding='utf-8') as fichier:
+            return json.load(fichier)
+    except (OSError, ValueError):
+        return None
+
+def _ecrire_meta(meta: Dict):
+    """Remplacement atomique : les lecteurs voient l'ancien ou le nouvel état, jamais un mélange"""
+    temporaire = os.path.join(DOSSIER_INDEX, f"meta.{os.getpid()}.tmp")
+    with open(temporaire, 'w', encoding='utf-8') as fichier:
+        json.dump(meta, fichier)
+    os.replace(temporaire, os.path.join(DOSSIER_INDEX, 'meta.json'))
+
+@contextmanager
+def _verrou_maintenance():
+    """Verrou inter-processus par fichier exclusif ; cède False si un autre processus maintient l'index"""
+    os.makedirs(DOSSIER_INDEX, exist_ok=True)
+    chemin = os.path.join(DOSSIER_INDEX, 'maintenance.lock')
+    try:
+        descripteur = os.open(chemin, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(chemin) < DUREE_VERROU:
+                yield False
+                return
+            os.remove(chemin)
+            descripteur = os.open(chemin, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError:
+            yield False
+            return
+    try:
+        yield True
+    finally:
+        os.close(descripteur)
+        os.remove(chemin)
+
+def _vecteurs_en_csr(vecteurs: List[Tuple[np.ndarray, np.ndarray]], decalage: int = 0):
+    ptr = np.zeros(len(vecteurs) + 1, dtype=np.int64)
+    ptr[1:] = np.cumsum([len(v[0]) for v in vecteurs])
+    termes = np.concatenate([v[0] for v in vecteurs]) if vecteurs else np.empty(0, dtype=np.int32)
+    poids = np.concatenate([v[1] for v in vecteurs]) if vecteurs else np.empty(0, dtype=np.float32)
+    return ptr + decalage, termes, poids
+
+def construire_index() -> Dict[str, int]:
+    """Reconstruit l'index complet (nouvelle génération de fichiers) ; retourne ses dimensions"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, type_projet, description FROM leads ORDER BY id')
+    lignes = cursor.fetchall()
+    conn.close()
+
+    documents = [normaliser_texte(texte_projet(t, d)) for _, t, d in lignes]
+    frequences = Counter()
+    for termes in documents:
+        frequences.update(set(termes))
+    vocabulaire = sorted(frequences)
+    positions = {t: i for i, t in enumerate(vocabulaire)}
+    nombre = len(documents)
+    idf = np.log((1.0 + nombre) / (1.0 + np.array([frequences[t] for t in vocabulaire], dtype=np.float64))) + 1.0
+
+    ligne_ptr, ligne_termes, ligne_poids = _vecteurs_en_csr([vecteur_tfidf(d, positions, idf) for d in documents])
+    # Listes inversées : transposée du CSR, projets croissants dans chaque terme
+    ordre = np.argsort(ligne_termes, kind='stable')
+    terme_ptr = np.zeros(len(vocabulaire) + 1, dtype=np.int64)
+    terme_ptr[1:] = np.cumsum(np.bincount(ligne_termes, minlength=len(vocabulaire)))
+    terme_lignes = np.repeat(np.arange(nombre, dtype=np.int32), np.diff(ligne_ptr))[ordre]
+
+    meta_precedente = _lire_meta()
+    generation = (meta_precedente['generation'] if meta_precedente else 0) + 1
+    tableaux = {
+        'ids': np.array([l[0] for l in lignes], dtype=np.int64), 'ligne_ptr': ligne_ptr,
+        'ligne_termes': ligne_termes, 'ligne_poids': ligne_poids, 'terme_ptr': terme_ptr,
+        'terme_lignes': terme_lignes, 'terme_poids': ligne_poids[ordre], 'idf': idf,
+        'ajout_ids': np.empty(0), 'ajout_ptr': np.zeros(1), 'ajout_termes': np.empty(0), 'ajout_poids': np.empty(0),
+    }
+    os.makedirs(DOSSIER_INDEX, exist_ok=True)
+    for nom, tableau in tableaux.items():
+        np.ascontiguousarray(tableau, dtype=_FICHIERS[nom]).tofile(_chemin(generation, nom))
+    with open(os.path.join(DOSSIER_INDEX, f"g{generation}_vocabulaire.json"), 'w', encoding='utf-8') as fichier:
+        json.dump(vocabulaire, fichier)
+
+    _ecrire_meta({
+        'generation': generation,
+        'nb_projets': nombre,
+        'nnz': int(ligne_ptr[-1]),
+        'nb_termes': len(vocabulaire),
+        'nb_ajouts': 0,
+        'nnz_ajouts': 0,
+        'dernier_lead_id': lignes[-1][0] if lignes else 0,
+        'date_construction': time.time(),
+    })
+
+    # Anciennes générations : encore projetées par un lecteur sous Windows, elles partiront à la suivante
+    for chemin in glob.glob(os.path.join(DOSSIER_INDEX, 'g*_*')):
+        if not os.path.basename(chemin).startswith(f"g{generation}_"):
+            try:
+                os.remove(chemin)
+            except OSError:
+                pass
+
+    return {'projets': nombre, 'termes': len(vocabulaire), 'nnz': int(ligne_ptr[-1])}
+
+def ajouter_nouveaux_projets() -> int:
+    """Ajoute au segment d'ajout les projets publiés depuis la dernière mise à jour de l'index"""
+    meta = _lire_meta()
+    index = get_index_similarite()
+    if meta is None or index is None:
+        return 0
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, type_projet, description FROM leads WHERE id > ? ORDER BY id',
+                   (meta['dernier_lead_id'],))
+    lignes = cursor.fetchall()
+    conn.close()
+    if not lignes:
+        return 0
+
+    vecteurs = [vecteur_tfidf(normaliser_texte(texte_projet(t, d)), index.vocabulaire, index.idf) for _, t, d in lignes]
+    ptr, termes, poids = _vecteurs_en_csr(vecteurs, decalage=meta['nnz_ajouts'])
+    generation = meta['generation']
+    _ajouter_au_fichier(generation, 'ajout_ids', np.array([l[0] for l in lignes]), meta['nb_ajouts'])
+    _ajouter_au_fichier(generation, 'ajout_ptr', ptr[1:], meta['nb_ajouts'] + 1)
+    _ajouter_au_fichier(generation, 'ajout_termes', termes, meta['nnz_ajouts'])
+    _ajouter_au_fichier(generation, 'ajout_poids', poids, meta['nnz_ajouts'])
+
+    meta.update({
+        'nb_ajouts': meta['nb_ajouts'] + len(lignes),
+        'nnz_ajouts': int(ptr[-1]),
+        'dernier_lead_id': lignes[-1][0],
+    })
+    _ecrire_meta(meta)
+    return len(lignes)
+
+def maintenir_index_similarite() -> Optional[str]:
+    """Tâche de fond : reconstruit l'index s'il est absent, vieux ou trop complété, sinon le complète"""
+    with _verrou_maintenance() as obtenu:
+        if not obtenu:
+            return None
+        meta = _lire_meta()
+        if (meta is None
+                or time.time() - meta['date_construction'] > DUREE_VIE_INDEX
+                or meta['nb_ajouts'] > FRACTION_AJOUT_MAX * max(meta['nb_projets'], 100)):
+            construire_index()
+            return 'reconstruction'
+        ajouter_nouveaux_projets()
+        return 'ajout'
+
+class _IndexSimilarite:
+    """Vue en lecture seule d'une génération de l'index et de son segment d'ajout"""
+
+    def __init__(self, meta: Dict, precedent: Optional['_IndexSimilarite'] = None):
+        g = meta['generation']
+        self.meta = meta
+        if precedent is not None and precedent.meta['generation'] == g:
+            # Même génération : seul le segment d'ajout a grandi
+            for nom in ('vocabulaire', 'idf', 'ids', 'ligne_ptr', 'ligne_termes', 'ligne_poids',
+                        'terme_ptr', 'terme_lignes', 'terme_poids'):
+                setattr(self, nom, getattr(precedent, nom))
+        else:
+            with open(os.path.join(DOSSIER_INDEX, f"g{g}_vocabulaire.json"), encoding='utf-8') as fichier:
+                self.vocabulaire = {t: i for i, t in enumerate(json.load(fichier))}
+            self.idf = np.array(_carte(g, 'idf', meta['nb_termes']))
+            self.ids = _carte(g, 'ids', meta['nb_projets'])
+            self.ligne_ptr = _carte(g, 'ligne_ptr', meta['nb_projets'] + 1)
+            self.ligne_termes = _carte(g, 'ligne_termes', meta['nnz'])
+            self.ligne_poids = _carte(g, 'ligne_poids', meta['nnz'])
+            self.terme_ptr = _carte(g, 'terme_ptr', meta['nb_termes'] + 1)
+            self.terme_lignes = _carte(g, 'terme_lignes', meta['nnz'])
+            self.terme_poids = _carte(g, 'terme_poids', meta['nnz'])
+        self.ajout_ids = _carte(g, 'ajout_ids', meta['nb_ajouts'])
+        self.ajout_ptr = _carte(g, 'ajout_ptr', meta['nb_ajouts'] + 1)
+        self.ajout_termes = _carte(g, 'ajout_termes', meta['nnz_ajouts'])
+        self.ajout_poids = _carte(g, 'ajout_poids', meta['nnz_ajouts'])
+
+    def vecteur(self, lead_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Vecteur d'un projet indexé (segment principal ou d'ajout), None s'il est absent"""
+        for ids, ptr, termes, poids in ((self.ids, self.ligne_ptr, self.ligne_termes, self.ligne_poids),
+                                        (self.ajout_ids, self.ajout_ptr, self.ajout_termes, self.ajout_poids)):
+            i = int(np.searchsorted(ids, lead_id))
+            if i < len(ids) and ids[i] == lead_id:
+                return np.asarray(termes[ptr[i]:ptr[i + 1]]), np.asarray(poids[ptr[i]:ptr[i + 1]])
+        return None
+
+    def scores(self, termes: np.ndarray, poids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, produit scalaire avec la requête) pour tous les projets indexés"""
+        # Segment principal : seules les listes inversées des termes de la requête sont lues
+        debuts = np.asarray(self.terme_ptr[termes])
+        longueurs = np.asarray(self.terme_ptr[termes + 1]) - debuts
+        positions = np.repeat(debuts - np.cumsum(longueurs) + longueurs, longueurs) + np.arange(longueurs.sum())
+        scores_principal = np.bincount(
+            self.terme_lignes[positions],
+            weights=self.terme_poids[positions] * np.repeat(poids, longueurs),
+            minlength=len(self.ids),
+        )
+
+        # Segment d'ajout : parcouru en entier, il reste petit entre deux reconstructions
+        requete = np.zeros(len(self.vocabulaire), dtype=np.float32)
+        requete[termes] = poids
+        scores_ajout = np.bincount(
+            np.repeat(np.arange(len(self.ajout_ids)), np.diff(self.ajout_ptr)),
+            weights=self.ajout_poids * requete[self.ajout_termes],
+            minlength=len(self.ajout_ids),
+        )
+        return np.concatenate([self.ids, self.ajout_ids]), np.concatenate([scores_principal, scores_ajout])
+
+def get_index_similarite() -> Optional[_IndexSimilarite]:
+    """Index courant (rechargé quand meta.json change), None s'il n'est pas encore construit"""
+    meta = _lire_meta()
+    if meta is None:
+        return None
+    with _verrou:
+        index = _index.get(DOSSIER_INDEX)
+        if index is None or index.meta != meta:
+            index = _IndexSimilarite(meta, index)
+            _index[DOSSIER_INDEX] = index
+        return index
+
+def _vecteur_projet(index: _IndexSimilarite, lead_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Vecteur indexé, ou calculé depuis la base pour un projet publié après la dernière mise à jour"""
+    vecteur = index.vecteur(lead_id)
+    if vecteur is not None:
+        return vecteur
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    cursor.execute('SELECT type_projet, description FROM leads WHERE id = ?', (lead_id,))
+    ligne = cursor.fetchone()
+    conn.close()
+    if ligne is None:
+        return None
+    return vecteur_tfidf(normaliser_texte(texte_projet(*ligne)), index.vocabulaire, index.idf)
+
+def projets_similaires(lead_ids: Iterable[int], k: int = 5, ids_candidats: Optional[Iterable[int]] = None,
+                       exclure_ids: Iterable[int] = ()) -> List[Tuple[int, float]]:
+    """
+    Les k projets les plus proches (cosinus) d'un ou plusieurs projets de référence.
+
+    Plusieurs références (ex. les projets soumissionnés par un entrepreneur)
+    forment un profil : la somme de leurs vecteurs. Les références sont
+    exclues du résultat, comme exclure_ids ; ids_candidats restreint la
+    recherche (ex. projets ouverts).
+    """
+    index = get_index_similarite()
+    lead_ids = list(lead_ids)
+    if index is None or not lead_ids:
+        return []
+
+    vecteurs = [v for v in (_vecteur_projet(index, i) for i in lead_ids) if v is not None and len(v[0])]
+    if not vecteurs:
+        return []
+    termes, inverse = np.unique(np.concatenate([v[0] for v in vecteurs]), return_inverse=True)
+    poids = np.bincount(inverse, weights=np.concatenate([v[1] for v in vecteurs]))
+    poids /= np.linalg.norm(poids)
+
+    ids, scores = index.scores(termes, poids)
+    retenus = (scores > 0) & ~np.isin(ids, lead_ids + list(exclure_ids))
+    if ids_candidats is not None:
+        retenus &= np.isin(ids, np.fromiter(ids_candidats, dtype=np.int64))
+    return selectionner_meilleurs(ids[retenus], scores[retenus], k)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recherche de projets par proximité géographique SEAOP
+
+Chaque code postal est localisé par le centroïde de sa RTA (3 premiers
+caractères), chargé depuis donnees/centroides_rta.csv dans la table indexée
+centroides_rta. Une recherche « à moins de R km de tel code postal » :
+1. repère les cellules de la grille de centroïdes (pas de 0,5°) qui touchent
+   la boîte englobante du cercle ;
+2. calcule la distance exacte (haversine) pour les seules RTA de ces cellules ;
+3. filtre les projets par leur RTA, via un index d'expression sur leads.
+"""
+
+import sqlite3
+import csv
+import math
+import os
+import threading
+from typing import Optional, Dict, Tuple, List
+
+import numpy as np
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+CHEMIN_CENTROIDES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'donnees', 'centroides_rta.csv')
+
+RAYON_TERRE_KM = 6371.0088
+
+# Pas de la grille de centroïdes, en degrés (environ 55 km en latitude)
+PAS_GRILLE = 0.5
+
+# Expression SQL de la RTA d'un projet ; identique à celle de l'index idx_leads_rta
+EXPRESSION_RTA_LEAD = "upper(substr(l.code_postal, 1, 3))"
+
+_bases_pretes = set()
+_grilles: Dict[str, '_GrilleCentroides'] = {}
+_verrou = threading.Lock()
+
+def normaliser_rta(code_postal: Optional[str]) -> str:
+    """RTA d'un code postal (« h2b 3c4 » -> « H2B »)"""
+    return (code_postal or '').strip().upper()[:3]
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distance orthodromique en km ; accepte des scalaires ou des tableaux NumPy"""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RAYON_TERRE_KM * np.arcsin(np.sqrt(a))
+
+def boite_englobante(latitude: float, longitude: float, rayon_km: float) -> Tuple[float, float, float, float]:
+    """(lat_min, lat_max, lon_min, lon_max) contenant le cercle de rayon donné"""
+    delta_lat = math.degrees(rayon_km / RAYON_TERRE_KM)
+    lat_min, lat_max = latitude - delta_lat, latitude + delta_lat
+    # La largeur en longitude se prend à la latitude la plus proche du pôle
+    cos_lat = math.cos(math.radians(min(max(abs(lat_min), abs(lat_max)), 89.9)))
+    delta_lon = math.degrees(rayon_km / (RAYON_TERRE_KM * cos_lat))
+    return lat_min, lat_max, longitude - delta_lon, longitude + delta_lon
+
+class _GrilleCentroides:
+    """Centroïdes en tableaux NumPy, répartis par cellule de PAS_GRILLE degrés"""
+
+    def __init__(self, lignes: List[tuple]):
+        self.rta = np.array([l[0] for l in lignes])
+        self.latitudes = np.array([l[1] for l in lignes], dtype=np.float64)
+        self.longitudes = np.array([l[2] for l in lignes], dtype=np.float64)
+        self.positions = {rta: i for i, rta in enumerate(self.rta.tolist())}
+        cles = zip(np.floor(self.latitudes / PAS_GRILLE).astype(int).tolist(),
+                   np.floor(self.longitudes / PAS_GRILLE).astype(int).tolist())
+        regroupement: Dict[Tuple[int, int], List[int]] = {}
+        for i, cle in enumerate(cles):
+            regroupement.setdefault(cle, []).append(i)
+        self.cellules = {cle: np.array(indices) for cle, indices in regroupement.items()}
+
+    def centroide(self, rta: str) -> Optional[Tuple[float, float]]:
+        i = self.positions.get(rta)
+        return None if i is None else (float(self.latitudes[i]), float(self.longitudes[i]))
+
+    def candidats(self, latitude: float, longitude: float, rayon_km: float) -> np.ndarray:
+        """Indices des centroïdes des cellules touchant la boîte englobante"""
+        lat_min, lat_max, lon_min, lon_max = boite_englobante(latitude, longitude, rayon_km)
+        indices = [
+            self.cellules[(i, j)]
+            for i in range(math.floor(lat_min / PAS_GRILLE), math.floor(lat_max / PAS_GRILLE) + 1)
+            for j in range(math.floor(lon_min / PAS_GRILLE), math.floor(lon_max / PAS_GRILLE) + 1)
+            if (i, j) in self.cellules
+        ]
+        return np.concatenate(indices) if indices else np.empty(0, dtype=int)
+
+    def dans_rayon(self, latitude: float, longitude: float, rayon_km: float) -> Dict[str, float]:
+        """RTA à moins de rayon_km du point, avec leur distance"""
+        candidats = self.candidats(latitude, longitude, rayon_km)
+        distances = haversine_km(latitude, longitude, self.latitudes[candidats], self.longitudes[candidats])
+        retenus = distances <= rayon_km
+        return dict(zip(self.rta[candidats][retenus].tolist(), distances[retenus].tolist()))
+
+def assurer_centroides_rta():
+    """Crée la table des centroïdes (chargée depuis le CSV si vide) et l'index RTA des projets"""
+    if DATABASE_PATH in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS centroides_rta (
+                rta TEXT PRIMARY KEY,
+                localite TEXT,
+                province TEXT,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_leads_rta ON leads({EXPRESSION_RTA_LEAD.replace("l.", "")})')
+
+        cursor.execute('SELECT COUNT(*) FROM centroides_rta')
+        if cursor.fetchone()[0] == 0 and os.path.exists(CHEMIN_CENTROIDES):
+            with open(CHEMIN_CENTROIDES, newline='', encoding='utf-8') as fichier:
+                cursor.executemany(
+                    'INSERT OR REPLACE INTO centroides_rta (rta, localite, province, latitude, longitude) VALUES (?, ?, ?, ?, ?)',
+                    [(l['rta'], l['localite'], l['province'], float(l['latitude']), float(l['longitude']))
+                     for l in csv.DictReader(fichier)]
+                )
+
+        conn.commit()
+        _bases_pretes.add(DATABASE_PATH)
+    except Exception as e:
+        print(f"Erreur lors du chargement des centroïdes RTA: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def get_grille_centroides() -> _GrilleCentroides:
+    """Grille des centroïdes, construite une fois par base"""
+    with _verrou:
+        grille = _grilles.get(DATABASE_PATH)
+        if grille is None:
+            assurer_centroides_rta()
+            conn = sqlite3.connect(DATABASE_PATH)
+            cursor = conn.cursor()
+            cursor.execute('SELECT rta, latitude, longitude FROM centroides_rta ORDER BY rta')
+            grille = _GrilleCentroides(cursor.fetchall())
+            conn.close()
+            _grilles[DATABASE_PATH] = grille
+        return grille
+
+def get_centroide(code_postal: Optional[str]) -> Optional[Tuple[float, float]]:
+    """(latitude, longitude) du centroïde de la RTA d'un code postal, None si inconnue"""
+    return get_grille_centroides().centroide(normaliser_rta(code_postal))
+
+def distance_codes_postaux(code_postal_1: Optional[str], code_postal_2: Optional[str]) -> Optional[float]:
+    """Distance en km entre les centroïdes de deux codes postaux"""
+    grille = get_grille_centroides()
+    point_1 = grille.centroide(normaliser_rta(code_postal_1))
+    point_2 = grille.centroide(normaliser_rta(code_postal_2))
+    if point_1 is None or point_2 is None:
+        return None
+    return float(haversine_km(point_1[0], point_1[1], point_2[0], point_2[1]))
+
+def rta_dans_rayon(code_postal_origine: Optional[str], rayon_km: float) -> Optional[Dict[str, float]]:
+    """RTA à moins de rayon_km du code postal d'origine (distance en km), None si l'origine est inconnue"""
+    grille = get_grille_centroides()
+    origine = grille.centroide(normaliser_rta(code_postal_origine))
+    if origine is None:
+        return None
+    return grille.dans_rayon(origine[0], origine[1], rayon_km)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recherches sauvegardées et alertes des entrepreneurs SEAOP
+
+Un entrepreneur enregistre les critères du fil de projets (type, gamme de
+budget, début de code postal, texte, rayon). Le moteur d'alertes n'évalue que
+les projets créés depuis le filigrane (dernier_lead_id) de chaque recherche :
+- les recherches candidates d'un projet sont trouvées par l'index inverse
+  (cle_type, cle_code_postal) : type du projet ou « * », croisé avec chaque
+  préfixe du code postal ou « * » ;
+- les critères restants (budget, texte, rayon) ne sont vérifiés que pour ces
+  candidates ;
+- chaque recherche reçoit une seule notification par passage, quel que soit
+  le nombre de projets trouvés, et toutes les notifications sont insérées en
+  un lot.
+"""
+
+import sqlite3
+import os
+import re
+from typing import Optional, List, Dict, Tuple
+
+from proximite_projets import get_grille_centroides, rta_dans_rayon, normaliser_rta
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+TOUS = '*'
+
+TYPE_NOTIFICATION = 'alerte_recherche'
+
+# Gammes de budget du fil des projets : (minimum, maximum) en dollars
+GAMMES_BUDGET = {
+    "Tous": (None, None),
+    "< 5K": (None, 5000),
+    "5K-15K": (5000, 15000),
+    "15K-50K": (15000, 50000),
+    "50K-100K": (50000, 100000),
+    "> 100K": (100000, None),
+}
+
+# Nombre maximal de projets évalués par passage du moteur d'alertes
+TAILLE_LOT_ALERTES = 1000
+
+_bases_pretes = set()
+
+def extraire_budget_minimum(budget: Optional[str]) -> int:
+    """Premier montant d'une gamme de budget (ex. « 15 000$ - 30 000$ » -> 15000)"""
+    montant = re.search(r'\d[\d\s]*', budget or '')
+    return int(re.sub(r'\s', '', montant.group())) if montant else 0
+
+def budget_dans_gamme(budget: Optional[str], gamme_budget: Optional[str]) -> bool:
+    """Le budget d'un projet est-il dans la gamme choisie (bornes incluses) ?"""
+    minimum, maximum = GAMMES_BUDGET.get(gamme_budget or "Tous", (None, None))
+    montant = extraire_budget_minimum(budget)
+    return (minimum is None or montant >= minimum) and (maximum is None or montant <= maximum)
+
+def normaliser_code_postal(code_postal: Optional[str]) -> str:
+    return re.sub(r'\s', '', code_postal or '').upper()
+
+def cles_code_postal(code_postal: Optional[str]) -> List[str]:
+    """Clés d'index d'un projet : chacun des préfixes de son code postal, et « * »"""
+    code = normaliser_code_postal(code_postal)[:6]
+    return [TOUS] + [code[:i] for i in range(1, len(code) + 1)]
+
+def assurer_recherches_sauvegardees():
+    """Crée la table des recherches sauvegardées et son index inverse de critères"""
+    if DATABASE_PATH in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS recherches_sauvegardees (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                entrepreneur_id INTEGER NOT NULL,
+                nom TEXT NOT NULL,
+                type_projet TEXT,
+                gamme_budget TEXT,
+                code_postal TEXT,
+                recherche_texte TEXT,
+                rayon_km REAL,
+                code_postal_origine TEXT,
+                cle_type TEXT NOT NULL,
+                cle_code_postal TEXT NOT NULL,
+                dernier_lead_id INTEGER NOT NULL DEFAULT 0,
+                nb_alertes INTEGER DEFAULT 0,
+                active BOOLEAN DEFAULT 1,
+                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (entrepreneur_id) REFERENCES entrepreneurs (id)
+            )
+        ''')
+        # Index inverse : des critères d'un projet vers les recherches qui peuvent le retenir
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_recherches_criteres
+            ON recherches_sauvegardees(cle_type, cle_code_postal, active, dernier_lead_id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_recherches_entrepreneur
+            ON recherches_sauvegardees(entrepreneur_id, active)
+        ''')
+        conn.commit()
+        _bases_pretes.add(DATABASE_PATH)
+    except Exception as e:
+        print(f"Erreur lors de la création des recherches sauvegardées: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def sauvegarder_recherche(entrepreneur_id: int, nom: str, type_projet: Optional[str] = None,
+                          gamme_budget: Optional[str] = None, code_postal: Optional[str] = None,
+                          recherche_texte: Optional[str] = None, rayon_km: Optional[float] = None,
+                          code_postal_origine: Optional[str] = None) -> Optional[int]:
+    """
+    Enregistre une recherche ; seuls les projets publiés ensuite déclenchent des alertes.
+
+    Retourne l'id de la recherche, ou None en cas d'erreur.
+    """
+    assurer_recherches_sauvegardees()
+    type_projet = None if type_projet in (None, "", "Tous") else type_projet
+    code_postal = normaliser_code_postal(code_postal)[:6] or None
+    if not rayon_km:
+        rayon_km, code_postal_origine = None, None
+
+    try:
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO recherches_sauvegardees (
+                entrepreneur_id, nom, type_projet, gamme_budget, code_postal, recherche_texte,
+                rayon_km, code_postal_origine, cle_type, cle_code_postal, dernier_lead_id
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(id), 0) FROM leads))
+        ''', (entrepreneur_id, nom, type_projet, gamme_budget, code_postal, recherche_texte or None,
+              rayon_km, code_postal_origine, type_projet or TOUS, code_postal or TOUS))
+        recherche_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return recherche_id
+    except Exception as e:
+        print(f"Erreur lors de la sauvegarde de la recherche: {e}")
+        return None
+
+def get_recherches_entrepreneur(entrepreneur_id: int) -> List[Dict]:
+    """Recherches actives d'un entrepreneur, les plus récentes d'abord"""
+    assurer_recherches_sauvegardees()
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT id, nom, type_projet, gamme_budget, code_postal, recherche_texte, rayon_km,
+               code_postal_origine, nb_alertes, date_creation
+        FROM recherches_sauvegardees
+        WHERE entrepreneur_id = ? AND active = 1
+        ORDER BY id DESC
+    ''', (entrepreneur_id,))
+    recherches = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return recherches
+
+def decrire_recherche(recherche: Dict) -> str:
+    """Résumé lisible des critères d'une recherche"""
+    criteres = []
+    if recherche.get('type_projet'):
+        criteres.append(f"🏗️ {recherche['type_projet']}")
+    if recherche.get('gamme_budget') and recherche['gamme_budget'] != "Tous":
+        criteres.append(f"💰 {recherche['gamme_budget']}")
+    if recherche.get('code_postal'):
+        criteres.append(f"📍 {recherche['code_postal']}*")
+    if recherche.get('rayon_km'):
+        criteres.append(f"📏 {recherche['rayon_km']:.0f} km de {recherche['code_postal_origine']}")
+    if recherche.get('recherche_texte'):
+        criteres.append(f"🔍 « {recherche['recherche_texte']} »")
+    return ' · '.join(criteres) or "Tous les projets"
+
+def supprimer_recherche(recherche_id: int, entrepreneur_id: int) -> bool:
+    """Désactive une recherche (seulement si elle appartient à l'entrepreneur)"""
+    try:
+        conn = sqlite3.connect(DATABASE_PATH)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE recherches_sauvegardees SET active = 0 WHERE id = ? AND entrepreneur_id = ?
+        ''', (recherche_id, entrepreneur_id))
+        conn.commit()
+        modifiee = cursor.rowcount > 0
+        conn.close()
+        return modifiee
+    except Exception as e:
+        print(f"Erreur lors de la suppression de la recherche: {e}")
+        return False
+
+def _criteres_restants_satisfaits(recherche: sqlite3.Row, projet: sqlite3.Row, distances_cache: Dict) -> bool:
+    """Budget, texte et rayon : vérifiés seulement pour les recherches candidates"""
+    if recherche['gamme_budget'] and not budget_dans_gamme(projet['budget'], recherche['gamme_budget']):
+        return False
+
+    if recherche['recherche_texte']:
+        texte = recherche['recherche_texte'].lower()
+        if not any(texte in (projet[c] or '').lower() for c in ('description', 'type_projet', 'nom')):
+            return False
+
+    if recherche['rayon_km']:
+        cle = (recherche['code_postal_origine'], recherche['rayon_km'])
+        if cle not in distances_cache:
+            distances_cache[cle] = rta_dans_rayon(*cle) or {}
+        if normaliser_rta(projet['code_postal']) not in distances_cache[cle]:
+            return False
+
+    return True
+
+def evaluer_alertes(taille_lot: int = TAILLE_LOT_ALERTES) -> Dict[str, int]:
+    """
+    Évalue les projets publiés depuis les filigranes des recherches actives.
+
+    Traite au plus taille_lot projets par appel, dans une transaction
+    d'écriture : deux processus ne notifient jamais deux fois le même projet.
+    Retourne {projets, recherches_notifiees, correspondances}.
+    """
+    assurer_recherches_sauvegardees()
+    # Grille des centroïdes chargée avant la transaction : les rayons se calculent ensuite en mémoire
+    get_grille_centroides()
+    resultat = {'projets': 0, 'recherches_notifiees': 0, 'correspondances': 0}
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute('SELECT MIN(dernier_lead_id) FROM recherches_sauvegardees WHERE active = 1')
+        filigrane_min = cursor.fetchone()[0]
+        if filigrane_min is None:
+            conn.rollback()
+            return resultat
+
+        cursor.execute('''
+            SELECT id, nom, code_postal, type_projet, description, budget
+            FROM leads
+            WHERE id > ? AND visible_entrepreneurs = 1 AND accepte_soumissions = 1
+            ORDER BY id
+            LIMIT ?
+        ''', (filigrane_min, taille_lot))
+        projets = cursor.fetchall()
+        if not projets:
+            conn.rollback()
+            return resultat
+
+        correspondances: Dict[int, Tuple[sqlite3.Row, List[sqlite3.Row]]] = {}
+        distances_cache = {}
+        for projet in projets:
+            cles_cp = cles_code_postal(projet['code_postal'])
+            cursor.execute(f'''
+                SELECT * FROM recherches_sauvegardees
+                WHERE cle_type IN (?, '*')
+                  AND cle_code_postal IN ({', '.join('?' * len(cles_cp))})
+                  AND active = 1 AND dernier_lead_id < ?
+            ''', [projet['type_projet']] + cles_cp + [projet['id']])
+            for recherche in cursor.fetchall():
+                if _criteres_restants_satisfaits(recherche, projet, distances_cache):
+                    correspondances.setdefault(recherche['id'], (recherche, []))[1].append(projet)
+
+        notifications = []
+        for recherche, trouves in correspondances.values():
+            titre = f"🔔 {len(trouves)} nouveau(x) projet(s) : {recherche['nom']}"
+            apercu = ', '.join(f"{p['type_projet']} ({normaliser_code_postal(p['code_postal'])[:3]})" for p in trouves[:3])
+            suite = f" et {len(trouves) - 3} autre(s)" if len(trouves) > 3 else ""
+            message = f"Votre recherche « {recherche['nom']} » a trouvé : {apercu}{suite}"
+            notifications.append(('entrepreneur', recherche['entrepreneur_id'], TYPE_NOTIFICATION,
+                                  titre, message, trouves[0]['id']))
+        cursor.executemany('''
+            INSERT INTO notifications (utilisateur_type, utilisateur_id, type_notification, titre, message, lien_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', notifications)
+        cursor.executemany('''
+            UPDATE recherches_sauvegardees SET nb_alertes = nb_alertes + ? WHERE id = ?
+        ''', [(len(trouves), recherche_id) for recherche_id, (_, trouves) in correspondances.items()])
+
+        # Toutes les recherches actives ont été évaluées jusqu'au dernier projet du lot
+        dernier = projets[-1]['id'] if len(projets) == taille_lot else max(projets[-1]['id'], _max_lead_id(cursor))
+        cursor.execute('''
+            UPDATE recherches_sauvegardees SET dernier_lead_id = ?
+            WHERE active = 1 AND dernier_lead_id < ?
+        ''', (dernier, dernier))
+
+        conn.commit()
+        resultat.update({
+            'projets': len(projets),
+            'recherches_notifiees': len(correspondances),
+            'correspondances': sum(len(t) for _, t in correspondances.values()),
+        })
+    except Exception as e:
+        print(f"Erreur lors de l'évaluation des alertes: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+    return resultat
+
+def _max_lead_id(cursor: sqlite3.Cursor) -> int:
+    cursor.execute('SELECT COALESCE(MAX(id), 0) FROM leads')
+    return cursor.fetchone()[0]
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal des requêtes lentes SEAOP
+
+Les connexions instrumentées (instrumentation.installer) signalent ici
+toute instruction dont l'exécution et la lecture des lignes dépassent
+SEUIL_MS millisecondes (variable d'environnement SEAOP_SEUIL_REQUETE_LENTE_MS).
+Les requêtes dynamiques (filtres de projets, de soumissions, statistiques)
+produisent autant de variantes que de combinaisons de critères ; chaque
+variante est regroupée sous l'empreinte de son SQL normalisé (littéraux et
+listes IN remplacés par ?), avec :
+- la forme des paramètres liés (types, motifs LIKE) de la dernière occurrence ;
+- le nombre d'exécutions lentes, leur durée totale et maximale ;
+- le plan EXPLAIN QUERY PLAN, relevé sur la connexion de l'instruction à la
+  première occurrence depuis la dernière persistance, et s'il balaie une
+  table entière (SCAN sans index).
+
+Comme la présence du chat, les occurrences sont cumulées en mémoire puis
+ajoutées à la table requetes_lentes par la tâche de fond
+persister_requetes_lentes, en une écriture par lot.
+
+Usage :
+    enregistrer_tache('requetes_lentes', persister_requetes_lentes, intervalle_secondes=DELAI_PERSISTANCE)
+    get_requetes_lentes(tri='duree_totale_ms')
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from base_donnees import connecter_lecture, executer_ecriture
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+# Durée (ms) à partir de laquelle une instruction est journalisée
+SEUIL_MS = float(os.getenv('SEAOP_SEUIL_REQUETE_LENTE_MS', '100'))
+
+# Intervalle de persistance des occurrences (tâche de fond)
+DELAI_PERSISTANCE = 60
+
+# Colonnes par lesquelles le journal peut être trié
+TRIS = ['duree_totale_ms', 'duree_max_ms', 'executions', 'derniere_date']
+
+FORMAT_DATE = '%Y-%m-%d %H:%M:%S'
+
+_bases_pretes = set()
+_registres: Dict[str, 'RegistreRequetesLentes'] = {}
+_verrou_registres = threading.Lock()
+
+def assurer_table_requetes_lentes(chemin: Optional[str] = None):
+    """Crée la table du journal des requêtes lentes"""
+    chemin = chemin or DATABASE_PATH
+    if chemin in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS requetes_lentes (
+                empreinte TEXT PRIMARY KEY,
+                sql_normalise TEXT NOT NULL,
+                formes_parametres TEXT,
+                executions INTEGER NOT NULL DEFAULT 0,
+                duree_totale_ms REAL NOT NULL DEFAULT 0,
+                duree_max_ms REAL NOT NULL DEFAULT 0,
+                plan TEXT,
+                balayage BOOLEAN DEFAULT 0,
+                premiere_date TIMESTAMP,
+                derniere_date TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        _bases_pretes.add(chemin)
+    except Exception as e:
+        print(f"Erreur lors de la création de la table des requêtes lentes: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def normaliser_sql(sql: str) -> str:
+    """SQL sans littéraux ni espaces superflus : une forme par variante de requête"""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    sql = re.sub(r'[:@$]\w+', '?', sql)
+    sql = ' '.join(sql.split())
+    return re.sub(r'\(\s*\?(?:\s*,\s*\?)+\s*\)', '(?, ...)', sql)
+
+def empreinte_sql(sql_normalise: str) -> str:
+    return hashlib.sha1(sql_normalise.encode('utf-8')).hexdigest()[:16]
+
+def _forme(valeur) -> str:
+    if valeur is None:
+        return 'NULL'
+    if isinstance(valeur, (bool, int)):
+        return 'entier'
+    if isinstance(valeur, float):
+        return 'réel'
+    if isinstance(valeur, (bytes, bytearray, memoryview)):
+        return 'blob'
+    if isinstance(valeur, str) and valeur.startswith('%'):
+        return 'motif %…'   # LIKE sans préfixe fixe : aucun index utilisable
+    if isinstance(valeur, str) and '%' in valeur:
+        return 'motif'
+    return 'texte'
+
+def formes_parametres(parametres) -> str:
+    """Types des paramètres liés (JSON), sans leurs valeurs"""
+    if isinstance(parametres, dict):
+        return json.dumps({cle: _forme(v) for cle, v in parametres.items()}, ensure_ascii=False)
+    return json.dumps([_forme(v) for v in parametres or ()], ensure_ascii=False)
+
+def plan_requete(conn: sqlite3.Connection, sql: str, parametres=()) -> Optional[str]:
+    """EXPLAIN QUERY PLAN en texte indenté, ou None si l'instruction ne s'y prête pas"""
+    try:
+        # Curseur non instrumenté : le relevé du plan n'est ni tracé ni journalisé
+        lignes = sqlite3.Cursor(conn).execute('EXPLAIN QUERY PLAN ' + sql, parametres or ()).fetchall()
+    except (sqlite3.Error, ValueError):
+        return None
+    niveaux = {0: -1}
+    texte = []
+    for identifiant, parent, _, detail in lignes:
+        niveaux[identifiant] = niveaux.get(parent, -1) + 1
+        texte.append('  ' * niveaux[identifiant] + detail)
+    return '\n'.join(texte)
+
+def balaie_table(plan: Optional[str]) -> bool:
+    """Le plan parcourt-il une table entière (SCAN sans index) ?"""
+    return any(ligne.strip().startswith('SCAN ') and 'USING' not in ligne and 'CONSTANT ROW' not in ligne
+               for ligne in (plan or '').splitlines())
+
+class RegistreRequetesLentes:
+    """Occurrences lentes par empreinte : mémoire du processus, persistée par lots"""
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self._verrou = threading.Lock()
+        self._entrees: Dict[str, dict] = {}
+
+    def noter(self, conn: sqlite3.Connection, sql: str, parametres, duree_ms: float, explicable: bool = True):
+        """Cumule une occurrence lente ; relève le plan à la première depuis la dernière persistance"""
+        sql_normalise = normaliser_sql(sql)
+        empreinte = empreinte_sql(sql_normalise)
+        maintenant = time.strftime(FORMAT_DATE, time.gmtime())
+        with self._verrou:
+            nouvelle = empreinte not in self._entrees
+            if nouvelle:
+                self._entrees[empreinte] = {
+                    'sql_normalise': sql_normalise, 'executions': 0, 'duree_totale_ms': 0.0,
+                    'duree_max_ms': 0.0, 'plan': None, 'premiere_date': maintenant
+                }
+            entree = self._entrees[empreinte]
+            entree['executions'] += 1
+            entree['duree_totale_ms'] += duree_ms
+            entree['duree_max_ms'] = max(entree['duree_max_ms'], duree_ms)
+            entree['formes_parametres'] = formes_parametres(parametres)
+            entree['derniere_date'] = maintenant
+        if nouvelle and explicable:
+            plan = plan_requete(conn, sql, parametres)
+            with self._verrou:
+                if empreinte in self._entrees:
+                    self._entrees[empreinte]['plan'] = plan
+
+    def persister(self) -> int:
+        """Ajoute les occurrences cumulées à la table ; retourne le nombre d'empreintes écrites"""
+        with self._verrou:
+            entrees, self._entrees = self._entrees, {}
+        if not entrees:
+            return 0
+        assurer_table_requetes_lentes(self.chemin)
+        lignes = [(empreinte, e['sql_normalise'], e['formes_parametres'], e['executions'], e['duree_totale_ms'],
+                   e['duree_max_ms'], e['plan'], balaie_table(e['plan']), e['premiere_date'], e['derniere_date'])
+                  for empreinte, e in entrees.items()]
+        try:
+            executer_ecriture(_ecrire_requetes_lentes, lignes, chemin=self.chemin)
+        except Exception as e:
+            print(f"Erreur lors de la persistance des requêtes lentes: {e}")
+            return 0
+        return len(lignes)
+
+def _ecrire_requetes_lentes(cursor: sqlite3.Cursor, lignes: list):
+    """Opération d'écriture : cumule les occurrences par empreinte, garde le dernier plan relevé"""
+    cursor.executemany('''
+        INSERT INTO requetes_lentes (empreinte, sql_normalise, formes_parametres, executions, duree_totale_ms,
+                                     duree_max_ms, plan, balayage, premiere_date, derniere_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(empreinte) DO UPDATE SET
+            formes_parametres = excluded.formes_parametres,
+            executions = executions + excluded.executions,
+            duree_totale_ms = duree_totale_ms + excluded.duree_totale_ms,
+            duree_max_ms = MAX(duree_max_ms, excluded.duree_max_ms),
+            plan = COALESCE(excluded.plan, plan),
+            balayage = CASE WHEN excluded.plan IS NULL THEN balayage ELSE excluded.balayage END,
+            derniere_date = excluded.derniere_date
+    ''', lignes)
+
+def get_registre_requetes_lentes(chemin: Optional[str] = None) -> RegistreRequetesLentes:
+    """Registre des requêtes lentes de la base, partagé par les sessions du processus"""
+    chemin = chemin or DATABASE_PATH
+    with _verrou_registres:
+        if chemin not in _registres:
+            _registres[chemin] = RegistreRequetesLentes(chemin)
+        return _registres[chemin]
+
+def noter_requete_lente(conn: sqlite3.Connection, chemin: str, sql: str, parametres, duree_ms: float,
+                        explicable: bool = True):
+    """Signale une instruction lente exécutée sur la base chemin"""
+    if chemin and chemin != ':memory:':
+        get_registre_requetes_lentes(chemin).noter(conn, sql, parametres, duree_ms, explicable)
+
+def persister_requetes_lentes() -> int:
+    """Tâche de fond : persiste les occurrences du registre de la base"""
+    return get_registre_requetes_lentes(DATABASE_PATH).persister()
+
+def get_requetes_lentes(tri: str = 'duree_totale_ms', limite: int = 100, chemin: Optional[str] = None) -> List[Dict]:
+    """Empreintes du journal, triées par ordre décroissant de la colonne tri"""
+    chemin = chemin or DATABASE_PATH
+    if tri not in TRIS:
+        tri = 'duree_totale_ms'
+    assurer_table_requetes_lentes(chemin)
+    conn = connecter_lecture(chemin)
+    conn.row_factory = sqlite3.Row
+    try:
+        lignes = conn.execute(f'''
+            SELECT * FROM requetes_lentes ORDER BY {tri} DESC LIMIT ?
+        ''', (limite,)).fetchall()
+        return [dict(ligne) for ligne in lignes]
+    except sqlite3.Error as e:
+        print(f"Erreur lors de la lecture des requêtes lentes: {e}")
+        return []
+    finally:
+        conn.close()
+
+def vider_requetes_lentes(chemin: Optional[str] = None) -> int:
+    """Efface le journal (après correction d'un index, par exemple) ; retourne le nombre d'empreintes"""
+    chemin = chemin or DATABASE_PATH
+    assurer_table_requetes_lentes(chemin)
+    return executer_ecriture(lambda cursor: cursor.execute('DELETE FROM requetes_lentes').rowcount, chemin=chemin)
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Statistiques de prix des soumissions SEAOP
+
+Calculées chaque nuit par la tâche de fond, stockées en tables indexées et
+servies telles quelles au formulaire de soumission :
+- stats_prix_soumissions : par type de projet et gamme de budget du projet
+  (« * » pour toutes), nombre de soumissions, percentiles des montants,
+  taux d'acceptation ;
+- stats_prix_tranches : taux d'acceptation par quartile de prix du groupe ;
+- modele_prix_soumissions : coefficients d'une régression linéaire pondérée
+  (NumPy) du logarithme du montant sur le type de projet, le budget annoncé
+  et l'urgence ; les soumissions acceptées pèsent davantage. La fourchette
+  suggérée est l'intervalle à 50 % autour de la prédiction.
+Entre deux calculs, chaque acceptation met à jour les comptes d'acceptation
+(enregistrer_acceptation) ; les percentiles attendent le calcul suivant.
+"""
+
+import sqlite3
+import datetime
+import math
+import os
+from typing import Optional, List, Dict, Tuple
+
+import numpy as np
+
+# Configuration du stockage persistant
+DATA_DIR = os.getenv('DATA_DIR', '.')
+DATABASE_PATH = os.path.join(DATA_DIR, 'seaop.db')
+
+TOUS = '*'
+
+# Montant représentatif de chaque gamme de budget du formulaire de projet
+MONTANTS_GAMMES_BUDGET = {
+    "Moins de 5 000$": 3000,
+    "5 000$ - 15 000$": 10000,
+    "15 000$ - 30 000$": 22500,
+    "30 000$ - 50 000$": 40000,
+    "Plus de 50 000$": 75000,
+}
+
+NIVEAUX_URGENCE = ('faible', 'normal', 'eleve', 'critique')
+
+# Un groupe n'est publié qu'à partir de ce nombre de soumissions
+NB_MIN_SOUMISSIONS = 5
+
+# Poids d'une soumission acceptée dans la régression (les autres pèsent 1)
+POIDS_ACCEPTEE = 3.0
+
+# Rappel de chaque coefficient vers sa valeur a priori (régression ridge) : montant
+# proportionnel au budget annoncé, aucun effet du type ni de l'urgence. Négligeable
+# devant des milliers de soumissions, il stabilise le modèle sur peu de données
+PENALITE = 5.0
+
+# Entrées du modèle qui ne sont pas des coefficients
+PARAMETRES_MODELE = ('sigma', 'nb_observations', 'log_budget_defaut')
+
+# Quantile normal à 75 % : la fourchette suggérée couvre 50 % des montants attendus
+Z_FOURCHETTE = 0.6745
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+_bases_pretes = set()
+
+def assurer_statistiques_prix():
+    """Crée les tables de statistiques ; premier calcul si elles n'ont jamais été remplies"""
+    if DATABASE_PATH in _bases_pretes:
+        return
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_prix_soumissions (
+                type_projet TEXT NOT NULL,
+                gamme_budget TEXT NOT NULL,
+                nb_soumissions INTEGER NOT NULL,
+                nb_acceptees INTEGER NOT NULL,
+                p10 REAL, p25 REAL, p50 REAL, p75 REAL, p90 REAL,
+                moyenne REAL,
+                PRIMARY KEY (type_projet, gamme_budget)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_prix_tranches (
+                type_projet TEXT NOT NULL,
+                gamme_budget TEXT NOT NULL,
+                tranche INTEGER NOT NULL,
+                borne_min REAL,
+                borne_max REAL,
+                nb_soumissions INTEGER NOT NULL,
+                nb_acceptees INTEGER NOT NULL,
+                PRIMARY KEY (type_projet, gamme_budget, tranche)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS modele_prix_soumissions (
+                variable TEXT PRIMARY KEY,
+                coefficient REAL NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_prix_calcul (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                derniere_soumission_id INTEGER NOT NULL,
+                date_calcul TIMESTAMP NOT NULL
+            )
+        ''')
+        conn.commit()
+        cursor.execute('SELECT COUNT(*) FROM stats_prix_calcul')
+        jamais_calcule = cursor.fetchone()[0] == 0
+        _bases_pretes.add(DATABASE_PATH)
+    except Exception as e:
+        print(f"Erreur lors de la création des statistiques de prix: {e}")
+        conn.rollback()
+        return
+    finally:
+        conn.close()
+
+    if jamais_calcule:
+        recalculer_statistiques_prix()
+
+def montant_gamme_budget(gamme_budget: Optional[str]) -> Optional[float]:
+    """Montant représentatif d'une gamme de budget, None si non chiffrée (« À déterminer »)"""
+    return MONTANTS_GAMMES_BUDGET.get(gamme_budget or '')
+
+def _log_budgets(gammes_budget: List[str]) -> np.ndarray:
+    """Logarithme du montant représentatif de chaque gamme, NaN si non chiffrée"""
+    return np.log(np.array([montant_gamme_budget(g) or np.nan for g in gammes_budget], dtype=np.float64))
+
+def _variables(types_projets: List[str], gammes_budget: List[str], urgences: List[str],
+               colonnes: List[str], log_budget_defaut: float) -> np.ndarray:
+    """
+    Matrice de conception : constante, log du budget, budget inconnu, urgences et écarts par type.
+
+    Un budget non chiffré prend log_budget_defaut (médiane des budgets chiffrés),
+    l'indicateur budget_inconnu en corrigeant l'écart.
+    """
+    log_budgets = _log_budgets(gammes_budget)
+    inconnu = np.isnan(log_budgets)
+    matrice = np.zeros((len(types_projets), len(colonnes)))
+    position = {c: i for i, c in enumerate(colonnes)}
+    matrice[:, position['constante']] = 1.0
+    matrice[:, position['log_budget']] = np.where(inconnu, log_budget_defaut, log_budgets)
+    matrice[:, position['budget_inconnu']] = inconnu
+    for i, (type_projet, urgence) in enumerate(zip(types_projets, urgences)):
+        if f"urgence:{urgence}" in position:
+            matrice[i, position[f"urgence:{urgence}"]] = 1.0
+        if f"type:{type_projet}" in position:
+            matrice[i, position[f"type:{type_projet}"]] = 1.0
+    return matrice
+
+def ajuster_modele(types_projets: List[str], gammes_budget: List[str], urgences: List[str],
+                   montants: np.ndarray, acceptees: np.ndarray) -> Dict[str, float]:
+    """
+    Régression pondérée de log(montant) ; retourne {variable: coefficient} et 'sigma'.
+
+    L'urgence « normal » sert de référence. Hors constante, chaque
+    coefficient est pénalisé (ridge) vers sa valeur a priori : 1 pour
+    log_budget, 0 pour les autres ; un type peu représenté, ou une variable
+    sans variation dans les données, reste à sa valeur a priori.
+    """
+    colonnes = (['constante', 'log_budget', 'budget_inconnu']
+                + [f"urgence:{u}" for u in NIVEAUX_URGENCE if u != 'normal']
+                + [f"type:{t}" for t in sorted(set(types_projets))])
+    log_budgets = _log_budgets(gammes_budget)
+    connus = log_budgets[~np.isnan(log_budgets)]
+    log_budget_defaut = float(np.median(connus)) if len(connus) else math.log(MONTANTS_GAMMES_BUDGET["15 000$ - 30 000$"])
+    x = _variables(types_projets, gammes_budget, urgences, colonnes, log_budget_defaut)
+    y = np.log(montants)
+    poids = np.sqrt(np.where(acceptees, POIDS_ACCEPTEE, 1.0))
+
+    # Lignes de pénalité : sqrt(lambda) * (coefficient - valeur a priori)
+    penalite = np.sqrt(PENALITE) * np.eye(len(colonnes))[1:]
+    a_priori = np.array([c == 'log_budget' for c in colonnes[1:]], dtype=np.float64)
+    a = np.vstack([x * poids[:, None], penalite])
+    b = np.concatenate([y * poids, np.sqrt(PENALITE) * a_priori])
+    coefficients, *_ = np.linalg.lstsq(a, b, rcond=None)
+
+    residus = y - x @ coefficients
+    poids_carres = poids ** 2
+    sigma = math.sqrt(float(np.sum(poids_carres * residus ** 2) / np.sum(poids_carres)))
+    modele = dict(zip(colonnes, coefficients.tolist()))
+    modele.update({'sigma': sigma, 'nb_observations': float(len(y)), 'log_budget_defaut': log_budget_defaut})
+    return modele
+
+def _statistiques_groupe(montants: np.ndarray, acceptees: np.ndarray) -> Tuple[tuple, List[tuple]]:
+    """(nb, nb_acceptees, percentiles..., moyenne) et tranches (n°, borne_min, borne_max, nb, nb_acceptees)"""
+    percentiles = np.percentile(montants, PERCENTILES)
+    ligne = (len(montants), int(acceptees.sum()), *percentiles.tolist(), float(montants.mean()))
+    bornes = [None, float(percentiles[1]), float(percentiles[2]), float(percentiles[3]), None]
+    tranches = []
+    for i in range(4):
+        dans = np.ones(len(montants), dtype=bool)
+        if bornes[i] is not None:
+            dans &= montants >= bornes[i]
+        if bornes[i + 1] is not None:
+            dans &= montants < bornes[i + 1]
+        tranches.append((i, bornes[i], bornes[i + 1], int(dans.sum()), int(acceptees[dans].sum())))
+    return ligne, tranches
+
+def recalculer_statistiques_prix() -> Dict[str, int]:
+    """Calcul complet (tâche de nuit) : groupes, tranches et modèle remplacés en une transaction"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    resultat = {'soumissions': 0, 'groupes': 0}
+
+    try:
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute('''
+            SELECT s.id, s.montant, s.statut = 'acceptee', COALESCE(l.type_projet, ''),
+                   COALESCE(l.budget, ''), COALESCE(l.niveau_urgence, 'normal')
+            FROM soumissions s
+            JOIN leads l ON l.id = s.lead_id
+            WHERE s.montant > 0
+        ''')
+        lignes = cursor.fetchall()
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM soumissions')
+        derniere_soumission_id = cursor.fetchone()[0]
+
+        cursor.execute('DELETE FROM stats_prix_soumissions')
+        cursor.execute('DELETE FROM stats_prix_tranches')
+        cursor.execute('DELETE FROM modele_prix_soumissions')
+
+        if lignes:
+            _, montants, acceptees, types_projets, gammes, urgences = (list(c) for c in zip(*lignes))
+            montants = np.array(montants, dtype=np.float64)
+            acceptees = np.array(acceptees, dtype=bool)
+
+            groupes: Dict[Tuple[str, str], List[int]] = {}
+            for i, (type_projet, gamme) in enumerate(zip(types_projets, gammes)):
+                for cle in ((type_projet, gamme), (type_projet, TOUS), (TOUS, TOUS)):
+                    groupes.setdefault(cle, []).append(i)
+
+            for (type_projet, gamme), indices in groupes.items():
+                if len(indices) < NB_MIN_SOUMISSIONS:
+                    continue
+                ligne, tranches = _statistiques_groupe(montants[indices], acceptees[indices])
+                cursor.execute('''
+                    INSERT INTO stats_prix_soumissions
+                    (type_projet, gamme_budget, nb_soumissions, nb_acceptees, p10, p25, p50, p75, p90, moyenne)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (type_projet, gamme) + ligne)
+                cursor.executemany('''
+                    INSERT INTO stats_prix_tranches
+                    (type_projet, gamme_budget, tranche, borne_min, borne_max, nb_soumissions, nb_acceptees)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', [(type_projet, gamme) + t for t in tranches])
+                resultat['groupes'] += 1
+
+            if len(lignes) >= NB_MIN_SOUMISSIONS:
+                modele = ajuster_modele(types_projets, gammes, urgences, montants, acceptees)
+                cursor.executemany('INSERT INTO modele_prix_soumissions (variable, coefficient) VALUES (?, ?)',
+                                   list(modele.items()))
+
+        cursor.execute('''
+            INSERT OR REPLACE INTO stats_prix_calcul (id, derniere_soumission_id, date_calcul) VALUES (1, ?, ?)
+        ''', (derniere_soumission_id, datetime.datetime.now().isoformat(timespec='seconds')))
+        conn.commit()
+        resultat['soumissions'] = len(lignes)
+    except Exception as e:
+        print(f"Erreur lors du calcul des statistiques de prix: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+    return resultat
+
+def enregistrer_acceptation(cursor: sqlite3.Cursor, soumission_id: int):
+    """
+    Compte une acceptation dans les groupes et tranches de la soumission.
+
+    S'exécute dans la transaction qui accepte la soumission. Une soumission
+    arrivée après le dernier calcul n'y figure pas encore : elle est aussi
+    ajoutée au nombre de soumissions.
+    """
+    cursor.execute('''
+        SELECT s.montant, COALESCE(l.type_projet, ''), COALESCE(l.budget, ''),
+               s.id > (SELECT derniere_soumission_id FROM stats_prix_calcul WHERE id = 1)
+        FROM soumissions s
+        JOIN leads l ON l.id = s.lead_id
+        WHERE s.id = ?
+    ''', (soumission_id,))
+    ligne = cursor.fetchone()
+    if ligne is None or ligne[3] is None:
+        return
+    montant, type_projet, gamme, nouvelle = ligne
+    groupes = [(type_projet, gamme), (type_projet, TOUS), (TOUS, TOUS)]
+    cursor.executemany('''
+        UPDATE stats_prix_soumissions
+        SET nb_acceptees = nb_acceptees + 1, nb_soumissions = nb_soumissions + ?
+        WHERE type_projet = ? AND gamme_budget = ?
+    ''', [(nouvelle, t, g) for t, g in groupes])
+    cursor.executemany('''
+        UPDATE stats_prix_tranches
+        SET nb_acceptees = nb_acceptees + 1, nb_soumissions = nb_soumissions + ?
+        WHERE type_projet = ? AND gamme_budget = ?
+          AND (borne_min IS NULL OR ? >= borne_min) AND (borne_max IS NULL OR ? < borne_max)
+    ''', [(nouvelle, t, g, montant, montant) for t, g in groupes])
+
+def fourchette_suggeree(modele: Dict[str, float], type_projet: str, gamme_budget: str,
+                        niveau_urgence: str) -> Optional[Tuple[float, float, float]]:
+    """(bas, milieu, haut) du montant suggéré selon le modèle"""
+    if not modele:
+        return None
+    colonnes = [c for c in modele if c not in PARAMETRES_MODELE]
+    x = _variables([type_projet], [gamme_budget], [niveau_urgence], colonnes, modele['log_budget_defaut'])[0]
+    prediction = float(x @ np.array([modele[c] for c in colonnes]))
+    ecart = Z_FOURCHETTE * modele['sigma']
+    return math.exp(prediction - ecart), math.exp(prediction), math.exp(prediction + ecart)
+
+def _lire_groupe(cursor: sqlite3.Cursor, type_projet: str, gamme_budget: str) -> Optional[Dict]:
+    """Groupe le plus précis disponible et ses tranches, sans fourchette"""
+    cursor.execute('''
+        SELECT * FROM stats_prix_soumissions
+        WHERE (type_projet = ? AND gamme_budget IN (?, ?)) OR (type_projet = ? AND gamme_budget = ?)
+        ORDER BY (type_projet = ?) DESC, (gamme_budget = ?) DESC
+        LIMIT 1
+    ''', (type_projet, gamme_budget, TOUS, TOUS, TOUS, type_projet, gamme_budget))
+    groupe = cursor.fetchone()
+    if groupe is None:
+        return None
+    cursor.execute('''
+        SELECT borne_min, borne_max, nb_soumissions, nb_acceptees FROM stats_prix_tranches
+        WHERE type_projet = ? AND gamme_budget = ? ORDER BY tranche
+    ''', (groupe['type_projet'], groupe['gamme_budget']))
+    tranches = [dict(row) for row in cursor.fetchall()]
+
+    contexte = dict(groupe)
+    contexte['taux_acceptation'] = contexte['nb_acceptees'] / contexte['nb_soumissions']
+    for tranche in tranches:
+        tranche['taux_acceptation'] = tranche['nb_acceptees'] / tranche['nb_soumissions'] if tranche['nb_soumissions'] else None
+    contexte['tranches'] = tranches
+    return contexte
+
+def _lire_modele(cursor: sqlite3.Cursor) -> Dict[str, float]:
+    cursor.execute('SELECT variable, coefficient FROM modele_prix_soumissions')
+    return {row['variable']: row['coefficient'] for row in cursor.fetchall()}
+
+def get_contexte_prix(type_projet: Optional[str], gamme_budget: Optional[str],
+                      niveau_urgence: Optional[str] = 'normal') -> Optional[Dict]:
+    """
+    Contexte de marché d'un projet, lu dans les tables précalculées.
+
+    Groupe le plus précis disponible : type et gamme de budget, sinon le
+    type, sinon tous les projets. Retourne None sans aucune statistique.
+    """
+    type_projet, gamme_budget = type_projet or '', gamme_budget or ''
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    try:
+        contexte = _lire_groupe(cursor, type_projet, gamme_budget)
+        if contexte is None:
+            return None
+        modele = _lire_modele(cursor)
+    except sqlite3.OperationalError:
+        # Tables pas encore créées
+        return None
+    finally:
+        conn.close()
+
+    contexte['fourchette'] = fourchette_suggeree(modele, type_projet, gamme_budget, niveau_urgence or 'normal')
+    return contexte
+
+def get_contextes_prix(projets: List[Dict]) -> Dict[int, Optional[Dict]]:
+    """
+    Contextes de marché d'une page de projets, par id de projet.
+
+    Une connexion et un modèle pour la page, un groupe lu par couple
+    (type de projet, gamme de budget) distinct ; la fourchette suit
+    l'urgence de chaque projet.
+    """
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    try:
+        groupes = {}
+        for projet in projets:
+            cle = (projet['type_projet'] or '', projet['budget'] or '')
+            if cle not in groupes:
+                groupes[cle] = _lire_groupe(cursor, *cle)
+        modele = _lire_modele(cursor) if any(groupes.values()) else {}
+    except sqlite3.OperationalError:
+        # Tables pas encore créées
+        return {projet['id']: None for projet in projets}
+    finally:
+        conn.close()
+
+    contextes = {}
+    for projet in projets:
+        cle = (projet['type_projet'] or '', projet['budget'] or '')
+        groupe = groupes[cle]
+        if groupe is None:
+            contextes[projet['id']] = None
+            continue
+        contexte = dict(groupe)
+        contexte['fourchette'] = fourchette_suggeree(modele, *cle, projet.get('niveau_urgence') or 'normal')
+        contextes[projet['id']] = contexte
+    return contextes
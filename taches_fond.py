@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tâches de fond SEAOP
+
+Streamlit réexécute les pages à chaque interaction et n'offre pas de
+planificateur : les traitements périodiques (alertes des recherches
+sauvegardées, calculs de nuit...) sont enregistrés ici et exécutés par un
+unique fil d'exécution démon par processus.
+
+Usage :
+    enregistrer_tache('alertes', evaluer_alertes, intervalle_secondes=60)
+    demarrer_taches_fond()   # idempotent, appelé à chaque rendu de page
+"""
+
+import datetime
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from metriques import compteur, histogramme
+
+# Granularité (secondes) de la boucle du fil de tâches
+PAS_BOUCLE = 1.0
+
+class _Tache:
+    """Tâche périodique : fonction, intervalle et prochaine échéance"""
+
+    def __init__(self, nom: str, fonction: Callable[[], object], intervalle_secondes: float):
+        self.nom = nom
+        self.fonction = fonction
+        self.intervalle = intervalle_secondes
+        self.prochaine_execution = 0.0
+        self.derniere_duree: Optional[float] = None
+        self.derniere_erreur: Optional[str] = None
+        self.executions = 0
+
+DUREE_TACHES = histogramme('seaop_tache_duree_secondes', "Durée des exécutions des tâches de fond", ('tache',))
+ERREURS_TACHES = compteur('seaop_tache_erreurs_total', "Exécutions des tâches de fond en erreur", ('tache',))
+
+_taches: Dict[str, _Tache] = {}
+_verrou = threading.Lock()
+_fil: Optional[threading.Thread] = None
+
+def enregistrer_tache(nom: str, fonction: Callable[[], object], intervalle_secondes: float,
+                      delai_initial: float = 0.0, remplacer: bool = True):
+    """
+    Enregistre une tâche exécutée toutes les intervalle_secondes.
+
+    Avec remplacer=False, une tâche déjà enregistrée sous ce nom est conservée
+    telle quelle (appel sans effet à chaque rendu de page).
+    """
+    tache = _Tache(nom, fonction, intervalle_secondes)
+    tache.prochaine_execution = time.time() + delai_initial
+    with _verrou:
+        if remplacer or nom not in _taches:
+            _taches[nom] = tache
+
+def secondes_avant(heure: int, maintenant: Optional[datetime.datetime] = None) -> float:
+    """Secondes jusqu'à la prochaine occurrence de heure:00 (délai initial d'une tâche de nuit)"""
+    maintenant = maintenant or datetime.datetime.now()
+    echeance = maintenant.replace(hour=heure, minute=0, second=0, microsecond=0)
+    if echeance <= maintenant:
+        echeance += datetime.timedelta(days=1)
+    return (echeance - maintenant).total_seconds()
+
+def executer_taches_dues(maintenant: Optional[float] = None) -> int:
+    """Exécute les tâches arrivées à échéance ; retourne le nombre de tâches exécutées"""
+    maintenant = time.time() if maintenant is None else maintenant
+    with _verrou:
+        dues = [t for t in _taches.values() if t.prochaine_execution <= maintenant]
+        for tache in dues:
+            tache.prochaine_execution = maintenant + tache.intervalle
+
+    for tache in dues:
+        debut = time.perf_counter()
+        try:
+            tache.fonction()
+            tache.derniere_erreur = None
+        except Exception as e:
+            tache.derniere_erreur = str(e)
+            ERREURS_TACHES.incrementer(tache=tache.nom)
+            print(f"Erreur dans la tâche de fond {tache.nom}: {e}")
+        tache.derniere_duree = time.perf_counter() - debut
+        tache.executions += 1
+        DUREE_TACHES.observer(tache.derniere_duree, tache=tache.nom)
+    return len(dues)
+
+def _boucle():
+    while True:
+        executer_taches_dues()
+        time.sleep(PAS_BOUCLE)
+
+def demarrer_taches_fond():
+    """Démarre le fil des tâches de fond s'il ne tourne pas déjà dans ce processus"""
+    global _fil
+    with _verrou:
+        if _fil is not None and _fil.is_alive():
+            return
+        _fil = threading.Thread(target=_boucle, name='seaop-taches-fond', daemon=True)
+        _fil.start()
+
+def get_etat_taches() -> Dict[str, Dict]:
+    """État de chaque tâche (intervalle, exécutions, dernière durée et erreur)"""
+    with _verrou:
+        return {
+            nom: {
+                'intervalle': t.intervalle,
+                'executions': t.executions,
+                'derniere_duree': t.derniere_duree,
+                'derniere_erreur': t.derniere_erreur,
+                'prochaine_execution': t.prochaine_execution,
+            }
+            for nom, t in _taches.items()
+        }
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de l'appariement projets / entrepreneurs SEAOP
+Valide la normalisation des zones, la reprise, la réindexation et la diffusion ciblée
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import appariement_leads
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec quatre entrepreneurs aux profils variés"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE entrepreneurs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, nom_entreprise TEXT,
+            zones_desservies TEXT, types_projets TEXT, statut TEXT DEFAULT 'actif'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, utilisateur_type TEXT NOT NULL,
+            utilisateur_id INTEGER NOT NULL, type_notification TEXT NOT NULL,
+            titre TEXT NOT NULL, message TEXT NOT NULL, lien_id INTEGER,
+            lu BOOLEAN DEFAULT 0, date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.executemany(
+        "INSERT INTO entrepreneurs (nom_entreprise, zones_desservies, types_projets, statut) VALUES (?, ?, ?, ?)",
+        [
+            ('Montréal Cuisines', 'H1A, h2b 3c4; Montréal', 'Rénovation cuisine,Plancher', 'actif'),
+            ('Québec Toitures', 'G1A,G1B', 'Toiture', 'actif'),
+            ('Région H', 'H*', '', 'actif'),
+            ('Partout', '', 'Rénovation cuisine', 'suspendu'),
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return chemin
+
+def test_extraction_zones():
+    """Codes postaux, RTA, régions et mentions libres"""
+    assert appariement_leads.extraire_zones('H1A, h2b 3c4; Montréal') == {'H1A', 'H2B'}
+    assert appariement_leads.extraire_zones('H*\nJ') == {'H', 'J'}
+    assert appariement_leads.extraire_zones('Partout au Québec') == {'*'}
+    assert appariement_leads.extraire_types(' Toiture , Plancher,') == {'Toiture', 'Plancher'}
+    assert appariement_leads.zones_du_code_postal('h2b 3c4') == ['*', 'H', 'H2B']
+    print("Normalisation des zones OK")
+
+def test_appariement():
+    """Seuls les entrepreneurs actifs couvrant la zone et le type sont notifiés"""
+    print("=== TEST APPARIEMENT PROJETS / ENTREPRENEURS ===")
+    chemin_original = appariement_leads.DATABASE_PATH
+    appariement_leads.DATABASE_PATH = preparer_base_test()
+    try:
+        verifier_appariement()
+    finally:
+        appariement_leads.DATABASE_PATH = chemin_original
+
+def verifier_appariement():
+    """Reprise, diffusion en lot et réindexation d'un profil"""
+    admissibles = appariement_leads.get_entrepreneurs_admissibles
+    # Reprise : l'entrepreneur 3 (région H, tous types) couvre tout Montréal
+    assert sorted(admissibles('H2B 3C4', 'Rénovation cuisine')) == [1, 3]
+    assert admissibles('H9Z 1A1', 'Rénovation cuisine') == [3]
+    assert admissibles('G1A 1A1', 'Toiture') == [2]
+    assert admissibles('G1A 1A1', 'Plancher') == []
+    print("Reprise et résolution des admissibles OK")
+
+    conn = sqlite3.connect(appariement_leads.DATABASE_PATH)
+    cursor = conn.cursor()
+    notifies = appariement_leads.notifier_entrepreneurs_admissibles(cursor, 42, 'H1A 2B3', 'Plancher')
+    conn.commit()
+    cursor.execute("SELECT utilisateur_id, type_notification, lien_id FROM notifications ORDER BY utilisateur_id")
+    assert notifies == 2
+    assert cursor.fetchall() == [(1, 'projet_correspondant', 42), (3, 'projet_correspondant', 42)]
+    conn.close()
+    print("Diffusion ciblée des notifications OK")
+
+    # Le profil mis à jour remplace l'ancien index
+    assert appariement_leads.indexer_entrepreneur(2, 'H2B', 'Toiture')
+    assert sorted(admissibles('H2B 1A1', 'Toiture')) == [2, 3]
+    assert admissibles('G1A 1A1', 'Toiture') == []
+
+    # La suppression d'un entrepreneur nettoie l'index
+    conn = sqlite3.connect(appariement_leads.DATABASE_PATH)
+    conn.execute("DELETE FROM entrepreneurs WHERE id = 3")
+    conn.commit()
+    restants = conn.execute("SELECT COUNT(*) FROM entrepreneur_zones WHERE entrepreneur_id = 3").fetchone()[0]
+    conn.close()
+    assert restants == 0
+    assert admissibles('H2B 1A1', 'Toiture') == [2]
+    print("Réindexation et suppression OK")
+
+if __name__ == "__main__":
+    test_extraction_zones()
+    test_appariement()
+    print("\nSUCCES - Appariement projets / entrepreneurs fonctionnel")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de l'écrivain unique SEAOP
+Valide le regroupement des écritures, l'isolement des erreurs et les lectures WAL concurrentes
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.append('.')
+
+import base_donnees
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec une table de notifications"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('''
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, utilisateur_id INTEGER NOT NULL, titre TEXT UNIQUE
+        )
+    ''')
+    conn.commit()
+    conn.close()
+    return chemin
+
+def inserer_notification(cursor, utilisateur_id, titre):
+    cursor.execute('INSERT INTO notifications (utilisateur_id, titre) VALUES (?, ?)', (utilisateur_id, titre))
+    return cursor.lastrowid
+
+def test_ecrivain_unique():
+    """Écritures concurrentes regroupées, résultats et erreurs rendus à chaque appelant"""
+    print("=== TEST ÉCRIVAIN UNIQUE ===")
+    chemin = preparer_base_test()
+    ecrivain = base_donnees.get_ecrivain(chemin)
+    assert base_donnees.get_ecrivain(chemin) is ecrivain
+
+    # 8 fils de 25 écritures : chaque appelant reçoit l'id de sa ligne
+    ids = []
+    def session(numero):
+        for i in range(25):
+            ids.append(base_donnees.executer_ecriture(inserer_notification, numero, f"{numero}-{i}", chemin=chemin))
+    fils = [threading.Thread(target=session, args=(n,)) for n in range(8)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    assert sorted(ids) == list(range(1, 201))
+    assert ecrivain.operations == 200 and ecrivain.groupes < 200, (ecrivain.operations, ecrivain.groupes)
+
+    # Une opération en erreur est annulée seule ; les autres du groupe sont validées
+    futures = [base_donnees.ecrire(inserer_notification, 1, titre, chemin=chemin)
+               for titre in ('nouveau-1', '0-0', 'nouveau-2')]
+    assert futures[0].result() and futures[2].result()
+    try:
+        futures[1].result()
+        assert False, "doublon accepté"
+    except sqlite3.IntegrityError:
+        pass
+    assert base_donnees.executer_sql('DELETE FROM notifications WHERE titre LIKE ?', ('nouveau-%',),
+                                     chemin=chemin) is not None
+
+    # Lecture WAL : instantané cohérent pendant une écriture, écriture refusée
+    lecture = base_donnees.connecter_lecture(chemin)
+    assert lecture.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    lecture.execute('BEGIN')
+    avant = lecture.execute('SELECT COUNT(*) FROM notifications').fetchone()[0]
+    base_donnees.executer_sql('INSERT INTO notifications (utilisateur_id, titre) VALUES (9, ?)', ('pendant',),
+                              chemin=chemin)
+    assert lecture.execute('SELECT COUNT(*) FROM notifications').fetchone()[0] == avant == 200
+    lecture.execute('COMMIT')
+    assert lecture.execute('SELECT COUNT(*) FROM notifications').fetchone()[0] == 201
+    try:
+        lecture.execute('DELETE FROM notifications')
+        assert False, "écriture acceptée en lecture"
+    except sqlite3.OperationalError:
+        pass
+    lecture.close()
+
+    # Une opération ne peut pas attendre une autre opération (blocage de l'écrivain)
+    def imbriquee(cursor):
+        return base_donnees.ecrire(inserer_notification, 1, 'imbriquee', chemin=chemin)
+    try:
+        base_donnees.executer_ecriture(imbriquee, chemin=chemin)
+        assert False, "écriture imbriquée acceptée"
+    except RuntimeError:
+        pass
+
+    # Transaction interrompue par une opération : le groupe échoue, l'écrivain continue
+    def interrompre(cursor):
+        cursor.execute('ROLLBACK')
+        raise ValueError("transaction interrompue")
+    suivante = base_donnees.ecrire(inserer_notification, 1, 'apres interruption', chemin=chemin)
+    try:
+        base_donnees.executer_ecriture(interrompre, chemin=chemin)
+        assert False, "interruption ignorée"
+    except (ValueError, sqlite3.Error):
+        pass
+    try:
+        suivante.result(timeout=5)
+    except sqlite3.Error:
+        pass
+    assert ecrivain._fil.is_alive()
+    assert base_donnees.executer_ecriture(inserer_notification, 1, 'reprise', chemin=chemin) > 0
+
+    # Un fil écrivain arrêté est remplacé au prochain appel
+    ecrivain._fil = threading.Thread(target=lambda: None)
+    ecrivain._fil.start()
+    ecrivain._fil.join()
+    remplacant = base_donnees.get_ecrivain(chemin)
+    assert remplacant is not ecrivain and remplacant._fil.is_alive()
+    assert base_donnees.executer_ecriture(inserer_notification, 1, 'remplacant', chemin=chemin) > 0
+    print(f"{ecrivain.operations} opérations en {ecrivain.groupes} groupes")
+
+if __name__ == "__main__":
+    test_ecrivain_unique()
+    print("\nSUCCES - Écrivain unique fonctionnel")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test du chargement parallèle des tableaux de bord SEAOP
+Valide la durée des lectures concurrentes, les connexions de lecture par fil,
+la trace du rerun, la propagation des erreurs et le tableau de bord entrepreneur
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append('.')
+
+import acces_donnees
+import chargement_parallele
+import instrumentation
+
+def preparer_base_test() -> str:
+    """Base temporaire : 3 soumissions de l'entrepreneur 1 dont 2 acceptées et évaluées"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.executescript('''
+        CREATE TABLE leads (id INTEGER PRIMARY KEY AUTOINCREMENT, type_projet TEXT);
+        CREATE TABLE soumissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, lead_id INTEGER, entrepreneur_id INTEGER, montant REAL,
+            statut TEXT, date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE evaluations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, soumission_id INTEGER, evaluateur_type TEXT, note INTEGER,
+            commentaire TEXT, date_evaluation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO leads (type_projet) VALUES ('Toiture'), ('Cuisine');
+        INSERT INTO soumissions (lead_id, entrepreneur_id, montant, statut) VALUES
+            (1, 1, 10000, 'acceptee'), (2, 1, 20000, 'acceptee'), (2, 1, 5000, 'refusee'), (1, 2, 8000, 'acceptee');
+        INSERT INTO evaluations (soumission_id, evaluateur_type, note, commentaire, date_evaluation) VALUES
+            (1, 'client', 5, 'Impeccable', '2024-05-01'), (2, 'client', 3, '', '2024-06-01'),
+            (4, 'client', 1, 'Autre entrepreneur', '2024-07-01');
+    ''')
+    conn.commit()
+    conn.close()
+    return chemin
+
+def test_lectures_concurrentes():
+    """Durée proche de la plus lente, une connexion en lecture seule par fil, erreurs propagées"""
+    print("=== TEST LECTURES CONCURRENTES ===")
+    chemin = preparer_base_test()
+    fils, connexions = set(), set()
+
+    def lecture_lente(conn):
+        fils.add(threading.current_thread().name)
+        connexions.add(id(conn))
+        time.sleep(0.2)
+        return conn.execute('SELECT COUNT(*) FROM soumissions').fetchone()[0]
+
+    lectures = {f"lecture_{i}": lecture_lente for i in range(chargement_parallele.TAILLE_POOL)}
+    debut = time.perf_counter()
+    resultats = chargement_parallele.charger_en_parallele(lectures, chemin)
+    duree = time.perf_counter() - debut
+    assert list(resultats) == list(lectures) and set(resultats.values()) == {4}
+    assert duree < 0.2 * 2, f"{duree:.2f} s"
+    assert len(fils) == chargement_parallele.TAILLE_POOL
+    assert all(nom.startswith('seaop-lecture') for nom in fils)
+
+    # Connexions du fil réutilisées d'un chargement à l'autre, écriture refusée
+    chargement_parallele.charger_en_parallele(lectures, chemin)
+    assert len(connexions) == chargement_parallele.TAILLE_POOL
+
+    def ecriture(conn):
+        conn.execute("DELETE FROM soumissions")
+
+    try:
+        chargement_parallele.charger_en_parallele({'ecriture': ecriture, 'lecture': lecture_lente}, chemin)
+        assert False, "écriture acceptée"
+    except sqlite3.OperationalError:
+        pass
+
+    # Chargement imbriqué depuis un fil du pool : à la suite, sans bloquer le pool
+    imbrique = lambda conn: chargement_parallele.charger_en_parallele(
+        {f"sous_{i}": lambda c: 1 for i in range(chargement_parallele.TAILLE_POOL * 2)}, chemin)
+    resultats = chargement_parallele.charger_en_parallele(
+        {f"imbrique_{i}": imbrique for i in range(chargement_parallele.TAILLE_POOL)}, chemin)
+    assert all(sum(r.values()) == chargement_parallele.TAILLE_POOL * 2 for r in resultats.values())
+    print("Lectures concurrentes OK")
+
+def test_trace_et_tableau_de_bord():
+    """Requêtes des fils imputées au rerun ; tableau de bord identique aux fonctions séparées"""
+    print("=== TEST TABLEAU DE BORD ENTREPRENEUR ===")
+    # Instrumentation installée avant l'ouverture des connexions de lecture de cette base
+    instrumentation.installer()
+    chemin = preparer_base_test()
+    instrumentation.FICHIER_TRACES = os.path.join(os.path.dirname(chemin), 'traces_reruns.jsonl')
+    chemin_original = acces_donnees.DATABASE_PATH
+    acces_donnees.DATABASE_PATH = chemin
+    try:
+        tableau = acces_donnees.get_tableau_de_bord_entrepreneur(1)
+        assert tableau['evaluations'] == acces_donnees.get_evaluations_entrepreneur(1)
+        assert tableau['commentaires'] == acces_donnees.get_derniers_commentaires_entrepreneur(1)
+        assert tableau['stats'] == acces_donnees.get_stats_entrepreneur(1)
+        assert tableau['evaluations']['note_moyenne'] == 4.0
+        assert [c['commentaire'] for c in tableau['commentaires']] == ['Impeccable']
+        stats = tableau['stats']
+        assert (stats['total_soumissions'], stats['soumissions_acceptees'], stats['ca_total']) == (3, 2, 30000)
+
+        with instrumentation.tracer_rerun() as trace:
+            acces_donnees.get_tableau_de_bord_entrepreneur(1)
+        spans = {span['nom']: span for span in trace.en_dict()['spans']}
+        enfants = {span['nom']: span['requetes'] for span in spans['get_tableau_de_bord_entrepreneur']['enfants']}
+        assert enfants == {'soumissions': 1, 'evolution_mensuelle': 1, 'evaluations': 1, 'commentaires': 1}
+        assert trace.racine.requetes == 4
+    finally:
+        acces_donnees.DATABASE_PATH = chemin_original
+        # Les traces en mémoire sont partagées par les tests du processus
+        instrumentation._traces_recentes.clear()
+    print("Tableau de bord entrepreneur OK")
+
+if __name__ == "__main__":
+    test_lectures_concurrentes()
+    test_trace_et_tableau_de_bord()
+    print("\nSUCCES - Chargement parallèle des tableaux de bord fonctionnel")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test du registre unifié des demandes de services SEAOP
+Valide la reprise, la synchronisation par triggers et l'agrégat des statistiques
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import demandes_services
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec une estimation et deux demandes de technologue"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE estimations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, nom_client TEXT, email_client TEXT,
+            numero_reference TEXT, statut TEXT DEFAULT 'recue', prix_estimation REAL,
+            notes_internes TEXT, date_debut_analyse TIMESTAMP,
+            date_estimation_terminee TIMESTAMP, date_envoi_client TIMESTAMP,
+            date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE demandes_technologue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, nom_client TEXT, email_client TEXT,
+            numero_reference TEXT, statut TEXT DEFAULT 'recue', prix_service REAL,
+            superficie_batiment REAL, pourcentage_complete INTEGER DEFAULT 0,
+            niveau_urgence TEXT DEFAULT 'normal', notes_internes TEXT,
+            date_analyse TIMESTAMP, date_acceptation TIMESTAMP,
+            date_debut_plans TIMESTAMP, date_revision TIMESTAMP,
+            date_demande TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("INSERT INTO estimations (nom_client, email_client, numero_reference, prix_estimation, date_demande) VALUES ('A', 'a@test.ca', 'EST-1', 150, '2025-01-01')")
+    cursor.execute("INSERT INTO demandes_technologue (nom_client, email_client, numero_reference, statut, prix_service, superficie_batiment, date_demande) VALUES ('A', 'a@test.ca', 'TECH-1', 'en_cours', 5000, 2000, '2025-01-02')")
+    cursor.execute("INSERT INTO demandes_technologue (nom_client, email_client, numero_reference, prix_service, superficie_batiment, date_demande) VALUES ('B', 'b@test.ca', 'TECH-2', 3000, 1000, '2025-01-03')")
+    conn.commit()
+    conn.close()
+    return chemin
+
+def test_registre_services():
+    """Les demandes existantes et futures sont reflétées dans le registre"""
+    print("=== TEST REGISTRE DES DEMANDES DE SERVICES ===")
+    chemin_original = demandes_services.DATABASE_PATH
+    demandes_services.DATABASE_PATH = preparer_base_test()
+    try:
+        verifier_registre()
+    finally:
+        demandes_services.DATABASE_PATH = chemin_original
+
+def verifier_registre():
+    """Reprise, triggers d'insertion/mise à jour/suppression et statistiques"""
+    # Reprise des demandes existantes
+    demandes = demandes_services.get_demandes_services(email_client='a@test.ca')
+    assert [d['numero_reference'] for d in demandes] == ['TECH-1', 'EST-1']
+    print("Reprise des demandes existantes OK")
+
+    stats = demandes_services.get_stats_services()
+    assert stats['technologue']['total'] == 2
+    assert stats['technologue']['en_cours'] == 1
+    assert stats['technologue']['ca_total'] == 8000
+    assert stats['technologue']['superficie_moyenne'] == 1500
+    assert stats['estimation']['total'] == 1
+    assert stats['ingenieur']['total'] == 0
+
+    # Mise à jour par la fonction partagée, suivie par trigger
+    tech_2 = demandes_services.get_demandes_services(email_client='b@test.ca')[0]
+    assert demandes_services.mettre_a_jour_statut_demande('technologue', tech_2['demande_id'], 'revision', 'Note', 50)
+    tech_2 = demandes_services.get_demandes_services(email_client='b@test.ca')[0]
+    assert tech_2['statut'] == 'revision'
+    assert tech_2['pourcentage_complete'] == 50
+    assert demandes_services.get_stats_services()['technologue']['en_cours'] == 2
+    print("Mise à jour synchronisée OK")
+
+    # Insertion et suppression après la mise en place des triggers
+    conn = sqlite3.connect(demandes_services.DATABASE_PATH)
+    conn.execute("INSERT INTO estimations (nom_client, email_client, numero_reference, prix_estimation) VALUES ('B', 'b@test.ca', 'EST-2', 300)")
+    conn.execute("DELETE FROM demandes_technologue WHERE numero_reference = 'TECH-1'")
+    conn.commit()
+    conn.close()
+
+    references = {d['numero_reference'] for d in demandes_services.get_demandes_services()}
+    assert references == {'EST-1', 'EST-2', 'TECH-2'}
+    stats = demandes_services.get_stats_services()
+    assert stats['estimation']['ca_total'] == 450
+    assert stats['technologue']['total'] == 1
+    print("Insertion et suppression synchronisées OK")
+
+if __name__ == "__main__":
+    test_registre_services()
+    print("\nSUCCES - Registre des demandes de services fonctionnel")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la détection des projets republiés SEAOP
+Valide les signatures MinHash, l'index LSH, la reprise et le marquage à la publication
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append('.')
+
+import doublons_leads
+
+CUISINE = ("Rénovation complète de la cuisine : nouvelles armoires en merisier, comptoir de quartz blanc, "
+           "dosseret en céramique, îlot central avec évier double et robinetterie moderne.")
+CUISINE_RETOUCHEE = ("Rénovation complète de la cuisine: nouvelles armoires en érable, comptoir de quartz blanc, "
+                     "dosseret en céramique, îlot central avec évier double et robinetterie moderne!")
+TOITURE = "Remplacement de la toiture en bardeaux d'asphalte, ventilation de l'entretoit et gouttières neuves."
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec deux projets existants, non indexés"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, email TEXT, telephone TEXT, code_postal TEXT,
+            description TEXT, numero_reference TEXT,
+            visible_entrepreneurs BOOLEAN DEFAULT 1, accepte_soumissions BOOLEAN DEFAULT 1
+        )
+    ''')
+    conn.executemany('''
+        INSERT INTO leads (email, telephone, code_postal, description, numero_reference) VALUES (?, ?, ?, ?, ?)
+    ''', [
+        ('marie@exemple.ca', '514-555-0101', 'H2B 1A1', CUISINE, 'SEAOP-001'),
+        ('paul@exemple.ca', '418-555-0202', 'G1A 1A1', TOITURE, 'SEAOP-002'),
+    ])
+    conn.commit()
+    conn.close()
+    return chemin
+
+def publier(email: str, telephone: str, code_postal: str, description: str):
+    """Insère un projet et consulte l'index dans la même transaction, comme sauvegarder_lead"""
+    conn = sqlite3.connect(doublons_leads.DATABASE_PATH)
+    cursor = conn.cursor()
+    cursor.execute('INSERT INTO leads (email, telephone, code_postal, description) VALUES (?, ?, ?, ?)',
+                   (email, telephone, code_postal, description))
+    lead_id = cursor.lastrowid
+    original = doublons_leads.detecter_doublon(cursor, lead_id, description, email, telephone, code_postal)
+    conn.commit()
+    visible, doublon_de = cursor.execute('SELECT visible_entrepreneurs, doublon_de FROM leads WHERE id = ?',
+                                         (lead_id,)).fetchone()
+    conn.close()
+    return lead_id, original, visible, doublon_de
+
+def test_signatures():
+    """La proportion de minimums égaux estime la similarité de Jaccard"""
+    fragments = [doublons_leads.fragments(t) for t in (CUISINE, CUISINE_RETOUCHEE, TOITURE, '')]
+    signatures = doublons_leads.signatures(fragments)
+    assert signatures.shape == (4, doublons_leads.NOMBRE_HACHAGES) and signatures.dtype == np.uint32
+    a, b = set(fragments[0].tolist()), set(fragments[1].tolist())
+    jaccard = len(a & b) / len(a | b)
+    estimation = doublons_leads.similarite(signatures[0], signatures[1])
+    assert abs(estimation - jaccard) < 0.2, (estimation, jaccard)
+    assert doublons_leads.similarite(signatures[0], signatures[2]) < 0.1
+    assert (signatures[3] == doublons_leads.SIGNATURE_VIDE).all()
+
+    # Le calcul par lot (blocs de fragments) donne les mêmes signatures qu'un à un
+    taille_originale = doublons_leads.TAILLE_BLOC_FRAGMENTS
+    doublons_leads.TAILLE_BLOC_FRAGMENTS = 50
+    try:
+        assert (doublons_leads.signatures(fragments) == signatures).all()
+    finally:
+        doublons_leads.TAILLE_BLOC_FRAGMENTS = taille_originale
+    assert (doublons_leads.signatures(fragments[1:2])[0] == signatures[1]).all()
+    print(f"Jaccard {jaccard:.2f}, estimation MinHash {estimation:.2f}")
+
+def test_doublons():
+    """Reprise des projets existants puis marquage des republications"""
+    print("=== TEST DÉTECTION DES DOUBLONS ===")
+    chemin_original = doublons_leads.DATABASE_PATH
+    doublons_leads.DATABASE_PATH = preparer_base_test()
+    try:
+        verifier_doublons()
+    finally:
+        doublons_leads.DATABASE_PATH = chemin_original
+
+def verifier_doublons():
+    """Même client et description retouchée : doublon ; autre client ou autre projet : non"""
+    assert doublons_leads.indexer_leads_existants(taille_lot=1) == 2
+    assert doublons_leads.indexer_leads_existants() == 0
+    assert doublons_leads._reprises_faites[doublons_leads.DATABASE_PATH] == 2
+
+    # Même courriel, description retouchée : regroupé avec l'original et masqué
+    lead_id, original, visible, doublon_de = publier('Marie@Exemple.ca', '', 'H2B 1A1', CUISINE_RETOUCHEE)
+    assert original['id'] == 1 and original['numero_reference'] == 'SEAOP-001', original
+    assert (visible, doublon_de) == (0, 1)
+
+    # Troisième publication du même projet, par téléphone : rattachée au premier original
+    _, original, _, doublon_de = publier('autre@exemple.ca', '(514) 555-0101', 'J4B 1A1', CUISINE)
+    assert doublon_de == 1 and original['similarite'] == 1.0
+
+    # Même description, client différent : projet distinct
+    _, original, visible, _ = publier('voisin@exemple.ca', '450-555-0303', 'H3A 2B2', CUISINE)
+    assert original is None and visible == 1
+
+    # Même client, autre projet : diffusé normalement
+    _, original, _, _ = publier('marie@exemple.ca', '', 'H2B 1A1', TOITURE)
+    assert original is None
+
+    # L'original fermé, la republication est légitime
+    conn = sqlite3.connect(doublons_leads.DATABASE_PATH)
+    conn.execute('UPDATE leads SET accepte_soumissions = 0 WHERE id = 2')
+    conn.commit()
+    plan = ' '.join(str(r) for r in conn.execute(
+        'EXPLAIN QUERY PLAN SELECT lead_id FROM lead_bandes_lsh WHERE cle IN (1, 2, 3)'))
+    conn.close()
+    _, original, _, _ = publier('paul@exemple.ca', '', 'G1A 1A1', TOITURE)
+    assert original is None
+    assert 'PRIMARY KEY' in plan or 'sqlite_autoindex' in plan, plan
+
+    # Reprise incrémentale : un projet importé sans index au-delà de la dernière reprise est repris,
+    # les projets en deçà ne sont plus parcourus
+    conn = sqlite3.connect(doublons_leads.DATABASE_PATH)
+    importe = conn.execute('INSERT INTO leads (email, description) VALUES (?, ?)', ('import@exemple.ca', TOITURE)).lastrowid
+    conn.execute('DELETE FROM lead_minhash WHERE lead_id = 1')
+    conn.commit()
+    conn.close()
+    assert doublons_leads.indexer_leads_existants() == 1
+    assert doublons_leads._reprises_faites[doublons_leads.DATABASE_PATH] == importe
+    assert doublons_leads.indexer_leads_existants() == 0
+    print("Marquage des republications OK")
+
+if __name__ == "__main__":
+    test_signatures()
+    test_doublons()
+    print("\nSUCCES - Détection des doublons fonctionnelle")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des fils de discussion du Chat Room SEAOP
+Valide l'ordre des fils et des réponses, les comptes, le dépliage et les likes chargés en une requête
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import fils_chat
+
+def preparer_base_test() -> str:
+    """
+    Fils de test (id : parent) :
+    1 épinglé ; 2 ; 3 : 2 ; 4 : 2 ; 5 : 3 ; 6 : 2 supprimé ; 7 : 6 ; 8 : 2 ; 9
+    """
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.executescript('''
+        CREATE TABLE chat_room (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_type TEXT NOT NULL, user_name TEXT NOT NULL,
+            user_email TEXT NOT NULL, user_id INTEGER, message TEXT NOT NULL, parent_id INTEGER,
+            likes INTEGER DEFAULT 0, is_pinned BOOLEAN DEFAULT 0, is_deleted BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, user_badge TEXT
+        );
+        CREATE TABLE chat_room_likes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, message_id INTEGER NOT NULL, user_email TEXT NOT NULL,
+            UNIQUE(message_id, user_email)
+        );
+    ''')
+    messages = [(None, 1, 0), (None, 0, 0), (2, 0, 0), (2, 0, 0), (3, 0, 0), (2, 0, 1), (6, 0, 0), (2, 0, 0), (None, 0, 0)]
+    conn.executemany('''
+        INSERT INTO chat_room (user_type, user_name, user_email, message, parent_id, is_pinned, is_deleted, created_at)
+        VALUES ('client', 'Marie', 'marie@exemple.ca', ?, ?, ?, ?, ?)
+    ''', [(f"message {i}", parent, epingle, supprime, f"2025-06-01 10:{i:02d}:00")
+          for i, (parent, epingle, supprime) in enumerate(messages, start=1)])
+    conn.execute("INSERT INTO chat_room_likes (message_id, user_email) VALUES (5, 'paul@exemple.ca')")
+    conn.commit()
+    conn.close()
+    return chemin
+
+def test_fils_chat():
+    """Une requête par page : racines, réponses imbriquées, comptes et likes"""
+    print("=== TEST FILS DE DISCUSSION ===")
+    chemin = preparer_base_test()
+
+    fils = fils_chat.charger_fils('paul@exemple.ca', chemin=chemin)
+    # Épinglé d'abord, puis les racines les plus récentes
+    assert [f['message']['id'] for f in fils] == [1, 9, 2]
+    fil = fils[2]
+    # 4 réponses visibles (la réponse supprimée masque sa propre réponse), 2 chargées repliées
+    assert fil['nb_reponses'] == 4 and not fil['complet']
+    assert [(r['id'], r['profondeur']) for r in fil['reponses']] == [(3, 1), (5, 2)]
+    assert fil['reponses'][1]['aime'] and not fil['message']['aime']
+    assert all(r['racine'] == 2 for r in fil['reponses'])
+    assert fils[1]['nb_reponses'] == 0 and fils[1]['complet']
+
+    # Fil déplié : toutes les réponses, dans l'ordre de la conversation
+    fil = fils_chat.charger_fils('paul@exemple.ca', fils_ouverts={2}, chemin=chemin)[2]
+    assert fil['complet'] and [(r['id'], r['profondeur']) for r in fil['reponses']] == [(3, 1), (5, 2), (4, 1), (8, 1)]
+
+    # Limite : nombre de racines non épinglées
+    assert [f['message']['id'] for f in fils_chat.charger_fils(limite=1, chemin=chemin)] == [1, 9]
+
+    # La récursion suit l'index des réponses
+    conn = sqlite3.connect(chemin)
+    plan = ' '.join(str(r) for r in conn.execute('EXPLAIN QUERY PLAN ' + fils_chat.REQUETE_FILS.format(ouverts=''),
+                                                 (50, '', 2)))
+    conn.close()
+    assert 'idx_chatroom_parent' in plan, plan
+    print("Fils de discussion OK")
+
+if __name__ == "__main__":
+    test_fils_chat()
+    print("\nSUCCES - Fils de discussion fonctionnels")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test du générateur de données synthétiques SEAOP
+Valide les volumes, les contraintes du schéma et le déterminisme pour une graine donnée
+"""
+
+import hashlib
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+
+TABLES = ['entrepreneurs', 'leads', 'soumissions', 'messages', 'notifications', 'chat_room', 'chat_room_likes']
+
+def generer(graine: int = 7) -> str:
+    """Base générée à petite échelle par la ligne de commande ; retourne son chemin"""
+    dossier = tempfile.mkdtemp()
+    subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generer_donnees.py'),
+                    '--data-dir', dossier, '--graine', str(graine), '--leads', '500', '--entrepreneurs', '40',
+                    '--soumissions', '4000', '--messages', '6000', '--notifications', '2000', '--chat', '600',
+                    '--likes-chat', '900', '--taille-pieces-jointes', '300', '--proportion-pieces-jointes', '0.2',
+                    '--taille-lot', '1000'],
+                   check=True, capture_output=True)
+    return os.path.join(dossier, 'seaop.db')
+
+def empreinte(chemin: str, table: str) -> str:
+    conn = sqlite3.connect(chemin)
+    lignes = conn.execute(f'SELECT * FROM {table} ORDER BY id').fetchall()
+    conn.close()
+    return hashlib.sha256(repr(lignes).encode()).hexdigest()
+
+def test_generer_donnees():
+    """Volumes demandés, contraintes respectées, même base pour la même graine"""
+    print("=== TEST GENERATEUR DE DONNEES ===")
+    chemin = generer()
+    conn = sqlite3.connect(chemin)
+    requete = lambda sql: conn.execute(sql).fetchone()[0]
+
+    assert [requete(f'SELECT COUNT(*) FROM {t}') for t in TABLES[:6]] == [40, 500, 4000, 6000, 2000, 600]
+    # Au plus une soumission acceptée par projet, jamais avant la publication du projet
+    assert requete("SELECT MAX(n) FROM (SELECT COUNT(*) n FROM soumissions WHERE statut = 'acceptee' GROUP BY lead_id)") == 1
+    assert requete('SELECT COUNT(*) FROM soumissions s JOIN leads l ON l.id = s.lead_id '
+                   'WHERE s.date_creation < l.date_creation') == 0
+    assert requete("SELECT COUNT(*) FROM leads WHERE accepte_soumissions = 0 AND id NOT IN "
+                   "(SELECT lead_id FROM soumissions WHERE statut = 'acceptee')") == 0
+    # Conversations sur des soumissions existantes
+    assert requete('SELECT COUNT(*) FROM messages m LEFT JOIN soumissions s '
+                   'ON s.lead_id = m.lead_id AND s.entrepreneur_id = m.entrepreneur_id WHERE s.id IS NULL') == 0
+    # Compteurs de likes tenus par les triggers, réponses à des messages existants
+    assert requete('SELECT SUM(likes) FROM chat_room') == requete('SELECT COUNT(*) FROM chat_room_likes')
+    assert requete('SELECT COUNT(*) FROM chat_room c WHERE parent_id IS NOT NULL '
+                   'AND NOT EXISTS (SELECT 1 FROM chat_room p WHERE p.id = c.parent_id)') == 0
+    assert requete("SELECT COUNT(*) FROM leads WHERE code_postal NOT GLOB '[GHJ][0-9][A-Z] [0-9][A-Z][0-9]'") == 0
+    assert requete('SELECT COUNT(*) FROM leads WHERE photos IS NOT NULL') > 0
+    assert requete('SELECT COUNT(*) FROM stats_prix_soumissions') > 0
+    conn.close()
+
+    autre = generer()
+    assert all(empreinte(chemin, t) == empreinte(autre, t) for t in TABLES)
+    assert empreinte(chemin, 'soumissions') != empreinte(generer(graine=8), 'soumissions')
+    print("Generateur OK")
+
+if __name__ == "__main__":
+    test_generer_donnees()
+    print("\nSUCCES - Generateur de donnees fonctionnel")
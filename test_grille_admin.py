@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des grilles d'administration SEAOP
+Valide le filtrage, le tri et la pagination par clé côté SQL
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import grille_admin
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec des demandes de technologue"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+    colonnes = GRILLE['colonnes'][1:]
+    cursor.execute(f'''
+        CREATE TABLE demandes_technologue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            {', '.join(colonnes)}
+        )
+    ''')
+    for i in range(1, 58):
+        ligne = {c: None for c in colonnes}
+        ligne.update({
+            'nom_client': f"Client {i}",
+            'statut': None if i % 11 == 0 else 'recue' if i % 3 else 'en_cours',
+            # Dates volontairement dupliquées pour vérifier le départage par id, et quelques dates absentes
+            'date_demande': None if i % 5 == 0 else f"2025-01-{(i % 10) + 1:02d} 10:00:00",
+            'prix_service': None if i % 7 == 0 else float(i * 100 % 1700)
+        })
+        cursor.execute(
+            f"INSERT INTO demandes_technologue ({', '.join(colonnes)}) VALUES ({', '.join('?' * len(colonnes))})",
+            [ligne[c] for c in colonnes]
+        )
+    conn.commit()
+    conn.close()
+    return chemin
+
+GRILLE = grille_admin.GRILLES_ADMIN['technologue']
+
+def parcourir(filtres, tri, taille_page):
+    """Parcourt toutes les pages d'une grille et retourne les ids dans l'ordre"""
+    ids = []
+    curseur = None
+    while True:
+        page = grille_admin.charger_page_grille('technologue', filtres, tri, curseur, taille_page)
+        ids.extend(ligne['id'] for ligne in page['lignes'])
+        if page['curseur_suivant'] is None:
+            return ids, page['total']
+        curseur = page['curseur_suivant']
+
+def test_pagination_grille():
+    """La pagination par clé donne le même résultat qu'un tri complet"""
+    print("=== TEST PAGINATION GRILLE ADMIN ===")
+    chemin_original = grille_admin.DATABASE_PATH
+    grille_admin.DATABASE_PATH = preparer_base_test()
+    grille_admin._index_verifies.clear()
+    try:
+        verifier_grille()
+    finally:
+        grille_admin.DATABASE_PATH = chemin_original
+        grille_admin._index_verifies.clear()
+
+def verifier_grille():
+    """Compare chaque parcours paginé au tri complet en Python"""
+    conn = sqlite3.connect(grille_admin.DATABASE_PATH)
+    rows = conn.execute("SELECT id, statut, date_demande, prix_service FROM demandes_technologue").fetchall()
+    conn.close()
+
+    attendus = {
+        'date_desc': sorted(rows, key=lambda r: (r[2] or '', r[0]), reverse=True),
+        'date_asc': sorted(rows, key=lambda r: (r[2] or '', r[0])),
+        'prix_desc': sorted(rows, key=lambda r: (r[3] or 0, r[0]), reverse=True),
+        'prix_asc': sorted(rows, key=lambda r: (r[3] or 0, r[0])),
+        'statut': sorted(rows, key=lambda r: (r[1] or '', r[0])),
+    }
+
+    for tri, ordre in attendus.items():
+        for filtre_statut in ('Tous', 'recue', 'en_cours'):
+            attendu = [r[0] for r in ordre if filtre_statut == 'Tous' or r[1] == filtre_statut]
+            ids, total = parcourir({'statut': filtre_statut}, tri, 8)
+            assert ids == attendu, f"Ordre incorrect pour {tri}/{filtre_statut}"
+            assert total == len(attendu)
+    print("Pagination conforme pour tous les tris et filtres")
+
+    # Les index composites sont créés à la première utilisation
+    conn = sqlite3.connect(grille_admin.DATABASE_PATH)
+    index = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    conn.close()
+    assert set(GRILLE['index']) <= index
+    assert not set(GRILLE['index_remplaces']) & index
+
+def test_filtre_non_autorise():
+    """Un filtre hors de la définition de la grille est refusé"""
+    try:
+        grille_admin.charger_page_grille('technologue', {'email_client': 'x'})
+    except ValueError:
+        print("Filtre non autorisé refusé")
+        return
+    assert False, "Le filtre aurait dû être refusé"
+
+if __name__ == "__main__":
+    test_pagination_grille()
+    test_filtre_non_autorise()
+    print("\nSUCCES - Grilles d'administration fonctionnelles")
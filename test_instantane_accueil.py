@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de l'instantané de la page d'accueil SEAOP
+Valide l'ordre des projets, les compteurs, la réévaluation de l'urgence et le partage en mémoire
+"""
+
+import datetime
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import instantane_accueil
+
+def dans(jours: int) -> str:
+    return (datetime.date.today() + datetime.timedelta(days=jours)).isoformat()
+
+def preparer_base_test() -> str:
+    """Base temporaire : 7 projets ouverts dont un devenu critique, un masqué ; 3 entrepreneurs"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.executescript('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, nom TEXT, email TEXT, code_postal TEXT, type_projet TEXT,
+            budget TEXT, delai_realisation TEXT, date_limite_soumissions DATE, date_debut_souhaite DATE,
+            niveau_urgence TEXT DEFAULT 'normal', photos TEXT, date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            numero_reference TEXT, visible_entrepreneurs BOOLEAN DEFAULT 1, accepte_soumissions BOOLEAN DEFAULT 1
+        );
+        CREATE TABLE entrepreneurs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, statut TEXT DEFAULT 'actif',
+            date_inscription TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE soumissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, lead_id INTEGER, entrepreneur_id INTEGER,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, utilisateur_type TEXT, utilisateur_id INTEGER,
+            type_notification TEXT, titre TEXT, message TEXT, lien_id INTEGER
+        );
+    ''')
+    for i in range(6):
+        conn.execute('''
+            INSERT INTO leads (type_projet, code_postal, date_limite_soumissions, date_debut_souhaite,
+                               niveau_urgence, photos, date_creation)
+            VALUES (?, 'H2A 1A1', ?, ?, 'faible', ?, datetime('now', ?))
+        ''', (f"Projet {i}", dans(30 + i), dans(60), 'x' * 10000, f"-{i * 3} days"))
+    # Classé faible mais dont la date limite est après-demain
+    conn.execute('''
+        INSERT INTO leads (type_projet, date_limite_soumissions, date_debut_souhaite, niveau_urgence, numero_reference)
+        VALUES ('Toiture urgente', ?, ?, 'faible', 'SEAOP-1')
+    ''', (dans(2), dans(20)))
+    conn.execute("INSERT INTO leads (type_projet, visible_entrepreneurs) VALUES ('Masqué', 0)")
+    conn.execute("INSERT INTO entrepreneurs (date_inscription) VALUES (datetime('now', '-30 days'))")
+    conn.execute("INSERT INTO entrepreneurs DEFAULT VALUES")
+    conn.execute("INSERT INTO entrepreneurs (statut) VALUES ('suspendu')")
+    conn.execute("INSERT INTO soumissions (lead_id, entrepreneur_id, date_creation) VALUES (7, 1, '2020-01-01')")
+    conn.execute("INSERT INTO soumissions (lead_id, entrepreneur_id) VALUES (7, 1)")
+    conn.commit()
+    conn.close()
+    return chemin
+
+def test_instantane_accueil():
+    """Premier affichage calculé une fois, puis servi de la mémoire jusqu'au recalcul par la tâche"""
+    print("=== TEST INSTANTANE ACCUEIL ===")
+    chemin = preparer_base_test()
+
+    instantane = instantane_accueil.get_instantane_accueil(chemin)
+    projets = instantane['projets']
+    assert len(projets) == instantane_accueil.NOMBRE_PROJETS_ACCUEIL
+    # L'urgence réévaluée place le projet critique en tête, les autres par date limite
+    assert (projets[0]['type_projet'], projets[0]['niveau_urgence']) == ('Toiture urgente', 'critique')
+    assert projets[0]['nb_soumissions'] == 2 and projets[0]['jours_restants_soumissions'] == 2
+    assert [p['type_projet'] for p in projets[1:]] == ['Projet 0', 'Projet 1', 'Projet 2', 'Projet 3']
+    assert 'photos' not in projets[1]
+    assert (instantane['appels_offres_actifs'], instantane['appels_offres_semaine']) == (7, 4)
+    assert (instantane['fournisseurs'], instantane['fournisseurs_semaine']) == (2, 1)
+    assert (instantane['soumissions'], instantane['soumissions_semaine']) == (2, 1)
+
+    conn = sqlite3.connect(chemin)
+    assert conn.execute("SELECT niveau_urgence FROM leads WHERE id = 7").fetchone() == ('critique',)
+    assert conn.execute("SELECT COUNT(*) FROM notifications WHERE lien_id = 7").fetchone() == (2,)
+
+    # Servi de la mémoire : un nouveau projet n'apparaît qu'au recalcul
+    conn.execute("INSERT INTO leads (type_projet, date_limite_soumissions) VALUES ('Nouveau', ?)", (dans(1),))
+    conn.commit()
+    conn.close()
+    assert instantane_accueil.get_instantane_accueil(chemin) is instantane
+
+    instantane_accueil.actualiser_instantane_accueil(chemin)
+    instantane = instantane_accueil.get_instantane_accueil(chemin)
+    assert instantane['appels_offres_actifs'] == 8
+    assert [p['type_projet'] for p in instantane['projets'][:2]] == ['Nouveau', 'Toiture urgente']
+    print("Instantané accueil OK")
+
+if __name__ == "__main__":
+    test_instantane_accueil()
+    print("\nSUCCES - Instantané de la page d'accueil fonctionnel")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de l'instrumentation des reruns SEAOP
+Valide le comptage des requêtes, l'arbre de spans, les instructions lentes et le fichier de traces
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import instrumentation
+
+def test_instrumentation():
+    """Requêtes imputées aux spans, appels cumulés, traces en mémoire et en JSONL"""
+    print("=== TEST INSTRUMENTATION ===")
+    dossier = tempfile.mkdtemp()
+    chemin = os.path.join(dossier, 'seaop.db')
+    instrumentation.FICHIER_TRACES = os.path.join(dossier, 'traces_reruns.jsonl')
+    instrumentation.installer()
+
+    conn = sqlite3.connect(chemin)
+    conn.execute('CREATE TABLE leads (id INTEGER PRIMARY KEY, titre TEXT)')
+    conn.executemany('INSERT INTO leads (titre) VALUES (?)', [(f"projet {i}",) for i in range(50)])
+    conn.commit()
+    conn.close()
+
+    def get_lead(lead_id):
+        conn = sqlite3.connect(chemin)
+        cursor = conn.cursor()
+        cursor.execute('SELECT titre FROM leads WHERE id = ?', (lead_id,))
+        titre = cursor.fetchone()[0]
+        conn.close()
+        return titre
+
+    def page_projets():
+        conn = sqlite3.connect(chemin)
+        ids = [ligne[0] for ligne in conn.execute('SELECT id FROM leads ORDER BY id LIMIT 3').fetchall()]
+        conn.close()
+        return [get_lead(i) for i in ids]
+
+    espace = {'get_lead': get_lead, 'page_projets': page_projets, 'autre': print}
+    instrumentation.instrumenter_fonctions(espace, ('page_', 'get_'))
+    assert espace['autre'] is print
+    get_lead, page_projets = espace['get_lead'], espace['page_projets']
+
+    # Hors rerun tracé : rien n'est mesuré ni enregistré
+    assert page_projets() == ['projet 0', 'projet 1', 'projet 2']
+    assert instrumentation.traces_recentes() == []
+
+    with instrumentation.tracer_rerun() as trace:
+        page_projets()
+        sqlite3.connect(chemin).execute('SELECT COUNT(*) FROM leads').fetchone()
+        trace.page = 'projets'
+
+    donnees = instrumentation.traces_recentes()[0]
+    assert donnees['page'] == 'projets' and donnees['issue'] == 'ok'
+    assert donnees['requetes'] == 5
+    page, = donnees['spans']
+    assert (page['nom'], page['appels'], page['requetes']) == ('page_projets', 1, 4)
+    enfant, = page['enfants']
+    assert (enfant['nom'], enfant['appels'], enfant['requetes']) == ('get_lead', 3, 3)
+    assert page['duree_ms'] >= enfant['duree_ms'] and donnees['duree_ms'] >= page['duree_ms']
+    assert len(donnees['instructions_lentes']) == instrumentation.INSTRUCTIONS_LENTES
+    assert {i['span'] for i in donnees['instructions_lentes']} <= {'rerun', 'page_projets', 'get_lead'}
+    assert [s['niveau'] for s in instrumentation.aplatir_spans(donnees['spans'])] == [0, 1]
+
+    # Rerun interrompu par une erreur : tracé quand même
+    try:
+        with instrumentation.tracer_rerun() as trace:
+            trace.page = 'projets'
+            get_lead(999)
+    except TypeError:
+        pass
+    assert instrumentation.traces_recentes()[0]['issue'] == 'erreur : TypeError'
+
+    traces = instrumentation.lire_traces()
+    assert [t['issue'] for t in traces] == ['erreur : TypeError', 'ok']
+    with open(instrumentation.FICHIER_TRACES, encoding='utf-8') as fichier:
+        assert json.loads(fichier.readline())['requetes'] == 5
+    resume, = instrumentation.resume_par_page(traces)
+    assert (resume['page'], resume['reruns']) == ('projets', 2)
+    print("Instrumentation OK")
+
+if __name__ == "__main__":
+    test_instrumentation()
+    print("\nSUCCES - Instrumentation des reruns fonctionnelle")
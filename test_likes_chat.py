@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des likes du Chat Room SEAOP
+Valide la bascule du like, le compteur tenu par triggers et les clics simultanés
+"""
+
+import sqlite3
+import os
+import sys
+import threading
+
+sys.path.append('.')
+
+import likes_chat
+from test_fils_chat import preparer_base_test
+
+def compter(chemin: str, message_id: int):
+    """(compteur de chat_room, lignes de chat_room_likes) d'un message"""
+    conn = sqlite3.connect(chemin)
+    resultat = conn.execute('''
+        SELECT likes, (SELECT COUNT(*) FROM chat_room_likes WHERE message_id = ?) FROM chat_room WHERE id = ?
+    ''', (message_id, message_id)).fetchone()
+    conn.close()
+    return resultat
+
+def test_likes():
+    """Bascule, compteurs existants conservés, clics concurrents sans double compte"""
+    print("=== TEST LIKES CHAT ===")
+    chemin = preparer_base_test()
+
+    # Message 5 : un like existant (paul), déjà compté ; les triggers n'appliquent ensuite que des écarts
+    conn = sqlite3.connect(chemin)
+    conn.execute('UPDATE chat_room SET likes = 1 WHERE id = 5')
+    conn.commit()
+    conn.close()
+
+    assert likes_chat.basculer_like(5, 'marie@exemple.ca', chemin=chemin) == (True, 2)
+    assert likes_chat.basculer_like(5, 'paul@exemple.ca', chemin=chemin) == (False, 1)
+    assert likes_chat.basculer_like(5, 'marie@exemple.ca', chemin=chemin) == (False, 0)
+    assert likes_chat.basculer_like(5, 'marie@exemple.ca', chemin=chemin) == (True, 1)
+    assert compter(chemin, 5) == (1, 1)
+
+    # 20 utilisateurs cliquent en même temps ; les 10 premiers cliquent deux fois (double clic)
+    def cliquer(numero):
+        likes_chat.basculer_like(2, f"client{numero}@exemple.ca", chemin=chemin)
+        if numero < 10:
+            likes_chat.basculer_like(2, f"client{numero}@exemple.ca", chemin=chemin)
+    fils = [threading.Thread(target=cliquer, args=(n,)) for n in range(20)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    assert compter(chemin, 2) == (10, 10)
+    print("Likes OK")
+
+if __name__ == "__main__":
+    test_likes()
+    print("\nSUCCES - Likes du chat fonctionnels")
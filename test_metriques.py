@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des métriques SEAOP
+Valide le registre, le format Prometheus, le serveur /metrics et l'historique des instantanés
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import urllib.request
+
+sys.path.append('.')
+
+import metriques
+
+def test_format_prometheus():
+    """Compteurs étiquetés, jauges et histogrammes cumulés au format d'exposition"""
+    print("=== TEST FORMAT PROMETHEUS ===")
+    registre = metriques.RegistreMetriques()
+    reruns = registre.compteur('test_reruns_total', "Reruns", ('page', 'issue'))
+    reruns.incrementer(page='accueil', issue='ok')
+    reruns.incrementer(2, page='accueil', issue='ok')
+    reruns.incrementer(page='chat "public"', issue='erreur')
+    assert registre.compteur('test_reruns_total', "Autre aide", ('page', 'issue')) is reruns
+    registre.jauge('test_file', "File").fixer(4)
+    duree = registre.histogramme('test_duree_secondes', "Durée", ('page',), bornes=(0.1, 1.0))
+    for valeur in (0.05, 0.1, 0.5, 3.0):
+        duree.observer(valeur, page='accueil')
+
+    texte = registre.format_prometheus()
+    assert '# TYPE test_reruns_total counter' in texte
+    assert 'test_reruns_total{page="accueil",issue="ok"} 3' in texte
+    assert 'test_reruns_total{page="chat \\"public\\"",issue="erreur"} 1' in texte
+    assert '# TYPE test_file gauge\ntest_file 4' in texte
+    assert 'test_duree_secondes_bucket{page="accueil",le="0.1"} 2' in texte
+    assert 'test_duree_secondes_bucket{page="accueil",le="1"} 3' in texte
+    assert 'test_duree_secondes_bucket{page="accueil",le="+Inf"} 4' in texte
+    assert 'test_duree_secondes_count{page="accueil"} 4' in texte
+    assert 'test_duree_secondes_sum{page="accueil"} 3.65' in texte
+
+    instantane = {(nom, etiquettes): valeur for nom, etiquettes, valeur in registre.instantane()}
+    assert instantane[('test_duree_secondes_count', '{"page": "accueil"}')] == 4
+    assert instantane[('test_file', '{}')] == 4
+    print("Format Prometheus OK")
+
+def test_serveur_et_historique():
+    """Export HTTP du registre du processus, instantanés en base et purge au-delà de la conservation"""
+    print("=== TEST SERVEUR ET HISTORIQUE ===")
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    metriques.DATABASE_PATH = chemin
+    metriques.fichier_servi('photo', b'x' * 1500)
+
+    port = metriques.demarrer_serveur_metriques(port=0)
+    assert metriques.demarrer_serveur_metriques(port=0) == port
+    reponse = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics")
+    assert reponse.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    texte = reponse.read().decode('utf-8')
+    assert 'seaop_fichiers_octets_total{type="photo"} 1500' in texte
+    assert 'seaop_base_octets{fichier="base"}' in texte and 'seaop_cache_ratio_succes' in texte
+
+    maintenant = datetime.datetime(2025, 9, 1, 12, 0)
+    ancien = maintenant - datetime.timedelta(days=metriques.CONSERVATION_JOURS + 1)
+    assert metriques.enregistrer_historique(chemin, maintenant=ancien) > 0
+    metriques.fichier_servi('photo', b'x' * 500)
+    metriques.enregistrer_historique(chemin, maintenant=maintenant)
+    assert 'seaop_fichiers_servis_total' in metriques.get_noms_historique(chemin)
+    historique = metriques.get_historique('seaop_fichiers_octets_total', jours=10000, chemin=chemin)
+    # L'instantané ancien est purgé par le suivant
+    assert [(h['horodatage'], h['etiquettes'], h['valeur']) for h in historique] == \
+        [('2025-09-01 12:00:00', {'type': 'photo'}, 2000.0)]
+    print("Serveur et historique OK")
+
+if __name__ == "__main__":
+    test_format_prometheus()
+    test_serveur_et_historique()
+    print("\nSUCCES - Métriques fonctionnelles")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de référence du moteur de tarification SEAOP
+Compare le moteur (calcul unitaire et par lot) aux anciens calculs codés en dur
+"""
+
+import itertools
+import sys
+
+import numpy as np
+
+sys.path.append('.')
+
+import moteur_tarification as mt
+
+# === ANCIENS CALCULS (référence) ===
+
+def ancien_prix_technologue(superficie, services, options):
+    if superficie <= 1000:
+        prix_base = 2500
+    elif superficie <= 2500:
+        prix_base = 3500
+    elif superficie <= 4000:
+        prix_base = 4500
+    elif superficie <= 6000:
+        prix_base = 6000
+    else:
+        prix_base = 7500
+    if superficie <= 3000:
+        prix_base += superficie * 0.80
+    else:
+        prix_base += superficie * 1.00
+    multiplicateur_services = 1.0
+    if 'electricite' in services:
+        multiplicateur_services += 0.15
+    if 'plomberie' in services:
+        multiplicateur_services += 0.12
+    if 'chauffage' in services:
+        multiplicateur_services += 0.10
+    if options.get('modele_3d', False):
+        prix_base += 800
+    if options.get('visite_terrain', False):
+        prix_base += 350
+    if options.get('revision_multiple', False):
+        prix_base += 400
+    if options.get('urgence_elevee', False):
+        multiplicateur_services += 0.25
+    return round(prix_base * multiplicateur_services, 2)
+
+def ancien_prix_architecture(superficie, structure, mecanique, electrique, civil):
+    if superficie < 10000:
+        prix_base, prix_par_pi2 = 15000, 1.50
+    elif superficie < 25000:
+        prix_base, prix_par_pi2 = 25000, 1.25
+    elif superficie < 50000:
+        prix_base, prix_par_pi2 = 40000, 1.00
+    else:
+        prix_base, prix_par_pi2 = 60000, 0.85
+    prix_estime = prix_base + (superficie * prix_par_pi2)
+    if structure:
+        prix_estime += superficie * 0.25
+    if mecanique:
+        prix_estime += superficie * 0.20
+    if electrique:
+        prix_estime += superficie * 0.15
+    if civil:
+        prix_estime += superficie * 0.10
+    return prix_estime
+
+def ancien_prix_ingenieur(superficie, type_structure, services_demandes, sismique, dynamique, modelisation, surveillance):
+    if type_structure == 'batiment':
+        if superficie < 5000:
+            prix_base, prix_pi2 = 8000, 0.80
+        elif superficie < 15000:
+            prix_base, prix_pi2 = 12000, 0.65
+        elif superficie < 50000:
+            prix_base, prix_pi2 = 18000, 0.50
+        else:
+            prix_base, prix_pi2 = 25000, 0.40
+    elif type_structure == 'industriel':
+        prix_base, prix_pi2 = 15000, 0.75
+    else:
+        prix_base, prix_pi2 = 20000, 1.00
+    prix_estime = prix_base + (superficie * prix_pi2)
+    if services_demandes == 'complet':
+        prix_estime *= 1.8
+    elif services_demandes == 'plans':
+        prix_estime *= 1.4
+    if sismique:
+        prix_estime += superficie * 0.15
+    if dynamique:
+        prix_estime += superficie * 0.20
+    if modelisation:
+        prix_estime += superficie * 0.10
+    if surveillance:
+        prix_estime += superficie * 0.25
+    return prix_estime
+
+def ancien_prix_lead(type_projet, budget):
+    prix_base = {
+        "Peinture": 45.0, "Plancher": 55.0, "Électricité": 65.0, "Plomberie": 65.0,
+        "Chauffage/Climatisation": 75.0, "Isolation": 60.0, "Fenêtres et portes": 70.0,
+        "Maçonnerie": 80.0, "Charpenterie": 85.0, "Rénovation cuisine": 95.0,
+        "Rénovation salle de bain": 85.0, "Toiture": 105.0, "Revêtement extérieur": 90.0,
+        "Agrandissement": 120.0, "Autre": 70.0
+    }
+    multiplicateur_budget = {
+        "Moins de 5 000$": 0.8, "5 000$ - 15 000$": 1.0, "15 000$ - 30 000$": 1.3,
+        "30 000$ - 50 000$": 1.6, "Plus de 50 000$": 2.0
+    }
+    prix = prix_base.get(type_projet, 50.0)
+    prix *= multiplicateur_budget.get(budget, 1.0)
+    return round(prix, 2)
+
+# Superficies couvrant les bornes de chaque palier, leurs voisines et des valeurs quelconques
+SUPERFICIES = sorted({
+    0, 1, 999, 999.99, 1000, 1000.01, 1001, 2499.5, 2500, 2501, 2999, 3000, 3000.5, 3001,
+    3999, 4000, 4001, 4999, 5000, 5001, 5999.99, 6000, 6001, 7500, 9999, 10000, 10001,
+    14999, 15000, 15001, 24999, 25000, 25001, 33333.33, 49999, 50000, 50001, 85000, 123456.78
+} | set(np.random.default_rng(2025).uniform(0, 120000, 300).round(2).tolist()))
+
+def test_technologue():
+    """Technologue : toutes combinaisons de services et options"""
+    services_possibles = ['electricite', 'plomberie', 'chauffage']
+    options_possibles = ['modele_3d', 'visite_terrain', 'revision_multiple', 'urgence_elevee']
+    lignes = []
+    for superficie in SUPERFICIES:
+        for bits in itertools.product([False, True], repeat=7):
+            services = [s for s, b in zip(services_possibles, bits[:3]) if b] + ['implantation']
+            options = dict(zip(options_possibles, bits[3:]))
+            attendu = ancien_prix_technologue(superficie, services, options)
+            actifs = services + [k for k, v in options.items() if v]
+            assert mt.calculer_prix('technologue', superficie, actifs) == attendu, (superficie, bits)
+            lignes.append((superficie, bits, attendu))
+
+    prix = mt.calculer_prix_lot(
+        'technologue',
+        [l[0] for l in lignes],
+        {nom: [l[1][i] for l in lignes] for i, nom in enumerate(services_possibles + options_possibles)}
+    )
+    assert prix.tolist() == [l[2] for l in lignes]
+    print(f"Technologue : {len(lignes)} cas identiques")
+
+def test_architecture():
+    """Architecture : toutes combinaisons de services inclus"""
+    noms = ['structure', 'mecanique', 'electrique', 'civil']
+    lignes = []
+    for superficie in SUPERFICIES:
+        for bits in itertools.product([False, True], repeat=4):
+            attendu = ancien_prix_architecture(superficie, *bits)
+            actifs = [n for n, b in zip(noms, bits) if b]
+            assert mt.calculer_prix('architecture', superficie, actifs) == attendu, (superficie, bits)
+            lignes.append((superficie, bits, attendu))
+
+    prix = mt.calculer_prix_lot(
+        'architecture',
+        [l[0] for l in lignes],
+        {nom: [l[1][i] for l in lignes] for i, nom in enumerate(noms)}
+    )
+    assert prix.tolist() == [l[2] for l in lignes]
+    assert mt.palier_tarifaire('architecture', 10000) == (25000.0, 1.25)
+    print(f"Architecture : {len(lignes)} cas identiques")
+
+def test_ingenieur():
+    """Ingénieur : types de structure, formules et analyses"""
+    noms = ['analyse_sismique', 'analyse_dynamique', 'modelisation_3d', 'surveillance_chantier']
+    lignes = []
+    for superficie in SUPERFICIES:
+        for type_structure in ('batiment', 'industriel', 'pont', 'fondation', ''):
+            for formule in ('calculs', 'plans', 'complet'):
+                for bits in itertools.product([False, True], repeat=4):
+                    attendu = ancien_prix_ingenieur(superficie, type_structure, formule, *bits)
+                    actifs = [n for n, b in zip(noms, bits) if b]
+                    obtenu = mt.calculer_prix('ingenieur', superficie, actifs, categorie=type_structure, formule=formule)
+                    assert obtenu == attendu, (superficie, type_structure, formule, bits)
+                    lignes.append((superficie, type_structure, formule, bits, attendu))
+
+    prix = mt.calculer_prix_lot(
+        'ingenieur',
+        [l[0] for l in lignes],
+        {nom: [l[3][i] for l in lignes] for i, nom in enumerate(noms)},
+        categories=[l[1] for l in lignes],
+        formules=[l[2] for l in lignes]
+    )
+    assert prix.tolist() == [l[4] for l in lignes]
+    print(f"Ingénieur : {len(lignes)} cas identiques")
+
+def test_leads():
+    """Leads : types et budgets connus et inconnus"""
+    types = list(mt.TARIFS_LEADS['prix_par_type']) + ['Inconnu']
+    budgets = list(mt.TARIFS_LEADS['multiplicateurs_budget']) + ['À déterminer']
+    paires = list(itertools.product(types, budgets))
+    for type_projet, budget in paires:
+        assert mt.calculer_prix_lead(type_projet, budget) == ancien_prix_lead(type_projet, budget)
+    prix = mt.calculer_prix_leads_lot([p[0] for p in paires], [p[1] for p in paires])
+    assert prix.tolist() == [ancien_prix_lead(*p) for p in paires]
+    print(f"Leads : {len(paires)} cas identiques")
+
+if __name__ == "__main__":
+    test_technologue()
+    test_architecture()
+    test_ingenieur()
+    test_leads()
+    print("\nSUCCES - Moteur de tarification conforme aux anciens calculs")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test du classement des projets par pertinence SEAOP
+Valide le score, la sélection des K meilleurs et la mise à jour incrémentale
+"""
+
+import sqlite3
+import datetime
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append('.')
+
+import pertinence_projets
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec quatre projets ouverts et un projet fermé"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, type_projet TEXT, code_postal TEXT,
+            niveau_urgence TEXT, date_limite_soumissions DATE,
+            visible_entrepreneurs BOOLEAN DEFAULT 1, accepte_soumissions BOOLEAN DEFAULT 1
+        )
+    ''')
+    cursor.execute('CREATE TABLE soumissions (id INTEGER PRIMARY KEY AUTOINCREMENT, lead_id INTEGER)')
+    dans_10_jours = (datetime.date.today() + datetime.timedelta(days=10)).isoformat()
+    cursor.executemany(
+        "INSERT INTO leads (type_projet, code_postal, niveau_urgence, date_limite_soumissions, accepte_soumissions) VALUES (?, ?, ?, ?, ?)",
+        [
+            ('Toiture', 'H2B 1A1', 'normal', dans_10_jours, 1),        # 1 : type et RTA
+            ('Toiture', 'H9Z 1A1', 'normal', dans_10_jours, 1),        # 2 : type, même région
+            ('Plancher', 'H2B 1A1', 'normal', dans_10_jours, 1),       # 3 : RTA seulement
+            ('Plancher', 'G1A 1A1', 'critique', None, 1),              # 4 : urgence seulement
+            ('Toiture', 'H2B 1A1', 'critique', dans_10_jours, 0),      # 5 : fermé
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return chemin
+
+def test_selection_meilleurs():
+    """Sélection partielle : mêmes K premiers qu'un tri complet, égalités au plus récent"""
+    rng = np.random.default_rng(7)
+    ids = np.arange(1, 1001, dtype=np.int64)
+    scores = rng.integers(0, 50, 1000) / 50
+    attendu = sorted(zip(ids.tolist(), scores.tolist()), key=lambda x: (-x[1], -x[0]))
+    assert pertinence_projets.selectionner_meilleurs(ids, scores, 25) == attendu[:25]
+    assert pertinence_projets.selectionner_meilleurs(ids, scores, None) == attendu
+    print("Sélection des K meilleurs OK")
+
+def test_classement():
+    """Le classement suit le profil et intègre les nouveaux projets et soumissions"""
+    print("=== TEST CLASSEMENT PAR PERTINENCE ===")
+    chemin_original = pertinence_projets.DATABASE_PATH
+    pertinence_projets.DATABASE_PATH = preparer_base_test()
+    try:
+        verifier_classement()
+    finally:
+        pertinence_projets.invalider_matrice_projets()
+        pertinence_projets.DATABASE_PATH = chemin_original
+
+def verifier_classement():
+    """Ordre attendu, projet fermé exclu, incréments de projets et de soumissions"""
+    classement = pertinence_projets.classer_projets('H2B', 'Toiture')
+    assert [p[0] for p in classement] == [1, 2, 3, 4]
+    assert abs(classement[0][1] - 0.35 - 0.25 - 0.15 * 0.33 - 0.15 * 2 ** (-10 / 14) - 0.10) < 1e-9
+
+    # Profil sans zone ni type reconnus : seuls urgence, échéance et concurrence départagent
+    assert pertinence_projets.classer_projets('', '', k=1)[0][0] == 4
+    assert [p[0] for p in pertinence_projets.classer_projets('H2B', 'Toiture', ids_candidats=[2, 3])] == [2, 3]
+    print("Classement selon le profil OK")
+
+    # Nouvelles soumissions et nouveau projet, pris en compte sans rechargement complet
+    score_avant = pertinence_projets.classer_projets('H2B', 'Toiture', k=1)[0][1]
+    matrice = pertinence_projets.get_matrice_projets()
+    conn = sqlite3.connect(pertinence_projets.DATABASE_PATH)
+    conn.executemany("INSERT INTO soumissions (lead_id) VALUES (?)", [(1,), (1,), (1,)])
+    conn.execute("INSERT INTO leads (type_projet, code_postal, niveau_urgence) VALUES ('Toiture', 'H2B 2B2', 'normal')")
+    conn.execute("INSERT INTO soumissions (lead_id) VALUES (6)")
+    conn.commit()
+    conn.close()
+
+    assert pertinence_projets.get_matrice_projets() is matrice
+    assert matrice.nb_soumissions.tolist() == [3, 0, 0, 0, 1]
+    classement = pertinence_projets.classer_projets('H2B', 'Toiture', k=3)
+    assert [p[0] for p in classement] == [1, 2, 6]
+    assert abs(score_avant - classement[0][1] - 0.10 * (1 - 1 / 4)) < 1e-9
+    print("Mise à jour incrémentale OK")
+
+    # Projet rouvert après le chargement : la matrice est rechargée et le projet classé
+    conn = sqlite3.connect(pertinence_projets.DATABASE_PATH)
+    conn.execute("UPDATE leads SET accepte_soumissions = 1 WHERE id = 5")
+    conn.commit()
+    conn.close()
+    classement = pertinence_projets.classer_projets('H2B', 'Toiture', ids_candidats=[3, 5])
+    assert [p[0] for p in classement] == [5, 3] and classement[0][1] is not None
+    assert pertinence_projets.get_matrice_projets() is not matrice
+
+    # Candidat toujours absent de la matrice : après les projets classés, sans score, dans la limite de k
+    classement = pertinence_projets.classer_projets('H2B', 'Toiture', ids_candidats=[999, 3, 5], k=3)
+    assert classement[2] == (999, None) and [p[0] for p in classement[:2]] == [5, 3]
+    assert len(pertinence_projets.classer_projets('H2B', 'Toiture', ids_candidats=[999, 3, 5], k=2)) == 2
+    print("Candidats absents de la matrice OK")
+
+if __name__ == "__main__":
+    test_selection_meilleurs()
+    test_classement()
+    print("\nSUCCES - Classement des projets par pertinence fonctionnel")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la présence dans le Chat Room SEAOP
+Valide le registre en mémoire, la persistance regroupée, la visibilité entre processus et la purge
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import presence_chat
+
+def test_presence():
+    """Battements en mémoire, une ligne par utilisateur à la persistance, purge des absents"""
+    print("=== TEST PRÉSENCE CHAT ===")
+    chemin_original = presence_chat.DATABASE_PATH
+    presence_chat.DATABASE_PATH = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    try:
+        verifier_presence()
+    finally:
+        presence_chat.DATABASE_PATH = chemin_original
+
+def verifier_presence():
+    chemin = presence_chat.DATABASE_PATH
+    presence_chat.assurer_table_presence(chemin)
+    registre = presence_chat.get_registre_presence(chemin)
+    assert presence_chat.get_registre_presence() is registre
+    t0 = 1_750_000_000.0
+
+    # Dix affichages de Marie, un de Paul : visibles aussitôt, sans écriture
+    for i in range(10):
+        registre.battement('client', 'Marie', 'marie@exemple.ca', maintenant=t0 + i)
+    registre.battement('entrepreneur', 'Paul - Toitures Pro', 'paul@exemple.ca', maintenant=t0 + 5)
+    assert registre.en_ligne(maintenant=t0 + 10) == [
+        ('client', 'Marie', 'marie@exemple.ca'), ('entrepreneur', 'Paul - Toitures Pro', 'paul@exemple.ca')
+    ]
+    conn = sqlite3.connect(chemin)
+    assert conn.execute('SELECT COUNT(*) FROM chat_room_online').fetchone()[0] == 0
+
+    # Persistance : une ligne par utilisateur, au dernier battement
+    assert registre.persister(maintenant=t0 + 10) == 2
+    assert registre.persister(maintenant=t0 + 11) == 0
+    assert conn.execute("SELECT last_seen FROM chat_room_online WHERE user_email = 'marie@exemple.ca'"
+                        ).fetchone()[0] == presence_chat._date_sql(t0 + 9)
+
+    # Un autre processus (autre registre) voit ces utilisateurs après sa propre persistance
+    autre = presence_chat.RegistrePresence(chemin)
+    autre.battement('client', 'Julie', 'julie@exemple.ca', maintenant=t0 + 20)
+    autre.persister(maintenant=t0 + 20)
+    assert [u[2] for u in autre.en_ligne(maintenant=t0 + 20)] == ['julie@exemple.ca', 'marie@exemple.ca', 'paul@exemple.ca']
+
+    # Un battement plus ancien ne recule pas last_seen
+    autre.battement('client', 'Marie', 'marie@exemple.ca', maintenant=t0 + 1)
+    autre.persister(maintenant=t0 + 21)
+    assert conn.execute("SELECT last_seen FROM chat_room_online WHERE user_email = 'marie@exemple.ca'"
+                        ).fetchone()[0] == presence_chat._date_sql(t0 + 9)
+
+    # Hors de la fenêtre : absents de la liste puis purgés ; la borne utilise l'index
+    plus_tard = t0 + 9 + presence_chat.FENETRE_EN_LIGNE
+    assert [u[2] for u in registre.en_ligne(maintenant=plus_tard)] == []
+    assert presence_chat.purger_presence(maintenant=plus_tard) == 2
+    assert [r[0] for r in conn.execute('SELECT user_email FROM chat_room_online')] == ['julie@exemple.ca']
+    plan = ' '.join(str(r) for r in conn.execute(
+        'EXPLAIN QUERY PLAN SELECT user_email FROM chat_room_online WHERE last_seen > ?', ('2025-01-01',)))
+    assert 'idx_chatroom_online' in plan, plan
+    conn.close()
+    print("Présence OK")
+
+if __name__ == "__main__":
+    test_presence()
+    print("\nSUCCES - Présence du chat fonctionnelle")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test du profilage à la demande des pages SEAOP
+Valide l'armement par page, les deux modes, les fichiers produits et leur lecture
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append('.')
+
+import profilage
+
+def calcul_lent():
+    total = 0
+    for i in range(200000):
+        total += i * i
+    return total
+
+def page_lente():
+    debut = time.perf_counter()
+    while time.perf_counter() - debut < 0.05:
+        calcul_lent()
+
+def test_profilage():
+    """Seuls les reruns armés de la page sont profilés, en .prof ou en piles repliées"""
+    print("=== TEST PROFILAGE ===")
+    profilage.DOSSIER_PROFILS = os.path.join(tempfile.mkdtemp(), 'profils')
+
+    # Page non armée : aucun fichier
+    with profilage.profiler_page('entrepreneur'):
+        page_lente()
+    assert profilage.lister_profils() == []
+
+    profilage.armer_profilage('entrepreneur', reruns=2, mode='cprofile')
+    profilage.armer_profilage('accueil', reruns=1, mode='echantillonnage')
+    assert profilage.get_armements()['entrepreneur']['reruns'] == 2
+    for page in ('entrepreneur', 'accueil', 'entrepreneur', 'entrepreneur', 'accueil'):
+        with profilage.profiler_page(page):
+            page_lente()
+    assert profilage.get_armements() == {}
+
+    profils = profilage.lister_profils()
+    assert sorted((p['page'], p['mode']) for p in profils) == [
+        ('accueil', 'echantillonnage'), ('entrepreneur', 'cprofile'), ('entrepreneur', 'cprofile')]
+    assert all(p['duree_ms'] >= 50 for p in profils)
+
+    cprofile = next(p for p in profils if p['mode'] == 'cprofile')
+    fonctions = profilage.top_fonctions(cprofile['fichier'])
+    page = next(f for f in fonctions if f['fonction'].startswith('page_lente '))
+    calcul = next(f for f in fonctions if f['fonction'].startswith('calcul_lent '))
+    assert page['temps_cumule'] >= calcul['temps_cumule'] > 0 and calcul['appels'] >= 1
+
+    echantillons = next(p for p in profils if p['mode'] == 'echantillonnage')
+    fonctions = {f['fonction'].split(' ')[0]: f for f in profilage.top_fonctions(echantillons['fichier'])}
+    assert fonctions['page_lente']['part_cumulee'] > 0.8
+    assert fonctions['calcul_lent']['propre'] > 0
+
+    # Un seul rerun profilé à la fois : l'autre s'exécute sans profil et garde son armement
+    profilage.armer_profilage('accueil', reruns=1)
+    with profilage.profiler_page('accueil'):
+        profilage.armer_profilage('mes_projets', reruns=1)
+        with profilage.profiler_page('mes_projets'):
+            pass
+    assert list(profilage.get_armements()) == ['mes_projets']
+    profilage.desarmer_profilage('mes_projets')
+
+    try:
+        profilage.armer_profilage('accueil', mode='inconnu')
+        assert False, "Mode inconnu accepté"
+    except ValueError:
+        pass
+    print("Profilage OK")
+
+if __name__ == "__main__":
+    test_profilage()
+    print("\nSUCCES - Profilage à la demande fonctionnel")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des projets similaires SEAOP
+Valide la normalisation du texte, l'index TF-IDF sur disque, l'ajout incrémental et la reconstruction
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append('.')
+
+import projets_similaires
+
+DESCRIPTIONS = [
+    ('Rénovation cuisine', 'Refaire les armoires et le comptoir de quartz de la cuisine'),
+    ('Rénovation cuisine', 'Nouvelles armoires de cuisine, comptoir en quartz et dosseret'),
+    ('Toiture', 'Remplacement des bardeaux d\'asphalte sur toit en pente'),
+    ('Toiture', 'Réfection complète de la toiture, bardeaux et ventilation'),
+    ('Rénovation salle de bain', 'Douche en céramique et nouveau bain autoportant'),
+    ('Peinture', ''),
+]
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec quelques projets décrits"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('CREATE TABLE leads (id INTEGER PRIMARY KEY AUTOINCREMENT, type_projet TEXT, description TEXT)')
+    conn.executemany('INSERT INTO leads (type_projet, description) VALUES (?, ?)', DESCRIPTIONS)
+    conn.commit()
+    conn.close()
+    return chemin
+
+def ajouter_projets(projets: list):
+    conn = sqlite3.connect(projets_similaires.DATABASE_PATH)
+    conn.executemany('INSERT INTO leads (type_projet, description) VALUES (?, ?)', projets)
+    conn.commit()
+    conn.close()
+
+def test_normalisation():
+    """Accents pliés, mots vides et nombres retirés"""
+    termes = projets_similaires.normaliser_texte("Rénovation d'une CUISINE : îlot et comptoirs en quartz, 2 500 $")
+    assert termes == ['renovation', 'cuisine', 'ilot', 'comptoirs', 'quartz'], termes
+    print("Normalisation du texte OK")
+
+def test_similarite():
+    """Voisins TF-IDF exacts, segment d'ajout et reconstruction"""
+    print("=== TEST PROJETS SIMILAIRES ===")
+    originaux = projets_similaires.DATABASE_PATH, projets_similaires.DOSSIER_INDEX
+    projets_similaires.DATABASE_PATH = preparer_base_test()
+    projets_similaires.DOSSIER_INDEX = os.path.join(tempfile.mkdtemp(), 'index_similarite')
+    try:
+        verifier_similarite()
+    finally:
+        projets_similaires.DATABASE_PATH, projets_similaires.DOSSIER_INDEX = originaux
+
+def cosinus_force_brute(index, lead_id: int) -> dict:
+    """Cosinus par produit dense entre le projet et chaque projet indexé"""
+    def dense(vecteur):
+        v = np.zeros(len(index.vocabulaire))
+        v[vecteur[0]] = vecteur[1]
+        return v
+    ids = np.concatenate([index.ids, index.ajout_ids]).tolist()
+    reference = dense(index.vecteur(lead_id))
+    return {i: float(dense(index.vecteur(i)) @ reference) for i in ids if i != lead_id}
+
+def verifier_similarite():
+    """Index absent, construction, requêtes, ajout puis reconstruction"""
+    ps = projets_similaires
+    assert ps.projets_similaires([1]) == []
+    assert ps.maintenir_index_similarite() == 'reconstruction'
+
+    index = ps.get_index_similarite()
+    assert isinstance(index.terme_lignes, np.memmap)
+    voisins = ps.projets_similaires([1], k=2)
+    assert [v[0] for v in voisins] == [2, 5], voisins
+    attendu = cosinus_force_brute(index, 1)
+    for lead_id, score in ps.projets_similaires([1], k=10):
+        assert abs(score - attendu[lead_id]) < 1e-5
+    assert ps.projets_similaires([6]) == []  # aucun terme
+    assert [v[0] for v in ps.projets_similaires([3], k=3, ids_candidats=[1, 4, 5])] == [4]
+    assert [v[0] for v in ps.projets_similaires([1, 3], k=2, exclure_ids=[2])] == [4, 5]
+    print(f"Voisins de 1 : {voisins}")
+
+    # Projet publié après la construction : vecteur calculé à la volée, puis ajouté
+    ajouter_projets([('Toiture', 'Bardeaux arrachés par le vent, toit à réparer')])
+    assert ps.projets_similaires([7], k=1)[0][0] in (3, 4)
+    assert ps.maintenir_index_similarite() == 'ajout'
+    index = ps.get_index_similarite()
+    assert index.ajout_ids.tolist() == [7]
+    assert 7 in [v[0] for v in ps.projets_similaires([3], k=3)]
+    attendu = cosinus_force_brute(index, 3)
+    for lead_id, score in ps.projets_similaires([3], k=10):
+        assert abs(score - attendu[lead_id]) < 1e-5
+    print("Segment d'ajout OK")
+
+    # Un segment d'ajout trop gros déclenche la reconstruction (IDF à jour)
+    ajouter_projets([('Plomberie', f'Chauffe-eau numéro {i} à remplacer') for i in range(30)])
+    assert ps.maintenir_index_similarite() == 'ajout'
+    assert ps.maintenir_index_similarite() == 'reconstruction'
+    index = ps.get_index_similarite()
+    assert index.meta['generation'] == 2 and index.meta['nb_ajouts'] == 0 and len(index.ids) == 37
+    assert not [f for f in os.listdir(ps.DOSSIER_INDEX) if f.startswith('g1_')]
+    print("Reconstruction OK")
+
+if __name__ == "__main__":
+    test_normalisation()
+    test_similarite()
+    print("\nSUCCES - Projets similaires fonctionnels")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de la recherche de projets par proximité SEAOP
+Valide les centroïdes, l'élagage par grille et l'usage de l'index RTA des projets
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append('.')
+
+import proximite_projets
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec une table de projets minimale"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.execute('CREATE TABLE leads (id INTEGER PRIMARY KEY AUTOINCREMENT, code_postal TEXT NOT NULL)')
+    conn.executemany("INSERT INTO leads (code_postal) VALUES (?)",
+                     [('H2B 1A1',), ('h2a 3c4',), ('G1A 1B1',), ('J4B 2C3',), ('X0X 0X0',)])
+    conn.commit()
+    conn.close()
+    return chemin
+
+def test_proximite():
+    """Centroïdes chargés depuis le CSV, rayon identique à la force brute"""
+    print("=== TEST PROXIMITÉ DES PROJETS ===")
+    chemin_original = proximite_projets.DATABASE_PATH
+    proximite_projets.DATABASE_PATH = preparer_base_test()
+    try:
+        verifier_proximite()
+    finally:
+        proximite_projets.DATABASE_PATH = chemin_original
+
+def verifier_proximite():
+    """Distances connues, élagage sans perte et requête indexée"""
+    grille = proximite_projets.get_grille_centroides()
+    assert len(grille.rta) > 1600
+
+    # Montréal (Ahuntsic) - Québec : environ 235 km à vol d'oiseau
+    distance = proximite_projets.distance_codes_postaux('h2b 3c4', 'G1A 1A1')
+    assert 220 < distance < 250, distance
+    assert proximite_projets.get_centroide('X0X') is None
+    assert proximite_projets.rta_dans_rayon('X0X 0X0', 40) is None
+    print(f"Distance Montréal - Québec : {distance:.0f} km")
+
+    # La grille ne perd aucune RTA par rapport au calcul sur tous les centroïdes
+    rng = np.random.default_rng(3)
+    for origine in rng.choice(grille.rta, 60):
+        for rayon in (5, 25, 40, 150, 600):
+            lat, lon = grille.centroide(str(origine))
+            distances = proximite_projets.haversine_km(lat, lon, grille.latitudes, grille.longitudes)
+            attendu = set(grille.rta[distances <= rayon].tolist())
+            assert set(grille.dans_rayon(lat, lon, rayon)) == attendu, (origine, rayon)
+    print("Élagage par grille sans perte OK")
+
+    # Filtrage des projets par RTA, servi par l'index d'expression
+    proches = proximite_projets.rta_dans_rayon('H2B', 40)
+    assert 'H2A' in proches and 'J4B' in proches and 'G1A' not in proches
+    requete = f'''
+        SELECT l.id FROM leads l
+        WHERE {proximite_projets.EXPRESSION_RTA_LEAD} IN ({', '.join('?' * len(proches))})
+        ORDER BY l.id
+    '''
+    conn = sqlite3.connect(proximite_projets.DATABASE_PATH)
+    plan = ' '.join(str(r) for r in conn.execute('EXPLAIN QUERY PLAN ' + requete, list(proches)))
+    ids = [r[0] for r in conn.execute(requete, list(proches))]
+    conn.close()
+    assert 'idx_leads_rta' in plan, plan
+    assert ids == [1, 2, 4]
+    print("Filtrage indexé des projets OK")
+
+if __name__ == "__main__":
+    test_proximite()
+    print("\nSUCCES - Recherche par proximité fonctionnelle")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des recherches sauvegardées et des alertes SEAOP
+Valide l'index inverse, le filigrane par recherche et les notifications par lot
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import recherches_sauvegardees
+import proximite_projets
+import taches_fond
+
+def preparer_base_test() -> str:
+    """Crée une base temporaire avec les tables de projets et de notifications"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, nom TEXT, code_postal TEXT NOT NULL,
+            type_projet TEXT, description TEXT, budget TEXT,
+            visible_entrepreneurs BOOLEAN DEFAULT 1, accepte_soumissions BOOLEAN DEFAULT 1
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, utilisateur_type TEXT NOT NULL,
+            utilisateur_id INTEGER NOT NULL, type_notification TEXT NOT NULL,
+            titre TEXT NOT NULL, message TEXT NOT NULL, lien_id INTEGER,
+            lu BOOLEAN DEFAULT 0, date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # Projet antérieur aux recherches : ne doit jamais déclencher d'alerte
+    cursor.execute("""
+        INSERT INTO leads (nom, code_postal, type_projet, description, budget)
+        VALUES ('Ancien', 'H2B 1A1', 'Toiture', 'Bardeaux', '15 000$ - 30 000$')
+    """)
+    conn.commit()
+    conn.close()
+    return chemin
+
+def ajouter_projets(chemin: str, projets: list):
+    conn = sqlite3.connect(chemin)
+    conn.executemany('''
+        INSERT INTO leads (nom, code_postal, type_projet, description, budget, visible_entrepreneurs)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', projets)
+    conn.commit()
+    conn.close()
+
+def alertes(chemin: str) -> list:
+    conn = sqlite3.connect(chemin)
+    lignes = conn.execute('''
+        SELECT utilisateur_id, titre, lien_id FROM notifications
+        WHERE type_notification = 'alerte_recherche' ORDER BY id
+    ''').fetchall()
+    conn.close()
+    return lignes
+
+def test_cles_et_gammes():
+    """Préfixes de code postal et bornes des gammes de budget"""
+    assert recherches_sauvegardees.cles_code_postal('h2b 3c4') == ['*', 'H', 'H2', 'H2B', 'H2B3', 'H2B3C', 'H2B3C4']
+    assert recherches_sauvegardees.budget_dans_gamme('15 000$ - 30 000$', '15K-50K')
+    assert not recherches_sauvegardees.budget_dans_gamme('2 500$', '5K-15K')
+    assert recherches_sauvegardees.budget_dans_gamme('2 500$', 'Tous')
+    print("Clés d'index et gammes de budget OK")
+
+def test_alertes():
+    """Une notification par recherche, seulement pour les nouveaux projets"""
+    print("=== TEST RECHERCHES SAUVEGARDÉES ===")
+    chemin = preparer_base_test()
+    originaux = recherches_sauvegardees.DATABASE_PATH, proximite_projets.DATABASE_PATH
+    recherches_sauvegardees.DATABASE_PATH = proximite_projets.DATABASE_PATH = chemin
+    try:
+        verifier_alertes(chemin)
+    finally:
+        recherches_sauvegardees.DATABASE_PATH, proximite_projets.DATABASE_PATH = originaux
+
+def verifier_alertes(chemin: str):
+    """Index inverse, critères restants, filigrane et lot de notifications"""
+    rs = recherches_sauvegardees
+    toitures = rs.sauvegarder_recherche(1, 'Toitures Montréal', type_projet='Toiture', code_postal='h2')
+    cuisines = rs.sauvegarder_recherche(2, 'Cuisines', type_projet='Rénovation cuisine', gamme_budget='15K-50K')
+    proches = rs.sauvegarder_recherche(3, 'Tout près', rayon_km=40, code_postal_origine='H2B 1A1')
+    texte = rs.sauvegarder_recherche(4, 'Quartz', recherche_texte='quartz')
+    supprimee = rs.sauvegarder_recherche(5, 'Supprimée')
+    assert rs.supprimer_recherche(supprimee, 5)
+    assert not rs.supprimer_recherche(toitures, 2)  # pas la sienne
+    assert [r['id'] for r in rs.get_recherches_entrepreneur(1)] == [toitures]
+
+    # Aucun nouveau projet : rien à notifier
+    assert rs.evaluer_alertes()['recherches_notifiees'] == 0
+
+    ajouter_projets(chemin, [
+        ('A', 'H2A 1A1', 'Toiture', 'Toit plat', '5 000$ - 15 000$', 1),                      # 2 : toitures, proches
+        ('B', 'H2X 2Y7', 'Toiture', 'Membrane', '15 000$ - 30 000$', 1),                      # 3 : toitures, proches
+        ('C', 'G1A 1A1', 'Rénovation cuisine', 'Comptoir en quartz', '20 000$ - 40 000$', 1),  # 4 : cuisines, texte
+        ('D', 'G1A 1A1', 'Rénovation cuisine', 'Armoires', '2 000$ - 4 000$', 1),             # 5 : budget hors gamme
+        ('E', 'H2B 2B2', 'Toiture', 'Caché', '5 000$', 0),                                    # 6 : invisible
+    ])
+    resultat = rs.evaluer_alertes()
+    assert resultat == {'projets': 4, 'recherches_notifiees': 4, 'correspondances': 6}, resultat
+
+    notifications = sorted(alertes(chemin))
+    assert [n[0] for n in notifications] == [1, 2, 3, 4]
+    assert notifications[0][1].startswith('🔔 2 nouveau(x) projet(s)') and notifications[0][2] == 2
+    assert (notifications[1][2], notifications[3][2]) == (4, 4)
+    print(f"{len(notifications)} notifications groupées pour {resultat['correspondances']} correspondances")
+
+    # Les filigranes ont avancé : un second passage ne renotifie rien
+    assert rs.evaluer_alertes()['projets'] == 0
+    assert len(alertes(chemin)) == 4
+    assert [r['nb_alertes'] for r in rs.get_recherches_entrepreneur(1)] == [2]
+
+    # Une recherche créée maintenant ignore les projets existants
+    rs.sauvegarder_recherche(6, 'Tardive')
+    ajouter_projets(chemin, [('F', 'J4B 1A1', 'Toiture', 'Bardeaux', '8 000$', 1)])
+    rs.evaluer_alertes()
+    nouvelles = alertes(chemin)[4:]
+    assert sorted(n[0] for n in nouvelles) == [3, 6] and all(n[2] == 7 for n in nouvelles), nouvelles
+    print("Filigranes par recherche OK")
+
+    # L'index inverse sert la recherche des candidates
+    conn = sqlite3.connect(chemin)
+    plan = ' '.join(str(r) for r in conn.execute('''
+        EXPLAIN QUERY PLAN SELECT * FROM recherches_sauvegardees
+        WHERE cle_type IN ('Toiture', '*') AND cle_code_postal IN ('*', 'H', 'H2')
+          AND active = 1 AND dernier_lead_id < 10
+    '''))
+    conn.close()
+    assert 'idx_recherches_criteres' in plan, plan
+    print("Index inverse des critères OK")
+
+def test_taches_fond():
+    """Exécution des tâches échues, conservation de l'échéance avec remplacer=False"""
+    appels = []
+    taches_fond.enregistrer_tache('test_tache', lambda: appels.append(1), intervalle_secondes=60)
+    taches_fond.enregistrer_tache('test_tache', lambda: appels.append(2), intervalle_secondes=60, remplacer=False)
+    maintenant = taches_fond.get_etat_taches()['test_tache']['prochaine_execution']
+    assert taches_fond.executer_taches_dues(maintenant) >= 1
+    assert appels == [1]
+    taches_fond.executer_taches_dues(maintenant + 30)
+    assert appels == [1]
+    taches_fond.executer_taches_dues(maintenant + 61)
+    assert appels == [1, 1]
+    assert taches_fond.get_etat_taches()['test_tache']['executions'] == 2
+    print("Tâches de fond OK")
+
+if __name__ == "__main__":
+    test_cles_et_gammes()
+    test_alertes()
+    test_taches_fond()
+    print("\nSUCCES - Recherches sauvegardées et alertes fonctionnelles")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test du journal des requêtes lentes SEAOP
+Valide la normalisation, le regroupement par empreinte, le plan relevé et la persistance
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.append('.')
+
+import instrumentation
+import requetes_lentes
+
+def test_normalisation():
+    """Littéraux, paramètres nommés et listes IN ramenés à une seule forme"""
+    print("=== TEST NORMALISATION SQL ===")
+    a = requetes_lentes.normaliser_sql("SELECT * FROM leads\n  WHERE id IN (1, 2, 3) AND nom = 'O''Neil' AND t1 = 4.5")
+    b = requetes_lentes.normaliser_sql("SELECT * FROM leads WHERE id IN (?, ?) AND nom = :nom AND t1 = ?")
+    assert a == b == "SELECT * FROM leads WHERE id IN (?, ...) AND nom = ? AND t1 = ?"
+    assert requetes_lentes.formes_parametres((1, None, '%toit%', 'toit%', 'Toiture', 2.5)) == \
+        '["entier", "NULL", "motif %…", "motif", "texte", "réel"]'
+    print("Normalisation OK")
+
+def test_journal_requetes_lentes():
+    """Occurrences lentes cumulées par empreinte, plan et balayage relevés, tri du journal"""
+    print("=== TEST JOURNAL DES REQUETES LENTES ===")
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    instrumentation.installer()
+    conn = sqlite3.connect(chemin)
+    conn.execute('CREATE TABLE leads (id INTEGER PRIMARY KEY, type_projet TEXT, description TEXT)')
+    conn.execute('CREATE INDEX idx_leads_type ON leads(type_projet)')
+    conn.executemany('INSERT INTO leads (type_projet, description) VALUES (?, ?)',
+                     [('Toiture' if i % 3 else 'Cuisine', f"travaux {i}") for i in range(300)])
+    conn.commit()
+
+    seuil = requetes_lentes.SEUIL_MS
+    requetes_lentes.SEUIL_MS = 0.0
+    try:
+        # Deux variantes de la même requête filtrée, et une recherche par index
+        for motif in ('%travaux 1%', '%travaux 2%'):
+            conn.execute('SELECT id FROM leads WHERE description LIKE ?', (motif,)).fetchall()
+        conn.execute("SELECT id FROM leads WHERE description LIKE '%5%' AND id > 10").fetchall()
+        conn.execute('SELECT id FROM leads WHERE type_projet = ?', ('Cuisine',)).fetchall()
+    finally:
+        requetes_lentes.SEUIL_MS = seuil
+    conn.close()
+
+    # Sous le seuil par défaut : rien de plus
+    sqlite3.connect(chemin).execute('SELECT COUNT(*) FROM leads').fetchone()
+
+    assert requetes_lentes.get_registre_requetes_lentes(chemin).persister() == 3
+    journal = {r['sql_normalise']: r for r in requetes_lentes.get_requetes_lentes(chemin=chemin)}
+    like = journal['SELECT id FROM leads WHERE description LIKE ?']
+    assert like['executions'] == 2 and like['duree_totale_ms'] >= like['duree_max_ms'] > 0
+    assert like['formes_parametres'] == '["motif %…"]'
+    assert like['balayage'] == 1 and 'SCAN leads' in like['plan']
+    assert 'SELECT id FROM leads WHERE description LIKE ? AND id > ?' in journal
+    index = journal['SELECT id FROM leads WHERE type_projet = ?']
+    assert index['balayage'] == 0 and 'idx_leads_type' in index['plan']
+
+    # Nouvelle persistance : cumul sur les empreintes existantes
+    registre = requetes_lentes.get_registre_requetes_lentes(chemin)
+    registre.noter(sqlite3.connect(chemin), 'SELECT id FROM leads WHERE description LIKE ?', ('%x%',), 1000.0)
+    assert registre.persister() == 1
+    premiere = requetes_lentes.get_requetes_lentes(tri='duree_max_ms', chemin=chemin)[0]
+    assert premiere['sql_normalise'] == like['sql_normalise'] and premiere['executions'] == 3
+    assert premiere['duree_max_ms'] == 1000.0 and premiere['plan'] == like['plan']
+    assert requetes_lentes.vider_requetes_lentes(chemin=chemin) == 3
+    print("Journal des requetes lentes OK")
+
+if __name__ == "__main__":
+    test_normalisation()
+    test_journal_requetes_lentes()
+    print("\nSUCCES - Journal des requetes lentes fonctionnel")
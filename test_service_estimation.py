@@ -93,7 +93,7 @@ def test_functions_import():
     print("\n=== TEST IMPORT FONCTIONS ===")
     
     try:
-        from app_v2 import (
+        from acces_donnees import (
             creer_demande_estimation,
             get_estimations_admin,
             get_estimations_client,
@@ -111,7 +111,7 @@ def test_create_estimation():
     print("\n=== TEST CRÉATION ESTIMATION ===")
     
     try:
-        from app_v2 import creer_demande_estimation
+        from acces_donnees import creer_demande_estimation
         
         # Données de test
         estimation_test = {
@@ -163,7 +163,7 @@ def test_admin_functions():
     print("\n=== TEST FONCTIONS ADMIN ===")
     
     try:
-        from app_v2 import get_estimations_admin, mettre_a_jour_statut_estimation
+        from acces_donnees import get_estimations_admin, mettre_a_jour_statut_estimation
         
         # Test récupération estimations admin
         estimations = get_estimations_admin()
@@ -197,7 +197,7 @@ def test_client_functions():
     print("\n=== TEST FONCTIONS CLIENT ===")
     
     try:
-        from app_v2 import get_estimations_client
+        from acces_donnees import get_estimations_client
         
         # Test avec email de démonstration
         estimations = get_estimations_client('marie.dubois@exemple.com')
@@ -40,7 +40,7 @@ def test_estimations():
     # Test 4: Test import fonctions
     try:
         sys.path.append('.')
-        from app_v2 import creer_demande_estimation, get_estimations_admin
+        from acces_donnees import creer_demande_estimation, get_estimations_admin
         print("OK - Fonctions importees")
         
         # Test 5: Test récupération admin
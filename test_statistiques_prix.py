@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des statistiques de prix des soumissions SEAOP
+Valide les percentiles par groupe, le repli, le modèle de fourchette et la mise à jour des acceptations
+"""
+
+import sqlite3
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append('.')
+
+import statistiques_prix
+
+def preparer_base_test() -> str:
+    """Base temporaire : 40 soumissions en cuisine 15-30 k$, 10 en toiture sans budget"""
+    chemin = os.path.join(tempfile.mkdtemp(), 'seaop.db')
+    conn = sqlite3.connect(chemin)
+    conn.executescript('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, type_projet TEXT, budget TEXT, niveau_urgence TEXT DEFAULT 'normal'
+        );
+        CREATE TABLE soumissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, lead_id INTEGER, montant REAL, statut TEXT DEFAULT 'envoyee'
+        );
+    ''')
+    conn.execute("INSERT INTO leads (type_projet, budget) VALUES ('Rénovation cuisine', '15 000$ - 30 000$')")
+    conn.execute("INSERT INTO leads (type_projet, budget, niveau_urgence) VALUES ('Toiture', 'À déterminer', 'critique')")
+    rng = np.random.default_rng(7)
+    montants_cuisine = np.round(np.exp(rng.normal(np.log(22000), 0.2, 40)), -2)
+    conn.executemany('INSERT INTO soumissions (lead_id, montant, statut) VALUES (1, ?, ?)',
+                     [(m, 'acceptee' if i % 4 == 0 else 'envoyee') for i, m in enumerate(montants_cuisine.tolist())])
+    conn.executemany('INSERT INTO soumissions (lead_id, montant) VALUES (2, ?)',
+                     [(m,) for m in (9000, 9500, 10000, 10500, 11000, 12000, 12500, 13000, 14000, 15000)])
+    conn.commit()
+    conn.close()
+    return chemin
+
+def test_statistiques_prix():
+    """Calcul complet, lecture précalculée et acceptations incrémentales"""
+    print("=== TEST STATISTIQUES DE PRIX ===")
+    chemin_original = statistiques_prix.DATABASE_PATH
+    statistiques_prix.DATABASE_PATH = preparer_base_test()
+    try:
+        verifier_statistiques()
+    finally:
+        statistiques_prix.DATABASE_PATH = chemin_original
+
+def verifier_statistiques():
+    # Premier appel : tables créées et calculées
+    statistiques_prix.assurer_statistiques_prix()
+    contexte = statistiques_prix.get_contexte_prix('Rénovation cuisine', '15 000$ - 30 000$', 'normal')
+    assert (contexte['type_projet'], contexte['gamme_budget']) == ('Rénovation cuisine', '15 000$ - 30 000$')
+    assert contexte['nb_soumissions'] == 40 and contexte['nb_acceptees'] == 10
+
+    conn = sqlite3.connect(statistiques_prix.DATABASE_PATH)
+    montants = np.array([r[0] for r in conn.execute('SELECT montant FROM soumissions WHERE lead_id = 1')])
+    conn.close()
+    assert abs(contexte['p50'] - np.median(montants)) < 1e-6
+    assert contexte['p10'] <= contexte['p25'] <= contexte['p50'] <= contexte['p75'] <= contexte['p90']
+    assert sum(t['nb_soumissions'] for t in contexte['tranches']) == 40
+    assert sum(t['nb_acceptees'] for t in contexte['tranches']) == 10
+
+    # Fourchette suggérée autour des montants observés
+    bas, milieu, haut = contexte['fourchette']
+    assert bas < milieu < haut and 15000 < milieu < 30000, contexte['fourchette']
+    # Budget plus élevé : fourchette plus haute ; toiture critique à budget inconnu : près de ses montants
+    assert statistiques_prix.get_contexte_prix('Rénovation cuisine', 'Plus de 50 000$', 'normal')['fourchette'][1] > milieu
+    milieu_toiture = statistiques_prix.get_contexte_prix('Toiture', 'À déterminer', 'critique')['fourchette'][1]
+    assert 8000 < milieu_toiture < 16000, milieu_toiture
+
+    # Gamme sans statistiques propres : repli sur le type, puis sur tous les projets
+    contexte = statistiques_prix.get_contexte_prix('Rénovation cuisine', 'Plus de 50 000$', 'normal')
+    assert contexte['gamme_budget'] == '*' and contexte['nb_soumissions'] == 40
+    contexte = statistiques_prix.get_contexte_prix('Piscine', 'Moins de 5 000$', 'faible')
+    assert (contexte['type_projet'], contexte['nb_soumissions']) == ('*', 50)
+    assert contexte['fourchette'] is not None
+
+    # Contextes d'une page : mêmes groupes, fourchette selon l'urgence de chaque projet
+    projets = [
+        {'id': 1, 'type_projet': 'Toiture', 'budget': 'À déterminer', 'niveau_urgence': 'critique'},
+        {'id': 2, 'type_projet': 'Toiture', 'budget': 'À déterminer', 'niveau_urgence': 'faible'},
+        {'id': 3, 'type_projet': 'Piscine', 'budget': None, 'niveau_urgence': None},
+    ]
+    contextes = statistiques_prix.get_contextes_prix(projets)
+    assert contextes[1] == statistiques_prix.get_contexte_prix('Toiture', 'À déterminer', 'critique')
+    assert contextes[2] == statistiques_prix.get_contexte_prix('Toiture', 'À déterminer', 'faible')
+    assert contextes[1]['fourchette'] != contextes[2]['fourchette']
+    assert contextes[3] == statistiques_prix.get_contexte_prix('Piscine', None, 'normal')
+
+    # Acceptation d'une soumission déjà comptée, puis d'une soumission arrivée après le calcul
+    conn = sqlite3.connect(statistiques_prix.DATABASE_PATH)
+    cursor = conn.cursor()
+    cursor.execute("UPDATE soumissions SET statut = 'acceptee' WHERE id = 2")
+    statistiques_prix.enregistrer_acceptation(cursor, 2)
+    cursor.execute("INSERT INTO soumissions (lead_id, montant, statut) VALUES (1, 21000, 'acceptee')")
+    statistiques_prix.enregistrer_acceptation(cursor, cursor.lastrowid)
+    conn.commit()
+    conn.close()
+
+    contexte = statistiques_prix.get_contexte_prix('Rénovation cuisine', '15 000$ - 30 000$', 'normal')
+    assert (contexte['nb_soumissions'], contexte['nb_acceptees']) == (41, 12)
+    assert sum(t['nb_acceptees'] for t in contexte['tranches']) == 12
+    assert statistiques_prix.get_contexte_prix('Autre', '', 'normal')['nb_acceptees'] == 12
+
+    # Le calcul de nuit retrouve les mêmes comptes
+    assert statistiques_prix.recalculer_statistiques_prix() == {'soumissions': 51, 'groupes': 5}
+    contexte = statistiques_prix.get_contexte_prix('Rénovation cuisine', '15 000$ - 30 000$', 'normal')
+    assert (contexte['nb_soumissions'], contexte['nb_acceptees']) == (41, 12)
+    print("Statistiques de prix OK")
+
+if __name__ == "__main__":
+    test_statistiques_prix()
+    print("\nSUCCES - Statistiques de prix fonctionnelles")